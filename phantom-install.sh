@@ -462,6 +462,47 @@ install_multihop_interface_service() {
     log "Multihop interface service enabled (will start when multihop is enabled)" "$GREEN"
 }
 
+# Install API daemon service
+install_api_daemon_service() {
+    log "Installing API daemon service..." "$BLUE"
+
+    # Copy daemon service file
+    if [[ -f "$INSTALL_DIR/phantom/scripts/phantom-api.service" ]]; then
+        cp "$INSTALL_DIR/phantom/scripts/phantom-api.service" /etc/systemd/system/
+        log "Service file installed: phantom-api.service" "$GREEN"
+    else
+        log "Warning: phantom-api.service not found" "$YELLOW"
+        return
+    fi
+
+    # Reload systemd, enable and start daemon (phantom-api falls back to in-process if it is down)
+    systemctl daemon-reload
+    systemctl enable phantom-api.service > /dev/null 2>&1
+    systemctl restart phantom-api.service > /dev/null 2>&1 || true
+    log "API daemon service enabled" "$GREEN"
+}
+
+# Install traffic accounting timer
+install_traffic_timer() {
+    log "Installing traffic accounting timer..." "$BLUE"
+
+    # Copy service and timer files
+    for unit in phantom-traffic.service phantom-traffic.timer; do
+        if [[ -f "$INSTALL_DIR/phantom/scripts/$unit" ]]; then
+            cp "$INSTALL_DIR/phantom/scripts/$unit" /etc/systemd/system/
+            log "Unit file installed: $unit" "$GREEN"
+        else
+            log "Warning: $unit not found" "$YELLOW"
+            return
+        fi
+    done
+
+    # Reload systemd, enable and start the timer (samples every 5 minutes)
+    systemctl daemon-reload
+    systemctl enable --now phantom-traffic.timer > /dev/null 2>&1 || true
+    log "Traffic accounting timer enabled" "$GREEN"
+}
+
 # Show completion
 show_completion() {
     echo ""
@@ -505,6 +546,8 @@ main() {
     create_commands
     install_multihop_monitor_service
     install_multihop_interface_service
+    install_api_daemon_service
+    install_traffic_timer
     
     # Complete
     show_completion
@@ -18,6 +18,8 @@ TR: Phantom-WG API Paketi
         - Exceptions: Özelleştirilmiş hata sınıfları hiyerarşisi
         - Validators: Girdi doğrulama sınıfları
         - Core: Ana API motoru (PhantomAPI)
+        - Daemon: Modülleri sıcak tutan Unix socket RPC servisi (PhantomDaemon, DaemonClient)
+        - Status Stream: Abonelere artımlı durum değişiklikleri yayınlayan ortak örnekleyici (StatusStream)
     
     Kullanım Akışı:
         1. CLI veya programatik erişim ile API çağrısı yapılır
@@ -44,6 +46,8 @@ EN: Phantom-WG API Package
         - Exceptions: Custom exception class hierarchy
         - Validators: Input validation classes
         - Core: Main API engine (PhantomAPI)
+        - Daemon: Unix socket RPC service keeping modules warm (PhantomDaemon, DaemonClient)
+        - Status Stream: Shared sampler publishing incremental status changes to subscribers (StatusStream)
     
     Usage Flow:
         1. API call made via CLI or programmatic access
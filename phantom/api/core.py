@@ -11,7 +11,8 @@ TR: Phantom-WG Ana API Motoru
     
     Bu modül, Phantom-WG için merkezi API motoru olarak hizmet verir ve şunları sağlar:
     
-    - Modüllerin olduğu dizininden (../modules) dinamik modül keşfi ve yükleme
+    - Modüllerin olduğu dizininden (../modules) dinamik modül keşfi ve ilk
+      kullanımda yükleme (lazy loading)
     - Tüm modül eylemleri için birleşik API arayüzü
     - Uygun hata yönetimi ile standartlaştırılmış istek/yanıt işleme
     - Temiz programatik erişim için modül proxy sistemi
@@ -20,7 +21,8 @@ TR: Phantom-WG Ana API Motoru
     Ana Bileşenler:
         - PhantomAPI: Tüm modülleri yükleyen ve yöneten ana orkestratör
         - ModuleProxy: Modül eylemlerine öznitelik tarzı erişim sağlar (örn: api.core.add_client())
-        - Dinamik Yükleme: Modülleri çalışma zamanında, sabit kodlanmış bağımlılıklar olmadan keşfeder
+        - Dinamik Yükleme: Modülleri çalışma zamanında, sabit kodlanmış bağımlılıklar olmadan keşfeder;
+          başlangıçta yalnızca kayıt defteri oluşturulur, modül ilk çağrıldığında import edilir
         - Hata Yönetimi: Detaylı hata yanıtları ile kapsamlı exception-handling
     
     Mimari:
@@ -33,7 +35,7 @@ EN: Phantom-WG Main API Engine
 
     This module serves as the central API engine for Phantom-WG, providing:
 
-    - Dynamic module discovery and loading from the modules directory
+    - Dynamic module discovery and on-first-use loading from the modules directory
     - Unified API interface for all module actions
     - Standardized request/response handling with proper error management
     - Module proxy system for clean programmatic access
@@ -42,7 +44,8 @@ EN: Phantom-WG Main API Engine
     Key Components:
         - PhantomAPI: Main orchestrator that loads and manages all modules
         - ModuleProxy: Provides attribute-style access to module actions (e.g., api.core.add_client())
-        - Dynamic Loading: Discovers modules at runtime without hardcoded dependencies
+        - Dynamic Loading: Discovers modules at runtime without hardcoded dependencies;
+          startup only builds a registry, a module is imported when first used
         - Error Handling: Comprehensive exception management with detailed error responses
 
     Architecture:
@@ -62,16 +65,21 @@ Usage Examples:
     # List available modules
     modules = api.list_modules()
 
+    # Per-module import and init time
+    report = api.profile_startup()
+
 Copyright (c) 2025 Rıza Emre ARAS <r.emrearas@proton.me>
 Licensed under AGPL-3.0 - see LICENSE file for details
 Third-party licenses - see THIRD_PARTY_LICENSES file for details
 WireGuard® is a registered trademark of Jason A. Donenfeld.
 """
 import os
+import time
 import importlib
 import logging
+import threading
 from pathlib import Path
-from typing import Optional
+from typing import Any, Dict, List, Optional
 
 from phantom import __version__
 from .response import APIResponse
@@ -143,14 +151,18 @@ class PhantomAPI:
         install_dir: Path to the Phantom-WG installation directory
         logger: Configured logger instance for API operations
         _modules: Dictionary of loaded module instances keyed by module name
+        _registry: Discovered module names mapped to their import paths
+        _load_times: Import and init time (ms) of every loaded module
     """
 
     def __init__(self, install_dir: Optional[Path] = None):
         """Initialize the Phantom API engine.
 
-        Sets up the installation directory, configures logging, and loads all
-        available modules from the modules directory. The initialization is
-        designed to be quiet for clean JSON output in CLI usage.
+        Sets up the installation directory, configures logging, and discovers
+        the available modules. Modules are imported and instantiated on first
+        use, so a request only pays for the module it calls. The
+        initialization is designed to be quiet for clean JSON output in CLI
+        usage.
 
         Args:
             install_dir: Optional custom installation directory. If not provided,
@@ -160,8 +172,11 @@ class PhantomAPI:
         self.install_dir = install_dir or self._detect_install_dir()
         self.logger = self._setup_logger()
         self._modules = {}
+        self._registry: Dict[str, str] = {}
+        self._load_times: Dict[str, Dict[str, float]] = {}
+        self._load_lock = threading.RLock()
 
-        # Discover and load all available modules from modules directory
+        # Discover available modules; each one is loaded on first use
         self._load_modules()
 
     # noinspection PyMethodMayBeStatic
@@ -226,16 +241,16 @@ class PhantomAPI:
         return logger
 
     def _load_modules(self) -> None:
-        """Dynamically discover and load all available modules.
+        """Discover all available modules without importing them.
 
         This method scans the 'phantom/modules' directory for valid module
-        packages. A valid module is a directory containing a 'module.py' file
-        with a class that inherits from BaseModule.
+        packages and records them in the module registry. Nothing is imported
+        here: a module is imported and instantiated by _get_module() the first
+        time one of its actions is executed.
 
-        The loading process is fault-tolerant - if one module fails to load,
-        it logs the error and continues loading other modules. This ensures
-        that a single broken module doesn't prevent the entire system from
-        functioning.
+        Loading is fault-tolerant - if a module fails to load on first use,
+        only requests for that module fail. A single broken module doesn't
+        prevent the rest of the system from functioning.
 
         Module Discovery Rules:
             - Must be a directory under 'phantom/modules/'
@@ -249,13 +264,69 @@ class PhantomAPI:
             self.logger.warning(f"Modules directory not found: {modules_dir}")
             return
 
-        # Iterate through all subdirectories in modules directory
-        for module_dir in modules_dir.iterdir():
+        # Register all subdirectories that contain a module.py
+        for module_dir in sorted(modules_dir.iterdir(), key=lambda path: path.name):
             if module_dir.is_dir() and (module_dir / "module.py").exists():
+                self._registry[module_dir.name] = f"phantom.modules.{module_dir.name}.module"
+
+    @property
+    def available_modules(self) -> List[str]:
+        """Names of discovered and already loaded modules."""
+        return list(dict.fromkeys(list(self._registry) + list(self._modules)))
+
+    def _get_module(self, module_name: str):
+        """Return the module instance, loading it on first use.
+
+        Args:
+            module_name: Name of the module
+
+        Returns:
+            The module instance
+
+        Raises:
+            PhantomModuleNotFoundError: If the module is not registered, has no module
+                class, or fails to import or initialize
+        """
+        instance = self._modules.get(module_name)
+        if instance is not None:
+            return instance
+
+        if module_name not in self._registry:
+            available = self.available_modules
+            raise PhantomModuleNotFoundError(
+                f"Module '{module_name}' not found. Available modules: {', '.join(available)}",
+                data={"available_modules": available}
+            )
+
+        with self._load_lock:
+            if module_name not in self._modules:
                 try:
-                    self._load_module(module_dir.name)
+                    self._load_module(module_name)
                 except Exception as e:
-                    self.logger.error(f"Failed to load module '{module_dir.name}': {e}")
+                    # A module that cannot be loaded is unavailable, as with eager loading
+                    raise PhantomModuleNotFoundError(
+                        f"Module '{module_name}' could not be loaded: {e}",
+                        data={"exception_type": type(e).__name__}
+                    ) from e
+
+        instance = self._modules.get(module_name)
+        if instance is None:
+            raise PhantomModuleNotFoundError(f"No module class found in {module_name}")
+        return instance
+
+    def get_module(self, module_name: str):
+        """Return a module instance for in-process integrations, loading it on first use.
+
+        Used by the API daemon to build helpers (such as its status sampler)
+        from the warm module. Regular callers should use execute().
+
+        Args:
+            module_name: Name of the module
+
+        Raises:
+            PhantomModuleNotFoundError: If the module is not available
+        """
+        return self._get_module(module_name)
 
     def _load_module(self, module_name: str) -> None:
         """Load a specific module by name.
@@ -282,8 +353,11 @@ class PhantomAPI:
         """
         try:
             # Dynamically import the module using Python's importlib
-            module_path = f"phantom.modules.{module_name}.module"
+            module_path = self._registry.get(module_name, f"phantom.modules.{module_name}.module")
+            started = time.perf_counter()
             module = importlib.import_module(module_path)
+            imported = time.perf_counter()
+            self._load_times[module_name] = {"import_ms": round((imported - started) * 1000, 3), "init_ms": 0.0}
 
             # Search for the module class within the imported module
             module_class = None
@@ -301,6 +375,7 @@ class PhantomAPI:
                 # noinspection PyCallingNonCallable
                 instance = module_class(self.install_dir)
                 self._modules[module_name] = instance
+                self._load_times[module_name]["init_ms"] = round((time.perf_counter() - imported) * 1000, 3)
             else:
                 self.logger.warning(f"No module class found in {module_name}")
 
@@ -338,16 +413,10 @@ class PhantomAPI:
               info in debug mode
         """
         try:
-            # Verify that the requested module exists in the loaded modules
-            if module not in self._modules:
-                available = ", ".join(self._modules.keys())
-                raise PhantomModuleNotFoundError(
-                    f"Module '{module}' not found. Available modules: {available}",
-                    data={"available_modules": list(self._modules.keys())}
-                )
+            # Resolve the module, importing it on first use
+            module_instance = self._get_module(module)
 
             # Delegate action execution to the appropriate module instance
-            module_instance = self._modules[module]
             return module_instance.execute_action(action, **kwargs)
 
         except PhantomException as e:
@@ -408,25 +477,22 @@ class PhantomAPI:
 
         # Define preferred display order for better UX (core features first)
         module_order = ["core", "dns", "multihop", "ghost"]
-
-        # Add modules in preferred order first
-        for module_name in module_order:
-            if module_name in self._modules:
-                instance = self._modules[module_name]
-                modules.append({
-                    "name": module_name,
-                    "description": instance.get_module_description(),
-                    "actions_count": len(instance.get_actions())
-                })
-
-        # Add any remaining modules that aren't in the preferred order list
-        for name, instance in self._modules.items():
-            if name not in module_order:
-                modules.append({
-                    "name": name,
-                    "description": instance.get_module_description(),
-                    "actions_count": len(instance.get_actions())
-                })
+        available = self.available_modules
+        ordered = [name for name in module_order if name in available]
+        ordered += [name for name in available if name not in module_order]
+
+        # Describing a module needs its instance, so every module is loaded here
+        for module_name in ordered:
+            try:
+                instance = self._get_module(module_name)
+            except Exception as e:
+                self.logger.error(f"Failed to load module '{module_name}': {e}")
+                continue
+            modules.append({
+                "name": module_name,
+                "description": instance.get_module_description(),
+                "actions_count": len(instance.get_actions())
+            })
 
         return APIResponse.success_response(
             data={
@@ -462,10 +528,10 @@ class PhantomAPI:
         Raises:
             PhantomModuleNotFoundError: If the specified module doesn't exist
         """
-        if module not in self._modules:
+        if module not in self._modules and module not in self._registry:
             raise PhantomModuleNotFoundError(f"Module '{module}' not found")
 
-        instance = self._modules[module]
+        instance = self._get_module(module)
         actions = instance.get_actions()
 
         action_list = []
@@ -476,7 +542,7 @@ class PhantomAPI:
             for name, func in actions.items():
                 if func:
                     # Hide individual client actions as they're accessed through submenu
-                    if name in ["add_client", "remove_client", "export_client"]:
+                    if name in ["add_client", "add_clients", "remove_client", "remove_clients", "export_client"]:
                         continue
 
                     if name == "list_clients":
@@ -558,12 +624,12 @@ class PhantomAPI:
         """Perform a system health check and return API status information.
 
         This method provides a quick way to verify that the API is functioning
-        correctly and all modules are loaded. It's useful for monitoring,
+        correctly. It does not load any module. It's useful for monitoring,
         debugging, and integration testing.
 
         The health check includes:
             - API version information
-            - Number of loaded modules
+            - Number of modules loaded so far
             - List of available module names
             - Installation directory path
             - Overall health status
@@ -571,17 +637,54 @@ class PhantomAPI:
         Returns:
             APIResponse: Success response containing:
                 - api_version: Current Phantom-WG version
-                - modules_loaded: Count of successfully loaded modules
-                - modules: List of module names
+                - modules_loaded: Count of modules instantiated so far
+                - modules: List of available module names
                 - install_dir: Path to installation directory
                 - status: Always "healthy" if this method executes
         """
         health_data = {
             "api_version": __version__,
             "modules_loaded": len(self._modules),
-            "modules": list(self._modules.keys()),
+            "modules": self.available_modules,
             "install_dir": str(self.install_dir),
             "status": "healthy"
         }
 
         return APIResponse.success_response(data=health_data)
+
+    def profile_startup(self) -> APIResponse:
+        """Load every module and report how long each one took.
+
+        Discovery time is measured separately from the per-module import and
+        init time. Import time is only meaningful for modules that were not
+        imported earlier in the same process, so this is meant to be run in
+        a fresh process (phantom-api --profile-startup).
+
+        Returns:
+            APIResponse: Success response containing:
+                - discovery_ms: Time spent building the module registry
+                - modules: List of {name, import_ms, init_ms, total_ms, error}
+                - total_ms: Discovery plus all module loads
+        """
+        started = time.perf_counter()
+        self._registry = {}
+        self._load_modules()
+        discovery_ms = round((time.perf_counter() - started) * 1000, 3)
+
+        modules: List[Dict[str, Any]] = []
+        for module_name in self.available_modules:
+            entry: Dict[str, Any] = {"name": module_name}
+            try:
+                self._get_module(module_name)
+            except Exception as e:
+                entry["error"] = str(e)
+            times = self._load_times.get(module_name, {"import_ms": 0.0, "init_ms": 0.0})
+            entry.update(times)
+            entry["total_ms"] = round(times["import_ms"] + times["init_ms"], 3)
+            modules.append(entry)
+
+        return APIResponse.success_response(data={
+            "discovery_ms": discovery_ms,
+            "modules": modules,
+            "total_ms": round((time.perf_counter() - started) * 1000, 3)
+        })
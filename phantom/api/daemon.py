@@ -0,0 +1,616 @@
+"""
+██████╗ ██╗  ██╗ █████╗ ███╗   ██╗████████╗ ██████╗ ███╗   ███╗
+██╔══██╗██║  ██║██╔══██╗████╗  ██║╚══██╔══╝██╔═══██╗████╗ ████║
+██████╔╝███████║███████║██╔██╗ ██║   ██║   ██║   ██║██╔████╔██║
+██╔═══╝ ██╔══██║██╔══██║██║╚██╗██║   ██║   ██║   ██║██║╚██╔╝██║
+██║     ██║  ██║██║  ██║██║ ╚████║   ██║   ╚██████╔╝██║ ╚═╝ ██║
+╚═╝     ╚═╝  ╚═╝╚═╝  ╚═╝╚═╝  ╚═══╝   ╚═╝    ╚═════╝ ╚═╝     ╚═╝
+
+TR: Phantom-WG API Arka Plan Servisi (Daemon) ve Unix Socket RPC
+    ===============================================================
+
+    Bu modül, PhantomAPI örneğini ve yüklenmiş modülleri bellekte sıcak
+    tutan uzun ömürlü bir arka plan servisi sağlar. İstekler yerel bir
+    Unix socket üzerinden satır bazlı JSON olarak alınır ve yanıtlar aynı
+    formatta döndürülür. Böylece her CLI çağrısında modül keşfi, yapılandırma
+    okuma ve veritabanı açma maliyeti ortadan kalkar.
+
+    Ana Bileşenler:
+        - PhantomDaemon: Socket sunucusu, PhantomAPI örneğini yönetir
+        - DaemonClient: İnce istemci, daemon çalışmıyorsa DaemonUnavailableError fırlatır
+        - DaemonUnavailableError: CLI'nin süreç içi çalıştırmaya geri dönmesi için sinyal
+        - StatusStream: Tüm abonelerin paylaştığı tek canlı durum örnekleyicisi
+
+    Protokol:
+        İstek:  {"op": "execute", "module": "core", "action": "list_clients", "params": {...}}
+        Yanıt:  APIResponse.to_dict() çıktısı
+        Her mesaj tek satırdır ve '\\n' ile sonlanır.
+
+        Abonelik: {"op": "subscribe", "topic": "status"} isteğine önce bir
+        APIResponse satırı, ardından bağlantı kapanana kadar snapshot, delta,
+        error ve heartbeat mesajları satır satır gönderilir.
+
+    Tutarlılık:
+        phantom.json dosyası başka bir süreç tarafından değiştirildiğinde
+        değişiklik bir sonraki istekte ortak ConfigService üzerinden
+        yayınlanır ve yüklü modüller yapılandırmalarını yerinde yeniler.
+        Eylemler tek bir kilit altında sırayla çalışır.
+
+EN: Phantom-WG API Daemon and Unix Socket RPC
+    ===========================================
+
+    This module provides a long-lived daemon that keeps a PhantomAPI
+    instance and its loaded modules warm in memory. Requests are received
+    over a local Unix socket as line-delimited JSON and responses are
+    returned in the same format. This removes the module discovery, config
+    parsing and database opening cost from every CLI invocation.
+
+    Key Components:
+        - PhantomDaemon: Socket server that owns the PhantomAPI instance
+        - DaemonClient: Thin client, raises DaemonUnavailableError if no daemon is running
+        - DaemonUnavailableError: Signal for the CLI to fall back to in-process execution
+        - StatusStream: Single live status sampler shared by all subscribers
+
+    Protocol:
+        Request:  {"op": "execute", "module": "core", "action": "list_clients", "params": {...}}
+        Response: Output of APIResponse.to_dict()
+        Every message is a single line terminated by '\\n'.
+
+        Subscription: {"op": "subscribe", "topic": "status"} is answered with
+        one APIResponse line, followed by snapshot, delta, error and heartbeat
+        messages, one per line, until the connection is closed.
+
+    Consistency:
+        When phantom.json is changed by another process the change is
+        published through the shared ConfigService on the next request and
+        the loaded modules refresh their configuration in place. Actions are
+        executed sequentially under a single lock.
+
+Usage Examples:
+    # Server (foreground, e.g. under systemd)
+    PhantomDaemon().serve_forever()
+
+    # Client
+    client = DaemonClient()
+    try:
+        response = client.execute("core", "list_clients", page=1)
+    except DaemonUnavailableError:
+        response = PhantomAPI().execute("core", "list_clients", page=1).to_dict()
+
+    # Live status deltas
+    for message in DaemonClient().subscribe("status"):
+        print(message["type"], message.get("events"))
+
+Copyright (c) 2025 Rıza Emre ARAS <r.emrearas@proton.me>
+Licensed under AGPL-3.0 - see LICENSE file for details
+Third-party licenses - see THIRD_PARTY_LICENSES file for details
+WireGuard® is a registered trademark of Jason A. Donenfeld.
+"""
+import os
+import json
+import socket
+import signal
+import struct
+import logging
+import threading
+import socketserver
+from pathlib import Path
+from typing import Any, Callable, Dict, Iterator, Optional
+
+from phantom.modules.config_service import get_config_service
+
+from .response import APIResponse
+from .status_stream import StatusStream
+
+# Default socket location and override environment variable
+DEFAULT_SOCKET_PATH = "/run/phantom-wg/phantom-api.sock"
+SOCKET_PATH_ENV = "PHANTOM_API_SOCKET"
+
+# Environment variable that forces in-process execution in the CLI
+NO_DAEMON_ENV = "PHANTOM_API_NO_DAEMON"
+
+# Socket file permissions - actions require root, so only the owner may connect
+SOCKET_PERMISSIONS = 0o600
+
+# Upper bound for a single request line (protects the daemon from runaway clients)
+MAX_REQUEST_SIZE = 16 * 1024 * 1024
+
+# Client connect timeout in seconds - actions themselves may run much longer
+CONNECT_TIMEOUT = 1.0
+
+# Seconds of silence after which a subscription sends a heartbeat line
+HEARTBEAT_INTERVAL = 5.0
+
+# Topics accepted by the subscribe operation
+SUBSCRIPTION_TOPICS = ("status",)
+
+
+class DaemonUnavailableError(ConnectionError):
+    """Raised by DaemonClient when no daemon is listening on the socket.
+
+    The request has not been sent when this error is raised, so the
+    caller can safely execute the action in-process instead.
+    """
+
+
+def get_socket_path(socket_path: Optional[str] = None) -> Path:
+    """Resolve the daemon socket path.
+
+    Args:
+        socket_path: Explicit path, takes precedence over the environment
+
+    Returns:
+        Path: Socket path from argument, PHANTOM_API_SOCKET or the default
+    """
+    return Path(socket_path or os.environ.get(SOCKET_PATH_ENV) or DEFAULT_SOCKET_PATH)
+
+
+class _RequestHandler(socketserver.StreamRequestHandler):
+    """Handles one client connection: one or more request lines."""
+
+    def handle(self):
+        daemon: 'PhantomDaemon' = self.server.phantom_daemon  # type: ignore[attr-defined]
+
+        if not daemon.is_peer_authorized(self.request):
+            self._send(APIResponse.error_response(
+                error="Permission denied",
+                code="PERMISSION_DENIED"
+            ).to_dict())
+            return
+
+        while True:
+            line = self.rfile.readline(MAX_REQUEST_SIZE + 1)
+            if not line:
+                break
+            if len(line) > MAX_REQUEST_SIZE:
+                self._send(APIResponse.error_response(
+                    error="Request too large",
+                    code="INVALID_REQUEST"
+                ).to_dict())
+                break
+            if not line.strip():
+                continue
+
+            try:
+                request = json.loads(line)
+            except (json.JSONDecodeError, UnicodeDecodeError) as e:
+                response = APIResponse.error_response(
+                    error=f"Malformed request: {e}",
+                    code="INVALID_REQUEST"
+                ).to_dict()
+            else:
+                if isinstance(request, dict) and request.get("op") == "subscribe":
+                    # The connection belongs to the subscription from here on
+                    daemon.stream_subscription(request, self._send)
+                    break
+                response = daemon.handle_request(request)
+
+            self._send(response)
+
+    def _send(self, payload: Dict[str, Any]) -> None:
+        self.wfile.write(json.dumps(payload, default=str).encode("utf-8") + b"\n")
+        self.wfile.flush()
+
+
+class _UnixServer(socketserver.ThreadingMixIn, socketserver.UnixStreamServer):
+    daemon_threads = True
+
+
+class PhantomDaemon:
+    """Long-lived PhantomAPI server bound to a Unix socket.
+
+    Keeps a single PhantomAPI instance alive between requests. Module
+    actions are not written to be thread-safe, so connections are accepted
+    concurrently but executions are serialised with a lock. The status
+    sampler runs on its own thread with its own ServiceMonitor and read-only
+    database connection (see CoreModule.create_status_sampler), so it shares
+    no request-path objects and does not take the lock while sampling.
+
+    Attributes:
+        socket_path: Filesystem path of the listening socket
+        install_dir: Installation directory passed to PhantomAPI
+        requests_served: Number of execute requests handled
+    """
+
+    def __init__(self, socket_path: Optional[str] = None,
+                 install_dir: Optional[Path] = None,
+                 api_factory: Optional[Callable[..., Any]] = None):
+        """Initialize the daemon without binding the socket.
+
+        Args:
+            socket_path: Socket path (default: PHANTOM_API_SOCKET or /run/phantom-wg/phantom-api.sock)
+            install_dir: Installation directory for PhantomAPI (auto-detected if None)
+            api_factory: Callable returning a PhantomAPI-like object; used by tests
+        """
+        if api_factory is None:
+            from .core import PhantomAPI
+            api_factory = PhantomAPI
+
+        self.socket_path = get_socket_path(socket_path)
+        self.install_dir = install_dir
+        self.logger = logging.getLogger("phantom.api.daemon")
+        self.requests_served = 0
+
+        self._api_factory = api_factory
+        self._api = None
+        self._status_sampler = None
+        self._lock = threading.Lock()
+        self._server: Optional[_UnixServer] = None
+
+        # One sampler for every status subscriber, running only while there are any
+        self.status_stream = StatusStream(self._sample_status)
+
+    # API lifecycle
+
+    def _config_file(self) -> Optional[Path]:
+        install_dir = self.install_dir or getattr(self._api, "install_dir", None)
+        if install_dir is None:
+            return None
+        return Path(install_dir) / "config" / "phantom.json"
+
+    def _get_api(self):
+        """Return the warm API instance, publishing external phantom.json edits first.
+
+        Loaded modules subscribe to the shared ConfigService and refresh their
+        configuration in place, so the instance is kept across changes; the
+        daemon's own writes are not seen as changes.
+        """
+        if self._api is None:
+            self._api = self._api_factory(self.install_dir) if self.install_dir else self._api_factory()
+            return self._api
+
+        config_file = self._config_file()
+        if config_file is not None:
+            try:
+                if get_config_service(config_file).poll():
+                    self.logger.info("Configuration changed on disk, refreshed loaded modules")
+                    # Rebuilt on the next sample; a sample in flight keeps its own reference
+                    self._status_sampler = None
+            except (OSError, ValueError) as e:
+                # Missing or half-written file: keep the last good configuration
+                self.logger.warning(f"Could not reload {config_file}: {e}")
+
+        return self._api
+
+    def handle_request(self, request: Dict[str, Any]) -> Dict[str, Any]:
+        """Dispatch a decoded request and return a response dictionary.
+
+        Supported operations:
+            - execute: Run module.action(**params) (default when "op" is missing)
+            - ping: Liveness check, returns pid, request count and subscribers
+            - subscribe: Streams on the connection, see stream_subscription()
+
+        Args:
+            request: Decoded request object
+
+        Returns:
+            Dict[str, Any]: APIResponse dictionary
+        """
+        if not isinstance(request, dict):
+            return APIResponse.error_response(
+                error="Request must be a JSON object",
+                code="INVALID_REQUEST"
+            ).to_dict()
+
+        op = request.get("op", "execute")
+
+        if op == "ping":
+            return APIResponse.success_response(data={
+                "status": "running",
+                "pid": os.getpid(),
+                "requests_served": self.requests_served,
+                "subscribers": self.status_stream.subscribers
+            }).to_dict()
+
+        if op != "execute":
+            return APIResponse.error_response(
+                error=f"Unknown operation: {op}",
+                code="INVALID_REQUEST"
+            ).to_dict()
+
+        module = request.get("module")
+        action = request.get("action")
+        params = request.get("params") or {}
+        if not isinstance(module, str) or not isinstance(action, str) or not isinstance(params, dict):
+            return APIResponse.error_response(
+                error="Request requires string 'module', 'action' and object 'params'",
+                code="INVALID_REQUEST"
+            ).to_dict()
+
+        with self._lock:
+            try:
+                api = self._get_api()
+                response = api.execute(module, action, **params)
+                result = response.to_dict()
+            except Exception as e:
+                self.logger.exception(f"Daemon failed to execute {module}.{action}")
+                # Drop the instance so a broken state is not reused
+                self._api = None
+                self._status_sampler = None
+                result = APIResponse.error_response(
+                    error=f"Unexpected error in {module}.{action}: {e}",
+                    code="INTERNAL_ERROR",
+                    data={"exception_type": type(e).__name__}
+                ).to_dict()
+            self.requests_served += 1
+
+        return result
+
+    # Status subscriptions
+
+    def _sample_status(self, include_service: bool) -> Dict[str, Any]:
+        """Sample source of the status stream.
+
+        Runs on the stream's sampler thread. The lock is only held to build
+        the sampler from the warm core module; the sample itself ('wg show'
+        plus a read on the sampler's own connection) runs without it.
+        """
+        with self._lock:
+            if self._status_sampler is None:
+                self._status_sampler = self._get_api().get_module("core").create_status_sampler()
+            sampler = self._status_sampler
+        try:
+            return sampler.sample_status(include_service=include_service).to_dict()
+        except Exception:
+            with self._lock:
+                if self._status_sampler is sampler:
+                    self._status_sampler = None
+            raise
+
+    def stream_subscription(self, request: Dict[str, Any], send: Callable[[Dict[str, Any]], None]) -> None:
+        """Serve a subscribe request until the client disconnects.
+
+        Sends one APIResponse line, then every stream message as its own
+        line. A heartbeat is sent after HEARTBEAT_INTERVAL seconds without
+        changes, so a vanished client is noticed by the failing write.
+
+        Args:
+            request: Decoded subscribe request ({"op": "subscribe", "topic": "status"})
+            send: Writes one message line to the client
+        """
+        topic = request.get("topic", "status")
+        if topic not in SUBSCRIPTION_TOPICS:
+            send(APIResponse.error_response(
+                error=f"Unknown subscription topic: {topic}",
+                code="INVALID_REQUEST"
+            ).to_dict())
+            return
+
+        subscription = self.status_stream.subscribe()
+        try:
+            send(APIResponse.success_response(data={
+                "topic": topic,
+                "interval": self.status_stream.interval,
+                "heartbeat": HEARTBEAT_INTERVAL
+            }).to_dict())
+            while True:
+                message = subscription.get(timeout=HEARTBEAT_INTERVAL)
+                if subscription.closed:
+                    break
+                send(message or {"type": "heartbeat"})
+        except OSError:
+            # Client went away (BrokenPipeError, ConnectionResetError)
+            pass
+        finally:
+            subscription.close()
+
+    # Socket server
+
+    # noinspection PyMethodMayBeStatic
+    def is_peer_authorized(self, conn: socket.socket) -> bool:
+        """Allow only root or the daemon's own user to issue requests.
+
+        Uses SO_PEERCRED where available; on platforms without it the
+        socket file permissions are the only access control.
+        """
+        if not hasattr(socket, "SO_PEERCRED"):
+            return True
+        try:
+            creds = conn.getsockopt(socket.SOL_SOCKET, socket.SO_PEERCRED, struct.calcsize("3i"))
+            _pid, uid, _gid = struct.unpack("3i", creds)
+        except OSError:
+            return False
+        return uid == 0 or uid == os.getuid()
+
+    def start(self) -> None:
+        """Bind the socket and warm up the API. Does not block."""
+        self.socket_path.parent.mkdir(parents=True, exist_ok=True)
+
+        # Remove a stale socket left by a crashed daemon, but never steal a live one
+        if self.socket_path.exists():
+            if _socket_is_live(self.socket_path):
+                raise RuntimeError(f"Another daemon is already listening on {self.socket_path}")
+            self.socket_path.unlink()
+
+        old_umask = os.umask(0o177)
+        try:
+            self._server = _UnixServer(str(self.socket_path), _RequestHandler)
+        finally:
+            os.umask(old_umask)
+        os.chmod(self.socket_path, SOCKET_PERMISSIONS)
+        self._server.phantom_daemon = self  # type: ignore[attr-defined]
+
+        # Load modules up front so the first request is already fast
+        with self._lock:
+            self._get_api()
+
+        self.logger.info(f"Phantom API daemon listening on {self.socket_path}")
+
+    def serve_forever(self) -> None:
+        """Start the daemon and block until shutdown() or SIGTERM/SIGINT."""
+        if self._server is None:
+            self.start()
+
+        if threading.current_thread() is threading.main_thread():
+            def _stop(_signum, _frame):
+                threading.Thread(target=self.shutdown, daemon=True).start()
+            signal.signal(signal.SIGTERM, _stop)
+            signal.signal(signal.SIGINT, _stop)
+
+        try:
+            self._server.serve_forever()
+        finally:
+            self._cleanup()
+
+    def shutdown(self) -> None:
+        """Stop serving; serve_forever() returns afterwards."""
+        if self._server is not None:
+            self._server.shutdown()
+
+    def _cleanup(self) -> None:
+        self.status_stream.close()
+        if self._server is not None:
+            self._server.server_close()
+            self._server = None
+        try:
+            self.socket_path.unlink()
+        except FileNotFoundError:
+            pass
+
+
+def _socket_is_live(socket_path: Path) -> bool:
+    """Check whether something accepts connections on socket_path."""
+    sock = socket.socket(socket.AF_UNIX, socket.SOCK_STREAM)
+    sock.settimeout(CONNECT_TIMEOUT)
+    try:
+        sock.connect(str(socket_path))
+        return True
+    except OSError:
+        return False
+    finally:
+        sock.close()
+
+
+class DaemonClient:
+    """Thin client for PhantomDaemon.
+
+    Each call opens a short-lived connection. If the connection cannot be
+    established, DaemonUnavailableError is raised before anything is sent,
+    so falling back to in-process execution never runs an action twice.
+    """
+
+    def __init__(self, socket_path: Optional[str] = None,
+                 connect_timeout: float = CONNECT_TIMEOUT,
+                 timeout: Optional[float] = None):
+        """Initialize the client.
+
+        Args:
+            socket_path: Socket path (default: PHANTOM_API_SOCKET or the default path)
+            connect_timeout: Seconds to wait for the connection
+            timeout: Seconds to wait for the response (None waits indefinitely)
+        """
+        self.socket_path = get_socket_path(socket_path)
+        self.connect_timeout = connect_timeout
+        self.timeout = timeout
+
+    def _connect(self) -> socket.socket:
+        sock = socket.socket(socket.AF_UNIX, socket.SOCK_STREAM)
+        sock.settimeout(self.connect_timeout)
+        try:
+            sock.connect(str(self.socket_path))
+        except OSError as e:
+            sock.close()
+            raise DaemonUnavailableError(f"Daemon not available at {self.socket_path}: {e}")
+        return sock
+
+    def _request(self, payload: Dict[str, Any]) -> Dict[str, Any]:
+        sock = self._connect()
+        try:
+            sock.settimeout(self.timeout)
+            with sock.makefile("rwb") as stream:
+                stream.write(json.dumps(payload).encode("utf-8") + b"\n")
+                stream.flush()
+                line = stream.readline()
+        finally:
+            sock.close()
+
+        if not line:
+            # The request was delivered; the action may have run, so never retry here
+            raise ConnectionError("Daemon closed the connection without a response")
+        return json.loads(line)
+
+    def is_available(self) -> bool:
+        """Return True if a daemon answers a ping."""
+        try:
+            return bool(self._request({"op": "ping"}).get("success"))
+        except (ConnectionError, OSError, ValueError):
+            return False
+
+    def ping(self) -> Dict[str, Any]:
+        """Return the daemon's ping response dictionary."""
+        return self._request({"op": "ping"})
+
+    def execute(self, module: str, action: str, **kwargs) -> Dict[str, Any]:
+        """Execute a module action through the daemon.
+
+        Args:
+            module: Module name
+            action: Action name
+            **kwargs: Action parameters (must be JSON-serialisable)
+
+        Returns:
+            Dict[str, Any]: APIResponse dictionary, identical to in-process output
+
+        Raises:
+            DaemonUnavailableError: If no daemon is listening
+            ConnectionError: If the daemon dropped the connection mid-request
+        """
+        return self._request({
+            "op": "execute",
+            "module": module,
+            "action": action,
+            "params": kwargs
+        })
+
+    def subscribe(self, topic: str = "status") -> Iterator[Dict[str, Any]]:
+        """Subscribe to a daemon stream.
+
+        The connection is opened and the subscription confirmed before this
+        returns, so an unavailable daemon is reported right away. Heartbeats
+        are consumed here; closing the iterator closes the connection.
+
+        Args:
+            topic: Stream topic (only "status")
+
+        Returns:
+            Iterator of stream messages, starting with a snapshot
+
+        Raises:
+            DaemonUnavailableError: If no daemon is listening
+            ValueError: If the daemon refused the subscription
+            ConnectionError: If the daemon stopped answering while subscribed
+        """
+        sock = self._connect()
+        try:
+            # Heartbeats arrive every few seconds, so a long silence means a dead daemon
+            sock.settimeout(HEARTBEAT_INTERVAL * 3)
+            stream = sock.makefile("rwb")
+            stream.write(json.dumps({"op": "subscribe", "topic": topic}).encode("utf-8") + b"\n")
+            stream.flush()
+            line = stream.readline()
+            if not line:
+                raise ConnectionError("Daemon closed the connection without a response")
+            response = json.loads(line)
+            if not response.get("success"):
+                raise ValueError(response.get("error") or "Subscription refused")
+        except BaseException:
+            sock.close()
+            raise
+        return self._iter_messages(sock, stream)
+
+    @staticmethod
+    def _iter_messages(sock: socket.socket, stream) -> Iterator[Dict[str, Any]]:
+        try:
+            while True:
+                try:
+                    line = stream.readline()
+                except socket.timeout:
+                    raise ConnectionError("Daemon stopped sending status updates")
+                if not line:
+                    return
+                message = json.loads(line)
+                if message.get("type") != "heartbeat":
+                    yield message
+        finally:
+            stream.close()
+            sock.close()
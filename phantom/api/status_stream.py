@@ -0,0 +1,453 @@
+"""
+██████╗ ██╗  ██╗ █████╗ ███╗   ██╗████████╗ ██████╗ ███╗   ███╗
+██╔══██╗██║  ██║██╔══██╗████╗  ██║╚══██╔══╝██╔═══██╗████╗ ████║
+██████╔╝███████║███████║██╔██╗ ██║   ██║   ██║   ██║██╔████╔██║
+██╔═══╝ ██╔══██║██╔══██║██║╚██╗██║   ██║   ██║   ██║██║╚██╔╝██║
+██║     ██║  ██║██║  ██║██║ ╚████║   ██║   ╚██████╔╝██║ ╚═╝ ██║
+╚═╝     ╚═╝  ╚═╝╚═╝  ╚═╝╚═╝  ╚═══╝   ╚═╝    ╚═════╝ ╚═╝     ╚═╝
+
+TR: Canlı Durum Akışı - Tek örnekleyiciden abonelere artımlı durum değişiklikleri
+    ===========================================================================
+
+    Tek bir arka plan iş parçacığı core.status_snapshot eylemini (bir
+    'wg show dump' ve birkaç saniyede bir 'systemctl is-active') saniyenin
+    altında aralıklarla çalıştırır, ardışık örnekleri karşılaştırır ve
+    yalnızca değişiklikleri abonelere yayınlar. Abone sayısı ne olursa
+    olsun örnekleme maliyeti tektir; hiç abone yokken iş parçacığı durur.
+
+    Mesajlar:
+        - snapshot: Tam durum (abonelikte ve geride kalan abone için yeniden eşitlemede)
+        - delta:    Bir örnekten diğerine olaylar listesi
+        - error:    Örnekleme hatası (yalnızca hata mesajı değiştiğinde)
+
+    Olaylar:
+        interface, service, peer_added, peer_removed, peer_connected,
+        peer_disconnected, peer_updated, transfer
+
+    Yavaş abone kuyruğu dolduğunda kuyruk boşaltılır ve abone bir sonraki
+    okumada yeni bir snapshot alır; örnekleyici hiçbir zaman aboneyi beklemez.
+
+EN: Live Status Stream - Incremental status changes from one sampler to all subscribers
+    ===========================================================================
+
+    A single background thread runs the core.status_snapshot action (one
+    'wg show dump' and, every few seconds, one 'systemctl is-active') at a
+    sub-second interval, compares consecutive samples and publishes only
+    the changes to subscribers. The sampling cost is paid once however many
+    subscribers there are; the thread stops while nobody is subscribed.
+
+    Messages:
+        - snapshot: Full status (on subscribe and when a lagging subscriber resyncs)
+        - delta:    List of events from one sample to the next
+        - error:    Sampling failure (only when the error message changes)
+
+    Events:
+        interface, service, peer_added, peer_removed, peer_connected,
+        peer_disconnected, peer_updated, transfer
+
+    When a slow subscriber's queue fills up, the queue is dropped and the
+    subscriber receives a fresh snapshot on its next read; the sampler never
+    waits for a subscriber.
+
+Usage Examples:
+    stream = StatusStream(sample)
+    with stream.subscribe() as subscription:
+        status = None
+        for message in subscription:
+            if message["type"] == "snapshot":
+                status = message["status"]
+            elif message["type"] == "delta":
+                apply_status_delta(status, message["events"])
+
+Copyright (c) 2025 Rıza Emre ARAS <r.emrearas@proton.me>
+Licensed under AGPL-3.0 - see LICENSE file for details
+Third-party licenses - see THIRD_PARTY_LICENSES file for details
+WireGuard® is a registered trademark of Jason A. Donenfeld.
+"""
+import copy
+import time
+import queue
+import logging
+import threading
+from typing import Any, Callable, Dict, Iterator, List, Optional, Set
+
+# Seconds between two samples while at least one subscriber is connected
+DEFAULT_SAMPLE_INTERVAL = 0.5
+
+# Seconds between two service state checks (interface changes force one sooner)
+SERVICE_CHECK_INTERVAL = 5.0
+
+# Messages buffered per subscriber before it is resynced with a snapshot
+SUBSCRIBER_QUEUE_SIZE = 256
+
+# Peer fields reported by peer_updated events
+PEER_FIELDS = ("client", "allowed_ips", "endpoint", "latest_handshake_epoch")
+
+# Queue markers
+_WAKE = object()
+_CLOSED = object()
+
+
+def _rate(previous: int, current: int, elapsed: float) -> int:
+    """Bytes per second between two counter readings; a reset counts from zero."""
+    if elapsed <= 0:
+        return 0
+    delta = current - previous if current >= previous else current
+    return int(delta / elapsed)
+
+
+def annotate_rates(previous: Optional[Dict[str, Any]], current: Dict[str, Any]) -> None:
+    """Add rx_rate/tx_rate (bytes per second) to every peer of current."""
+    old_peers = previous["peers"] if previous else {}
+    elapsed = current["read_at"] - previous["read_at"] if previous else 0
+    for key, peer in current["peers"].items():
+        old = old_peers.get(key)
+        if old is None:
+            peer["rx_rate"] = peer["tx_rate"] = 0
+        else:
+            peer["rx_rate"] = _rate(old["rx"], peer["rx"], elapsed)
+            peer["tx_rate"] = _rate(old["tx"], peer["tx"], elapsed)
+
+
+def diff_status(previous: Dict[str, Any], current: Dict[str, Any]) -> List[Dict[str, Any]]:
+    """List the events that turn the previous status into the current one.
+
+    Args:
+        previous: Earlier status sample
+        current: Later status sample
+
+    Returns:
+        Events in a stable order, empty if nothing changed
+    """
+    events: List[Dict[str, Any]] = []
+
+    if previous["interface"] != current["interface"]:
+        events.append({"event": "interface", **current["interface"]})
+    if current.get("service") is not None and previous.get("service") != current["service"]:
+        events.append({"event": "service", **current["service"]})
+
+    old_peers, new_peers = previous["peers"], current["peers"]
+    for key in sorted(old_peers.keys() - new_peers.keys()):
+        events.append({"event": "peer_removed", "public_key": key, "client": old_peers[key].get("client")})
+
+    for key, peer in new_peers.items():
+        old = old_peers.get(key)
+        if old is None:
+            events.append({"event": "peer_added", "public_key": key, "peer": peer})
+            continue
+
+        if peer["connected"] != old["connected"]:
+            events.append({
+                "event": "peer_connected" if peer["connected"] else "peer_disconnected",
+                "public_key": key,
+                "client": peer.get("client"),
+                "endpoint": peer.get("endpoint")
+            })
+
+        changes = {name: peer.get(name) for name in PEER_FIELDS if peer.get(name) != old.get(name)}
+        if changes:
+            events.append({"event": "peer_updated", "public_key": key, "changes": changes})
+
+        transfer = ("rx", "tx", "rx_rate", "tx_rate")
+        if any(peer.get(name) != old.get(name) for name in transfer):
+            events.append({
+                "event": "transfer",
+                "public_key": key,
+                "client": peer.get("client"),
+                **{name: peer.get(name, 0) for name in transfer}
+            })
+
+    return events
+
+
+def apply_status_delta(status: Dict[str, Any], events: List[Dict[str, Any]]) -> Dict[str, Any]:
+    """Apply delta events to a status snapshot in place.
+
+    Args:
+        status: Status from a snapshot message
+        events: Events from the following delta messages, in order
+
+    Returns:
+        The updated status (same object)
+    """
+    peers = status["peers"]
+    for event in events:
+        kind = event["event"]
+        key = event.get("public_key")
+        if kind == "interface":
+            status["interface"] = {name: value for name, value in event.items() if name != "event"}
+        elif kind == "service":
+            status["service"] = {"running": event["running"]}
+        elif kind == "peer_added":
+            peers[key] = dict(event["peer"])
+        elif kind == "peer_removed":
+            peers.pop(key, None)
+        elif key in peers:
+            peer = peers[key]
+            if kind in ("peer_connected", "peer_disconnected"):
+                peer["connected"] = kind == "peer_connected"
+                peer["endpoint"] = event.get("endpoint")
+            elif kind == "peer_updated":
+                peer.update(event["changes"])
+            elif kind == "transfer":
+                for name in ("rx", "tx", "rx_rate", "tx_rate"):
+                    peer[name] = event[name]
+    return status
+
+
+class StatusSubscription:
+    """One subscriber's view of a StatusStream.
+
+    The first message is always a snapshot. Iterating blocks until the next
+    message and ends when the subscription or the stream is closed.
+    """
+
+    def __init__(self, stream: 'StatusStream', queue_size: int):
+        self._stream = stream
+        self._queue: queue.Queue = queue.Queue(maxsize=queue_size)
+        self._resync = True
+        self.closed = False
+        self.resyncs = 0
+
+    def _put(self, message: Dict[str, Any]) -> None:
+        """Queue a message; called by the stream with its lock held."""
+        if self._resync and message["type"] == "delta":
+            # The next snapshot already includes this delta, just wake the reader
+            if self._queue.empty():
+                self._queue.put_nowait(_WAKE)
+            return
+        try:
+            self._queue.put_nowait(message)
+        except queue.Full:
+            self._drain()
+            self._resync = True
+            self.resyncs += 1
+            self._queue.put_nowait(_WAKE)
+
+    def _drain(self) -> None:
+        while True:
+            try:
+                self._queue.get_nowait()
+            except queue.Empty:
+                return
+
+    def _wake_closed(self) -> None:
+        self.closed = True
+        self._drain()
+        self._queue.put_nowait(_CLOSED)
+
+    def get(self, timeout: Optional[float] = None) -> Optional[Dict[str, Any]]:
+        """Return the next message.
+
+        Args:
+            timeout: Seconds to wait (None waits indefinitely)
+
+        Returns:
+            Next message, or None on timeout or when closed
+        """
+        while not self.closed:
+            if self._resync:
+                snapshot = self._stream._take_snapshot(self)
+                if snapshot is not None:
+                    return snapshot
+            try:
+                message = self._queue.get(timeout=timeout)
+            except queue.Empty:
+                return None
+            if message is _WAKE:
+                continue
+            if message is _CLOSED:
+                break
+            return message
+        return None
+
+    def close(self) -> None:
+        """Stop receiving messages; the sampler stops with the last subscriber."""
+        self._stream.unsubscribe(self)
+
+    def __iter__(self) -> Iterator[Dict[str, Any]]:
+        while True:
+            message = self.get()
+            if message is None:
+                return
+            yield message
+
+    def __enter__(self) -> 'StatusSubscription':
+        return self
+
+    def __exit__(self, *exc_info) -> None:
+        self.close()
+
+
+class StatusStream:
+    """Shared status sampler publishing deltas to any number of subscribers.
+
+    Attributes:
+        interval: Seconds between samples
+        service_interval: Seconds between service state checks
+        samples_taken: Number of successful samples
+    """
+
+    def __init__(self, sample: Callable[[bool], Dict[str, Any]],
+                 interval: float = DEFAULT_SAMPLE_INTERVAL,
+                 service_interval: float = SERVICE_CHECK_INTERVAL,
+                 queue_size: int = SUBSCRIBER_QUEUE_SIZE,
+                 clock: Callable[[], float] = time.monotonic):
+        """Initialize the stream without starting the sampler.
+
+        Args:
+            sample: Callable taking include_service and returning a
+                core.status_snapshot dictionary; may raise on failure
+            interval: Seconds between samples
+            service_interval: Seconds between service state checks
+            queue_size: Messages buffered per subscriber
+            clock: Monotonic clock, replaceable in tests
+        """
+        self.interval = interval
+        self.service_interval = service_interval
+        self.samples_taken = 0
+        self.logger = logging.getLogger("phantom.api.status_stream")
+
+        self._sample = sample
+        self._queue_size = queue_size
+        self._clock = clock
+
+        self._lock = threading.Lock()          # subscribers, status and sequence
+        self._sample_lock = threading.Lock()   # one sample at a time
+        self._subscribers: Set[StatusSubscription] = set()
+        self._status: Optional[Dict[str, Any]] = None
+        self._seq = 0
+        self._error: Optional[str] = None
+        self._service_checked_at: Optional[float] = None
+        self._force_service = False
+
+        self._thread: Optional[threading.Thread] = None
+        self._stop = threading.Event()
+        self._closed = False
+
+    @property
+    def subscribers(self) -> int:
+        with self._lock:
+            return len(self._subscribers)
+
+    @property
+    def running(self) -> bool:
+        thread = self._thread
+        return thread is not None and thread.is_alive()
+
+    # Subscriptions
+
+    def subscribe(self, start: bool = True) -> StatusSubscription:
+        """Register a subscriber and start the sampler if it is idle.
+
+        Args:
+            start: Start the background thread; tests drive sample_once() instead
+
+        Returns:
+            StatusSubscription whose first message is a snapshot
+        """
+        subscription = StatusSubscription(self, self._queue_size)
+        with self._lock:
+            if self._closed:
+                subscription.closed = True
+                return subscription
+            self._subscribers.add(subscription)
+            idle = self._thread is None
+            thread = None
+            if idle and start:
+                thread = threading.Thread(target=self._run, name="phantom-status-sampler", daemon=True)
+                self._thread = thread
+
+        if idle:
+            # Prime with a fresh sample so the first snapshot is not stale
+            self.sample_once()
+        if thread is not None:
+            thread.start()
+        return subscription
+
+    def unsubscribe(self, subscription: StatusSubscription) -> None:
+        with self._lock:
+            self._subscribers.discard(subscription)
+            subscription._wake_closed()
+
+    def _take_snapshot(self, subscription: StatusSubscription) -> Optional[Dict[str, Any]]:
+        """Build a snapshot message and clear the subscriber's resync flag."""
+        with self._lock:
+            if self._status is None:
+                return None
+            subscription._resync = False
+            return {"type": "snapshot", "seq": self._seq, "status": copy.deepcopy(self._status)}
+
+    # Sampling
+
+    def sample_once(self) -> List[Dict[str, Any]]:
+        """Take one sample and publish the changes.
+
+        Returns:
+            Events published by this sample (empty for the first one)
+        """
+        with self._sample_lock:
+            now = self._clock()
+            include_service = (self._force_service or self._service_checked_at is None
+                               or now - self._service_checked_at >= self.service_interval)
+            try:
+                current = self._sample(include_service)
+            except Exception as e:
+                self._publish_error(str(e) or type(e).__name__)
+                return []
+
+            self.samples_taken += 1
+            if include_service:
+                self._service_checked_at = now
+
+            previous = self._status
+            if current.get("service") is None and previous is not None:
+                current["service"] = previous.get("service")
+            annotate_rates(previous, current)
+            events = diff_status(previous, current) if previous is not None else []
+
+            # An interface going up or down usually means the service changed too
+            self._force_service = not include_service and any(e["event"] == "interface" for e in events)
+
+            with self._lock:
+                self._status = current
+                self._error = None
+                if events:
+                    self._seq += 1
+                    message = {"type": "delta", "seq": self._seq, "read_at": current["read_at"], "events": events}
+                    for subscription in self._subscribers:
+                        subscription._put(message)
+            return events
+
+    def _publish_error(self, error: str) -> None:
+        with self._lock:
+            if error == self._error:
+                return
+            self._error = error
+            self.logger.warning(f"Status sample failed: {error}")
+            message = {"type": "error", "seq": self._seq, "error": error}
+            for subscription in self._subscribers:
+                subscription._put(message)
+
+    def _run(self) -> None:
+        while not self._stop.wait(self.interval):
+            with self._lock:
+                if not self._subscribers:
+                    self._thread = None
+                    return
+            self.sample_once()
+        with self._lock:
+            self._thread = None
+
+    def close(self) -> None:
+        """Stop the sampler and end every subscription."""
+        with self._lock:
+            self._closed = True
+            self._stop.set()
+            subscriptions = list(self._subscribers)
+            self._subscribers.clear()
+            thread = self._thread
+            for subscription in subscriptions:
+                subscription._wake_closed()
+        if thread is not None and thread.is_alive() and thread is not threading.current_thread():
+            thread.join(timeout=self.interval + 5)
@@ -0,0 +1,73 @@
+"""
+██████╗ ██╗  ██╗ █████╗ ███╗   ██╗████████╗ ██████╗ ███╗   ███╗
+██╔══██╗██║  ██║██╔══██╗████╗  ██║╚══██╔══╝██╔═══██╗████╗ ████║
+██████╔╝███████║███████║██╔██╗ ██║   ██║   ██║   ██║██╔████╔██║
+██╔═══╝ ██╔══██║██╔══██║██║╚██╗██║   ██║   ██║   ██║██║╚██╔╝██║
+██║     ██║  ██║██║  ██║██║ ╚████║   ██║   ╚██████╔╝██║ ╚═╝ ██║
+╚═╝     ╚═╝  ╚═╝╚═╝  ╚═╝╚═╝  ╚═══╝   ╚═╝    ╚═════╝ ╚═╝     ╚═╝
+
+PhantomAPI Startup Benchmark - import of phantom.api plus PhantomAPI() in a fresh interpreter
+
+Usage:
+    python -m phantom.api.tests.benchmarks.bench_startup [--runs N] [--budget-ms MS]
+
+With --budget-ms the exit status is 1 when the median exceeds the budget.
+
+Copyright (c) 2025 Rıza Emre ARAS <r.emrearas@proton.me>
+Licensed under AGPL-3.0 - see LICENSE file for details
+Third-party licenses - see THIRD_PARTY_LICENSES file for details
+WireGuard® is a registered trademark of Jason A. Donenfeld.
+"""
+
+import argparse
+import json
+import statistics
+import subprocess
+import sys
+import tempfile
+from pathlib import Path
+
+REPO_ROOT = Path(__file__).resolve().parents[4]
+
+PROBE = """
+import sys, time
+from pathlib import Path
+started = time.perf_counter()
+from phantom.api.core import PhantomAPI
+PhantomAPI(install_dir=Path(sys.argv[1]))
+print((time.perf_counter() - started) * 1000)
+"""
+
+
+def measure(install_dir: Path) -> float:
+    result = subprocess.run(
+        [sys.executable, "-c", PROBE, str(install_dir)],
+        capture_output=True, text=True, check=True, cwd=str(REPO_ROOT),
+        env={"PYTHONPATH": str(REPO_ROOT), "PATH": "/usr/bin:/bin"}
+    )
+    return float(result.stdout.strip().splitlines()[-1])
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark PhantomAPI startup")
+    parser.add_argument("--runs", type=int, default=10, help="Fresh interpreters to measure")
+    parser.add_argument("--budget-ms", type=float, default=None, help="Fail when the median exceeds this")
+    args = parser.parse_args()
+
+    with tempfile.TemporaryDirectory() as tmp:
+        install_dir = Path(tmp)
+        (install_dir / "phantom").symlink_to(REPO_ROOT / "phantom")
+        (install_dir / "config").mkdir()
+        (install_dir / "config" / "phantom.json").write_text(json.dumps({"wireguard": {"network": "10.8.0.0/24"}}))
+        samples = [measure(install_dir) for _ in range(args.runs)]
+
+    median = statistics.median(samples)
+    print(f"startup: median {median:.1f} ms, min {min(samples):.1f} ms, max {max(samples):.1f} ms ({args.runs} runs)")
+
+    if args.budget_ms is not None and median > args.budget_ms:
+        print(f"over budget: {median:.1f} ms > {args.budget_ms:.1f} ms")
+        sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,104 @@
+"""
+██████╗ ██╗  ██╗ █████╗ ███╗   ██╗████████╗ ██████╗ ███╗   ███╗
+██╔══██╗██║  ██║██╔══██╗████╗  ██║╚══██╔══╝██╔═══██╗████╗ ████║
+██████╔╝███████║███████║██╔██╗ ██║   ██║   ██║   ██║██╔████╔██║
+██╔═══╝ ██╔══██║██╔══██║██║╚██╗██║   ██║   ██║   ██║██║╚██╔╝██║
+██║     ██║  ██║██║  ██║██║ ╚████║   ██║   ╚██████╔╝██║ ╚═╝ ██║
+╚═╝     ╚═╝  ╚═╝╚═╝  ╚═╝╚═╝  ╚═══╝   ╚═╝    ╚═════╝ ╚═╝     ╚═╝
+
+PhantomAPI Lazy Startup Tests
+
+Each scenario runs in a fresh interpreter so that modules imported by
+other tests do not hide eager imports. Startup time is measured by
+tests/benchmarks/bench_startup.py, not here.
+
+Copyright (c) 2025 Rıza Emre ARAS <r.emrearas@proton.me>
+Licensed under AGPL-3.0 - see LICENSE file for details
+Third-party licenses - see THIRD_PARTY_LICENSES file for details
+WireGuard® is a registered trademark of Jason A. Donenfeld.
+"""
+
+import json
+import subprocess
+import sys
+from pathlib import Path
+
+import pytest
+
+REPO_ROOT = Path(__file__).resolve().parents[4]
+
+PROBE = """
+import json, sys
+from pathlib import Path
+from phantom.api.core import PhantomAPI
+
+def loaded_modules():
+    return sorted(m for m in sys.modules if m.endswith(".module") and m.startswith("phantom.modules."))
+
+api = PhantomAPI(install_dir=Path(sys.argv[1]))
+before = loaded_modules()
+response = api.execute(sys.argv[2], sys.argv[3]) if len(sys.argv) > 3 else None
+print(json.dumps({
+    "imported_before": before,
+    "imported_after": loaded_modules(),
+    "available": api.available_modules,
+    "instantiated": list(api._modules),
+    "success": response.success if response else None
+}))
+"""
+
+
+def run_probe(install_dir: Path, *args: str) -> dict:
+    result = subprocess.run(
+        [sys.executable, "-c", PROBE, str(install_dir), *args],
+        capture_output=True, text=True, cwd=str(REPO_ROOT),
+        env={"PYTHONPATH": str(REPO_ROOT), "PATH": "/usr/bin:/bin"}
+    )
+    assert result.returncode == 0, result.stderr
+    return json.loads(result.stdout.strip().splitlines()[-1])
+
+
+@pytest.fixture
+def install_dir(tmp_path):
+    (tmp_path / "phantom").symlink_to(REPO_ROOT / "phantom")
+    (tmp_path / "config").mkdir()
+    (tmp_path / "config" / "phantom.json").write_text(json.dumps({
+        "wireguard": {"network": "10.8.0.0/24"},
+        "dns": {"primary": "1.1.1.1", "secondary": "9.9.9.9"}
+    }))
+    return tmp_path
+
+
+class TestLazyStartup:
+
+    @pytest.mark.integration
+    def test_construction_imports_no_module(self, install_dir):
+        """Test that PhantomAPI() only discovers modules and imports none of them."""
+        probe = run_probe(install_dir)
+
+        assert probe["imported_before"] == []
+        assert probe["instantiated"] == []
+        assert probe["available"] == ["core", "dns", "ghost", "multihop"]
+
+    @pytest.mark.integration
+    def test_first_call_loads_only_its_module(self, install_dir):
+        """Test that a DNS request imports and builds the DNS module only."""
+        probe = run_probe(install_dir, "dns", "get_dns_servers")
+
+        assert probe["success"] is True
+        assert probe["imported_before"] == []
+        assert probe["imported_after"] == ["phantom.modules.dns.module"]
+        assert probe["instantiated"] == ["dns"]
+
+    @pytest.mark.integration
+    def test_profile_startup_reports_every_module(self, install_dir):
+        """Test that profile_startup loads all modules and times each one."""
+        from phantom.api.core import PhantomAPI
+
+        data = PhantomAPI(install_dir=install_dir).profile_startup().data
+
+        assert [m["name"] for m in data["modules"]] == ["core", "dns", "ghost", "multihop"]
+        for module in data["modules"]:
+            assert "error" not in module
+            assert module["total_ms"] == pytest.approx(module["import_ms"] + module["init_ms"], abs=0.01)
+        assert data["total_ms"] >= data["discovery_ms"]
@@ -174,10 +174,11 @@ class TestPhantomAPI:
 
                     mock_iterdir.return_value = [mock_core, mock_dns, mock_file]
 
-                    _ = PhantomAPI()
+                    api = PhantomAPI()
 
-                    # Only directories with module.py should be loaded
-                    assert mock_load_module.call_count == 2
+                    # Only directories with module.py are registered, nothing is imported yet
+                    assert api.available_modules == ["core", "dns"]
+                    mock_load_module.assert_not_called()
 
     @patch('phantom.api.core.PhantomAPI._detect_install_dir')
     @patch('phantom.api.core.PhantomAPI._setup_logger')
@@ -626,10 +627,16 @@ class TestPhantomAPI:
                     mock_iterdir.return_value = [mock_module]
 
                     with patch.object(PhantomAPI, '_load_module', side_effect=Exception("Load error")):
-                        _ = PhantomAPI()
+                        api = PhantomAPI()
+                        mock_logger.error.assert_not_called()
+
+                        # The failure surfaces on first use and does not break listing
+                        result = api.list_modules()
 
+                        assert result.data["modules"] == []
                         mock_logger.error.assert_called()
                         assert "Failed to load module 'bad_module'" in str(mock_logger.error.call_args)
+                        assert api.execute("bad_module", "status").code == "MODULE_NOT_FOUND"
 
     @patch('phantom.api.core.PhantomAPI._detect_install_dir')
     @patch('phantom.api.core.PhantomAPI._setup_logger')
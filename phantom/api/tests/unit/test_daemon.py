@@ -0,0 +1,349 @@
+"""
+██████╗ ██╗  ██╗ █████╗ ███╗   ██╗████████╗ ██████╗ ███╗   ███╗
+██╔══██╗██║  ██║██╔══██╗████╗  ██║╚══██╔══╝██╔═══██╗████╗ ████║
+██████╔╝███████║███████║██╔██╗ ██║   ██║   ██║   ██║██╔████╔██║
+██╔═══╝ ██╔══██║██╔══██║██║╚██╗██║   ██║   ██║   ██║██║╚██╔╝██║
+██║     ██║  ██║██║  ██║██║ ╚████║   ██║   ╚██████╔╝██║ ╚═╝ ██║
+╚═╝     ╚═╝  ╚═╝╚═╝  ╚═╝╚═╝  ╚═══╝   ╚═╝    ╚═════╝ ╚═╝     ╚═╝
+
+Unit tests for phantom.api.daemon module
+
+Copyright (c) 2025 Rıza Emre ARAS <r.emrearas@proton.me>
+Licensed under AGPL-3.0 - see LICENSE file for details
+Third-party licenses - see THIRD_PARTY_LICENSES file for details
+WireGuard® is a registered trademark of Jason A. Donenfeld.
+"""
+
+import os
+import json
+import shutil
+import socket
+import tempfile
+import threading
+import time
+from pathlib import Path
+from unittest.mock import Mock
+
+import pytest
+
+from phantom.api.daemon import (
+    PhantomDaemon, DaemonClient, DaemonUnavailableError, get_socket_path,
+    SOCKET_PATH_ENV, DEFAULT_SOCKET_PATH
+)
+from phantom.api.response import APIResponse
+from phantom.modules.config_service import get_config_service
+
+
+def _make_api():
+    api = Mock()
+    api.install_dir = None
+    api.execute.side_effect = lambda module, action, **kwargs: APIResponse.success_response(
+        data={"module": module, "action": action, "params": kwargs}
+    )
+    return api
+
+
+@pytest.fixture
+def socket_dir():
+    # AF_UNIX paths are limited to ~108 bytes, so keep them short
+    path = Path(tempfile.mkdtemp(prefix="phd-"))
+    yield path
+    shutil.rmtree(path, ignore_errors=True)
+
+
+@pytest.fixture
+def running_daemon(socket_dir):
+    factory = Mock(side_effect=lambda *args: _make_api())
+    daemon = PhantomDaemon(socket_path=str(socket_dir / "api.sock"), api_factory=factory)
+    daemon.start()
+    thread = threading.Thread(target=daemon.serve_forever, daemon=True)
+    thread.start()
+    yield daemon, factory
+    daemon.shutdown()
+    thread.join(timeout=5)
+
+
+class TestSocketPath:
+
+    def test_explicit_path_wins(self, monkeypatch):
+        monkeypatch.setenv(SOCKET_PATH_ENV, "/tmp/from-env.sock")
+        assert get_socket_path("/tmp/explicit.sock") == Path("/tmp/explicit.sock")
+
+    def test_env_and_default(self, monkeypatch):
+        monkeypatch.setenv(SOCKET_PATH_ENV, "/tmp/from-env.sock")
+        assert get_socket_path() == Path("/tmp/from-env.sock")
+        monkeypatch.delenv(SOCKET_PATH_ENV)
+        assert get_socket_path() == Path(DEFAULT_SOCKET_PATH)
+
+
+class TestHandleRequest:
+
+    def test_execute_dispatches_to_api(self):
+        daemon = PhantomDaemon(socket_path="/tmp/unused.sock", api_factory=_make_api)
+
+        result = daemon.handle_request({
+            "module": "core", "action": "list_clients", "params": {"page": 2}
+        })
+
+        assert result["success"] is True
+        assert result["data"] == {"module": "core", "action": "list_clients", "params": {"page": 2}}
+        assert daemon.requests_served == 1
+
+    def test_api_instance_is_reused(self):
+        factory = Mock(side_effect=lambda *args: _make_api())
+        daemon = PhantomDaemon(socket_path="/tmp/unused.sock", api_factory=factory)
+
+        for _ in range(5):
+            daemon.handle_request({"module": "dns", "action": "get_dns_servers"})
+
+        assert factory.call_count == 1
+
+    def test_config_change_refreshes_warm_api(self, tmp_path):
+        """Test that an external edit reaches subscribed modules without rebuilding the API."""
+        config_dir = tmp_path / "config"
+        config_dir.mkdir()
+        config_file = config_dir / "phantom.json"
+        config_file.write_text(json.dumps({"version": 1}))
+        service = get_config_service(config_file)
+        service.snapshot()
+        published = []
+
+        def on_change(snapshot, source):
+            published.append((snapshot, source))
+
+        service.subscribe(on_change)
+
+        factory = Mock(side_effect=lambda *args: _make_api())
+        daemon = PhantomDaemon(socket_path="/tmp/unused.sock", install_dir=tmp_path, api_factory=factory)
+
+        daemon.handle_request({"module": "core", "action": "server_status"})
+        service.save({"version": 2}, source="core")
+        daemon.handle_request({"module": "core", "action": "server_status"})
+        assert published == [({"version": 2}, "core")]
+
+        config_file.write_text(json.dumps({"version": 3, "changed": True}))
+        daemon.handle_request({"module": "core", "action": "server_status"})
+
+        assert factory.call_count == 1
+        assert published[-1] == ({"version": 3, "changed": True}, None)
+
+    def test_ping(self):
+        daemon = PhantomDaemon(socket_path="/tmp/unused.sock", api_factory=_make_api)
+        result = daemon.handle_request({"op": "ping"})
+
+        assert result["success"] is True
+        assert result["data"]["pid"] == os.getpid()
+
+    @pytest.mark.parametrize("request_obj", [
+        [],
+        {"op": "shutdown"},
+        {"module": "core"},
+        {"module": "core", "action": "list_clients", "params": ["x"]},
+    ])
+    def test_invalid_requests(self, request_obj):
+        daemon = PhantomDaemon(socket_path="/tmp/unused.sock", api_factory=_make_api)
+        result = daemon.handle_request(request_obj)
+
+        assert result["success"] is False
+        assert result["code"] == "INVALID_REQUEST"
+
+    def test_unexpected_error_drops_instance(self):
+        broken = Mock()
+        broken.install_dir = None
+        broken.execute.side_effect = RuntimeError("boom")
+        factory = Mock(side_effect=[broken, _make_api()])
+        daemon = PhantomDaemon(socket_path="/tmp/unused.sock", api_factory=factory)
+
+        first = daemon.handle_request({"module": "core", "action": "list_clients"})
+        second = daemon.handle_request({"module": "core", "action": "list_clients"})
+
+        assert first["code"] == "INTERNAL_ERROR"
+        assert second["success"] is True
+        assert factory.call_count == 2
+
+
+class TestDaemonRoundTrip:
+
+    def test_client_execute(self, running_daemon):
+        daemon, _ = running_daemon
+        client = DaemonClient(socket_path=str(daemon.socket_path))
+
+        result = client.execute("core", "add_client", client_name="alice")
+
+        assert result["success"] is True
+        assert result["data"]["params"] == {"client_name": "alice"}
+
+    def test_socket_permissions(self, running_daemon):
+        daemon, _ = running_daemon
+        assert (daemon.socket_path.stat().st_mode & 0o777) == 0o600
+
+    def test_is_available_and_warm_instance(self, running_daemon):
+        daemon, factory = running_daemon
+        client = DaemonClient(socket_path=str(daemon.socket_path))
+
+        assert client.is_available() is True
+        for _ in range(3):
+            client.execute("dns", "get_dns_servers")
+
+        # Modules are loaded once at start and reused
+        assert factory.call_count == 1
+
+    def test_malformed_line(self, running_daemon):
+        daemon, _ = running_daemon
+        sock = socket.socket(socket.AF_UNIX, socket.SOCK_STREAM)
+        sock.connect(str(daemon.socket_path))
+        with sock, sock.makefile("rwb") as stream:
+            stream.write(b"not json\n")
+            stream.flush()
+            response = json.loads(stream.readline())
+
+        assert response["success"] is False
+        assert response["code"] == "INVALID_REQUEST"
+
+    def test_second_daemon_refuses_live_socket(self, running_daemon):
+        daemon, _ = running_daemon
+        other = PhantomDaemon(socket_path=str(daemon.socket_path), api_factory=_make_api)
+
+        with pytest.raises(RuntimeError):
+            other.start()
+
+    def test_stale_socket_is_replaced(self, socket_dir):
+        path = socket_dir / "stale.sock"
+        stale = socket.socket(socket.AF_UNIX, socket.SOCK_STREAM)
+        stale.bind(str(path))
+        stale.close()
+
+        daemon = PhantomDaemon(socket_path=str(path), api_factory=_make_api)
+        daemon.start()
+        thread = threading.Thread(target=daemon.serve_forever, daemon=True)
+        thread.start()
+        try:
+            assert DaemonClient(socket_path=str(path)).is_available() is True
+        finally:
+            daemon.shutdown()
+            thread.join(timeout=5)
+
+        assert not path.exists()
+
+
+class TestStatusSubscription:
+
+    @pytest.fixture
+    def status_daemon(self, socket_dir):
+        peers = {"QUxJQ0U=": {"client": "alice", "allowed_ips": "10.8.0.2/32", "endpoint": None,
+                              "latest_handshake_epoch": 0, "connected": False, "rx": 0, "tx": 0}}
+
+        def sample_status(include_service):
+            return Mock(to_dict=Mock(return_value={
+                "interface": {"name": "wg_main", "active": True, "port": 51820},
+                "service": {"running": True} if include_service else None,
+                "peers": json.loads(json.dumps(peers)),
+                "read_at": time.time()
+            }))
+
+        def make_status_api(*_args):
+            api = _make_api()
+            sampler = api.get_module.return_value.create_status_sampler.return_value
+            sampler.sample_status.side_effect = sample_status
+            return api
+
+        daemon = PhantomDaemon(socket_path=str(socket_dir / "api.sock"), api_factory=make_status_api)
+        daemon.status_stream.interval = 0.02
+        daemon.start()
+        thread = threading.Thread(target=daemon.serve_forever, daemon=True)
+        thread.start()
+        yield daemon, peers
+        daemon.shutdown()
+        thread.join(timeout=5)
+
+    def test_snapshot_then_deltas(self, status_daemon):
+        daemon, peers = status_daemon
+        client = DaemonClient(socket_path=str(daemon.socket_path))
+
+        viewers = [client.subscribe("status"), client.subscribe("status")]
+        snapshots = [next(viewer) for viewer in viewers]
+        assert [s["type"] for s in snapshots] == ["snapshot", "snapshot"]
+        assert snapshots[0]["status"]["peers"]["QUxJQ0U="]["client"] == "alice"
+        assert client.ping()["data"]["subscribers"] == 2
+
+        peers["QUxJQ0U="].update(connected=True, latest_handshake_epoch=int(time.time()), rx=4096)
+        for viewer in viewers:
+            delta = next(viewer)
+            assert delta["type"] == "delta"
+            assert delta["events"][0] == {"event": "peer_connected", "public_key": "QUxJQ0U=",
+                                          "client": "alice", "endpoint": None}
+
+        # Both viewers were fed from the same samples of one sampler, outside the request path
+        sampler = daemon._api.get_module.return_value.create_status_sampler.return_value
+        assert sampler.sample_status.call_count - daemon.status_stream.samples_taken in (0, 1)
+        daemon._api.get_module.assert_called_once_with("core")
+        daemon._api.execute.assert_not_called()
+
+        for viewer in viewers:
+            viewer.close()
+        deadline = time.time() + 2
+        while daemon.status_stream.subscribers and time.time() < deadline:
+            time.sleep(0.02)
+        assert daemon.status_stream.subscribers == 0
+
+    def test_slow_sample_does_not_block_requests(self):
+        """Test that requests are served while a status sample waits on the kernel."""
+        sampling, release = threading.Event(), threading.Event()
+
+        def slow_sample(include_service):
+            sampling.set()
+            release.wait(5)
+            return Mock(to_dict=Mock(return_value={}))
+
+        def make_slow_api(*_args):
+            api = _make_api()
+            api.get_module.return_value.create_status_sampler.return_value.sample_status.side_effect = slow_sample
+            return api
+
+        daemon = PhantomDaemon(socket_path="/tmp/unused.sock", api_factory=make_slow_api)
+        sampler = threading.Thread(target=daemon._sample_status, args=(False,))
+        sampler.start()
+        try:
+            assert sampling.wait(5)
+            result = {}
+            request = threading.Thread(target=lambda: result.update(
+                daemon.handle_request({"module": "core", "action": "list_clients"})))
+            request.start()
+            request.join(timeout=2)
+            assert result.get("success") is True
+        finally:
+            release.set()
+            sampler.join(timeout=5)
+
+    def test_failed_sample_rebuilds_sampler(self):
+        """Test that a sampler that raised is replaced on the next sample."""
+        api = _make_api()
+        samplers = [Mock(), Mock()]
+        samplers[0].sample_status.side_effect = RuntimeError("wg not found")
+        samplers[1].sample_status.return_value.to_dict.return_value = {"peers": {}}
+        api.get_module.return_value.create_status_sampler.side_effect = samplers
+        daemon = PhantomDaemon(socket_path="/tmp/unused.sock", api_factory=lambda *args: api)
+
+        with pytest.raises(RuntimeError):
+            daemon._sample_status(True)
+        assert daemon._sample_status(True) == {"peers": {}}
+        assert daemon._sample_status(False) == {"peers": {}}
+        assert api.get_module.return_value.create_status_sampler.call_count == 2
+
+    def test_unknown_topic(self, status_daemon):
+        daemon, _ = status_daemon
+        client = DaemonClient(socket_path=str(daemon.socket_path))
+
+        with pytest.raises(ValueError):
+            client.subscribe("clients")
+        assert daemon.status_stream.samples_taken == 0
+
+
+class TestDaemonClientUnavailable:
+
+    def test_missing_socket_raises(self, socket_dir):
+        client = DaemonClient(socket_path=str(socket_dir / "missing.sock"))
+
+        with pytest.raises(DaemonUnavailableError):
+            client.execute("core", "list_clients")
+        assert client.is_available() is False
@@ -0,0 +1,215 @@
+"""
+██████╗ ██╗  ██╗ █████╗ ███╗   ██╗████████╗ ██████╗ ███╗   ███╗
+██╔══██╗██║  ██║██╔══██╗████╗  ██║╚══██╔══╝██╔═══██╗████╗ ████║
+██████╔╝███████║███████║██╔██╗ ██║   ██║   ██║   ██║██╔████╔██║
+██╔═══╝ ██╔══██║██╔══██║██║╚██╗██║   ██║   ██║   ██║██║╚██╔╝██║
+██║     ██║  ██║██║  ██║██║ ╚████║   ██║   ╚██████╔╝██║ ╚═╝ ██║
+╚═╝     ╚═╝  ╚═╝╚═╝  ╚═╝╚═╝  ╚═══╝   ╚═╝    ╚═════╝ ╚═╝     ╚═╝
+
+Unit tests for phantom.api.status_stream module
+
+Copyright (c) 2025 Rıza Emre ARAS <r.emrearas@proton.me>
+Licensed under AGPL-3.0 - see LICENSE file for details
+Third-party licenses - see THIRD_PARTY_LICENSES file for details
+WireGuard® is a registered trademark of Jason A. Donenfeld.
+"""
+
+import copy
+import time
+
+from phantom.api.status_stream import StatusStream, annotate_rates, apply_status_delta, diff_status
+
+
+def make_peer(client, connected=True, rx=0, tx=0, endpoint="203.0.113.5:40000"):
+    return {"client": client, "allowed_ips": "10.8.0.2/32", "endpoint": endpoint,
+            "latest_handshake_epoch": 1000 if connected else 0, "connected": connected, "rx": rx, "tx": tx}
+
+
+def make_status(peers, read_at=1000.0, active=True, running=True):
+    return {"interface": {"name": "wg_main", "active": active, "port": 51820 if active else None},
+            "service": None if running is None else {"running": running},
+            "peers": peers, "read_at": read_at}
+
+
+class FakeSource:
+    """Mutable status returned by the sample callable."""
+
+    def __init__(self):
+        self.peers = {"QUxJQ0U=": make_peer("alice", connected=False)}
+        self.active = True
+        self.read_at = 1000.0
+        self.calls = []
+        self.fail = None
+
+    def __call__(self, include_service):
+        self.calls.append(include_service)
+        if self.fail:
+            raise RuntimeError(self.fail)
+        self.read_at += 0.5
+        return make_status(copy.deepcopy(self.peers), self.read_at, self.active,
+                           running=self.active if include_service else None)
+
+
+class TestDiffStatus:
+
+    def test_connection_and_transfer_events(self):
+        previous = make_status({"a": make_peer("alice", connected=False), "b": make_peer("bob", rx=100)})
+        current = make_status({"a": make_peer("alice", rx=2000, tx=1000), "c": make_peer("carol")},
+                              read_at=1002.0, running=False)
+        annotate_rates(previous, current)
+
+        events = diff_status(previous, current)
+        kinds = [(event["event"], event.get("public_key")) for event in events]
+
+        assert kinds == [("service", None), ("peer_removed", "b"), ("peer_connected", "a"),
+                         ("peer_updated", "a"), ("transfer", "a"), ("peer_added", "c")]
+        transfer = events[4]
+        assert (transfer["rx"], transfer["rx_rate"], transfer["tx_rate"]) == (2000, 1000, 500)
+
+    def test_unchanged_status_has_no_events(self):
+        previous = make_status({"a": make_peer("alice", rx=10)})
+        current = make_status({"a": make_peer("alice", rx=10)}, read_at=1001.0)
+        annotate_rates(previous, current)
+        previous["peers"]["a"].update(rx_rate=0, tx_rate=0)
+
+        assert diff_status(previous, current) == []
+
+    def test_rate_drop_to_zero_is_published(self):
+        """Test that a peer going quiet is reported, so viewers do not keep a stale rate."""
+        previous = make_status({"a": dict(make_peer("alice", rx=10), rx_rate=50, tx_rate=0)})
+        current = make_status({"a": make_peer("alice", rx=10)}, read_at=1001.0)
+        annotate_rates(previous, current)
+
+        assert [event["event"] for event in diff_status(previous, current)] == ["transfer"]
+
+    def test_counter_reset_rate(self):
+        previous = make_status({"a": make_peer("alice", rx=5000)})
+        current = make_status({"a": make_peer("alice", rx=300)}, read_at=1001.0)
+        annotate_rates(previous, current)
+        assert current["peers"]["a"]["rx_rate"] == 300
+
+    def test_apply_delta_rebuilds_current(self):
+        previous = make_status({"a": make_peer("alice", connected=False), "b": make_peer("bob")})
+        current = make_status({"a": make_peer("alice", rx=7, endpoint="198.51.100.1:1"), "c": make_peer("carol")},
+                              read_at=1001.0, active=False, running=False)
+        annotate_rates(None, previous)
+        annotate_rates(previous, current)
+
+        rebuilt = apply_status_delta(copy.deepcopy(previous), diff_status(previous, current))
+
+        assert rebuilt["peers"] == current["peers"]
+        assert rebuilt["interface"] == current["interface"]
+        assert rebuilt["service"] == current["service"]
+
+
+class TestStatusStream:
+
+    def test_subscribers_share_one_sample(self):
+        source = FakeSource()
+        stream = StatusStream(source)
+        first = stream.subscribe(start=False)
+        second = stream.subscribe(start=False)
+        calls = len(source.calls)
+
+        assert first.get(timeout=0)["type"] == "snapshot"
+        assert second.get(timeout=0)["type"] == "snapshot"
+
+        source.peers["QUxJQ0U="] = make_peer("alice", rx=512)
+        stream.sample_once()
+
+        assert len(source.calls) == calls + 1
+        deltas = [first.get(timeout=0), second.get(timeout=0)]
+        assert deltas[0] == deltas[1]
+        assert [event["event"] for event in deltas[0]["events"]] == ["peer_connected", "peer_updated", "transfer"]
+
+        # Counters stopped: the rate falls to zero once, then nothing is sent
+        stream.sample_once()
+        assert first.get(timeout=0)["events"][0]["rx_rate"] == 0
+        stream.sample_once()
+        assert first.get(timeout=0) is None
+        stream.close()
+
+    def test_service_check_is_throttled(self):
+        source = FakeSource()
+        clock = {"now": 0.0}
+        stream = StatusStream(source, service_interval=5.0, clock=lambda: clock["now"])
+        subscription = stream.subscribe(start=False)
+        subscription.get(timeout=0)
+
+        for _ in range(3):
+            clock["now"] += 0.5
+            stream.sample_once()
+        assert source.calls == [True, False, False, False]
+
+        # Interface drop is seen at once; the service state follows on the next sample
+        source.active = False
+        stream.sample_once()
+        stream.sample_once()
+        assert source.calls[-2:] == [False, True]
+        events = [subscription.get(timeout=0)["events"] for _ in range(2)]
+        assert events[0][0]["event"] == "interface"
+        assert events[1] == [{"event": "service", "running": False}]
+
+        clock["now"] += 5.0
+        stream.sample_once()
+        assert source.calls[-1] is True
+        stream.close()
+
+    def test_slow_subscriber_resyncs_with_snapshot(self):
+        source = FakeSource()
+        stream = StatusStream(source, queue_size=2)
+        slow = stream.subscribe(start=False)
+        slow.get(timeout=0)
+
+        for rx in range(1, 6):
+            source.peers["QUxJQ0U="]["rx"] = rx
+            stream.sample_once()
+
+        message = slow.get(timeout=0)
+        assert message["type"] == "snapshot"
+        assert message["status"]["peers"]["QUxJQ0U="]["rx"] == 5
+        assert slow.resyncs == 1
+        assert slow.get(timeout=0) is None
+        stream.close()
+
+    def test_error_published_once(self):
+        source = FakeSource()
+        stream = StatusStream(source)
+        subscription = stream.subscribe(start=False)
+        subscription.get(timeout=0)
+
+        source.fail = "wg not found"
+        stream.sample_once()
+        stream.sample_once()
+
+        assert subscription.get(timeout=0) == {"type": "error", "seq": 0, "error": "wg not found"}
+        assert subscription.get(timeout=0) is None
+        stream.close()
+
+    def test_sampler_runs_only_while_subscribed(self):
+        source = FakeSource()
+        stream = StatusStream(source, interval=0.01)
+
+        subscription = stream.subscribe()
+        assert subscription.get(timeout=1)["type"] == "snapshot"
+        assert stream.running
+
+        source.peers["QUxJQ0U="] = make_peer("alice")
+        message = subscription.get(timeout=1)
+        assert message["events"][0]["event"] == "peer_connected"
+
+        subscription.close()
+        assert subscription.get(timeout=1) is None
+        deadline = time.monotonic() + 2
+        while stream.running and time.monotonic() < deadline:
+            time.sleep(0.01)
+        assert not stream.running
+        stream.close()
+
+    def test_close_ends_iteration(self):
+        stream = StatusStream(FakeSource())
+        subscription = stream.subscribe(start=False)
+        stream.close()
+
+        assert list(subscription) == []
+        assert stream.subscribe().closed
@@ -32,6 +32,12 @@ TR: Phantom-WG API Komut Satırı Arayüzü
         Tüm yanıtlar JSON formatında döndürülür ve başarı durumu,
         veri ve metadata bilgilerini içerir.
 
+    Daemon Modu:
+        phantom-api --daemon [--socket YOL]
+        Modülleri bellekte tutan arka plan servisini başlatır. Daemon
+        çalışıyorsa normal çağrılar Unix socket üzerinden ona iletilir,
+        çalışmıyorsa eylem süreç içinde çalıştırılır.
+
 EN: Phantom-WG API Command-Line Interface
     ==========================================
     
@@ -57,6 +63,17 @@ EN: Phantom-WG API Command-Line Interface
         All responses are returned in JSON format and include success status,
         data, and metadata information.
 
+    Daemon Mode:
+        phantom-api --daemon [--socket PATH]
+        Starts the background service that keeps modules loaded. When the
+        daemon is running, regular invocations are forwarded to it over a
+        Unix socket; otherwise the action is executed in-process.
+
+    Startup Profile:
+        phantom-api --profile-startup
+        Modules are imported on first use. This loads all of them in a fresh
+        process and prints the import and init time of each module.
+
 Copyright (c) 2025 Rıza Emre ARAS <r.emrearas@proton.me>
 Licensed under AGPL-3.0 - see LICENSE file for details
 Third-party licenses - see THIRD_PARTY_LICENSES file for details
@@ -65,6 +82,7 @@ WireGuard® is a registered trademark of Jason A. Donenfeld.
 import sys
 import os
 import json
+import time
 from textwrap import dedent
 
 # Add current directory to path to import path_helper
@@ -74,7 +92,7 @@ from path_helper import setup_phantom_path
 # Setup phantom module path
 setup_phantom_path()
 
-from phantom.api.core import PhantomAPI
+from phantom.api.daemon import DaemonClient, DaemonUnavailableError, NO_DAEMON_ENV
 
 
 def print_help():
@@ -147,6 +165,20 @@ def print_help():
                 }
             }
         
+        DAEMON MODE:
+            phantom-api --daemon [--socket PATH]
+                Keep modules loaded in a background process. Regular calls are
+                forwarded to it over a Unix socket and fall back to in-process
+                execution when it is not running.
+            phantom-api --no-daemon <module> <action> [parameters...]
+                Always execute in-process (same as PHANTOM_API_NO_DAEMON=1)
+            Default socket: /run/phantom-wg/phantom-api.sock (PHANTOM_API_SOCKET)
+        
+        STARTUP PROFILE:
+            phantom-api --profile-startup
+                Load every module in-process and report API, import and init
+                time per module (modules are otherwise loaded on first use)
+        
         NOTES:
             • Root privileges required for system changes
             • Backup before network configuration changes
@@ -168,7 +200,7 @@ def main():
         1. Komut satırı argümanlarını kontrol eder
         2. Modül ve eylem isimlerini çıkarır
         3. Parametreleri anahtar=değer formatından Python dict'e dönüştürür
-        4. PhantomAPI'yi başlatır ve eylemi çalıştırır
+        4. Eylemi daemon üzerinden veya süreç içinde çalıştırır
         5. Sonucu JSON formatında ekrana yazdırır
         
         Parametre Dönüşümü:
@@ -182,7 +214,7 @@ def main():
         1. Checks command-line arguments
         2. Extracts module and action names
         3. Converts parameters from key=value format to Python dict
-        4. Initializes PhantomAPI and executes the action
+        4. Executes the action through the daemon or in-process
         5. Prints the result in JSON format to screen
         
         Parameter Conversion:
@@ -195,18 +227,31 @@ def main():
         print_help()
         sys.exit(0)
 
-    if len(sys.argv) < 3:
+    argv = sys.argv[1:]
+
+    # Daemon mode: serve requests over the Unix socket until stopped
+    if argv and argv[0] == '--daemon':
+        run_daemon(argv[1:])
+        return
+
+    if argv and argv[0] == '--profile-startup':
+        print(json.dumps(profile_startup(), indent=2))
+        return
+
+    use_daemon = not os.environ.get(NO_DAEMON_ENV)
+    if argv and argv[0] == '--no-daemon':
+        use_daemon = False
+        argv = argv[1:]
+
+    if len(argv) < 2:
         print("Usage: phantom-api <module> <action> [args...]")
         print("Example: phantom-api core list_clients")
         print("\nFor detailed help, run: phantom-api --help")
         sys.exit(1)
 
-    module = sys.argv[1]
-    action = sys.argv[2]
-    args = sys.argv[3:]
-
-    # Initialize API
-    api = PhantomAPI()
+    module = argv[0]
+    action = argv[1]
+    args = argv[2:]
 
     # Parse arguments as key=value pairs
     kwargs = {}
@@ -221,8 +266,8 @@ def main():
 
     # Execute action
     try:
-        response = api.execute(module, action, **kwargs)
-        print(json.dumps(response.to_dict(), indent=2))
+        response = execute_action(module, action, kwargs, use_daemon)
+        print(json.dumps(response, indent=2))
     except Exception as e:
         print(json.dumps({
             "success": False,
@@ -232,5 +277,63 @@ def main():
         sys.exit(1)
 
 
+def execute_action(module, action, kwargs, use_daemon=True):
+    """
+    TR: Eylemi daemon üzerinden çalıştırır; daemon yoksa süreç içinde çalıştırır.
+        Daemon'a bağlanılamazsa istek hiç gönderilmemiş olur, bu yüzden
+        geri dönüş bir eylemi asla iki kez çalıştırmaz.
+
+    EN: Executes the action through the daemon, or in-process if it is not running.
+        If the daemon cannot be reached the request was never sent, so the
+        fallback never runs an action twice.
+    """
+    if use_daemon:
+        try:
+            return DaemonClient().execute(module, action, **kwargs)
+        except DaemonUnavailableError:
+            pass
+
+    from phantom.api.core import PhantomAPI
+    api = PhantomAPI()
+    return api.execute(module, action, **kwargs).to_dict()
+
+
+def profile_startup():
+    """
+    TR: API'nin ve her modülün import/başlatma süresini ölçer (her zaman süreç içinde).
+    EN: Measures the import and init time of the API and every module (always in-process).
+    """
+    started = time.perf_counter()
+    from phantom.api.core import PhantomAPI
+    imported = time.perf_counter()
+    api = PhantomAPI()
+    constructed = time.perf_counter()
+
+    response = api.profile_startup().to_dict()
+    response["data"]["api_import_ms"] = round((imported - started) * 1000, 3)
+    response["data"]["api_init_ms"] = round((constructed - imported) * 1000, 3)
+    return response
+
+
+def run_daemon(args):
+    """
+    TR: API daemon'unu ön planda başlatır (systemd tarafından kullanılır).
+    EN: Starts the API daemon in the foreground (used by systemd).
+    """
+    socket_path = None
+    if len(args) >= 2 and args[0] == '--socket':
+        socket_path = args[1]
+
+    import logging
+    from phantom.api.daemon import PhantomDaemon
+
+    logging.basicConfig(level=logging.INFO, format='%(asctime)s - %(name)s - %(levelname)s - %(message)s')
+    try:
+        PhantomDaemon(socket_path=socket_path).serve_forever()
+    except RuntimeError as e:
+        print(str(e), file=sys.stderr)
+        sys.exit(1)
+
+
 if __name__ == "__main__":
     main()
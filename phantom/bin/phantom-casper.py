@@ -22,6 +22,8 @@ TR: Casper - Ghost Mode Client Configuration Exporter
     
     Kullanım:
         phantom-casper [kullanıcı_adı]     # İstemci konfigürasyonunu görüntüle
+        phantom-casper --output DİZİN [ad|desen ...]
+                                           # Toplu dışa aktarım (dizin, .tar.gz veya .zip)
         phantom-casper --help              # Yardımı göster
 
 EN: Casper - Ghost Mode Client Configuration Exporter
@@ -39,6 +41,8 @@ EN: Casper - Ghost Mode Client Configuration Exporter
     
     Usage:
         phantom-casper [username]     # Display client configuration
+        phantom-casper --output DIR [name|pattern ...]
+                                      # Bulk export (directory, .tar.gz or .zip)
         phantom-casper --help         # Show help
 
 Copyright (c) 2025 Rıza Emre ARAS <r.emrearas@proton.me>
@@ -57,7 +61,7 @@ from path_helper import setup_phantom_path
 # Setup phantom module path
 setup_phantom_path()
 
-from phantom.casper.core import CasperService
+from phantom.casper.core import CasperService, BULK_EXPORT_WORKERS
 
 
 def show_help():
@@ -76,10 +80,13 @@ def show_help():
     print("=" * 45)
     print()
     print("Usage: phantom-casper [username]")
+    print("       phantom-casper --output PATH [--workers N] [name|pattern ...]")
     print()
     print("Examples:")
     print("  phantom-casper john-laptop    # Show config for john-laptop")
     print("  phantom-casper alice-phone    # Show config for alice-phone")
+    print("  phantom-casper --output ./ghost-configs                # Export all clients")
+    print("  phantom-casper --output ghost.tar.gz 'team-*' bob      # Export matching clients")
     print()
     print("Requirements:")
     print("  - Ghost Mode must be active")
@@ -89,6 +96,8 @@ def show_help():
     print("  - WireGuard configuration (ghost.conf)")
     print("  - Setup instructions")
     print("  - No files created - stdout only")
+    print("  - With --output: one <name>.conf per client plus manifest.json,")
+    print("    written to a directory, a .tar.gz or a .zip archive (0600)")
 
 
 def main():
@@ -113,9 +122,19 @@ def main():
 
     # Define command-line arguments
     parser.add_argument(
-        "username",
-        nargs="?",  # Optional positional argument
-        help="Client username to export configuration for"
+        "usernames",
+        nargs="*",
+        help="Client username(s) or glob patterns to export configuration for"
+    )
+    parser.add_argument(
+        "--output", "-o",
+        help="Bulk export target: directory, .tar.gz/.tgz or .zip path"
+    )
+    parser.add_argument(
+        "--workers",
+        type=int,
+        default=BULK_EXPORT_WORKERS,
+        help="Parallel workers for bulk export"
     )
     parser.add_argument(
         "--help", "-h",
@@ -127,17 +146,29 @@ def main():
     args = parser.parse_args()
 
     # Handle help request or missing username
-    if args.help or not args.username:
+    if args.help or (not args.usernames and not args.output):
         show_help()
         sys.exit(0)
 
+    if not args.output and len(args.usernames) > 1:
+        print("Error: exporting several clients requires --output")
+        sys.exit(1)
+
     # Initialize service and perform export
     try:
         # Create Casper service instance
         service = CasperService()
 
+        if args.output:
+            # Bulk export: API and Ghost state are loaded once for all clients
+            manifest = service.export_client_configs(args.usernames, args.output, workers=args.workers)
+            print(f"Exported {manifest['exported']} client configurations to {manifest['output']}")
+            for error in manifest["errors"]:
+                print(f"  Skipped {error['name']}: {error['error']}")
+            sys.exit(0 if manifest["exported"] else 1)
+
         # Export client configuration to stdout
-        service.export_client_config(args.username)
+        service.export_client_config(args.usernames[0])
 
     except KeyboardInterrupt:
         # Handle Ctrl+C gracefully
@@ -12,7 +12,7 @@ Test Phases:
     Phase 1: Environment Setup (3 tests)
     Phase 2: Basic Functionality Tests (6 tests)
     Phase 3: Advanced Tests (4 tests)
-    Phase 4: Integration Tests (3 tests)
+    Phase 4: Integration Tests (4 tests)
     Phase 5: Cleanup Tests (2 tests)
 
 Copyright (c) 2025 Rıza Emre ARAS <r.emrearas@proton.me>
@@ -213,6 +213,39 @@ class TestGhostFunctionality:
         assert '[Interface]' in export_output, "Export should contain WireGuard interface section"
         assert '[Peer]' in export_output, "Export should contain WireGuard peer section"
 
+    @pytest.mark.dependency(depends=["TestGhostFunctionality::test_ghost_phantom_casper_configuration_export"])
+    @pytest.mark.skipif(os.geteuid() != 0, reason="Requires root privileges")
+    def test_ghost_phantom_casper_bulk_export(self, tmp_path):
+        """Test phantom-casper bulk export to a directory and an archive"""
+        import json
+        import tarfile
+
+        add_response = self.api.execute("core", "add_clients", names=["casper-bulk-1", "casper-bulk-2"])
+        assert self.validate_response(add_response), "Bulk client add should succeed"
+
+        from phantom.casper import CasperService
+        service = CasperService()
+
+        try:
+            manifest = service.export_client_configs(["casper-bulk-*", "casper-missing"], str(tmp_path / "out"))
+            archive_manifest = service.export_client_configs("casper-bulk-1", str(tmp_path / "ghost.tar.gz"))
+        finally:
+            self.api.execute("core", "remove_clients", names=["casper-bulk-1", "casper-bulk-2"])
+
+        # Verify directory export
+        assert manifest['exported'] == 2, "Both matching clients should be exported"
+        assert manifest['errors'][0]['name'] == 'casper-missing', "Unknown client should be reported"
+        saved = json.loads((tmp_path / "out" / "manifest.json").read_text())
+        assert [c['name'] for c in saved['clients']] == ['casper-bulk-1', 'casper-bulk-2']
+        config = (tmp_path / "out" / "casper-bulk-1.conf").read_text()
+        assert 'Endpoint = 127.0.0.1:51820' in config, "Endpoint should point to wstunnel"
+        assert ((tmp_path / "out" / "casper-bulk-1.conf").stat().st_mode & 0o777) == 0o600
+
+        # Verify archive export
+        assert archive_manifest['exported'] == 1
+        with tarfile.open(tmp_path / "ghost.tar.gz") as archive:
+            assert archive.getnames() == ['casper-bulk-1.conf', 'manifest.json']
+
     @pytest.mark.dependency(depends=["TestGhostFunctionality::test_ghost_phantom_casper_configuration_export"])
     @pytest.mark.skipif(os.geteuid() != 0, reason="Requires root privileges")
     def test_duplicate_enable_attempt(self):
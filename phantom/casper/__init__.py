@@ -20,6 +20,7 @@ TR: Phantom-WG Casper - Ghost Mode Configuration Exporter
     
     Kullanım:
         phantom-casper [kullanıcı_adı]
+        phantom-casper --output [dizin|arşiv] [ad|desen ...]
     
     Çıktı Formatı:
         # Wstunnel Command (for run client side): [komut]
@@ -39,6 +40,7 @@ EN: Phantom-WG Casper - Ghost Mode Configuration Exporter
     
     Usage:
         phantom-casper [username]
+        phantom-casper --output [directory|archive] [name|pattern ...]
     
     Output Format:
         # Wstunnel Command (for run client side): [command]
@@ -51,7 +53,9 @@ WireGuard® is a registered trademark of Jason A. Donenfeld.
 """
 
 from .core import CasperService
+from .allowed_ips import calculate_allowed_ips
 
 __all__ = [
     "CasperService",
+    "calculate_allowed_ips",
 ]
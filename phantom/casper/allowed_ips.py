@@ -0,0 +1,147 @@
+"""
+██████╗ ██╗  ██╗ █████╗ ███╗   ██╗████████╗ ██████╗ ███╗   ███╗
+██╔══██╗██║  ██║██╔══██╗████╗  ██║╚══██╔══╝██╔═══██╗████╗ ████║
+██████╔╝███████║███████║██╔██╗ ██║   ██║   ██║   ██║██╔████╔██║
+██╔═══╝ ██╔══██║██╔══██║██║╚██╗██║   ██║   ██║   ██║██║╚██╔╝██║
+██║     ██║  ██║██║  ██║██║ ╚████║   ██║   ╚██████╔╝██║ ╚═╝ ██║
+╚═╝     ╚═╝  ╚═╝╚═╝  ╚═╝╚═╝  ╚═══╝   ╚═╝    ╚═════╝ ╚═╝     ╚═╝
+
+TR: Casper AllowedIPs Hesaplama - Hariç tutma kümeleri için minimal CIDR örtüsü
+    ============================================================================
+
+    AllowedIPs girdilerinden (IPv4 ve IPv6) keyfi sayıda adres ve önekin
+    çıkarılmasını sağlar. Ağlar tamsayı aralıklarına çevrilir, aralıklar
+    birleştirilip çıkarılır ve kalan her aralık hizalı en büyük bloklara
+    bölünerek minimal CIDR örtüsü üretilir. ipaddress nesneleri yalnızca
+    girişte ve çıkışta oluşturulur.
+
+    Sonuçlar (AllowedIPs, hariç tutma kümesi) çifti başına önbelleğe alınır;
+    aynı sunucu IP'si için yapılan binlerce Ghost dışa aktarımı tek bir
+    hesaplanmış listeyi paylaşır.
+
+EN: Casper AllowedIPs Calculation - Minimal CIDR cover for exclusion sets
+    =====================================================================
+
+    Removes an arbitrary number of addresses and prefixes (IPv4 and IPv6)
+    from AllowedIPs entries. Networks are converted to integer ranges, the
+    ranges are merged and subtracted and every remaining range is split
+    into the largest aligned blocks, giving the minimal CIDR cover.
+    ipaddress objects are only built on input and output.
+
+    Results are memoized per (AllowedIPs, exclusion set) pair, so thousands
+    of Ghost exports for the same server IP share one computed list.
+
+Copyright (c) 2025 Rıza Emre ARAS <r.emrearas@proton.me>
+Licensed under AGPL-3.0 - see LICENSE file for details
+Third-party licenses - see THIRD_PARTY_LICENSES file for details
+WireGuard® is a registered trademark of Jason A. Donenfeld.
+"""
+
+import ipaddress
+from functools import lru_cache
+from typing import Dict, Iterable, List, Tuple
+
+# Address width per IP version
+ADDRESS_BITS = {4: 32, 6: 128}
+
+# Distinct (AllowedIPs, exclusions) pairs kept in memory
+ALLOWED_IPS_CACHE_SIZE = 256
+
+Range = Tuple[int, int]
+
+
+def _to_ranges(entries: Iterable[str]) -> Dict[int, List[Range]]:
+    """Parse CIDR strings or addresses into merged ranges per IP version."""
+    ranges: Dict[int, List[Range]] = {4: [], 6: []}
+    for entry in entries:
+        network = ipaddress.ip_network(entry, strict=False)
+        first = int(network.network_address)
+        ranges[network.version].append((first, first + network.num_addresses - 1))
+    return {version: _merge(items) for version, items in ranges.items()}
+
+
+def _merge(ranges: List[Range]) -> List[Range]:
+    merged: List[Range] = []
+    for start, end in sorted(ranges):
+        if merged and start <= merged[-1][1] + 1:
+            if end > merged[-1][1]:
+                merged[-1] = (merged[-1][0], end)
+        else:
+            merged.append((start, end))
+    return merged
+
+
+def _subtract(included: List[Range], excluded: List[Range]) -> List[Range]:
+    """Remove excluded ranges from included ranges (both sorted and merged)."""
+    result: List[Range] = []
+    index = 0
+    for start, end in included:
+        # Skip exclusions that end before this range
+        while index < len(excluded) and excluded[index][1] < start:
+            index += 1
+        cursor = start
+        probe = index
+        while probe < len(excluded) and excluded[probe][0] <= end:
+            ex_start, ex_end = excluded[probe]
+            if ex_start > cursor:
+                result.append((cursor, ex_start - 1))
+            cursor = max(cursor, ex_end + 1)
+            probe += 1
+        if cursor <= end:
+            result.append((cursor, end))
+    return result
+
+
+def _range_to_cidrs(start: int, end: int, bits: int) -> List[Tuple[int, int]]:
+    """Minimal list of (network, prefixlen) blocks covering [start, end]."""
+    blocks = []
+    while start <= end:
+        # Largest block aligned at start that does not pass end
+        size = start & -start if start else 1 << bits
+        while size > end - start + 1:
+            size >>= 1
+        blocks.append((start, bits - size.bit_length() + 1))
+        start += size
+    return blocks
+
+
+@lru_cache(maxsize=ALLOWED_IPS_CACHE_SIZE)
+def _compute(allowed: Tuple[str, ...], excluded: Tuple[str, ...]) -> Tuple[str, ...]:
+    allowed_ranges = _to_ranges(allowed)
+    excluded_ranges = _to_ranges(excluded)
+
+    # Nothing to cut: keep the entries exactly as written
+    if not any(_subtract(allowed_ranges[v], excluded_ranges[v]) != allowed_ranges[v] for v in ADDRESS_BITS):
+        return allowed
+
+    cidrs = []
+    for version, bits in ADDRESS_BITS.items():
+        address_class = ipaddress.IPv4Address if version == 4 else ipaddress.IPv6Address
+        for start, end in _subtract(allowed_ranges[version], excluded_ranges[version]):
+            for network, prefix in _range_to_cidrs(start, end, bits):
+                cidrs.append(f"{address_class(network)}/{prefix}")
+    return tuple(cidrs)
+
+
+def calculate_allowed_ips(original_ips: str, exclusions: Iterable[str]) -> List[str]:
+    """Remove addresses and prefixes from an AllowedIPs value.
+
+    Args:
+        original_ips: Comma separated AllowedIPs (e.g. "0.0.0.0/0, ::/0")
+        exclusions: Addresses or CIDR prefixes to leave out (IPv4 or IPv6)
+
+    Returns:
+        list: Minimal CIDR blocks covering the AllowedIPs minus the exclusions,
+              IPv4 first, or the original entries if nothing overlaps
+
+    Raises:
+        ValueError: If an entry or exclusion is not a valid address or network
+    """
+    allowed = tuple(ip.strip() for ip in original_ips.split(',') if ip.strip())
+    excluded = tuple(sorted({str(ipaddress.ip_network(ip.strip(), strict=False)) for ip in exclusions if ip}))
+    return list(_compute(allowed, excluded))
+
+
+def clear_cache():
+    """Drop memoized results (e.g. after the server IP changed)."""
+    _compute.cache_clear()
@@ -17,7 +17,10 @@ TR: Casper Servisi - Ghost Mode Configuration Export Core
         - Ghost durumu kontrolü ve bilgi okuma
         - Phantom API üzerinden client verilerine erişim
         - wstunnel komutunu Ghost API'den alma
-        - AllowedIPs hesaplama algoritması (binary tree split)
+        - AllowedIPs hesaplama (tamsayı aralıkları ile minimal CIDR örtüsü)
+        - Toplu dışa aktarım: Ghost durumu ve API bir kez yüklenir, istemci
+          listesi veya glob desenleri için yapılandırmalar paralel olarak bir
+          dizine ya da arşive manifest ile birlikte yazılır
     
     Mimari:
         Servis, Ghost Mode'un aktif olup olmadığını kontrol eder, ardından
@@ -35,7 +38,10 @@ EN: Casper Service - Ghost Mode Configuration Export Core
         - Ghost state checking and information reading
         - Client data access via Phantom API
         - Fetching wstunnel command from Ghost API
-        - AllowedIPs calculation algorithm (binary tree split)
+        - AllowedIPs calculation (minimal CIDR cover over integer ranges)
+        - Bulk export: the Ghost state and API are loaded once and configs for
+          a list or glob of clients are written in parallel to a directory or
+          archive together with a manifest
     
     Architecture:
         The service checks if Ghost Mode is active, then retrieves client
@@ -48,11 +54,20 @@ Third-party licenses - see THIRD_PARTY_LICENSES file for details
 WireGuard® is a registered trademark of Jason A. Donenfeld.
 """
 
+import io
 import re
+import os
 import json
-import ipaddress
+import fnmatch
+import hashlib
+import tarfile
+import zipfile
+import tempfile
 from pathlib import Path
 from datetime import datetime
+from concurrent.futures import ThreadPoolExecutor
+
+from .allowed_ips import calculate_allowed_ips
 
 # Import PhantomAPI
 try:
@@ -72,6 +87,12 @@ except ImportError:
 
     PHANTOM_API_AVAILABLE = False
 
+# Bulk export settings
+BULK_EXPORT_WORKERS = 8
+CLIENT_PAGE_SIZE = 1000
+MANIFEST_FILENAME = "manifest.json"
+EXPORT_FILE_PERMISSIONS = 0o600
+
 
 class CasperService:
     def __init__(self):
@@ -156,28 +177,202 @@ class CasperService:
         print("NOTE: Keep the wstunnel command running while connected!")
         print("=" * 80)
 
-    def _is_ghost_active(self):
-        """Check if Ghost Mode is active.
+    def export_client_configs(self, patterns=None, output=None, workers=BULK_EXPORT_WORKERS):
+        """Export Ghost Mode configurations of many clients at once.
 
-        Reads the ghost-state.json file to determine if Ghost Mode
-        is currently enabled.
+        The Ghost state, the wstunnel command and the client list are read
+        once. Client configurations are fetched with a single core
+        export_clients call and the Ghost configs are rendered and written
+        in parallel. A manifest.json describing every file is written next
+        to them.
+
+        Args:
+            patterns: Client names or glob patterns (e.g. "team-*"), all clients if empty
+            output: Output directory, or an archive path ending in .tar.gz, .tgz or .zip
+            workers: Number of parallel render/write workers
 
         Returns:
-            bool: True if Ghost Mode is active, False otherwise
+            dict: The manifest (output, counts, per-client files and failures)
+
+        Raises:
+            Exception: If Ghost Mode is not active, the API is unavailable or nothing matches
         """
-        # Check state file
-        if not self.ghost_state_file.exists():
-            return False
+        if not output:
+            raise Exception("An output directory or archive path is required for bulk export")
+
+        # Read the Ghost state once for the whole batch
+        state = self._read_ghost_state()
+        if not state or not state.get("enabled", False):
+            raise Exception(
+                "Ghost Mode is not active. Enable it first with: phantom-api ghost enable domain=your-domain.com")
+        ghost_info = {
+            "domain": state.get("domain"),
+            "server_ip": state.get("server_ip"),
+            "secret": state.get("secret")
+        }
+        wstunnel_cmd = self._get_wstunnel_command()
 
+        names, failed = self._resolve_client_patterns(patterns or ["*"])
+        if not names:
+            raise Exception("No clients matched the given names or patterns")
+
+        client_configs = self._get_client_configs(names)
+        for name in names:
+            if name not in client_configs:
+                failed.append({"name": name, "error": "Client configuration could not be exported"})
+        names = [name for name in names if name in client_configs]
+
+        def render(name):
+            config = self._generate_ghost_config({"config": client_configs[name]}, ghost_info)
+            return name, config.encode()
+
+        with ThreadPoolExecutor(max_workers=max(1, workers)) as pool:
+            rendered = list(pool.map(render, names))
+            manifest = {
+                "generated": datetime.now().isoformat(),
+                "server": ghost_info["domain"],
+                "wstunnel_command": wstunnel_cmd,
+                "output": str(output),
+                "exported": len(rendered),
+                "failed": len(failed),
+                "clients": [
+                    {"name": name, "file": f"{name}.conf", "sha256": hashlib.sha256(data).hexdigest(),
+                     "size": len(data)}
+                    for name, data in rendered
+                ],
+                "errors": failed
+            }
+            self._write_bulk_export(Path(output), rendered, manifest, pool)
+
+        return manifest
+
+    def _resolve_client_patterns(self, patterns):
+        """Expand names and glob patterns against the client list (read once)."""
+        if isinstance(patterns, str):
+            patterns = [p.strip() for p in patterns.split(",") if p.strip()]
+
+        all_names = self._list_client_names()
+        known = set(all_names)
+        selected = {}
+        failed = []
+        for pattern in patterns:
+            if any(char in pattern for char in "*?["):
+                matches = fnmatch.filter(all_names, pattern)
+                if not matches:
+                    failed.append({"name": pattern, "error": "Pattern matched no clients"})
+                selected.update(dict.fromkeys(matches))
+            elif pattern in known:
+                selected[pattern] = None
+            else:
+                failed.append({"name": pattern, "error": f"Client '{pattern}' not found"})
+        return list(selected), failed
+
+    def _list_client_names(self):
+        """Get all client names via Phantom API using cursor pagination."""
+        if not self.phantom_api:
+            raise Exception("Phantom API not available")
+
+        names = []
+        params = {"per_page": CLIENT_PAGE_SIZE}
+        while True:
+            response = self.phantom_api.execute("core", "list_clients", **params)
+            if not response.success:
+                raise Exception(f"Failed to list clients: {response.error}")
+            names.extend(client["name"] for client in response.data.get("clients", []))
+            cursor = response.data.get("next_cursor")
+            if not cursor:
+                return names
+            params["cursor"] = cursor
+
+    def _get_client_configs(self, names):
+        """Get client configurations with one core export_clients call."""
+        if not self.phantom_api:
+            raise Exception("Phantom API not available")
+
+        with tempfile.TemporaryDirectory() as tmp_dir:
+            archive_path = Path(tmp_dir) / "clients.tar.gz"
+            response = self.phantom_api.execute("core", "export_clients", names=names, format="tar",
+                                                output=str(archive_path))
+            if not response.success:
+                raise Exception(f"Failed to get client data: {response.error}")
+
+            configs = {}
+            with tarfile.open(archive_path, "r:gz") as archive:
+                for member in archive:
+                    if member.isfile() and member.name.endswith(".conf"):
+                        configs[member.name[:-len(".conf")]] = archive.extractfile(member).read().decode()
+            return configs
+
+    @staticmethod
+    def _archive_format(output):
+        name = output.name.lower()
+        if name.endswith((".tar.gz", ".tgz")):
+            return "tar"
+        if name.endswith(".zip"):
+            return "zip"
+        return None
+
+    def _write_bulk_export(self, output, rendered, manifest, pool):
+        """Write rendered configs and the manifest to a directory (in parallel) or an archive."""
+        entries = rendered + [(None, json.dumps(manifest, indent=2).encode())]
+        archive_format = self._archive_format(output)
+
+        def member_name(name):
+            return f"{name}.conf" if name is not None else MANIFEST_FILENAME
+
+        if archive_format is None:
+            output.mkdir(parents=True, exist_ok=True, mode=0o700)
+            list(pool.map(lambda item: self._write_private_file(output / member_name(item[0]), item[1]), entries))
+            return
+
+        # Archives hold private keys: create 0600 before anything is written
+        output.parent.mkdir(parents=True, exist_ok=True)
+        fd = os.open(output, os.O_WRONLY | os.O_CREAT | os.O_TRUNC, EXPORT_FILE_PERMISSIONS)
+        with os.fdopen(fd, "wb") as archive_file:
+            if archive_format == "tar":
+                with tarfile.open(fileobj=archive_file, mode="w|gz") as archive:
+                    for name, data in entries:
+                        self._add_tar_member(archive, member_name(name), data)
+            else:
+                with zipfile.ZipFile(archive_file, mode="w", compression=zipfile.ZIP_DEFLATED) as archive:
+                    for name, data in entries:
+                        archive.writestr(member_name(name), data)
+
+    @staticmethod
+    def _write_private_file(path, data):
+        fd = os.open(path, os.O_WRONLY | os.O_CREAT | os.O_TRUNC, EXPORT_FILE_PERMISSIONS)
+        with os.fdopen(fd, "wb") as f:
+            f.write(data)
+
+    @staticmethod
+    def _add_tar_member(archive, name, data):
+        info = tarfile.TarInfo(name)
+        info.size = len(data)
+        info.mode = EXPORT_FILE_PERMISSIONS
+        info.mtime = int(datetime.now().timestamp())
+        archive.addfile(info, io.BytesIO(data))
+
+    def _read_ghost_state(self):
+        """Read ghost-state.json, None if missing or invalid."""
         try:
-            # Read state
             with open(self.ghost_state_file, 'r') as f:
-                state = json.load(f)
-                return state.get("enabled", False)
+                return json.load(f)
         except FileNotFoundError:
-            return False
+            return None
         except (json.JSONDecodeError, KeyError):
-            return False
+            return None
+
+    def _is_ghost_active(self):
+        """Check if Ghost Mode is active.
+
+        Reads the ghost-state.json file to determine if Ghost Mode
+        is currently enabled.
+
+        Returns:
+            bool: True if Ghost Mode is active, False otherwise
+        """
+        state = self._read_ghost_state()
+        return bool(state and state.get("enabled", False))
 
     def _get_ghost_info(self):
         """Get Ghost Mode connection information.
@@ -189,21 +384,17 @@ class CasperService:
             dict: Connection info with 'domain', 'server_ip', and 'secret' keys,
                  or None if unable to read the state file
         """
-        try:
-            # Read state file
-            with open(self.ghost_state_file, 'r') as f:
-                state = json.load(f)
-                # Return required fields
-                return {
-                    "domain": state.get("domain"),
-                    "server_ip": state.get("server_ip"),
-                    "secret": state.get("secret")
-                }
-        except FileNotFoundError:
-            return None
-        except (json.JSONDecodeError, KeyError):
+        state = self._read_ghost_state()
+        if state is None:
             return None
 
+        # Return required fields
+        return {
+            "domain": state.get("domain"),
+            "server_ip": state.get("server_ip"),
+            "secret": state.get("secret")
+        }
+
     def _get_wstunnel_command(self):
         """Get wstunnel command from Ghost API.
 
@@ -306,62 +497,15 @@ class CasperService:
     def _calculate_allowed_ips(self, original_ips, server_ip):
         """Calculate AllowedIPs excluding server IP.
 
-        Uses a binary tree splitting algorithm to exclude the server's IP
-        address from the default route (0.0.0.0/0) to prevent routing loops.
+        Removes the server's IP address from the AllowedIPs (e.g. the
+        0.0.0.0/0 default route) to prevent routing loops. The minimal CIDR
+        cover is computed once per server IP and reused for every export.
 
         Args:
             original_ips: Comma-separated string of original AllowedIPs
-            server_ip: The server's IP address to exclude
+            server_ip: The server's IP address to exclude (IPv4 or IPv6)
 
         Returns:
             list: List of CIDR blocks that exclude the server IP
         """
-        # Parse IPs
-        ips_list = [ip.strip() for ip in original_ips.split(',')]
-
-        # Check for default route
-        has_default_route = any(ip == "0.0.0.0/0" for ip in ips_list)
-
-        # Return if no default route
-        if not has_default_route:
-            return ips_list
-
-        # Convert server IP
-        server_ip_obj = ipaddress.IPv4Address(server_ip)
-        server_int = int(server_ip_obj)
-
-        def split_cidr(network, exclude_ip):
-            """
-            Recursively split a CIDR block to exclude a specific IP.
-            
-            Uses binary tree splitting: divides the network in half,
-            determines which half contains the excluded IP, and recurses.
-            """
-            # Return if IP not in network
-            if exclude_ip < int(network.network_address) or exclude_ip > int(network.broadcast_address):
-                return [str(network)]
-
-            # Exclude single IP
-            if network.prefixlen >= 32:
-                return []
-
-            # Split network
-            networks = list(network.subnets(prefixlen_diff=1))
-            result = []
-
-            # Process halves
-            for subnet in networks:
-                result.extend(split_cidr(subnet, exclude_ip))
-
-            return result
-
-        # Start with full IPv4 space
-        all_ipv4 = ipaddress.IPv4Network("0.0.0.0/0")
-        allowed_cidrs = split_cidr(all_ipv4, server_int)
-
-        # Add non-default routes
-        for ip in ips_list:
-            if ip != "0.0.0.0/0" and ip not in allowed_cidrs:
-                allowed_cidrs.append(ip)
-
-        return allowed_cidrs
+        return calculate_allowed_ips(original_ips, [server_ip])
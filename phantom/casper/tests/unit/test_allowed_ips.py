@@ -0,0 +1,126 @@
+"""
+██████╗ ██╗  ██╗ █████╗ ███╗   ██╗████████╗ ██████╗ ███╗   ███╗
+██╔══██╗██║  ██║██╔══██╗████╗  ██║╚══██╔══╝██╔═══██╗████╗ ████║
+██████╔╝███████║███████║██╔██╗ ██║   ██║   ██║   ██║██╔████╔██║
+██╔═══╝ ██╔══██║██╔══██║██║╚██╗██║   ██║   ██║   ██║██║╚██╔╝██║
+██║     ██║  ██║██║  ██║██║ ╚████║   ██║   ╚██████╔╝██║ ╚═╝ ██║
+╚═╝     ╚═╝  ╚═╝╚═╝  ╚═╝╚═╝  ╚═══╝   ╚═╝    ╚═════╝ ╚═╝     ╚═╝
+
+
+Casper AllowedIPs Unit Test
+
+Copyright (c) 2025 Rıza Emre ARAS <r.emrearas@proton.me>
+Licensed under AGPL-3.0 - see LICENSE file for details
+Third-party licenses - see THIRD_PARTY_LICENSES file for details
+WireGuard® is a registered trademark of Jason A. Donenfeld.
+"""
+
+import ipaddress
+
+import pytest
+
+from phantom.casper.allowed_ips import calculate_allowed_ips, clear_cache
+
+
+def recursive_split(network, exclude_ip):
+    """The binary tree split Casper used before the range based cover."""
+    if exclude_ip < int(network.network_address) or exclude_ip > int(network.broadcast_address):
+        return [str(network)]
+    if network.prefixlen >= network.max_prefixlen:
+        return []
+    result = []
+    for subnet in network.subnets(prefixlen_diff=1):
+        result.extend(recursive_split(subnet, exclude_ip))
+    return result
+
+
+def covered_addresses(cidrs, version):
+    return sum(network.num_addresses for network in map(ipaddress.ip_network, cidrs)
+               if network.version == version)
+
+
+def assert_disjoint(cidrs):
+    networks = sorted(map(ipaddress.ip_network, cidrs), key=lambda n: (n.version, n.network_address))
+    for left, right in zip(networks, networks[1:]):
+        assert left.version != right.version or not left.overlaps(right), (left, right)
+
+
+@pytest.fixture(autouse=True)
+def fresh_cache():
+    clear_cache()
+    yield
+    clear_cache()
+
+
+class TestCalculateAllowedIps:
+
+    @pytest.mark.parametrize("server_ip", ["203.0.113.7", "0.0.0.0", "255.255.255.255", "10.8.0.1"])
+    def test_default_route_matches_recursive_split(self, server_ip):
+        expected = recursive_split(ipaddress.IPv4Network("0.0.0.0/0"), int(ipaddress.IPv4Address(server_ip)))
+
+        result = calculate_allowed_ips("0.0.0.0/0", [server_ip])
+
+        assert result == expected
+        assert len(result) == 32
+
+    def test_no_overlap_keeps_entries_as_written(self):
+        result = calculate_allowed_ips("10.8.0.0/24, 192.168.1.5, fd00::/64", ["203.0.113.7", "2001:db8::1"])
+
+        assert result == ["10.8.0.0/24", "192.168.1.5", "fd00::/64"]
+
+    def test_no_exclusions_keeps_entries_as_written(self):
+        assert calculate_allowed_ips("0.0.0.0/0, ::/0", []) == ["0.0.0.0/0", "::/0"]
+
+    def test_ipv6_exclusion(self):
+        result = calculate_allowed_ips("0.0.0.0/0, ::/0", ["2001:db8::1"])
+
+        assert "0.0.0.0/0" in result
+        ipv6 = [cidr for cidr in result if ":" in cidr]
+        assert len(ipv6) == 128
+        assert not any(ipaddress.ip_address("2001:db8::1") in ipaddress.ip_network(cidr) for cidr in ipv6)
+        assert covered_addresses(result, 6) == 2 ** 128 - 1
+
+    def test_several_exclusions(self):
+        exclusions = ["203.0.113.7", "198.51.100.0/24", "10.0.0.0/8"]
+
+        result = calculate_allowed_ips("0.0.0.0/0", exclusions)
+
+        for exclusion in map(ipaddress.ip_network, exclusions):
+            assert not any(ipaddress.ip_network(cidr).overlaps(exclusion) for cidr in result)
+        assert covered_addresses(result, 4) == 2 ** 32 - 1 - 256 - 2 ** 24
+        assert_disjoint(result)
+
+    def test_overlapping_exclusions_are_merged(self):
+        exclusions = ["10.0.0.0/8", "10.1.0.0/16", "10.1.2.3", "11.0.0.0/8"]
+
+        result = calculate_allowed_ips("0.0.0.0/0", exclusions)
+
+        assert result == calculate_allowed_ips("0.0.0.0/0", ["10.0.0.0/7"])
+        assert covered_addresses(result, 4) == 2 ** 32 - 2 ** 25
+        assert_disjoint(result)
+
+    def test_full_coverage_of_remaining_space(self):
+        allowed = "0.0.0.0/0, ::/0, 10.8.0.0/24"
+        exclusions = ["203.0.113.7", "10.8.0.1", "192.0.2.0/25", "2001:db8::/32", "fe80::1"]
+
+        result = calculate_allowed_ips(allowed, exclusions)
+
+        # Every address outside the exclusions is covered exactly once
+        excluded = [ipaddress.ip_network(cidr) for cidr in exclusions]
+        for version, bits in ((4, 32), (6, 128)):
+            removed = sum(n.num_addresses for n in excluded if n.version == version)
+            assert covered_addresses(result, version) == 2 ** bits - removed
+        assert_disjoint(result)
+        # The VPN subnet is folded into the cover instead of being appended
+        assert "10.8.0.0/24" not in result
+
+    def test_result_is_memoized_per_exclusion_set(self):
+        first = calculate_allowed_ips("0.0.0.0/0", ["203.0.113.7", "198.51.100.1"])
+        second = calculate_allowed_ips("0.0.0.0/0", ["198.51.100.1", " 203.0.113.7"])
+
+        assert first == second
+        assert first is not second
+
+    def test_invalid_exclusion_raises(self):
+        with pytest.raises(ValueError):
+            calculate_allowed_ips("0.0.0.0/0", ["not-an-ip"])
@@ -0,0 +1,210 @@
+"""
+██████╗ ██╗  ██╗ █████╗ ███╗   ██╗████████╗ ██████╗ ███╗   ███╗
+██╔══██╗██║  ██║██╔══██╗████╗  ██║╚══██╔══╝██╔═══██╗████╗ ████║
+██████╔╝███████║███████║██╔██╗ ██║   ██║   ██║   ██║██╔████╔██║
+██╔═══╝ ██╔══██║██╔══██║██║╚██╗██║   ██║   ██║   ██║██║╚██╔╝██║
+██║     ██║  ██║██║  ██║██║ ╚████║   ██║   ╚██████╔╝██║ ╚═╝ ██║
+╚═╝     ╚═╝  ╚═╝╚═╝  ╚═╝╚═╝  ╚═══╝   ╚═╝    ╚═════╝ ╚═╝     ╚═╝
+
+
+Casper Bulk Export Unit Test
+
+Copyright (c) 2025 Rıza Emre ARAS <r.emrearas@proton.me>
+Licensed under AGPL-3.0 - see LICENSE file for details
+Third-party licenses - see THIRD_PARTY_LICENSES file for details
+WireGuard® is a registered trademark of Jason A. Donenfeld.
+"""
+
+import hashlib
+import io
+import json
+import tarfile
+import zipfile
+from unittest.mock import Mock, patch
+
+import pytest
+
+from phantom.casper.core import CasperService
+
+SERVER_IP = "203.0.113.7"
+
+CLIENT_CONFIG = """[Interface]
+PrivateKey = key-{name}
+Address = 10.8.0.2/32
+
+[Peer]
+PublicKey = server-public
+Endpoint = 203.0.113.7:51820
+AllowedIPs = 0.0.0.0/0
+"""
+
+
+class FakePhantomAPI:
+    """Answers the core and ghost actions used by the bulk export."""
+
+    def __init__(self, names, page_size=2, unexportable=()):
+        self.names = names
+        self.page_size = page_size
+        self.unexportable = set(unexportable)
+        self.calls = []
+
+    def execute(self, module, action, **params):
+        self.calls.append((module, action, params))
+        if (module, action) == ("ghost", "status"):
+            return Mock(success=True, data={"connection_command": "wstunnel client --test"})
+        if (module, action) == ("core", "list_clients"):
+            start = int(params.get("cursor", 0))
+            page = self.names[start:start + self.page_size]
+            next_cursor = str(start + self.page_size) if start + self.page_size < len(self.names) else None
+            return Mock(success=True, data={"clients": [{"name": name} for name in page],
+                                            "next_cursor": next_cursor})
+        if (module, action) == ("core", "export_clients"):
+            with tarfile.open(params["output"], "w:gz") as archive:
+                for name in params["names"]:
+                    if name in self.unexportable:
+                        continue
+                    data = CLIENT_CONFIG.format(name=name).encode()
+                    info = tarfile.TarInfo(f"{name}.conf")
+                    info.size = len(data)
+                    archive.addfile(info, io.BytesIO(data))
+            return Mock(success=True, data={"output": params["output"]})
+        raise AssertionError(f"Unexpected API call {module}.{action}")
+
+    def count(self, module, action):
+        return sum(1 for call in self.calls if call[:2] == (module, action))
+
+
+@pytest.fixture
+def make_service(tmp_path):
+    def factory(names=("alice", "bob", "team-a", "team-b", "team-c"), enabled=True, **api_options):
+        state_file = tmp_path / "ghost-state.json"
+        state_file.write_text(json.dumps({"enabled": enabled, "domain": "ghost.example.com",
+                                          "server_ip": SERVER_IP, "secret": "s3cret"}))
+        with patch("phantom.casper.core.PHANTOM_API_AVAILABLE", False):
+            service = CasperService()
+        service.ghost_state_file = state_file
+        service.phantom_api = FakePhantomAPI(list(names), **api_options)
+        return service
+    return factory
+
+
+class TestResolveClientPatterns:
+
+    def test_names_and_patterns_are_expanded_in_order(self, make_service):
+        service = make_service()
+
+        names, failed = service._resolve_client_patterns(["team-*", "alice", "team-a"])
+
+        assert names == ["team-a", "team-b", "team-c", "alice"]
+        assert failed == []
+        # The client list is paged with the cursor and read once
+        assert service.phantom_api.count("core", "list_clients") == 3
+
+    def test_comma_separated_string(self, make_service):
+        service = make_service()
+
+        names, _ = service._resolve_client_patterns("bob, team-?")
+
+        assert names == ["bob", "team-a", "team-b", "team-c"]
+
+    def test_missing_names_and_empty_patterns_are_reported(self, make_service):
+        service = make_service()
+
+        names, failed = service._resolve_client_patterns(["alice", "carol", "ops-*"])
+
+        assert names == ["alice"]
+        assert failed == [
+            {"name": "carol", "error": "Client 'carol' not found"},
+            {"name": "ops-*", "error": "Pattern matched no clients"}
+        ]
+
+
+class TestExportClientConfigs:
+
+    def test_directory_export_writes_private_files_and_manifest(self, make_service, tmp_path):
+        service = make_service()
+        output = tmp_path / "out"
+
+        manifest = service.export_client_configs(["team-*", "carol"], str(output))
+
+        assert manifest["exported"] == 3
+        assert manifest["failed"] == 1
+        assert manifest["errors"] == [{"name": "carol", "error": "Client 'carol' not found"}]
+        assert manifest["server"] == "ghost.example.com"
+        assert manifest["wstunnel_command"] == "wstunnel client --test"
+        assert (output.stat().st_mode & 0o777) == 0o700
+
+        saved = json.loads((output / "manifest.json").read_text())
+        assert saved == manifest
+        for entry in saved["clients"]:
+            path = output / entry["file"]
+            data = path.read_bytes()
+            assert (path.stat().st_mode & 0o777) == 0o600
+            assert entry["size"] == len(data)
+            assert entry["sha256"] == hashlib.sha256(data).hexdigest()
+
+        config = (output / "team-a.conf").read_text()
+        assert "Endpoint = 127.0.0.1:51820" in config
+        assert f"{SERVER_IP}/32" not in config
+        assert "0.0.0.0/0" not in config
+        # All configurations come from one export_clients call
+        assert service.phantom_api.count("core", "export_clients") == 1
+        assert service.phantom_api.count("ghost", "status") == 1
+
+    def test_all_clients_are_exported_without_patterns(self, make_service, tmp_path):
+        service = make_service()
+
+        manifest = service.export_client_configs(None, str(tmp_path / "out"))
+
+        assert [entry["name"] for entry in manifest["clients"]] == ["alice", "bob", "team-a", "team-b", "team-c"]
+
+    def test_tar_archive_is_private(self, make_service, tmp_path):
+        service = make_service()
+        output = tmp_path / "exports" / "ghost.tar.gz"
+
+        manifest = service.export_client_configs("alice,bob", str(output))
+
+        assert manifest["exported"] == 2
+        assert (output.stat().st_mode & 0o777) == 0o600
+        with tarfile.open(output) as archive:
+            assert archive.getnames() == ["alice.conf", "bob.conf", "manifest.json"]
+            assert all(member.mode == 0o600 for member in archive.getmembers())
+            assert json.load(archive.extractfile("manifest.json"))["exported"] == 2
+
+    def test_zip_archive_is_private(self, make_service, tmp_path):
+        service = make_service()
+        output = tmp_path / "ghost.zip"
+
+        service.export_client_configs(["bob"], str(output))
+
+        assert (output.stat().st_mode & 0o777) == 0o600
+        with zipfile.ZipFile(output) as archive:
+            assert archive.namelist() == ["bob.conf", "manifest.json"]
+            assert "Endpoint = 127.0.0.1:51820" in archive.read("bob.conf").decode()
+
+    def test_unexported_client_is_reported(self, make_service, tmp_path):
+        service = make_service(unexportable=["bob"])
+
+        manifest = service.export_client_configs(["alice", "bob"], str(tmp_path / "out"))
+
+        assert [entry["name"] for entry in manifest["clients"]] == ["alice"]
+        assert manifest["errors"] == [{"name": "bob", "error": "Client configuration could not be exported"}]
+        assert not (tmp_path / "out" / "bob.conf").exists()
+
+    def test_nothing_matched_raises(self, make_service, tmp_path):
+        service = make_service()
+
+        with pytest.raises(Exception, match="No clients matched"):
+            service.export_client_configs(["carol", "ops-*"], str(tmp_path / "out"))
+        assert not (tmp_path / "out").exists()
+
+    def test_inactive_ghost_mode_raises(self, make_service, tmp_path):
+        service = make_service(enabled=False)
+
+        with pytest.raises(Exception, match="Ghost Mode is not active"):
+            service.export_client_configs(["alice"], str(tmp_path / "out"))
+        assert service.phantom_api.calls == []
+
+    def test_output_is_required(self, make_service):
+        with pytest.raises(Exception, match="output directory or archive path is required"):
+            make_service().export_client_configs(["alice"])
@@ -41,6 +41,7 @@ import os
 import sys
 import argparse
 import time
+from collections import deque
 from datetime import datetime
 
 # Rich imports
@@ -62,6 +63,8 @@ except ImportError:
 # Phantom imports
 from phantom import __version__
 from phantom.api.core import PhantomAPI
+from phantom.api.daemon import DaemonClient, DaemonUnavailableError, NO_DAEMON_ENV
+from phantom.api.status_stream import StatusStream, apply_status_delta
 
 # UI imports
 try:
@@ -904,6 +907,7 @@ class InteractiveUI:
             self.print("\nOptions:")
             self.print("  1. View Detailed System Information")
             self.print("  2. Refresh Status")
+            self.print("  3. Live Status (streaming)")
             self.print("  0. Back to main menu")
 
             if RICH_AVAILABLE:
@@ -919,6 +923,8 @@ class InteractiveUI:
             elif choice == "2":
                 # Refresh - just continue the loop
                 continue
+            elif choice == "3":
+                self._run_live_status_view(handler)
             else:
                 self.print_error("Invalid selection")
                 if RICH_AVAILABLE:
@@ -926,6 +932,148 @@ class InteractiveUI:
                 else:
                     input("\nPress Enter to continue...")
 
+    def _sample_status(self, include_service):
+        """Sample source for an in-process status stream"""
+        response = self.api.execute("core", "status_snapshot", include_service=include_service)
+        if not response.success:
+            raise RuntimeError(response.error)
+        return response.data
+
+    def _open_status_stream(self):
+        """Subscribe to status deltas.
+
+        Uses the daemon's shared sampler when it is running, so every viewer
+        costs one sample; otherwise samples in-process with a private stream.
+
+        Returns:
+            Tuple of (message iterator, local StatusStream or None)
+        """
+        if not os.environ.get(NO_DAEMON_ENV):
+            try:
+                return DaemonClient().subscribe("status"), None
+            except DaemonUnavailableError:
+                pass
+        stream = StatusStream(self._sample_status)
+        return iter(stream.subscribe()), stream
+
+    # noinspection PyProtectedMember
+    def _run_live_status_view(self, handler):
+        """Display peer connections and transfer rates from the status stream"""
+        format_bytes = handler._format_bytes
+        messages, local_stream = self._open_status_stream()
+        state = {"status": None, "error": None, "updated": None}
+
+        def apply(message):
+            """Fold one stream message into the local status"""
+            if message["type"] == "snapshot":
+                state["status"] = message["status"]
+                state["error"] = None
+            elif message["type"] == "delta" and state["status"] is not None:
+                apply_status_delta(state["status"], message["events"])
+                state["error"] = None
+            elif message["type"] == "error":
+                state["error"] = message["error"]
+            state["updated"] = datetime.now().strftime("%H:%M:%S")
+            return message
+
+        def summary_line(status):
+            """Service, interface and connection counts in one line"""
+            service = status.get("service") or {}
+            interface = status.get("interface", {})
+            peers = status.get("peers", {})
+            connected = sum(1 for peer in peers.values() if peer.get("connected"))
+            return (f"Service: {'Running' if service.get('running') else 'Stopped'} | "
+                    f"Interface: {'Up' if interface.get('active') else 'Down'}"
+                    f"{' :' + str(interface['port']) if interface.get('port') else ''} | "
+                    f"Connected: {connected}/{len(peers)}")
+
+        try:
+            if RICH_AVAILABLE and self.console:
+                from rich.live import Live
+                from rich.table import Table
+                from rich import box
+
+                # noinspection PyShadowingNames
+                def create_status_display():
+                    """Create the live status panel"""
+                    status = state["status"]
+                    if status is None:
+                        return Panel(
+                            f"[red]Error: {state['error']}[/red]" if state["error"] else "[dim]Waiting for status...[/dim]",
+                            title="📊 Live Server Status",
+                            border_style="red" if state["error"] else "cyan"
+                        )
+
+                    table = Table(box=box.SIMPLE, show_header=True, header_style="bold magenta")
+                    table.add_column("Client", style="cyan")
+                    table.add_column("Status", width=12)
+                    table.add_column("Endpoint", style="dim")
+                    table.add_column("↓ Rate", justify="right")
+                    table.add_column("↑ Rate", justify="right")
+                    table.add_column("↓ Total", justify="right")
+                    table.add_column("↑ Total", justify="right")
+
+                    # Connected peers first, then by client name
+                    peers = sorted(status["peers"].items(),
+                                   key=lambda item: (not item[1].get("connected"), item[1].get("client") or item[0]))
+                    for public_key, peer in peers:
+                        table.add_row(
+                            peer.get("client") or f"[dim]{public_key[:12]}…[/dim]",
+                            "[green]🟢 Connected[/green]" if peer.get("connected") else "[yellow]🟡 Idle[/yellow]",
+                            peer.get("endpoint") or "N/A",
+                            f"{format_bytes(peer.get('rx_rate', 0))}/s",
+                            f"{format_bytes(peer.get('tx_rate', 0))}/s",
+                            format_bytes(peer.get("rx", 0)),
+                            format_bytes(peer.get("tx", 0))
+                        )
+
+                    subtitle = f"Last change: {state['updated']} - Press Ctrl+C to exit"
+                    if state["error"]:
+                        subtitle = f"[red]{state['error']}[/red]"
+                    return Panel(
+                        table,
+                        title=f"📊 Live Server Status - {summary_line(status)}",
+                        subtitle=subtitle,
+                        border_style="cyan"
+                    )
+
+                self.clear_screen()
+                with Live(create_status_display(), console=self.console, refresh_per_second=4) as live:
+                    for message in messages:
+                        apply(message)
+                        live.update(create_status_display())
+            else:
+                # Fallback: print one line per change
+                self.print("\n📊 Live Server Status (Press Ctrl+C to exit)")
+                self.print("=" * 60)
+                for message in messages:
+                    apply(message)
+                    if message["type"] == "snapshot":
+                        self.print(summary_line(state["status"]))
+                    elif message["type"] == "error":
+                        self.print(f"❌ {message['error']}")
+                    else:
+                        for event in message["events"]:
+                            if event["event"] in ("peer_connected", "peer_disconnected"):
+                                name = event.get("client") or event["public_key"][:12]
+                                self.print(f"[{state['updated']}] {name}: {event['event'].split('_')[1]}")
+                            elif event["event"] in ("service", "interface"):
+                                self.print(f"[{state['updated']}] {summary_line(state['status'])}")
+
+        except KeyboardInterrupt:
+            self.print("\nExiting live status view...")
+        except ConnectionError as e:
+            self.print_error(f"Status stream interrupted: {e}")
+            if RICH_AVAILABLE:
+                Prompt.ask("\nPress Enter to continue")
+            else:
+                input("\nPress Enter to continue...")
+        finally:
+            if hasattr(messages, "close"):
+                messages.close()
+            if local_stream is not None:
+                local_stream.close()
+
     def _show_detailed_system_info(self, status_data):  # noinspection PyProtectedMember
         """Show detailed system and interface information"""
         self.clear_screen()
@@ -1156,21 +1304,36 @@ class InteractiveUI:
         """Display live updating log view"""
         lines = int(kwargs.get("lines", 50))
 
+        # Remove _special from kwargs
+        clean_kwargs = {k: v for k, v in kwargs.items() if k != "_special"}
+
+        # Lines seen so far; after the first call only new lines are fetched
+        buffer = deque(maxlen=lines)
+        cursor = {"offset": None}
+
+        def fetch_log():
+            """Fetch the lines written since the previous refresh"""
+            call_kwargs = dict(clean_kwargs)
+            if cursor["offset"] is not None:
+                call_kwargs["since_offset"] = cursor["offset"]
+            # noinspection PyShadowingNames
+            response = self.api.execute(module, action, **call_kwargs)
+            if response.success:
+                if response.data.get("reset"):
+                    buffer.clear()
+                buffer.extend(response.data.get("log_lines", []))
+                cursor["offset"] = response.data.get("offset")
+            return response
+
         if RICH_AVAILABLE and self.console:
             from rich.table import Table
             from rich.panel import Panel
             from rich import box
 
-            # Remove _special from kwargs
-            clean_kwargs = {k: v for k, v in kwargs.items() if k != "_special"}
-
-            def create_log_display():
+            # noinspection PyShadowingNames
+            def create_log_display(response):
                 """Create the log display table"""
                 try:
-                    # Get data
-                    # noinspection PyShadowingNames
-                    response = self.api.execute(module, action, **clean_kwargs)
-
                     if not response.success:
                         return Panel(
                             f"[red]Error: {response.error}[/red]",
@@ -1180,7 +1343,7 @@ class InteractiveUI:
 
                     data = response.data
                     # noinspection PyShadowingNames
-                    log_lines = data.get("log_lines", [])
+                    log_lines = list(buffer)
                 except Exception as e:
                     return Panel(
                         f"[red]Error in create_log_display: {str(e)}[/red]",
@@ -1266,8 +1429,8 @@ class InteractiveUI:
                     # Clear and redraw
                     self.clear_screen()
 
-                    # Get data
-                    response = self.api.execute(module, action, **clean_kwargs)
+                    # Get new lines
+                    response = fetch_log()
 
                     if not response.success:
                         self.console.print(Panel(
@@ -1278,7 +1441,7 @@ class InteractiveUI:
                         break
 
                     # Display the log
-                    self.console.print(create_log_display())
+                    self.console.print(create_log_display(response))
 
                     # Show update time
                     self.console.print(
@@ -1302,17 +1465,17 @@ class InteractiveUI:
 
             try:
                 while True:
-                    # Get log data
-                    response = self.api.execute(module, action, **{k: v for k, v in kwargs.items() if k != "_special"})
+                    # Get new log lines
+                    response = fetch_log()
 
                     if response.success:
                         self.clear_screen()
                         self.print("📄 Session Log")
                         self.print("=" * 60)
 
-                        log_lines = response.data.get("log_lines", [])
+                        log_lines = list(buffer)
                         if log_lines:
-                            for line in log_lines[-lines:]:
+                            for line in log_lines:
                                 self.print(line)
                         else:
                             self.print("No log entries yet...")
@@ -1510,7 +1673,8 @@ class InteractiveUI:
                 "status": ("DNS Status", "View current configuration and health"),
                 "get_dns_servers": ("Current Servers", "Show active DNS servers"),
                 "change_dns_servers": ("Change DNS", "Update primary and secondary DNS"),
-                "test_dns_servers": ("Test DNS", "Check DNS resolution performance")
+                "test_dns_servers": ("Test DNS", "Check DNS resolution performance"),
+                "rank_dns_servers": ("Rank DNS", "Benchmark and rank candidate servers")
             }
             action_idx = 1
             action_map = {}
@@ -1537,7 +1701,8 @@ class InteractiveUI:
                 "status": ("DNS Status", "View current configuration"),
                 "get_dns_servers": ("Current Servers", "Show DNS servers"),
                 "change_dns_servers": ("Change DNS", "Update DNS servers"),
-                "test_dns_servers": ("Test DNS", "Test DNS resolution")
+                "test_dns_servers": ("Test DNS", "Test DNS resolution"),
+                "rank_dns_servers": ("Rank DNS", "Rank DNS servers by latency")
             }
             action_idx = 1
             action_map = {}
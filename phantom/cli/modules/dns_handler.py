@@ -139,3 +139,31 @@ class DNSUIHandler(BaseUIHandler):
             return {"domain": domain.strip()}
         else:
             return {}
+
+    def handle_rank_dns_servers(self):
+        """Handle rank_dns_servers action"""
+        self.clear_screen()
+
+        if self.console:
+            from rich.panel import Panel
+            from rich import box
+
+            # Show header
+            self.console.print(Panel(
+                "[bold cyan]🏁 Rank DNS Servers[/bold cyan]\n"
+                "[dim]Benchmark candidate servers by latency and loss[/dim]",
+                box=box.DOUBLE,
+                border_style="cyan"
+            ))
+        else:
+            self.print("🏁 Rank DNS Servers", style="bold yellow")
+            self.print("=" * 40)
+
+        self.print("\nThis will query the current servers and well-known public resolvers.")
+
+        queries = self.prompt("\nQueries per server and domain", default="5")
+
+        if queries and queries.strip().isdigit():
+            return {"queries": int(queries.strip())}
+        else:
+            return {}
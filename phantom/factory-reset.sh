@@ -201,6 +201,9 @@ echo "Starting fresh WireGuard..."
 systemctl enable wg-quick@$WG_INTERFACE
 systemctl start wg-quick@$WG_INTERFACE
 
+# Restart API daemon (if installed) so it drops state from the old installation
+systemctl try-restart phantom-api 2>/dev/null || true
+
 # 15. Set permissions
 chown -R root:root /opt/phantom-wg
 chmod 755 /opt/phantom-wg
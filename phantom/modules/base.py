@@ -13,6 +13,7 @@ Licensed under AGPL-3.0 - see LICENSE file for details
 Third-party licenses - see THIRD_PARTY_LICENSES file for details
 WireGuard® is a registered trademark of Jason A. Donenfeld.
 """
+import copy
 import logging
 from abc import ABC, abstractmethod
 from pathlib import Path
@@ -20,6 +21,8 @@ from typing import Dict, Any, Callable, Optional, List
 import json
 
 from ..api import APIResponse, PhantomException, ActionNotFoundError
+from .config_service import ConfigService, get_config_service
+from .snapshot_store import STORE_DIR, get_snapshot_store
 
 class BaseModule(ABC):
 
@@ -42,8 +45,10 @@ class BaseModule(ABC):
         # Setup logger for this module
         self.logger = self._setup_logger()
 
-        # Load configuration
+        # Load configuration through the process-wide service and follow its changes
+        self.config_service: ConfigService = get_config_service(self.config_dir / "phantom.json")
         self.config = self._load_config()
+        self.config_service.subscribe(self._on_config_published)
 
         # Module metadata
         self.metadata = {
@@ -73,8 +78,10 @@ class BaseModule(ABC):
         """
         Load main configuration file.
 
-        Reads system configuration from phantom.json file. Raises ConfigurationError
-        if file not found or read error occurs.
+        Returns a private copy of the configuration cached by the shared
+        ConfigService, so phantom.json is parsed once per change rather than
+        once per module. Raises ConfigurationError if file not found or read
+        error occurs.
 
         Returns:
             Dict[str, Any]: Configuration dictionary
@@ -84,7 +91,7 @@ class BaseModule(ABC):
         """
         from phantom.api.exceptions import ConfigurationError
 
-        config_file = self.config_dir / "phantom.json"
+        config_file = self.config_service.config_file
 
         if not config_file.exists():
             error_msg = f"Configuration file not found: {config_file}"
@@ -92,8 +99,7 @@ class BaseModule(ABC):
             raise ConfigurationError(error_msg)
 
         try:
-            with open(config_file, 'r') as f:
-                return json.load(f)
+            return self.config_service.load()
         except Exception as e:
             error_msg = f"Error loading configuration file: {e}"
             self.logger.error(error_msg)
@@ -104,24 +110,71 @@ class BaseModule(ABC):
         Save configuration to file.
 
         Saves provided configuration or current instance configuration
-        to phantom.json file. Creates directory if it doesn't exist.
+        to phantom.json through the shared ConfigService (file lock and
+        atomic rename). Other modules of the process are notified and
+        refresh their copy.
 
         Args:
             config: Configuration dictionary to save (uses instance config if None)
         """
-        config_file = self.config_dir / "phantom.json"
-        config_file.parent.mkdir(parents=True, exist_ok=True)
-
         # Use provided config or instance config
         config_to_save = config if config is not None else self.config
 
-        with open(config_file, 'w') as f:
-            json.dump(config_to_save, f, indent=2)
+        self.config_service.save(config_to_save, source=self)
 
         # Update instance config if a different config was provided
         if config is not None:
             self.config = config
 
+    def _on_config_published(self, snapshot: Dict[str, Any], source: Any) -> None:
+        """
+        Refresh the instance configuration after another writer changed it.
+
+        The dictionary is updated in place because helpers (state managers,
+        handlers) keep a reference to it.
+
+        Args:
+            snapshot: New configuration published by the ConfigService
+            source: Module that saved it (None for external changes)
+        """
+        if source is self or snapshot == self.config:
+            return
+        self.config.clear()
+        self.config.update(copy.deepcopy(snapshot))
+        self._config_changed()
+
+    def _snapshot_state(self, label: str, files: Optional[Dict[str, Path]] = None) -> Optional[str]:
+        """
+        Record phantom.json and module files in the shared backup store.
+
+        Called before a module changes state; the backup can be restored
+        with 'phantom-api core restore_backup'. A failed backup is logged
+        and does not block the operation.
+
+        Args:
+            label: Backup label (e.g. "ghost_enable")
+            files: Additional name -> path entries
+
+        Returns:
+            Backup id, or None if the backup could not be taken
+        """
+        store = get_snapshot_store(self.install_dir / STORE_DIR, self.config.get("backups"))
+        try:
+            snapshot = store.create(label, {"main_config": self.config_service.config_file, **(files or {})},
+                                    source=self.get_module_name())
+        except (OSError, PhantomException) as e:
+            self.logger.warning(f"Backup '{label}' could not be created: {e}")
+            return None
+        return snapshot.id
+
+    def _config_changed(self) -> None:
+        """
+        Hook called after the configuration was refreshed from another writer.
+
+        Modules that derive state from self.config override this.
+        """
+        pass
+
     @abstractmethod
     def get_module_name(self) -> str:
         """
@@ -0,0 +1,345 @@
+"""
+██████╗ ██╗  ██╗ █████╗ ███╗   ██╗████████╗ ██████╗ ███╗   ███╗
+██╔══██╗██║  ██║██╔══██╗████╗  ██║╚══██╔══╝██╔═══██╗████╗ ████║
+██████╔╝███████║███████║██╔██╗ ██║   ██║   ██║   ██║██╔████╔██║
+██╔═══╝ ██╔══██║██╔══██║██║╚██╗██║   ██║   ██║   ██║██║╚██╔╝██║
+██║     ██║  ██║██║  ██║██║ ╚████║   ██║   ╚██████╔╝██║ ╚═╝ ██║
+╚═╝     ╚═╝  ╚═╝╚═╝  ╚═╝╚═╝  ╚═══╝   ╚═╝    ╚═════╝ ╚═╝     ╚═╝
+
+TR: ConfigService - Paylaşılan, önbellekli phantom.json erişimi
+    ===========================================================
+
+    Bir süreçteki tüm modüller (core, dns, ghost, multihop) ve uzun ömürlü
+    servisler (multihop izleyici) aynı yapılandırma dosyası için tek bir
+    ConfigService örneği kullanır (get_config_service):
+
+        - Okuma: ayrıştırılmış yapılandırma dosyanın (inode, mtime, boyut)
+          imzasıyla önbelleğe alınır; imza değişmedikçe dosya yeniden
+          ayrıştırılmaz. snapshot() paylaşılan salt okunur kopyayı, load()
+          değiştirilebilir özel bir kopyayı döndürür (copy-on-write)
+        - Yazma: yazıcılar süreç içinde bir kilitle, süreçler arasında
+          phantom.json.lock üzerinde flock ile sıralanır; içerik geçici
+          dosyaya yazılıp fsync edilir ve os.replace ile atomik olarak
+          yerine konur. update() değişikliği kilit altında en güncel
+          içeriğe uygular
+        - Bildirim: subscribe() ile kaydolan geri çağırmalar yeni anlık
+          görüntüyle çağrılır; hem süreç içi yazmalarda hem de dışarıdan
+          yapılan değişiklikler fark edildiğinde. watch() bir inotify
+          tanımlayıcısı döndürür, olay döngüleri handle_events() ile
+          yoklama yapmadan güncel kalır
+
+    Aynı saat tikinde yapılan ve boyutu değiştirmeyen yazmalar imzayı
+    değiştirmeyebilir; bu nedenle ayrıştırma anına çok yakın mtime değerleri
+    güvenilmez sayılır ve ham içerik karşılaştırılır.
+
+EN: ConfigService - Shared, cached access to phantom.json
+    ====================================================
+
+    All modules of a process (core, dns, ghost, multihop) and long-lived
+    services (the multihop monitor) share one ConfigService instance per
+    configuration file (get_config_service):
+
+        - Reads: the parsed configuration is cached under the file's
+          (inode, mtime, size) signature and is not parsed again until the
+          signature changes. snapshot() returns the shared read-only copy,
+          load() a private mutable copy (copy-on-write)
+        - Writes: writers are serialised by a lock within the process and
+          by flock on phantom.json.lock across processes; content is written
+          to a temporary file, fsynced and atomically moved into place with
+          os.replace. update() applies a change to the latest content while
+          holding the lock
+        - Notifications: callbacks registered with subscribe() receive the
+          new snapshot, both for writes made in the process and when an
+          external change is noticed. watch() returns an inotify descriptor
+          so event loops stay current through handle_events() instead of
+          polling
+
+    Writes within the same clock tick that keep the size may not change the
+    signature, so mtimes too close to the parse time are not trusted and
+    the raw content is compared instead.
+
+Copyright (c) 2025 Rıza Emre ARAS <r.emrearas@proton.me>
+Licensed under AGPL-3.0 - see LICENSE file for details
+Third-party licenses - see THIRD_PARTY_LICENSES file for details
+WireGuard® is a registered trademark of Jason A. Donenfeld.
+"""
+
+import copy
+import ctypes
+import ctypes.util
+import fcntl
+import json
+import os
+import struct
+import tempfile
+import threading
+import time
+import weakref
+from pathlib import Path
+from typing import Any, Callable, Dict, List, Optional, Tuple
+
+# Mode of a newly created configuration file (it holds the server keys)
+CONFIG_FILE_PERMISSIONS = 0o600
+
+# mtimes closer than this to the parse time may hide a same-tick rewrite
+RACY_WINDOW_NS = 2_000_000_000
+
+# inotify event masks (linux/inotify.h)
+IN_CLOSE_WRITE = 0x00000008
+IN_MOVED_TO = 0x00000080
+IN_CREATE = 0x00000100
+IN_DELETE = 0x00000200
+CONFIG_EVENTS = IN_CLOSE_WRITE | IN_MOVED_TO | IN_CREATE | IN_DELETE
+INOTIFY_EVENT = struct.Struct("iIII")
+
+Signature = Tuple[int, int, int]
+Subscriber = Callable[[Dict[str, Any], Any], None]
+
+
+class ConfigService:
+    """Cached, lock-protected access to a single JSON configuration file.
+
+    Args:
+        config_file: Path of the configuration file (phantom.json)
+    """
+
+    def __init__(self, config_file: Path):
+        self.config_file = Path(config_file)
+        self.lock_file = self.config_file.with_name(f"{self.config_file.name}.lock")
+        self._lock = threading.RLock()
+        self._snapshot: Optional[Dict[str, Any]] = None
+        self._signature: Optional[Signature] = None
+        self._raw: Optional[bytes] = None
+        self._parsed_at_ns = 0
+        self._subscribers: List[Any] = []
+        self._inotify_fd: Optional[int] = None
+
+    # Reading
+
+    def _stat_signature(self) -> Optional[Signature]:
+        try:
+            stat = self.config_file.stat()
+        except OSError:
+            return None
+        return stat.st_ino, stat.st_mtime_ns, stat.st_size
+
+    def _is_fresh(self, signature: Optional[Signature]) -> bool:
+        if self._snapshot is None or signature is None or signature != self._signature:
+            return False
+        # An mtime near the parse time could belong to a rewrite in the same tick
+        return signature[1] < self._parsed_at_ns - RACY_WINDOW_NS
+
+    def _refresh(self) -> Tuple[Dict[str, Any], bool]:
+        """Re-parse the file if needed; returns (snapshot, changed)."""
+        with self._lock:
+            signature = self._stat_signature()
+            if self._is_fresh(signature):
+                return self._snapshot, False
+
+            raw = self.config_file.read_bytes()
+            signature = self._stat_signature() or signature
+            self._parsed_at_ns = time.time_ns()
+            if self._snapshot is not None and raw == self._raw:
+                self._signature = signature
+                return self._snapshot, False
+
+            previous = self._snapshot
+            self._snapshot, self._raw, self._signature = json.loads(raw), raw, signature
+            # The first parse is a load, not a change
+            return self._snapshot, previous is not None
+
+    def snapshot(self) -> Dict[str, Any]:
+        """Shared parsed configuration; callers must not modify it.
+
+        Raises:
+            OSError: If the file cannot be read
+            ValueError: If the file is not valid JSON
+        """
+        snapshot, changed = self._refresh()
+        if changed:
+            self._publish(snapshot, None)
+        return snapshot
+
+    def load(self) -> Dict[str, Any]:
+        """Private, mutable copy of the configuration."""
+        return copy.deepcopy(self.snapshot())
+
+    def invalidate(self):
+        """Force the next read to consult the file."""
+        with self._lock:
+            self._parsed_at_ns = 0
+
+    # Writing
+
+    def _write(self, config: Dict[str, Any]):
+        raw = json.dumps(config, indent=2).encode()
+        self.config_file.parent.mkdir(parents=True, exist_ok=True)
+        try:
+            mode = self.config_file.stat().st_mode & 0o7777
+        except FileNotFoundError:
+            mode = CONFIG_FILE_PERMISSIONS
+
+        fd, tmp_path = tempfile.mkstemp(dir=self.config_file.parent, prefix=f".{self.config_file.name}.")
+        try:
+            os.fchmod(fd, mode)
+            with os.fdopen(fd, 'wb') as f:
+                f.write(raw)
+                f.flush()
+                os.fsync(f.fileno())
+            os.replace(tmp_path, self.config_file)
+        except BaseException:
+            if os.path.exists(tmp_path):
+                os.unlink(tmp_path)
+            raise
+
+        self._snapshot, self._raw = copy.deepcopy(config), raw
+        self._signature = self._stat_signature()
+        self._parsed_at_ns = time.time_ns()
+
+    def _locked(self):
+        """Open and flock the sidecar lock file; closing it releases the lock."""
+        self.config_file.parent.mkdir(parents=True, exist_ok=True)
+        handle = open(self.lock_file, 'a')
+        fcntl.flock(handle.fileno(), fcntl.LOCK_EX)
+        return handle
+
+    def save(self, config: Dict[str, Any], source: Any = None) -> Dict[str, Any]:
+        """Atomically replace the configuration.
+
+        Args:
+            config: Complete configuration to write
+            source: Publisher passed to subscribers, so it can skip its own write
+
+        Returns:
+            The new snapshot
+        """
+        with self._lock, self._locked():
+            self._write(config)
+            snapshot = self._snapshot
+        self._publish(snapshot, source)
+        return snapshot
+
+    def update(self, mutator: Callable[[Dict[str, Any]], None], source: Any = None) -> Dict[str, Any]:
+        """Apply mutator to a copy of the latest configuration and write it.
+
+        The file is re-read while the lock is held, so concurrent writers in
+        other processes are not overwritten with stale content.
+
+        Args:
+            mutator: Callable modifying the configuration dict in place
+            source: Publisher passed to subscribers
+
+        Returns:
+            The new snapshot
+        """
+        with self._lock, self._locked():
+            self.invalidate()
+            config = copy.deepcopy(self._refresh()[0])
+            mutator(config)
+            self._write(config)
+            snapshot = self._snapshot
+        self._publish(snapshot, source)
+        return snapshot
+
+    # Notifications
+
+    def subscribe(self, callback: Subscriber) -> Subscriber:
+        """Call callback(snapshot, source) whenever the configuration changes.
+
+        Bound methods are held weakly so subscribing does not keep module
+        instances alive; source is None for external changes.
+        """
+        with self._lock:
+            if hasattr(callback, "__self__"):
+                self._subscribers.append(weakref.WeakMethod(callback))
+            else:
+                self._subscribers.append(lambda: callback)
+        return callback
+
+    def unsubscribe(self, callback: Subscriber):
+        with self._lock:
+            self._subscribers = [ref for ref in self._subscribers if ref() not in (None, callback)]
+
+    def _publish(self, snapshot: Dict[str, Any], source: Any):
+        with self._lock:
+            self._subscribers = [ref for ref in self._subscribers if ref() is not None]
+            callbacks = [ref() for ref in self._subscribers]
+        for callback in callbacks:
+            if callback is not None:
+                callback(snapshot, source)
+
+    def poll(self) -> bool:
+        """Check the file now; returns True (and notifies) when it changed."""
+        snapshot, changed = self._refresh()
+        if changed:
+            self._publish(snapshot, None)
+        return changed
+
+    def watch(self) -> Optional[int]:
+        """Open an inotify descriptor on the configuration directory.
+
+        The directory is watched so atomic replacements are seen as well.
+
+        Returns:
+            Readable file descriptor for an event loop, or None when inotify
+            is unavailable (callers then fall back to poll())
+        """
+        if self._inotify_fd is not None:
+            return self._inotify_fd
+        try:
+            libc = ctypes.CDLL(ctypes.util.find_library("c") or "libc.so.6", use_errno=True)
+            fd = libc.inotify_init1(os.O_NONBLOCK | os.O_CLOEXEC)
+            if fd < 0:
+                raise OSError(ctypes.get_errno(), "inotify_init1 failed")
+            if libc.inotify_add_watch(fd, str(self.config_file.parent).encode(), CONFIG_EVENTS) < 0:
+                os.close(fd)
+                raise OSError(ctypes.get_errno(), "inotify_add_watch failed")
+        except (OSError, AttributeError):
+            return None
+        self._inotify_fd = fd
+        return fd
+
+    def handle_events(self) -> bool:
+        """Drain pending inotify events; returns True when the configuration changed."""
+        touched = False
+        while self._inotify_fd is not None:
+            try:
+                data = os.read(self._inotify_fd, 4096)
+            except (BlockingIOError, InterruptedError):
+                break
+            if not data:
+                break
+            offset = 0
+            while offset + INOTIFY_EVENT.size <= len(data):
+                _, _, _, length = INOTIFY_EVENT.unpack_from(data, offset)
+                name = data[offset + INOTIFY_EVENT.size:offset + INOTIFY_EVENT.size + length].rstrip(b"\0")
+                offset += INOTIFY_EVENT.size + length
+                if name.decode(errors="replace") == self.config_file.name:
+                    touched = True
+        if not touched:
+            return False
+        self.invalidate()
+        try:
+            return self.poll()
+        except (OSError, ValueError):
+            # Removed or half written by a non-atomic editor; the next event retries
+            return False
+
+    def close(self):
+        if self._inotify_fd is not None:
+            os.close(self._inotify_fd)
+            self._inotify_fd = None
+
+
+_services: Dict[Path, ConfigService] = {}
+_services_lock = threading.Lock()
+
+
+def get_config_service(config_file: Path) -> ConfigService:
+    """Process-wide ConfigService for a configuration file."""
+    key = Path(os.path.abspath(config_file))
+    with _services_lock:
+        service = _services.get(key)
+        if service is None:
+            service = _services[key] = ConfigService(key)
+        return service
@@ -15,7 +15,7 @@ TR: Phantom-WG Core Modülü
     Modül Yapısı:
         - module.py: Ana orchestration katmanı (14 API endpoint)
         - lib/: Managers
-            • data_store.py: TinyDB ve IP yönetimi
+            • data_store.py: SQLite istemci deposu ve IP yönetimi
             • key_generator.py: Kriptografik anahtar üretimi
             • common_tools.py: Ortak yardımcı araçlar
             • client_handler.py: İstemci yaşam döngüsü
@@ -40,7 +40,7 @@ EN: Phantom-WG Core Module
     Module Structure:
         - module.py: Main orchestration layer (14 API endpoints)
         - lib/: Managers
-            • data_store.py: TinyDB and IP management
+            • data_store.py: SQLite client store and IP management
             • key_generator.py: Cryptographic key generation
             • common_tools.py: Common utilities
             • client_handler.py: Client lifecycle
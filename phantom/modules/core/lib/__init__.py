@@ -15,13 +15,20 @@ WireGuard® is a registered trademark of Jason A. Donenfeld.
 """
 
 from .data_store import DataStore
+from .ip_allocator import IPAllocator
+from .ip_remap import IPRemapper
 from .key_generator import KeyGenerator
+from .peer_state import PeerStateReader
+from .state_cache import StateCache
+from .wg_config import WireGuardConfig, WireGuardConfigFile
 from .common_tools import CommonTools
 from .client_handler import ClientHandler
 from .service_monitor import ServiceMonitor
 from .config_keeper import ConfigKeeper
 from .network_admin import NetworkAdmin
 from .config_generation_service import ConfigGenerationService
+from .config_cache import ConfigCache
+from .traffic_history import TrafficHistory
 
-__all__ = ['DataStore', 'KeyGenerator', 'CommonTools', 'ClientHandler', 'ServiceMonitor', 'ConfigKeeper',
-           'NetworkAdmin', 'ConfigGenerationService']
+__all__ = ['DataStore', 'IPAllocator', 'IPRemapper', 'KeyGenerator', 'PeerStateReader', 'StateCache', 'WireGuardConfig', 'WireGuardConfigFile', 'CommonTools', 'ClientHandler', 'ServiceMonitor', 'ConfigKeeper',
+           'NetworkAdmin', 'ConfigGenerationService', 'ConfigCache', 'TrafficHistory']
@@ -15,6 +15,8 @@ TR: ClientHandler Manager - WireGuard istemci yaşam döngüsü ve işlemlerini
 
     Ana Sorumluluklar:
         - Yeni istemci ekleme ve kriptografik anahtar yönetimi
+        - Toplu istemci ekleme (tek transaction, tek yapılandırma yazımı)
+        - Toplu istemci kaldırma ve etkin olmayan istemcileri temizleme
         - Mevcut istemci kaldırma ve temizlik işlemleri
         - İstemci listesi görüntüleme (sayfalama ve arama desteği)
         - İstemci yapılandırma dosyası dışa aktarma
@@ -50,6 +52,8 @@ EN: ClientHandler Manager - Manage WireGuard client lifecycle and operations
 
     Main Responsibilities:
         - New client addition and cryptographic key management
+        - Bulk client addition (one transaction, one configuration write)
+        - Bulk client removal and pruning of inactive clients
         - Existing client removal and cleanup operations
         - Client listing with pagination and search support
         - Client configuration file export
@@ -83,15 +87,23 @@ WireGuard® is a registered trademark of Jason A. Donenfeld.
 """
 
 import os
+import json
+import time
+import base64
+import binascii
+import sqlite3
+import tarfile
+import zipfile
 from pathlib import Path
-from typing import Dict, Any, Optional
-from datetime import datetime
-from textwrap import dedent
+from typing import Dict, Any, List, Optional, Tuple, Union
+from datetime import datetime, timedelta
 
 from phantom.api.exceptions import (
+    ClientError,
     ClientExistsError,
     ClientNotFoundError,
     InvalidClientNameError,
+    InvalidParameterError,
     ServiceOperationError,
     IPAllocationError
 )
@@ -99,6 +111,12 @@ from phantom.api.exceptions import (
 from ..models import (
     WireGuardClient,
     ClientAddResult,
+    BulkClientAddResult,
+    BulkClientEntry,
+    BulkClientRemoveResult,
+    BulkClientExportResult,
+    ClientPruneResult,
+    PruneCandidate,
     ClientRemoveResult,
     ClientExportResult,
     LatestClientsResult,
@@ -109,12 +127,18 @@ from ..models import (
     ActiveConnectionsMap
 )
 from .service_monitor import ServiceMonitor
+from .state_cache import StateCache
+from .config_cache import ConfigCache
+from .wg_config import WireGuardConfigFile
 
 from .default_constants import (
     DEFAULT_HOST_CIDR,
     DEFAULT_PAGE_SIZE,
     DEFAULT_LATEST_COUNT,
     DEFAULT_WG_NETWORK,
+    CONFIG_CACHE_DIR,
+    EXPORTS_DIR,
+    EXPORT_FORMATS,
     WG_CONFIG_PERMISSIONS
 )
 
@@ -139,7 +163,8 @@ class ClientHandler:
     """
 
     def __init__(self, data_store, key_generator, common_tools, config: Dict[str, Any],
-                 run_command, wg_interface: str, wg_config_file: Path, install_dir: Path):
+                 run_command, wg_interface: str, wg_config_file: Path, install_dir: Path,
+                 state_cache: Optional[StateCache] = None, wg_config: Optional[WireGuardConfigFile] = None):
         self.data_store = data_store
         self.key_generator = key_generator
         self.common_tools = common_tools
@@ -148,9 +173,12 @@ class ClientHandler:
         self.wg_interface = wg_interface
         self.wg_config_file = wg_config_file
         self.install_dir = install_dir
+        self.state_cache = state_cache or StateCache()
+        self.wg_config = wg_config or WireGuardConfigFile(wg_config_file)
 
         from .config_generation_service import ConfigGenerationService
         self.config_service = ConfigGenerationService(config)
+        self.config_cache = ConfigCache(install_dir / "data" / CONFIG_CACHE_DIR, self.config_service)
 
         self.service_monitor = ServiceMonitor(
             data_store=data_store,
@@ -159,7 +187,8 @@ class ClientHandler:
             run_command=run_command,
             wg_interface=wg_interface,
             wg_config_file=wg_config_file,
-            install_dir=install_dir
+            install_dir=install_dir,
+            state_cache=self.state_cache
         )
 
         self.core_module = None
@@ -253,6 +282,129 @@ class ClientHandler:
                 "For details, check the logs at /opt/phantom-wg/logs/"
             )
 
+    def add_new_clients(self, client_names: Union[List[str], str]) -> BulkClientAddResult:
+        """Add many clients with one transaction, one config write and one kernel update.
+
+        Names that are invalid, duplicated or already taken are reported as
+        failures without affecting the rest of the batch. If a shared step
+        (database, server configuration or applying to WireGuard) fails, every
+        client of the batch is rolled back.
+
+        Args:
+            client_names: List of client names, or a comma separated string
+
+        Returns:
+            BulkClientAddResult with one entry per requested name
+        """
+        if isinstance(client_names, str):
+            client_names = [name.strip() for name in client_names.split(",") if name.strip()]
+        if not client_names:
+            raise InvalidClientNameError("At least one client name is required")
+
+        entries: Dict[int, BulkClientEntry] = {}
+        pending = []
+        seen = set()
+
+        # Validate every name up front, failures do not stop the batch
+        for index, client_name in enumerate(client_names):
+            try:
+                self.common_tools.ensure_name_is_valid(client_name)
+                if client_name in seen:
+                    raise ClientExistsError(f"Client '{client_name}' is listed more than once")
+                if self.data_store.check_if_client_exists(client_name):
+                    raise ClientExistsError(f"Client '{client_name}' already exists")
+            except ClientError as e:
+                entries[index] = BulkClientEntry(name=str(client_name), success=False, error=e.message)
+                continue
+            seen.add(client_name)
+            # Keys are generated before the transaction so the write lock is held briefly
+            private_key = self.key_generator.create_private_key()
+            pending.append((index, client_name, private_key,
+                            self.key_generator.derive_public_key(private_key),
+                            self.key_generator.create_preshared_key()))
+
+        created: List[WireGuardClient] = []
+        original_config = self._read_server_configuration()
+
+        try:
+            with self.data_store.transaction():
+                for index, client_name, private_key, public_key, preshared_key in pending:
+                    try:
+                        client_ip = self.data_store.allocate_next_available_ip()
+                    except ValueError:
+                        current_subnet = self.config.get("wireguard", {}).get("network", DEFAULT_WG_NETWORK)
+                        entries[index] = BulkClientEntry(
+                            name=client_name, success=False,
+                            error=f"No available IP addresses in subnet {current_subnet}"
+                        )
+                        continue
+
+                    client = WireGuardClient(
+                        name=client_name,
+                        ip=client_ip,
+                        private_key=private_key,
+                        public_key=public_key,
+                        preshared_key=preshared_key,
+                        created=datetime.now(),
+                        enabled=True
+                    )
+                    self.data_store.store_new_client(client)
+                    created.append(client)
+                    entries[index] = BulkClientEntry(
+                        name=client_name, success=True, ip=client_ip, public_key=client.public_key
+                    )
+
+                # Single server configuration write, still inside the transaction so
+                # a failed write also discards the database rows
+                if created:
+                    server_config = self.wg_config.load()
+                    for c in created:
+                        server_config.add_client_peer(c.name, c.public_key, c.preshared_key, c.ip)
+                    self.wg_config.save(server_config)
+
+        except (OSError, IOError, ValueError, sqlite3.Error) as e:
+            import logging
+            logger = logging.getLogger(__name__)
+            logger.error(f"Failed to add client batch: {e}")
+            self._restore_server_configuration(original_config)
+            raise ServiceOperationError(
+                "Unable to add the clients. No client from this batch was added.\n"
+                "• Database access issues - ensure /opt/phantom-wg/data/ is writable\n"
+                "• WireGuard config file must be writable at /etc/wireguard/wg_main.conf\n"
+                "For details, check the logs at /opt/phantom-wg/logs/"
+            )
+
+        apply_method = "none"
+        if created:
+            should_restart = (self.core_module.restart_service_after_client_creation
+                              if self.core_module else self.restart_service_after_client_creation)
+            try:
+                if should_restart:
+                    self._restart_wireguard_service_if_needed()
+                    apply_method = "restart"
+                else:
+                    applied = self.add_peers_to_server_dynamically(created)
+                    apply_method = "dynamic" if applied else "restart"
+            except ServiceOperationError:
+                # Neither the dynamic update nor the restart worked, undo the whole batch
+                with self.data_store.transaction():
+                    for client in created:
+                        self.data_store.remove_existing_client(client.name)
+                self._restore_server_configuration(original_config)
+                raise
+
+        results = [entries[index] for index in sorted(entries)]
+        added = len(created)
+        failed = len(results) - added
+
+        return BulkClientAddResult(
+            results=results,
+            added=added,
+            failed=failed,
+            apply_method=apply_method,
+            message=f"Added {added} of {len(results)} clients"
+        )
+
     def remove_existing_client(self, client_name: str) -> ClientRemoveResult:
 
         if not client_name:
@@ -287,6 +439,8 @@ class ClientHandler:
             else:
                 self.delete_peer_to_server_dynamically(client_name, client_public_key)
 
+            self._discard_cached_configs([client_name])
+
             result = ClientRemoveResult(
                 removed=True,
                 client_name=client_name,
@@ -307,70 +461,254 @@ class ClientHandler:
                 "Try running the command with sudo if permission issues persist."
             )
 
-    def list_all_clients(self, page: int = 1, per_page: int = DEFAULT_PAGE_SIZE,
-                         search: Optional[str] = None) -> ClientListResult:
+    def remove_existing_clients(self, client_names: Union[List[str], str]) -> BulkClientRemoveResult:
+        """Remove many clients with one transaction, one config write and one kernel update.
 
-        # Get all clients from database
-        all_clients = self.data_store.get_all_clients()
+        The server configuration is parsed once, all matching [Peer] sections
+        are dropped and the file is replaced atomically. Unknown names are
+        reported per client. If a shared step fails, the whole batch is
+        rolled back.
 
-        # Get active connections
-        active_connections = self._get_active_connections()
+        Args:
+            client_names: List of client names, or a comma separated string
 
-        # Build client info list
-        client_infos = []
-        for client in all_clients:
-            # Apply search filter
-            if search and search.lower() not in client.name.lower():
+        Returns:
+            BulkClientRemoveResult with one entry per requested name
+        """
+        if isinstance(client_names, str):
+            client_names = [name.strip() for name in client_names.split(",") if name.strip()]
+        if not client_names:
+            raise InvalidClientNameError("At least one client name is required")
+
+        entries: List[BulkClientEntry] = []
+        clients: List[WireGuardClient] = []
+        seen = set()
+
+        for client_name in client_names:
+            client = self.data_store.find_client_by_name(client_name) if client_name not in seen else None
+            if not client:
+                reason = "is listed more than once" if client_name in seen else "not found"
+                entries.append(BulkClientEntry(
+                    name=str(client_name), success=False, error=f"Client '{client_name}' {reason}"
+                ))
                 continue
+            seen.add(client_name)
+            clients.append(client)
+            entries.append(BulkClientEntry(
+                name=client.name, success=True, ip=client.ip, public_key=client.public_key
+            ))
+
+        apply_method = self._remove_clients_batch(clients) if clients else "none"
+
+        removed = len(clients)
+        return BulkClientRemoveResult(
+            results=entries,
+            removed=removed,
+            failed=len(entries) - removed,
+            apply_method=apply_method,
+            message=f"Removed {removed} of {len(entries)} clients"
+        )
+
+    def prune_inactive_clients(self, inactive_days: int, confirm: bool = False) -> ClientPruneResult:
+        """Remove clients without a handshake in the last N days.
+
+        A client counts as inactive when neither its latest handshake nor its
+        creation time falls inside the window, so freshly added clients that
+        have not connected yet are kept. Without confirm only the candidates
+        are returned.
+
+        Args:
+            inactive_days: Size of the inactivity window in days
+            confirm: Must be True to actually remove the candidates
+
+        Returns:
+            ClientPruneResult with the candidates and, if confirmed, the removal report
+        """
+        try:
+            inactive_days = int(inactive_days)
+        except (TypeError, ValueError):
+            inactive_days = -1
+        if inactive_days < 1:
+            raise InvalidParameterError("inactive_days must be a positive number of days")
+
+        handshakes = self.service_monitor.gather_latest_handshakes()
+        if handshakes is None:
+            raise ServiceOperationError(
+                f"Unable to read handshakes from interface {self.wg_interface}. "
+                "Inactive clients can only be determined while WireGuard is running."
+            )
 
-            # Build client info
-            client_info = ClientInfo(
+        cutoff = datetime.now() - timedelta(days=inactive_days)
+        cutoff_epoch = cutoff.timestamp()
+
+        candidates: List[PruneCandidate] = []
+        for client in self.state_cache.get_clients(self.data_store):
+            handshake = handshakes.get(client.public_key, 0)
+            if handshake >= cutoff_epoch or client.created >= cutoff:
+                continue
+            candidates.append(PruneCandidate(
                 name=client.name,
                 ip=client.ip,
-                enabled=client.enabled,
                 created=client.created.isoformat(),
-                connected=client.name in active_connections,
-                connection=active_connections.get(client.name) if client.name in active_connections else None
+                last_handshake=datetime.fromtimestamp(handshake).isoformat() if handshake else None
+            ))
+
+        removal = None
+        if confirm and candidates:
+            removal = self.remove_existing_clients([c.name for c in candidates])
+
+        return ClientPruneResult(
+            inactive_days=inactive_days,
+            cutoff=cutoff.isoformat(),
+            candidates=candidates,
+            dry_run=not confirm,
+            removal=removal
+        )
+
+    def _remove_clients_batch(self, clients: List[WireGuardClient]) -> str:
+        original_config = self._read_server_configuration()
+
+        try:
+            with self.data_store.transaction():
+                for client in clients:
+                    self.data_store.remove_existing_client(client.name)
+
+                # O(1) removals from the peer index, one atomic write
+                if original_config is not None:
+                    server_config = self.wg_config.load()
+                    dropped = sum(1 for c in clients if server_config.remove_peer_by_ip(c.ip))
+                    if dropped:
+                        self.wg_config.save(server_config)
+                    if dropped != len(clients):
+                        import logging
+                        logging.getLogger(__name__).warning(
+                            f"{len(clients) - dropped} peers not found in server configuration"
+                        )
+
+        except (OSError, IOError, ValueError, sqlite3.Error) as e:
+            import logging
+            logger = logging.getLogger(__name__)
+            logger.error(f"Failed to remove client batch: {e}")
+            self._restore_server_configuration(original_config)
+            raise ServiceOperationError(
+                "Unable to remove the clients. No client from this batch was removed.\n"
+                "• You have proper permissions to modify WireGuard configuration\n"
+                "• The WireGuard config file exists at /etc/wireguard/wg_main.conf\n"
+                "• No other process is currently modifying the configuration"
             )
-            client_infos.append(client_info)
 
-        client_infos.sort(key=lambda x: x.created)
+        should_restart = (self.core_module.restart_service_after_client_creation
+                          if self.core_module else self.restart_service_after_client_creation)
+        try:
+            if should_restart:
+                self._restart_wireguard_service_if_needed()
+                apply_method = "restart"
+            else:
+                apply_method = "dynamic" if self.delete_peers_to_server_dynamically(clients) else "restart"
+        except ServiceOperationError:
+            # Neither the dynamic update nor the restart worked, put the batch back
+            with self.data_store.transaction():
+                for client in clients:
+                    self.data_store.store_new_client(client)
+            self._restore_server_configuration(original_config)
+            raise
+
+        self._discard_cached_configs([client.name for client in clients])
+        return apply_method
+
+    def list_all_clients(self, page: int = 1, per_page: int = DEFAULT_PAGE_SIZE,
+                         search: Optional[str] = None, cursor: Optional[str] = None) -> ClientListResult:
+        """List clients ordered by creation time, one page at a time.
 
-        # Calculate pagination
-        total_clients = len(client_infos)
-        total_pages = (total_clients + per_page - 1) // per_page if total_clients > 0 else 0
+        Only the requested page is read from the database (created/name
+        index) and only its rows are enriched with connection data. The
+        search term is a case-insensitive name prefix served from the name
+        index.
+
+        Args:
+            page: Page number, ignored when a cursor is given
+            per_page: Clients per page
+            search: Optional name prefix filter
+            cursor: Opaque next_cursor from a previous result; continues the
+                listing right after that result's last client
+
+        Returns:
+            ClientListResult with the page, the match count, pagination info
+            and next_cursor (None on the last page)
+        """
+        if per_page < 1:
+            raise InvalidParameterError("per_page must be a positive integer")
 
-        # Validate page number
-        if page < 1:
-            page = 1
-        elif 0 < total_pages < page:
-            page = total_pages
+        search = search or None
+        total_clients = self.data_store.count_clients(name_prefix=search)
+        total_pages = (total_clients + per_page - 1) // per_page if total_clients > 0 else 0
 
-        # Get page slice
-        start_idx = (page - 1) * per_page
-        end_idx = min(start_idx + per_page, total_clients)
-        paginated_clients = client_infos[start_idx:end_idx]
+        if cursor:
+            position = self._decode_list_cursor(cursor)
+            clients = self.data_store.get_clients_page(per_page + 1, name_prefix=search, after=position)
+            start_idx = self.data_store.count_clients_before(position, name_prefix=search)
+            page = start_idx // per_page + 1
+        else:
+            # Validate page number
+            if page < 1:
+                page = 1
+            elif 0 < total_pages < page:
+                page = total_pages
+            start_idx = (page - 1) * per_page
+            clients = self.data_store.get_clients_page(per_page + 1, offset=start_idx, name_prefix=search)
+
+        # One extra row tells whether another page follows without counting
+        has_next = len(clients) > per_page
+        clients = clients[:per_page]
+
+        # Connection data only for the rows being returned
+        active_connections = self._get_active_connections(clients) if clients else {}
+
+        paginated_clients = [
+            ClientInfo(
+                name=client.name,
+                ip=client.ip,
+                enabled=client.enabled,
+                created=client.created.isoformat(),
+                connected=client.name in active_connections,
+                connection=active_connections.get(client.name)
+            )
+            for client in clients
+        ]
 
         # Build pagination info
         pagination = PaginationInfo(
             page=page,
             per_page=per_page,
             total_pages=total_pages,
-            has_next=page < total_pages,
-            has_prev=page > 1,
+            has_next=has_next,
+            has_prev=start_idx > 0,
             showing_from=start_idx + 1 if paginated_clients else 0,
-            showing_to=end_idx
+            showing_to=start_idx + len(paginated_clients)
         )
 
-        # Create result
-        result = ClientListResult(
+        return ClientListResult(
             clients=paginated_clients,
             total=total_clients,
-            pagination=pagination
+            pagination=pagination,
+            next_cursor=self._encode_list_cursor(clients[-1]) if has_next else None
         )
 
-        # Return result
-        return result
+    @staticmethod
+    def _encode_list_cursor(client: WireGuardClient) -> str:
+        payload = json.dumps([client.created.isoformat(), client.name]).encode()
+        return base64.urlsafe_b64encode(payload).decode().rstrip("=")
+
+    @staticmethod
+    def _decode_list_cursor(cursor: str) -> Tuple[str, str]:
+        try:
+            padded = cursor + "=" * (-len(cursor) % 4)
+            created, name = json.loads(base64.urlsafe_b64decode(padded.encode()))
+            if not isinstance(created, str) or not isinstance(name, str):
+                raise ValueError("cursor fields must be strings")
+            return created, name
+        except (ValueError, TypeError, binascii.Error) as e:
+            raise InvalidParameterError(f"Invalid list cursor: {cursor}") from e
 
     def export_client_configuration(self, client_name: str) -> ClientExportResult:
         if not client_name:
@@ -382,8 +720,13 @@ class ClientHandler:
             raise ClientNotFoundError(f"Client '{client_name}' not found")
 
         try:
-            # Generate client configuration (convert to dict for compatibility)
-            config_content = self.config_service.generate_client_config(client.to_dict())
+            # Rendered configs are cached until the client or a global field changes
+            try:
+                config_content = self.config_cache.get_config(client)
+            except OSError as e:
+                import logging
+                logging.getLogger(__name__).warning(f"Config cache unavailable, rendering directly: {e}")
+                config_content = self.config_service.generate_client_config(client.to_dict())
 
             result = ClientExportResult(
                 client=client,
@@ -401,10 +744,119 @@ class ClientHandler:
                 "Please verify the client exists and has valid configuration."
             )
 
+    def export_client_configurations(self, client_names: Union[List[str], str, None] = None,
+                                     archive_format: str = "tar", output: Optional[str] = None,
+                                     include_qr: bool = False) -> BulkClientExportResult:
+        """Write the configurations of many clients into one tar.gz or zip archive.
+
+        Configurations come from the rendered config cache, so only clients
+        whose record or global settings changed since the last export are
+        rendered again. Entries are streamed from the cache files into the
+        archive one by one; nothing is collected in memory.
+
+        Args:
+            client_names: Names to export (list or comma separated string), all clients if empty
+            archive_format: "tar" (tar.gz) or "zip"
+            output: Archive path (default: <install_dir>/data/exports/phantom-clients-<timestamp>)
+            include_qr: Add an SVG QR code next to every config
+
+        Returns:
+            BulkClientExportResult with one entry per exported or missing client
+        """
+        if archive_format not in EXPORT_FORMATS:
+            raise InvalidParameterError(
+                f"Unsupported archive format '{archive_format}'. Use one of: {', '.join(EXPORT_FORMATS)}"
+            )
+
+        entries: List[BulkClientEntry] = []
+        if client_names:
+            if isinstance(client_names, str):
+                client_names = [name.strip() for name in client_names.split(",") if name.strip()]
+            clients = []
+            for client_name in dict.fromkeys(client_names):
+                client = self.data_store.find_client_by_name(client_name)
+                if client:
+                    clients.append(client)
+                else:
+                    entries.append(BulkClientEntry(
+                        name=str(client_name), success=False, error=f"Client '{client_name}' not found"
+                    ))
+        else:
+            clients = sorted(self.state_cache.get_clients(self.data_store), key=lambda c: c.name)
+
+        extension = "tar.gz" if archive_format == "tar" else "zip"
+        if output:
+            archive_path = Path(output)
+        else:
+            archive_path = self.install_dir / "data" / EXPORTS_DIR / f"phantom-clients-{time.strftime('%Y%m%d-%H%M%S')}.{extension}"
+
+        if not clients:
+            return BulkClientExportResult(
+                results=entries, archive=None, format=archive_format, exported=0,
+                failed=len(entries), rendered=0, cache_hits=0, qr_included=False,
+                size_bytes=0, message="No clients to export"
+            )
+
+        try:
+            cached = self.config_cache.render_many(clients, with_qr=include_qr)
+            archive_path.parent.mkdir(parents=True, exist_ok=True)
+            self._write_export_archive(archive_path, archive_format, cached)
+        except OSError as e:
+            import logging
+            logging.getLogger(__name__).error(f"Failed to export client configs: {e}")
+            raise ServiceOperationError(f"Unable to write export archive '{archive_path}': {e.strerror or e}")
+
+        for client in clients:
+            entries.append(BulkClientEntry(
+                name=client.name, success=True, ip=client.ip, public_key=client.public_key
+            ))
+
+        cache_hits = sum(1 for entry in cached if entry.hit)
+        return BulkClientExportResult(
+            results=entries,
+            archive=str(archive_path),
+            format=archive_format,
+            exported=len(cached),
+            failed=len(entries) - len(cached),
+            rendered=len(cached) - cache_hits,
+            cache_hits=cache_hits,
+            qr_included=any(entry.qr_path for entry in cached),
+            size_bytes=archive_path.stat().st_size,
+            message=f"Exported {len(cached)} client configurations to {archive_path}"
+        )
+
+    @staticmethod
+    def _archive_members(entry) -> List[Tuple[Path, str]]:
+        members = [(entry.path, f"{entry.name}.conf")]
+        if entry.qr_path:
+            members.append((entry.qr_path, f"{entry.name}.svg"))
+        return members
+
+    @staticmethod
+    def _write_export_archive(archive_path: Path, archive_format: str, cached) -> None:
+        # Archives hold private keys: create 0600 before anything is written
+        fd = os.open(archive_path, os.O_WRONLY | os.O_CREAT | os.O_TRUNC, WG_CONFIG_PERMISSIONS)
+        with os.fdopen(fd, 'wb') as archive_file:
+            if archive_format == "tar":
+                with tarfile.open(fileobj=archive_file, mode="w|gz") as archive:
+                    for entry in cached:
+                        for path, arcname in ClientHandler._archive_members(entry):
+                            info = archive.gettarinfo(str(path), arcname=arcname)
+                            info.mode = WG_CONFIG_PERMISSIONS
+                            info.uid = info.gid = 0
+                            info.uname = info.gname = "root"
+                            with open(path, 'rb') as f:
+                                archive.addfile(info, f)
+            else:
+                with zipfile.ZipFile(archive_file, mode="w", compression=zipfile.ZIP_DEFLATED) as archive:
+                    for entry in cached:
+                        for path, arcname in ClientHandler._archive_members(entry):
+                            archive.write(path, arcname=arcname)
+
     def get_recently_added_clients(self, count: int = DEFAULT_LATEST_COUNT) -> LatestClientsResult:
         try:
             # Get all clients sorted by creation date
-            all_clients = self.data_store.get_all_clients()
+            all_clients = self.state_cache.get_clients(self.data_store)
 
             # Sort by creation date (newest first)
             sorted_clients = sorted(
@@ -468,6 +920,7 @@ class ClientHandler:
         logger = logging.getLogger(__name__)
 
         logger.info(f"Adding peer {client_name} dynamically without service restart")
+        self.state_cache.invalidate_peer_state()
 
         try:
             # Build wg set command
@@ -513,6 +966,57 @@ class ClientHandler:
             self._restart_wireguard_service_if_needed()
             return False
 
+    def add_peers_to_server_dynamically(self, clients: List[WireGuardClient]) -> bool:
+        """Add many peers to the running interface with a single wg invocation.
+
+        Peers are passed to 'wg addconf' on stdin, so preshared keys never
+        touch the filesystem and the whole batch costs one subprocess. The
+        server configuration file is written by the caller, so no
+        'wg-quick save' is needed.
+
+        Args:
+            clients: Clients whose peers should be added
+
+        Returns:
+            True if peers were added dynamically, False if fallback to restart was needed
+        """
+
+        import logging
+        logger = logging.getLogger(__name__)
+
+        logger.info(f"Adding {len(clients)} peers dynamically without service restart")
+        self.state_cache.invalidate_peer_state()
+
+        peers_config = "\n".join(
+            f"[Peer]\nPublicKey = {c.public_key}\nPresharedKey = {c.preshared_key}\n"
+            f"AllowedIPs = {c.ip}{DEFAULT_HOST_CIDR}\n"
+            for c in clients
+        )
+
+        try:
+            result = self._run_command(
+                ["wg", "addconf", self.wg_interface, "/dev/stdin"],
+                input=peers_config,
+                text=True,
+                capture_output=True
+            )
+
+            if result.returncode != 0:
+                error_msg = result.stderr or "Unknown error"
+                logger.error(f"Failed to add peers dynamically: {error_msg}")
+                logger.info("Falling back to service restart method")
+                self._restart_wireguard_service_if_needed()
+                return False
+
+            logger.info(f"Successfully added {len(clients)} peers dynamically")
+            return True
+
+        except (OSError, RuntimeError, ValueError) as e:
+            logger.error(f"Exception during dynamic peer addition: {e}")
+            logger.info("Falling back to service restart method due to exception")
+            self._restart_wireguard_service_if_needed()
+            return False
+
     def delete_peer_to_server_dynamically(self, client_name: str, public_key: str) -> bool:
         """Remove peer from server without restarting WireGuard service.
 
@@ -528,6 +1032,7 @@ class ClientHandler:
         logger = logging.getLogger(__name__)
 
         logger.info(f"Removing peer {client_name} dynamically without service restart")
+        self.state_cache.invalidate_peer_state()
 
         try:
             # Build wg set command to remove peer
@@ -571,6 +1076,49 @@ class ClientHandler:
             self._restart_wireguard_service_if_needed()
             return False
 
+    def delete_peers_to_server_dynamically(self, clients: List[WireGuardClient]) -> bool:
+        """Remove many peers from the running interface with a single wg invocation.
+
+        Builds one 'wg set <interface> peer A remove peer B remove ...' command.
+        The server configuration file is written by the caller, so no
+        'wg-quick save' is needed.
+
+        Args:
+            clients: Clients whose peers should be removed
+
+        Returns:
+            True if peers were removed dynamically, False if fallback to restart was needed
+        """
+
+        import logging
+        logger = logging.getLogger(__name__)
+
+        logger.info(f"Removing {len(clients)} peers dynamically without service restart")
+        self.state_cache.invalidate_peer_state()
+
+        cmd = ["wg", "set", self.wg_interface]
+        for client in clients:
+            cmd.extend(["peer", client.public_key, "remove"])
+
+        try:
+            result = self._run_command(cmd, capture_output=True, text=True)
+
+            if result.returncode != 0:
+                error_msg = result.stderr or "Unknown error"
+                logger.error(f"Failed to remove peers dynamically: {error_msg}")
+                logger.info("Falling back to service restart method")
+                self._restart_wireguard_service_if_needed()
+                return False
+
+            logger.info(f"Successfully removed {len(clients)} peers dynamically")
+            return True
+
+        except (OSError, RuntimeError, ValueError) as e:
+            logger.error(f"Exception during dynamic peer removal: {e}")
+            logger.info("Falling back to service restart method due to exception")
+            self._restart_wireguard_service_if_needed()
+            return False
+
     def add_peer_to_server_configuration(self, client_name: str, public_key: str,
                                          preshared_key: str, client_ip: str) -> None:
         """Add peer configuration to server config file.
@@ -581,21 +1129,11 @@ class ClientHandler:
             preshared_key: Pre-shared key for additional security
             client_ip: IP address allocated to client
         """
+        server_config = self.wg_config.load()
+        server_config.add_client_peer(client_name, public_key, preshared_key, client_ip)
 
-        peer_config = dedent(f"""
-            [Peer] # {client_name}
-            PublicKey = {public_key}
-            PresharedKey = {preshared_key}
-            AllowedIPs = {client_ip}/32
-
-            """)
-
-        # Append to server configuration
-        with open(self.wg_config_file, 'a') as f:
-            f.write(peer_config)
-
-        # Set secure file permissions
-        os.chmod(self.wg_config_file, WG_CONFIG_PERMISSIONS)
+        # Atomic write with secure file permissions
+        self.wg_config.save(server_config)
 
     def remove_peer_from_server_configuration(self, client_ip: str) -> bool:
         """Remove peer configuration from server config file based on IP address
@@ -607,71 +1145,50 @@ class ClientHandler:
             bool: True if peer was found and removed, False otherwise
         """
 
-        if not self.wg_config_file.exists():
+        if not self.wg_config.exists():
             return False
 
-        content = self.wg_config_file.read_text()
-        lines = content.split('\n')
+        server_config = self.wg_config.load()
+        removed = server_config.remove_peer_by_ip(client_ip)
 
-        # Parse config into sections
-        sections = []
-        current_section = []
+        if removed:
+            # Atomic write with secure file permissions
+            self.wg_config.save(server_config)
 
-        for line in lines:
-            if line.strip().startswith('['):
-                if current_section:
-                    sections.append(current_section)
-                current_section = [line]
-            else:
-                current_section.append(line)
-
-        # Add last section
-        if current_section:
-            sections.append(current_section)
-
-        # Find and remove peer with matching IP
-        peer_removed = False
-        new_sections = []
-
-        for section in sections:
-            # Check if peer section has target IP
-            if section and section[0].strip().startswith('[Peer'):
-                # Look for AllowedIPs with target IP
-                has_target_ip = any(
-                    line.strip().startswith('AllowedIPs') and
-                    f"{client_ip}/32" in line
-                    for line in section
-                )
-
-                if has_target_ip:
-                    peer_removed = True
-                    continue  # Skip matched section
+        return removed
 
-            new_sections.append(section)
-
-        if peer_removed:
-            # Reconstruct configuration
-            new_lines = []
-            for i, section in enumerate(new_sections):
-                new_lines.extend(section)
-                # Add separator between sections
-                if i < len(new_sections) - 1:
-                    new_lines.append('')
+    # Private helper methods
 
-            # Write modified config
-            new_content = '\n'.join(new_lines)
-            self.wg_config_file.write_text(new_content)
+    def _read_server_configuration(self) -> Optional[str]:
+        return self.wg_config.read_text()
 
-            # Set secure file permissions
-            os.chmod(self.wg_config_file, WG_CONFIG_PERMISSIONS)
+    def _write_server_configuration(self, content: str) -> None:
+        """Replace the server configuration atomically (temp file, fsync, rename)."""
+        self.wg_config.write_text(content)
 
-        return peer_removed
+    def _restore_server_configuration(self, original: Optional[str]) -> None:
+        # The cached model may still hold the aborted change
+        self.wg_config.invalidate()
+        try:
+            if original is None:
+                if self.wg_config_file.exists():
+                    self.wg_config_file.unlink()
+            elif self._read_server_configuration() != original:
+                self._write_server_configuration(original)
+        except OSError as e:
+            import logging
+            logging.getLogger(__name__).error(f"Failed to restore server configuration: {e}")
 
-    # Private helper methods
+    def _discard_cached_configs(self, client_names: List[str]) -> None:
+        try:
+            self.config_cache.discard(client_names)
+        except OSError as e:
+            import logging
+            logging.getLogger(__name__).warning(f"Failed to discard cached configs: {e}")
 
-    def _get_active_connections_typed(self) -> ActiveConnectionsMap:
+    def _get_active_connections_typed(self, clients: Optional[List[WireGuardClient]] = None) -> ActiveConnectionsMap:
         # Use ServiceMonitor instance
-        active_connections = self.service_monitor.gather_active_connections()
+        active_connections = self.service_monitor.gather_active_connections(clients)
 
         # Format connections for listing
         formatted_connections = {}
@@ -688,8 +1205,8 @@ class ClientHandler:
 
         return ActiveConnectionsMap(connections=formatted_connections)
 
-    def _get_active_connections(self) -> Dict[str, Any]:
-        result: ActiveConnectionsMap = self._get_active_connections_typed()
+    def _get_active_connections(self, clients: Optional[List[WireGuardClient]] = None) -> Dict[str, Any]:
+        result: ActiveConnectionsMap = self._get_active_connections_typed(clients)
         return result.to_dict()
 
     def _restart_wireguard_service_if_needed(self) -> None:
@@ -0,0 +1,244 @@
+"""
+██████╗ ██╗  ██╗ █████╗ ███╗   ██╗████████╗ ██████╗ ███╗   ███╗
+██╔══██╗██║  ██║██╔══██╗████╗  ██║╚══██╔══╝██╔═══██╗████╗ ████║
+██████╔╝███████║███████║██╔██╗ ██║   ██║   ██║   ██║██╔████╔██║
+██╔═══╝ ██╔══██║██╔══██║██║╚██╗██║   ██║   ██║   ██║██║╚██╔╝██║
+██║     ██║  ██║██║  ██║██║ ╚████║   ██║   ╚██████╔╝██║ ╚═╝ ██║
+╚═╝     ╚═╝  ╚═╝╚═╝  ╚═╝╚═╝  ╚═══╝   ╚═╝    ╚═════╝ ╚═╝     ╚═╝
+
+TR: ConfigCache - İçerik adresli işlenmiş istemci yapılandırma önbelleği
+    ====================================================================
+
+    ConfigGenerationService çıktısını ve QR (SVG) yüklerini veri dizininde
+    saklar. Her girdinin adı, yapılandırmayı belirleyen girdilerin SHA-256
+    özetidir: istemci anahtarları ve IP'si ile global DNS, endpoint, port,
+    sunucu açık anahtarı ve ağ alanları.
+
+    Geçersiz Kılma:
+        - Global alanların özeti index.json içinde tutulur; change_dns_servers,
+          change_subnet, anahtar değişimi veya elle düzenleme bu özeti
+          değiştirdiğinde önbellek bir sonraki erişimde tamamen temizlenir
+        - İstemci kaydı değiştiğinde (ör. subnet geçişinde yeni IP) eski
+          girdi silinir, istemci kaldırıldığında girdisi atılır
+
+    Dosyalar özel anahtar içerdiği için dizin 0700, dosyalar 0600 izinleriyle
+    atomik olarak yazılır.
+
+EN: ConfigCache - Content addressed cache of rendered client configurations
+    ======================================================================
+
+    Stores ConfigGenerationService output and QR (SVG) payloads in the data
+    directory. Every entry is named after the SHA-256 digest of the inputs
+    that determine the configuration: the client keys and IP plus the global
+    DNS, endpoint, port, server public key and network fields.
+
+    Invalidation:
+        - The digest of the global fields is kept in index.json; when
+          change_dns_servers, change_subnet, key rotation or a manual edit
+          changes it, the whole cache is cleared on the next access
+        - When a client record changes (e.g. a new IP after a subnet change)
+          its old entry is deleted, removed clients are discarded
+
+    Entries contain private keys, so the directory is created 0700 and files
+    are written atomically with 0600 permissions.
+
+Copyright (c) 2025 Rıza Emre ARAS <r.emrearas@proton.me>
+Licensed under AGPL-3.0 - see LICENSE file for details
+Third-party licenses - see THIRD_PARTY_LICENSES file for details
+WireGuard® is a registered trademark of Jason A. Donenfeld.
+"""
+
+import hashlib
+import json
+import os
+import tempfile
+import threading
+from dataclasses import dataclass
+from pathlib import Path
+from typing import Any, Dict, Iterable, List, Optional
+
+from .config_generation_service import ConfigGenerationService
+from .default_constants import WG_CONFIG_PERMISSIONS
+from ..models import WireGuardClient
+
+# QR code generation support
+try:
+    import qrcode
+    import qrcode.image.svg
+
+    QRCODE_AVAILABLE = True
+except ImportError:
+    qrcode = None
+    QRCODE_AVAILABLE = False
+
+# Bump when the config template changes so old renders are not reused
+CONFIG_TEMPLATE_VERSION = 1
+
+INDEX_FILENAME = "index.json"
+
+
+@dataclass
+class CachedConfig:
+    """A rendered configuration on disk."""
+    name: str
+    digest: str
+    path: Path
+    hit: bool
+    qr_path: Optional[Path] = None
+
+    def read(self) -> str:
+        return self.path.read_text()
+
+
+class ConfigCache:
+    """Content addressed store of rendered client configurations.
+
+    Args:
+        cache_dir: Directory holding the entries and index.json
+        config_service: Service used to render configs on a cache miss
+    """
+
+    def __init__(self, cache_dir: Path, config_service: ConfigGenerationService):
+        self.cache_dir = cache_dir
+        self.config_service = config_service
+        self._lock = threading.Lock()
+
+    @staticmethod
+    def _digest(payload: Any) -> str:
+        encoded = json.dumps(payload, sort_keys=True, separators=(",", ":")).encode()
+        return hashlib.sha256(encoded).hexdigest()
+
+    def globals_digest(self, settings: Optional[Dict[str, Any]] = None) -> str:
+        settings = settings or self.config_service.global_settings()
+        return self._digest({"template": CONFIG_TEMPLATE_VERSION, "settings": settings})
+
+    def client_digest(self, client: WireGuardClient, globals_digest: str) -> str:
+        return self._digest({
+            "globals": globals_digest,
+            "private_key": client.private_key,
+            "preshared_key": client.preshared_key,
+            "ip": client.ip
+        })
+
+    # Index
+
+    def _load_index(self) -> Dict[str, Any]:
+        try:
+            with open(self.cache_dir / INDEX_FILENAME, 'r') as f:
+                index = json.load(f)
+            if isinstance(index.get("clients"), dict):
+                return index
+        except (OSError, ValueError, AttributeError):
+            pass
+        return {"globals": None, "clients": {}}
+
+    def _write_atomic(self, path: Path, data: bytes):
+        fd, tmp_path = tempfile.mkstemp(dir=self.cache_dir, prefix=f".{path.name}.")
+        try:
+            os.fchmod(fd, WG_CONFIG_PERMISSIONS)
+            with os.fdopen(fd, 'wb') as f:
+                f.write(data)
+            os.replace(tmp_path, path)
+        except OSError:
+            if os.path.exists(tmp_path):
+                os.unlink(tmp_path)
+            raise
+
+    def _save_index(self, index: Dict[str, Any]):
+        self._write_atomic(self.cache_dir / INDEX_FILENAME, json.dumps(index, indent=2).encode())
+
+    def _entry_paths(self, digest: str) -> List[Path]:
+        return [self.cache_dir / f"{digest}.conf", self.cache_dir / f"{digest}.svg"]
+
+    def _drop(self, digest: str):
+        for path in self._entry_paths(digest):
+            try:
+                path.unlink()
+            except FileNotFoundError:
+                pass
+
+    def _clear_entries(self):
+        for path in self.cache_dir.iterdir():
+            if path.suffix in (".conf", ".svg"):
+                path.unlink()
+
+    # Public API
+
+    def render_many(self, clients: Iterable[WireGuardClient], with_qr: bool = False) -> List[CachedConfig]:
+        """Return cached renders for clients, rendering only what changed.
+
+        The global settings are resolved once for the whole batch and the
+        index is written at most once.
+
+        Args:
+            clients: Client records to render
+            with_qr: Also produce an SVG QR payload per client (needs qrcode)
+
+        Returns:
+            List of CachedConfig in the order of clients
+        """
+        settings = self.config_service.global_settings()
+        globals_digest = self.globals_digest(settings)
+
+        with self._lock:
+            self.cache_dir.mkdir(parents=True, exist_ok=True, mode=0o700)
+            index = self._load_index()
+            dirty = False
+
+            if index["globals"] != globals_digest:
+                # DNS, endpoint, port, server key or network changed: nothing is reusable
+                self._clear_entries()
+                index = {"globals": globals_digest, "clients": {}}
+                dirty = True
+
+            results = []
+            for client in clients:
+                digest = self.client_digest(client, globals_digest)
+                config_path, qr_path = self._entry_paths(digest)
+
+                previous = index["clients"].get(client.name)
+                if previous is not None and previous != digest:
+                    self._drop(previous)
+                if previous != digest:
+                    index["clients"][client.name] = digest
+                    dirty = True
+
+                hit = config_path.exists()
+                if not hit:
+                    content = self.config_service.generate_client_config(client.to_dict(), settings)
+                    self._write_atomic(config_path, content.encode())
+
+                entry = CachedConfig(name=client.name, digest=digest, path=config_path, hit=hit)
+                if with_qr and QRCODE_AVAILABLE:
+                    if not qr_path.exists():
+                        self._write_atomic(qr_path, self._render_qr(entry.read()))
+                    entry.qr_path = qr_path
+                results.append(entry)
+
+            if dirty:
+                self._save_index(index)
+
+        return results
+
+    def render(self, client: WireGuardClient, with_qr: bool = False) -> CachedConfig:
+        return self.render_many([client], with_qr=with_qr)[0]
+
+    def get_config(self, client: WireGuardClient) -> str:
+        """Rendered configuration text of a client (cached)."""
+        return self.render(client).read()
+
+    def discard(self, client_names: Iterable[str]):
+        """Forget removed clients and delete their entries."""
+        with self._lock:
+            index = self._load_index()
+            removed = [index["clients"].pop(name) for name in client_names if name in index["clients"]]
+            if not removed:
+                return
+            for digest in removed:
+                self._drop(digest)
+            self._save_index(index)
+
+    @staticmethod
+    def _render_qr(content: str) -> bytes:
+        image = qrcode.make(content, image_factory=qrcode.image.svg.SvgPathImage)
+        return image.to_string()
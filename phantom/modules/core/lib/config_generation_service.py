@@ -12,14 +12,14 @@ TR: ConfigGenerationService - Dinamik WireGuard yapılandırma dosyası üretimi
     Bu servis, WireGuard istemci yapılandırma dosyalarını dinamik olarak üretir.
     
     Ana Sorumluluklar:
-        - İstemci verilerini TinyDB'den alma
+        - İstemci verilerini veritabanından alma
         - Global ayarları phantom.json'dan okuma
         - WireGuard yapılandırma formatında birleştirme
         - DNS, MTU, endpoint ayarlarını ekleme
         - Güvenlik anahtarlarını (preshared) dahil etme
         
     Veri Kaynakları:
-        - TinyDB: İstemci özel anahtarı, IP adresi, preshared key
+        - Veritabanı: İstemci özel anahtarı, IP adresi, preshared key
         - Global Config: DNS sunucuları, sunucu bilgileri, port
         - Sabit Değerler: MTU (1420), keepalive (25)
         
@@ -35,14 +35,14 @@ EN: ConfigGenerationService - Dynamic WireGuard configuration file generation
     This service dynamically generates WireGuard client configuration files.
 
     Main Responsibilities:
-        - Retrieve client data from TinyDB
+        - Retrieve client data from the client database
         - Read global settings from phantom.json
         - Combine in WireGuard configuration format
         - Add DNS, MTU, endpoint settings
         - Include security keys (preshared)
         
     Data Sources:
-        - TinyDB: Client private key, IP address, preshared key
+        - Database: Client private key, IP address, preshared key
         - Global Config: DNS servers, server info, port
         - Static Values: MTU (1420), keepalive (25)
         
@@ -58,7 +58,7 @@ Third-party licenses - see THIRD_PARTY_LICENSES file for details
 WireGuard® is a registered trademark of Jason A. Donenfeld.
 """
 
-from typing import Dict, Any
+from typing import Dict, Any, Optional
 from textwrap import dedent
 
 from .default_constants import (
@@ -88,47 +88,63 @@ class ConfigGenerationService:
     def __init__(self, config: Dict[str, Any]):
         self.config = config
 
-    def generate_client_config(self, client_data: Dict[str, Any]) -> str:
-        """Generate WireGuard configuration content for a client.
+    def global_settings(self) -> Dict[str, Any]:
+        """Resolve the phantom.json fields every client configuration depends on.
 
-        Args:
-            client_data: Dictionary containing client's private_key, ip,
-                         and optionally preshared_key
+        The same values are used by generate_client_config and by the
+        rendered config cache to fingerprint the global part of a config.
 
         Returns:
-            String containing complete WireGuard configuration file content
+            Dict with dns_primary, dns_secondary, server_public_key,
+            endpoint_host, port and network
         """
         dns_config = self.config.get("dns", {})
-        dns_primary = dns_config.get("primary", DEFAULT_DNS_PRIMARY)
-        dns_secondary = dns_config.get("secondary", DEFAULT_DNS_SECONDARY)
-
         wg_config = self.config.get("wireguard", {})
         server_config = self.config.get("server", {})
 
-        server_public_key = server_config.get("public_key", "")
-
         # Try multiple config locations for endpoint
         server_ip = (wg_config.get("server_ip") or
                      server_config.get("ip") or
                      wg_config.get("endpoint") or
                      "YOUR_SERVER_IP")
 
-        server_port = wg_config.get("port", DEFAULT_WG_PORT)
-        network = wg_config.get("network", DEFAULT_WG_NETWORK)
+        return {
+            "dns_primary": dns_config.get("primary", DEFAULT_DNS_PRIMARY),
+            "dns_secondary": dns_config.get("secondary", DEFAULT_DNS_SECONDARY),
+            "server_public_key": server_config.get("public_key", ""),
+            "endpoint_host": server_ip,
+            "port": wg_config.get("port", DEFAULT_WG_PORT),
+            "network": wg_config.get("network", DEFAULT_WG_NETWORK)
+        }
+
+    def generate_client_config(self, client_data: Dict[str, Any],
+                               settings: Optional[Dict[str, Any]] = None) -> str:
+        """Generate WireGuard configuration content for a client.
+
+        Args:
+            client_data: Dictionary containing client's private_key, ip,
+                         and optionally preshared_key
+            settings: Pre-resolved global_settings() (optional, resolved
+                      from config when not provided)
+
+        Returns:
+            String containing complete WireGuard configuration file content
+        """
+        settings = settings or self.global_settings()
 
         # Build WireGuard configuration
         config = dedent(f"""
             [Interface]
             PrivateKey = {client_data['private_key']}
             Address = {client_data['ip']}{DEFAULT_CLIENT_CIDR}
-            DNS = {dns_primary}, {dns_secondary}
+            DNS = {settings['dns_primary']}, {settings['dns_secondary']}
             MTU = {DEFAULT_MTU}
 
             [Peer]
-            PublicKey = {server_public_key}
+            PublicKey = {settings['server_public_key']}
             PresharedKey = {client_data.get('preshared_key', '')}
-            Endpoint = {server_ip}:{server_port}
-            AllowedIPs = 0.0.0.0/0, {network}
+            Endpoint = {settings['endpoint_host']}:{settings['port']}
+            AllowedIPs = 0.0.0.0/0, {settings['network']}
             PersistentKeepalive = {DEFAULT_KEEPALIVE}
             """).strip()
 
@@ -9,111 +9,74 @@
 TR: DataStore Manager - İstemci verilerini kalıcı olarak depolama ve yönetme
     ========================================================================
     
-    Bu sınıf, TinyDB veritabanı üzerinden tüm istemci verilerini ve IP tahsislerini
-    yönetir.
+    Bu sınıf, indeksli bir SQLite veritabanı üzerinden tüm istemci verilerini
+    ve IP tahsislerini yönetir.
     
     Ana Sorumluluklar:
-        - İstemci verilerini TinyDB'de saklama ve yönetme
+        - İstemci verilerini SQLite'ta saklama ve yönetme
         - IP adresi tahsisi ve takibi
         - Subnet değişiklikleri için IP yeniden haritalama
         - Veritabanı bütünlüğü ve tutarlılığı
+        - Eski TinyDB JSON dosyalarının otomatik taşınması
         
-    TinyDB Veritabanı Yapısı:
+    SQLite Veritabanı Yapısı:
         Dosya: self.data_dir / "clients.db"
         
-        clients tablosu örneği:
-        {
-          "_default": {
-            "1": {
-              "name": "john-laptop",
-              "ip": "10.8.0.2",
-              "private_key": "aBcD1234...",
-              "public_key": "xYz5678...",
-              "preshared_key": "PreShared123...",
-              "created": "2025-01-30T10:15:00",
-              "enabled": true
-            },
-            "2": {
-              "name": "alice-phone",
-              "ip": "10.8.0.3",
-              "private_key": "eFgH5678...",
-              "public_key": "MnO9012...",
-              "preshared_key": "PreShared456...",
-              "created": "2025-01-30T11:30:00",
-              "enabled": true
-            }
-          }
-        }
+        clients tablosu:
+            name TEXT PRIMARY KEY, ip TEXT UNIQUE, public_key TEXT UNIQUE,
+            private_key, preshared_key, created (ISO), enabled (0/1)
+            İndeks: created
         
-        ip_assignments tablosu örneği:
-        {
-          "_default": {
-            "1": {
-              "ip": "10.8.0.2",
-              "client_name": "john-laptop",
-              "assigned_at": "2025-01-30T10:15:00"
-            },
-            "2": {
-              "ip": "10.8.0.3",
-              "client_name": "alice-phone",
-              "assigned_at": "2025-01-30T11:30:00"
-            }
-          }
-        }
+        ip_assignments tablosu:
+            ip TEXT PRIMARY KEY, client_name TEXT UNIQUE, assigned_at (ISO)
+        
+        İsim, IP ve public key aramaları tam tablo taraması yerine benzersiz
+        indeksler üzerinden yapılır; yazma işlemleri yalnızca değişen satırı
+        etkiler. Journal modu DELETE olarak bırakılır, böylece clients.db
+        tek başına tutarlı bir dosyadır ve yedekleme için doğrudan kopyalanabilir.
+    
+    TinyDB Taşıma:
+        clients.db eski TinyDB JSON formatındaysa ilk açılışta tüm kayıtlar tek
+        bir transaction içinde SQLite'a aktarılır. Orijinal dosya
+        clients.db.tinydb.bak olarak saklanır ve yeni veritabanı atomik olarak
+        yerine taşınır. Dosya standart json modülüyle okunur; tinydb paketi
+        gerekmez.
 
 EN: DataStore Manager - Store and manage all client data persistently
     ================================================================
     
-    This class manages all client data and IP allocations through TinyDB database.
+    This class manages all client data and IP allocations through an indexed
+    SQLite database.
     
     Main Responsibilities:
-        - Store and manage client data in TinyDB
+        - Store and manage client data in SQLite
         - IP address allocation and tracking
         - IP remapping for subnet changes
         - Database integrity and consistency
+        - Automatic migration of legacy TinyDB JSON files
         
-    TinyDB Database Structure:
+    SQLite Database Structure:
         File: self.data_dir / "clients.db"
         
-        clients table example:
-        {
-          "_default": {
-            "1": {
-              "name": "john-laptop",
-              "ip": "10.8.0.2",
-              "private_key": "aBcD1234...",
-              "public_key": "xYz5678...",
-              "preshared_key": "PreShared123...",
-              "created": "2025-01-30T10:15:00",
-              "enabled": true
-            },
-            "2": {
-              "name": "alice-phone",
-              "ip": "10.8.0.3",
-              "private_key": "eFgH5678...",
-              "public_key": "MnO9012...",
-              "preshared_key": "PreShared456...",
-              "created": "2025-01-30T11:30:00",
-              "enabled": true
-            }
-          }
-        }
+        clients table:
+            name TEXT PRIMARY KEY, ip TEXT UNIQUE, public_key TEXT UNIQUE,
+            private_key, preshared_key, created (ISO), enabled (0/1)
+            Index: created
+        
+        ip_assignments table:
+            ip TEXT PRIMARY KEY, client_name TEXT UNIQUE, assigned_at (ISO)
         
-        ip_assignments table example:
-        {
-          "_default": {
-            "1": {
-              "ip": "10.8.0.2",
-              "client_name": "john-laptop",
-              "assigned_at": "2025-01-30T10:15:00"
-            },
-            "2": {
-              "ip": "10.8.0.3",
-              "client_name": "alice-phone",
-              "assigned_at": "2025-01-30T11:30:00"
-            }
-          }
-        }
+        Name, IP and public key lookups go through unique indexes instead of
+        full table scans, and writes only touch the affected rows. The journal
+        mode is left at DELETE so clients.db is a self-contained file that can
+        be copied directly for backups.
+    
+    TinyDB Migration:
+        If clients.db is still in the legacy TinyDB JSON format, all records
+        are imported into SQLite in a single transaction on first open. The
+        original file is kept as clients.db.tinydb.bak and the new database is
+        atomically moved into place. The file is read with the standard json
+        module; the tinydb package is not required.
 
 Copyright (c) 2025 Rıza Emre ARAS <r.emrearas@proton.me>
 Licensed under AGPL-3.0 - see LICENSE file for details
@@ -121,187 +84,513 @@ Third-party licenses - see THIRD_PARTY_LICENSES file for details
 WireGuard® is a registered trademark of Jason A. Donenfeld.
 """
 
-from typing import Dict, Any, Optional, List
+import json
+import os
+import shutil
+import sqlite3
+import logging
+import ipaddress
+from contextlib import contextmanager
+from typing import Dict, Any, Optional, List, Iterator, Tuple
 from pathlib import Path
 from datetime import datetime
-from tinydb import TinyDB, Query
-import ipaddress
 
-from phantom.api.exceptions import ClientNotFoundError
+from phantom.api.exceptions import ClientNotFoundError, ConfigurationError
 from ..models import WireGuardClient
+from .ip_allocator import IPAllocator
+from .ip_remap import IPRemapper, address_array
 from .default_constants import (
     DEFAULT_WG_NETWORK,
     CLIENTS_TABLE_NAME,
-    IP_ASSIGNMENTS_TABLE_NAME
+    IP_ASSIGNMENTS_TABLE_NAME,
+    DB_BUSY_TIMEOUT_MS,
+    LEGACY_DB_BACKUP_SUFFIX,
+    DEFAULT_IP_REMAP_STRATEGY
 )
 
+SQLITE_HEADER = b"SQLite format 3\x00"
+
+_SCHEMA = f"""
+CREATE TABLE IF NOT EXISTS {CLIENTS_TABLE_NAME} (
+    name TEXT PRIMARY KEY,
+    ip TEXT NOT NULL UNIQUE,
+    private_key TEXT NOT NULL,
+    public_key TEXT NOT NULL UNIQUE,
+    preshared_key TEXT NOT NULL,
+    created TEXT NOT NULL,
+    enabled INTEGER NOT NULL DEFAULT 1
+);
+CREATE INDEX IF NOT EXISTS idx_{CLIENTS_TABLE_NAME}_created ON {CLIENTS_TABLE_NAME} (created);
+CREATE INDEX IF NOT EXISTS idx_{CLIENTS_TABLE_NAME}_created_name ON {CLIENTS_TABLE_NAME} (created, name);
+CREATE INDEX IF NOT EXISTS idx_{CLIENTS_TABLE_NAME}_name_nocase ON {CLIENTS_TABLE_NAME} (name COLLATE NOCASE);
+CREATE TABLE IF NOT EXISTS {IP_ASSIGNMENTS_TABLE_NAME} (
+    ip TEXT PRIMARY KEY,
+    client_name TEXT NOT NULL UNIQUE,
+    assigned_at TEXT NOT NULL
+);
+"""
+
+_CLIENT_COLUMNS = "name, ip, private_key, public_key, preshared_key, created, enabled"
+
 
 class DataStore:
-    """TinyDB-based storage manager for client data and IP allocations.
+    """SQLite-based storage manager for client data and IP allocations.
 
-    Uses TinyDB as the data source for managing WireGuard client data
-    and IP address allocations.
+    Uses an indexed SQLite database as the data source for managing
+    WireGuard client data and IP address allocations.
 
     Core Functions:
         - Client CRUD operations
         - Automatic IP allocation and release
         - IP remapping for subnet changes
         - Database consistency control
+        - Multi-statement transactions via transaction()
 
     Performance:
-        - Fast TinyDB queries
-        - Single data source, no synchronization issues
-        - Optimized memory usage
+        - Unique indexes on name, ip and public_key (no full table scans)
+        - Next free IP from an in-memory allocation bitmap (IPAllocator)
+        - Incremental row-level writes instead of rewriting the whole file
+        - Safe for concurrent processes (CLI, daemon, casper) via SQLite locking
     """
 
-    def __init__(self, db_path: Path, data_dir: Path, subnet: str = DEFAULT_WG_NETWORK):
-        self.db_path = db_path
+    def __init__(self, db_path: Path, data_dir: Path, subnet: str = DEFAULT_WG_NETWORK,
+                 read_only: bool = False):
+        self.db_path = Path(db_path)
         self.data_dir = data_dir
+        # Read-only stores open an existing database and never migrate or create tables
+        self.read_only = read_only
         self.subnet = subnet
         self.network = ipaddress.IPv4Network(subnet)
+        self.logger = logging.getLogger(__name__)
+        self._transaction_depth = 0
+        # Bumped after every local commit or rollback, see change_token()
+        self._write_generation = 0
+
+        # In-memory allocation bitmap, built lazily from ip_assignments
+        self._allocator: Optional[IPAllocator] = None
+        self._allocator_data_version: Optional[int] = None
 
         # Initialize database and tables
         self._initialize_database()
 
     def _initialize_database(self) -> None:
-        self.db = TinyDB(self.db_path)
-        self.clients_table = self.db.table(CLIENTS_TABLE_NAME)
-        self.ip_table = self.db.table(IP_ASSIGNMENTS_TABLE_NAME)
+        if self.read_only:
+            self.db = self._connect(self.db_path)
+            return
+
+        if self._is_legacy_tinydb_file(self.db_path):
+            self._migrate_from_tinydb()
+
+        self.db = self._connect(self.db_path)
+        self.db.executescript(_SCHEMA)
+
+    def _connect(self, path: Path) -> sqlite3.Connection:
+        # isolation_level=None: autocommit, explicit BEGIN in transaction()
+        # check_same_thread=False: the API daemon serialises access across threads
+        if self.read_only:
+            conn = sqlite3.connect(f"{path.resolve().as_uri()}?mode=ro", uri=True,
+                                   isolation_level=None, check_same_thread=False)
+        else:
+            conn = sqlite3.connect(str(path), isolation_level=None, check_same_thread=False)
+        conn.row_factory = sqlite3.Row
+        conn.execute(f"PRAGMA busy_timeout = {DB_BUSY_TIMEOUT_MS}")
+        if self.read_only:
+            return conn
+        # Keep rollback journal (not WAL) so clients.db stays a single self-contained file
+        conn.execute("PRAGMA journal_mode = DELETE")
+        return conn
+
+    @contextmanager
+    def transaction(self) -> Iterator[sqlite3.Connection]:
+        """Run several writes atomically.
+
+        Nested calls join the outermost transaction. On exception every
+        change made inside the outermost block is rolled back.
+        """
+        if self._transaction_depth:
+            self._transaction_depth += 1
+            try:
+                yield self.db
+            finally:
+                self._transaction_depth -= 1
+            return
+
+        self.db.execute("BEGIN IMMEDIATE")
+        self._transaction_depth = 1
+        try:
+            yield self.db
+        except BaseException:
+            self.db.execute("ROLLBACK")
+            # Bitmap updates made inside the transaction are no longer valid
+            self._allocator = None
+            raise
+        else:
+            self.db.execute("COMMIT")
+        finally:
+            self._transaction_depth = 0
+            self._write_generation += 1
+
+    def change_token(self) -> tuple:
+        """Return a value that changes whenever the stored data may have changed.
+
+        Combines a counter of our own transactions and the connection's
+        total_changes (autocommit writes) with PRAGMA data_version, which
+        changes when another connection commits. Used to validate cached
+        client lists without re-reading the table.
+        """
+        data_version = self.db.execute("PRAGMA data_version").fetchone()[0]
+        return data_version, self._write_generation, self.db.total_changes
+
+    # Legacy TinyDB migration
+
+    @staticmethod
+    def _is_legacy_tinydb_file(path: Path) -> bool:
+        try:
+            with open(path, 'rb') as f:
+                header = f.read(len(SQLITE_HEADER))
+        except FileNotFoundError:
+            return False
+        # An empty file is a valid (new) SQLite database
+        return bool(header) and header != SQLITE_HEADER
+
+    def _migrate_from_tinydb(self) -> None:
+        try:
+            with open(self.db_path, 'r') as f:
+                legacy = json.load(f)
+        except (OSError, ValueError) as e:
+            raise ConfigurationError(f"Cannot migrate legacy client database {self.db_path}: {e}")
+
+        def _records(table: str) -> List[Dict[str, Any]]:
+            docs = legacy.get(table) or {}
+            return [docs[k] for k in sorted(docs, key=lambda k: int(k) if str(k).isdigit() else 0)]
+
+        clients = _records(CLIENTS_TABLE_NAME)
+        assignments = _records(IP_ASSIGNMENTS_TABLE_NAME)
+
+        # Build the new database next to the old one, then swap it in atomically.
+        # A crash before the swap leaves the legacy file in place and migration reruns.
+        tmp_path = self.db_path.with_name(self.db_path.name + ".migrating")
+        if tmp_path.exists():
+            tmp_path.unlink()
+
+        conn = self._connect(tmp_path)
+        try:
+            conn.executescript(_SCHEMA)
+            conn.execute("BEGIN")
+            imported = set()
+            for record in clients:
+                try:
+                    conn.execute(
+                        f"INSERT INTO {CLIENTS_TABLE_NAME} ({_CLIENT_COLUMNS}) VALUES (?, ?, ?, ?, ?, ?, ?)",
+                        (record["name"], record["ip"], record["private_key"], record["public_key"],
+                         record["preshared_key"], record["created"], int(record.get("enabled", True)))
+                    )
+                    imported.add(record["name"])
+                except (KeyError, sqlite3.IntegrityError) as e:
+                    self.logger.warning(f"Skipping invalid legacy client record {record.get('name')}: {e}")
+
+            for record in assignments:
+                if record.get("client_name") not in imported:
+                    continue
+                conn.execute(
+                    f"INSERT OR IGNORE INTO {IP_ASSIGNMENTS_TABLE_NAME} (ip, client_name, assigned_at) "
+                    f"VALUES (?, ?, ?)",
+                    (record["ip"], record["client_name"], record.get("assigned_at") or datetime.now().isoformat())
+                )
+
+            # Every client must own an allocation, even if the legacy table lost it
+            conn.execute(
+                f"INSERT OR IGNORE INTO {IP_ASSIGNMENTS_TABLE_NAME} (ip, client_name, assigned_at) "
+                f"SELECT ip, name, created FROM {CLIENTS_TABLE_NAME}"
+            )
+            conn.execute("COMMIT")
+        except BaseException:
+            conn.close()
+            tmp_path.unlink()
+            raise
+        conn.close()
+
+        with open(tmp_path, 'rb') as f:
+            os.fsync(f.fileno())
+
+        backup_path = self.db_path.with_name(self.db_path.name + LEGACY_DB_BACKUP_SUFFIX)
+        shutil.copy2(self.db_path, backup_path)
+        os.replace(tmp_path, self.db_path)
+
+        self.logger.info(
+            f"Migrated {len(imported)} clients from TinyDB to SQLite (legacy copy: {backup_path})"
+        )
+
+    # Helpers
+
+    @staticmethod
+    def _row_to_client(row: sqlite3.Row) -> WireGuardClient:
+        return WireGuardClient(
+            name=row["name"],
+            ip=row["ip"],
+            private_key=row["private_key"],
+            public_key=row["public_key"],
+            preshared_key=row["preshared_key"],
+            created=datetime.fromisoformat(row["created"]),
+            enabled=bool(row["enabled"])
+        )
+
+    def _assign_ip(self, client_name: str, ip: str) -> None:
+        row = self.db.execute(
+            f"SELECT ip FROM {IP_ASSIGNMENTS_TABLE_NAME} WHERE client_name = ?", (client_name,)
+        ).fetchone()
+        self.db.execute(
+            f"DELETE FROM {IP_ASSIGNMENTS_TABLE_NAME} WHERE client_name = ?", (client_name,)
+        )
+        self.db.execute(
+            f"INSERT OR REPLACE INTO {IP_ASSIGNMENTS_TABLE_NAME} (ip, client_name, assigned_at) VALUES (?, ?, ?)",
+            (ip, client_name, datetime.now().isoformat())
+        )
+        self._allocator_release(row["ip"] if row else None)
+        self._allocator_mark(ip)
+
+    # IP allocation bitmap
+
+    def _get_allocator(self) -> IPAllocator:
+        """Return the allocation bitmap, rebuilding it when another process changed the DB.
+
+        PRAGMA data_version only changes on commits from other connections,
+        so our own writes keep the bitmap valid through incremental updates.
+        """
+        data_version = self.db.execute("PRAGMA data_version").fetchone()[0]
+        if self._allocator is None or data_version != self._allocator_data_version:
+            allocated = (row[0] for row in self.db.execute(f"SELECT ip FROM {IP_ASSIGNMENTS_TABLE_NAME}"))
+            self._allocator = IPAllocator(self.network, allocated)
+            self._allocator_data_version = data_version
+        return self._allocator
+
+    def _allocator_mark(self, ip: str) -> None:
+        if self._allocator is not None:
+            self._allocator.mark(ip)
+
+    def _allocator_release(self, ip: Optional[str]) -> None:
+        if self._allocator is not None and ip:
+            self._allocator.release(ip)
+
+    # Client operations
 
     def store_new_client(self, client: WireGuardClient) -> None:
-        # Convert to dict for storage
         client_dict = client.to_dict()
 
-        # Store in clients table
-        self.clients_table.insert(client_dict)
-
-        # Track IP allocation
-        self.ip_table.insert({
-            'ip': client.ip,
-            'client_name': client.name,
-            'assigned_at': client.created.isoformat()
-        })
+        with self.transaction():
+            # Store in clients table
+            self.db.execute(
+                f"INSERT INTO {CLIENTS_TABLE_NAME} ({_CLIENT_COLUMNS}) VALUES (?, ?, ?, ?, ?, ?, ?)",
+                (client_dict["name"], client_dict["ip"], client_dict["private_key"],
+                 client_dict["public_key"], client_dict["preshared_key"], client_dict["created"],
+                 int(client_dict["enabled"]))
+            )
+
+            # Track IP allocation
+            self.db.execute(
+                f"INSERT OR REPLACE INTO {IP_ASSIGNMENTS_TABLE_NAME} (ip, client_name, assigned_at) "
+                f"VALUES (?, ?, ?)",
+                (client.ip, client.name, client.created.isoformat())
+            )
+        self._allocator_mark(client.ip)
 
     def remove_existing_client(self, client_name: str) -> None:
-        client_query = Query()
+        with self.transaction():
+            row = self.db.execute(
+                f"SELECT ip FROM {IP_ASSIGNMENTS_TABLE_NAME} WHERE client_name = ?", (client_name,)
+            ).fetchone()
 
-        # Get client data for IP cleanup
-        client = self.clients_table.get(client_query.name == client_name)  # type: ignore
-        if client:
-            # Remove IP allocation
-            ip_query = Query()
-            self.ip_table.remove(ip_query.client_name == client_name)  # type: ignore
-
-            # Remove client
-            self.clients_table.remove(client_query.name == client_name)  # type: ignore
+            # Remove IP allocation and client
+            self.db.execute(f"DELETE FROM {IP_ASSIGNMENTS_TABLE_NAME} WHERE client_name = ?", (client_name,))
+            self.db.execute(f"DELETE FROM {CLIENTS_TABLE_NAME} WHERE name = ?", (client_name,))
+        self._allocator_release(row["ip"] if row else None)
 
     def ensure_client_does_not_exist(self, client_name: str) -> None:
-        client_query = Query()
-        if self.clients_table.search(client_query.name == client_name):  # type: ignore
+        if self.check_if_client_exists(client_name):
             raise ValueError(f"Client '{client_name}' already exists")
 
     def find_client_by_name(self, client_name: str) -> Optional[WireGuardClient]:
-        client_query = Query()
-        result = self.clients_table.get(client_query.name == client_name)  # type: ignore
-        return WireGuardClient.from_dict(dict(result)) if result else None
+        row = self.db.execute(
+            f"SELECT {_CLIENT_COLUMNS} FROM {CLIENTS_TABLE_NAME} WHERE name = ?", (client_name,)
+        ).fetchone()
+        return self._row_to_client(row) if row else None
+
+    def find_client_by_ip(self, ip: str) -> Optional[WireGuardClient]:
+        row = self.db.execute(
+            f"SELECT {_CLIENT_COLUMNS} FROM {CLIENTS_TABLE_NAME} WHERE ip = ?", (ip,)
+        ).fetchone()
+        return self._row_to_client(row) if row else None
+
+    def find_client_by_public_key(self, public_key: str) -> Optional[WireGuardClient]:
+        row = self.db.execute(
+            f"SELECT {_CLIENT_COLUMNS} FROM {CLIENTS_TABLE_NAME} WHERE public_key = ?", (public_key,)
+        ).fetchone()
+        return self._row_to_client(row) if row else None
 
     def get_all_clients(self) -> List[WireGuardClient]:
-        return [WireGuardClient.from_dict(dict(client)) for client in self.clients_table.all()]
+        rows = self.db.execute(
+            f"SELECT {_CLIENT_COLUMNS} FROM {CLIENTS_TABLE_NAME} ORDER BY rowid"
+        ).fetchall()
+        return [self._row_to_client(row) for row in rows]
+
+    def iter_client_ips(self) -> Iterator[Tuple[str, str]]:
+        """Yield (name, ip) of every client straight from the cursor, without building client objects."""
+        yield from self.db.execute(f"SELECT name, ip FROM {CLIENTS_TABLE_NAME} ORDER BY rowid")
+
+    def count_clients(self, name_prefix: Optional[str] = None) -> int:
+        where, params = self._name_prefix_filter(name_prefix)
+        return self.db.execute(
+            f"SELECT COUNT(*) FROM {CLIENTS_TABLE_NAME}{where}", params
+        ).fetchone()[0]
+
+    def get_clients_page(self, limit: int, offset: int = 0, name_prefix: Optional[str] = None,
+                         after: Optional[Tuple[str, str]] = None) -> List[WireGuardClient]:
+        """Return one page of clients ordered by (created, name).
+
+        Served from the (created, name) index, so only the requested rows are
+        read and converted. With a name prefix the NOCASE name index narrows
+        the candidates first.
+
+        Args:
+            limit: Maximum number of clients to return
+            offset: Number of matching clients to skip
+            name_prefix: Case-insensitive name prefix filter
+            after: Keyset cursor (created, name); only clients after it are returned
+
+        Returns:
+            List of WireGuardClient instances
+        """
+        where, params = self._name_prefix_filter(name_prefix, after=after)
+        rows = self.db.execute(
+            f"SELECT {_CLIENT_COLUMNS} FROM {CLIENTS_TABLE_NAME}{where} "
+            f"ORDER BY created, name LIMIT ? OFFSET ?",
+            (*params, limit, offset)
+        ).fetchall()
+        return [self._row_to_client(row) for row in rows]
+
+    def count_clients_before(self, position: Tuple[str, str], name_prefix: Optional[str] = None) -> int:
+        """Count matching clients ordered at or before a (created, name) position."""
+        where, params = self._name_prefix_filter(name_prefix)
+        where += " AND " if where else " WHERE "
+        return self.db.execute(
+            f"SELECT COUNT(*) FROM {CLIENTS_TABLE_NAME}{where}(created, name) <= (?, ?)",
+            (*params, *position)
+        ).fetchone()[0]
+
+    @staticmethod
+    def _name_prefix_filter(name_prefix: Optional[str],
+                            after: Optional[Tuple[str, str]] = None) -> Tuple[str, tuple]:
+        clauses = []
+        params: tuple = ()
+        if name_prefix:
+            # Range scan on the NOCASE index instead of LIKE (no escaping of '_' needed)
+            clauses.append("name >= ? COLLATE NOCASE AND name < ? COLLATE NOCASE")
+            params += (name_prefix, name_prefix + "\U0010ffff")
+        if after:
+            clauses.append("(created, name) > (?, ?)")
+            params += tuple(after)
+        return (" WHERE " + " AND ".join(clauses) if clauses else ""), params
 
     def allocate_next_available_ip(self) -> str:
-        # Get allocated IPs
-        allocated_ips = {record['ip'] for record in self.ip_table.all()}
-
-        # Add server IP to allocated set
-        server_ip = str(self.network.network_address + 1)
-        allocated_ips.add(server_ip)
-
-        # Find first available IP
-        for ip in self.network.hosts():
-            ip_str = str(ip)
-            if ip_str not in allocated_ips:
-                return ip_str
-
-        raise ValueError("No available IP addresses in the subnet")
+        # Lowest free host from the bitmap (server .1 is reserved)
+        ip = self._get_allocator().next_free()
+        if ip is None:
+            raise ValueError("No available IP addresses in the subnet")
+        return ip
 
     def update_client_ip_address(self, client_name: str, new_ip: str) -> None:
-        client_query = Query()
-        ip_query = Query()
-
-        self.clients_table.update({'ip': new_ip}, client_query.name == client_name)  # type: ignore
-
-        self.ip_table.update({
-            'ip': new_ip,
-            'assigned_at': datetime.now().isoformat()
-        }, ip_query.client_name == client_name)  # type: ignore
+        with self.transaction():
+            cursor = self.db.execute(
+                f"UPDATE {CLIENTS_TABLE_NAME} SET ip = ? WHERE name = ?", (new_ip, client_name)
+            )
+            if cursor.rowcount:
+                self._assign_ip(client_name, new_ip)
 
     def check_if_client_exists(self, client_name: str) -> bool:
-        client_query = Query()
-        return bool(self.clients_table.search(client_query.name == client_name))  # type: ignore
+        row = self.db.execute(
+            f"SELECT 1 FROM {CLIENTS_TABLE_NAME} WHERE name = ?", (client_name,)
+        ).fetchone()
+        return row is not None
 
     def update_network_configuration(self, new_subnet: str) -> None:
         self.subnet = new_subnet
         self.network = ipaddress.IPv4Network(new_subnet)
 
+        # Bitmap covers the old subnet; rebuild on next allocation
+        self._allocator = None
+
     def get_ip_allocations(self) -> List[Dict[str, Any]]:
-        return [dict(record) for record in self.ip_table.all()]
+        rows = self.db.execute(
+            f"SELECT ip, client_name, assigned_at FROM {IP_ASSIGNMENTS_TABLE_NAME} ORDER BY rowid"
+        ).fetchall()
+        return [dict(row) for row in rows]
 
     def update_all_client_ips(self, ip_mapping: Dict[str, str]) -> None:
-        client_query = Query()
-        ip_query = Query()
-
-        for client_name, new_ip in ip_mapping.items():
-            # Update client IP
-            self.clients_table.update({'ip': new_ip}, client_query.name == client_name)  # type: ignore
-
-            self.ip_table.update({
-                'ip': new_ip,
-                'assigned_at': datetime.now().isoformat()
-            }, ip_query.client_name == client_name)  # type: ignore
+        if not ip_mapping:
+            return
+
+        now = datetime.now().isoformat()
+        with self.transaction():
+            # Two passes keep the unique ip indexes valid when addresses are swapped
+            # between clients (e.g. a -> .3 while b still holds .3)
+            for client_name in ip_mapping:
+                placeholder = f"~{client_name}"
+                self.db.execute(f"UPDATE {CLIENTS_TABLE_NAME} SET ip = ? WHERE name = ?",
+                                (placeholder, client_name))
+                self.db.execute(f"UPDATE {IP_ASSIGNMENTS_TABLE_NAME} SET ip = ? WHERE client_name = ?",
+                                (placeholder, client_name))
+
+            for client_name, new_ip in ip_mapping.items():
+                self.db.execute(f"UPDATE {CLIENTS_TABLE_NAME} SET ip = ? WHERE name = ?",
+                                (new_ip, client_name))
+                self.db.execute(
+                    f"UPDATE {IP_ASSIGNMENTS_TABLE_NAME} SET ip = ?, assigned_at = ? WHERE client_name = ?",
+                    (new_ip, now, client_name)
+                )
+
+        # Many addresses moved at once; rebuilding is cheaper than diffing
+        self._allocator = None
 
     def create_ip_mapping_for_subnet_change(self, old_network: ipaddress.IPv4Network,
-                                            new_network: ipaddress.IPv4Network) -> Dict[str, str]:
-        # old_network kept for API compatibility
-        _ = old_network
-        ip_mapping = {}
-        clients = self.get_all_clients()
-
-        # Sort clients by IP for consistent mapping
-        sorted_clients = sorted(clients, key=lambda c: ipaddress.IPv4Address(c.ip))
-
-        # Allocate new IPs (skip server .1)
-        new_hosts = list(new_network.hosts())[1:]
-
-        for i, client in enumerate(sorted_clients):
-            if i < len(new_hosts):
-                ip_mapping[client.name] = str(new_hosts[i])
-            else:
-                raise ValueError(f"New subnet too small for {len(sorted_clients)} clients")
+                                            new_network: ipaddress.IPv4Network,
+                                            strategy: str = DEFAULT_IP_REMAP_STRATEGY) -> Dict[str, str]:
+        names, ips = [], []
+        for name, ip in self.iter_client_ips():
+            names.append(name)
+            ips.append(ip)
 
-        return ip_mapping
+        # Computed on integer arrays; the new subnet's host list is never built
+        new_ips = IPRemapper(old_network, new_network, strategy).remap(address_array(ips)).as_dict()
+        return {name: new_ips[ip] for name, ip in zip(names, ips)}
 
     def update_client_ip(self, client_name: str, new_ip: str) -> None:
         # Verify client exists
-        client = self.find_client_by_name(client_name)
-        if not client:
+        if not self.check_if_client_exists(client_name):
             raise ClientNotFoundError(f"Client '{client_name}' not found")
 
-        old_ip = client.ip
-
-        self.clients_table.update(
-            {"ip": new_ip},
-            Query().name == client_name  # type: ignore
-        )
-
-        # Update IP allocation table
-        self.ip_table.remove(Query().ip == old_ip)  # type: ignore
-
-        # Add new IP allocation
-        self.ip_table.insert({
-            "ip": new_ip,
-            "client_name": client_name,
-            "assigned_at": datetime.now().isoformat()
-        })
+        with self.transaction():
+            self.db.execute(f"UPDATE {CLIENTS_TABLE_NAME} SET ip = ? WHERE name = ?", (new_ip, client_name))
+
+            # Replace IP allocation
+            self._assign_ip(client_name, new_ip)
+
+    def restore_database(self, source: Path) -> None:
+        """Replace the database content with a copy (e.g. a backup).
+
+        Uses the SQLite backup API on the open connection instead of
+        replacing the file, so this connection and other open ones see the
+        restored data.
+
+        Args:
+            source: Path of the SQLite file to copy from
+        """
+        src = sqlite3.connect(str(source))
+        try:
+            src.backup(self.db)
+        finally:
+            src.close()
+        self._allocator = None
+        self._write_generation += 1
 
     def close(self) -> None:
         if hasattr(self, 'db'):
@@ -75,6 +75,17 @@ DEFAULT_MTU = 1420
 # Network Services
 DEFAULT_SSH_PORT = "22"
 
+# Subnet Migration: "restart" stops the interface, "live" re-addresses peers in place
+SUBNET_MIGRATION_MODES = ("restart", "live")
+DEFAULT_MIGRATION_GRACE_PERIOD = 300  # seconds the old server address is kept in live mode
+SUBNET_CLEANUP_UNIT = "phantom-subnet-cleanup"
+
+# IP Remapping: "compact" renumbers clients from .2 in address order,
+# "preserve" keeps each client's host offset when it fits the new subnet
+IP_REMAP_STRATEGIES = ("compact", "preserve")
+DEFAULT_IP_REMAP_STRATEGY = "compact"
+DEFAULT_REMAP_PREVIEW_LIMIT = 50
+
 # =============================================================================
 # DNS DEFAULTS
 # =============================================================================
@@ -102,6 +113,19 @@ DEFAULT_LATEST_COUNT = 5
 GHOST_STATE_FILENAME = "ghost-state.json"
 BACKUPS_DIR = "backups"
 
+# Rendered client config cache (under the data directory) and bulk exports
+CONFIG_CACHE_DIR = "config_cache"
+EXPORTS_DIR = "exports"
+EXPORT_FORMATS = ("tar", "zip")
+
+# Per-peer traffic history (under the data directory): 5 minute samples, 32 days
+TRAFFIC_DIR = "traffic"
+TRAFFIC_SAMPLE_INTERVAL = 300  # seconds
+TRAFFIC_RETENTION_SAMPLES = 9216
+TRAFFIC_PERIODS = {"24h": 86400, "7d": 7 * 86400, "30d": 30 * 86400, "month": None, "all": None}
+TRAFFIC_BUCKETS = {"hour": 3600, "day": 86400}
+DEFAULT_TOP_TALKERS = 10
+
 # =============================================================================
 # DATABASE
 # =============================================================================
@@ -110,6 +134,10 @@ BACKUPS_DIR = "backups"
 CLIENTS_TABLE_NAME = "clients"
 IP_ASSIGNMENTS_TABLE_NAME = "ip_assignments"
 
+# SQLite Settings
+DB_BUSY_TIMEOUT_MS = 5000
+LEGACY_DB_BACKUP_SUFFIX = ".tinydb.bak"
+
 # =============================================================================
 # VALIDATION & SECURITY
 # =============================================================================
@@ -121,5 +149,11 @@ MAX_CLIENT_NAME_LENGTH = 50
 # File Permissions
 WG_CONFIG_PERMISSIONS = 0o600
 
+# Key Generation Backends
+KEY_BACKEND_WG = "wg"
+KEY_BACKEND_NATIVE = "native"
+
 # Configurable Settings
-ACTIVE_CONNECTION_THRESHOLD = 180 # seconds
\ No newline at end of file
+ACTIVE_CONNECTION_THRESHOLD = 180 # seconds
+# Peer state snapshot lifetime (seconds) inside API requests
+PEER_STATE_CACHE_TTL = 2.0
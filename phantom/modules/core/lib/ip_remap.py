@@ -0,0 +1,233 @@
+"""
+██████╗ ██╗  ██╗ █████╗ ███╗   ██╗████████╗ ██████╗ ███╗   ███╗
+██╔══██╗██║  ██║██╔══██╗████╗  ██║╚══██╔══╝██╔═══██╗████╗ ████║
+██████╔╝███████║███████║██╔██╗ ██║   ██║   ██║   ██║██╔████╔██║
+██╔═══╝ ██╔══██║██╔══██║██║╚██╗██║   ██║   ██║   ██║██║╚██╔╝██║
+██║     ██║  ██║██║  ██║██║ ╚████║   ██║   ╚██████╔╝██║ ╚═╝ ██║
+╚═╝     ╚═╝  ╚═╝╚═╝  ╚═╝╚═╝  ╚═══╝   ╚═╝    ╚═════╝ ╚═╝     ╚═╝
+
+TR: IP Yeniden Eşleme - Subnet değişikliğinde istemci adreslerini tamsayı dizileriyle hesaplama
+    ==========================================================================================
+
+    İstemci adresleri 32 bit işaretsiz tamsayı dizilerinde (array('I'))
+    tutulur ve yeni adresler bu diziler üzerinde aritmetikle hesaplanır.
+    Yeni subnet'in host listesi (bir /8 için 16M IPv4Address nesnesi) hiçbir
+    zaman oluşturulmaz; bellek kullanımı subnet boyutuna değil istemci
+    sayısına bağlıdır (istemci başına 8 byte).
+
+    Stratejiler:
+        - compact:  İstemciler adres sırasıyla .2'den itibaren ardışık
+                    numaralanır (önceki davranış)
+        - preserve: Her istemci host ofsetini korur (10.8.0.57 -> 10.9.0.57);
+                    yeni subnet'e sığmayan ofsetler en düşük boş adreslere
+                    taşınır
+
+    Önizleme yalnızca ilk N eşlemeyi string'e çevirir; özet istatistikler
+    diziler üzerinde tek geçişte hesaplanır.
+
+EN: IP Remapping - Compute client addresses for a subnet change on integer arrays
+    ==========================================================================================
+
+    Client addresses are held in arrays of unsigned 32-bit integers
+    (array('I')) and new addresses are computed with arithmetic on those
+    arrays. The host list of the new subnet (16M IPv4Address objects for a
+    /8) is never built; memory depends on the number of clients, not on the
+    subnet size (8 bytes per client).
+
+    Strategies:
+        - compact:  Clients are numbered consecutively from .2 in address
+                    order (the previous behaviour)
+        - preserve: Each client keeps its host offset (10.8.0.57 -> 10.9.0.57);
+                    offsets that do not fit the new subnet move to the lowest
+                    free addresses
+
+    The preview only turns the first N mappings into strings; the summary
+    statistics are computed in a single pass over the arrays.
+
+Copyright (c) 2025 Rıza Emre ARAS <r.emrearas@proton.me>
+Licensed under AGPL-3.0 - see LICENSE file for details
+Third-party licenses - see THIRD_PARTY_LICENSES file for details
+WireGuard® is a registered trademark of Jason A. Donenfeld.
+"""
+
+import socket
+import ipaddress
+from array import array
+from itertools import islice
+from typing import Any, Dict, Iterable, Iterator, Tuple
+
+from .default_constants import IP_REMAP_STRATEGIES, DEFAULT_IP_REMAP_STRATEGY, DEFAULT_REMAP_PREVIEW_LIMIT
+
+# 'I' is at least 32 bits on every supported platform; 'L' is 64 bits on Linux
+_TYPECODE = "I" if array("I").itemsize >= 4 else "L"
+
+
+def ip_to_int(ip: str) -> int:
+    """Parse a dotted IPv4 address without building an IPv4Address object."""
+    try:
+        return int.from_bytes(socket.inet_pton(socket.AF_INET, ip), "big")
+    except (OSError, TypeError):
+        raise ValueError(f"Invalid IPv4 address '{ip}'")
+
+
+def int_to_ip(value: int) -> str:
+    return socket.inet_ntoa(value.to_bytes(4, "big"))
+
+
+def address_array(ips: Iterable[str]) -> array:
+    """Pack dotted IPv4 addresses into an unsigned integer array."""
+    return array(_TYPECODE, map(ip_to_int, ips))
+
+
+class IPRemapPlan:
+    """Old and new client addresses as two aligned integer arrays.
+
+    Attributes:
+        old: Current client addresses, ascending
+        new: New address of the client at the same index
+        strategy: Strategy the plan was computed with
+        capacity: Client addresses available in the new subnet
+    """
+
+    def __init__(self, old: array, new: array, strategy: str, capacity: int,
+                 old_base: int, new_base: int):
+        self.old = old
+        self.new = new
+        self.strategy = strategy
+        self.capacity = capacity
+        self._old_base = old_base
+        self._new_base = new_base
+
+    def __len__(self) -> int:
+        return len(self.old)
+
+    def pairs(self) -> Iterator[Tuple[str, str]]:
+        """Yield (old_ip, new_ip) strings lazily, in old address order."""
+        for old, new in zip(self.old, self.new):
+            yield int_to_ip(old), int_to_ip(new)
+
+    def as_dict(self) -> Dict[str, str]:
+        """Old IP to new IP for every client."""
+        return dict(self.pairs())
+
+    def summary(self) -> Dict[str, Any]:
+        """Counts and address range of the plan, without building any string per client."""
+        old_base, new_base = self._old_base, self._new_base
+        kept = sum(1 for old, new in zip(self.old, self.new) if old - old_base == new - new_base)
+        total = len(self.new)
+        return {
+            "strategy": self.strategy,
+            "clients": total,
+            "capacity": self.capacity,
+            "utilization": round(total / self.capacity * 100, 2) if self.capacity else 0.0,
+            "offsets_kept": kept,
+            "renumbered": total - kept,
+            "first_new_ip": int_to_ip(min(self.new)) if total else None,
+            "last_new_ip": int_to_ip(max(self.new)) if total else None
+        }
+
+
+class IPRemapper:
+    """Compute new client addresses when moving from one subnet to another.
+
+    Example:
+        >>> remapper = IPRemapper(IPv4Network("10.8.0.0/24"), IPv4Network("10.9.0.0/16"), "preserve")
+        >>> remapper.remap(address_array(["10.8.0.57"])).as_dict()
+        {'10.8.0.57': '10.9.0.57'}
+    """
+
+    def __init__(self, old_network: ipaddress.IPv4Network, new_network: ipaddress.IPv4Network,
+                 strategy: str = DEFAULT_IP_REMAP_STRATEGY):
+        if strategy not in IP_REMAP_STRATEGIES:
+            raise ValueError(f"Unknown remap strategy '{strategy}'")
+        self.old_network = old_network
+        self.new_network = new_network
+        self.strategy = strategy
+
+        # Same reservations as IPAllocator: network, server (first host) and broadcast
+        self._old_base = int(old_network.network_address)
+        self._old_size = old_network.num_addresses
+        self._new_base = int(new_network.network_address)
+        if new_network.prefixlen < 31:
+            self._first = 2
+            self._last = new_network.num_addresses - 2
+        else:
+            self._first = 1
+            self._last = new_network.num_addresses - 1
+        self.capacity = max(0, self._last - self._first + 1)
+
+    def server_mapping(self) -> Tuple[str, str]:
+        """Old and new server address (first host of each subnet)."""
+        return int_to_ip(self._old_base + 1), int_to_ip(self._new_base + self._first - 1)
+
+    def remap(self, addresses: array) -> IPRemapPlan:
+        """Compute the new address of every client.
+
+        Args:
+            addresses: Current client addresses, in any order
+
+        Returns:
+            IPRemapPlan with the old addresses sorted ascending
+
+        Raises:
+            ValueError: If the new subnet cannot hold every client
+        """
+        old = array(_TYPECODE, sorted(addresses))
+        if len(old) > self.capacity:
+            raise ValueError(f"New subnet too small for {len(old)} clients")
+
+        if self.strategy == "compact":
+            start = self._new_base + self._first
+            new = array(_TYPECODE, range(start, start + len(old)))
+        else:
+            new = self._preserve_offsets(old)
+
+        return IPRemapPlan(old, new, self.strategy, self.capacity, self._old_base, self._new_base)
+
+    def _preserve_offsets(self, old: array) -> array:
+        old_base, old_size = self._old_base, self._old_size
+        first, last, new_base = self._first, self._last, self._new_base
+
+        offsets = [address - old_base for address in old]
+        fits = [0 <= offset < old_size and first <= offset <= last for offset in offsets]
+
+        # Offsets of kept clients are ascending because old is sorted
+        taken = iter([offset for offset, fit in zip(offsets, fits) if fit])
+        next_taken = next(taken, None)
+
+        new = array(_TYPECODE, bytes(old.itemsize * len(old)))
+        candidate = first
+        for index, offset in enumerate(offsets):
+            if fits[index]:
+                new[index] = new_base + offset
+                continue
+            # Lowest offset not kept by another client
+            while next_taken is not None and next_taken <= candidate:
+                if next_taken == candidate:
+                    candidate += 1
+                next_taken = next(taken, None)
+            new[index] = new_base + candidate
+            candidate += 1
+        return new
+
+    def preview(self, addresses: array, limit: int = DEFAULT_REMAP_PREVIEW_LIMIT) -> Dict[str, Any]:
+        """First mappings and summary statistics of a remap.
+
+        Only the first ``limit`` mappings are converted to strings, so the
+        result has the same size for ten clients and for a million.
+
+        Args:
+            addresses: Current client addresses
+            limit: Number of mappings to include
+
+        Returns:
+            Dictionary with server, mappings (old IP -> new IP), truncated and summary
+        """
+        plan = self.remap(addresses)
+        old_server, new_server = self.server_mapping()
+        return {
+            "server": {"old": old_server, "new": new_server},
+            "mappings": dict(islice(plan.pairs(), max(0, int(limit)))),
+            "truncated": len(plan) > limit,
+            "summary": plan.summary()
+        }
@@ -18,9 +18,17 @@ TR: KeyGenerator Manager - WireGuard için kriptografik anahtar oluşturma
         - Public Key: Private key'den türetilen açık anahtar
         - Preshared Key: Ek güvenlik için ön paylaşımlı anahtar
         
+    Anahtar Arka Uçları:
+        - wg: Her anahtar için wg genkey / wg pubkey / wg genpsk çalıştırılır
+        - native: Private ve preshared key'ler os.urandom ile süreç içinde
+          üretilir (private key, wg genkey gibi Curve25519 için clamp edilir).
+          Public key, kuruluysa cryptography paketinin X25519 primitifleriyle,
+          değilse RFC 7748 Montgomery ladder'ının saf Python uygulamasıyla
+          türetilir; native arka uç hiçbir zaman wg çalıştırmaz. Çıktı wg ile
+          bire bir aynı base64 formatındadır.
+
     Güvenlik:
-        - wg komut satırı araçları kullanılır
-        - Sistem entropisi kullanılır
+        - Sistem entropisi kullanılır (getrandom)
         - Format doğrulaması yapılır
         - Bellek temizliği otomatik
 
@@ -36,9 +44,17 @@ EN: KeyGenerator Manager - Create cryptographic keys for WireGuard
         - Public Key: Public key derived from private key
         - Preshared Key: Pre-shared key for additional security
         
+    Key Backends:
+        - wg: Runs wg genkey / wg pubkey / wg genpsk for every key
+        - native: Private and preshared keys are generated in-process with
+          os.urandom (the private key is clamped for Curve25519 exactly like
+          wg genkey). The public key is derived with the X25519 primitives of
+          the cryptography package when installed, otherwise with a pure
+          Python RFC 7748 Montgomery ladder; the native backend never runs
+          wg. Output is byte-identical base64 to wg.
+
     Security:
-        - Uses wg command line tools
-        - Uses system entropy
+        - Uses system entropy (getrandom)
         - Format validation
         - Automatic memory cleanup
 
@@ -48,11 +64,70 @@ Third-party licenses - see THIRD_PARTY_LICENSES file for details
 WireGuard® is a registered trademark of Jason A. Donenfeld.
 """
 
+import os
+import base64
+import binascii
+
 from phantom.api.exceptions import ServiceOperationError
 from .default_constants import (
-    WG_KEY_LENGTH as _WG_KEY_LENGTH
+    WG_KEY_LENGTH as _WG_KEY_LENGTH,
+    KEY_BACKEND_WG,
+    KEY_BACKEND_NATIVE
 )
 
+try:
+    from cryptography.hazmat.primitives.asymmetric.x25519 import X25519PrivateKey
+    from cryptography.hazmat.primitives import serialization
+    _HAS_X25519 = True
+except ImportError:  # pragma: no cover - depends on environment
+    X25519PrivateKey = None
+    serialization = None
+    _HAS_X25519 = False
+
+WG_KEY_BYTES = 32
+
+# Curve25519 field prime and (A - 2) / 4 from RFC 7748
+_P = 2 ** 255 - 19
+_A24 = 121665
+
+
+def x25519_base(scalar: bytes) -> bytes:
+    """X25519(scalar, 9) with the RFC 7748 Montgomery ladder in constant-size steps.
+
+    Used when the cryptography package is not installed. Public keys are
+    not secret and the private key never leaves the process, so timing
+    side channels of Python integer arithmetic are not a concern here.
+    """
+    k = bytearray(scalar)
+    k[0] &= 248
+    k[31] = (k[31] & 127) | 64
+    k_int = int.from_bytes(bytes(k), "little")
+
+    x1 = 9
+    x2, z2, x3, z3 = 1, 0, x1, 1
+    swap = 0
+    for t in range(254, -1, -1):
+        bit = (k_int >> t) & 1
+        swap ^= bit
+        if swap:
+            x2, x3, z2, z3 = x3, x2, z3, z2
+        swap = bit
+
+        a, b = (x2 + z2) % _P, (x2 - z2) % _P
+        aa, bb = a * a % _P, b * b % _P
+        e = (aa - bb) % _P
+        c, d = (x3 + z3) % _P, (x3 - z3) % _P
+        da, cb = d * a % _P, c * b % _P
+        x3 = (da + cb) ** 2 % _P
+        z3 = x1 * (da - cb) ** 2 % _P
+        x2 = aa * bb % _P
+        z2 = e * (aa + _A24 * e) % _P
+
+    if swap:
+        x2, z2 = x3, z3
+    return (x2 * pow(z2, _P - 2, _P) % _P).to_bytes(32, "little")
+
+
 class KeyGenerator:
     """Secure cryptographic key generator for WireGuard.
 
@@ -63,14 +138,40 @@ class KeyGenerator:
         - Three key types: private, public, preshared
         - Format validation (44 character base64)
         - In-memory operations, no filesystem usage
+        - Native in-process backend that never runs wg
     """
 
     EXPECTED_KEY_LENGTH = _WG_KEY_LENGTH  # Base64 encoded 32 bytes = 44 chars
 
-    def __init__(self, run_command):
+    def __init__(self, run_command, backend: str = KEY_BACKEND_WG):
+        if backend not in (KEY_BACKEND_WG, KEY_BACKEND_NATIVE):
+            raise ValueError(f"Unknown key backend: {backend}")
         self._run_command = run_command
+        self.backend = backend
+
+    @property
+    def public_key_provider(self) -> str:
+        """How derive_public_key() works: "cryptography", "python" or "wg"."""
+        if self.backend == KEY_BACKEND_WG:
+            return "wg"
+        return "cryptography" if _HAS_X25519 else "python"
+
+    @staticmethod
+    def _encode(raw: bytes) -> str:
+        return base64.b64encode(raw).decode("ascii")
+
+    @staticmethod
+    def _clamp(raw: bytes) -> bytes:
+        # Curve25519 secret clamping, identical to curve25519_clamp_secret() in wg(8)
+        key = bytearray(raw)
+        key[0] &= 248
+        key[31] = (key[31] & 127) | 64
+        return bytes(key)
 
     def create_private_key(self) -> str:
+        if self.backend == KEY_BACKEND_NATIVE:
+            return self._encode(self._clamp(os.urandom(WG_KEY_BYTES)))
+
         result = self._run_command(["wg", "genkey"])
         if not result["success"]:
             raise ServiceOperationError("Failed to generate private key")
@@ -80,6 +181,9 @@ class KeyGenerator:
         return key
 
     def derive_public_key(self, private_key: str) -> str:
+        if self.backend == KEY_BACKEND_NATIVE:
+            return self._derive_public_key_native(private_key)
+
         result = self._run_command(
             ["wg", "pubkey"],
             input=private_key,
@@ -94,7 +198,27 @@ class KeyGenerator:
         self._validate_key_format(public_key, "public")
         return public_key
 
+    def _derive_public_key_native(self, private_key: str) -> str:
+        try:
+            raw = base64.b64decode(private_key.strip(), validate=True)
+        except (binascii.Error, ValueError):
+            raw = b""
+        if len(raw) != WG_KEY_BYTES:
+            raise ServiceOperationError("Failed to generate public key")
+
+        # X25519 clamps the scalar internally, matching wg pubkey for unclamped input too
+        if not _HAS_X25519:
+            return self._encode(x25519_base(raw))
+        public = X25519PrivateKey.from_private_bytes(raw).public_key().public_bytes(
+            encoding=serialization.Encoding.Raw,
+            format=serialization.PublicFormat.Raw
+        )
+        return self._encode(public)
+
     def create_preshared_key(self) -> str:
+        if self.backend == KEY_BACKEND_NATIVE:
+            return self._encode(os.urandom(WG_KEY_BYTES))
+
         result = self._run_command(["wg", "genpsk"])
         if not result["success"]:
             raise ServiceOperationError("Failed to generate preshared key")
@@ -17,6 +17,7 @@ TR: NetworkAdmin Manager - WireGuard ağ yapılandırması ve subnet yönetimi
         - Mevcut ağ yapılandırmasını analiz etme
         - Subnet değişikliği için validasyon ve uygunluk kontrolü
         - Güvenli subnet geçişi (yedekleme ve geri alma desteği)
+        - Yedekleri listeleme ve geri yükleme
         - RFC1918 özel IP aralıklarının yönetimi
         - Firewall kuralları ve NAT yapılandırması güncelleme
         - Ghost Mode ve Multihop durum kontrolü
@@ -38,6 +39,7 @@ EN: NetworkAdmin Manager - WireGuard network configuration and subnet management
         - Analyze current network configuration
         - Validate and check eligibility for subnet changes
         - Secure subnet migration (with backup and rollback support)
+        - Listing and restoring backups
         - RFC1918 private IP range management
         - Update firewall rules and NAT configuration
         - Ghost Mode and Multihop state checking
@@ -56,7 +58,7 @@ WireGuard® is a registered trademark of Jason A. Donenfeld.
 
 import ipaddress
 from pathlib import Path
-from typing import Dict, Any, List, Callable
+from typing import Dict, Any, List, Callable, Optional
 
 from phantom.api.exceptions import (
     ValidationError,
@@ -67,7 +69,10 @@ from ..models import (
     NetworkAnalysis,
     NetworkValidationResult,
     NetworkMigrationResult,
-    MainInterfaceInfo
+    SubnetCleanupResult,
+    MainInterfaceInfo,
+    BackupListResult,
+    BackupRestoreResult
 )
 
 from .network_admin_helpers import (
@@ -77,10 +82,15 @@ from .network_admin_helpers import (
     StateOperations as _StateOperations,
     MigrationOperations as _MigrationOperations
 )
+from .wg_config import WireGuardConfigFile
+from ...config_service import get_config_service
 
 from .default_constants import (
     DEFAULT_WG_NETWORK,
-    BACKUPS_DIR
+    BACKUPS_DIR,
+    DEFAULT_MIGRATION_GRACE_PERIOD,
+    IP_REMAP_STRATEGIES,
+    DEFAULT_IP_REMAP_STRATEGY
 )
 
 
@@ -104,7 +114,8 @@ class NetworkAdmin:
     def __init__(self, data_store, common_tools, service_monitor,
                  config: Dict[str, Any], save_config: Callable,
                  run_command: Callable, wg_interface: str,
-                 wg_config_file: Path, install_dir: Path):
+                 wg_config_file: Path, install_dir: Path,
+                 wg_config: Optional[WireGuardConfigFile] = None):
         """
         Initialize NetworkAdmin with dependencies and helper classes.
 
@@ -118,6 +129,7 @@ class NetworkAdmin:
             wg_interface: WireGuard interface name (e.g., 'wg0')
             wg_config_file: Path to WireGuard configuration file
             install_dir: Base installation directory
+            wg_config: Shared WireGuardConfigFile (created from wg_config_file if omitted)
         """
         self.data_store = data_store
         self.common_tools = common_tools
@@ -127,6 +139,7 @@ class NetworkAdmin:
         self._run_command = run_command
         self.wg_interface = wg_interface
         self.wg_config_file = wg_config_file
+        self.wg_config = wg_config or WireGuardConfigFile(wg_config_file)
         self.install_dir = install_dir
         self.data_dir = install_dir / "data"
         self.backup_dir = install_dir / BACKUPS_DIR
@@ -169,6 +182,7 @@ class NetworkAdmin:
             run_command=self._run_command,
             wg_interface=self.wg_interface,
             wg_config_file=self.wg_config_file,
+            wg_config=self.wg_config,
             install_dir=self.install_dir,
             data_dir=self.data_dir,
             backup_dir=self.backup_dir,
@@ -190,33 +204,97 @@ class NetworkAdmin:
         result: NetworkAnalysis = self._analyze_current_network_typed()
         return result.to_dict()
 
-    def validate_network_modification(self, new_subnet: str) -> Dict[str, Any]:
+    def validate_network_modification(self, new_subnet: str,
+                                      strategy: str = DEFAULT_IP_REMAP_STRATEGY) -> Dict[str, Any]:
         """
         Validate if subnet change is possible and safe.
 
         Args:
             new_subnet: Target subnet in CIDR notation (e.g., '10.8.0.0/24')
+            strategy: IP remap strategy used for the preview ("compact" or "preserve")
 
         Returns:
             Validation result with checks, errors, warnings, and IP mapping preview
         """
-        result: NetworkValidationResult = self._validate_network_modification_typed(new_subnet)
+        result: NetworkValidationResult = self._validate_network_modification_typed(new_subnet, strategy)
         return result.to_dict()
 
-    def execute_network_migration(self, new_subnet: str, force: bool = False) -> Dict[str, Any]:
+    def execute_network_migration(self, new_subnet: str, force: bool = False, mode: str = "restart",
+                                  grace_period: int = DEFAULT_MIGRATION_GRACE_PERIOD,
+                                  strategy: str = DEFAULT_IP_REMAP_STRATEGY) -> Dict[str, Any]:
         """
         Execute complete subnet migration with automatic rollback on failure.
 
         Args:
             new_subnet: Target subnet in CIDR notation
             force: Bypass safety checks if True (use with caution)
+            mode: "restart" (stop/start the interface) or "live" (re-address peers in place)
+            grace_period: Seconds the old subnet stays served in live mode
+            strategy: "compact" (renumber from .2) or "preserve" (keep host offsets)
 
         Returns:
-            Migration result including success status, backup ID, and IP mappings
+            Migration result including success status, backup ID, IP mappings and phase timings
         """
-        result: NetworkMigrationResult = self._execute_network_migration_typed(new_subnet, force)
+        result: NetworkMigrationResult = self._execute_network_migration_typed(new_subnet, force, mode,
+                                                                               grace_period, strategy)
         return result.to_dict()
 
+    def finalize_network_migration(self) -> Dict[str, Any]:
+        """
+        Remove the old subnet of a live migration once its grace period is over.
+
+        Returns:
+            Cleanup result with finalized flag and phase timings
+        """
+        result: SubnetCleanupResult = self._finalize_network_migration_typed()
+        return result.to_dict()
+
+    def list_backups(self, label: Optional[str] = None) -> Dict[str, Any]:
+        """
+        List snapshots of the shared backup store.
+
+        Args:
+            label: Only snapshots with this label (e.g. 'subnet_change')
+
+        Returns:
+            Backups newest first, with bytes stored on disk and bytes represented
+        """
+        result: BackupListResult = self._list_backups_typed(label)
+        return result.to_dict()
+
+    def restore_backup(self, backup_id: str, force: bool = False) -> Dict[str, Any]:
+        """
+        Restore a snapshot of the backup store.
+
+        Args:
+            backup_id: Snapshot id from list_backups
+            force: Must be True to overwrite the current state
+
+        Returns:
+            Restore result with the restored files and the safety backup id
+        """
+        result: BackupRestoreResult = self._restore_backup_typed(backup_id, force)
+        return result.to_dict()
+
+    def _list_backups_typed(self, label: Optional[str] = None) -> BackupListResult:
+        result_dict = self._migration_ops.list_backups_typed(label)
+        return BackupListResult(
+            backups=result_dict["backups"],
+            total=result_dict["total"],
+            stored_bytes=result_dict["stored_bytes"],
+            logical_bytes=result_dict["logical_bytes"]
+        )
+
+    def _restore_backup_typed(self, backup_id: str, force: bool = False) -> BackupRestoreResult:
+        result_dict = self._migration_ops.restore_backup_typed(backup_id, force)
+        return BackupRestoreResult(
+            backup_id=result_dict["backup_id"],
+            label=result_dict["label"],
+            restored_files=result_dict["restored_files"],
+            safety_backup_id=result_dict["safety_backup_id"],
+            warnings=result_dict["warnings"]
+        )
+
     def _analyze_current_network_typed(self) -> NetworkAnalysis:
         """
         Internal typed version of network analysis.
@@ -224,11 +302,10 @@ class NetworkAdmin:
         Returns:
             NetworkAnalysis object with complete network state information
         """
-        # Load fresh config to capture any external changes
+        # Shared snapshot captures external changes without re-parsing unchanged files
         config_file = self.install_dir / "config" / "phantom.json"
         if config_file.exists():
-            import json
-            current_config = json.loads(config_file.read_text())
+            current_config = get_config_service(config_file).snapshot()
         else:
             current_config = self.config
 
@@ -304,12 +381,14 @@ class NetworkAdmin:
             warnings=warnings
         )
 
-    def _validate_network_modification_typed(self, new_subnet: str) -> NetworkValidationResult:
+    def _validate_network_modification_typed(self, new_subnet: str,
+                                             strategy: str = DEFAULT_IP_REMAP_STRATEGY) -> NetworkValidationResult:
         """
         Perform comprehensive validation of proposed subnet change.
 
         Args:
             new_subnet: Target subnet in CIDR notation
+            strategy: IP remap strategy used for the preview
 
         Returns:
             NetworkValidationResult with detailed validation results
@@ -324,6 +403,10 @@ class NetworkAdmin:
                 "Valid examples: '10.8.0.0/24', '192.168.1.0/24', '172.16.0.0/16'. "
                 "The subnet must be a valid IPv4 network address with prefix length."
             )
+        if strategy not in IP_REMAP_STRATEGIES:
+            raise ValidationError(
+                f"Invalid remap strategy '{strategy}'. Valid strategies: {', '.join(IP_REMAP_STRATEGIES)}"
+            )
 
         # Retrieve current network state for comparison
         current_info = self.analyze_current_network()
@@ -390,7 +473,7 @@ class NetworkAdmin:
         ip_mapping_preview = None
         if valid:
             ip_mapping_preview = self._ip_ops.preview_ip_remapping(
-                current_network, new_network, current_info
+                current_network, new_network, current_info, strategy
             )
 
         return NetworkValidationResult(
@@ -403,18 +486,24 @@ class NetworkAdmin:
             ip_mapping_preview=ip_mapping_preview
         )
 
-    def _execute_network_migration_typed(self, new_subnet: str, force: bool = False) -> NetworkMigrationResult:
+    def _execute_network_migration_typed(self, new_subnet: str, force: bool = False, mode: str = "restart",
+                                         grace_period: int = DEFAULT_MIGRATION_GRACE_PERIOD,
+                                         strategy: str = DEFAULT_IP_REMAP_STRATEGY) -> NetworkMigrationResult:
         """
         Execute subnet migration with backup and rollback capability.
 
         Args:
             new_subnet: Target subnet in CIDR notation
             force: Bypass safety checks if True
+            mode: "restart" or "live"
+            grace_period: Seconds the old subnet stays served in live mode
+            strategy: IP remap strategy ("compact" or "preserve")
 
         Returns:
             NetworkMigrationResult with migration status and details
         """
-        result_dict = self._migration_ops.execute_network_migration_typed(new_subnet, force)
+        result_dict = self._migration_ops.execute_network_migration_typed(new_subnet, force, mode, grace_period,
+                                                                          strategy)
 
         return NetworkMigrationResult(
             success=result_dict["success"],
@@ -422,7 +511,28 @@ class NetworkAdmin:
             new_subnet=result_dict["new_subnet"],
             clients_updated=result_dict["clients_updated"],
             backup_id=result_dict["backup_id"],
-            ip_mapping=result_dict["ip_mapping"]
+            ip_mapping=result_dict["ip_mapping"],
+            mode=result_dict["mode"],
+            strategy=result_dict["strategy"],
+            phase_timings=result_dict["phase_timings"],
+            cleanup_scheduled=result_dict.get("cleanup_scheduled", False),
+            cleanup_at=result_dict.get("cleanup_at")
+        )
+
+    def _finalize_network_migration_typed(self) -> SubnetCleanupResult:
+        """
+        Internal typed version of live migration cleanup.
+
+        Returns:
+            SubnetCleanupResult with cleanup status and phase timings
+        """
+        result_dict = self._migration_ops.finalize_network_migration_typed()
+
+        return SubnetCleanupResult(
+            finalized=result_dict["finalized"],
+            old_subnet=result_dict["old_subnet"],
+            new_subnet=result_dict["new_subnet"],
+            phase_timings=result_dict["phase_timings"]
         )
 
     def _ensure_subnet_size_is_adequate(self, network: ipaddress.IPv4Network) -> Dict[str, Any]:
@@ -444,12 +554,14 @@ class NetworkAdmin:
 
     def _preview_ip_remapping(self, old_network: ipaddress.IPv4Network,
                               new_network: ipaddress.IPv4Network,
-                              current_info: Dict[str, Any]) -> Dict[str, Any]:
-        return self._ip_ops.preview_ip_remapping(old_network, new_network, current_info)
+                              current_info: Dict[str, Any],
+                              strategy: str = DEFAULT_IP_REMAP_STRATEGY) -> Dict[str, Any]:
+        return self._ip_ops.preview_ip_remapping(old_network, new_network, current_info, strategy)
 
     def _calculate_complete_ip_remapping(self, old_network: ipaddress.IPv4Network,
-                                         new_network: ipaddress.IPv4Network) -> Dict[str, str]:
-        return self._ip_ops.calculate_complete_ip_remapping(old_network, new_network)
+                                         new_network: ipaddress.IPv4Network,
+                                         strategy: str = DEFAULT_IP_REMAP_STRATEGY) -> Dict[str, str]:
+        return self._ip_ops.calculate_complete_ip_remapping(old_network, new_network, strategy)
 
     def _update_client_database_with_new_ips(self, ip_mapping: Dict[str, str]) -> None:
         self._ip_ops.update_client_database_with_new_ips(ip_mapping)
@@ -490,8 +602,8 @@ class NetworkAdmin:
     def _analyze_main_network_interface(self) -> Dict[str, Any]:
         return self._state_ops.analyze_main_network_interface()
 
-    def _create_comprehensive_migration_backup(self, backup_id: str) -> Dict[str, Any]:
-        return self._migration_ops.create_comprehensive_migration_backup(backup_id)
+    def _create_comprehensive_migration_backup(self, label: str = "subnet_change") -> Dict[str, Any]:
+        return self._migration_ops.create_comprehensive_migration_backup(label)
 
     def _safely_stop_wireguard_service(self) -> None:
         self._migration_ops.safely_stop_wireguard_service()
@@ -40,7 +40,8 @@ WireGuard® is a registered trademark of Jason A. Donenfeld.
 
 import ipaddress
 import subprocess
-from typing import Dict, Any, Callable, Optional
+from typing import Dict, Any, Callable, List, Optional
+from phantom.modules.rule_batch import RuleBatch
 from phantom.modules.core.lib.default_constants import (
     DEFAULT_SSH_PORT
 )
@@ -172,23 +173,67 @@ class _FirewallOperations:
             old_network: Current network configuration
             new_network: Target network configuration
         """
+        # Swap the MASQUERADE rule in one iptables-restore transaction;
+        # a rule already in place for the new network is not duplicated
+        self.apply_nat_rules(present=[new_network], absent=[old_network])
+
+    def allow_subnet(self, network: ipaddress.IPv4Network) -> None:
+        """
+        Add UFW and NAT rules for a subnet, leaving rules of other subnets in place
+
+        Used by live migration, where old and new subnets are served side by side
+        until the grace period ends.
+
+        Args:
+            network: Subnet to allow
+        """
+        try:
+            ssh_port = self._detect_ssh_port()
+            self._run_command(["ufw", "allow", "from", str(network), "to", "any", "port", ssh_port])
+            self._run_command(["ufw", "allow", "from", str(network)])
+        except (OSError, ValueError, subprocess.CalledProcessError):
+            pass
+
+        self.apply_nat_rules(present=[network], absent=[])
+
+    def revoke_subnet(self, network: ipaddress.IPv4Network) -> None:
+        """
+        Remove UFW and NAT rules of a subnet that is no longer served
+
+        Args:
+            network: Subnet to revoke
+        """
+        try:
+            ssh_port = self._detect_ssh_port()
+            self._run_command(["ufw", "delete", "allow", "from", str(network), "to", "any", "port", ssh_port])
+            self._run_command(["ufw", "delete", "allow", "from", str(network)])
+        except (OSError, ValueError, subprocess.CalledProcessError):
+            pass
+
+        self.apply_nat_rules(present=[], absent=[network])
+
+    def apply_nat_rules(self, present: List[ipaddress.IPv4Network],
+                        absent: List[ipaddress.IPv4Network]) -> None:
+        """
+        Add and remove MASQUERADE rules in a single iptables-restore transaction
+        
+        Args:
+            present: Subnets that must be masqueraded
+            absent: Subnets whose MASQUERADE rule must be removed
+        """
         try:
             # Get main interface
             main_interface = self._analyze_main_network_interface()
             if main_interface["interface"] != "unknown":
                 interface = main_interface["interface"]
 
-                # Remove old NAT rule
-                self._run_command([
-                    "iptables", "-t", "nat", "-D", "POSTROUTING",
-                    "-s", str(old_network), "-o", interface, "-j", "MASQUERADE"
-                ])
-
-                # Add new NAT rule
-                self._run_command([
-                    "iptables", "-t", "nat", "-A", "POSTROUTING",
-                    "-s", str(new_network), "-o", interface, "-j", "MASQUERADE"
-                ])
+                batch = RuleBatch(self._run_command)
+                for network in absent:
+                    batch.remove_rule("nat", "POSTROUTING", f"-s {network} -o {interface} -j MASQUERADE")
+                for network in present:
+                    batch.ensure_rule("nat", "POSTROUTING", f"-s {network} -o {interface} -j MASQUERADE")
+                if not batch.apply().changed:
+                    return
 
                 # Save iptables rules persistently if netfilter-persistent is installed
                 # Continue without failing if the command is not available
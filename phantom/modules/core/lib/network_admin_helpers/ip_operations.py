@@ -13,11 +13,12 @@ TR: IPOperations - IP adresi yönetimi yardımcı modülü
     veritabanı güncellemelerini gerçekleştirir.
 
     Ana Sorumluluklar:
-        - Yürütmeden önce IP adresi yeniden eşlemesini önizle
+        - Yürütmeden önce IP adresi yeniden eşlemesini önizle (ilk N eşleme ve özet)
         - Geçişler için tam IP eşlemesini hesapla
         - İstemci veritabanını yeni IP adresleriyle güncelle
         - Yeni alt ağlar için sunucu IP adreslerini hesapla
         - Ağ değişiklikleri sırasında IP aralıklarını dönüştür
+        - "compact" ve "preserve" stratejileri (bkz. ip_remap)
 
 EN: IPOperations - Helper module for IP address management
     =====================================================================
@@ -26,11 +27,12 @@ EN: IPOperations - Helper module for IP address management
     during network migrations.
 
     Main Responsibilities:
-        - Preview IP address remapping before execution
+        - Preview IP address remapping before execution (first N mappings and summary)
         - Calculate complete IP mapping for migrations
         - Update client database with new IP addresses
         - Calculate server IP addresses for new subnets
         - Transform IP ranges during network changes
+        - "compact" and "preserve" strategies (see ip_remap)
 
 Copyright (c) 2025 Rıza Emre ARAS <r.emrearas@proton.me>
 Licensed under AGPL-3.0 - see LICENSE file for details
@@ -41,6 +43,9 @@ WireGuard® is a registered trademark of Jason A. Donenfeld.
 import ipaddress
 from typing import Dict, Any
 
+from phantom.modules.core.lib.default_constants import DEFAULT_IP_REMAP_STRATEGY, DEFAULT_REMAP_PREVIEW_LIMIT
+from phantom.modules.core.lib.ip_remap import IPRemapper, address_array
+
 
 class _IPOperations:
     """
@@ -66,92 +71,86 @@ class _IPOperations:
 
     def preview_ip_remapping(self, old_network: ipaddress.IPv4Network,
                              new_network: ipaddress.IPv4Network,
-                             current_info: Dict[str, Any]) -> Dict[str, Any]:
+                             current_info: Dict[str, Any],
+                             strategy: str = DEFAULT_IP_REMAP_STRATEGY,
+                             limit: int = DEFAULT_REMAP_PREVIEW_LIMIT) -> Dict[str, Any]:
         """
         Preview IP address remapping for subnet change
-        
+
+        Only the first ``limit`` clients (in address order) are listed; the
+        rest of the fleet is described by the summary statistics, so the
+        preview stays the same size however many clients there are.
+
         Args:
             old_network: Current network configuration
             new_network: Target network configuration
             current_info: Current network information
-        
+            strategy: "compact" or "preserve"
+            limit: Number of client mappings to list
+
         Returns:
-            Dictionary with mapping preview
+            Dictionary with mapping preview and summary
         """
         # Parameter retained for compatibility but not used in current implementation
         _ = current_info
 
-        # Get all clients
-        clients = self.data_store.get_all_clients()
+        remapper = IPRemapper(old_network, new_network, strategy)
+        preview = remapper.preview(address_array(ip for _, ip in self.data_store.iter_client_ips()), limit)
 
-        # Create mapping preview
-        mapping = {
-            "server": {
-                "old": str(old_network.network_address + 1),
-                "new": str(new_network.network_address + 1)
-            }
-        }
-
-        # Map clients sequentially
-        new_ip_counter = 2  # Start from .2 (after server)
-        for client in sorted(clients, key=lambda c: ipaddress.IPv4Address(c.ip)):
-            old_ip = client.ip
-            new_ip = str(new_network.network_address + new_ip_counter)
-            mapping[client.name] = {
-                "old": old_ip,
-                "new": new_ip
-            }
-            new_ip_counter += 1
+        # Names are only looked up for the listed clients
+        mapping: Dict[str, Dict[str, str]] = {"server": preview["server"]}
+        for old_ip, new_ip in preview["mappings"].items():
+            client = self.data_store.find_client_by_ip(old_ip)
+            mapping[client.name if client else old_ip] = {"old": old_ip, "new": new_ip}
 
         return {
-            "total_mappings": len(mapping),
-            "mappings": mapping
+            "total_mappings": preview["summary"]["clients"] + 1,
+            "mappings": mapping,
+            "truncated": preview["truncated"],
+            "summary": preview["summary"]
         }
 
     def calculate_complete_ip_remapping(self, old_network: ipaddress.IPv4Network,
-                                        new_network: ipaddress.IPv4Network) -> Dict[str, str]:
+                                        new_network: ipaddress.IPv4Network,
+                                        strategy: str = DEFAULT_IP_REMAP_STRATEGY) -> Dict[str, str]:
         """
         Calculate complete IP remapping for network migration
-        
+
         Args:
             old_network: Current network configuration
             new_network: Target network configuration
-        
+            strategy: "compact" (renumber from .2) or "preserve" (keep host offsets)
+
         Returns:
             Dictionary mapping old IPs to new IPs
         """
-        # Server always gets the first usable IP (.1 in the subnet)
-        ip_mapping = {
-            str(old_network.network_address + 1): str(new_network.network_address + 1)
-        }
+        remapper = IPRemapper(old_network, new_network, strategy)
 
-        # Get all clients sorted by IP
-        clients = self.data_store.get_all_clients()
-        sorted_clients = sorted(clients, key=lambda c: ipaddress.IPv4Address(c.ip))
-
-        # Assign new IPs sequentially to maintain order
-        new_ip_counter = 2  # Start from .2
-        for client in sorted_clients:
-            old_ip = client.ip
-            new_ip = str(new_network.network_address + new_ip_counter)
-            ip_mapping[old_ip] = new_ip
-            new_ip_counter += 1
+        # Server always gets the first usable IP (.1 in the subnet)
+        old_server, new_server = remapper.server_mapping()
+        ip_mapping = {old_server: new_server}
 
+        plan = remapper.remap(address_array(ip for _, ip in self.data_store.iter_client_ips()))
+        ip_mapping.update(plan.pairs())
         return ip_mapping
 
     def update_client_database_with_new_ips(self, ip_mapping: Dict[str, str]) -> None:
         """
         Update client database with new IP addresses
         
+        All rows are rewritten in a single transaction, so a failure leaves
+        every client on its old address.
+
         Args:
             ip_mapping: Dictionary mapping old IPs to new IPs
         """
         clients = self.data_store.get_all_clients()
 
+        name_mapping = {}
         for client in clients:
-            old_ip = client.ip
-            new_ip = ip_mapping.get(old_ip)
+            new_ip = ip_mapping.get(client.ip)
+            if new_ip and new_ip != client.ip:
+                name_mapping[client.name] = new_ip
 
-            if new_ip and new_ip != old_ip:
-                # Persist the new IP address to the database
-                self.data_store.update_client_ip(client.name, new_ip)
+        # Persist the new IP addresses to the database
+        self.data_store.update_all_client_ips(name_mapping)
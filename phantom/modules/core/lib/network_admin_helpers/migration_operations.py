@@ -21,12 +21,21 @@ TR: MigrationOperations - Ağ geçiş orkestrasyonu yardımcı modülü
         - Tüm yapılandırmaları atomik olarak güncelle
 
     Kritik İşlemler:
-        - Alt ağ değişikliğinden önce tam sistem yedeği
+        - Alt ağ değişikliğinden önce tam sistem yedeği (paylaşılan,
+          tekilleştirilmiş SnapshotStore'da)
         - IP eşleme ve istemci veritabanı güncellemeleri
         - Güvenlik duvarı kuralları senkronizasyonu
         - Minimum kesinti ile kusursuz servis yeniden başlatma
         - Herhangi bir hatada otomatik geri alma
 
+    Canlı Geçiş (mode="live"):
+        Servis durdurulmaz. Yeni sunucu adresi eskisinin yanına eklenir,
+        tüm eşlerin AllowedIPs değerleri tek bir 'wg syncconf' ile yeniden
+        yazılır (bekleme süresince eski adresler de kabul edilir), istemci
+        satırları tek bir işlemde güncellenir. Eski adres ve kurallar bekleme
+        süresinden sonra finalize_network_migration_typed ile kaldırılır.
+        Her aşamanın süresi sonuçta raporlanır.
+
 EN: MigrationOperations - Helper module for network migration orchestration
     =====================================================================
 
@@ -42,26 +51,35 @@ EN: MigrationOperations - Helper module for network migration orchestration
         - Update all configurations atomically
 
     Critical Operations:
-        - Full system backup before subnet change
+        - Full system backup before subnet change (in the shared,
+          deduplicated SnapshotStore)
         - IP mapping and client database updates
         - Firewall rules synchronization
         - Seamless service restart with minimal downtime
         - Automatic rollback on any failure
 
+    Live Migration (mode="live"):
+        The service is not stopped. The new server address is added next to
+        the old one and every peer's AllowedIPs is rewritten with a single
+        'wg syncconf' (old addresses stay accepted during the grace period),
+        and client rows are updated in one transaction. The old address and
+        rules are removed after the grace period by
+        finalize_network_migration_typed. Per-phase timings are reported.
+
 Copyright (c) 2025 Rıza Emre ARAS <r.emrearas@proton.me>
 Licensed under AGPL-3.0 - see LICENSE file for details
 Third-party licenses - see THIRD_PARTY_LICENSES file for details
 WireGuard® is a registered trademark of Jason A. Donenfeld.
 """
 
-import re
+import sys
 import json
 import time
-import shutil
 import ipaddress
 from pathlib import Path
-from datetime import datetime
-from typing import Dict, Any, Optional, Callable
+from contextlib import contextmanager
+from datetime import datetime, timedelta
+from typing import Dict, Any, Iterator, List, Optional, Callable
 
 from phantom.api.exceptions import (
     ValidationError,
@@ -71,8 +89,16 @@ from phantom.api.exceptions import (
 )
 
 from phantom.modules.core.lib.default_constants import (
-    DEFAULT_WG_NETWORK
+    DEFAULT_WG_NETWORK,
+    SUBNET_MIGRATION_MODES,
+    DEFAULT_MIGRATION_GRACE_PERIOD,
+    SUBNET_CLEANUP_UNIT,
+    IP_REMAP_STRATEGIES,
+    DEFAULT_IP_REMAP_STRATEGY
 )
+from phantom.modules.core.lib.wg_config import WireGuardConfigFile
+from phantom.modules.config_service import get_config_service
+from phantom.modules.snapshot_store import get_snapshot_store
 
 
 class _MigrationOperations:
@@ -97,7 +123,8 @@ class _MigrationOperations:
                  install_dir: Path, data_dir: Path, backup_dir: Path,
                  subnet_ops, ip_ops, firewall_ops, state_ops,
                  validate_network_modification: Optional[Callable] = None,
-                 analyze_current_network: Optional[Callable] = None):
+                 analyze_current_network: Optional[Callable] = None,
+                 wg_config: Optional[WireGuardConfigFile] = None):
         """
         Initialize migration operations helper
         
@@ -119,6 +146,7 @@ class _MigrationOperations:
             state_ops: StateOperations helper instance
             validate_network_modification: Optional validation callback
             analyze_current_network: Optional analysis callback
+            wg_config: Shared WireGuardConfigFile (created from wg_config_file if omitted)
         """
         self.data_store = data_store
         self.common_tools = common_tools
@@ -128,9 +156,11 @@ class _MigrationOperations:
         self._run_command = run_command
         self.wg_interface = wg_interface
         self.wg_config_file = wg_config_file
+        self.wg_config = wg_config or WireGuardConfigFile(wg_config_file)
         self.install_dir = install_dir
         self.data_dir = data_dir
         self.backup_dir = backup_dir
+        self.backup_store = get_snapshot_store(backup_dir, config.get("backups"))
 
         # Helper references
         self.subnet_ops = subnet_ops
@@ -142,7 +172,9 @@ class _MigrationOperations:
         self._validate_network_modification_typed = validate_network_modification
         self._analyze_current_network_typed = analyze_current_network
 
-    def execute_network_migration_typed(self, new_subnet: str, force: bool = False) -> Dict[str, Any]:
+    def execute_network_migration_typed(self, new_subnet: str, force: bool = False, mode: str = "restart",
+                                        grace_period: int = DEFAULT_MIGRATION_GRACE_PERIOD,
+                                        strategy: str = DEFAULT_IP_REMAP_STRATEGY) -> Dict[str, Any]:
         """
         Execute the network migration with full backup and rollback capabilities.
 
@@ -156,8 +188,23 @@ class _MigrationOperations:
         7. Start WireGuard service
         8. Verify success
 
+        With mode="live" steps 3 and 7 are replaced by re-addressing the
+        running interface (see execute_live_network_migration).
+        strategy selects how client addresses are remapped (see ip_remap).
+
         Automatic rollback occurs on any failure.
         """
+        if mode not in SUBNET_MIGRATION_MODES:
+            raise ValidationError(
+                f"Invalid migration mode '{mode}'. Valid modes: {', '.join(SUBNET_MIGRATION_MODES)}"
+            )
+        if int(grace_period) < 0:
+            raise ValidationError("Grace period cannot be negative")
+        if strategy not in IP_REMAP_STRATEGIES:
+            raise ValidationError(
+                f"Invalid remap strategy '{strategy}'. Valid strategies: {', '.join(IP_REMAP_STRATEGIES)}"
+            )
+
         if not force:
             raise ValidationError(
                 "Subnet change requires explicit confirmation. "
@@ -166,6 +213,10 @@ class _MigrationOperations:
                 "network disruptions."
             )
 
+        # A previous live migration still serving its old subnet is completed first
+        if self.config.get("wireguard", {}).get("pending_migration"):
+            self.finalize_network_migration_typed()
+
         # Perform validation if callback is available
         if self._validate_network_modification_typed:
             validation = self._validate_network_modification_typed(new_subnet)
@@ -189,30 +240,24 @@ class _MigrationOperations:
             old_subnet = self.config.get("wireguard", {}).get("network", DEFAULT_WG_NETWORK)
             old_network = ipaddress.IPv4Network(old_subnet)
 
+        timings: Dict[str, float] = {}
+
         # Create comprehensive backup
-        backup_id = f"subnet_change_{int(time.time())}"
-        backup_data = self.create_comprehensive_migration_backup(backup_id)
+        with self._phase(timings, "backup"):
+            backup_data = self.create_comprehensive_migration_backup("subnet_change")
+        backup_id = backup_data["id"]
 
         try:
-            # Stop WireGuard service
-            self.safely_stop_wireguard_service()
-
-            # Create IP mapping
-            ip_mapping = self.ip_ops.calculate_complete_ip_remapping(old_network, new_network)
-
-            # Update all configuration files atomically
-            self.update_server_network_configuration(new_network, ip_mapping)
-            # Client configurations are generated dynamically from database
-            # Static config files no longer need regeneration
-            self.ip_ops.update_client_database_with_new_ips(ip_mapping)
-            self.update_main_config_with_new_subnet(str(new_network))
-            self.firewall_ops.update_firewall_rules_for_new_subnet(old_network, new_network)
-
-            # Start WireGuard service
-            self.safely_start_wireguard_service()
+            if mode == "live":
+                result = self.execute_live_network_migration(old_network, new_network, int(grace_period), timings,
+                                                             strategy)
+            else:
+                result = self._execute_restart_network_migration(old_network, new_network, timings, strategy)
 
             # Verify that the migration completed successfully
-            if not self.verify_network_migration_success(new_network):
+            with self._phase(timings, "verify"):
+                verified = self.verify_network_migration_success(new_network)
+            if not verified:
                 raise ServiceOperationError(
                     "Subnet change completed but verification failed. "
                     "The WireGuard service may not be running properly.\n"
@@ -223,13 +268,22 @@ class _MigrationOperations:
                     "A backup was created and can be restored if needed."
                 )
 
+            if mode == "live":
+                with self._phase(timings, "cleanup"):
+                    result.update(self._schedule_old_address_cleanup(int(grace_period)))
+
+            ip_mapping = result.pop("ip_mapping")
             return {
                 "success": True,
                 "old_subnet": str(old_network),
                 "new_subnet": str(new_network),
                 "clients_updated": len(ip_mapping) - 1,  # Exclude server
                 "backup_id": backup_id,
-                "ip_mapping": ip_mapping
+                "ip_mapping": ip_mapping,
+                "mode": mode,
+                "strategy": strategy,
+                "phase_timings": timings,
+                **result
             }
 
         except Exception as e:
@@ -245,65 +299,240 @@ class _MigrationOperations:
 
             raise NetworkError(f"Subnet change failed and was rolled back: {str(e)}")
 
-    def create_comprehensive_migration_backup(self, backup_id: str) -> Dict[str, Any]:
-        """Create comprehensive backup before migration"""
-        backup_path = self.backup_dir / backup_id
-        backup_path.mkdir(exist_ok=True)
+    def _execute_restart_network_migration(self, old_network: ipaddress.IPv4Network,
+                                           new_network: ipaddress.IPv4Network,
+                                           timings: Dict[str, float],
+                                           strategy: str = DEFAULT_IP_REMAP_STRATEGY) -> Dict[str, Any]:
+        """Migrate with the interface stopped (clients are disconnected until restart)."""
+        # Stop WireGuard service
+        with self._phase(timings, "service_stop"):
+            self.safely_stop_wireguard_service()
+
+        # Create IP mapping
+        with self._phase(timings, "remap"):
+            ip_mapping = self.ip_ops.calculate_complete_ip_remapping(old_network, new_network, strategy)
+
+        # Update all configuration files atomically
+        with self._phase(timings, "server_config"):
+            self.update_server_network_configuration(new_network, ip_mapping)
+        # Client configurations are generated dynamically from database
+        # Static config files no longer need regeneration
+        with self._phase(timings, "database"):
+            self.ip_ops.update_client_database_with_new_ips(ip_mapping)
+        with self._phase(timings, "main_config"):
+            self.update_main_config_with_new_subnet(str(new_network))
+        with self._phase(timings, "firewall"):
+            self.firewall_ops.update_firewall_rules_for_new_subnet(old_network, new_network)
+
+        # Start WireGuard service
+        with self._phase(timings, "service_start"):
+            self.safely_start_wireguard_service()
+
+        return {"ip_mapping": ip_mapping}
+
+    def execute_live_network_migration(self, old_network: ipaddress.IPv4Network,
+                                       new_network: ipaddress.IPv4Network, grace_period: int,
+                                       timings: Dict[str, float],
+                                       strategy: str = DEFAULT_IP_REMAP_STRATEGY) -> Dict[str, Any]:
+        """
+        Migrate without stopping the interface.
+
+        The new server address is added next to the old one and all peers are
+        re-addressed with a single 'wg syncconf'; during the grace period each
+        peer also keeps its old address so clients can pick up their new
+        configuration. The old address, AllowedIPs and firewall rules are
+        removed by finalize_network_migration_typed.
+
+        Every phase is a single command or a single pass over the peers.
+
+        Args:
+            old_network: Current network configuration
+            new_network: Target network configuration
+            grace_period: Seconds to keep serving the old subnet
+            timings: Phase durations, filled in place
+            strategy: IP remap strategy ("compact" or "preserve")
+
+        Returns:
+            Dictionary with ip_mapping
+        """
+        old_server_ip = str(old_network.network_address + 1)
+        old_address = self._current_server_address(old_server_ip, old_network)
+
+        with self._phase(timings, "remap"):
+            ip_mapping = self.ip_ops.calculate_complete_ip_remapping(old_network, new_network, strategy)
+        new_address = f"{ip_mapping[old_server_ip]}/{new_network.prefixlen}"
+
+        # 1. Serve both subnets on the running interface
+        with self._phase(timings, "address_add"):
+            self._run_ip_address("replace", new_address)
+
+        # 2. Final configuration on disk, old and new AllowedIPs on the interface
+        with self._phase(timings, "server_config"):
+            self.update_server_network_configuration(new_network, ip_mapping)
+        with self._phase(timings, "peer_sync"):
+            config = self.wg_config.load()
+            reverse_mapping = {new: old for old, new in ip_mapping.items()}
+            old_allowed_ips: Dict[str, List[str]] = {}
+            for peer in config.peers():
+                kept = [f"{reverse_mapping[ip.partition('/')[0]]}/32" for ip in peer.allowed_ips
+                        if ip.partition('/')[0] in reverse_mapping]
+                if kept:
+                    old_allowed_ips[peer.public_key] = kept
+            self._sync_interface(config.strip(old_allowed_ips if grace_period else None))
+
+        # 3. Client rows in one transaction
+        with self._phase(timings, "database"):
+            self.ip_ops.update_client_database_with_new_ips(ip_mapping)
+
+        # 4. Main configuration, remembering what the cleanup has to remove
+        with self._phase(timings, "main_config"):
+            self.config["wireguard"]["pending_migration"] = {
+                "old_subnet": str(old_network),
+                "old_address": old_address,
+                "new_subnet": str(new_network),
+                "cleanup_after": (datetime.now() + timedelta(seconds=grace_period)).isoformat()
+            }
+            self.update_main_config_with_new_subnet(str(new_network))
+
+        # 5. Firewall rules for the new subnet (the old ones go with the cleanup)
+        with self._phase(timings, "firewall"):
+            self.firewall_ops.allow_subnet(new_network)
 
-        backup_data = {
-            "id": backup_id,
-            "timestamp": datetime.now().isoformat(),
-            "original_subnet": self.config.get("wireguard", {}).get("network", DEFAULT_WG_NETWORK),
-            "paths": {}
+        return {"ip_mapping": ip_mapping}
+
+    def finalize_network_migration_typed(self) -> Dict[str, Any]:
+        """
+        Stop serving the old subnet of a live migration.
+
+        Re-syncs the interface from the configuration file (dropping the old
+        AllowedIPs), removes the old server address and the old firewall
+        rules. Does nothing if no live migration is pending.
+
+        Returns:
+            Dictionary with finalized flag, subnets and phase timings
+        """
+        pending = self.config.get("wireguard", {}).get("pending_migration")
+        if not pending:
+            return {"finalized": False, "old_subnet": None, "new_subnet": None, "phase_timings": {}}
+
+        timings: Dict[str, float] = {}
+        old_network = ipaddress.IPv4Network(pending["old_subnet"])
+
+        with self._phase(timings, "peer_sync"):
+            self._sync_interface(self.wg_config.load().strip())
+        with self._phase(timings, "address_remove"):
+            # Already gone if the interface was restarted meanwhile
+            self._run_command(["ip", "-4", "address", "del", pending["old_address"], "dev", self.wg_interface])
+        with self._phase(timings, "firewall"):
+            self.firewall_ops.revoke_subnet(old_network)
+        with self._phase(timings, "main_config"):
+            self.config["wireguard"].pop("pending_migration", None)
+            self._save_config(self.config)
+
+        return {
+            "finalized": True,
+            "old_subnet": pending["old_subnet"],
+            "new_subnet": pending.get("new_subnet", self.config["wireguard"].get("network")),
+            "phase_timings": timings
         }
 
+    @staticmethod
+    @contextmanager
+    def _phase(timings: Dict[str, float], name: str) -> Iterator[None]:
+        """Record the duration of a migration phase in seconds."""
+        started = time.perf_counter()
         try:
-            # 1. Backup WireGuard config
-            if self.wg_config_file.exists():
-                wg_backup = backup_path / "wg_main.conf"
-                shutil.copy2(self.wg_config_file, wg_backup)
-                backup_data["paths"]["wireguard_config"] = str(wg_backup)
-
-            # 2. Backup main config
-            main_config = self.install_dir / "config" / "phantom.json"
-            if main_config.exists():
-                config_backup = backup_path / "phantom.json"
-                shutil.copy2(main_config, config_backup)
-                backup_data["paths"]["main_config"] = str(config_backup)
-
-            # 3. Backup client database
-            clients_db = self.data_dir / "clients.db"
-            if clients_db.exists():
-                db_backup = backup_path / "clients.db"
-                shutil.copy2(clients_db, db_backup)
-                backup_data["paths"]["clients_db"] = str(db_backup)
-
-            # 4. Backup firewall rules
-            ufw_rules = self.firewall_ops.capture_current_firewall_rules()
-            firewall_backup = backup_path / "firewall_rules.json"
-            with open(firewall_backup, 'w') as f:
-                json.dump(ufw_rules, f, indent=2)
-            backup_data["paths"]["firewall_rules"] = str(firewall_backup)
-
-            # 5. Save backup metadata
-            metadata_file = backup_path / "backup_metadata.json"
-            with open(metadata_file, 'w') as f:
-                json.dump(backup_data, f, indent=2)
-
-            return backup_data
+            yield
+        finally:
+            timings[name] = round(time.perf_counter() - started, 6)
+
+    def _current_server_address(self, server_ip: str, network: ipaddress.IPv4Network) -> str:
+        """Server address with prefix as written in the Interface section."""
+        interface = self.wg_config.load().interface
+        address = interface.get("Address") if interface else None
+        for entry in (a.strip() for a in (address or "").split(",")):
+            if entry.partition("/")[0] == server_ip:
+                return entry if "/" in entry else f"{entry}/{network.prefixlen}"
+        return f"{server_ip}/{network.prefixlen}"
+
+    def _run_ip_address(self, action: str, address: str) -> None:
+        result = self._run_command(["ip", "-4", "address", action, address, "dev", self.wg_interface])
+        if result["returncode"] != 0:
+            raise ServiceOperationError(
+                f"Unable to {action} address {address} on {self.wg_interface}.\n"
+                f"Error details: {result['stderr']}"
+            )
 
-        except Exception:
-            # Clean up incomplete backup on failure
-            if backup_path.exists():
-                shutil.rmtree(backup_path, ignore_errors=True)
+    def _sync_interface(self, stripped_config: str) -> None:
+        """Apply peers and AllowedIPs to the running interface in one call."""
+        result = self._run_command(["wg", "syncconf", self.wg_interface, "/dev/stdin"], input=stripped_config)
+        if result["returncode"] != 0:
+            raise ServiceOperationError(
+                f"Unable to apply the new peer addresses with 'wg syncconf'.\n"
+                f"Error details: {result['stderr']}"
+            )
+
+    def _schedule_old_address_cleanup(self, grace_period: int) -> Dict[str, Any]:
+        """Remove the old subnet now, or schedule it with a transient systemd timer."""
+        if grace_period == 0:
+            self.finalize_network_migration_typed()
+            return {"cleanup_scheduled": False, "cleanup_at": None}
+
+        cleanup_at = self.config["wireguard"]["pending_migration"]["cleanup_after"]
+        api_script = self.install_dir / "phantom" / "bin" / "phantom-api.py"
+
+        # Replace a timer left over from an earlier migration
+        self._run_command(["systemctl", "stop", f"{SUBNET_CLEANUP_UNIT}.timer"])
+        result = self._run_command([
+            "systemd-run", f"--unit={SUBNET_CLEANUP_UNIT}", f"--on-active={grace_period}",
+            "--timer-property=AccuracySec=1s",
+            sys.executable, str(api_script), "core", "finalize_subnet_change"
+        ])
+
+        # Without systemd-run the cleanup stays pending until finalize_subnet_change is called
+        return {"cleanup_scheduled": result["returncode"] == 0, "cleanup_at": cleanup_at}
+
+    def create_comprehensive_migration_backup(self, label: str = "subnet_change") -> Dict[str, Any]:
+        """Create comprehensive backup before migration
+
+        Files are recorded in the shared snapshot store; unchanged files and
+        unchanged chunks of clients.db are not stored again.
+        """
+        original_subnet = self.config.get("wireguard", {}).get("network", DEFAULT_WG_NETWORK)
+        try:
+            snapshot = self.backup_store.create(
+                label,
+                files={
+                    "wireguard_config": self.wg_config_file,
+                    "main_config": self.install_dir / "config" / "phantom.json",
+                    "clients_db": self.data_dir / "clients.db"
+                },
+                data={
+                    "firewall_rules": json.dumps(self.firewall_ops.capture_current_firewall_rules(),
+                                                 indent=2).encode()
+                },
+                source="core",
+                metadata={"original_subnet": original_subnet}
+            )
+        except OSError as e:
+            failed_path = e.filename or self.backup_store.root
             raise ServiceOperationError(
-                "Unable to create backup before subnet change. "
+                f"Unable to create backup before subnet change: {e.strerror or e} ({failed_path}).\n"
                 "Please ensure:\n"
-                "• Sufficient disk space in /opt/phantom-wg/backups/\n"
+                "• The files to back up exist and are readable\n"
+                f"• Sufficient disk space in {self.backup_store.root}/\n"
                 "• Write permissions for the backup directory\n"
                 "• No disk quota restrictions\n"
                 "Cannot proceed without a backup for safety reasons."
-            )
+            ) from e
+
+        return {
+            "id": snapshot.id,
+            "timestamp": snapshot.created,
+            "original_subnet": original_subnet,
+            "files": [f.name for f in snapshot.files],
+            "new_bytes": snapshot.new_bytes
+        }
 
     def safely_stop_wireguard_service(self) -> None:
         """Safely stop WireGuard service"""
@@ -378,6 +607,36 @@ class _MigrationOperations:
     def execute_emergency_rollback(self, backup_data: Dict[str, Any]) -> None:
         """Execute emergency rollback to restore previous state"""
         try:
+            self.restore_snapshot(backup_data["id"])
+        except Exception:
+            raise ServiceOperationError(
+                "CRITICAL: Rollback operation failed!\n"
+                "The system may be in an inconsistent state.\n\n"
+                "Immediate actions required:\n"
+                "• Stop the WireGuard service: 'systemctl stop wg-quick@wg_main'\n"
+                f"• Manually restore backup '{backup_data.get('id')}': "
+                f"'phantom-api core restore_backup backup_id={backup_data.get('id')} confirm=true'\n"
+                "• Check the backup metadata with 'phantom-api core list_backups'\n"
+                "• Restart the service after manual restoration\n"
+            )
+
+    def restore_snapshot(self, backup_id: str) -> Dict[str, Any]:
+        """Restore the files of a snapshot.
+
+        The WireGuard service is restarted when the snapshot contains its
+        configuration or the client database. Files of other modules are
+        written back to the path they were recorded from.
+
+        Returns:
+            Dict with the restored file names and warnings for steps that
+            need manual follow-up (e.g. firewall rules of a restored subnet)
+        """
+        snapshot = self.backup_store.get(backup_id)
+        names = [f.name for f in snapshot.files if f.name != "firewall_rules"]
+        warnings: List[str] = []
+        restart = bool({"wireguard_config", "clients_db"} & set(names))
+
+        if restart:
             # Stop the service before restoring files
             self._run_command(["systemctl", "stop", f"wg-quick@{self.wg_interface}"])
 
@@ -387,36 +646,45 @@ class _MigrationOperations:
             # Wait to ensure interface is fully removed
             time.sleep(1)
 
-            # Restore files
-            paths = backup_data.get("paths", {})
-
-            # Restore WireGuard config
-            if "wireguard_config" in paths:
-                shutil.copy2(paths["wireguard_config"], self.wg_config_file)
-
-            # Restore main config
-            if "main_config" in paths:
-                shutil.copy2(paths["main_config"], self.install_dir / "config" / "phantom.json")
-
-            # Restore client database
-            if "clients_db" in paths:
-                shutil.copy2(paths["clients_db"], self.data_dir / "clients.db")
-
-            # Attempt to restore firewall rules
-            original_subnet = backup_data.get("original_subnet")
-            if original_subnet:
+        current_subnet = self.config.get("wireguard", {}).get("network", DEFAULT_WG_NETWORK)
+        config_service = get_config_service(self.install_dir / "config" / "phantom.json")
+
+        for name in names:
+            if name == "wireguard_config":
+                self.backup_store.extract(backup_id, name, self.wg_config_file)
+                self.wg_config.invalidate()
+            elif name == "main_config":
+                # Atomically, so readers never see a partial file
+                config_service.save(json.loads(self.backup_store.read(backup_id, name)))
+            elif name == "clients_db":
+                # Copied into the open connection, the file itself is not replaced
+                restored = self.backup_store.extract(backup_id, name, self.data_dir / ".clients.db.restore")
                 try:
-                    original_network = ipaddress.IPv4Network(original_subnet)
-                    current_network = ipaddress.IPv4Network(
-                        self.config.get("wireguard", {}).get("network", DEFAULT_WG_NETWORK)
-                    )
-                    self.firewall_ops.update_firewall_rules_for_new_subnet(current_network, original_network)
-                except (OSError, ValueError):
-                    pass
+                    self.data_store.restore_database(restored)
+                finally:
+                    restored.unlink()
+            else:
+                self.backup_store.extract(backup_id, name)
 
-            # Reload config
-            self.config = json.loads((self.install_dir / "config" / "phantom.json").read_text())
+        # Reload config
+        self.config.clear()
+        self.config.update(config_service.load())
+        restored_subnet = self.config.get("wireguard", {}).get("network", DEFAULT_WG_NETWORK)
+        self.data_store.update_network_configuration(restored_subnet)
 
+        # Attempt to restore firewall rules
+        if restored_subnet != current_subnet:
+            try:
+                self.firewall_ops.update_firewall_rules_for_new_subnet(
+                    ipaddress.IPv4Network(current_subnet), ipaddress.IPv4Network(restored_subnet)
+                )
+            except (OSError, ValueError) as e:
+                warnings.append(
+                    f"Firewall rules could not be moved from {current_subnet} to {restored_subnet}: {e}. "
+                    "Update the UFW and NAT rules for the restored subnet manually."
+                )
+
+        if restart:
             # Start service and verify
             start_result = self._run_command(["systemctl", "start", f"wg-quick@{self.wg_interface}"])
             if start_result["returncode"] != 0:
@@ -430,17 +698,45 @@ class _MigrationOperations:
                         f"Error: {start_result.get('stderr', 'Unknown error')}"
                     )
 
-        except Exception:
+        return {"restored_files": names, "warnings": warnings}
+
+    def list_backups_typed(self, label: Optional[str] = None) -> Dict[str, Any]:
+        """List snapshots of the backup store, newest first, with store usage."""
+        usage = self.backup_store.usage()
+        backups = [snapshot.to_dict() for snapshot in self.backup_store.list(label)]
+        return {
+            "backups": backups,
+            "total": len(backups),
+            "stored_bytes": usage["stored_bytes"],
+            "logical_bytes": usage["logical_bytes"]
+        }
+
+    def restore_backup_typed(self, backup_id: str, force: bool = False) -> Dict[str, Any]:
+        """Restore a snapshot after recording the current state as a "pre_restore" snapshot."""
+        if not force:
+            raise ValidationError(
+                "Restoring a backup overwrites the current configuration. "
+                "Review the backup with 'phantom-api core list_backups' and add 'confirm=true' to proceed."
+            )
+        snapshot = self.backup_store.get(backup_id)
+
+        safety = self.create_comprehensive_migration_backup("pre_restore")
+        try:
+            restored = self.restore_snapshot(backup_id)
+        except Exception as e:
             raise ServiceOperationError(
-                "CRITICAL: Rollback operation failed!\n"
-                "The system may be in an inconsistent state.\n\n"
-                "Immediate actions required:\n"
-                "• Stop the WireGuard service: 'systemctl stop wg-quick@wg_main'\n"
-                f"• Manually restore from backup at: {backup_data.get('backup_path', '/opt/phantom-wg/backups/')}\n"
-                "• Check the backup metadata file for original configuration\n"
-                "• Restart the service after manual restoration\n"
+                f"Restoring backup '{backup_id}' failed: {e}. "
+                f"The state before the restore was saved as backup '{safety['id']}'."
             )
 
+        return {
+            "backup_id": backup_id,
+            "label": snapshot.label,
+            "restored_files": restored["restored_files"],
+            "safety_backup_id": safety["id"],
+            "warnings": restored["warnings"]
+        }
+
     def update_server_network_configuration(self, new_network: ipaddress.IPv4Network,
                                             ip_mapping: Dict[str, str]) -> None:
         """Update server network configuration in WireGuard config file"""
@@ -459,84 +755,40 @@ class _MigrationOperations:
             self.config.get("wireguard", {}).get("network", DEFAULT_WG_NETWORK)
         )
 
-        # Define patterns for parsing WireGuard configuration
-        section_pattern = re.compile(r'^\[(Interface|Peer)]')
-        key_value_pattern = re.compile(r'^(\w+)\s*=\s*(.+)$')
-
-        # Read current config
-        with open(self.wg_config_file, 'r') as f:
-            config_lines = f.readlines()
-
-        # Process each line
-        updated_lines = []
-        current_section = None
-
-        for line in config_lines:
-            stripped = line.strip()
-
-            # Check for section header
-            section_match = section_pattern.match(stripped)
-            if section_match:
-                current_section = section_match.group(1)
-                updated_lines.append(line)
-                continue
-
-            # Check for key-value pair
-            kv_match = key_value_pattern.match(stripped)
-            if kv_match:
-                key, value = kv_match.groups()
-
-                # Update server IP address in Interface section
-                if current_section == 'Interface' and key == 'Address':
-                    # Update server address
-                    old_server_ip = str(old_subnet.network_address + 1)
-                    new_server_ip = ip_mapping[old_server_ip]
-
-                    # Maintain CIDR notation format
-                    if '/' in value:
-                        prefix = value.split('/')[1]
-                        new_value = f"{new_server_ip}/{prefix}"
+        config = self.wg_config.load()
+        try:
+            # Update server IP address in Interface section, keeping the CIDR prefix
+            old_server_ip = str(old_subnet.network_address + 1)
+            interface = config.interface
+            address = interface.get("Address") if interface else None
+            if address:
+                new_addresses = []
+                for entry in (a.strip() for a in address.split(",")):
+                    ip_part, _, prefix = entry.partition("/")
+                    if ip_part == old_server_ip:
+                        entry = f"{ip_mapping[old_server_ip]}/{prefix or new_network.prefixlen}"
+                    new_addresses.append(entry)
+                interface.set("Address", ", ".join(new_addresses))
+
+            # Update client IP addresses in Peer sections, other lines stay untouched
+            for peer in list(config.peers()):
+                new_allowed_ips = []
+                for ip in peer.allowed_ips:
+                    ip_part, _, cidr_part = ip.partition("/")
+                    if ip_part in ip_mapping:
+                        new_allowed_ips.append(f"{ip_mapping[ip_part]}/{cidr_part or '32'}")
                     else:
-                        new_value = f"{new_server_ip}/{new_network.prefixlen}"
-
-                    # Preserve original formatting
-                    updated_lines.append(f"{key} = {new_value}\n")
-                    continue
-
-                # Update client IP addresses in Peer sections
-                if current_section == 'Peer' and key == 'AllowedIPs':
-                    # Parse allowed IPs
-                    allowed_ips = [ip.strip() for ip in value.split(',')]
-                    new_allowed_ips = []
-
-                    for ip in allowed_ips:
-                        # Parse IP address and CIDR notation
-                        if '/' in ip:
-                            ip_part = ip.split('/')[0]
-                            cidr_part = ip.split('/')[1]
-                        else:
-                            ip_part = ip
-                            cidr_part = '32'
-
-                        # Update IP if it exists in our mapping
-                        if ip_part in ip_mapping:
-                            new_ip = ip_mapping[ip_part]
-                            new_allowed_ips.append(f"{new_ip}/{cidr_part}")
-                        else:
-                            # Preserve IPs not in our subnet
-                            new_allowed_ips.append(ip)
-
-                    # Preserve original formatting
-                    new_value = ', '.join(new_allowed_ips)
-                    updated_lines.append(f"{key} = {new_value}\n")
-                    continue
-
-            # Preserve all other configuration lines
-            updated_lines.append(line)
-
-        # Write updated config
-        with open(self.wg_config_file, 'w') as f:
-            f.writelines(updated_lines)
+                        # Preserve IPs not in our subnet
+                        new_allowed_ips.append(ip)
+                if new_allowed_ips != peer.allowed_ips:
+                    config.update_peer(peer.public_key, allowed_ips=new_allowed_ips)
+
+            # Atomic write (temp file, fsync, rename)
+            self.wg_config.save(config)
+        except BaseException:
+            # Drop the partially remapped model, the file on disk is unchanged
+            self.wg_config.invalidate()
+            raise
 
     def update_main_config_with_new_subnet(self, new_subnet: str) -> None:
         """Update main configuration with new subnet"""
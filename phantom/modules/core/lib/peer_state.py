@@ -0,0 +1,221 @@
+"""
+██████╗ ██╗  ██╗ █████╗ ███╗   ██╗████████╗ ██████╗ ███╗   ███╗
+██╔══██╗██║  ██║██╔══██╗████╗  ██║╚══██╔══╝██╔═══██╗████╗ ████║
+██████╔╝███████║███████║██╔██╗ ██║   ██║   ██║   ██║██╔████╔██║
+██╔═══╝ ██╔══██║██╔══██║██║╚██╗██║   ██║   ██║   ██║██║╚██╔╝██║
+██║     ██║  ██║██║  ██║██║ ╚████║   ██║   ╚██████╔╝██║ ╚═╝ ██║
+╚═╝     ╚═╝  ╚═╝╚═╝  ╚═╝╚═╝  ╚═══╝   ╚═╝    ╚═════╝ ╚═╝     ╚═╝
+
+TR: PeerStateReader - WireGuard arayüz ve peer durumunu makine çıktısından okuma
+    ============================================================================
+
+    'wg show <arayüz> dump' komutunun tab ile ayrılmış makine çıktısını tek
+    bir çağrıda okur ve tipli PeerInfo kayıtları döndürür. İnsan okunabilir
+    'wg show' çıktısının ("1 minute, 3 seconds ago", "1.50 KiB received")
+    regex ile ayrıştırılmasına gerek kalmaz.
+
+    Her peer için:
+        - latest_handshake_epoch: Unix zamanı (0 = hiç handshake yok)
+        - transfer.received_bytes / sent_bytes: Ham kernel sayaçları
+        - latest_handshake / transfer.received / sent: wg show ile aynı
+          formatta insan okunabilir değerler (geriye dönük uyumluluk)
+
+    Arayüz WireGuard değilse veya yoksa read_dump() None döndürür.
+
+    Yalnızca handshake zamanları gerekiyorsa latest_handshakes() süreç
+    başlatmadan netlink veya UAPI soketi üzerinden okur; 'wg show
+    <arayüz> latest-handshakes' son çaredir.
+
+EN: PeerStateReader - Read WireGuard interface and peer state from machine output
+    ===========================================================================
+
+    Reads the tab separated machine output of 'wg show <interface> dump' in a
+    single call and returns typed PeerInfo records. Regex parsing of the
+    human readable 'wg show' output ("1 minute, 3 seconds ago", "1.50 KiB
+    received") is no longer needed.
+
+    For every peer:
+        - latest_handshake_epoch: Unix time (0 = never)
+        - transfer.received_bytes / sent_bytes: Raw kernel counters
+        - latest_handshake / transfer.received / sent: Human readable values
+          formatted exactly like wg show (backward compatibility)
+
+    read_dump() returns None if the interface is missing or not WireGuard.
+
+    When only handshake times are needed, latest_handshakes() reads them
+    over netlink or the UAPI socket without starting a process; 'wg show
+    <interface> latest-handshakes' is the last resort.
+
+Copyright (c) 2025 Rıza Emre ARAS <r.emrearas@proton.me>
+Licensed under AGPL-3.0 - see LICENSE file for details
+Third-party licenses - see THIRD_PARTY_LICENSES file for details
+WireGuard® is a registered trademark of Jason A. Donenfeld.
+"""
+
+import time
+from typing import List, Optional
+
+from ..models import PeerInfo, TransferStats, InterfaceDump
+from .wg_netlink import WireGuardNetlink, read_uapi_handshakes
+
+_NONE = "(none)"
+
+# Shared so the WireGuard netlink family id is resolved once per process
+_netlink = WireGuardNetlink()
+
+_TIME_UNITS = (
+    ("year", 365 * 24 * 60 * 60),
+    ("day", 24 * 60 * 60),
+    ("hour", 60 * 60),
+    ("minute", 60),
+    ("second", 1)
+)
+
+_BYTE_UNITS = ("KiB", "MiB", "GiB", "TiB")
+
+
+def format_handshake_age(seconds: int) -> str:
+    """Format a handshake age like wg show does ("1 minute, 3 seconds ago")."""
+    if seconds <= 0:
+        return "Now"
+
+    parts = []
+    for unit, size in _TIME_UNITS:
+        value, seconds = divmod(seconds, size)
+        if value:
+            parts.append(f"{value} {unit}{'' if value == 1 else 's'}")
+    return ", ".join(parts) + " ago"
+
+
+def format_transfer_bytes(value: int) -> str:
+    """Format a byte counter like wg show does ("512 B", "1.50 KiB")."""
+    if value < 1024:
+        return f"{value} B"
+
+    size = float(value)
+    for unit in _BYTE_UNITS:
+        size /= 1024
+        if size < 1024 or unit == _BYTE_UNITS[-1]:
+            return f"{size:.2f} {unit}"
+    return f"{value} B"  # pragma: no cover
+
+
+def _optional(value: str) -> Optional[str]:
+    return None if value in ("", _NONE) else value
+
+
+def _to_int(value: str) -> Optional[int]:
+    try:
+        return int(value)
+    except ValueError:
+        return None
+
+
+class PeerStateReader:
+    """Reads interface and peer state with one 'wg show <interface> dump' call.
+
+    Attributes:
+        wg_interface: WireGuard interface to query
+    """
+
+    def __init__(self, run_command, wg_interface: str):
+        self._run_command = run_command
+        self.wg_interface = wg_interface
+
+    def read_dump(self) -> Optional[InterfaceDump]:
+        """Return the current interface state, or None if it cannot be read."""
+        result = self._run_command(["wg", "show", self.wg_interface, "dump"])
+        if not result["success"]:
+            return None
+        return self.parse_dump(self.wg_interface, result["stdout"])
+
+    def latest_handshakes(self) -> Optional[List[int]]:
+        """Return one handshake epoch per peer (0 = never), or None if unavailable.
+
+        Kernel interfaces are read over netlink and wireguard-go interfaces
+        over their UAPI socket; only if both fail is 'wg show <interface>
+        latest-handshakes' run.
+        """
+        for reader in (_netlink.latest_handshakes, read_uapi_handshakes):
+            try:
+                return reader(self.wg_interface)
+            except OSError:
+                continue
+
+        result = self._run_command(["wg", "show", self.wg_interface, "latest-handshakes"])
+        if not result["success"]:
+            return None
+        return self.parse_latest_handshakes(result["stdout"])
+
+    @staticmethod
+    def parse_latest_handshakes(output: str) -> List[int]:
+        """Parse 'wg show <interface> latest-handshakes' output (public key, epoch)."""
+        handshakes = []
+        for line in output.splitlines():
+            fields = line.split()
+            if len(fields) >= 2:
+                handshakes.append(_to_int(fields[1]) or 0)
+        return handshakes
+
+    @staticmethod
+    def parse_dump(interface: str, output: str, now: Optional[float] = None) -> Optional[InterfaceDump]:
+        """Parse 'wg show <interface> dump' output.
+
+        The first line describes the interface (private key, public key,
+        listen port, fwmark). Every following line is a peer: public key,
+        preshared key, endpoint, allowed ips, latest handshake, rx bytes,
+        tx bytes, persistent keepalive.
+
+        Args:
+            interface: Interface name the output belongs to
+            output: Raw command output
+            now: Reference time for handshake ages (defaults to time.time())
+
+        Returns:
+            InterfaceDump, or None if the output has no interface line
+        """
+        now = time.time() if now is None else now
+        lines = [line for line in output.splitlines() if line.strip()]
+        if not lines:
+            return None
+
+        header = lines[0].split("\t")
+        if len(header) < 4:
+            return None
+
+        fwmark = _optional(header[3])
+        dump = InterfaceDump(
+            interface=interface,
+            public_key=_optional(header[1]),
+            listen_port=_to_int(header[2]),
+            fwmark=int(fwmark, 0) if fwmark and fwmark != "off" else None,
+            peers=[],
+            read_at=now
+        )
+
+        for line in lines[1:]:
+            fields = line.split("\t")
+            if len(fields) < 8:
+                continue
+
+            handshake = _to_int(fields[4]) or 0
+            rx_bytes = _to_int(fields[5]) or 0
+            tx_bytes = _to_int(fields[6]) or 0
+            allowed_ips = _optional(fields[3])
+
+            dump.peers.append(PeerInfo(
+                public_key=fields[0],
+                allowed_ips=allowed_ips.replace(",", ", ") if allowed_ips else "",
+                latest_handshake=format_handshake_age(int(now) - handshake) if handshake else None,
+                endpoint=_optional(fields[2]),
+                transfer=TransferStats(
+                    received=format_transfer_bytes(rx_bytes),
+                    sent=format_transfer_bytes(tx_bytes),
+                    received_bytes=rx_bytes,
+                    sent_bytes=tx_bytes
+                ),
+                latest_handshake_epoch=handshake,
+                persistent_keepalive=_to_int(fields[7])
+            ))
+
+        return dump
@@ -24,7 +24,8 @@ TR: ServiceMonitor Manager - WireGuard servis sağlığını izleme ve durum bil
     Izlenen Parametreler:
         - Servis durumu (aktif/pasif, PID, başlangıç zamanı)
         - Interface durumu (UP/DOWN, port, public key)
-        - Peer istatistikleri (handshake, transfer, allowed IPs)
+        - Peer istatistikleri (handshake, transfer, allowed IPs) - tek bir
+          'wg show <arayüz> dump' çağrısından tipli PeerInfo kayıtları olarak
         - Güvenlik duvarı kuralları (UFW, iptables, NAT)
         - Sistem bilgileri (kernel modülü, açık portlar)
         - Bağlantı kalitesi (son handshake zamanları)
@@ -53,7 +54,8 @@ EN: ServiceMonitor Manager - Monitor WireGuard service health and provide status
     Monitored Parameters:
         - Service status (active/inactive, PID, start time)
         - Interface status (UP/DOWN, port, public key)
-        - Peer statistics (handshake, transfer, allowed IPs)
+        - Peer statistics (handshake, transfer, allowed IPs) - typed PeerInfo
+          records from a single 'wg show <interface> dump' call
         - Firewall rules (UFW, iptables, NAT)
         - System information (kernel module, open ports)
         - Connection quality (recent handshake times)
@@ -70,15 +72,21 @@ Third-party licenses - see THIRD_PARTY_LICENSES file for details
 WireGuard® is a registered trademark of Jason A. Donenfeld.
 """
 
+import time
+from datetime import datetime
 from pathlib import Path
-from typing import Dict, Any
+from typing import Dict, Any, List, Optional, Tuple
 
-from phantom.api.exceptions import ServiceOperationError
+from phantom.api.exceptions import ClientNotFoundError, ServiceOperationError
 from ..models import (
     ServiceHealth, ServiceLogs, RestartResult,
     ServiceStatus, ClientStatistics, ServerConfig, SystemInfo,
-    FirewallConfiguration, InterfaceStatistics
+    FirewallConfiguration, InterfaceStatistics, InterfaceDump, WireGuardClient, StatusSnapshot,
+    TrafficCollectResult, TrafficBucket, ClientUsageResult, TopTalker, TopTalkersResult
 )
+from .peer_state import PeerStateReader, format_transfer_bytes
+from .state_cache import StateCache
+from .traffic_history import TrafficHistory, resolve_period
 
 from .default_constants import (
     DEFAULT_LOG_LINES,
@@ -86,7 +94,8 @@ from .default_constants import (
     DEFAULT_WG_NETWORK,
     DEFAULT_DNS_PRIMARY,
     DEFAULT_DNS_SECONDARY,
-    ACTIVE_CONNECTION_THRESHOLD
+    ACTIVE_CONNECTION_THRESHOLD,
+    DEFAULT_TOP_TALKERS
 )
 
 import re
@@ -113,7 +122,9 @@ class ServiceMonitor:
     """
 
     def __init__(self, data_store, common_tools, config: Dict[str, Any],
-                 run_command, wg_interface: str, wg_config_file: Path, install_dir: Path):
+                 run_command, wg_interface: str, wg_config_file: Path, install_dir: Path,
+                 state_cache: Optional[StateCache] = None,
+                 traffic_history: Optional[TrafficHistory] = None):
         self.data_store = data_store
         self.common_tools = common_tools
         self.config = config
@@ -121,6 +132,11 @@ class ServiceMonitor:
         self.wg_interface = wg_interface
         self.wg_config_file = wg_config_file
         self.install_dir = install_dir
+        self.state_cache = state_cache or StateCache()
+        self.traffic_history = traffic_history
+
+        # (change token, public key -> client name) for status sampling
+        self._peer_names: Optional[Tuple[tuple, Dict[str, str]]] = None
 
     def check_wireguard_health(self) -> ServiceHealth:
         try:
@@ -327,34 +343,51 @@ class ServiceMonitor:
 
     def _get_interface_statistics(self) -> InterfaceStatistics:
         # Check interface existence
-        result = self._run_command(["ip", "link", "show", self.wg_interface])
-        interface_exists = result["success"]
-
-        if not interface_exists:
+        # One 'wg show <interface> dump' call: fails for missing or non-WireGuard interfaces
+        dump = self.read_peer_state()
+        if dump is None:
             return InterfaceStatistics(
                 active=False,
                 interface=self.wg_interface,
                 peers=[]
             )
 
-        # Get interface details
-        result = self._run_command(["wg", "show", self.wg_interface])
-        if not result["success"]:
-            return InterfaceStatistics(
-                active=False,
-                interface=self.wg_interface,
-                peers=[]
-            )
+        rx_bytes, tx_bytes = self._read_interface_counters()
+
+        return InterfaceStatistics(
+            active=True,
+            interface=self.wg_interface,
+            peers=[peer.to_dict() for peer in dump.peers],
+            public_key=dump.public_key,
+            port=dump.listen_port,
+            rx_bytes=rx_bytes,
+            tx_bytes=tx_bytes
+        )
+
+    def read_peer_state(self) -> Optional[InterfaceDump]:
+        """Read interface and peer state from 'wg show <interface> dump'.
+
+        Returns:
+            InterfaceDump with typed PeerInfo records, or None if the
+            interface is missing or not a WireGuard interface
 
-        # Parse wg show output
-        parsed_data = self.common_tools.parse_wg_show_output(result["stdout"])
+        Inside an API request the snapshot is shared through the state cache,
+        so one request runs the dump at most once.
+        """
+        return self.state_cache.get_peer_state(
+            lambda: PeerStateReader(self._run_command, self.wg_interface).read_dump()
+        )
 
-        # Extract interface info
-        public_key = parsed_data["interface"].get("public_key")
-        port = parsed_data["interface"].get("listening_port")
-        peers = parsed_data["peers"]
+    def _read_interface_counters(self) -> Tuple[Optional[int], Optional[int]]:
+        # Kernel counters from sysfs, no subprocess needed
+        statistics_dir = Path("/sys/class/net") / self.wg_interface / "statistics"
+        try:
+            return (int((statistics_dir / "rx_bytes").read_text()),
+                    int((statistics_dir / "tx_bytes").read_text()))
+        except (OSError, ValueError):
+            pass
 
-        # Get interface statistics
+        # Fallback when sysfs is not visible (e.g. commands run in another namespace)
         rx_bytes = None
         tx_bytes = None
         result = self._run_command(["ip", "-s", "link", "show", self.wg_interface])
@@ -377,15 +410,7 @@ class ServiceMonitor:
                         except (ValueError, IndexError):
                             pass
 
-        return InterfaceStatistics(
-            active=True,
-            interface=self.wg_interface,
-            peers=peers,
-            public_key=public_key,
-            port=port,
-            rx_bytes=rx_bytes,
-            tx_bytes=tx_bytes
-        )
+        return rx_bytes, tx_bytes
 
     def retrieve_server_configuration(self) -> Dict[str, Any]:
         server_config: ServerConfig = self._get_server_config_info()
@@ -423,7 +448,7 @@ class ServiceMonitor:
     def _get_client_statistics(self) -> ClientStatistics:
         try:
             # Get all clients
-            all_clients = self.data_store.get_all_clients()
+            all_clients = self.state_cache.get_clients(self.data_store)
 
             # Count client states
             enabled_count = sum(1 for c in all_clients if c.enabled)
@@ -503,6 +528,7 @@ class ServiceMonitor:
 
         # Wait for service initialization
         time.sleep(2)
+        self.state_cache.invalidate_peer_state()
 
     def check_interface_is_active(self) -> bool:
         result = self._run_command(["ip", "link", "show", self.wg_interface])
@@ -619,51 +645,187 @@ class ServiceMonitor:
 
         return total_seconds
 
-    def gather_active_connections(self) -> Dict[str, Any]:
+    def gather_latest_handshakes(self) -> Optional[Dict[str, int]]:
+        """Return the latest handshake of every peer as a Unix timestamp.
+
+        Returns:
+            Map of peer public key to handshake epoch (0 = never), or None
+            if the interface cannot be queried
+        """
+        dump = self.read_peer_state()
+        if dump is None:
+            return None
+        return {peer.public_key: peer.latest_handshake_epoch or 0 for peer in dump.peers}
+
+    def gather_active_connections(self, clients: Optional[List[WireGuardClient]] = None) -> Dict[str, Any]:
+        """Return active peers keyed by client name.
+
+        Args:
+            clients: Restrict the result to these clients (e.g. one listing
+                page). Defaults to all clients; peers that match no client
+                are then reported as "Unknown".
+        """
         active_connections: Dict[str, Any] = {}
 
-        # Get interface statistics
-        interface_stats = self.gather_interface_statistics()
-
-        if interface_stats.get("active") and interface_stats.get("peers"):
-            # Get clients for name mapping
-            all_clients = self.data_store.get_all_clients()
-
-            # Create IP to name mapping
-            ip_to_name = {}
-            for client in all_clients:
-                ip = client.ip
-                if ip:
-                    ip_to_name[f"{ip}/32"] = client.name
-
-            # Process each peer
-            for peer in interface_stats["peers"]:
-                allowed_ips = peer.get("allowed_ips", "")
-                client_name = ip_to_name.get(allowed_ips, "Unknown")
-
-                # Check if handshake is recent
-                latest_handshake = peer.get("latest_handshake", "")
-                if latest_handshake:
-                    if latest_handshake == "Now":
-                        # "Now" kesinlikle aktif demektir
-                        active_connections[client_name] = {
-                            "public_key": peer.get("public_key"),
-                            "allowed_ips": allowed_ips,
-                            "latest_handshake": latest_handshake,
-                            "endpoint": peer.get("endpoint", "N/A"),
-                            "transfer": peer.get("transfer", {})
-                        }
-                    else:
-                        # Parse handshake time
-                        total_seconds = ServiceMonitor.parse_handshake_to_seconds(latest_handshake)
-                        is_recent = total_seconds < ACTIVE_CONNECTION_THRESHOLD
-                        if is_recent:
-                            active_connections[client_name] = {
-                                "public_key": peer.get("public_key"),
-                                "allowed_ips": allowed_ips,
-                                "latest_handshake": latest_handshake,
-                                "endpoint": peer.get("endpoint", "N/A"),
-                                "transfer": peer.get("transfer", {})
-                            }
+        dump = self.read_peer_state()
+        if dump is None or not dump.peers:
+            return active_connections
+
+        # Map peers to client names by public key, falling back to the allowed IP
+        key_to_name = {}
+        ip_to_name = {}
+        subset = clients is not None
+        if not subset:
+            clients = self.state_cache.get_clients(self.data_store)
+        for client in clients:
+            key_to_name[client.public_key] = client.name
+            if client.ip:
+                ip_to_name[f"{client.ip}/32"] = client.name
+
+        for peer in dump.peers:
+            # Handshake recency straight from the epoch, no string parsing
+            handshake = peer.latest_handshake_epoch or 0
+            if not handshake or dump.read_at - handshake >= ACTIVE_CONNECTION_THRESHOLD:
+                continue
+
+            client_name = key_to_name.get(peer.public_key) or ip_to_name.get(peer.allowed_ips)
+            if client_name is None:
+                if subset:
+                    continue
+                client_name = "Unknown"
+            active_connections[client_name] = {
+                "public_key": peer.public_key,
+                "allowed_ips": peer.allowed_ips,
+                "latest_handshake": peer.latest_handshake,
+                "latest_handshake_epoch": handshake,
+                "endpoint": peer.endpoint or "N/A",
+                "transfer": peer.transfer.to_dict() if peer.transfer else {}
+            }
 
         return active_connections
+
+    # Live status sampling
+
+    def _get_peer_names(self) -> Dict[str, str]:
+        """Map public keys to client names, reloading only after a DB change."""
+        token = self.data_store.change_token()
+        if self._peer_names is None or self._peer_names[0] != token:
+            clients = self.data_store.get_all_clients()
+            self._peer_names = (token, {client.public_key: client.name for client in clients})
+        return self._peer_names[1]
+
+    def sample_status(self, include_service: bool = True) -> StatusSnapshot:
+        """Take a cheap status sample for the live status stream.
+
+        Runs one 'wg show <interface> dump' and, if requested, one
+        'systemctl is-active'. Always reads the kernel directly instead of
+        the state cache, since the stream samples more often than its TTL.
+
+        Args:
+            include_service: Also check the wg-quick service state
+
+        Returns:
+            StatusSnapshot with per-peer connection state and raw counters
+        """
+        service_running = None
+        if include_service:
+            result = self._run_command(["systemctl", "is-active", f"wg-quick@{self.wg_interface}"])
+            service_running = result["success"] and result["stdout"].strip() == "active"
+
+        dump = PeerStateReader(self._run_command, self.wg_interface).read_dump()
+        if dump is None:
+            return StatusSnapshot(interface=self.wg_interface, active=False, read_at=time.time(),
+                                  peers={}, service_running=service_running)
+
+        names = self._get_peer_names()
+        peers: Dict[str, Dict[str, Any]] = {}
+        for peer in dump.peers:
+            handshake = peer.latest_handshake_epoch or 0
+            transfer = peer.transfer
+            peers[peer.public_key] = {
+                "client": names.get(peer.public_key),
+                "allowed_ips": peer.allowed_ips,
+                "endpoint": peer.endpoint,
+                "latest_handshake_epoch": handshake,
+                "connected": bool(handshake) and dump.read_at - handshake < ACTIVE_CONNECTION_THRESHOLD,
+                "rx": (transfer.received_bytes or 0) if transfer else 0,
+                "tx": (transfer.sent_bytes or 0) if transfer else 0
+            }
+
+        return StatusSnapshot(interface=self.wg_interface, active=True, read_at=dump.read_at,
+                              peers=peers, port=dump.listen_port, service_running=service_running)
+
+    # Traffic accounting
+
+    def sample_peer_traffic(self) -> TrafficCollectResult:
+        """Store one sample of every peer's raw rx/tx counters.
+
+        Meant to run at the sample interval (phantom-traffic.timer).
+
+        Raises:
+            ServiceOperationError: If the interface state cannot be read
+        """
+        dump = PeerStateReader(self._run_command, self.wg_interface).read_dump()
+        if dump is None:
+            raise ServiceOperationError(f"Cannot read peer counters of {self.wg_interface}")
+
+        counts = self.traffic_history.collect(dump)
+        return TrafficCollectResult(
+            interface=self.wg_interface,
+            timestamp=datetime.fromtimestamp(dump.read_at).isoformat(),
+            **counts
+        )
+
+    def summarize_client_usage(self, client_name: str, period: str = "30d",
+                               bucket: Optional[str] = "day") -> ClientUsageResult:
+        """Traffic of one client over a period, with optional hourly/daily rollups.
+
+        Raises:
+            ClientNotFoundError: If the client does not exist
+            ValidationError: If the period or bucket is unknown
+        """
+        client = self.data_store.find_client_by_name(client_name)
+        if client is None:
+            raise ClientNotFoundError(f"Client '{client_name}' not found")
+
+        until = int(time.time())
+        since = resolve_period(period, until)
+        (rx, tx), buckets = self.traffic_history.usage(client.public_key, since, until, bucket)
+
+        return ClientUsageResult(
+            client_name=client.name,
+            public_key=client.public_key,
+            period=period,
+            since=datetime.fromtimestamp(since).isoformat(),
+            until=datetime.fromtimestamp(until).isoformat(),
+            received_bytes=rx,
+            sent_bytes=tx,
+            received=format_transfer_bytes(rx),
+            sent=format_transfer_bytes(tx),
+            bucket=bucket,
+            buckets=[TrafficBucket(start=datetime.fromtimestamp(start).isoformat(),
+                                   received_bytes=b_rx, sent_bytes=b_tx)
+                     for start, b_rx, b_tx in buckets]
+        )
+
+    def rank_top_talkers(self, period: str = "30d", limit: int = DEFAULT_TOP_TALKERS) -> TopTalkersResult:
+        """Peers ranked by total traffic (received + sent) over a period."""
+        until = int(time.time())
+        since = resolve_period(period, until)
+        totals = self.traffic_history.totals(since, until)
+        key_to_name = {client.public_key: client.name for client in self.state_cache.get_clients(self.data_store)}
+
+        ranked = sorted(totals.items(), key=lambda item: (-(item[1][0] + item[1][1]), item[0]))
+        talkers = [
+            TopTalker(rank=rank, public_key=public_key, received_bytes=rx, sent_bytes=tx,
+                      total=format_transfer_bytes(rx + tx), client_name=key_to_name.get(public_key))
+            for rank, (public_key, (rx, tx)) in enumerate(ranked[:max(limit, 0)], start=1)
+        ]
+
+        return TopTalkersResult(
+            period=period,
+            since=datetime.fromtimestamp(since).isoformat(),
+            until=datetime.fromtimestamp(until).isoformat(),
+            talkers=talkers,
+            peers_tracked=len(totals)
+        )
@@ -0,0 +1,123 @@
+"""
+██████╗ ██╗  ██╗ █████╗ ███╗   ██╗████████╗ ██████╗ ███╗   ███╗
+██╔══██╗██║  ██║██╔══██╗████╗  ██║╚══██╔══╝██╔═══██╗████╗ ████║
+██████╔╝███████║███████║██╔██╗ ██║   ██║   ██║   ██║██╔████╔██║
+██╔═══╝ ██╔══██║██╔══██║██║╚██╗██║   ██║   ██║   ██║██║╚██╔╝██║
+██║     ██║  ██║██║  ██║██║ ╚████║   ██║   ╚██████╔╝██║ ╚═╝ ██║
+╚═╝     ╚═╝  ╚═╝╚═╝  ╚═╝╚═╝  ╚═══╝   ╚═╝    ╚═════╝ ╚═╝     ╚═╝
+
+TR: StateCache - İstek kapsamlı istemci listesi ve kısa ömürlü peer durumu önbelleği
+    ================================================================================
+
+    ClientHandler ve ServiceMonitor aynı StateCache örneğini paylaşır. Böylece
+    tek bir API çağrısı (ör. list_clients veya server_status) kernel'e ve
+    veritabanına en fazla bir kez gider.
+
+    Önbellekler:
+        - İstemci listesi: Yalnızca bir istek kapsamı içinde geçerlidir ve
+          DataStore.change_token() değiştiğinde (yerel veya başka süreçten
+          yazma) yeniden okunur
+        - Peer durumu ('wg show dump'): PEER_STATE_CACHE_TTL saniye boyunca
+          geçerlidir; peer ekleme/kaldırma ve servis yeniden başlatma
+          sonrasında geçersiz kılınır
+
+    İstek kapsamı dışında (doğrudan kütüphane kullanımı, testler) hiçbir şey
+    önbelleğe alınmaz.
+
+EN: StateCache - Request scoped client list and short-TTL peer state cache
+    =====================================================================
+
+    ClientHandler and ServiceMonitor share one StateCache instance, so a
+    single API call (e.g. list_clients or server_status) hits the kernel and
+    the database at most once.
+
+    Caches:
+        - Client list: Only valid inside a request scope and reloaded when
+          DataStore.change_token() changes (local or cross-process writes)
+        - Peer state ('wg show dump'): Valid for PEER_STATE_CACHE_TTL seconds;
+          invalidated after peers are added/removed and after service restarts
+
+    Outside a request scope (direct library use, tests) nothing is cached.
+
+Copyright (c) 2025 Rıza Emre ARAS <r.emrearas@proton.me>
+Licensed under AGPL-3.0 - see LICENSE file for details
+Third-party licenses - see THIRD_PARTY_LICENSES file for details
+WireGuard® is a registered trademark of Jason A. Donenfeld.
+"""
+
+import time
+import threading
+from contextlib import contextmanager
+from typing import Any, Callable, Iterator, List, Optional
+
+from .default_constants import PEER_STATE_CACHE_TTL
+
+_MISSING = object()
+
+
+class StateCache:
+    """Shared cache for client lists and interface snapshots.
+
+    Attributes:
+        peer_state_ttl: Lifetime of a peer state snapshot in seconds
+    """
+
+    def __init__(self, peer_state_ttl: float = PEER_STATE_CACHE_TTL,
+                 clock: Callable[[], float] = time.monotonic):
+        self.peer_state_ttl = peer_state_ttl
+        self._clock = clock
+        self._local = threading.local()
+
+        self._peer_state: Any = _MISSING
+        self._peer_state_at = 0.0
+
+    # Request scope
+
+    @property
+    def in_request(self) -> bool:
+        return getattr(self._local, "depth", 0) > 0
+
+    @contextmanager
+    def request_scope(self) -> Iterator[None]:
+        """Enable caching for the duration of one API request (nestable, per thread)."""
+        depth = getattr(self._local, "depth", 0)
+        if depth == 0:
+            self._local.clients = None
+        self._local.depth = depth + 1
+        try:
+            yield
+        finally:
+            self._local.depth = depth
+            if depth == 0:
+                self._local.clients = None
+
+    # Client list
+
+    def get_clients(self, data_store) -> List[Any]:
+        """Return all clients, loading them at most once per request and DB change."""
+        if not self.in_request:
+            return data_store.get_all_clients()
+
+        token = data_store.change_token()
+        cached = self._local.clients
+        if cached is None or cached[0] != token:
+            cached = (token, data_store.get_all_clients())
+            self._local.clients = cached
+        return list(cached[1])
+
+    # Peer state snapshot
+
+    def get_peer_state(self, loader: Callable[[], Optional[Any]]) -> Optional[Any]:
+        """Return the interface snapshot, reusing it for peer_state_ttl seconds."""
+        if not self.in_request:
+            return loader()
+
+        now = self._clock()
+        if self._peer_state is _MISSING or now - self._peer_state_at >= self.peer_state_ttl:
+            self._peer_state = loader()
+            self._peer_state_at = now
+        return self._peer_state
+
+    def invalidate_peer_state(self) -> None:
+        """Drop the snapshot after the running interface was changed."""
+        self._peer_state = _MISSING
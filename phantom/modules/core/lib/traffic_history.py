@@ -0,0 +1,324 @@
+"""
+██████╗ ██╗  ██╗ █████╗ ███╗   ██╗████████╗ ██████╗ ███╗   ███╗
+██╔══██╗██║  ██║██╔══██╗████╗  ██║╚══██╔══╝██╔═══██╗████╗ ████║
+██████╔╝███████║███████║██╔██╗ ██║   ██║   ██║   ██║██╔████╔██║
+██╔═══╝ ██╔══██║██╔══██║██║╚██╗██║   ██║   ██║   ██║██║╚██╔╝██║
+██║     ██║  ██║██║  ██║██║ ╚████║   ██║   ╚██████╔╝██║ ╚═╝ ██║
+╚═╝     ╚═╝  ╚═╝╚═╝  ╚═╝╚═╝  ╚═══╝   ╚═╝    ╚═════╝ ╚═╝     ╚═╝
+
+TR: TrafficHistory - Peer başına trafik zaman serisi (mmap halka tampon)
+    ===================================================================
+
+    'wg show <arayüz> dump' çıktısındaki ham rx/tx sayaçları sabit aralıkla
+    (varsayılan 5 dakika) örneklenir ve her peer için veri dizinindeki
+    traffic/ altında sabit boyutlu bir ikili halka tampona yazılır. Dosya
+    mmap ile eşlenir; her kayıt 20 bayttır (zaman, toplam rx, toplam tx).
+
+    Kayıtlar ham sayaçları değil, sıfırlamalara karşı düzeltilmiş kümülatif
+    toplamları tutar:
+        - Sayaç bir önceki örnekten küçükse (arayüz yeniden başlatıldı)
+          yeni değerin tamamı o aralığın trafiği kabul edilir
+        - Bir zaman aralığının trafiği iki kümülatif değerin farkıdır; ikili
+          arama ile bulunur, aralık uzunluğundan bağımsız olarak O(log n)
+
+    Sorgular saatlik/günlük (UTC) özetler döndürür. Saklama süresince
+    örneği gelmeyen peer dosyaları toplama sırasında silinir.
+
+EN: TrafficHistory - Per-peer traffic time series (mmap ring buffer)
+    ===============================================================
+
+    Raw rx/tx counters from 'wg show <interface> dump' are sampled at a fixed
+    interval (5 minutes by default) into a fixed-size binary ring buffer per
+    peer under traffic/ in the data directory. The file is memory mapped;
+    every record is 20 bytes (time, total rx, total tx).
+
+    Records hold reset-corrected cumulative totals rather than raw counters:
+        - When a counter is below the previous sample (interface restarted)
+          its whole new value is taken as that interval's traffic
+        - Traffic over a time window is the difference of two cumulative
+          values, found by binary search in O(log n) whatever the window
+
+    Queries return hourly/daily (UTC) rollups. Files of peers that have not
+    been sampled for the retention period are removed while collecting.
+
+Copyright (c) 2025 Rıza Emre ARAS <r.emrearas@proton.me>
+Licensed under AGPL-3.0 - see LICENSE file for details
+Third-party licenses - see THIRD_PARTY_LICENSES file for details
+WireGuard® is a registered trademark of Jason A. Donenfeld.
+"""
+
+import fcntl
+import mmap
+import os
+import struct
+import threading
+from datetime import datetime
+from pathlib import Path
+from typing import Dict, Iterator, List, Optional, Tuple
+
+from phantom.api.exceptions import ValidationError
+from ..models import InterfaceDump
+from .default_constants import (
+    TRAFFIC_SAMPLE_INTERVAL,
+    TRAFFIC_RETENTION_SAMPLES,
+    TRAFFIC_PERIODS,
+    TRAFFIC_BUCKETS,
+    WG_CONFIG_PERMISSIONS
+)
+
+MAGIC = b"PWTR"
+VERSION = 1
+
+# magic, version, reserved, interval, capacity, written, last time, reserved, last raw rx, last raw tx
+HEADER = struct.Struct("<4sHHIIQIIQQ")
+# time, cumulative rx, cumulative tx
+RECORD = struct.Struct("<IQQ")
+
+LOCK_FILENAME = ".lock"
+RING_SUFFIX = ".ring"
+
+Totals = Tuple[int, int]
+
+
+def peer_filename(public_key: str) -> str:
+    """File name of a peer's ring (base64 made path safe)."""
+    return public_key.replace("/", "_").replace("+", "-") + RING_SUFFIX
+
+
+def peer_public_key(filename: str) -> str:
+    return filename[:-len(RING_SUFFIX)].replace("_", "/").replace("-", "+")
+
+
+def resolve_period(period: str, now: float) -> int:
+    """Start (epoch seconds) of a named period ending now."""
+    if period not in TRAFFIC_PERIODS:
+        raise ValidationError(f"Invalid period '{period}'. Use one of: {', '.join(TRAFFIC_PERIODS)}")
+    if period == "month":
+        start = datetime.fromtimestamp(now).replace(day=1, hour=0, minute=0, second=0, microsecond=0)
+        return int(start.timestamp())
+    seconds = TRAFFIC_PERIODS[period]
+    return 0 if seconds is None else int(now) - seconds
+
+
+class TrafficRing:
+    """Fixed-size ring of cumulative counters for one peer, backed by mmap.
+
+    Args:
+        path: Ring file, created with 0600 permissions if missing
+        capacity: Number of records (ignored for existing files)
+        interval: Sample interval in seconds (ignored for existing files)
+    """
+
+    def __init__(self, path: Path, capacity: int = TRAFFIC_RETENTION_SAMPLES,
+                 interval: int = TRAFFIC_SAMPLE_INTERVAL):
+        self.path = path
+        fd = os.open(path, os.O_RDWR | os.O_CREAT, WG_CONFIG_PERMISSIONS)
+        try:
+            if os.fstat(fd).st_size < HEADER.size:
+                # Sparse file: blocks are only allocated as records are written
+                os.ftruncate(fd, HEADER.size + capacity * RECORD.size)
+                os.pwrite(fd, HEADER.pack(MAGIC, VERSION, 0, interval, capacity, 0, 0, 0, 0, 0), 0)
+            self._map = mmap.mmap(fd, 0)
+        finally:
+            os.close(fd)
+
+        magic, version, _, self.interval, self.capacity, *_ = HEADER.unpack_from(self._map, 0)
+        if magic != MAGIC or version != VERSION or len(self._map) < HEADER.size + self.capacity * RECORD.size:
+            self._map.close()
+            raise ValueError(f"Not a traffic ring file: {path}")
+
+    def _header(self):
+        return HEADER.unpack_from(self._map, 0)
+
+    @property
+    def written(self) -> int:
+        return self._header()[5]
+
+    @property
+    def last_time(self) -> int:
+        return self._header()[6]
+
+    def __len__(self) -> int:
+        return min(self.written, self.capacity)
+
+    def _record(self, index: int) -> Tuple[int, int, int]:
+        """Record by chronological index (0 = oldest kept)."""
+        written = self.written
+        first = written - len(self)
+        slot = (first + index) % self.capacity
+        return RECORD.unpack_from(self._map, HEADER.size + slot * RECORD.size)
+
+    def append(self, timestamp: int, rx_bytes: int, tx_bytes: int) -> bool:
+        """Add a sample of the raw kernel counters.
+
+        Returns:
+            True if a counter reset (interface restart) was detected
+        """
+        _, _, _, interval, capacity, written, last_time, _, last_rx, last_tx = self._header()
+        reset = False
+        if written:
+            _, total_rx, total_tx = self._record(len(self) - 1)
+            reset = rx_bytes < last_rx or tx_bytes < last_tx
+            if reset:
+                total_rx, total_tx = total_rx + rx_bytes, total_tx + tx_bytes
+            else:
+                total_rx, total_tx = total_rx + rx_bytes - last_rx, total_tx + tx_bytes - last_tx
+        else:
+            # First sample is the baseline; earlier traffic is unknown
+            total_rx = total_tx = 0
+
+        RECORD.pack_into(self._map, HEADER.size + (written % capacity) * RECORD.size,
+                         timestamp, total_rx, total_tx)
+        self._map[:HEADER.size] = HEADER.pack(MAGIC, VERSION, 0, interval, capacity, written + 1,
+                                              timestamp, 0, rx_bytes, tx_bytes)
+        return reset
+
+    def _cumulative_at(self, timestamp: int) -> Optional[Totals]:
+        """Cumulative totals of the last record at or before timestamp."""
+        low, high = 0, len(self)
+        while low < high:
+            middle = (low + high) // 2
+            if self._record(middle)[0] <= timestamp:
+                low = middle + 1
+            else:
+                high = middle
+        if low == 0:
+            return None
+        return self._record(low - 1)[1:]
+
+    def totals(self, since: int, until: int) -> Totals:
+        """Bytes received and sent by the peer in (since, until]."""
+        if not len(self):
+            return 0, 0
+        end = self._cumulative_at(until)
+        if end is None:
+            return 0, 0
+        # Traffic before the oldest kept record is unknown
+        start = self._cumulative_at(since) or self._record(0)[1:]
+        return end[0] - start[0], end[1] - start[1]
+
+    def rollup(self, since: int, until: int, bucket: int) -> Iterator[Tuple[int, int, int]]:
+        """Yield (bucket start, rx, tx) for aligned buckets covering the window."""
+        start = since - since % bucket
+        while start < until:
+            end = min(start + bucket, until)
+            rx, tx = self.totals(max(start, since), end)
+            yield start, rx, tx
+            start += bucket
+
+    def close(self):
+        self._map.close()
+
+
+class TrafficHistory:
+    """Directory of per-peer traffic rings.
+
+    Args:
+        traffic_dir: Directory holding <public key>.ring files
+        capacity: Records per ring
+        interval: Expected sample interval in seconds
+    """
+
+    def __init__(self, traffic_dir: Path, capacity: int = TRAFFIC_RETENTION_SAMPLES,
+                 interval: int = TRAFFIC_SAMPLE_INTERVAL):
+        self.traffic_dir = traffic_dir
+        self.capacity = capacity
+        self.interval = interval
+        self._rings: Dict[str, TrafficRing] = {}
+        self._lock = threading.Lock()
+
+    @property
+    def retention_seconds(self) -> int:
+        return self.capacity * self.interval
+
+    def _ring(self, public_key: str, create: bool = False) -> Optional[TrafficRing]:
+        ring = self._rings.get(public_key)
+        if ring is not None and ring.path.exists():
+            return ring
+        path = self.traffic_dir / peer_filename(public_key)
+        if not create and not path.exists():
+            return None
+        try:
+            ring = self._rings[public_key] = TrafficRing(path, self.capacity, self.interval)
+        except (OSError, ValueError):
+            return None
+        return ring
+
+    def peers(self) -> List[str]:
+        """Public keys with a ring on disk."""
+        if not self.traffic_dir.is_dir():
+            return []
+        return sorted(peer_public_key(path.name) for path in self.traffic_dir.glob(f"*{RING_SUFFIX}"))
+
+    def collect(self, dump: InterfaceDump) -> Dict[str, int]:
+        """Store one sample of every peer in an interface dump, timed at dump.read_at.
+
+        Peers sampled less than half an interval ago are skipped so extra
+        runs do not eat into the retention window; their traffic is carried
+        into the next sample.
+
+        Returns:
+            Counts: sampled, skipped, resets, created and pruned
+        """
+        now = int(dump.read_at)
+        counts = {"sampled": 0, "skipped": 0, "resets": 0, "created": 0, "pruned": 0}
+
+        self.traffic_dir.mkdir(parents=True, exist_ok=True, mode=0o700)
+        with self._lock, open(self.traffic_dir / LOCK_FILENAME, 'a') as lock:
+            fcntl.flock(lock.fileno(), fcntl.LOCK_EX)
+            for peer in dump.peers:
+                if peer.transfer is None:
+                    continue
+                existed = (self.traffic_dir / peer_filename(peer.public_key)).exists()
+                ring = self._ring(peer.public_key, create=True)
+                if ring is None:
+                    continue
+                if ring.written and now - ring.last_time < ring.interval // 2:
+                    counts["skipped"] += 1
+                    continue
+                if ring.append(now, peer.transfer.received_bytes or 0, peer.transfer.sent_bytes or 0):
+                    counts["resets"] += 1
+                counts["sampled"] += 1
+                counts["created"] += 0 if existed else 1
+
+            live = {peer.public_key for peer in dump.peers}
+            for public_key in self.peers():
+                if public_key in live:
+                    continue
+                ring = self._ring(public_key)
+                if ring is not None and now - ring.last_time > self.retention_seconds:
+                    ring.close()
+                    self._rings.pop(public_key, None)
+                    ring.path.unlink()
+                    counts["pruned"] += 1
+        return counts
+
+    def usage(self, public_key: str, since: int, until: int,
+              bucket: Optional[str] = None) -> Tuple[Totals, List[Tuple[int, int, int]]]:
+        """Totals of one peer in (since, until] and optional rollup buckets.
+
+        Args:
+            public_key: Peer public key
+            since: Window start (epoch seconds)
+            until: Window end (epoch seconds)
+            bucket: Rollup size name ("hour", "day") or None
+
+        Returns:
+            ((rx, tx), [(bucket start, rx, tx), ...])
+        """
+        if bucket is not None and bucket not in TRAFFIC_BUCKETS:
+            raise ValidationError(f"Invalid bucket '{bucket}'. Use one of: {', '.join(TRAFFIC_BUCKETS)}")
+        ring = self._ring(public_key)
+        if ring is None:
+            return (0, 0), []
+        buckets = list(ring.rollup(since, until, TRAFFIC_BUCKETS[bucket])) if bucket else []
+        return ring.totals(since, until), buckets
+
+    def totals(self, since: int, until: int) -> Dict[str, Totals]:
+        """(rx, tx) in (since, until] for every recorded peer."""
+        result = {}
+        for public_key in self.peers():
+            ring = self._ring(public_key)
+            if ring is not None:
+                result[public_key] = ring.totals(since, until)
+        return result
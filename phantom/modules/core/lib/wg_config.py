@@ -0,0 +1,415 @@
+"""
+██████╗ ██╗  ██╗ █████╗ ███╗   ██╗████████╗ ██████╗ ███╗   ███╗
+██╔══██╗██║  ██║██╔══██╗████╗  ██║╚══██╔══╝██╔═══██╗████╗ ████║
+██████╔╝███████║███████║██╔██╗ ██║   ██║   ██║   ██║██╔████╔██║
+██╔═══╝ ██╔══██║██╔══██║██║╚██╗██║   ██║   ██║   ██║██║╚██╔╝██║
+██║     ██║  ██║██║  ██║██║ ╚████║   ██║   ╚██████╔╝██║ ╚═╝ ██║
+╚═╝     ╚═╝  ╚═╝╚═╝  ╚═╝╚═╝  ╚═══╝   ╚═╝    ╚═════╝ ╚═╝     ╚═╝
+
+TR: WireGuardConfig - Sunucu yapılandırma dosyası (wg_main.conf) modeli
+    ===================================================================
+
+    /etc/wireguard/wg_main.conf dosyasını bir kez ayrıştırır ve public key
+    ile IP adresine göre indekslenmiş sıralı bir peer haritası tutar.
+
+    Özellikler:
+        - Peer ekleme, kaldırma ve güncelleme O(1)
+        - Public key veya istemci IP'si ile O(1) peer arama
+        - Yorumlar, boş satırlar ve bilinmeyen anahtarlar aynen korunur;
+          bir başlığın hemen üstündeki yorumlar o bölüme aittir; değişmeyen
+          bölümler bayt bayt aynı yazılır
+        - Atomik yazma: geçici dosya, fsync, chmod 600, rename
+        - WireGuardConfigFile, ayrıştırılmış modeli dosyanın inode, boyut ve
+          zaman damgalarına göre önbelleğe alır; dosya başka bir yerden
+          değiştirilirse yeniden ayrıştırılır
+
+    ClientHandler (istemci ekleme/kaldırma) ve ağ geçişi (subnet değişikliği)
+    aynı WireGuardConfigFile örneğini kullanır.
+
+EN: WireGuardConfig - Server configuration file (wg_main.conf) model
+    ===============================================================
+
+    Parses /etc/wireguard/wg_main.conf once and keeps an ordered peer map
+    indexed by public key and IP address.
+
+    Features:
+        - O(1) peer add, remove and update
+        - O(1) peer lookup by public key or client IP
+        - Comments, blank lines and unknown keys are preserved; comments
+          right above a header belong to that section; untouched sections
+          are written back byte for byte
+        - Atomic writes: temp file, fsync, chmod 600, rename
+        - WireGuardConfigFile caches the parsed model keyed by the file's
+          inode, size and timestamps and re-parses it when the file is
+          changed elsewhere
+
+    ClientHandler (client add/remove) and network migration (subnet change)
+    share the same WireGuardConfigFile instance.
+
+Copyright (c) 2025 Rıza Emre ARAS <r.emrearas@proton.me>
+Licensed under AGPL-3.0 - see LICENSE file for details
+Third-party licenses - see THIRD_PARTY_LICENSES file for details
+WireGuard® is a registered trademark of Jason A. Donenfeld.
+"""
+
+import os
+import re
+import itertools
+import tempfile
+from pathlib import Path
+from typing import Dict, Iterator, List, Optional, Tuple
+
+from .default_constants import WG_CONFIG_PERMISSIONS, DEFAULT_HOST_CIDR
+
+_SECTION_PATTERN = re.compile(r'^\s*\[(\w+)]\s*(?:#\s*(.*?)\s*)?$')
+_KEY_VALUE_PATTERN = re.compile(r'^\s*(\w+)\s*=\s*(.*?)\s*$')
+
+# Keys handled by wg-quick itself; 'wg syncconf' rejects them
+_WG_QUICK_KEYS = {"Address", "DNS", "MTU", "Table", "PreUp", "PostUp", "PreDown", "PostDown", "SaveConfig"}
+
+
+def _strip_comment(value: str) -> str:
+    return value.split("#", 1)[0].strip()
+
+
+def _host_address(cidr: str) -> Optional[str]:
+    """Return the address of a single host entry ("10.8.0.2/32" -> "10.8.0.2")."""
+    address, _, prefix = cidr.partition("/")
+    if not prefix or prefix in ("32", "128"):
+        return address
+    return None
+
+
+class ConfigSection:
+    """One section of the file, with all raw lines up to the next header.
+
+    Attributes:
+        kind: Section name ("Interface", "Peer") or None for the preamble
+        lines: Raw lines including line endings, comments and blank lines
+    """
+
+    __slots__ = ("kind", "lines")
+
+    def __init__(self, kind: Optional[str], lines: List[str]):
+        self.kind = kind
+        self.lines = lines
+
+    def _header_index(self) -> int:
+        """Index of the [Section] line; leading comment lines come before it."""
+        if self.kind is None:
+            return -1
+        for index, line in enumerate(self.lines):
+            if _SECTION_PATTERN.match(line):
+                return index
+        return -1
+
+    @property
+    def comment(self) -> Optional[str]:
+        """Inline header comment, used by Phantom for the client name."""
+        header = self._header_index()
+        if header < 0:
+            return None
+        match = _SECTION_PATTERN.match(self.lines[header])
+        return match.group(2) or None
+
+    def get(self, key: str) -> Optional[str]:
+        for line in self.lines[self._header_index() + 1:]:
+            match = _KEY_VALUE_PATTERN.match(line)
+            if match and match.group(1) == key:
+                return _strip_comment(match.group(2))
+        return None
+
+    def set(self, key: str, value: str) -> None:
+        """Replace the value of key in place, or add it after the last key line."""
+        header = self._header_index()
+        last_key_index = header
+        for index in range(header + 1, len(self.lines)):
+            match = _KEY_VALUE_PATTERN.match(self.lines[index])
+            if not match:
+                continue
+            last_key_index = index
+            if match.group(1) == key:
+                self.lines[index] = f"{key} = {value}\n"
+                return
+        if last_key_index >= 0 and not self.lines[last_key_index].endswith("\n"):
+            self.lines[last_key_index] += "\n"
+        self.lines.insert(last_key_index + 1, f"{key} = {value}\n")
+
+    @property
+    def public_key(self) -> Optional[str]:
+        return self.get("PublicKey")
+
+    @property
+    def allowed_ips(self) -> List[str]:
+        value = self.get("AllowedIPs")
+        return [ip.strip() for ip in value.split(",") if ip.strip()] if value else []
+
+    def render(self) -> str:
+        return "".join(self.lines)
+
+
+class WireGuardConfig:
+    """Parsed wg-quick configuration with an ordered, indexed peer map."""
+
+    def __init__(self):
+        self._ids = itertools.count()
+        # Document order; dict keeps insertion order and gives O(1) removal
+        self._sections: Dict[int, ConfigSection] = {}
+        self._interface_id: Optional[int] = None
+        self._peer_ids: Dict[str, int] = {}
+        self._ip_index: Dict[str, str] = {}
+
+    # Parsing and rendering
+
+    @classmethod
+    def parse(cls, text: str) -> "WireGuardConfig":
+        config = cls()
+        current = ConfigSection(None, [])
+        for line in text.splitlines(keepends=True):
+            match = _SECTION_PATTERN.match(line)
+            if match:
+                leading = cls._split_leading_comments(current.lines)
+                config._append(current)
+                current = ConfigSection(match.group(1), leading + [line])
+            else:
+                current.lines.append(line)
+        config._append(current)
+        return config
+
+    def render(self) -> str:
+        return "".join(section.render() for section in self._sections.values())
+
+    def strip(self, extra_allowed_ips: Optional[Dict[str, List[str]]] = None) -> str:
+        """Render the configuration as 'wg-quick strip' would, for 'wg syncconf'.
+
+        Args:
+            extra_allowed_ips: Additional AllowedIPs per public key, appended
+                               to the peer's own entries (e.g. old addresses
+                               kept during a live subnet migration)
+
+        Returns:
+            str: [Interface] and [Peer] sections with wg(8) keys only
+        """
+        extra_allowed_ips = extra_allowed_ips or {}
+        out: List[str] = []
+        for section in self._sections.values():
+            if section.kind not in ("Interface", "Peer"):
+                continue
+            out.append(f"[{section.kind}]\n")
+            public_key = section.public_key if section.kind == "Peer" else None
+            for line in section.lines[section._header_index() + 1:]:
+                match = _KEY_VALUE_PATTERN.match(line)
+                if not match or match.group(1) in _WG_QUICK_KEYS:
+                    continue
+                key, value = match.group(1), _strip_comment(match.group(2))
+                if key == "AllowedIPs" and public_key in extra_allowed_ips:
+                    value = ", ".join(section.allowed_ips + extra_allowed_ips[public_key])
+                out.append(f"{key} = {value}\n")
+            if public_key in extra_allowed_ips and section.get("AllowedIPs") is None:
+                out.append(f"AllowedIPs = {', '.join(extra_allowed_ips[public_key])}\n")
+            out.append("\n")
+        return "".join(out)
+
+    @staticmethod
+    def _split_leading_comments(lines: List[str]) -> List[str]:
+        """Detach the comment block right above a header so it moves with that section."""
+        end = len(lines)
+        while end > 0 and not lines[end - 1].strip():
+            end -= 1
+        start = end
+        while start > 0 and lines[start - 1].lstrip().startswith("#"):
+            start -= 1
+        if start == end:
+            return []
+        leading = lines[start:]
+        del lines[start:]
+        return leading
+
+    def _append(self, section: ConfigSection) -> None:
+        if section.kind is None and not section.lines:
+            return
+        section_id = next(self._ids)
+        self._sections[section_id] = section
+        if section.kind == "Interface" and self._interface_id is None:
+            self._interface_id = section_id
+        elif section.kind == "Peer":
+            public_key = section.public_key
+            if public_key:
+                self._peer_ids[public_key] = section_id
+                self._index_ips(section, public_key)
+
+    def _index_ips(self, section: ConfigSection, public_key: str) -> None:
+        for cidr in section.allowed_ips:
+            address = _host_address(cidr)
+            if address:
+                self._ip_index[address] = public_key
+
+    def _unindex_ips(self, section: ConfigSection, public_key: str) -> None:
+        for cidr in section.allowed_ips:
+            address = _host_address(cidr)
+            if address and self._ip_index.get(address) == public_key:
+                del self._ip_index[address]
+
+    # Interface
+
+    @property
+    def interface(self) -> Optional[ConfigSection]:
+        return self._sections.get(self._interface_id) if self._interface_id is not None else None
+
+    # Peers
+
+    def __len__(self) -> int:
+        return len(self._peer_ids)
+
+    def __contains__(self, public_key: str) -> bool:
+        return public_key in self._peer_ids
+
+    def peers(self) -> Iterator[ConfigSection]:
+        """Iterate [Peer] sections with a public key, in file order."""
+        for section_id in list(self._peer_ids.values()):
+            yield self._sections[section_id]
+
+    def get_peer(self, public_key: str) -> Optional[ConfigSection]:
+        section_id = self._peer_ids.get(public_key)
+        return self._sections[section_id] if section_id is not None else None
+
+    def find_peer_by_ip(self, ip: str) -> Optional[ConfigSection]:
+        """Find the peer owning a host address ("10.8.0.2" or "10.8.0.2/32")."""
+        address = _host_address(ip)
+        public_key = self._ip_index.get(address) if address else None
+        return self.get_peer(public_key) if public_key else None
+
+    def add_peer(self, public_key: str, preshared_key: Optional[str], allowed_ips: List[str],
+                 name: Optional[str] = None) -> ConfigSection:
+        """Append a [Peer] section in the format Phantom has always written.
+
+        Raises:
+            ValueError: If a peer with this public key already exists
+        """
+        if public_key in self._peer_ids:
+            raise ValueError(f"Peer {public_key} already exists in server configuration")
+
+        tail = next(reversed(self._sections.values()), None)
+        if tail is not None and tail.lines and not tail.lines[-1].endswith("\n"):
+            tail.lines[-1] += "\n"
+
+        lines = ["\n", f"[Peer] # {name}\n" if name else "[Peer]\n", f"PublicKey = {public_key}\n"]
+        if preshared_key:
+            lines.append(f"PresharedKey = {preshared_key}\n")
+        lines.append(f"AllowedIPs = {', '.join(allowed_ips)}\n")
+        lines.append("\n")
+
+        # The leading blank line belongs to the section in front, like in files on disk
+        if tail is not None:
+            tail.lines.append(lines.pop(0))
+        else:
+            lines.pop(0)
+
+        section = ConfigSection("Peer", lines)
+        section_id = next(self._ids)
+        self._sections[section_id] = section
+        self._peer_ids[public_key] = section_id
+        self._index_ips(section, public_key)
+        return section
+
+    def add_client_peer(self, name: str, public_key: str, preshared_key: str, ip: str) -> ConfigSection:
+        return self.add_peer(public_key, preshared_key, [f"{ip}{DEFAULT_HOST_CIDR}"], name=name)
+
+    def remove_peer(self, public_key: str) -> bool:
+        section_id = self._peer_ids.pop(public_key, None)
+        if section_id is None:
+            return False
+        section = self._sections.pop(section_id)
+        self._unindex_ips(section, public_key)
+        return True
+
+    def remove_peer_by_ip(self, ip: str) -> bool:
+        section = self.find_peer_by_ip(ip)
+        return self.remove_peer(section.public_key) if section else False
+
+    def update_peer(self, public_key: str, allowed_ips: Optional[List[str]] = None,
+                    preshared_key: Optional[str] = None) -> bool:
+        """Update values of an existing peer in place, keeping its other lines."""
+        section = self.get_peer(public_key)
+        if section is None:
+            return False
+        if allowed_ips is not None:
+            self._unindex_ips(section, public_key)
+            section.set("AllowedIPs", ", ".join(allowed_ips))
+            self._index_ips(section, public_key)
+        if preshared_key is not None:
+            section.set("PresharedKey", preshared_key)
+        return True
+
+
+class WireGuardConfigFile:
+    """Cached, atomically written WireGuardConfig backed by a file.
+
+    Attributes:
+        path: Configuration file path
+    """
+
+    def __init__(self, path: Path):
+        self.path = Path(path)
+        self._config: Optional[WireGuardConfig] = None
+        self._signature: Optional[Tuple[int, int, int, int]] = None
+
+    def _stat_signature(self) -> Optional[Tuple[int, int, int, int]]:
+        try:
+            st = os.stat(self.path)
+        except FileNotFoundError:
+            return None
+        return st.st_ino, st.st_size, st.st_mtime_ns, st.st_ctime_ns
+
+    def exists(self) -> bool:
+        return self.path.exists()
+
+    def load(self) -> WireGuardConfig:
+        """Return the parsed configuration, re-parsing only if the file changed.
+
+        A missing file yields an empty configuration. Changes made to the
+        returned object are kept until save() or invalidate().
+        """
+        signature = self._stat_signature()
+        if self._config is None or signature != self._signature:
+            text = self.path.read_text() if signature is not None else ""
+            self._config = WireGuardConfig.parse(text)
+            self._signature = signature
+        return self._config
+
+    def read_text(self) -> Optional[str]:
+        try:
+            return self.path.read_text()
+        except FileNotFoundError:
+            return None
+
+    def save(self, config: Optional[WireGuardConfig] = None) -> None:
+        """Write the configuration atomically and keep it as the cached model."""
+        config = config or self.load()
+        self.write_text(config.render())
+        self._config = config
+        self._signature = self._stat_signature()
+
+    def write_text(self, content: str) -> None:
+        """Replace the file atomically (temp file, fsync, chmod 600, rename)."""
+        fd, tmp_name = tempfile.mkstemp(prefix=f".{self.path.name}.", dir=str(self.path.parent))
+        try:
+            with os.fdopen(fd, 'w') as f:
+                f.write(content)
+                f.flush()
+                os.fsync(f.fileno())
+            os.chmod(tmp_name, WG_CONFIG_PERMISSIONS)
+            os.replace(tmp_name, self.path)
+        except BaseException:
+            try:
+                os.unlink(tmp_name)
+            except FileNotFoundError:
+                pass
+            self.invalidate()
+            raise
+        self.invalidate()
+
+    def invalidate(self) -> None:
+        """Forget the cached model (e.g. after an aborted change)."""
+        self._config = None
+        self._signature = None
@@ -0,0 +1,213 @@
+"""
+██████╗ ██╗  ██╗ █████╗ ███╗   ██╗████████╗ ██████╗ ███╗   ███╗
+██╔══██╗██║  ██║██╔══██╗████╗  ██║╚══██╔══╝██╔═══██╗████╗ ████║
+██████╔╝███████║███████║██╔██╗ ██║   ██║   ██║   ██║██╔████╔██║
+██╔═══╝ ██╔══██║██╔══██║██║╚██╗██║   ██║   ██║   ██║██║╚██╔╝██║
+██║     ██║  ██║██║  ██║██║ ╚████║   ██║   ╚██████╔╝██║ ╚═╝ ██║
+╚═╝     ╚═╝  ╚═╝╚═╝  ╚═╝╚═╝  ╚═══╝   ╚═╝    ╚═════╝ ╚═╝     ╚═╝
+
+TR: WireGuard Netlink - wg çalıştırmadan süreç içi handshake okuma
+    ==============================================================
+
+    Kernel WireGuard arayüzlerini generic netlink üzerinden, wireguard-go
+    arayüzlerini UAPI soketi üzerinden sorgular. Sık örnekleme yapan
+    servisler (multihop monitörü) her kontrolde 'wg' süreci başlatmaz.
+
+    Yalnızca standart kütüphane (socket, struct) kullanılır. Sorgu
+    yapılamazsa OSError fırlatılır; çağıran 'wg show' ile devam eder
+    (bkz. PeerStateReader.latest_handshakes).
+
+EN: WireGuard Netlink - In-process handshake reads without running wg
+    ==================================================================
+
+    Queries kernel WireGuard interfaces over generic netlink and
+    wireguard-go interfaces over their UAPI socket, so services that sample
+    often (the multihop monitor) do not fork 'wg' on every check.
+
+    Only the standard library (socket, struct) is used. When a query is not
+    possible OSError is raised and the caller continues with 'wg show'
+    (see PeerStateReader.latest_handshakes).
+
+Copyright (c) 2025 Rıza Emre ARAS <r.emrearas@proton.me>
+Licensed under AGPL-3.0 - see LICENSE file for details
+Third-party licenses - see THIRD_PARTY_LICENSES file for details
+WireGuard® is a registered trademark of Jason A. Donenfeld.
+"""
+
+import errno
+import itertools
+import os
+import socket
+import struct
+from pathlib import Path
+from typing import Iterator, List, Tuple
+
+# Generic netlink / WireGuard netlink API (linux/netlink.h, linux/genetlink.h, linux/wireguard.h)
+NETLINK_GENERIC = 16
+NLMSG_HEADER = struct.Struct("=IHHII")
+GENL_HEADER = struct.Struct("=BBH")
+NLA_HEADER = struct.Struct("=HH")
+NLA_TYPE_MASK = 0x3FFF
+NLM_F_REQUEST = 0x1
+NLM_F_MULTI = 0x2
+NLM_F_DUMP = 0x300
+NLMSG_ERROR = 0x2
+NLMSG_DONE = 0x3
+GENL_ID_CTRL = 0x10
+CTRL_CMD_GETFAMILY = 3
+CTRL_ATTR_FAMILY_ID = 1
+CTRL_ATTR_FAMILY_NAME = 2
+WG_GENL_NAME = b"wireguard"
+WG_GENL_VERSION = 1
+WG_CMD_GET_DEVICE = 0
+WGDEVICE_A_IFNAME = 2
+WGDEVICE_A_PEERS = 8
+WGPEER_A_LAST_HANDSHAKE_TIME = 6
+
+# wireguard-go UAPI socket directory
+WG_UAPI_DIR = Path("/var/run/wireguard")
+
+SOCKET_TIMEOUT = 2
+
+
+def nla_align(length: int) -> int:
+    return (length + 3) & ~3
+
+
+def pack_nla(attr_type: int, value: bytes) -> bytes:
+    """Encode one netlink attribute, padded to 4 bytes."""
+    length = NLA_HEADER.size + len(value)
+    return NLA_HEADER.pack(length, attr_type) + value + b"\0" * (nla_align(length) - length)
+
+
+def parse_nla(data: bytes) -> Iterator[Tuple[int, bytes]]:
+    """Yield (type, value) for each attribute; stops at a malformed header."""
+    offset = 0
+    while offset + NLA_HEADER.size <= len(data):
+        length, attr_type = NLA_HEADER.unpack_from(data, offset)
+        if length < NLA_HEADER.size or offset + length > len(data):
+            break
+        yield attr_type & NLA_TYPE_MASK, data[offset + NLA_HEADER.size:offset + length]
+        offset += nla_align(length)
+
+
+def parse_messages(data: bytes, sequence: int) -> Tuple[List[bytes], bool]:
+    """Split one netlink receive buffer into generic netlink payloads.
+
+    Args:
+        data: Bytes returned by one recv()
+        sequence: Sequence number of the request; other messages are skipped
+
+    Returns:
+        (attribute payloads, True when the reply is complete)
+
+    Raises:
+        OSError: If the kernel answered with an error
+    """
+    payloads = []
+    offset = 0
+    while offset + NLMSG_HEADER.size <= len(data):
+        length, msg_type, msg_flags, msg_sequence, _ = NLMSG_HEADER.unpack_from(data, offset)
+        if length < NLMSG_HEADER.size:
+            return payloads, True
+        payload = data[offset + NLMSG_HEADER.size:offset + length]
+        offset += nla_align(length)
+        if msg_sequence != sequence:
+            continue
+        if msg_type == NLMSG_DONE:
+            return payloads, True
+        if msg_type == NLMSG_ERROR:
+            code = struct.unpack_from("=i", payload)[0]
+            if code:
+                raise OSError(-code, os.strerror(-code))
+            return payloads, True
+        payloads.append(payload[GENL_HEADER.size:])
+        if not msg_flags & NLM_F_MULTI:
+            return payloads, True
+    return payloads, False
+
+
+def parse_device_handshakes(payloads: List[bytes]) -> List[int]:
+    """Collect WGPEER_A_LAST_HANDSHAKE_TIME seconds from WG_CMD_GET_DEVICE replies."""
+    handshakes = []
+    for payload in payloads:
+        for attr_type, value in parse_nla(payload):
+            if attr_type != WGDEVICE_A_PEERS:
+                continue
+            for _, peer in parse_nla(value):
+                for peer_attr, peer_value in parse_nla(peer):
+                    if peer_attr == WGPEER_A_LAST_HANDSHAKE_TIME:
+                        handshakes.append(struct.unpack_from("=q", peer_value)[0])
+    return handshakes
+
+
+def parse_uapi_handshakes(text: str) -> List[int]:
+    """Collect last_handshake_time_sec values from a UAPI 'get=1' answer."""
+    return [int(line.split("=", 1)[1]) for line in text.splitlines()
+            if line.startswith("last_handshake_time_sec=")]
+
+
+class WireGuardNetlink:
+    """Generic netlink client for the WireGuard family; the family id is resolved once."""
+
+    def __init__(self):
+        self._family_id = None
+        self._sequence = itertools.count(1)
+
+    def _request(self, sock: socket.socket, family: int, command: int, flags: int,
+                 attributes: bytes) -> List[bytes]:
+        sequence = next(self._sequence)
+        body = GENL_HEADER.pack(command, WG_GENL_VERSION, 0) + attributes
+        sock.send(NLMSG_HEADER.pack(NLMSG_HEADER.size + len(body), family, flags, sequence, 0) + body)
+
+        payloads = []
+        done = False
+        while not done:
+            received, done = parse_messages(sock.recv(65536), sequence)
+            payloads.extend(received)
+        return payloads
+
+    def _resolve_family(self, sock: socket.socket) -> int:
+        if self._family_id is None:
+            replies = self._request(sock, GENL_ID_CTRL, CTRL_CMD_GETFAMILY, NLM_F_REQUEST,
+                                    pack_nla(CTRL_ATTR_FAMILY_NAME, WG_GENL_NAME + b"\0"))
+            for payload in replies:
+                for attr_type, value in parse_nla(payload):
+                    if attr_type == CTRL_ATTR_FAMILY_ID:
+                        self._family_id = struct.unpack_from("=H", value)[0]
+            if self._family_id is None:
+                raise OSError(errno.ENOENT, "wireguard netlink family not found")
+        return self._family_id
+
+    def latest_handshakes(self, interface: str) -> List[int]:
+        """Return one epoch per peer (0 = never) of a kernel interface.
+
+        Raises:
+            OSError: If netlink is unavailable or the interface is unknown
+        """
+        with socket.socket(socket.AF_NETLINK, socket.SOCK_RAW, NETLINK_GENERIC) as sock:
+            sock.settimeout(SOCKET_TIMEOUT)
+            family = self._resolve_family(sock)
+            replies = self._request(sock, family, WG_CMD_GET_DEVICE, NLM_F_REQUEST | NLM_F_DUMP,
+                                    pack_nla(WGDEVICE_A_IFNAME, interface.encode() + b"\0"))
+        return parse_device_handshakes(replies)
+
+
+def read_uapi_handshakes(interface: str, uapi_dir: Path = WG_UAPI_DIR) -> List[int]:
+    """Return one epoch per peer of a wireguard-go interface.
+
+    Raises:
+        OSError: If the interface has no UAPI socket or it cannot be read
+    """
+    uapi_socket = uapi_dir / f"{interface}.sock"
+    with socket.socket(socket.AF_UNIX, socket.SOCK_STREAM) as sock:
+        sock.settimeout(SOCKET_TIMEOUT)
+        sock.connect(str(uapi_socket))
+        sock.sendall(b"get=1\n\n")
+        data = b""
+        while not data.endswith(b"\n\n"):
+            chunk = sock.recv(4096)
+            if not chunk:
+                break
+            data += chunk
+    return parse_uapi_handshakes(data.decode())
@@ -22,7 +22,13 @@ from .client_models import (
     ClientExportResult,
     LatestClientsResult,
     ClientInfo,
-    PaginationInfo
+    PaginationInfo,
+    BulkClientEntry,
+    BulkClientAddResult,
+    BulkClientRemoveResult,
+    BulkClientExportResult,
+    PruneCandidate,
+    ClientPruneResult
 )
 
 from .service_models import (
@@ -34,17 +40,25 @@ from .service_models import (
     ServiceLogs,
     RestartResult,
     FirewallConfiguration,
-    InterfaceStatistics
+    InterfaceStatistics,
+    StatusSnapshot,
+    TrafficCollectResult,
+    TrafficBucket,
+    ClientUsageResult,
+    TopTalker,
+    TopTalkersResult
 )
 
 from .network_models import (
     TransferStats,
     PeerInfo,
+    InterfaceDump,
     NetworkInfo,
     SubnetChangeValidation,
     NetworkAnalysis,
     NetworkValidationResult,
     NetworkMigrationResult,
+    SubnetCleanupResult,
     MainInterfaceInfo
 )
 
@@ -55,7 +69,9 @@ from .config_models import (
 
 from .storage_models import (
     ClientDatastoreInfo,
-    ActiveConnectionsMap
+    ActiveConnectionsMap,
+    BackupListResult,
+    BackupRestoreResult
 )
 
 from .util_models import (
@@ -70,16 +86,18 @@ from phantom.models.base import BaseModel
 __all__ = [
     'WireGuardClient', 'ClientAddResult', 'ClientRemoveResult',
     'ClientListResult', 'ClientExportResult', 'LatestClientsResult',
-    'ClientInfo', 'PaginationInfo',
+    'ClientInfo', 'PaginationInfo', 'BulkClientEntry', 'BulkClientAddResult',
+    'BulkClientRemoveResult', 'BulkClientExportResult', 'PruneCandidate', 'ClientPruneResult',
     'ServiceStatus', 'ClientStatistics', 'ServerConfig', 'SystemInfo',
     'ServiceHealth', 'ServiceLogs', 'RestartResult',
-    'FirewallConfiguration', 'InterfaceStatistics',
-    'TransferStats', 'PeerInfo', 'NetworkInfo',
+    'FirewallConfiguration', 'InterfaceStatistics', 'StatusSnapshot',
+    'TrafficCollectResult', 'TrafficBucket', 'ClientUsageResult', 'TopTalker', 'TopTalkersResult',
+    'TransferStats', 'PeerInfo', 'InterfaceDump', 'NetworkInfo',
     'SubnetChangeValidation',
     'NetworkAnalysis', 'NetworkValidationResult',
-    'NetworkMigrationResult', 'MainInterfaceInfo',
+    'NetworkMigrationResult', 'SubnetCleanupResult', 'MainInterfaceInfo',
     'TweakSettingsResponse', 'TweakModificationResult',
-    'ClientDatastoreInfo', 'ActiveConnectionsMap',
+    'ClientDatastoreInfo', 'ActiveConnectionsMap', 'BackupListResult', 'BackupRestoreResult',
     'SuccessResponse', 'ErrorResponse', 'TransferData', 'WireGuardShowData',
     'BaseModel'
 ]
@@ -121,12 +121,14 @@ class ClientListResult(BaseModel):
     clients: List[ClientInfo]
     total: int
     pagination: PaginationInfo
+    next_cursor: Optional[str] = None
 
     def to_dict(self) -> Dict[str, Any]:
         return {
             "clients": [c.to_dict() for c in self.clients],
             "total": self.total,
-            "pagination": self.pagination.to_dict()
+            "pagination": self.pagination.to_dict(),
+            "next_cursor": self.next_cursor
         }
 
 
@@ -176,3 +178,125 @@ class LatestClientsResult(BaseModel):
             "count": self.count,
             "total_clients": self.total_clients
         }
+
+
+@dataclass
+class BulkClientEntry(BaseModel):
+    name: str
+    success: bool
+    ip: Optional[str] = None
+    public_key: Optional[str] = None
+    error: Optional[str] = None
+
+    def to_dict(self) -> Dict[str, Any]:
+        result = {
+            "name": self.name,
+            "success": self.success
+        }
+        if self.success:
+            result["ip"] = self.ip  # type: ignore
+            result["public_key"] = self.public_key  # type: ignore
+        else:
+            result["error"] = self.error  # type: ignore
+        return result
+
+
+@dataclass
+class BulkClientAddResult(BaseModel):
+    results: List[BulkClientEntry]
+    added: int
+    failed: int
+    apply_method: str
+    message: str
+
+    def to_dict(self) -> Dict[str, Any]:
+        return {
+            "results": [r.to_dict() for r in self.results],
+            "added": self.added,
+            "failed": self.failed,
+            "apply_method": self.apply_method,
+            "message": self.message
+        }
+
+
+@dataclass
+class BulkClientRemoveResult(BaseModel):
+    results: List[BulkClientEntry]
+    removed: int
+    failed: int
+    apply_method: str
+    message: str
+
+    def to_dict(self) -> Dict[str, Any]:
+        return {
+            "results": [r.to_dict() for r in self.results],
+            "removed": self.removed,
+            "failed": self.failed,
+            "apply_method": self.apply_method,
+            "message": self.message
+        }
+
+
+@dataclass
+class BulkClientExportResult(BaseModel):
+    results: List[BulkClientEntry]
+    archive: Optional[str]
+    format: str
+    exported: int
+    failed: int
+    rendered: int
+    cache_hits: int
+    qr_included: bool
+    size_bytes: int
+    message: str
+
+    def to_dict(self) -> Dict[str, Any]:
+        return {
+            "results": [r.to_dict() for r in self.results],
+            "archive": self.archive,
+            "format": self.format,
+            "exported": self.exported,
+            "failed": self.failed,
+            "rendered": self.rendered,
+            "cache_hits": self.cache_hits,
+            "qr_included": self.qr_included,
+            "size_bytes": self.size_bytes,
+            "message": self.message
+        }
+
+
+@dataclass
+class PruneCandidate(BaseModel):
+    name: str
+    ip: str
+    created: str
+    last_handshake: Optional[str] = None
+
+    def to_dict(self) -> Dict[str, Any]:
+        return {
+            "name": self.name,
+            "ip": self.ip,
+            "created": self.created,
+            "last_handshake": self.last_handshake
+        }
+
+
+@dataclass
+class ClientPruneResult(BaseModel):
+    inactive_days: int
+    cutoff: str
+    candidates: List[PruneCandidate]
+    dry_run: bool
+    removal: Optional[BulkClientRemoveResult] = None
+
+    def to_dict(self) -> Dict[str, Any]:
+        result = {
+            "inactive_days": self.inactive_days,
+            "cutoff": self.cutoff,
+            "candidates": [c.to_dict() for c in self.candidates],
+            "count": len(self.candidates),
+            "dry_run": self.dry_run
+        }
+        if self.removal:
+            result["removal"] = self.removal.to_dict()  # type: ignore
+        return result
@@ -23,12 +23,19 @@ from phantom.models.base import BaseModel
 class TransferStats(BaseModel):
     received: str  # e.g., "1.5 GiB"
     sent: str  # e.g., "2.3 GiB"
+    received_bytes: Optional[int] = None  # Raw kernel counter
+    sent_bytes: Optional[int] = None
 
     def to_dict(self) -> Dict[str, Any]:
-        return {
+        result: Dict[str, Any] = {
             "received": self.received,
             "sent": self.sent
         }
+        if self.received_bytes is not None:
+            result["received_bytes"] = self.received_bytes
+        if self.sent_bytes is not None:
+            result["sent_bytes"] = self.sent_bytes
+        return result
 
 
 @dataclass
@@ -38,6 +45,8 @@ class PeerInfo(BaseModel):
     latest_handshake: Optional[str] = None
     endpoint: Optional[str] = None
     transfer: Optional[TransferStats] = None
+    latest_handshake_epoch: Optional[int] = None  # Unix time, 0 = never
+    persistent_keepalive: Optional[int] = None
 
     def to_dict(self) -> Dict[str, Any]:
         result: Dict[str, Any] = {
@@ -46,10 +55,14 @@ class PeerInfo(BaseModel):
         }
         if self.latest_handshake:
             result["latest_handshake"] = self.latest_handshake
+        if self.latest_handshake_epoch is not None:
+            result["latest_handshake_epoch"] = self.latest_handshake_epoch
         if self.endpoint:
             result["endpoint"] = self.endpoint
         if self.transfer:
             result["transfer"] = self.transfer.to_dict()
+        if self.persistent_keepalive:
+            result["persistent_keepalive"] = self.persistent_keepalive
         return result
 
     @classmethod
@@ -59,10 +72,32 @@ class PeerInfo(BaseModel):
             allowed_ips=data["allowed_ips"],
             latest_handshake=data.get("latest_handshake"),
             endpoint=data.get("endpoint"),
-            transfer=TransferStats(**data["transfer"]) if "transfer" in data else None
+            transfer=TransferStats(**data["transfer"]) if "transfer" in data else None,
+            latest_handshake_epoch=data.get("latest_handshake_epoch"),
+            persistent_keepalive=data.get("persistent_keepalive")
         )
 
 
+@dataclass
+class InterfaceDump(BaseModel):
+    interface: str
+    public_key: Optional[str]
+    listen_port: Optional[int]
+    fwmark: Optional[int]
+    peers: List[PeerInfo]
+    read_at: float  # Unix time the dump was taken
+
+    def to_dict(self) -> Dict[str, Any]:
+        return {
+            "interface": self.interface,
+            "public_key": self.public_key,
+            "listen_port": self.listen_port,
+            "fwmark": self.fwmark,
+            "peers": [p.to_dict() for p in self.peers],
+            "read_at": self.read_at
+        }
+
+
 @dataclass
 class NetworkInfo(BaseModel):
     subnet: str
@@ -136,7 +171,7 @@ class NetworkValidationResult(BaseModel):
     checks: Dict[str, Any]
     warnings: List[str]
     errors: List[str]
-    ip_mapping_preview: Optional[Dict[str, str]] = None
+    ip_mapping_preview: Optional[Dict[str, Any]] = None
 
     def to_dict(self) -> Dict[str, Any]:
         result: Dict[str, Any] = {
@@ -160,9 +195,14 @@ class NetworkMigrationResult(BaseModel):
     clients_updated: int
     backup_id: str
     ip_mapping: Dict[str, str]
+    mode: str = "restart"
+    strategy: str = "compact"
+    phase_timings: Dict[str, float] = field(default_factory=dict)
+    cleanup_scheduled: bool = False
+    cleanup_at: Optional[str] = None
 
     def to_dict(self) -> Dict[str, Any]:
-        return {
+        result = {
             "success": self.success,
             "old_subnet": self.old_subnet,
             "new_subnet": self.new_subnet,
@@ -170,6 +210,30 @@ class NetworkMigrationResult(BaseModel):
             "backup_id": self.backup_id,
             "ip_mapping": self.ip_mapping
         }
+        if self.phase_timings:
+            result["mode"] = self.mode
+            result["strategy"] = self.strategy
+            result["phase_timings"] = self.phase_timings
+        if self.mode == "live":
+            result["cleanup_scheduled"] = self.cleanup_scheduled
+            result["cleanup_at"] = self.cleanup_at
+        return result
+
+
+@dataclass
+class SubnetCleanupResult(BaseModel):
+    finalized: bool
+    old_subnet: Optional[str]
+    new_subnet: Optional[str]
+    phase_timings: Dict[str, float] = field(default_factory=dict)
+
+    def to_dict(self) -> Dict[str, Any]:
+        return {
+            "finalized": self.finalized,
+            "old_subnet": self.old_subnet,
+            "new_subnet": self.new_subnet,
+            "phase_timings": self.phase_timings
+        }
 
 
 @dataclass
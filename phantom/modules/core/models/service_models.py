@@ -13,7 +13,7 @@ Licensed under AGPL-3.0 - see LICENSE file for details
 Third-party licenses - see THIRD_PARTY_LICENSES file for details
 WireGuard® is a registered trademark of Jason A. Donenfeld.
 """
-from dataclasses import dataclass
+from dataclasses import dataclass, field
 from typing import Dict, Any, List, Optional
 
 from phantom.models.base import BaseModel
@@ -137,6 +137,29 @@ class InterfaceStatistics(BaseModel):
         return result
 
 
+@dataclass
+class StatusSnapshot(BaseModel):
+    interface: str
+    active: bool
+    read_at: float
+    peers: Dict[str, Dict[str, Any]]
+    port: Optional[int] = None
+    service_running: Optional[bool] = None
+
+    def to_dict(self) -> Dict[str, Any]:
+        return {
+            "interface": {
+                "name": self.interface,
+                "active": self.active,
+                "port": self.port
+            },
+            # None when the service state was not checked in this sample
+            "service": None if self.service_running is None else {"running": self.service_running},
+            "peers": self.peers,
+            "read_at": self.read_at
+        }
+
+
 @dataclass
 class ServiceLogs(BaseModel):
     logs: List[str]
@@ -197,3 +220,113 @@ class ServiceHealth(BaseModel):
             "configuration": self.configuration.to_dict(),
             "system": self.system.to_dict()
         }
+
+
+@dataclass
+class TrafficCollectResult(BaseModel):
+    interface: str
+    timestamp: str
+    sampled: int
+    skipped: int
+    resets: int
+    created: int
+    pruned: int
+
+    def to_dict(self) -> Dict[str, Any]:
+        return {
+            "interface": self.interface,
+            "timestamp": self.timestamp,
+            "sampled": self.sampled,
+            "skipped": self.skipped,
+            "resets": self.resets,
+            "created": self.created,
+            "pruned": self.pruned
+        }
+
+
+@dataclass
+class TrafficBucket(BaseModel):
+    start: str
+    received_bytes: int
+    sent_bytes: int
+
+    def to_dict(self) -> Dict[str, Any]:
+        return {
+            "start": self.start,
+            "received_bytes": self.received_bytes,
+            "sent_bytes": self.sent_bytes,
+            "total_bytes": self.received_bytes + self.sent_bytes
+        }
+
+
+@dataclass
+class ClientUsageResult(BaseModel):
+    client_name: str
+    public_key: str
+    period: str
+    since: str
+    until: str
+    received_bytes: int
+    sent_bytes: int
+    received: str  # e.g., "1.50 GiB"
+    sent: str
+    bucket: Optional[str] = None
+    buckets: List[TrafficBucket] = field(default_factory=list)
+
+    def to_dict(self) -> Dict[str, Any]:
+        result: Dict[str, Any] = {
+            "client_name": self.client_name,
+            "public_key": self.public_key,
+            "period": self.period,
+            "since": self.since,
+            "until": self.until,
+            "received_bytes": self.received_bytes,
+            "sent_bytes": self.sent_bytes,
+            "total_bytes": self.received_bytes + self.sent_bytes,
+            "received": self.received,
+            "sent": self.sent
+        }
+        if self.bucket:
+            result["bucket"] = self.bucket
+            result["buckets"] = [b.to_dict() for b in self.buckets]
+        return result
+
+
+@dataclass
+class TopTalker(BaseModel):
+    rank: int
+    public_key: str
+    received_bytes: int
+    sent_bytes: int
+    total: str  # e.g., "210.04 GiB"
+    client_name: Optional[str] = None  # None once the client was removed
+
+    def to_dict(self) -> Dict[str, Any]:
+        return {
+            "rank": self.rank,
+            "client_name": self.client_name,
+            "public_key": self.public_key,
+            "received_bytes": self.received_bytes,
+            "sent_bytes": self.sent_bytes,
+            "total_bytes": self.received_bytes + self.sent_bytes,
+            "total": self.total
+        }
+
+
+@dataclass
+class TopTalkersResult(BaseModel):
+    period: str
+    since: str
+    until: str
+    talkers: List[TopTalker]
+    peers_tracked: int
+
+    def to_dict(self) -> Dict[str, Any]:
+        return {
+            "period": self.period,
+            "since": self.since,
+            "until": self.until,
+            "talkers": [t.to_dict() for t in self.talkers],
+            "count": len(self.talkers),
+            "peers_tracked": self.peers_tracked
+        }
@@ -13,8 +13,8 @@ Licensed under AGPL-3.0 - see LICENSE file for details
 Third-party licenses - see THIRD_PARTY_LICENSES file for details
 WireGuard® is a registered trademark of Jason A. Donenfeld.
 """
-from dataclasses import dataclass
-from typing import Dict, Any
+from dataclasses import dataclass, field
+from typing import Dict, Any, List, Optional
 
 from phantom.models.base import BaseModel
 
@@ -39,3 +39,39 @@ class ActiveConnectionsMap(BaseModel):
 
     def to_dict(self) -> Dict[str, Any]:
         return self.connections
+
+
+@dataclass
+class BackupListResult(BaseModel):
+    backups: List[Dict[str, Any]]
+    total: int
+    stored_bytes: int
+    logical_bytes: int
+
+    def to_dict(self) -> Dict[str, Any]:
+        return {
+            "backups": self.backups,
+            "total": self.total,
+            "stored_bytes": self.stored_bytes,
+            "logical_bytes": self.logical_bytes
+        }
+
+
+@dataclass
+class BackupRestoreResult(BaseModel):
+    backup_id: str
+    label: str
+    restored_files: List[str]
+    safety_backup_id: Optional[str]
+    warnings: List[str] = field(default_factory=list)
+
+    def to_dict(self) -> Dict[str, Any]:
+        result: Dict[str, Any] = {
+            "backup_id": self.backup_id,
+            "label": self.label,
+            "restored_files": self.restored_files,
+            "safety_backup_id": self.safety_backup_id
+        }
+        if self.warnings:
+            result["warnings"] = self.warnings
+        return result
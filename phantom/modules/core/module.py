@@ -12,11 +12,12 @@ TR: Phantom-WG Core Modülü
     WireGuard VPN yönetiminin ana orkestrasyon katmanı. Bu modül, 7 işlevsel
     olarak özelleşmiş yönetici kullanarak tüm temel işlevleri koordine eder.
     
-    API Endpoint'leri (14 adet):
-        1. İstemci Yönetimi: add_client, remove_client, list_clients, export_client, latest_clients
-        2. Servis Yönetimi: server_status, service_logs, restart_service, get_firewall_status
+    API Endpoint'leri (25 adet):
+        1. İstemci Yönetimi: add_client, add_clients, remove_client, remove_clients, prune_clients, list_clients, export_client, export_clients, latest_clients
+        2. Servis Yönetimi: server_status, status_snapshot, service_logs, restart_service, get_firewall_status, collect_traffic, client_usage, top_talkers
         3. Yapılandırma: get_tweak_settings, update_tweak_setting
-        4. Ağ Yönetimi: get_subnet_info, validate_subnet_change, change_subnet
+        4. Ağ Yönetimi: get_subnet_info, validate_subnet_change, change_subnet, finalize_subnet_change
+        5. Yedekler: list_backups, restore_backup
 
 EN: Phantom-WG Core Module
     ==========================================
@@ -24,11 +25,12 @@ EN: Phantom-WG Core Module
     Main orchestration layer for WireGuard VPN management. This module coordinates
     all core functionality using 7 functionally specialized managers.
     
-    API Endpoints (14 total):
-        1. Client Management: add_client, remove_client, list_clients, export_client, latest_clients
-        2. Service Management: server_status, service_logs, restart_service, get_firewall_status
+    API Endpoints (25 total):
+        1. Client Management: add_client, add_clients, remove_client, remove_clients, prune_clients, list_clients, export_client, export_clients, latest_clients
+        2. Service Management: server_status, status_snapshot, service_logs, restart_service, get_firewall_status, collect_traffic, client_usage, top_talkers
         3. Configuration: get_tweak_settings, update_tweak_setting
-        4. Network Management: get_subnet_info, validate_subnet_change, change_subnet
+        4. Network Management: get_subnet_info, validate_subnet_change, change_subnet, finalize_subnet_change
+        5. Backups: list_backups, restore_backup
 
 Copyright (c) 2025 Rıza Emre ARAS <r.emrearas@proton.me>
 Licensed under AGPL-3.0 - see LICENSE file for details
@@ -36,23 +38,37 @@ Third-party licenses - see THIRD_PARTY_LICENSES file for details
 WireGuard® is a registered trademark of Jason A. Donenfeld.
 """
 
+import copy
+from functools import cached_property
 from pathlib import Path
-from typing import Dict, Any, Optional, Callable
+from typing import Dict, Any, List, Optional, Callable
 
+from phantom.api import APIResponse
 from phantom.modules.base import BaseModule
 
 from .models import (
     ClientAddResult,
+    BulkClientAddResult,
+    BulkClientRemoveResult,
+    BulkClientExportResult,
+    ClientPruneResult,
     ClientRemoveResult,
     ClientListResult,
     ClientExportResult,
     LatestClientsResult,
-    ServiceHealth
+    ServiceHealth,
+    StatusSnapshot
 )
 
-from .lib import DataStore, KeyGenerator, CommonTools
+from .lib import DataStore, KeyGenerator, CommonTools, StateCache, WireGuardConfigFile
 from .lib.default_constants import (
-    DEFAULT_WG_NETWORK
+    DEFAULT_WG_NETWORK,
+    DEFAULT_MIGRATION_GRACE_PERIOD,
+    DEFAULT_IP_REMAP_STRATEGY,
+    DEFAULT_TOP_TALKERS,
+    KEY_BACKEND_NATIVE,
+    KEY_BACKEND_WG,
+    TRAFFIC_DIR
 )
 
 class CoreModule(BaseModule):
@@ -63,10 +79,12 @@ class CoreModule(BaseModule):
     and uses self-explanatory method names.
 
     Manager Responsibilities:
-        - DataStore: TinyDB operations and IP allocation
+        - DataStore: SQLite client store and IP allocation
         - KeyGenerator: WireGuard key generation
         - CommonTools: Validation and common utilities
         - ClientHandler: Client lifecycle management
+        - ConfigCache: Rendered client configuration cache
+        - TrafficHistory: Per-peer traffic ring buffers
         - ServiceMonitor: systemd service health monitoring
         - ConfigKeeper: Configuration persistence
         - NetworkAdmin: Subnet and network operations
@@ -92,27 +110,70 @@ class CoreModule(BaseModule):
         else:
             self.wg_config_file = Path(f"/etc/wireguard/{self.wg_interface}.conf")
 
-        subnet = self.config.get("wireguard", {}).get("network", DEFAULT_WG_NETWORK)
-        self.store_data = DataStore(
-            db_path=self.data_dir / "clients.db",
-            data_dir=self.data_dir,
-            subnet=subnet
-        )
-
         self.db_path = self.data_dir / "clients.db"
-        self.db = self.store_data.db
-        self.clients_table = self.store_data.clients_table
-        self.ip_table = self.store_data.ip_table
-        self.data_store = self.store_data
 
-        self.generate_keys = KeyGenerator(run_command=self._run_command)
+        # Backend is applied from the configuration by _config_changed()
+        self.generate_keys = KeyGenerator(run_command=self._run_command, backend=KEY_BACKEND_NATIVE)
         self.key_generator = self.generate_keys
 
         self.common_utilities = CommonTools(config=self.config, run_command=self._run_command)
         self.common_tools = self.common_utilities
 
+        # Shared by client handler and service monitor: one kernel/DB read per request
+        self.state_cache = StateCache()
+
+        # Parsed wg_main.conf shared by client operations and subnet migration
+        self.wg_config = WireGuardConfigFile(self.wg_config_file)
+
+        # The database and the managers below are built on first access, so
+        # actions that need none of them (e.g. get_tweak_settings) skip their setup
+
+        # Load tweak settings
+        self._config_changed()
+
+    def _key_backend(self) -> str:
+        """Return the configured key backend, falling back to native for unknown values."""
+        backend = self.config.get("wireguard", {}).get("key_backend", KEY_BACKEND_NATIVE)
+        if backend not in (KEY_BACKEND_WG, KEY_BACKEND_NATIVE):
+            self.logger.warning(f"Unknown wireguard.key_backend '{backend}', using '{KEY_BACKEND_NATIVE}'")
+            return KEY_BACKEND_NATIVE
+        return backend
+
+    def _config_changed(self) -> None:
+        """Re-derive runtime settings after phantom.json changed.
+
+        Managers share self.config and read it per call; only the values
+        copied out of it (tweaks, key backend, allocator subnet) are refreshed here.
+        """
+        tweaks = self.config.get("tweaks", {})
+        self.restart_service_after_client_creation = tweaks.get(
+            "restart_service_after_client_creation", False
+        )
+        self.generate_keys.backend = self._key_backend()
+
+        # The allocator of an already opened store follows a subnet changed elsewhere
+        if "store_data" in self.__dict__:
+            subnet = self.config.get("wireguard", {}).get("network", DEFAULT_WG_NETWORK)
+            if subnet != self.store_data.subnet:
+                self.store_data.update_network_configuration(subnet)
+
+    @cached_property
+    def store_data(self) -> DataStore:
+        subnet = self.config.get("wireguard", {}).get("network", DEFAULT_WG_NETWORK)
+        return DataStore(db_path=self.db_path, data_dir=self.data_dir, subnet=subnet)
+
+    @property
+    def data_store(self) -> DataStore:
+        return self.store_data
+
+    @property
+    def db(self):
+        return self.store_data.db
+
+    @cached_property
+    def manage_clients(self):
         from .lib import ClientHandler
-        self.manage_clients = ClientHandler(
+        handler = ClientHandler(
             data_store=self.store_data,
             key_generator=self.generate_keys,
             common_tools=self.common_utilities,
@@ -120,35 +181,75 @@ class CoreModule(BaseModule):
             run_command=self._run_command,
             wg_interface=self.wg_interface,
             wg_config_file=self.wg_config_file,
-            install_dir=self.install_dir
+            install_dir=self.install_dir,
+            state_cache=self.state_cache,
+            wg_config=self.wg_config
         )
-        self.manage_clients.core_module = self
-        self.client_handler = self.manage_clients
+        handler.core_module = self
+        return handler
 
-        from .lib import ServiceMonitor
-        self.monitor_service = ServiceMonitor(
+    @property
+    def client_handler(self):
+        return self.manage_clients
+
+    @cached_property
+    def monitor_service(self):
+        from .lib import ServiceMonitor, TrafficHistory
+        return ServiceMonitor(
             data_store=self.store_data,
             common_tools=self.common_utilities,
             config=self.config,
             run_command=self._run_command,
             wg_interface=self.wg_interface,
             wg_config_file=self.wg_config_file,
+            install_dir=self.install_dir,
+            state_cache=self.state_cache,
+            traffic_history=TrafficHistory(self.data_dir / TRAFFIC_DIR)
+        )
+
+    @property
+    def service_monitor(self):
+        return self.monitor_service
+
+    def create_status_sampler(self):
+        """Build a ServiceMonitor for status sampling on another thread.
+
+        It reads clients.db through a read-only connection of its own, so
+        samples never share the request-path connection or managers. The
+        caller owns the returned monitor and closes its data store.
+        """
+        from .lib import ServiceMonitor
+        # Creates the database and schema if this is the first access
+        _ = self.store_data
+        return ServiceMonitor(
+            data_store=DataStore(db_path=self.db_path, data_dir=self.data_dir, read_only=True),
+            common_tools=self.common_utilities,
+            config=copy.deepcopy(self.config),
+            run_command=self._run_command,
+            wg_interface=self.wg_interface,
+            wg_config_file=self.wg_config_file,
             install_dir=self.install_dir
         )
-        self.service_monitor = self.monitor_service
 
+    @cached_property
+    def keep_config(self):
         from .lib import ConfigKeeper
-        self.keep_config = ConfigKeeper(
+        return ConfigKeeper(
             config_dir=self.config_dir,
             logger=self.logger,
             load_config_func=self._load_config,
             save_config_func=self._save_config,
             runtime_updater=self._update_runtime_tweak
         )
-        self.config_keeper = self.keep_config
 
+    @property
+    def config_keeper(self):
+        return self.keep_config
+
+    @cached_property
+    def administer_network(self):
         from .lib import NetworkAdmin
-        self.administer_network = NetworkAdmin(
+        return NetworkAdmin(
             data_store=self.store_data,
             common_tools=self.common_utilities,
             service_monitor=self.monitor_service,
@@ -157,15 +258,13 @@ class CoreModule(BaseModule):
             run_command=self._run_command,
             wg_interface=self.wg_interface,
             wg_config_file=self.wg_config_file,
-            install_dir=self.install_dir
+            install_dir=self.install_dir,
+            wg_config=self.wg_config
         )
-        self.network_admin = self.administer_network
 
-        # Load tweak settings
-        tweaks = self.config.get("tweaks", {})
-        self.restart_service_after_client_creation = tweaks.get(
-            "restart_service_after_client_creation", False
-        )
+    @property
+    def network_admin(self):
+        return self.administer_network
 
     def _update_runtime_tweak(self, setting_name: str, value: bool) -> None:
         """Update runtime tweak values - callback from ConfigKeeper.
@@ -182,6 +281,15 @@ class CoreModule(BaseModule):
             self.restart_service_after_client_creation = value
             self.logger.debug(f"Runtime tweak updated: {setting_name} = {value}")
 
+    def execute_action(self, action: str, **kwargs) -> APIResponse:
+        """Execute an action inside a state cache request scope.
+
+        Client list and peer state reads made while the action runs are
+        shared, so a single API call reads the database and the kernel once.
+        """
+        with self.state_cache.request_scope():
+            return super().execute_action(action, **kwargs)
+
     def get_module_name(self) -> str:
         """Return module name."""
         return "core"
@@ -198,6 +306,7 @@ class CoreModule(BaseModule):
             - Service Management: status, logs, restart, firewall
             - Configuration: tweak settings
             - Network Administration: subnet operations
+            - Backups: list and restore snapshots
 
         Returns:
             Dict[str, Callable]: Map of action names to their handler methods
@@ -205,16 +314,24 @@ class CoreModule(BaseModule):
         return {
             # Client Management Actions
             "add_client": self.add_client,
+            "add_clients": self.add_clients,
             "remove_client": self.remove_client,
+            "remove_clients": self.remove_clients,
+            "prune_clients": self.prune_clients,
             "list_clients": self.list_clients,
             "export_client": self.export_client,
+            "export_clients": self.export_clients,
             "latest_clients": self.latest_clients,
 
             # Service Management Actions
             "server_status": self.server_status,
+            "status_snapshot": self.status_snapshot,
             "service_logs": self.service_logs,
             "restart_service": self.restart_service,
             "get_firewall_status": self.get_firewall_status,
+            "collect_traffic": self.collect_traffic,
+            "client_usage": self.client_usage,
+            "top_talkers": self.top_talkers,
 
             # Configuration Management Actions
             "get_tweak_settings": self.get_tweak_settings,
@@ -223,7 +340,12 @@ class CoreModule(BaseModule):
             # Network Administration Actions
             "get_subnet_info": self.get_subnet_info,
             "validate_subnet_change": self.validate_subnet_change,
-            "change_subnet": self.change_subnet
+            "change_subnet": self.change_subnet,
+            "finalize_subnet_change": self.finalize_subnet_change,
+
+            # Backup Actions
+            "list_backups": self.list_backups,
+            "restore_backup": self.restore_backup
         }
 
     def add_client(self, client_name: str) -> Dict[str, Any]:
@@ -249,11 +371,32 @@ class CoreModule(BaseModule):
         result: ClientAddResult = self.manage_clients.add_new_client(client_name)
         return result.to_dict()
 
+    def add_clients(self, names: List[str]) -> Dict[str, Any]:
+        """Add many WireGuard clients in one operation.
+
+        Keys are generated for every valid name, IPs are allocated and all
+        clients are stored in a single database transaction. The server
+        configuration is rewritten once and all peers are applied to
+        WireGuard with one command (or one restart, based on tweaks).
+
+        Args:
+            names: List of client names (a comma separated string is also accepted)
+
+        Returns:
+            Dict containing:
+            - results: Per-client entries (name, success, ip/public_key or error)
+            - added: Number of clients added
+            - failed: Number of names that were rejected
+            - apply_method: dynamic, restart or none
+        """
+        result: BulkClientAddResult = self.manage_clients.add_new_clients(names)
+        return result.to_dict()
+
     def remove_client(self, client_name: str) -> Dict[str, Any]:
         """Remove a WireGuard client and clean up all configurations.
 
         This action will:
-            1. Remove client from TinyDB database
+            1. Remove client from client database
             2. Remove peer from server configuration
             3. Delete client configuration files
             4. Free up the IP address for reuse
@@ -276,29 +419,75 @@ class CoreModule(BaseModule):
         result: ClientRemoveResult = self.manage_clients.remove_existing_client(client_name)
         return result.to_dict()
 
-    def list_clients(self, page: int = 1, per_page: int = 10, search: str = None) -> Dict[str, Any]:
+    def remove_clients(self, names: List[str]) -> Dict[str, Any]:
+        """Remove many WireGuard clients in one operation.
+
+        All clients are deleted in a single database transaction, the server
+        configuration is parsed and rewritten once and the peers are removed
+        from WireGuard with one command (or one restart, based on tweaks).
+
+        Args:
+            names: List of client names (a comma separated string is also accepted)
+
+        Returns:
+            Dict containing:
+            - results: Per-client entries (name, success, ip/public_key or error)
+            - removed: Number of clients removed
+            - failed: Number of names that were not found
+            - apply_method: dynamic, restart or none
+        """
+        result: BulkClientRemoveResult = self.manage_clients.remove_existing_clients(names)
+        return result.to_dict()
+
+    def prune_clients(self, inactive_days: int, confirm: bool = False) -> Dict[str, Any]:
+        """Remove clients that had no handshake in the last N days.
+
+        Handshakes are read once from the running interface. Clients created
+        inside the window are kept even if they never connected. Without
+        confirm=true the matching clients are only listed.
+
+        Args:
+            inactive_days: Inactivity window in days
+            confirm: Must be True to remove the matching clients
+
+        Returns:
+            Dict containing:
+            - candidates: Inactive clients (name, ip, created, last_handshake)
+            - count: Number of candidates
+            - dry_run: True if nothing was removed
+            - removal: Bulk removal report when confirmed
+        """
+        result: ClientPruneResult = self.manage_clients.prune_inactive_clients(inactive_days, confirm=confirm)
+        return result.to_dict()
+
+    def list_clients(self, page: int = 1, per_page: int = 10, search: str = None,
+                     cursor: str = None) -> Dict[str, Any]:
         """List all configured WireGuard clients with pagination and search.
 
         Shows connection status based on recent handshakes.
         Active = handshake within last 3 minutes.
 
         Returns ClientListResult through ClientHandler and converts
-        to dict via to_dict(). Client data retrieved from DataStore
-        and enriched with wg show command.
+        to dict via to_dict(). Only the requested page is read from
+        DataStore and enriched with wg show data.
 
         Args:
             page: Page number (default: 1)
             per_page: Items per page (default: 10)
-            search: Optional search term for filtering by name
+            search: Optional case-insensitive client name prefix
+            cursor: Optional next_cursor of a previous call (page is ignored)
 
         Returns:
             Dict containing:
             - clients: List of client objects with status
-            - total: Total number of clients
+            - total: Total number of matching clients
             - pagination: Page info (current, total, has_next, has_prev)
+            - next_cursor: Cursor for the following page, None on the last page
         """
         # ClientHandler queries DataStore and enriches with connection status
-        result: ClientListResult = self.manage_clients.list_all_clients(page=page, per_page=per_page, search=search)
+        result: ClientListResult = self.manage_clients.list_all_clients(
+            page=page, per_page=per_page, search=search, cursor=cursor
+        )
         return result.to_dict()
 
     def export_client(self, client_name: str) -> Dict[str, Any]:
@@ -319,6 +508,33 @@ class CoreModule(BaseModule):
         result: ClientExportResult = self.manage_clients.export_client_configuration(client_name)
         return result.to_dict()
 
+    def export_clients(self, names: Optional[List[str]] = None, format: str = "tar",
+                       output: Optional[str] = None, include_qr: bool = False) -> Dict[str, Any]:
+        """Export many client configurations into one archive.
+
+        Configurations are served from the rendered config cache, only
+        clients whose record or global settings changed are rendered again.
+        The archive is written with 0600 permissions.
+
+        Args:
+            names: Client names (list or comma separated string), all clients if omitted
+            format: Archive format, "tar" (tar.gz) or "zip"
+            output: Archive path (default: data/exports/phantom-clients-<timestamp>)
+            include_qr: Add an SVG QR code per client
+
+        Returns:
+            Dict containing:
+            - results: Per-client entries (name, success, ip/public_key or error)
+            - archive: Path of the written archive
+            - exported / failed: Counts
+            - rendered / cache_hits: Cache usage for this export
+            - size_bytes: Archive size
+        """
+        result: BulkClientExportResult = self.manage_clients.export_client_configurations(
+            names, archive_format=format, output=output, include_qr=include_qr
+        )
+        return result.to_dict()
+
     def server_status(self) -> Dict[str, Any]:
         """Get comprehensive WireGuard server status and health information.
 
@@ -340,6 +556,27 @@ class CoreModule(BaseModule):
         health: ServiceHealth = self.monitor_service.check_wireguard_health()
         return health.to_dict()
 
+    def status_snapshot(self, include_service: bool = True) -> Dict[str, Any]:
+        """Get a lightweight status sample for live dashboards.
+
+        Unlike server_status this only reads 'wg show <interface> dump' and,
+        optionally, the wg-quick service state. It is the sample source of
+        the API daemon's status stream, which turns consecutive samples
+        into deltas for subscribers.
+
+        Args:
+            include_service: Also check the service state (default: True)
+
+        Returns:
+            Dict containing:
+            - interface: name, active and listen port
+            - service: {"running": bool}, or None if not checked
+            - peers: Public key -> client, endpoint, connected, rx and tx
+            - read_at: Unix timestamp of the sample
+        """
+        snapshot: StatusSnapshot = self.monitor_service.sample_status(include_service=include_service)
+        return snapshot.to_dict()
+
     def service_logs(self, lines: int = 50) -> Dict[str, Any]:
         """Get WireGuard service logs.
 
@@ -401,6 +638,44 @@ class CoreModule(BaseModule):
         # ServiceMonitor examines UFW rules and WireGuard port status
         return self.monitor_service.check_firewall_configuration()
 
+    def collect_traffic(self) -> Dict[str, Any]:
+        """Sample per-peer traffic counters into the history store.
+
+        Reads raw rx/tx counters from 'wg show <interface> dump' and appends
+        one record per peer to its ring buffer under data/traffic. Run by
+        phantom-traffic.timer every 5 minutes; counter resets caused by an
+        interface restart are detected and corrected.
+
+        Returns:
+            Dict containing sampled, skipped, resets, created and pruned counts
+        """
+        return self.monitor_service.sample_peer_traffic().to_dict()
+
+    def client_usage(self, client_name: str, period: str = "30d", bucket: Optional[str] = "day") -> Dict[str, Any]:
+        """Get traffic used by a client over a period.
+
+        Args:
+            client_name: Client to report
+            period: "24h", "7d", "30d", "month" (since the 1st) or "all"
+            bucket: Rollup size, "hour" or "day" (UTC aligned), None for totals only
+
+        Returns:
+            Dict containing received/sent totals and per-bucket rollups
+        """
+        return self.monitor_service.summarize_client_usage(client_name, period=period, bucket=bucket).to_dict()
+
+    def top_talkers(self, period: str = "30d", limit: int = DEFAULT_TOP_TALKERS) -> Dict[str, Any]:
+        """Get the clients that used the most traffic over a period.
+
+        Args:
+            period: "24h", "7d", "30d", "month" (since the 1st) or "all"
+            limit: Number of entries to return (default: 10)
+
+        Returns:
+            Dict containing ranked talkers with received/sent/total bytes
+        """
+        return self.monitor_service.rank_top_talkers(period=period, limit=int(limit)).to_dict()
+
     def get_tweak_settings(self) -> Dict[str, Any]:
         """Get current tweak settings.
 
@@ -445,37 +720,93 @@ class CoreModule(BaseModule):
         # NetworkAdmin examines subnet usage and change feasibility
         return self.administer_network.analyze_current_network()
 
-    def validate_subnet_change(self, new_subnet: str) -> Dict[str, Any]:
+    def validate_subnet_change(self, new_subnet: str, strategy: str = DEFAULT_IP_REMAP_STRATEGY) -> Dict[str, Any]:
         """Validate if subnet change is possible and safe.
 
         Checks safety and compatibility of proposed change through NetworkAdmin.
         Validates RFC 1918 compliance, minimum /29 subnet,
         20% growth capacity and SSH access protection.
+        The IP mapping preview lists the first clients and summarizes the rest.
         Returns NetworkValidationResult model.
 
         Args:
             new_subnet: New subnet in CIDR notation (e.g., "10.9.0.0/24")
+            strategy: "compact" (renumber from .2) or "preserve" (keep host offsets)
 
         Returns:
             Dict containing validation results and warnings
         """
         # NetworkAdmin checks safety and compatibility of proposed change
-        return self.administer_network.validate_network_modification(new_subnet)
+        return self.administer_network.validate_network_modification(new_subnet, strategy)
 
-    def change_subnet(self, new_subnet: str, confirm: bool = False) -> Dict[str, Any]:
+    def change_subnet(self, new_subnet: str, confirm: bool = False, mode: str = "restart",
+                      grace_period: int = DEFAULT_MIGRATION_GRACE_PERIOD,
+                      strategy: str = DEFAULT_IP_REMAP_STRATEGY) -> Dict[str, Any]:
         """Change the VPN subnet.
 
         Performs complete subnet migration through NetworkAdmin.
         Ensures safe migration with backup and rollback support.
         Performs IP remapping, firewall update and service restart.
+        With mode="live" the service keeps running: the new server address
+        is added next to the old one, peers are re-addressed with a single
+        'wg syncconf' and the old subnet is removed after grace_period.
         Returns NetworkMigrationResult model.
 
         Args:
             new_subnet: New subnet in CIDR notation
             confirm: Must be True to proceed with the change
+            mode: "restart" (default) or "live"
+            grace_period: Seconds the old subnet stays served in live mode (0 removes it at once)
+            strategy: "compact" (renumber from .2) or "preserve" (keep host offsets)
 
         Returns:
-            Dict containing change results
+            Dict containing change results and per-phase timings
         """
         # NetworkAdmin performs complete subnet change with backup/rollback
-        return self.administer_network.execute_network_migration(new_subnet, force=confirm)
+        return self.administer_network.execute_network_migration(new_subnet, force=confirm, mode=mode,
+                                                                 grace_period=grace_period, strategy=strategy)
+
+    def finalize_subnet_change(self) -> Dict[str, Any]:
+        """Remove the old subnet left by a live subnet change.
+
+        Called by the transient timer scheduled by change_subnet(mode="live")
+        and safe to call by hand; does nothing if no live change is pending.
+        Returns SubnetCleanupResult model.
+
+        Returns:
+            Dict containing cleanup status and per-phase timings
+        """
+        return self.administer_network.finalize_network_migration()
+
+    def list_backups(self, label: Optional[str] = None) -> Dict[str, Any]:
+        """List backups of the shared snapshot store.
+
+        Backups are taken before subnet changes and before Ghost Mode and
+        multihop state changes. Unchanged files and unchanged chunks are
+        stored once, so stored_bytes is usually far below logical_bytes.
+        Returns BackupListResult model.
+
+        Args:
+            label: Only backups with this label (e.g. "subnet_change", "ghost_enable")
+
+        Returns:
+            Dict containing backups (newest first) and store usage
+        """
+        return self.administer_network.list_backups(label)
+
+    def restore_backup(self, backup_id: str, confirm: bool = False) -> Dict[str, Any]:
+        """Restore a backup taken by any module.
+
+        The current state is saved as a "pre_restore" backup first. The
+        WireGuard service is restarted if the backup contains its
+        configuration or the client database.
+        Returns BackupRestoreResult model.
+
+        Args:
+            backup_id: Backup id from list_backups
+            confirm: Must be True to proceed with the restore
+
+        Returns:
+            Dict containing restored files and the safety backup id
+        """
+        return self.administer_network.restore_backup(backup_id, force=confirm)
@@ -0,0 +1,75 @@
+"""
+██████╗ ██╗  ██╗ █████╗ ███╗   ██╗████████╗ ██████╗ ███╗   ███╗
+██╔══██╗██║  ██║██╔══██╗████╗  ██║╚══██╔══╝██╔═══██╗████╗ ████║
+██████╔╝███████║███████║██╔██╗ ██║   ██║   ██║   ██║██╔████╔██║
+██╔═══╝ ██╔══██║██╔══██║██║╚██╗██║   ██║   ██║   ██║██║╚██╔╝██║
+██║     ██║  ██║██║  ██║██║ ╚████║   ██║   ╚██████╔╝██║ ╚═╝ ██║
+╚═╝     ╚═╝  ╚═╝╚═╝  ╚═╝╚═╝  ╚═══╝   ╚═╝    ╚═════╝ ╚═╝     ╚═╝
+
+KeyGenerator Benchmark - client key sets (private + public + preshared) per second
+
+Usage:
+    python -m phantom.modules.core.tests.benchmarks.bench_key_generator [--count N]
+
+The wg backend is only measured when the wg binary is available.
+
+Copyright (c) 2025 Rıza Emre ARAS <r.emrearas@proton.me>
+Licensed under AGPL-3.0 - see LICENSE file for details
+Third-party licenses - see THIRD_PARTY_LICENSES file for details
+WireGuard® is a registered trademark of Jason A. Donenfeld.
+"""
+
+import argparse
+import shutil
+import subprocess
+import time
+
+from phantom.models.base import CommandResult
+from phantom.modules.core.lib.key_generator import KeyGenerator
+from phantom.modules.core.lib.default_constants import KEY_BACKEND_NATIVE, KEY_BACKEND_WG
+
+
+def _run_command(cmd, **kwargs):
+    kwargs.setdefault("capture_output", True)
+    kwargs.setdefault("text", True)
+    result = subprocess.run(cmd, **kwargs)
+    return CommandResult(
+        success=result.returncode == 0,
+        stdout=result.stdout,
+        stderr=result.stderr,
+        returncode=result.returncode
+    )
+
+
+def measure(backend: str, count: int) -> float:
+    generator = KeyGenerator(_run_command, backend=backend)
+    start = time.perf_counter()
+    for _ in range(count):
+        private_key = generator.create_private_key()
+        generator.derive_public_key(private_key)
+        generator.create_preshared_key()
+    elapsed = time.perf_counter() - start
+    return count / elapsed if elapsed else float("inf")
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark WireGuard key generation backends")
+    parser.add_argument("--count", type=int, default=200, help="Key sets per backend")
+    args = parser.parse_args()
+
+    has_wg = shutil.which("wg") is not None
+    provider = KeyGenerator(_run_command, backend=KEY_BACKEND_NATIVE).public_key_provider
+    native_rate = measure(KEY_BACKEND_NATIVE, args.count)
+    print(f"native: {native_rate:10.1f} key sets/s (public keys: {provider})")
+
+    if has_wg:
+        wg_rate = measure(KEY_BACKEND_WG, args.count)
+        print(f"wg:     {wg_rate:10.1f} key sets/s")
+        if native_rate:
+            print(f"speedup: {native_rate / wg_rate:.1f}x")
+    else:
+        print("wg:     skipped (wg binary not found)")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,256 @@
+"""
+██████╗ ██╗  ██╗ █████╗ ███╗   ██╗████████╗ ██████╗ ███╗   ███╗
+██╔══██╗██║  ██║██╔══██╗████╗  ██║╚══██╔══╝██╔═══██╗████╗ ████║
+██████╔╝███████║███████║██╔██╗ ██║   ██║   ██║   ██║██╔████╔██║
+██╔═══╝ ██╔══██║██╔══██║██║╚██╗██║   ██║   ██║   ██║██║╚██╔╝██║
+██║     ██║  ██║██║  ██║██║ ╚████║   ██║   ╚██████╔╝██║ ╚═╝ ██║
+╚═╝     ╚═╝  ╚═╝╚═╝  ╚═╝╚═╝  ╚═══╝   ╚═╝    ╚═════╝ ╚═╝     ╚═╝
+
+Client Handler Bulk Operation Integration Tests
+
+Copyright (c) 2025 Rıza Emre ARAS <r.emrearas@proton.me>
+Licensed under AGPL-3.0 - see LICENSE file for details
+Third-party licenses - see THIRD_PARTY_LICENSES file for details
+WireGuard® is a registered trademark of Jason A. Donenfeld.
+"""
+
+import itertools
+from datetime import datetime, timedelta
+from unittest.mock import Mock, patch
+
+import pytest
+
+from phantom.api.exceptions import ServiceOperationError, InvalidClientNameError, InvalidParameterError
+from phantom.models.base import CommandResult
+from phantom.modules.core.lib import DataStore, CommonTools, ClientHandler
+from phantom.modules.core.models import BulkClientAddResult, BulkClientRemoveResult, ClientPruneResult
+
+SERVER_CONFIG = "[Interface]\nPrivateKey = server\nAddress = 10.8.0.1/24\nListenPort = 51820\n"
+
+
+def _key_generator():
+    counter = itertools.count()
+    generator = Mock()
+    generator.create_private_key.side_effect = lambda: f"priv{next(counter):040d}="
+    generator.derive_public_key.side_effect = lambda private_key: private_key.replace("priv", "pub_")
+    generator.create_preshared_key.side_effect = lambda: f"psk_{next(counter):039d}="
+    return generator
+
+
+@pytest.fixture
+def environment(tmp_path):
+    wg_config_file = tmp_path / "wg_main.conf"
+    wg_config_file.write_text(SERVER_CONFIG)
+    config = {"wireguard": {"network": "10.8.0.0/29"}, "tweaks": {}}
+
+    run_command = Mock(return_value=CommandResult(success=True, returncode=0))
+    data_store = DataStore(db_path=tmp_path / "clients.db", data_dir=tmp_path, subnet="10.8.0.0/29")
+    handler = ClientHandler(
+        data_store=data_store,
+        key_generator=_key_generator(),
+        common_tools=CommonTools(config=config, run_command=run_command),
+        config=config,
+        run_command=run_command,
+        wg_interface="wg_main",
+        wg_config_file=wg_config_file,
+        install_dir=tmp_path
+    )
+    yield handler, run_command, wg_config_file
+    data_store.close()
+
+
+class TestAddNewClients:
+
+    @pytest.mark.integration
+    def test_batch_is_applied_once(self, environment):
+        """Test that a batch costs one config write and one wg invocation."""
+        handler, run_command, wg_config_file = environment
+
+        result = handler.add_new_clients(["alice", "bob", "carol"])
+
+        assert isinstance(result, BulkClientAddResult)
+        assert result.added == 3 and result.failed == 0
+        assert result.apply_method == "dynamic"
+        assert [r.ip for r in result.results] == ["10.8.0.2", "10.8.0.3", "10.8.0.4"]
+
+        run_command.assert_called_once()
+        assert run_command.call_args.args[0] == ["wg", "addconf", "wg_main", "/dev/stdin"]
+        assert run_command.call_args.kwargs["input"].count("[Peer]") == 3
+
+        content = wg_config_file.read_text()
+        assert content.startswith(SERVER_CONFIG)
+        for name, ip in (("alice", "10.8.0.2"), ("bob", "10.8.0.3"), ("carol", "10.8.0.4")):
+            assert f"[Peer] # {name}" in content
+            assert f"AllowedIPs = {ip}/32" in content
+        assert (wg_config_file.stat().st_mode & 0o777) == 0o600
+        assert handler.data_store.count_clients() == 3
+
+    @pytest.mark.integration
+    def test_per_client_failures(self, environment):
+        """Test that invalid, duplicate and existing names fail without stopping the batch."""
+        handler, _, _ = environment
+        handler.add_new_clients(["existing"])
+
+        result = handler.add_new_clients("good,bad name,existing,good,other")
+
+        report = [(r.name, r.success) for r in result.results]
+        assert report == [("good", True), ("bad name", False), ("existing", False),
+                          ("good", False), ("other", True)]
+        assert result.added == 2 and result.failed == 3
+        assert "error" in result.to_dict()["results"][1]
+
+    @pytest.mark.integration
+    def test_subnet_exhaustion_reported(self, environment):
+        """Test that names beyond the subnet capacity are reported, others are added."""
+        handler, _, _ = environment
+
+        result = handler.add_new_clients([f"c{i}" for i in range(7)])
+
+        # /29 has five client addresses (server .1 reserved)
+        assert result.added == 5
+        assert [r.success for r in result.results] == [True] * 5 + [False] * 2
+        assert "No available IP addresses" in result.results[-1].error
+
+    @pytest.mark.integration
+    def test_config_write_failure_rolls_back(self, environment):
+        """Test that a failed server config write discards the database rows."""
+        handler, run_command, wg_config_file = environment
+
+        with patch.object(handler.wg_config, "write_text", side_effect=OSError("disk full")):
+            with pytest.raises(ServiceOperationError):
+                handler.add_new_clients(["alice", "bob"])
+
+        assert handler.data_store.count_clients() == 0
+        assert wg_config_file.read_text() == SERVER_CONFIG
+        assert handler.data_store.allocate_next_available_ip() == "10.8.0.2"
+        run_command.assert_not_called()
+
+    @pytest.mark.integration
+    def test_apply_failure_rolls_back(self, environment):
+        """Test that the batch is undone when neither wg nor a restart can apply it."""
+        handler, run_command, wg_config_file = environment
+        run_command.return_value = CommandResult(success=False, returncode=1, stderr="no device")
+
+        with patch("time.sleep"):
+            with pytest.raises(ServiceOperationError):
+                handler.add_new_clients(["alice", "bob"])
+
+        assert handler.data_store.count_clients() == 0
+        assert wg_config_file.read_text() == SERVER_CONFIG
+
+    @pytest.mark.integration
+    def test_empty_batch(self, environment):
+        """Test that an empty list is rejected."""
+        handler, _, _ = environment
+
+        with pytest.raises(InvalidClientNameError):
+            handler.add_new_clients([])
+
+
+class TestRemoveExistingClients:
+
+    @pytest.mark.integration
+    def test_batch_is_removed_once(self, environment):
+        """Test that a removal batch costs one config write and one wg invocation."""
+        handler, run_command, wg_config_file = environment
+        handler.add_new_clients(["alice", "bob", "carol"])
+        run_command.reset_mock()
+
+        result = handler.remove_existing_clients(["alice", "carol", "ghost"])
+
+        assert isinstance(result, BulkClientRemoveResult)
+        assert result.removed == 2 and result.failed == 1
+        assert [(r.name, r.success) for r in result.results] == [
+            ("alice", True), ("carol", True), ("ghost", False)
+        ]
+
+        run_command.assert_called_once()
+        command = run_command.call_args.args[0]
+        assert command[:3] == ["wg", "set", "wg_main"]
+        assert command.count("remove") == 2
+
+        content = wg_config_file.read_text()
+        assert "[Peer] # bob" in content
+        assert "# alice" not in content and "# carol" not in content
+        assert content.startswith(SERVER_CONFIG.rstrip("\n"))
+        assert [c.name for c in handler.data_store.get_all_clients()] == ["bob"]
+        assert handler.data_store.allocate_next_available_ip() == "10.8.0.2"
+
+    @pytest.mark.integration
+    def test_apply_failure_restores_clients(self, environment):
+        """Test that clients and config are restored when the removal cannot be applied."""
+        handler, run_command, wg_config_file = environment
+        handler.add_new_clients(["alice", "bob"])
+        before = wg_config_file.read_text()
+        run_command.return_value = CommandResult(success=False, returncode=1, stderr="no device")
+
+        with patch("time.sleep"):
+            with pytest.raises(ServiceOperationError):
+                handler.remove_existing_clients(["alice", "bob"])
+
+        assert handler.data_store.count_clients() == 2
+        assert wg_config_file.read_text() == before
+
+
+class TestPruneInactiveClients:
+
+    @staticmethod
+    def _handshakes(handler, handshakes):
+        handler.service_monitor.gather_latest_handshakes = Mock(return_value=handshakes)
+
+    @staticmethod
+    def _age(handler, name, days):
+        handler.data_store.db.execute(
+            "UPDATE clients SET created = ? WHERE name = ?",
+            ((datetime.now() - timedelta(days=days)).isoformat(), name)
+        )
+
+    @pytest.mark.integration
+    def test_dry_run_lists_inactive(self, environment):
+        """Test that only old clients without a recent handshake are candidates."""
+        handler, _, _ = environment
+        handler.add_new_clients(["stale", "active", "fresh", "never"])
+        for name in ("stale", "active", "never"):
+            self._age(handler, name, 60)
+
+        clients = {c.name: c for c in handler.data_store.get_all_clients()}
+        now = datetime.now()
+        self._handshakes(handler, {
+            clients["stale"].public_key: int((now - timedelta(days=45)).timestamp()),
+            clients["active"].public_key: int((now - timedelta(hours=2)).timestamp()),
+            clients["never"].public_key: 0
+        })
+
+        result = handler.prune_inactive_clients(30)
+
+        assert isinstance(result, ClientPruneResult)
+        assert result.dry_run is True and result.removal is None
+        assert sorted(c.name for c in result.candidates) == ["never", "stale"]
+        assert handler.data_store.count_clients() == 4
+
+    @pytest.mark.integration
+    def test_confirm_removes(self, environment):
+        """Test that confirm=True removes the candidates in one batch."""
+        handler, run_command, _ = environment
+        handler.add_new_clients(["old", "new"])
+        self._age(handler, "old", 10)
+        self._handshakes(handler, {})
+        run_command.reset_mock()
+
+        result = handler.prune_inactive_clients(7, confirm=True)
+
+        assert result.removal.removed == 1
+        assert result.to_dict()["count"] == 1
+        assert [c.name for c in handler.data_store.get_all_clients()] == ["new"]
+        run_command.assert_called_once()
+
+    @pytest.mark.integration
+    def test_interface_down_and_invalid_days(self, environment):
+        """Test that pruning refuses to guess without handshake data or a valid window."""
+        handler, _, _ = environment
+        self._handshakes(handler, None)
+
+        with pytest.raises(ServiceOperationError):
+            handler.prune_inactive_clients(30)
+        with pytest.raises(InvalidParameterError):
+            handler.prune_inactive_clients(0)
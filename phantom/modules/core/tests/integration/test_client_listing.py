@@ -0,0 +1,175 @@
+"""
+██████╗ ██╗  ██╗ █████╗ ███╗   ██╗████████╗ ██████╗ ███╗   ███╗
+██╔══██╗██║  ██║██╔══██╗████╗  ██║╚══██╔══╝██╔═══██╗████╗ ████║
+██████╔╝███████║███████║██╔██╗ ██║   ██║   ██║   ██║██╔████╔██║
+██╔═══╝ ██╔══██║██╔══██║██║╚██╗██║   ██║   ██║   ██║██║╚██╔╝██║
+██║     ██║  ██║██║  ██║██║ ╚████║   ██║   ╚██████╔╝██║ ╚═╝ ██║
+╚═╝     ╚═╝  ╚═╝╚═╝  ╚═╝╚═╝  ╚═══╝   ╚═╝    ╚═════╝ ╚═╝     ╚═╝
+
+Client Listing Pagination Integration Tests
+
+Copyright (c) 2025 Rıza Emre ARAS <r.emrearas@proton.me>
+Licensed under AGPL-3.0 - see LICENSE file for details
+Third-party licenses - see THIRD_PARTY_LICENSES file for details
+WireGuard® is a registered trademark of Jason A. Donenfeld.
+"""
+
+import ipaddress
+from datetime import datetime, timedelta
+from unittest.mock import Mock, patch
+
+import pytest
+
+from phantom.api.exceptions import InvalidParameterError
+from phantom.models.base import CommandResult
+from phantom.modules.core.lib import DataStore, CommonTools, ClientHandler
+from phantom.modules.core.models import WireGuardClient
+
+BASE_TIME = datetime(2025, 1, 1, 12, 0, 0)
+NOW = int(BASE_TIME.timestamp()) + 10_000
+
+
+def _client(index: int, name: str) -> WireGuardClient:
+    return WireGuardClient(
+        name=name, ip=str(ipaddress.IPv4Address("10.8.0.2") + index),
+        private_key=f"priv{index}", public_key=f"pub{index}", preshared_key=f"psk{index}",
+        created=BASE_TIME + timedelta(seconds=index // 2)  # pairs share a timestamp
+    )
+
+
+@pytest.fixture
+def environment(tmp_path):
+    config = {"wireguard": {"network": "10.8.0.0/24"}, "tweaks": {}}
+    data_store = DataStore(db_path=tmp_path / "clients.db", data_dir=tmp_path, subnet="10.8.0.0/24")
+    with data_store.transaction():
+        for index in range(25):
+            name = ("Alice" if index % 5 == 0 else "bob") + f"_{index:02d}"
+            data_store.store_new_client(_client(index, name))
+
+    # pub0 (Alice_00) and pub3 (bob_03) have a recent handshake
+    dump = "\n".join([
+        "cHJpdmF0ZQ==\tU0VSVkVS\t51820\toff",
+        f"pub0\t(none)\t203.0.113.5:40000\t10.8.0.2/32\t{NOW - 5}\t10\t20\toff",
+        f"pub3\t(none)\t203.0.113.6:40000\t10.8.0.5/32\t{NOW - 5}\t10\t20\toff",
+    ]) + "\n"
+    run_command = Mock(return_value=CommandResult(success=True, stdout=dump))
+    handler = ClientHandler(
+        data_store=data_store, key_generator=Mock(),
+        common_tools=CommonTools(config=config, run_command=run_command),
+        config=config, run_command=run_command, wg_interface="wg_main",
+        wg_config_file=tmp_path / "wg_main.conf", install_dir=tmp_path
+    )
+    with patch("time.time", return_value=NOW):
+        yield handler
+    data_store.close()
+
+
+class TestPageListing:
+
+    @pytest.mark.integration
+    def test_page_is_read_from_index(self, environment):
+        """Test that a page never materialises the full client table."""
+        handler = environment
+
+        with patch.object(handler.data_store, "get_all_clients") as get_all:
+            result = handler.list_all_clients(page=2, per_page=10)
+
+        get_all.assert_not_called()
+        assert result.total == 25
+        assert [c.name for c in result.clients][:2] == ["Alice_10", "bob_11"]
+        assert result.pagination.total_pages == 3
+        assert result.pagination.showing_from == 11 and result.pagination.showing_to == 20
+        assert result.pagination.has_prev and result.pagination.has_next
+
+    @pytest.mark.integration
+    def test_order_by_created_then_name(self, environment):
+        """Test ordering by creation time with the name breaking ties."""
+        handler = environment
+
+        names = [c.name for c in handler.list_all_clients(page=1, per_page=25).clients]
+
+        assert names[:4] == ["Alice_00", "bob_01", "bob_02", "bob_03"]
+        assert len(names) == 25
+
+    @pytest.mark.integration
+    def test_enrichment_limited_to_page(self, environment):
+        """Test that only clients of the returned page carry connection data."""
+        handler = environment
+
+        first = handler.list_all_clients(page=1, per_page=3)
+        second = handler.list_all_clients(page=2, per_page=3)
+
+        assert [c.connected for c in first.clients] == [True, False, False]
+        assert [c.name for c in second.clients if c.connected] == ["bob_03"]
+        assert first.clients[0].connection["endpoint"] == "203.0.113.5:40000"
+
+    @pytest.mark.integration
+    def test_prefix_search(self, environment):
+        """Test case-insensitive name prefix search with pagination."""
+        handler = environment
+
+        result = handler.list_all_clients(search="alice", per_page=3)
+
+        assert result.total == 5
+        assert [c.name for c in result.clients] == ["Alice_00", "Alice_05", "Alice_10"]
+        assert result.pagination.total_pages == 2
+        assert handler.list_all_clients(search="ice").total == 0
+        assert handler.list_all_clients(search="bob_1").total == 8
+
+    @pytest.mark.integration
+    def test_page_clamped(self, environment):
+        """Test that out of range pages are clamped like before."""
+        handler = environment
+
+        assert handler.list_all_clients(page=99, per_page=10).pagination.page == 3
+        assert handler.list_all_clients(page=0, per_page=10).pagination.page == 1
+        with pytest.raises(InvalidParameterError):
+            handler.list_all_clients(per_page=0)
+
+
+class TestCursorListing:
+
+    @pytest.mark.integration
+    def test_walk_whole_list(self, environment):
+        """Test that following next_cursor visits every client exactly once."""
+        handler = environment
+
+        seen, cursor, pages = [], None, 0
+        while True:
+            result = handler.list_all_clients(per_page=7, cursor=cursor)
+            seen.extend(c.name for c in result.clients)
+            pages += 1
+            cursor = result.next_cursor
+            if cursor is None:
+                break
+
+        assert pages == 4
+        assert seen == [c.name for c in handler.list_all_clients(per_page=25).clients]
+        assert result.pagination.page == 4 and result.pagination.showing_from == 22
+
+    @pytest.mark.integration
+    def test_cursor_stable_under_inserts(self, environment):
+        """Test that clients added during a walk do not shift the next page."""
+        handler = environment
+        first = handler.list_all_clients(per_page=5)
+
+        handler.data_store.store_new_client(WireGuardClient(
+            name="aaa_early", ip="10.8.0.200", private_key="k", public_key="pk",
+            preshared_key="p", created=BASE_TIME - timedelta(days=1)
+        ))
+        second = handler.list_all_clients(per_page=5, cursor=first.next_cursor)
+
+        # Alice_05 and bob_04 share a timestamp, the name breaks the tie
+        assert first.clients[-1].name == "Alice_05"
+        assert second.clients[0].name == "bob_04"
+        assert "aaa_early" not in [c.name for c in second.clients]
+        assert second.to_dict()["next_cursor"] is not None
+
+    @pytest.mark.integration
+    def test_invalid_cursor(self, environment):
+        """Test that a malformed cursor is rejected."""
+        handler = environment
+
+        for cursor in ("not-a-cursor", "W10"):
+            with pytest.raises(InvalidParameterError):
+                handler.list_all_clients(cursor=cursor)
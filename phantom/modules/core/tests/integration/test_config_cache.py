@@ -0,0 +1,211 @@
+"""
+██████╗ ██╗  ██╗ █████╗ ███╗   ██╗████████╗ ██████╗ ███╗   ███╗
+██╔══██╗██║  ██║██╔══██╗████╗  ██║╚══██╔══╝██╔═══██╗████╗ ████║
+██████╔╝███████║███████║██╔██╗ ██║   ██║   ██║   ██║██╔████╔██║
+██╔═══╝ ██╔══██║██╔══██║██║╚██╗██║   ██║   ██║   ██║██║╚██╔╝██║
+██║     ██║  ██║██║  ██║██║ ╚████║   ██║   ╚██████╔╝██║ ╚═╝ ██║
+╚═╝     ╚═╝  ╚═╝╚═╝  ╚═╝╚═╝  ╚═══╝   ╚═╝    ╚═════╝ ╚═╝     ╚═╝
+
+ConfigCache and Bulk Export Integration Tests
+
+Copyright (c) 2025 Rıza Emre ARAS <r.emrearas@proton.me>
+Licensed under AGPL-3.0 - see LICENSE file for details
+Third-party licenses - see THIRD_PARTY_LICENSES file for details
+WireGuard® is a registered trademark of Jason A. Donenfeld.
+"""
+
+import itertools
+import json
+import tarfile
+import zipfile
+from datetime import datetime
+from unittest.mock import Mock, patch
+
+import pytest
+
+from phantom.api.exceptions import InvalidParameterError
+from phantom.models.base import CommandResult
+from phantom.modules.core.lib import DataStore, CommonTools, ClientHandler, ConfigCache, ConfigGenerationService
+from phantom.modules.core.lib.config_cache import QRCODE_AVAILABLE
+from phantom.modules.core.models import WireGuardClient, BulkClientExportResult
+
+SERVER_CONFIG = "[Interface]\nPrivateKey = server\nAddress = 10.8.0.1/24\nListenPort = 51820\n"
+
+
+def _config():
+    return {
+        "wireguard": {"network": "10.8.0.0/29", "port": 51820, "server_ip": "203.0.113.10"},
+        "server": {"public_key": "server_pub="},
+        "dns": {"primary": "1.1.1.1", "secondary": "9.9.9.9"},
+        "tweaks": {}
+    }
+
+
+def _client(name, ip, key="priv="):
+    return WireGuardClient(name=name, ip=ip, public_key=f"pub_{name}=", private_key=key,
+                           preshared_key="psk=", created=datetime(2025, 1, 1), enabled=True)
+
+
+@pytest.fixture
+def cache(tmp_path):
+    config = _config()
+    service = ConfigGenerationService(config)
+    return ConfigCache(tmp_path / "config_cache", service), service, config
+
+
+@pytest.fixture
+def environment(tmp_path):
+    wg_config_file = tmp_path / "wg_main.conf"
+    wg_config_file.write_text(SERVER_CONFIG)
+    config = _config()
+    counter = itertools.count()
+    key_generator = Mock()
+    key_generator.create_private_key.side_effect = lambda: f"priv{next(counter):040d}="
+    key_generator.derive_public_key.side_effect = lambda private_key: private_key.replace("priv", "pub_")
+    key_generator.create_preshared_key.side_effect = lambda: f"psk_{next(counter):039d}="
+
+    run_command = Mock(return_value=CommandResult(success=True, returncode=0))
+    data_store = DataStore(db_path=tmp_path / "clients.db", data_dir=tmp_path, subnet="10.8.0.0/29")
+    handler = ClientHandler(
+        data_store=data_store,
+        key_generator=key_generator,
+        common_tools=CommonTools(config=config, run_command=run_command),
+        config=config,
+        run_command=run_command,
+        wg_interface="wg_main",
+        wg_config_file=wg_config_file,
+        install_dir=tmp_path
+    )
+    handler.add_new_clients(["alice", "bob", "carol"])
+    yield handler, config, tmp_path
+    data_store.close()
+
+
+class TestConfigCache:
+
+    @pytest.mark.integration
+    def test_second_render_is_a_hit(self, cache):
+        """Test that an unchanged client is served from disk without rendering."""
+        config_cache, service, _ = cache
+        client = _client("alice", "10.8.0.2")
+
+        first = config_cache.render(client)
+        with patch.object(service, "generate_client_config") as generate:
+            second = config_cache.render(client)
+
+        generate.assert_not_called()
+        assert first.hit is False and second.hit is True
+        assert second.read() == service.generate_client_config(client.to_dict())
+        assert (second.path.stat().st_mode & 0o777) == 0o600
+
+    @pytest.mark.integration
+    def test_global_change_clears_cache(self, cache):
+        """Test that a DNS change makes every entry stale."""
+        config_cache, _, config = cache
+        config_cache.render_many([_client("alice", "10.8.0.2"), _client("bob", "10.8.0.3")])
+
+        config["dns"]["primary"] = "8.8.8.8"
+        results = config_cache.render_many([_client("alice", "10.8.0.2")])
+
+        assert results[0].hit is False
+        assert "DNS = 8.8.8.8, 9.9.9.9" in results[0].read()
+        assert len(list(config_cache.cache_dir.glob("*.conf"))) == 1
+
+    @pytest.mark.integration
+    def test_client_change_drops_old_entry(self, cache):
+        """Test that a new client IP replaces the previous entry."""
+        config_cache, _, _ = cache
+        old = config_cache.render(_client("alice", "10.8.0.2"))
+
+        new = config_cache.render(_client("alice", "10.8.0.5"))
+
+        assert new.hit is False
+        assert not old.path.exists()
+        assert "Address = 10.8.0.5/24" in new.read()
+        index = json.loads((config_cache.cache_dir / "index.json").read_text())
+        assert index["clients"] == {"alice": new.digest}
+
+    @pytest.mark.integration
+    def test_discard(self, cache):
+        """Test that discarded clients lose their entries."""
+        config_cache, _, _ = cache
+        entry = config_cache.render(_client("alice", "10.8.0.2"))
+
+        config_cache.discard(["alice", "unknown"])
+
+        assert not entry.path.exists()
+        assert config_cache.render(_client("alice", "10.8.0.2")).hit is False
+
+
+class TestExportClients:
+
+    @pytest.mark.integration
+    def test_tar_export(self, environment):
+        """Test that every client is written to a private tar.gz archive."""
+        handler, _, tmp_path = environment
+        output = tmp_path / "out.tar.gz"
+
+        result = handler.export_client_configurations(output=str(output))
+
+        assert isinstance(result, BulkClientExportResult)
+        assert result.exported == 3 and result.failed == 0
+        assert result.rendered == 3 and result.cache_hits == 0
+        assert result.size_bytes == output.stat().st_size
+        assert (output.stat().st_mode & 0o777) == 0o600
+        with tarfile.open(output) as archive:
+            assert archive.getnames() == ["alice.conf", "bob.conf", "carol.conf"]
+            content = archive.extractfile("bob.conf").read().decode()
+        assert content == handler.export_client_configuration("bob").config
+
+    @pytest.mark.integration
+    def test_zip_export_reuses_cache(self, environment):
+        """Test that a second export only renders clients that changed."""
+        handler, _, tmp_path = environment
+        handler.export_client_configurations(output=str(tmp_path / "first.tar.gz"))
+
+        result = handler.export_client_configurations(["alice", "missing"], archive_format="zip",
+                                                      output=str(tmp_path / "out.zip"))
+
+        assert result.rendered == 0 and result.cache_hits == 1
+        assert [(r.name, r.success) for r in result.results] == [("missing", False), ("alice", True)]
+        with zipfile.ZipFile(tmp_path / "out.zip") as archive:
+            assert archive.namelist() == ["alice.conf"]
+
+    @pytest.mark.integration
+    @pytest.mark.skipif(not QRCODE_AVAILABLE, reason="qrcode not installed")
+    def test_export_with_qr(self, environment):
+        """Test that SVG QR codes are stored next to each config."""
+        handler, _, tmp_path = environment
+
+        result = handler.export_client_configurations("alice", output=str(tmp_path / "qr.tar.gz"), include_qr=True)
+
+        assert result.qr_included is True
+        with tarfile.open(tmp_path / "qr.tar.gz") as archive:
+            assert archive.getnames() == ["alice.conf", "alice.svg"]
+            assert b"<svg" in archive.extractfile("alice.svg").read()
+
+    @pytest.mark.integration
+    def test_default_path_and_invalid_format(self, environment):
+        """Test the default archive location and format validation."""
+        handler, _, tmp_path = environment
+
+        result = handler.export_client_configurations(archive_format="zip")
+
+        assert result.archive.startswith(str(tmp_path / "data" / "exports" / "phantom-clients-"))
+        assert result.archive.endswith(".zip")
+        with pytest.raises(InvalidParameterError):
+            handler.export_client_configurations(archive_format="rar")
+
+    @pytest.mark.integration
+    def test_removed_clients_are_discarded(self, environment):
+        """Test that removing clients deletes their cached configs."""
+        handler, _, _ = environment
+        handler.export_client_configurations(output=str(handler.install_dir / "all.tar.gz"))
+        cache_dir = handler.config_cache.cache_dir
+
+        handler.remove_existing_client("alice")
+        handler.remove_existing_clients(["bob"])
+
+        assert len(list(cache_dir.glob("*.conf"))) == 1
+        index = json.loads((cache_dir / "index.json").read_text())
+        assert list(index["clients"]) == ["carol"]
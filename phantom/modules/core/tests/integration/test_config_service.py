@@ -0,0 +1,191 @@
+"""
+██████╗ ██╗  ██╗ █████╗ ███╗   ██╗████████╗ ██████╗ ███╗   ███╗
+██╔══██╗██║  ██║██╔══██╗████╗  ██║╚══██╔══╝██╔═══██╗████╗ ████║
+██████╔╝███████║███████║██╔██╗ ██║   ██║   ██║   ██║██╔████╔██║
+██╔═══╝ ██╔══██║██╔══██║██║╚██╗██║   ██║   ██║   ██║██║╚██╔╝██║
+██║     ██║  ██║██║  ██║██║ ╚████║   ██║   ╚██████╔╝██║ ╚═╝ ██║
+╚═╝     ╚═╝  ╚═╝╚═╝  ╚═╝╚═╝  ╚═══╝   ╚═╝    ╚═════╝ ╚═╝     ╚═╝
+
+ConfigService Integration Tests
+
+Copyright (c) 2025 Rıza Emre ARAS <r.emrearas@proton.me>
+Licensed under AGPL-3.0 - see LICENSE file for details
+Third-party licenses - see THIRD_PARTY_LICENSES file for details
+WireGuard® is a registered trademark of Jason A. Donenfeld.
+"""
+
+import gc
+import json
+import os
+import stat
+from unittest.mock import patch
+
+import pytest
+
+from phantom.modules.config_service import ConfigService, get_config_service
+from phantom.modules.dns.module import DnsModule
+
+BASE_CONFIG = {
+    "dns": {"primary": "1.1.1.1", "secondary": "1.0.0.1"},
+    "multihop": {"enabled": False},
+    "wireguard": {"network": "10.8.0.0/24"}
+}
+
+
+@pytest.fixture
+def config_file(tmp_path):
+    path = tmp_path / "config" / "phantom.json"
+    path.parent.mkdir()
+    path.write_text(json.dumps(BASE_CONFIG))
+    os.chmod(path, 0o640)
+    return path
+
+
+def age(path, seconds=60):
+    """Move the mtime out of the racy window so the stat cache is trusted."""
+    info = path.stat()
+    os.utime(path, ns=(info.st_atime_ns, info.st_mtime_ns - seconds * 1_000_000_000))
+
+
+class Recorder:
+
+    def __init__(self):
+        self.events = []
+
+    def __call__(self, snapshot, source):
+        self.events.append((snapshot, source))
+
+
+class TestConfigService:
+
+    @pytest.mark.integration
+    def test_snapshot_cached_until_file_changes(self, config_file):
+        """Test that an unchanged file is parsed once and snapshots are shared."""
+        age(config_file)
+        service = ConfigService(config_file)
+
+        with patch("phantom.modules.config_service.json.loads", wraps=json.loads) as parse:
+            first = service.snapshot()
+            assert service.snapshot() is first
+            assert parse.call_count == 1
+
+            config_file.write_text(json.dumps({**BASE_CONFIG, "debug": True}))
+            assert service.snapshot()["debug"] is True
+            assert parse.call_count == 2
+
+    @pytest.mark.integration
+    def test_same_tick_rewrite_detected(self, config_file):
+        """Test that a same-size rewrite keeping the mtime is not served stale."""
+        service = ConfigService(config_file)
+        assert service.snapshot()["dns"]["primary"] == "1.1.1.1"
+
+        info = config_file.stat()
+        config_file.write_text(config_file.read_text().replace("1.1.1.1", "9.9.9.9"))
+        os.utime(config_file, ns=(info.st_atime_ns, info.st_mtime_ns))
+        assert config_file.stat().st_size == info.st_size
+
+        assert service.snapshot()["dns"]["primary"] == "9.9.9.9"
+
+    @pytest.mark.integration
+    def test_load_is_copy_on_write(self, config_file):
+        """Test that load() copies do not leak into the shared snapshot."""
+        service = ConfigService(config_file)
+
+        private = service.load()
+        private["dns"]["primary"] = "8.8.8.8"
+
+        assert service.snapshot()["dns"]["primary"] == "1.1.1.1"
+
+    @pytest.mark.integration
+    def test_save_is_atomic_and_keeps_mode(self, config_file):
+        """Test that save replaces the file atomically and keeps its permissions."""
+        service = ConfigService(config_file)
+        inode = config_file.stat().st_ino
+        saved = {**BASE_CONFIG, "debug": True}
+
+        snapshot = service.save(saved)
+        saved["debug"] = False
+
+        assert snapshot["debug"] is True
+        assert json.loads(config_file.read_text())["debug"] is True
+        assert config_file.stat().st_ino != inode
+        assert stat.S_IMODE(config_file.stat().st_mode) == 0o640
+        assert sorted(p.name for p in config_file.parent.iterdir()) == ["phantom.json", "phantom.json.lock"]
+
+    @pytest.mark.integration
+    def test_update_applies_to_latest_content(self, config_file):
+        """Test that update() re-reads the file and does not drop external edits."""
+        service = ConfigService(config_file)
+        service.snapshot()
+        config_file.write_text(json.dumps({**BASE_CONFIG, "debug": True}))
+
+        service.update(lambda config: config["multihop"].update(active_exit="fast"))
+
+        saved = json.loads(config_file.read_text())
+        assert saved["debug"] is True
+        assert saved["multihop"]["active_exit"] == "fast"
+
+    @pytest.mark.integration
+    def test_subscribers_notified(self, config_file):
+        """Test that writes and external changes are published, bound methods weakly."""
+        service = ConfigService(config_file)
+        recorder = Recorder()
+        service.subscribe(recorder)
+        service.snapshot()
+        assert recorder.events == []
+
+        service.save({**BASE_CONFIG, "debug": True}, source="dns")
+        assert recorder.events[-1][1] == "dns"
+
+        config_file.write_text(json.dumps(BASE_CONFIG))
+        assert service.poll() is True
+        assert recorder.events[-1] == (BASE_CONFIG, None)
+
+        class Holder:
+            calls = 0
+
+            def on_change(self, snapshot, source):
+                Holder.calls += 1
+
+        holder = Holder()
+        service.subscribe(holder.on_change)
+        del holder
+        gc.collect()
+        service.save(BASE_CONFIG)
+        assert Holder.calls == 0
+        assert len(recorder.events) == 3
+
+    @pytest.mark.integration
+    def test_inotify_watch_reports_changes(self, config_file):
+        """Test that handle_events() publishes atomic replacements made elsewhere."""
+        service = ConfigService(config_file)
+        service.snapshot()
+        if service.watch() is None:
+            pytest.skip("inotify not available")
+        recorder = Recorder()
+        service.subscribe(recorder)
+
+        try:
+            tmp = config_file.with_name(".phantom.json.tmp")
+            tmp.write_text(json.dumps({**BASE_CONFIG, "debug": True}))
+            os.replace(tmp, config_file)
+
+            assert service.handle_events() is True
+            assert recorder.events[-1][0]["debug"] is True
+            assert service.handle_events() is False
+        finally:
+            service.close()
+
+    @pytest.mark.integration
+    def test_modules_share_service_and_refresh(self, config_file):
+        """Test that a DNS change made by one module reaches the others without re-reading."""
+        install_dir = config_file.parent.parent
+        writer = DnsModule(install_dir=install_dir)
+        reader = DnsModule(install_dir=install_dir)
+        assert writer.config_service is reader.config_service is get_config_service(config_file)
+
+        writer.change_dns_servers(primary="9.9.9.9", secondary="149.112.112.112")
+
+        assert reader.dns_config == {"primary": "9.9.9.9", "secondary": "149.112.112.112"}
+        assert reader.config["dns"]["primary"] == "9.9.9.9"
+        assert json.loads(config_file.read_text())["dns"]["primary"] == "9.9.9.9"
@@ -14,6 +14,9 @@ Third-party licenses - see THIRD_PARTY_LICENSES file for details
 WireGuard® is a registered trademark of Jason A. Donenfeld.
 """
 
+import sys
+import json
+import sqlite3
 import pytest
 from datetime import datetime
 import ipaddress
@@ -482,3 +485,149 @@ class TestDataStore:
             store_without_db.close()
         except AttributeError:
             pytest.fail("close() should handle missing db attribute gracefully")
+
+    @pytest.mark.integration
+    def test_indexed_lookups(self, environment):
+        """Test lookups by ip and public key and unique constraints."""
+        store = DataStore(
+            db_path=environment['db_path'],
+            data_dir=environment['data_dir'],
+            subnet="10.8.0.0/24"
+        )
+
+        for i, name in enumerate(["alpha", "beta"], start=2):
+            store.store_new_client(WireGuardClient(
+                name=name,
+                ip=f"10.8.0.{i}",
+                private_key=f"key_{name}",
+                public_key=f"pub_{name}",
+                preshared_key=f"pre_{name}",
+                created=datetime.now(),
+                enabled=True
+            ))
+
+        assert store.find_client_by_ip("10.8.0.3").name == "beta"
+        assert store.find_client_by_public_key("pub_alpha").name == "alpha"
+        assert store.find_client_by_ip("10.8.0.99") is None
+        assert store.count_clients() == 2
+
+        # Duplicate public key is rejected and leaves no partial rows behind
+        with pytest.raises(sqlite3.IntegrityError):
+            store.store_new_client(WireGuardClient(
+                name="gamma",
+                ip="10.8.0.4",
+                private_key="key_gamma",
+                public_key="pub_alpha",
+                preshared_key="pre_gamma",
+                created=datetime.now(),
+                enabled=True
+            ))
+        assert store.check_if_client_exists("gamma") is False
+        assert not any(a['ip'] == "10.8.0.4" for a in store.get_ip_allocations())
+
+    @pytest.mark.integration
+    def test_swapping_ips_in_bulk_update(self, environment):
+        """Test that bulk IP updates can swap addresses between clients."""
+        store = DataStore(
+            db_path=environment['db_path'],
+            data_dir=environment['data_dir'],
+            subnet="10.8.0.0/24"
+        )
+
+        for name, ip in [("a", "10.8.0.2"), ("b", "10.8.0.3")]:
+            store.store_new_client(WireGuardClient(
+                name=name, ip=ip, private_key=f"k{name}", public_key=f"p{name}",
+                preshared_key=f"s{name}", created=datetime.now(), enabled=True
+            ))
+
+        store.update_all_client_ips({"a": "10.8.0.3", "b": "10.8.0.2"})
+
+        assert store.find_client_by_name("a").ip == "10.8.0.3"
+        assert store.find_client_by_name("b").ip == "10.8.0.2"
+        allocations = {a['client_name']: a['ip'] for a in store.get_ip_allocations()}
+        assert allocations == {"a": "10.8.0.3", "b": "10.8.0.2"}
+
+    @pytest.mark.integration
+    def test_transaction_rollback(self, environment):
+        """Test that a failed transaction rolls back all of its writes."""
+        store = DataStore(
+            db_path=environment['db_path'],
+            data_dir=environment['data_dir'],
+            subnet="10.8.0.0/24"
+        )
+
+        with pytest.raises(RuntimeError):
+            with store.transaction():
+                store.store_new_client(WireGuardClient(
+                    name="rolled-back", ip="10.8.0.2", private_key="k", public_key="p",
+                    preshared_key="s", created=datetime.now(), enabled=True
+                ))
+                raise RuntimeError("abort")
+
+        assert store.check_if_client_exists("rolled-back") is False
+        assert store.get_ip_allocations() == []
+
+    @pytest.mark.integration
+    def test_legacy_tinydb_migration(self, environment):
+        """Test automatic migration of a TinyDB JSON clients.db to SQLite."""
+        created = "2025-01-30T10:15:00"
+        legacy = {
+            "clients": {
+                "1": {"name": "john", "ip": "10.8.0.2", "private_key": "k1", "public_key": "p1",
+                      "preshared_key": "s1", "created": created, "enabled": True},
+                "2": {"name": "alice", "ip": "10.8.0.3", "private_key": "k2", "public_key": "p2",
+                      "preshared_key": "s2", "created": created, "enabled": False}
+            },
+            "ip_assignments": {
+                "1": {"ip": "10.8.0.2", "client_name": "john", "assigned_at": created}
+            }
+        }
+        environment['db_path'].write_text(json.dumps(legacy))
+
+        store = DataStore(
+            db_path=environment['db_path'],
+            data_dir=environment['data_dir'],
+            subnet="10.8.0.0/24"
+        )
+
+        assert [c.name for c in store.get_all_clients()] == ["john", "alice"]
+        assert store.find_client_by_name("alice").enabled is False
+
+        # Missing allocation for alice is rebuilt from the client record
+        allocations = {a['client_name']: a['ip'] for a in store.get_ip_allocations()}
+        assert allocations == {"john": "10.8.0.2", "alice": "10.8.0.3"}
+
+        # Legacy file is preserved and the database file is now SQLite
+        backup = environment['db_path'].with_name(environment['db_path'].name + ".tinydb.bak")
+        assert json.loads(backup.read_text()) == legacy
+        assert environment['db_path'].read_bytes().startswith(b"SQLite format 3\x00")
+        store.close()
+
+        # Reopening does not migrate again
+        reopened = DataStore(
+            db_path=environment['db_path'],
+            data_dir=environment['data_dir'],
+            subnet="10.8.0.0/24"
+        )
+        assert reopened.count_clients() == 2
+        reopened.close()
+
+    @pytest.mark.integration
+    def test_open_and_migrate_without_tinydb(self, environment, monkeypatch):
+        """Test that neither a new database nor a legacy migration needs the tinydb package."""
+        monkeypatch.setitem(sys.modules, "tinydb", None)
+        with pytest.raises(ImportError):
+            import tinydb  # noqa: F401
+
+        fresh = DataStore(db_path=environment['db_path'], data_dir=environment['data_dir'], subnet="10.8.0.0/24")
+        assert fresh.count_clients() == 0
+        fresh.close()
+        assert environment['db_path'].read_bytes().startswith(b"SQLite format 3\x00")
+
+        legacy_path = environment['data_dir'] / "legacy.db"
+        legacy_path.write_text(json.dumps({"clients": {"1": {
+            "name": "john", "ip": "10.8.0.2", "private_key": "k1", "public_key": "p1",
+            "preshared_key": "s1", "created": "2025-01-30T10:15:00", "enabled": True}}}))
+        migrated = DataStore(db_path=legacy_path, data_dir=environment['data_dir'], subnet="10.8.0.0/24")
+        assert [c.name for c in migrated.get_all_clients()] == ["john"]
+        migrated.close()
@@ -0,0 +1,149 @@
+"""
+██████╗ ██╗  ██╗ █████╗ ███╗   ██╗████████╗ ██████╗ ███╗   ███╗
+██╔══██╗██║  ██║██╔══██╗████╗  ██║╚══██╔══╝██╔═══██╗████╗ ████║
+██████╔╝███████║███████║██╔██╗ ██║   ██║   ██║   ██║██╔████╔██║
+██╔═══╝ ██╔══██║██╔══██║██║╚██╗██║   ██║   ██║   ██║██║╚██╔╝██║
+██║     ██║  ██║██║  ██║██║ ╚████║   ██║   ╚██████╔╝██║ ╚═╝ ██║
+╚═╝     ╚═╝  ╚═╝╚═╝  ╚═╝╚═╝  ╚═══╝   ╚═╝    ╚═════╝ ╚═╝     ╚═╝
+
+IPAllocator Component Integration Tests
+
+Copyright (c) 2025 Rıza Emre ARAS <r.emrearas@proton.me>
+Licensed under AGPL-3.0 - see LICENSE file for details
+Third-party licenses - see THIRD_PARTY_LICENSES file for details
+WireGuard® is a registered trademark of Jason A. Donenfeld.
+"""
+
+import sqlite3
+import ipaddress
+from datetime import datetime
+
+import pytest
+
+from phantom.modules.core.lib.ip_allocator import IPAllocator
+from phantom.modules.core.lib.data_store import DataStore
+from phantom.modules.core.models import WireGuardClient
+
+
+def _client(name: str, ip: str) -> WireGuardClient:
+    return WireGuardClient(
+        name=name, ip=ip, private_key=f"k_{name}", public_key=f"p_{name}",
+        preshared_key=f"s_{name}", created=datetime.now(), enabled=True
+    )
+
+
+class TestIPAllocator:
+
+    @pytest.mark.integration
+    def test_reserved_addresses(self):
+        """Test that network, server and broadcast addresses are never handed out."""
+        allocator = IPAllocator(ipaddress.IPv4Network("10.8.0.0/29"))
+
+        handed_out = []
+        while True:
+            ip = allocator.next_free()
+            if ip is None:
+                break
+            handed_out.append(ip)
+            allocator.mark(ip)
+
+        assert handed_out == [f"10.8.0.{i}" for i in range(2, 7)]
+        assert allocator.available_count == 0
+        assert allocator.allocated_count == 5
+
+        # Releasing reserved addresses has no effect
+        for reserved in ("10.8.0.0", "10.8.0.1", "10.8.0.7"):
+            allocator.release(reserved)
+        assert allocator.next_free() is None
+
+    @pytest.mark.integration
+    def test_lowest_free_is_reused(self):
+        """Test that released addresses below the scan hint are reused first."""
+        allocator = IPAllocator(
+            ipaddress.IPv4Network("10.8.0.0/24"),
+            allocated=[f"10.8.0.{i}" for i in range(2, 50)]
+        )
+        assert allocator.next_free() == "10.8.0.50"
+
+        allocator.release("10.8.0.7")
+        allocator.release("10.8.0.30")
+        assert allocator.next_free() == "10.8.0.7"
+        allocator.mark("10.8.0.7")
+        assert allocator.next_free() == "10.8.0.30"
+
+    @pytest.mark.integration
+    def test_out_of_subnet_addresses_ignored(self):
+        """Test that addresses outside the subnet do not affect the bitmap."""
+        allocator = IPAllocator(ipaddress.IPv4Network("10.8.0.0/24"), allocated=["192.168.1.5", "bogus"])
+
+        assert allocator.allocated_count == 0
+        assert allocator.is_allocated("192.168.1.5") is False
+        assert allocator.next_free() == "10.8.0.2"
+
+    @pytest.mark.integration
+    def test_large_subnet_allocation(self):
+        """Test allocation on a nearly full /16 without walking hosts()."""
+        network = ipaddress.IPv4Network("10.0.0.0/16")
+        base = int(network.network_address)
+        allocated = (str(ipaddress.IPv4Address(base + i)) for i in range(2, 65000))
+        allocator = IPAllocator(network, allocated)
+
+        assert allocator.next_free() == "10.0.253.232"
+
+
+class TestDataStoreAllocation:
+
+    @pytest.fixture
+    def store(self, tmp_path):
+        store = DataStore(db_path=tmp_path / "clients.db", data_dir=tmp_path, subnet="10.8.0.0/24")
+        yield store
+        store.close()
+
+    @pytest.mark.integration
+    def test_bitmap_tracks_store_and_remove(self, store):
+        """Test that stores, removals and IP updates keep the bitmap in sync."""
+        for i in range(3):
+            ip = store.allocate_next_available_ip()
+            store.store_new_client(_client(f"c{i}", ip))
+
+        assert store.allocate_next_available_ip() == "10.8.0.5"
+
+        store.remove_existing_client("c1")
+        assert store.allocate_next_available_ip() == "10.8.0.3"
+
+        store.update_client_ip("c0", "10.8.0.100")
+        assert store.allocate_next_available_ip() == "10.8.0.2"
+
+    @pytest.mark.integration
+    def test_bitmap_rebuilt_on_subnet_change(self, store):
+        """Test that update_network_configuration rebuilds the bitmap for the new subnet."""
+        store.store_new_client(_client("a", store.allocate_next_available_ip()))
+        store.update_all_client_ips({"a": "10.9.0.2"})
+        store.update_network_configuration("10.9.0.0/24")
+
+        assert store.allocate_next_available_ip() == "10.9.0.3"
+
+    @pytest.mark.integration
+    def test_bitmap_sees_writes_from_other_connections(self, store, tmp_path):
+        """Test that allocations committed by another process are picked up."""
+        assert store.allocate_next_available_ip() == "10.8.0.2"
+
+        other = sqlite3.connect(str(tmp_path / "clients.db"))
+        other.execute(
+            "INSERT INTO ip_assignments (ip, client_name, assigned_at) VALUES (?, ?, ?)",
+            ("10.8.0.2", "external", datetime.now().isoformat())
+        )
+        other.commit()
+        other.close()
+
+        assert store.allocate_next_available_ip() == "10.8.0.3"
+
+    @pytest.mark.integration
+    def test_bitmap_reset_on_rollback(self, store):
+        """Test that a rolled back transaction does not leak allocations."""
+        with pytest.raises(RuntimeError):
+            with store.transaction():
+                store.store_new_client(_client("tmp", store.allocate_next_available_ip()))
+                raise RuntimeError("abort")
+
+        assert store.allocate_next_available_ip() == "10.8.0.2"
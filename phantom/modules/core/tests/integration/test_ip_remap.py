@@ -0,0 +1,138 @@
+"""
+██████╗ ██╗  ██╗ █████╗ ███╗   ██╗████████╗ ██████╗ ███╗   ███╗
+██╔══██╗██║  ██║██╔══██╗████╗  ██║╚══██╔══╝██╔═══██╗████╗ ████║
+██████╔╝███████║███████║██╔██╗ ██║   ██║   ██║   ██║██╔████╔██║
+██╔═══╝ ██╔══██║██╔══██║██║╚██╗██║   ██║   ██║   ██║██║╚██╔╝██║
+██║     ██║  ██║██║  ██║██║ ╚████║   ██║   ╚██████╔╝██║ ╚═╝ ██║
+╚═╝     ╚═╝  ╚═╝╚═╝  ╚═╝╚═╝  ╚═══╝   ╚═╝    ╚═════╝ ╚═╝     ╚═╝
+
+
+IPRemapper Integration Tests
+
+Copyright (c) 2025 Rıza Emre ARAS <r.emrearas@proton.me>
+Licensed under AGPL-3.0 - see LICENSE file for details
+Third-party licenses - see THIRD_PARTY_LICENSES file for details
+WireGuard® is a registered trademark of Jason A. Donenfeld.
+"""
+
+import ipaddress
+from datetime import datetime
+from unittest.mock import patch
+
+import pytest
+
+from phantom.modules.core.lib.data_store import DataStore
+from phantom.modules.core.lib.ip_remap import IPRemapper, address_array, int_to_ip, ip_to_int
+from phantom.modules.core.lib.network_admin_helpers.ip_operations import _IPOperations
+from phantom.modules.core.models import WireGuardClient
+
+OLD = ipaddress.IPv4Network("10.8.0.0/16")
+
+
+def _client(name: str, ip: str) -> WireGuardClient:
+    return WireGuardClient(
+        name=name, ip=ip, private_key=f"k_{name}", public_key=f"p_{name}",
+        preshared_key=f"s_{name}", created=datetime.now(), enabled=True
+    )
+
+
+class TestIPRemapper:
+
+    @pytest.mark.integration
+    def test_compact_renumbers_in_address_order(self):
+        """Test that compact numbers clients from .2 sorted by address, not by string."""
+        remapper = IPRemapper(OLD, ipaddress.IPv4Network("10.9.0.0/24"), "compact")
+
+        plan = remapper.remap(address_array(["10.8.0.10", "10.8.0.9", "10.8.1.2"]))
+
+        assert plan.as_dict() == {"10.8.0.9": "10.9.0.2", "10.8.0.10": "10.9.0.3", "10.8.1.2": "10.9.0.4"}
+        assert remapper.server_mapping() == ("10.8.0.1", "10.9.0.1")
+
+    @pytest.mark.integration
+    def test_preserve_keeps_offsets_and_fills_gaps(self):
+        """Test that preserve keeps host offsets and moves overflowing ones to the lowest free addresses."""
+        remapper = IPRemapper(OLD, ipaddress.IPv4Network("172.16.5.0/24"), "preserve")
+
+        plan = remapper.remap(address_array(["10.8.0.57", "10.8.0.2", "10.8.0.3", "10.8.3.1", "10.8.0.255"]))
+
+        assert plan.as_dict() == {
+            "10.8.0.2": "172.16.5.2",
+            "10.8.0.3": "172.16.5.3",
+            "10.8.0.57": "172.16.5.57",
+            # .255 would be the broadcast address and 3.1 is outside a /24
+            "10.8.0.255": "172.16.5.4",
+            "10.8.3.1": "172.16.5.5"
+        }
+        summary = plan.summary()
+        assert (summary["offsets_kept"], summary["renumbered"]) == (3, 2)
+        assert summary["capacity"] == 253
+
+    @pytest.mark.integration
+    def test_capacity_and_strategy_errors(self):
+        remapper = IPRemapper(OLD, ipaddress.IPv4Network("10.9.0.0/29"), "preserve")
+
+        with pytest.raises(ValueError, match="New subnet too small for 6 clients"):
+            remapper.remap(address_array([f"10.8.0.{i}" for i in range(2, 8)]))
+        with pytest.raises(ValueError):
+            IPRemapper(OLD, OLD, "random")
+        with pytest.raises(ValueError):
+            ip_to_int("10.8")
+
+    @pytest.mark.integration
+    def test_large_subnet_never_lists_hosts(self):
+        """Test that a /8 remap works on integers without walking the subnet's hosts."""
+        old = ipaddress.IPv4Network("10.0.0.0/8")
+        new = ipaddress.IPv4Network("172.16.0.0/12")
+        addresses = address_array(int_to_ip(int(old.network_address) + 2 + i * 7) for i in range(20000))
+
+        with patch.object(ipaddress.IPv4Network, "hosts", side_effect=AssertionError("hosts() called")):
+            preview = IPRemapper(old, new, "preserve").preview(addresses, limit=3)
+
+        assert preview["mappings"] == {"10.0.0.2": "172.16.0.2", "10.0.0.9": "172.16.0.9",
+                                       "10.0.0.16": "172.16.0.16"}
+        assert preview["truncated"] is True
+        assert preview["summary"]["clients"] == 20000
+        assert preview["summary"]["offsets_kept"] == 20000
+
+
+class TestRemapWithDataStore:
+
+    @pytest.fixture
+    def store(self, tmp_path):
+        store = DataStore(tmp_path / "clients.db", tmp_path, subnet="10.8.0.0/24")
+        for name, ip in (("alpha", "10.8.0.40"), ("beta", "10.8.0.2"), ("gamma", "10.8.0.200")):
+            store.store_new_client(_client(name, ip))
+        yield store
+        store.close()
+
+    @pytest.mark.integration
+    def test_mapping_by_name(self, store):
+        old, new = ipaddress.IPv4Network("10.8.0.0/24"), ipaddress.IPv4Network("10.9.0.0/25")
+
+        assert store.create_ip_mapping_for_subnet_change(old, new) == {
+            "alpha": "10.9.0.3", "beta": "10.9.0.2", "gamma": "10.9.0.4"
+        }
+        assert store.create_ip_mapping_for_subnet_change(old, new, "preserve") == {
+            "alpha": "10.9.0.40", "beta": "10.9.0.2", "gamma": "10.9.0.3"
+        }
+
+    @pytest.mark.integration
+    def test_streamed_preview(self, store):
+        """Test that the preview lists the first clients by name and summarizes the rest."""
+        ip_ops = _IPOperations(store, {})
+        old, new = ipaddress.IPv4Network("10.8.0.0/24"), ipaddress.IPv4Network("10.9.0.0/24")
+
+        preview = ip_ops.preview_ip_remapping(old, new, {}, strategy="preserve", limit=2)
+
+        assert preview["total_mappings"] == 4
+        assert preview["mappings"] == {
+            "server": {"old": "10.8.0.1", "new": "10.9.0.1"},
+            "beta": {"old": "10.8.0.2", "new": "10.9.0.2"},
+            "alpha": {"old": "10.8.0.40", "new": "10.9.0.40"}
+        }
+        assert preview["truncated"] is True
+        assert preview["summary"]["offsets_kept"] == 3
+
+        full = ip_ops.calculate_complete_ip_remapping(old, new, "preserve")
+        assert full["10.8.0.200"] == "10.9.0.200"
+        assert full["10.8.0.1"] == "10.9.0.1"
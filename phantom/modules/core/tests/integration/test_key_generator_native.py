@@ -0,0 +1,132 @@
+"""
+██████╗ ██╗  ██╗ █████╗ ███╗   ██╗████████╗ ██████╗ ███╗   ███╗
+██╔══██╗██║  ██║██╔══██╗████╗  ██║╚══██╔══╝██╔═══██╗████╗ ████║
+██████╔╝███████║███████║██╔██╗ ██║   ██║   ██║   ██║██╔████╔██║
+██╔═══╝ ██╔══██║██╔══██║██║╚██╗██║   ██║   ██║   ██║██║╚██╔╝██║
+██║     ██║  ██║██║  ██║██║ ╚████║   ██║   ╚██████╔╝██║ ╚═╝ ██║
+╚═╝     ╚═╝  ╚═╝╚═╝  ╚═╝╚═╝  ╚═══╝   ╚═╝    ╚═════╝ ╚═╝     ╚═╝
+
+KeyGenerator Native Backend Integration Tests
+
+Copyright (c) 2025 Rıza Emre ARAS <r.emrearas@proton.me>
+Licensed under AGPL-3.0 - see LICENSE file for details
+Third-party licenses - see THIRD_PARTY_LICENSES file for details
+WireGuard® is a registered trademark of Jason A. Donenfeld.
+"""
+
+import base64
+from unittest.mock import Mock
+
+import pytest
+
+from phantom.api.exceptions import ServiceOperationError
+from phantom.models.base import CommandResult
+from phantom.modules.core.lib import key_generator as key_generator_module
+from phantom.modules.core.lib.key_generator import KeyGenerator
+from phantom.modules.core.lib.default_constants import KEY_BACKEND_NATIVE, KEY_BACKEND_WG
+
+# RFC 7748 section 6.1 (Alice)
+RFC7748_PRIVATE = bytes.fromhex("77076d0a7318a57d3c16c17251b26645df4c2f87ebc0992ab177fba51db92c2a")
+RFC7748_PUBLIC = bytes.fromhex("8520f0098930a754748b7ddcb43ef75a0dbf3a0d26381af4eba4a98eaa9b4e6a")
+
+# RFC 7748 section 6.1 (Bob)
+RFC7748_BOB_PRIVATE = bytes.fromhex("5dab087e624a8a4b79e17f8b83800ee66f3bb1292618b6fd1c2f8b27ff88e0eb")
+RFC7748_BOB_PUBLIC = bytes.fromhex("de9edb7d7b7dc1b4d35b61c2ece435373f8343c85b78674dadfc7e146f882b4f")
+
+
+@pytest.fixture(params=["cryptography", "python"])
+def provider(request, monkeypatch):
+    """Run a test with each X25519 implementation of the native backend."""
+    if request.param == "cryptography":
+        if not key_generator_module._HAS_X25519:
+            pytest.skip("cryptography package not installed; the python provider is tested instead")
+    else:
+        monkeypatch.setattr(key_generator_module, "_HAS_X25519", False)
+    return request.param
+
+
+@pytest.fixture
+def run_command():
+    return Mock(return_value=CommandResult(
+        success=True, returncode=0, stdout="P" * 43 + "=\n", stderr=""
+    ))
+
+
+class TestNativeBackend:
+
+    @pytest.mark.integration
+    def test_private_key_is_clamped(self, run_command):
+        """Test that native private keys are 32 clamped bytes in wg base64 format."""
+        generator = KeyGenerator(run_command, backend=KEY_BACKEND_NATIVE)
+
+        for _ in range(50):
+            key = generator.create_private_key()
+            raw = base64.b64decode(key, validate=True)
+            assert len(key) == KeyGenerator.EXPECTED_KEY_LENGTH
+            assert len(raw) == 32
+            assert raw[0] & 7 == 0
+            assert raw[31] & 128 == 0
+            assert raw[31] & 64 == 64
+
+    @pytest.mark.integration
+    def test_no_subprocess_for_private_and_psk(self, run_command):
+        """Test that private and preshared keys never fork wg."""
+        generator = KeyGenerator(run_command, backend=KEY_BACKEND_NATIVE)
+
+        keys = {generator.create_private_key() for _ in range(20)}
+        psks = {generator.create_preshared_key() for _ in range(20)}
+
+        assert len(keys) == 20 and len(psks) == 20
+        assert all(len(psk) == KeyGenerator.EXPECTED_KEY_LENGTH for psk in psks)
+        run_command.assert_not_called()
+
+    @pytest.mark.integration
+    def test_public_key_rfc7748_vector(self, run_command, provider):
+        """Test native public key derivation against the RFC 7748 test vectors, without wg."""
+        generator = KeyGenerator(run_command, backend=KEY_BACKEND_NATIVE)
+        assert generator.public_key_provider == provider
+
+        for private, public in ((RFC7748_PRIVATE, RFC7748_PUBLIC), (RFC7748_BOB_PRIVATE, RFC7748_BOB_PUBLIC)):
+            public_key = generator.derive_public_key(base64.b64encode(private).decode())
+            assert base64.b64decode(public_key) == public
+        run_command.assert_not_called()
+
+    @pytest.mark.integration
+    def test_full_key_set_without_subprocess(self, run_command, provider):
+        """Test that a complete client key set is generated without forking wg."""
+        generator = KeyGenerator(run_command, backend=KEY_BACKEND_NATIVE)
+
+        public_keys = {generator.derive_public_key(generator.create_private_key()) for _ in range(5)}
+
+        assert len(public_keys) == 5
+        assert all(len(key) == KeyGenerator.EXPECTED_KEY_LENGTH for key in public_keys)
+        run_command.assert_not_called()
+
+    @pytest.mark.integration
+    def test_invalid_private_key_rejected(self, run_command, provider):
+        """Test that malformed private keys raise ServiceOperationError."""
+        generator = KeyGenerator(run_command, backend=KEY_BACKEND_NATIVE)
+
+        for bad in ("not-base64!", base64.b64encode(b"short").decode()):
+            with pytest.raises(ServiceOperationError):
+                generator.derive_public_key(bad)
+
+
+class TestBackendSelection:
+
+    @pytest.mark.integration
+    def test_wg_backend_uses_commands(self, run_command):
+        """Test that the wg backend keeps running wg for every key."""
+        generator = KeyGenerator(run_command, backend=KEY_BACKEND_WG)
+
+        generator.create_private_key()
+        generator.create_preshared_key()
+
+        commands = [call.args[0] for call in run_command.call_args_list]
+        assert commands == [["wg", "genkey"], ["wg", "genpsk"]]
+
+    @pytest.mark.integration
+    def test_unknown_backend(self, run_command):
+        """Test that an unknown backend name is rejected."""
+        with pytest.raises(ValueError):
+            KeyGenerator(run_command, backend="openssl")
@@ -0,0 +1,266 @@
+"""
+██████╗ ██╗  ██╗ █████╗ ███╗   ██╗████████╗ ██████╗ ███╗   ███╗
+██╔══██╗██║  ██║██╔══██╗████╗  ██║╚══██╔══╝██╔═══██╗████╗ ████║
+██████╔╝███████║███████║██╔██╗ ██║   ██║   ██║   ██║██╔████╔██║
+██╔═══╝ ██╔══██║██╔══██║██║╚██╗██║   ██║   ██║   ██║██║╚██╔╝██║
+██║     ██║  ██║██║  ██║██║ ╚████║   ██║   ╚██████╔╝██║ ╚═╝ ██║
+╚═╝     ╚═╝  ╚═╝╚═╝  ╚═╝╚═╝  ╚═══╝   ╚═╝    ╚═════╝ ╚═╝     ╚═╝
+
+Live Subnet Migration Integration Tests
+
+Copyright (c) 2025 Rıza Emre ARAS <r.emrearas@proton.me>
+Licensed under AGPL-3.0 - see LICENSE file for details
+Third-party licenses - see THIRD_PARTY_LICENSES file for details
+WireGuard® is a registered trademark of Jason A. Donenfeld.
+"""
+
+import errno
+import json
+from datetime import datetime
+from unittest.mock import Mock
+
+import pytest
+
+from phantom.api.exceptions import NetworkError, ServiceOperationError, ValidationError
+from phantom.models.base import CommandResult
+from phantom.modules.core.lib import WireGuardConfigFile
+from phantom.modules.core.lib.data_store import DataStore
+from phantom.modules.core.lib.network_admin_helpers import FirewallOperations, IPOperations, MigrationOperations
+from phantom.modules.core.models import WireGuardClient
+
+SERVER_CONFIG = """[Interface]
+PrivateKey = server
+Address = 10.8.0.1/24
+ListenPort = 51820
+PostUp = iptables -A FORWARD -i %i -j ACCEPT
+
+[Peer] # alice
+PublicKey = alice_pub
+AllowedIPs = 10.8.0.2/32
+
+[Peer] # bob
+PublicKey = bob_pub
+AllowedIPs = 10.8.0.5/32
+"""
+
+IPTABLES_SAVE = """*nat
+:POSTROUTING ACCEPT [0:0]
+-A POSTROUTING -s 10.8.0.0/24 -o eth0 -j MASQUERADE
+COMMIT
+"""
+
+
+class FakeSystem:
+    """Records commands and answers them like a running wg_main interface."""
+
+    def __init__(self):
+        self.commands = []
+        self.inputs = {}
+        self.addresses = {"10.8.0.1/24"}
+        self.fail = set()
+
+    def __call__(self, command, **kwargs):
+        line = " ".join(command)
+        self.commands.append(line)
+        if "input" in kwargs:
+            self.inputs.setdefault(command[0], []).append(kwargs["input"])
+        if command[0] in self.fail:
+            return CommandResult(success=False, stderr="failed", returncode=1)
+        if command[:3] == ["ip", "-4", "address"]:
+            (self.addresses.add if command[3] == "replace" else self.addresses.discard)(command[4])
+        if command[:3] == ["ip", "addr", "show"]:
+            return CommandResult(success=True, stdout="\n".join(f"inet {a}" for a in self.addresses))
+        if command[0] == "iptables-save":
+            return CommandResult(success=True, stdout=IPTABLES_SAVE)
+        return CommandResult(success=True)
+
+    def ran(self, prefix):
+        return [line for line in self.commands if line.startswith(prefix)]
+
+
+@pytest.fixture
+def migration(tmp_path):
+    (tmp_path / "config").mkdir()
+    (tmp_path / "config" / "phantom.json").write_text(json.dumps({"wireguard": {"network": "10.8.0.0/24"}}))
+    data_dir = tmp_path / "data"
+    data_dir.mkdir()
+    backup_dir = tmp_path / "backups"
+    backup_dir.mkdir()
+    wg_path = tmp_path / "wg_main.conf"
+    wg_path.write_text(SERVER_CONFIG)
+
+    store = DataStore(db_path=data_dir / "clients.db", data_dir=data_dir, subnet="10.8.0.0/24")
+    for name, ip in (("alice", "10.8.0.2"), ("bob", "10.8.0.5")):
+        store.store_new_client(WireGuardClient(name=name, ip=ip, private_key="", public_key=f"{name}_pub",
+                                               preshared_key="", created=datetime.now()))
+
+    system = FakeSystem()
+    config = {"wireguard": {"network": "10.8.0.0/24"}}
+    operations = MigrationOperations(
+        data_store=store, common_tools=Mock(), service_monitor=Mock(), config=config, save_config=Mock(),
+        run_command=system, wg_interface="wg_main", wg_config_file=wg_path, install_dir=tmp_path,
+        data_dir=data_dir, backup_dir=backup_dir, subnet_ops=Mock(), ip_ops=IPOperations(store, config),
+        firewall_ops=FirewallOperations(system, "wg_main", analyze_interface=lambda: {"interface": "eth0"}),
+        state_ops=Mock(), wg_config=WireGuardConfigFile(wg_path)
+    )
+    yield operations, system, store, config
+    store.close()
+
+
+class TestLiveMigration:
+
+    @pytest.mark.integration
+    def test_live_migration_keeps_interface_up(self, migration):
+        """Test that peers are re-addressed in one syncconf with both addresses during the grace period."""
+        operations, system, store, config = migration
+
+        result = operations.execute_network_migration_typed("10.9.0.0/24", force=True, mode="live",
+                                                            grace_period=600)
+
+        assert result["mode"] == "live" and result["cleanup_scheduled"] is True
+        assert system.ran("systemctl stop wg-quick") == [] and system.ran("systemctl start") == []
+        assert system.addresses == {"10.8.0.1/24", "10.9.0.1/24"}
+
+        assert len(system.ran("wg syncconf")) == 1
+        synced = system.inputs["wg"][0]
+        assert "AllowedIPs = 10.9.0.2/32, 10.8.0.2/32" in synced
+        assert "AllowedIPs = 10.9.0.3/32, 10.8.0.5/32" in synced
+        assert "Address" not in synced and "PostUp" not in synced
+
+        # Configuration file and database hold the final state only
+        assert "Address = 10.9.0.1/24" in operations.wg_config_file.read_text()
+        assert {c.name: c.ip for c in store.get_all_clients()} == {"alice": "10.9.0.2", "bob": "10.9.0.3"}
+        assert config["wireguard"]["network"] == "10.9.0.0/24"
+        assert config["wireguard"]["pending_migration"]["old_address"] == "10.8.0.1/24"
+
+        # New MASQUERADE rule added, old one kept until the cleanup
+        restore = system.inputs["iptables-restore"][0]
+        assert "-A POSTROUTING -s 10.9.0.0/24 -o eth0 -j MASQUERADE" in restore
+        assert "-D POSTROUTING" not in restore
+
+        assert system.ran("systemd-run --unit=phantom-subnet-cleanup --on-active=600")
+        assert set(result["phase_timings"]) == {"backup", "remap", "address_add", "server_config", "peer_sync",
+                                                "database", "main_config", "firewall", "verify", "cleanup"}
+
+    @pytest.mark.integration
+    def test_finalize_removes_old_subnet(self, migration):
+        """Test that the cleanup drops old AllowedIPs, the old address and the old NAT rule."""
+        operations, system, _, config = migration
+        operations.execute_network_migration_typed("10.9.0.0/24", force=True, mode="live", grace_period=600)
+
+        result = operations.finalize_network_migration_typed()
+
+        assert result["finalized"] is True and result["old_subnet"] == "10.8.0.0/24"
+        assert "10.8.0." not in system.inputs["wg"][-1]
+        assert system.addresses == {"10.9.0.1/24"}
+        assert "-D POSTROUTING -s 10.8.0.0/24 -o eth0 -j MASQUERADE" in system.inputs["iptables-restore"][-1]
+        assert "pending_migration" not in config["wireguard"]
+        assert operations.finalize_network_migration_typed()["finalized"] is False
+
+    @pytest.mark.integration
+    def test_zero_grace_period_cleans_up_at_once(self, migration):
+        operations, system, _, config = migration
+
+        result = operations.execute_network_migration_typed("10.9.0.0/24", force=True, mode="live",
+                                                            grace_period=0)
+
+        assert result["cleanup_scheduled"] is False
+        assert system.ran("systemd-run") == []
+        assert system.addresses == {"10.9.0.1/24"}
+        assert "pending_migration" not in config["wireguard"]
+
+    @pytest.mark.integration
+    def test_failed_sync_rolls_back(self, migration):
+        """Test that a rejected syncconf restores the backup instead of leaving a half migration."""
+        operations, system, store, _ = migration
+        system.fail.add("wg")
+
+        with pytest.raises(NetworkError):
+            operations.execute_network_migration_typed("10.9.0.0/24", force=True, mode="live")
+
+        assert system.ran("systemctl start wg-quick@wg_main")
+        assert operations.wg_config_file.read_text() == SERVER_CONFIG
+        assert {c.ip for c in store.get_all_clients()} == {"10.8.0.2", "10.8.0.5"}
+
+    @pytest.mark.integration
+    def test_invalid_mode(self, migration):
+        operations, _, _, _ = migration
+
+        with pytest.raises(ValidationError):
+            operations.execute_network_migration_typed("10.9.0.0/24", force=True, mode="hot")
+
+
+class TestBulkDatabaseUpdate:
+
+    @pytest.mark.integration
+    def test_single_transaction(self, migration):
+        """Test that client rows are remapped through one bulk update."""
+        _, _, store, config = migration
+        store.update_all_client_ips = Mock()
+
+        IPOperations(store, config).update_client_database_with_new_ips(
+            {"10.8.0.1": "10.9.0.1", "10.8.0.2": "10.9.0.2", "10.8.0.5": "10.8.0.5"}
+        )
+
+        store.update_all_client_ips.assert_called_once_with({"alice": "10.9.0.2"})
+
+
+class TestBackupRestore:
+
+    @pytest.mark.integration
+    def test_restore_backup_undoes_migration(self, migration, monkeypatch):
+        """Test that restoring the migration backup brings files, rows and subnet back."""
+        operations, system, store, config = migration
+        monkeypatch.setattr("time.sleep", lambda seconds: None)
+        result = operations.execute_network_migration_typed("10.9.0.0/24", force=True, mode="live",
+                                                            grace_period=0)
+
+        with pytest.raises(ValidationError):
+            operations.restore_backup_typed(result["backup_id"])
+        restored = operations.restore_backup_typed(result["backup_id"], force=True)
+
+        assert restored["restored_files"] == ["wireguard_config", "main_config", "clients_db"]
+        assert operations.wg_config_file.read_text() == SERVER_CONFIG
+        assert {c.ip for c in store.get_all_clients()} == {"10.8.0.2", "10.8.0.5"}
+        assert config["wireguard"]["network"] == "10.8.0.0/24"
+        assert str(store.network) == "10.8.0.0/24"
+        assert system.ran("systemctl start wg-quick@wg_main")
+
+        listing = operations.list_backups_typed()
+        assert [b["label"] for b in listing["backups"]] == ["pre_restore", "subnet_change"]
+        assert listing["backups"][0]["id"] == restored["safety_backup_id"]
+        assert listing["stored_bytes"] < listing["logical_bytes"]
+
+    @pytest.mark.integration
+    def test_backup_failure_names_path(self, migration, monkeypatch):
+        """Test that a failed backup keeps the OS error and the path that caused it."""
+        operations = migration[0]
+        error = OSError(errno.ENOSPC, "No space left on device", "/opt/phantom-wg/backups/objects/ab")
+
+        def fail(*args, **kwargs):
+            raise error
+
+        monkeypatch.setattr(operations.backup_store, "create", fail)
+        with pytest.raises(ServiceOperationError) as excinfo:
+            operations.create_comprehensive_migration_backup()
+
+        assert excinfo.value.__cause__ is error
+        assert "No space left on device (/opt/phantom-wg/backups/objects/ab)" in str(excinfo.value)
+
+    @pytest.mark.integration
+    def test_restore_reports_firewall_failure(self, migration, monkeypatch):
+        """Test that firewall rules left on the migrated subnet are reported, not hidden."""
+        operations, _, _, config = migration
+        monkeypatch.setattr("time.sleep", lambda seconds: None)
+        result = operations.execute_network_migration_typed("10.9.0.0/24", force=True, mode="live",
+                                                            grace_period=0)
+
+        def fail(old_network, new_network):
+            raise OSError("ufw not available")
+
+        monkeypatch.setattr(operations.firewall_ops, "update_firewall_rules_for_new_subnet", fail)
+        restored = operations.restore_backup_typed(result["backup_id"], force=True)
+
+        assert config["wireguard"]["network"] == "10.8.0.0/24"
+        assert len(restored["warnings"]) == 1
+        assert "10.9.0.0/24 to 10.8.0.0/24: ufw not available" in restored["warnings"][0]
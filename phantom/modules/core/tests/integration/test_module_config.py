@@ -0,0 +1,66 @@
+"""
+██████╗ ██╗  ██╗ █████╗ ███╗   ██╗████████╗ ██████╗ ███╗   ███╗
+██╔══██╗██║  ██║██╔══██╗████╗  ██║╚══██╔══╝██╔═══██╗████╗ ████║
+██████╔╝███████║███████║██╔██╗ ██║   ██║   ██║   ██║██╔████╔██║
+██╔═══╝ ██╔══██║██╔══██║██║╚██╗██║   ██║   ██║   ██║██║╚██╔╝██║
+██║     ██║  ██║██║  ██║██║ ╚████║   ██║   ╚██████╔╝██║ ╚═╝ ██║
+╚═╝     ╚═╝  ╚═╝╚═╝  ╚═╝╚═╝  ╚═══╝   ╚═╝    ╚═════╝ ╚═╝     ╚═╝
+
+CoreModule Configuration Integration Tests
+
+Copyright (c) 2025 Rıza Emre ARAS <r.emrearas@proton.me>
+Licensed under AGPL-3.0 - see LICENSE file for details
+Third-party licenses - see THIRD_PARTY_LICENSES file for details
+WireGuard® is a registered trademark of Jason A. Donenfeld.
+"""
+
+import json
+import logging
+
+import pytest
+
+from phantom.modules.core.lib.default_constants import KEY_BACKEND_NATIVE, KEY_BACKEND_WG
+from phantom.modules.core.module import CoreModule
+
+
+def make_core(tmp_path, config):
+    config_dir = tmp_path / "config"
+    config_dir.mkdir(exist_ok=True)
+    (config_dir / "phantom.json").write_text(json.dumps(config))
+    (tmp_path / "data").mkdir(exist_ok=True)
+    return CoreModule(install_dir=tmp_path, wg_config_file=tmp_path / "wg_main.conf")
+
+
+class TestCoreModuleConfig:
+
+    @pytest.mark.integration
+    def test_unknown_key_backend_falls_back_to_native(self, tmp_path, caplog):
+        """Test that a mistyped key backend does not prevent the module from loading."""
+        with caplog.at_level(logging.WARNING, logger="phantom.core"):
+            core = make_core(tmp_path, {"wireguard": {"key_backend": "openssl"}})
+
+        assert core.key_generator.backend == KEY_BACKEND_NATIVE
+        assert "openssl" in caplog.text
+
+    @pytest.mark.integration
+    def test_configured_key_backend_is_used(self, tmp_path):
+        core = make_core(tmp_path, {"wireguard": {"key_backend": KEY_BACKEND_WG}})
+        assert core.key_generator.backend == KEY_BACKEND_WG
+
+    @pytest.mark.integration
+    def test_external_edit_refreshes_runtime_settings(self, tmp_path):
+        """Test that a phantom.json edited by another process reaches the derived settings."""
+        config = {"wireguard": {"network": "10.8.0.0/24", "key_backend": KEY_BACKEND_NATIVE},
+                  "tweaks": {"restart_service_after_client_creation": False}}
+        core = make_core(tmp_path, config)
+        assert core.data_store.allocate_next_available_ip() == "10.8.0.2"
+
+        config["wireguard"].update(network="10.9.0.0/24", key_backend=KEY_BACKEND_WG)
+        config["tweaks"]["restart_service_after_client_creation"] = True
+        (tmp_path / "config" / "phantom.json").write_text(json.dumps(config))
+        assert core.config_service.poll() is True
+
+        assert core.restart_service_after_client_creation is True
+        assert core.client_handler.core_module.restart_service_after_client_creation is True
+        assert core.key_generator.public_key_provider == KEY_BACKEND_WG
+        assert core.data_store.allocate_next_available_ip() == "10.9.0.2"
@@ -0,0 +1,193 @@
+"""
+██████╗ ██╗  ██╗ █████╗ ███╗   ██╗████████╗ ██████╗ ███╗   ███╗
+██╔══██╗██║  ██║██╔══██╗████╗  ██║╚══██╔══╝██╔═══██╗████╗ ████║
+██████╔╝███████║███████║██╔██╗ ██║   ██║   ██║   ██║██╔████╔██║
+██╔═══╝ ██╔══██║██╔══██║██║╚██╗██║   ██║   ██║   ██║██║╚██╔╝██║
+██║     ██║  ██║██║  ██║██║ ╚████║   ██║   ╚██████╔╝██║ ╚═╝ ██║
+╚═╝     ╚═╝  ╚═╝╚═╝  ╚═╝╚═╝  ╚═══╝   ╚═╝    ╚═════╝ ╚═╝     ╚═╝
+
+PeerStateReader Integration Tests
+
+Copyright (c) 2025 Rıza Emre ARAS <r.emrearas@proton.me>
+Licensed under AGPL-3.0 - see LICENSE file for details
+Third-party licenses - see THIRD_PARTY_LICENSES file for details
+WireGuard® is a registered trademark of Jason A. Donenfeld.
+"""
+
+import errno
+from datetime import datetime
+from pathlib import Path
+from unittest.mock import Mock
+
+import pytest
+
+from phantom.models.base import CommandResult
+from phantom.modules.core.lib import PeerStateReader, ServiceMonitor
+from phantom.modules.core.lib.peer_state import format_handshake_age, format_transfer_bytes
+from phantom.modules.core.models import WireGuardClient
+
+NOW = 1_700_000_000
+
+DUMP = "\n".join([
+    "cHJpdmF0ZQ==\tU0VSVkVSX1BVQkxJQw==\t51820\toff",
+    f"QUxJQ0U=\t(none)\t203.0.113.5:40000\t10.8.0.2/32\t{NOW - 63}\t1536\t2097152\toff",
+    "Qk9C\tcHNr\t(none)\t10.8.0.3/32,fd00::3/128\t0\t0\t0\t25",
+    f"Q0FST0w=\t(none)\t198.51.100.7:5555\t10.8.0.4/32\t{NOW - 5}\t512\t100\toff",
+]) + "\n"
+
+
+class TestFormatting:
+
+    @pytest.mark.integration
+    @pytest.mark.parametrize("seconds, expected", [
+        (0, "Now"),
+        (1, "1 second ago"),
+        (63, "1 minute, 3 seconds ago"),
+        (3600 * 2 + 1, "2 hours, 1 second ago"),
+        (365 * 86400 + 86400, "1 year, 1 day ago"),
+    ])
+    def test_handshake_age(self, seconds, expected):
+        """Test that handshake ages match the wg show wording."""
+        assert format_handshake_age(seconds) == expected
+
+    @pytest.mark.integration
+    @pytest.mark.parametrize("value, expected", [
+        (0, "0 B"),
+        (1023, "1023 B"),
+        (1536, "1.50 KiB"),
+        (2097152, "2.00 MiB"),
+        (5 * 1024 ** 4, "5.00 TiB"),
+    ])
+    def test_transfer_bytes(self, value, expected):
+        """Test that byte counters match the wg show wording."""
+        assert format_transfer_bytes(value) == expected
+
+
+class TestPeerStateReader:
+
+    @pytest.mark.integration
+    def test_parse_dump(self):
+        """Test parsing of interface and peer lines into typed records."""
+        dump = PeerStateReader.parse_dump("wg_main", DUMP, now=NOW)
+
+        assert dump.public_key == "U0VSVkVSX1BVQkxJQw=="
+        assert dump.listen_port == 51820
+        assert dump.fwmark is None
+        assert len(dump.peers) == 3
+
+        alice, bob, _ = dump.peers
+        assert alice.latest_handshake_epoch == NOW - 63
+        assert alice.latest_handshake == "1 minute, 3 seconds ago"
+        assert alice.endpoint == "203.0.113.5:40000"
+        assert alice.transfer.received_bytes == 1536
+        assert alice.transfer.sent == "2.00 MiB"
+        assert alice.persistent_keepalive is None
+
+        assert bob.latest_handshake_epoch == 0
+        assert bob.latest_handshake is None
+        assert bob.endpoint is None
+        assert bob.allowed_ips == "10.8.0.3/32, fd00::3/128"
+        assert bob.persistent_keepalive == 25
+
+    @pytest.mark.integration
+    def test_read_dump_single_command(self):
+        """Test that reading state costs exactly one wg invocation."""
+        run_command = Mock(return_value=CommandResult(success=True, stdout=DUMP))
+
+        dump = PeerStateReader(run_command, "wg_main").read_dump()
+
+        assert len(dump.peers) == 3
+        run_command.assert_called_once_with(["wg", "show", "wg_main", "dump"])
+
+    @pytest.mark.integration
+    def test_unavailable_interface(self):
+        """Test that a failing or empty dump yields None."""
+        failing = Mock(return_value=CommandResult(success=False, stderr="Unable to access interface"))
+
+        assert PeerStateReader(failing, "wg_main").read_dump() is None
+        assert PeerStateReader.parse_dump("wg_main", "") is None
+
+
+    @pytest.mark.integration
+    def test_latest_handshakes_in_process(self, monkeypatch):
+        """Test that handshakes come from netlink without starting wg."""
+        run_command = Mock()
+        monkeypatch.setattr("phantom.modules.core.lib.peer_state._netlink.latest_handshakes",
+                            lambda interface: [NOW - 63, 0])
+
+        assert PeerStateReader(run_command, "wg_main").latest_handshakes() == [NOW - 63, 0]
+        run_command.assert_not_called()
+
+    @pytest.mark.integration
+    def test_latest_handshakes_falls_back_to_wg(self, monkeypatch):
+        """Test the UAPI socket and then 'wg show latest-handshakes' when netlink is unavailable."""
+        def unavailable(interface, *args):
+            raise OSError(errno.ENODEV, "No such device")
+
+        monkeypatch.setattr("phantom.modules.core.lib.peer_state._netlink.latest_handshakes", unavailable)
+        monkeypatch.setattr("phantom.modules.core.lib.peer_state.read_uapi_handshakes", unavailable)
+        output = f"QUxJQ0U=\t{NOW - 63}\nQk9C\t0\n"
+        run_command = Mock(return_value=CommandResult(success=True, stdout=output))
+
+        assert PeerStateReader(run_command, "wg_main").latest_handshakes() == [NOW - 63, 0]
+        run_command.assert_called_once_with(["wg", "show", "wg_main", "latest-handshakes"])
+
+        run_command.return_value = CommandResult(success=False, stderr="Unable to access interface")
+        assert PeerStateReader(run_command, "wg_main").latest_handshakes() is None
+
+
+class TestServiceMonitorPeerState:
+
+    @pytest.fixture
+    def monitor(self):
+        data_store = Mock()
+        data_store.get_all_clients.return_value = [
+            WireGuardClient(name="alice", ip="10.8.0.2", private_key="", public_key="QUxJQ0U=",
+                            preshared_key="", created=datetime.now()),
+            WireGuardClient(name="carol", ip="10.8.0.4", private_key="", public_key="other",
+                            preshared_key="", created=datetime.now()),
+        ]
+        run_command = Mock(return_value=CommandResult(success=True, stdout=DUMP))
+        monitor = ServiceMonitor(
+            data_store=data_store, common_tools=Mock(), config={}, run_command=run_command,
+            wg_interface="phantom-test-none", wg_config_file=Path("/nonexistent"),
+            install_dir=Path("/nonexistent")
+        )
+        return monitor, run_command
+
+    @pytest.mark.integration
+    def test_interface_statistics(self, monitor):
+        """Test that statistics come from the dump without human text parsing."""
+        service_monitor, run_command = monitor
+
+        stats = service_monitor.gather_interface_statistics()
+
+        assert stats["active"] is True
+        assert stats["port"] == 51820
+        assert stats["peers"][0]["transfer"]["received_bytes"] == 1536
+        commands = [call.args[0] for call in run_command.call_args_list]
+        assert commands[0] == ["wg", "show", "phantom-test-none", "dump"]
+        assert ["wg", "show", "phantom-test-none"] not in commands
+
+    @pytest.mark.integration
+    def test_active_connections_use_epoch(self, monitor, monkeypatch):
+        """Test handshake recency from epochs and name mapping by key or IP."""
+        service_monitor, run_command = monitor
+        monkeypatch.setattr("time.time", lambda: NOW)
+
+        active = service_monitor.gather_active_connections()
+
+        # alice matched by public key, carol by allowed IP, bob never connected
+        assert set(active) == {"alice", "carol"}
+        assert active["alice"]["transfer"]["sent_bytes"] == 2097152
+        assert active["carol"]["latest_handshake"] == "5 seconds ago"
+        run_command.assert_called_once()
+
+    @pytest.mark.integration
+    def test_latest_handshakes(self, monitor):
+        """Test the public key to epoch map used by prune_clients."""
+        service_monitor, _ = monitor
+
+        handshakes = service_monitor.gather_latest_handshakes()
+
+        assert handshakes == {"QUxJQ0U=": NOW - 63, "Qk9C": 0, "Q0FST0w=": NOW - 5}
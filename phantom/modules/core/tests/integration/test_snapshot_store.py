@@ -0,0 +1,204 @@
+"""
+██████╗ ██╗  ██╗ █████╗ ███╗   ██╗████████╗ ██████╗ ███╗   ███╗
+██╔══██╗██║  ██║██╔══██╗████╗  ██║╚══██╔══╝██╔═══██╗████╗ ████║
+██████╔╝███████║███████║██╔██╗ ██║   ██║   ██║   ██║██╔████╔██║
+██╔═══╝ ██╔══██║██╔══██║██║╚██╗██║   ██║   ██║   ██║██║╚██╔╝██║
+██║     ██║  ██║██║  ██║██║ ╚████║   ██║   ╚██████╔╝██║ ╚═╝ ██║
+╚═╝     ╚═╝  ╚═╝╚═╝  ╚═╝╚═╝  ╚═══╝   ╚═╝    ╚═════╝ ╚═╝     ╚═╝
+
+SnapshotStore Integration Tests
+
+Copyright (c) 2025 Rıza Emre ARAS <r.emrearas@proton.me>
+Licensed under AGPL-3.0 - see LICENSE file for details
+Third-party licenses - see THIRD_PARTY_LICENSES file for details
+WireGuard® is a registered trademark of Jason A. Donenfeld.
+"""
+
+import errno
+import hashlib
+import json
+import os
+import stat
+from datetime import datetime, timedelta
+from unittest.mock import patch
+
+import pytest
+
+from phantom.api.exceptions import ValidationError
+from phantom.modules.dns.module import DnsModule
+from phantom.modules.snapshot_store import CHUNK_SIZE, CLONE_RANGE, SnapshotStore
+
+
+def age(path, seconds=60):
+    """Move the mtime out of the racy window so the stat signature is trusted."""
+    info = path.stat()
+    os.utime(path, ns=(info.st_atime_ns, info.st_mtime_ns - seconds * 1_000_000_000))
+
+
+@pytest.fixture
+def files(tmp_path):
+    database = tmp_path / "clients.db"
+    database.write_bytes(b"".join(bytes([index]) * CHUNK_SIZE for index in range(5)))
+    config = tmp_path / "phantom.json"
+    config.write_text(json.dumps({"wireguard": {"network": "10.8.0.0/24"}}))
+    os.chmod(config, 0o640)
+    for path in (database, config):
+        age(path)
+    return {"clients_db": database, "main_config": config}
+
+
+class TestSnapshotStore:
+
+    @pytest.mark.integration
+    def test_unchanged_files_not_stored_again(self, tmp_path, files):
+        """Test that a second snapshot of unchanged files writes nothing and reads nothing."""
+        store = SnapshotStore(tmp_path / "backups")
+        first = store.create("subnet_change", files, source="core")
+        assert first.new_bytes == files["clients_db"].stat().st_size + files["main_config"].stat().st_size
+
+        with patch("builtins.open", side_effect=AssertionError("file was read")):
+            second = store.create("subnet_change", files, data={"firewall_rules": b"{}"})
+
+        assert second.id != first.id
+        assert second.new_bytes == 2
+        assert store.usage()["logical_bytes"] == 2 * first.size + 2
+
+    @pytest.mark.integration
+    def test_only_changed_chunks_stored(self, tmp_path, files):
+        """Test that an in-place page change costs one chunk, not the whole file."""
+        store = SnapshotStore(tmp_path / "backups")
+        store.create("subnet_change", files)
+
+        with open(files["clients_db"], "r+b") as f:
+            f.seek(3 * CHUNK_SIZE + 100)
+            f.write(b"changed")
+        snapshot = store.create("subnet_change", files)
+
+        assert snapshot.new_bytes == CHUNK_SIZE
+        assert len(snapshot.file("clients_db").chunks) == 5
+        assert store.usage()["objects"] == 5 + 1 + 1
+
+    @pytest.mark.integration
+    def test_extract_round_trip(self, tmp_path, files):
+        """Test that restored files match byte for byte and keep their mode."""
+        store = SnapshotStore(tmp_path / "backups")
+        original = files["clients_db"].read_bytes()
+        snapshot = store.create("subnet_change", files, data={"firewall_rules": b'{"ufw": {}}'})
+
+        files["clients_db"].write_bytes(b"broken")
+        files["main_config"].unlink()
+        store.extract(snapshot.id, "clients_db")
+        store.extract(snapshot.id, "main_config")
+
+        assert files["clients_db"].read_bytes() == original
+        assert stat.S_IMODE(files["main_config"].stat().st_mode) == 0o640
+        assert store.read(snapshot.id, "firewall_rules") == b'{"ufw": {}}'
+        with pytest.raises(ValidationError):
+            store.extract(snapshot.id, "firewall_rules")
+
+    @pytest.mark.integration
+    def test_retention_and_garbage_collection(self, tmp_path, files):
+        """Test count and age retention per label and removal of unreferenced chunks."""
+        store = SnapshotStore(tmp_path / "backups", keep_last=2, max_age_days=None)
+        ids = []
+        for index in range(4):
+            files["main_config"].write_text(json.dumps({"revision": index}))
+            ids.append(store.create("subnet_change", files).id)
+        ghost = store.create("ghost_enable", {"main_config": files["main_config"]}).id
+
+        assert [s.id for s in store.list("subnet_change")] == ids[:1:-1]
+        assert store.usage()["objects"] == 5 + 2
+        with pytest.raises(ValidationError):
+            store.get(ids[1])
+
+        # Age limit, but the newest snapshot of each label stays
+        old = (datetime.now() - timedelta(days=90)).isoformat()
+        for snapshot_id in (ids[3], ghost):
+            manifest = store.snapshots_dir / f"{snapshot_id}.json"
+            data = json.loads(manifest.read_text())
+            manifest.write_text(json.dumps({**data, "created": old}))
+        result = store.prune(max_age_days=30)
+
+        assert result.removed == []
+        assert {s.id for s in store.list()} == {ids[2], ids[3], ghost}
+
+    @pytest.mark.integration
+    def test_store_is_private(self, tmp_path, files):
+        store = SnapshotStore(tmp_path / "backups")
+        snapshot = store.create("subnet_change", files)
+
+        chunk = snapshot.file("main_config").chunks[0]
+        for path in (store.snapshots_dir / f"{snapshot.id}.json", store.objects_dir / chunk[:2] / chunk[2:]):
+            assert stat.S_IMODE(path.stat().st_mode) == 0o600
+
+    @pytest.mark.integration
+    def test_clone_of_changed_source_is_not_kept(self, tmp_path, files):
+        """Test that an object cloned after the source changed still matches its digest."""
+        store = SnapshotStore(tmp_path / "backups")
+        database = files["clients_db"]
+        clones = []
+
+        def clone_after_write(dst_fd, request, arg):
+            src_fd, src_offset, length, dst_offset = CLONE_RANGE.unpack(arg)
+            # A writer changes the live file between the read and the clone
+            with open(database, "r+b") as f:
+                f.seek(src_offset)
+                f.write(b"late write")
+            os.pwrite(dst_fd, os.pread(src_fd, length, src_offset), dst_offset)
+            clones.append(src_offset)
+
+        with patch("phantom.modules.snapshot_store.fcntl.ioctl", side_effect=clone_after_write):
+            snapshot = store.create("subnet_change", {"clients_db": database})
+
+        assert len(clones) == 5
+        for digest in snapshot.file("clients_db").chunks:
+            content = (store.objects_dir / digest[:2] / digest[2:]).read_bytes()
+            assert hashlib.sha256(content).hexdigest() == digest
+        assert store.read(snapshot.id, "clients_db") == b"".join(bytes([i]) * CHUNK_SIZE for i in range(5))
+
+    @pytest.mark.integration
+    def test_einval_copies_only_that_chunk(self, tmp_path, files):
+        """Test that a rejected clone range does not turn reflinks off for the store."""
+        store = SnapshotStore(tmp_path / "backups")
+        calls = []
+
+        def clone(dst_fd, request, arg):
+            src_fd, src_offset, length, dst_offset = CLONE_RANGE.unpack(arg)
+            calls.append(src_offset)
+            if src_offset == 0:
+                raise OSError(errno.EINVAL, "Invalid argument")
+            os.pwrite(dst_fd, os.pread(src_fd, length, src_offset), dst_offset)
+
+        with patch("phantom.modules.snapshot_store.fcntl.ioctl", side_effect=clone):
+            snapshot = store.create("subnet_change", {"clients_db": files["clients_db"]})
+            assert store._reflink is True
+
+            with patch("phantom.modules.snapshot_store.fcntl.ioctl",
+                       side_effect=OSError(errno.EOPNOTSUPP, "Operation not supported")):
+                store.create("ghost_mode", {"main_config": files["main_config"]})
+            assert store._reflink is False
+
+        assert calls == [index * CHUNK_SIZE for index in range(5)]
+        assert store.read(snapshot.id, "clients_db") == files["clients_db"].read_bytes()
+
+    @pytest.mark.integration
+    def test_invalid_label(self, tmp_path, files):
+        with pytest.raises(ValidationError):
+            SnapshotStore(tmp_path / "backups").create("../escape", files)
+
+
+class TestModuleSnapshots:
+
+    @pytest.mark.integration
+    def test_module_records_config_before_change(self, tmp_path):
+        """Test that modules record phantom.json in the shared store under their name."""
+        config_file = tmp_path / "config" / "phantom.json"
+        config_file.parent.mkdir()
+        config_file.write_text(json.dumps({"dns": {"primary": "1.1.1.1", "secondary": "1.0.0.1"}}))
+        module = DnsModule(install_dir=tmp_path)
+
+        backup_id = module._snapshot_state("dns_change")
+
+        snapshot = SnapshotStore(tmp_path / "backups").get(backup_id)
+        assert snapshot.source == "dns"
+        assert [f.name for f in snapshot.files] == ["main_config"]
@@ -0,0 +1,147 @@
+"""
+██████╗ ██╗  ██╗ █████╗ ███╗   ██╗████████╗ ██████╗ ███╗   ███╗
+██╔══██╗██║  ██║██╔══██╗████╗  ██║╚══██╔══╝██╔═══██╗████╗ ████║
+██████╔╝███████║███████║██╔██╗ ██║   ██║   ██║   ██║██╔████╔██║
+██╔═══╝ ██╔══██║██╔══██║██║╚██╗██║   ██║   ██║   ██║██║╚██╔╝██║
+██║     ██║  ██║██║  ██║██║ ╚████║   ██║   ╚██████╔╝██║ ╚═╝ ██║
+╚═╝     ╚═╝  ╚═╝╚═╝  ╚═╝╚═╝  ╚═══╝   ╚═╝    ╚═════╝ ╚═╝     ╚═╝
+
+StateCache Integration Tests
+
+Copyright (c) 2025 Rıza Emre ARAS <r.emrearas@proton.me>
+Licensed under AGPL-3.0 - see LICENSE file for details
+Third-party licenses - see THIRD_PARTY_LICENSES file for details
+WireGuard® is a registered trademark of Jason A. Donenfeld.
+"""
+
+from datetime import datetime
+from unittest.mock import Mock, patch
+
+import pytest
+
+from phantom.models.base import CommandResult
+from phantom.modules.core.lib import DataStore, CommonTools, ClientHandler, StateCache
+from phantom.modules.core.models import WireGuardClient
+
+DUMP = "cHJpdmF0ZQ==\tU0VSVkVSX1BVQkxJQw==\t51820\toff\n"
+
+
+def _client(name: str, ip: str) -> WireGuardClient:
+    return WireGuardClient(name=name, ip=ip, private_key="k", public_key=f"pub_{name}",
+                           preshared_key="p", created=datetime.now())
+
+
+@pytest.fixture
+def data_store(tmp_path):
+    store = DataStore(db_path=tmp_path / "clients.db", data_dir=tmp_path, subnet="10.8.0.0/24")
+    yield store
+    store.close()
+
+
+class TestClientCache:
+
+    @pytest.mark.integration
+    def test_loaded_once_per_request(self, data_store):
+        """Test that repeated reads inside a request hit the database once."""
+        data_store.store_new_client(_client("alice", "10.8.0.2"))
+        cache = StateCache()
+
+        with patch.object(data_store, "get_all_clients", wraps=data_store.get_all_clients) as loader:
+            with cache.request_scope():
+                first = cache.get_clients(data_store)
+                second = cache.get_clients(data_store)
+
+        assert [c.name for c in first] == [c.name for c in second] == ["alice"]
+        assert first is not second
+        loader.assert_called_once()
+
+    @pytest.mark.integration
+    def test_write_invalidates(self, data_store):
+        """Test that a write inside the request changes the token and reloads."""
+        cache = StateCache()
+
+        with cache.request_scope():
+            assert cache.get_clients(data_store) == []
+            with data_store.transaction():
+                data_store.store_new_client(_client("bob", "10.8.0.3"))
+            assert [c.name for c in cache.get_clients(data_store)] == ["bob"]
+            data_store.store_new_client(_client("carol", "10.8.0.4"))
+            assert len(cache.get_clients(data_store)) == 2
+
+    @pytest.mark.integration
+    def test_no_cache_outside_request(self, data_store):
+        """Test that direct library use always reads fresh data."""
+        cache = StateCache()
+
+        with patch.object(data_store, "get_all_clients", return_value=[]) as loader:
+            cache.get_clients(data_store)
+            cache.get_clients(data_store)
+            with cache.request_scope():
+                cache.get_clients(data_store)
+            with cache.request_scope():
+                cache.get_clients(data_store)
+
+        assert loader.call_count == 4
+
+
+class TestPeerStateCache:
+
+    @pytest.mark.integration
+    def test_ttl_and_invalidation(self):
+        """Test that snapshots are reused within the TTL and dropped on invalidate."""
+        now = [100.0]
+        cache = StateCache(peer_state_ttl=2.0, clock=lambda: now[0])
+        loader = Mock(side_effect=lambda: object())
+
+        with cache.request_scope():
+            first = cache.get_peer_state(loader)
+            now[0] += 1.5
+            assert cache.get_peer_state(loader) is first
+            now[0] += 1.0
+            second = cache.get_peer_state(loader)
+            assert second is not first
+            cache.invalidate_peer_state()
+            cache.get_peer_state(loader)
+
+        assert loader.call_count == 3
+
+    @pytest.mark.integration
+    def test_missing_interface_cached(self):
+        """Test that a None snapshot (interface down) is cached as well."""
+        cache = StateCache()
+        loader = Mock(return_value=None)
+
+        with cache.request_scope():
+            assert cache.get_peer_state(loader) is None
+            assert cache.get_peer_state(loader) is None
+
+        loader.assert_called_once()
+
+
+class TestSharedAcrossComponents:
+
+    @pytest.mark.integration
+    def test_single_dump_per_request(self, tmp_path, data_store):
+        """Test that the handler and its monitor share one dump and one client read."""
+        config = {"wireguard": {"network": "10.8.0.0/24"}, "tweaks": {}}
+        run_command = Mock(return_value=CommandResult(success=True, stdout=DUMP))
+        data_store.store_new_client(_client("alice", "10.8.0.2"))
+        handler = ClientHandler(
+            data_store=data_store, key_generator=Mock(),
+            common_tools=CommonTools(config=config, run_command=run_command),
+            config=config, run_command=run_command, wg_interface="wg_main",
+            wg_config_file=tmp_path / "wg_main.conf", install_dir=tmp_path
+        )
+
+        with patch.object(data_store, "get_all_clients", wraps=data_store.get_all_clients) as loader:
+            with handler.state_cache.request_scope():
+                handler.list_all_clients()
+                handler.service_monitor.calculate_client_statistics()
+                handler.service_monitor.gather_active_connections()
+                handler.service_monitor.calculate_client_statistics()
+                handler.service_monitor.gather_interface_statistics()
+
+        dumps = [call for call in run_command.call_args_list
+                 if call.args[0] == ["wg", "show", "wg_main", "dump"]]
+        assert len(dumps) == 1
+        loader.assert_called_once()
@@ -0,0 +1,127 @@
+"""
+██████╗ ██╗  ██╗ █████╗ ███╗   ██╗████████╗ ██████╗ ███╗   ███╗
+██╔══██╗██║  ██║██╔══██╗████╗  ██║╚══██╔══╝██╔═══██╗████╗ ████║
+██████╔╝███████║███████║██╔██╗ ██║   ██║   ██║   ██║██╔████╔██║
+██╔═══╝ ██╔══██║██╔══██║██║╚██╗██║   ██║   ██║   ██║██║╚██╔╝██║
+██║     ██║  ██║██║  ██║██║ ╚████║   ██║   ╚██████╔╝██║ ╚═╝ ██║
+╚═╝     ╚═╝  ╚═╝╚═╝  ╚═╝╚═╝  ╚═══╝   ╚═╝    ╚═════╝ ╚═╝     ╚═╝
+
+Status Snapshot Integration Tests
+
+Copyright (c) 2025 Rıza Emre ARAS <r.emrearas@proton.me>
+Licensed under AGPL-3.0 - see LICENSE file for details
+Third-party licenses - see THIRD_PARTY_LICENSES file for details
+WireGuard® is a registered trademark of Jason A. Donenfeld.
+"""
+
+import json
+import sqlite3
+import time
+from datetime import datetime
+from pathlib import Path
+from unittest.mock import Mock
+
+import pytest
+
+from phantom.models.base import CommandResult
+from phantom.modules.core.lib import ServiceMonitor
+from phantom.modules.core.models import WireGuardClient
+from phantom.modules.core.module import CoreModule
+
+
+@pytest.fixture
+def monitor(tmp_path):
+    clients = [WireGuardClient(name="alice", ip="10.8.0.2", private_key="", public_key="QUxJQ0U=",
+                               preshared_key="", created=datetime.now())]
+    data_store = Mock()
+    data_store.get_all_clients.return_value = clients
+    data_store.change_token.return_value = (1, 0, 0)
+
+    state = {"up": True, "commands": []}
+    recent = int(time.time()) - 10
+
+    def run_command(command):
+        state["commands"].append(command[0])
+        if command[0] == "systemctl":
+            return CommandResult(success=True, stdout="active\n" if state["up"] else "inactive\n")
+        if not state["up"]:
+            return CommandResult(success=False, stderr="Unable to access interface")
+        lines = ["cHJpdmF0ZQ==\tU0VSVkVS\t51820\toff",
+                 f"QUxJQ0U=\t(none)\t203.0.113.5:40000\t10.8.0.2/32\t{recent}\t2048\t1024\toff",
+                 "Qk9C\t(none)\t(none)\t10.8.0.3/32\t0\t0\t0\toff"]
+        return CommandResult(success=True, stdout="\n".join(lines) + "\n")
+
+    service_monitor = ServiceMonitor(
+        data_store=data_store, common_tools=Mock(), config={}, run_command=run_command,
+        wg_interface="wg_main", wg_config_file=Path("/nonexistent"), install_dir=tmp_path
+    )
+    return service_monitor, data_store, state
+
+
+class TestStatusSnapshot:
+
+    @pytest.mark.integration
+    def test_sample_peers_and_service(self, monitor):
+        """Test that one sample reports connection state and raw counters per peer."""
+        service_monitor, _, state = monitor
+
+        status = service_monitor.sample_status().to_dict()
+
+        assert state["commands"] == ["systemctl", "wg"]
+        assert status["interface"] == {"name": "wg_main", "active": True, "port": 51820}
+        assert status["service"] == {"running": True}
+        alice = status["peers"]["QUxJQ0U="]
+        assert (alice["client"], alice["connected"], alice["rx"], alice["tx"]) == ("alice", True, 2048, 1024)
+        assert alice["endpoint"] == "203.0.113.5:40000"
+        assert status["peers"]["Qk9C"]["client"] is None
+        assert status["peers"]["Qk9C"]["connected"] is False
+
+    @pytest.mark.integration
+    def test_sample_without_service_and_client_cache(self, monitor):
+        """Test that the service check is optional and client names are loaded once per DB change."""
+        service_monitor, data_store, state = monitor
+
+        for _ in range(3):
+            status = service_monitor.sample_status(include_service=False).to_dict()
+        assert status["service"] is None
+        assert state["commands"] == ["wg"] * 3
+        assert data_store.get_all_clients.call_count == 1
+
+        data_store.change_token.return_value = (2, 0, 0)
+        service_monitor.sample_status(include_service=False)
+        assert data_store.get_all_clients.call_count == 2
+
+    @pytest.mark.integration
+    def test_interface_down(self, monitor):
+        service_monitor, _, state = monitor
+        state["up"] = False
+
+        status = service_monitor.sample_status().to_dict()
+
+        assert status["interface"]["active"] is False
+        assert status["service"] == {"running": False}
+        assert status["peers"] == {}
+
+    @pytest.mark.integration
+    def test_status_sampler_has_own_read_only_store(self, tmp_path):
+        """Test that the daemon's sampler shares no connection or manager with requests."""
+        (tmp_path / "config").mkdir()
+        (tmp_path / "data").mkdir()
+        (tmp_path / "config" / "phantom.json").write_text(json.dumps({"wireguard": {"network": "10.8.0.0/24"}}))
+        core = CoreModule(install_dir=tmp_path, wg_config_file=tmp_path / "wg_main.conf")
+
+        sampler = core.create_status_sampler()
+        assert sampler is not core.service_monitor
+        assert sampler.data_store is not core.data_store
+        assert sampler.data_store.db is not core.data_store.db
+
+        core.data_store.store_new_client(WireGuardClient(name="alice", ip="10.8.0.2", private_key="",
+                                                         public_key="QUxJQ0U=", preshared_key="",
+                                                         created=datetime.now()))
+        dump = "cHJpdg==\tU0VSVkVS\t51820\toff\nQUxJQ0U=\t(none)\t(none)\t10.8.0.2/32\t0\t0\t0\toff\n"
+        sampler._run_command = lambda command: CommandResult(success=True, stdout=dump)
+        assert sampler.sample_status(include_service=False).to_dict()["peers"]["QUxJQ0U="]["client"] == "alice"
+
+        with pytest.raises(sqlite3.OperationalError):
+            sampler.data_store.remove_existing_client("alice")
+        sampler.data_store.close()
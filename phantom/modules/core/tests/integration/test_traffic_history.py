@@ -0,0 +1,207 @@
+"""
+██████╗ ██╗  ██╗ █████╗ ███╗   ██╗████████╗ ██████╗ ███╗   ███╗
+██╔══██╗██║  ██║██╔══██╗████╗  ██║╚══██╔══╝██╔═══██╗████╗ ████║
+██████╔╝███████║███████║██╔██╗ ██║   ██║   ██║   ██║██╔████╔██║
+██╔═══╝ ██╔══██║██╔══██║██║╚██╗██║   ██║   ██║   ██║██║╚██╔╝██║
+██║     ██║  ██║██║  ██║██║ ╚████║   ██║   ╚██████╔╝██║ ╚═╝ ██║
+╚═╝     ╚═╝  ╚═╝╚═╝  ╚═╝╚═╝  ╚═══╝   ╚═╝    ╚═════╝ ╚═╝     ╚═╝
+
+TrafficHistory Integration Tests
+
+Copyright (c) 2025 Rıza Emre ARAS <r.emrearas@proton.me>
+Licensed under AGPL-3.0 - see LICENSE file for details
+Third-party licenses - see THIRD_PARTY_LICENSES file for details
+WireGuard® is a registered trademark of Jason A. Donenfeld.
+"""
+
+import stat
+from datetime import datetime
+from pathlib import Path
+from unittest.mock import Mock
+
+import pytest
+
+from phantom.api.exceptions import ClientNotFoundError, ValidationError
+from phantom.models.base import CommandResult
+from phantom.modules.core.lib import ServiceMonitor, TrafficHistory
+from phantom.modules.core.lib.traffic_history import HEADER, RECORD, TrafficRing, peer_filename
+from phantom.modules.core.models import InterfaceDump, PeerInfo, TransferStats, WireGuardClient
+
+START = 1_700_000_000 - 1_700_000_000 % 86400  # midnight UTC
+INTERVAL = 300
+GIB = 1024 ** 3
+
+
+def make_dump(counters, now):
+    """InterfaceDump with raw (rx, tx) counters per public key."""
+    return InterfaceDump(
+        interface="wg_main", public_key="server", listen_port=51820, fwmark=None, read_at=now,
+        peers=[PeerInfo(public_key=key, allowed_ips="", transfer=TransferStats(
+            received="", sent="", received_bytes=rx, sent_bytes=tx)) for key, (rx, tx) in counters.items()]
+    )
+
+
+class TestTrafficRing:
+
+    @pytest.mark.integration
+    def test_file_is_fixed_size_and_private(self, tmp_path):
+        """Test that a ring has a fixed size on disk whatever the samples written."""
+        path = tmp_path / "peer.ring"
+        ring = TrafficRing(path, capacity=4, interval=INTERVAL)
+        for index in range(10):
+            ring.append(START + index * INTERVAL, index * 100, index * 10)
+
+        assert path.stat().st_size == HEADER.size + 4 * RECORD.size
+        assert stat.S_IMODE(path.stat().st_mode) == 0o600
+        assert len(ring) == 4
+        assert ring.written == 10
+        # Oldest kept record is the 7th sample
+        assert ring.totals(START, START + 9 * INTERVAL) == (300, 30)
+        ring.close()
+
+        # Reopening keeps the header and the data
+        reopened = TrafficRing(path)
+        assert (reopened.capacity, reopened.interval, reopened.written) == (4, INTERVAL, 10)
+        reopened.close()
+
+    @pytest.mark.integration
+    def test_counter_reset_corrected(self, tmp_path):
+        """Test that an interface restart does not produce negative or lost traffic."""
+        ring = TrafficRing(tmp_path / "peer.ring", capacity=16, interval=INTERVAL)
+
+        assert ring.append(START, 5000, 500) is False
+        assert ring.append(START + INTERVAL, 8000, 900) is False
+        # Interface restarted: counters start from zero again
+        assert ring.append(START + 2 * INTERVAL, 1000, 50) is True
+        assert ring.append(START + 3 * INTERVAL, 4000, 150) is False
+
+        assert ring.totals(START, START + 3 * INTERVAL) == (3000 + 1000 + 3000, 400 + 50 + 100)
+        ring.close()
+
+    @pytest.mark.integration
+    def test_rollup_buckets(self, tmp_path):
+        """Test that hourly buckets add up to the window total."""
+        ring = TrafficRing(tmp_path / "peer.ring", capacity=64, interval=INTERVAL)
+        for index in range(37):  # three hours of samples, 1 MB per interval
+            ring.append(START + index * INTERVAL, index * 1_000_000, 0)
+
+        buckets = list(ring.rollup(START, START + 3 * 3600, 3600))
+
+        assert [start for start, _, _ in buckets] == [START, START + 3600, START + 7200]
+        assert [rx for _, rx, _ in buckets] == [12_000_000] * 3
+        assert sum(rx for _, rx, _ in buckets) == ring.totals(START, START + 3 * 3600)[0]
+        ring.close()
+
+
+class TestTrafficHistory:
+
+    @pytest.mark.integration
+    def test_collect_and_query(self, tmp_path):
+        """Test sampling a dump and querying totals per peer."""
+        history = TrafficHistory(tmp_path / "traffic", capacity=32, interval=INTERVAL)
+
+        first = history.collect(make_dump({"a/b+c=": (0, 0), "other=": (0, 0)}, START))
+        history.collect(make_dump({"a/b+c=": (2 * GIB, GIB), "other=": (10, 10)}, START + INTERVAL))
+        early = history.collect(make_dump({"a/b+c=": (3 * GIB, GIB), "other=": (10, 10)}, START + INTERVAL + 5))
+
+        assert first == {"sampled": 2, "skipped": 0, "resets": 0, "created": 2, "pruned": 0}
+        assert early["skipped"] == 2
+        assert (tmp_path / "traffic" / peer_filename("a/b+c=")).exists()
+        assert history.peers() == ["a/b+c=", "other="]
+        assert history.totals(START, START + INTERVAL) == {"a/b+c=": (2 * GIB, GIB), "other=": (10, 10)}
+
+        # The skipped sample is carried into the next one
+        history.collect(make_dump({"a/b+c=": (3 * GIB, GIB), "other=": (10, 10)}, START + 2 * INTERVAL))
+        (rx, tx), buckets = history.usage("a/b+c=", START, START + 2 * INTERVAL, "hour")
+        assert (rx, tx) == (3 * GIB, GIB)
+        assert buckets == [(START, 3 * GIB, GIB)]
+
+    @pytest.mark.integration
+    def test_stale_peers_pruned(self, tmp_path):
+        """Test that rings of peers gone for the retention period are deleted."""
+        history = TrafficHistory(tmp_path / "traffic", capacity=4, interval=INTERVAL)
+        history.collect(make_dump({"gone=": (1, 1), "kept=": (1, 1)}, START))
+
+        result = history.collect(make_dump({"kept=": (2, 2)}, START + 5 * INTERVAL))
+
+        assert result["pruned"] == 1
+        assert history.peers() == ["kept="]
+
+    @pytest.mark.integration
+    def test_invalid_bucket(self, tmp_path):
+        history = TrafficHistory(tmp_path / "traffic")
+
+        with pytest.raises(ValidationError):
+            history.usage("peer=", 0, 1, "week")
+
+
+class TestServiceMonitorTraffic:
+
+    @pytest.fixture
+    def monitor(self, tmp_path, monkeypatch):
+        clients = [
+            WireGuardClient(name="alice", ip="10.8.0.2", private_key="", public_key="QUxJQ0U=",
+                            preshared_key="", created=datetime.now()),
+            WireGuardClient(name="bob", ip="10.8.0.3", private_key="", public_key="Qk9C",
+                            preshared_key="", created=datetime.now()),
+        ]
+        data_store = Mock()
+        data_store.get_all_clients.return_value = clients
+        data_store.find_client_by_name.side_effect = lambda name: next((c for c in clients if c.name == name), None)
+
+        counters = {"rx": 0}
+        clock = {"now": START + 30 * 86400}
+
+        def run_command(command):
+            lines = ["cHJpdmF0ZQ==\tU0VSVkVS\t51820\toff",
+                     f"QUxJQ0U=\t(none)\t(none)\t10.8.0.2/32\t0\t{counters['rx']}\t{counters['rx'] // 2}\toff",
+                     f"Qk9C\t(none)\t(none)\t10.8.0.3/32\t0\t{counters['rx'] // 4}\t0\toff",
+                     "UkVNT1ZFRA==\t(none)\t(none)\t10.8.0.9/32\t0\t100\t100\toff"]
+            return CommandResult(success=True, stdout="\n".join(lines) + "\n")
+
+        monkeypatch.setattr("time.time", lambda: clock["now"])
+        service_monitor = ServiceMonitor(
+            data_store=data_store, common_tools=Mock(), config={}, run_command=run_command,
+            wg_interface="wg_main", wg_config_file=Path("/nonexistent"), install_dir=tmp_path,
+            traffic_history=TrafficHistory(tmp_path / "traffic", capacity=64, interval=INTERVAL)
+        )
+
+        def sample(rx):
+            counters["rx"] = rx
+            result = service_monitor.sample_peer_traffic()
+            clock["now"] += INTERVAL
+            return result
+
+        return service_monitor, sample
+
+    @pytest.mark.integration
+    def test_client_usage_and_top_talkers(self, monitor):
+        """Test usage reports and ranking by total traffic with client names."""
+        service_monitor, sample = monitor
+        sample(0)
+        sample(200 * GIB)
+        result = sample(300 * GIB)
+
+        assert result.sampled == 3
+        usage = service_monitor.summarize_client_usage("alice", period="24h", bucket="day").to_dict()
+        assert usage["received_bytes"] == 300 * GIB
+        assert usage["sent_bytes"] == 150 * GIB
+        assert usage["received"] == "300.00 GiB"
+        assert sum(b["total_bytes"] for b in usage["buckets"]) == 450 * GIB
+
+        top = service_monitor.rank_top_talkers(period="30d", limit=2).to_dict()
+        assert [t["client_name"] for t in top["talkers"]] == ["alice", "bob"]
+        assert top["talkers"][0]["total"] == "450.00 GiB"
+        assert top["peers_tracked"] == 3
+
+        everyone = service_monitor.rank_top_talkers(period="all").to_dict()
+        assert everyone["talkers"][-1]["client_name"] is None
+
+    @pytest.mark.integration
+    def test_unknown_client_and_period(self, monitor):
+        service_monitor, _ = monitor
+
+        with pytest.raises(ClientNotFoundError):
+            service_monitor.summarize_client_usage("nobody")
+        with pytest.raises(ValidationError):
+            service_monitor.rank_top_talkers(period="fortnight")
@@ -0,0 +1,215 @@
+"""
+██████╗ ██╗  ██╗ █████╗ ███╗   ██╗████████╗ ██████╗ ███╗   ███╗
+██╔══██╗██║  ██║██╔══██╗████╗  ██║╚══██╔══╝██╔═══██╗████╗ ████║
+██████╔╝███████║███████║██╔██╗ ██║   ██║   ██║   ██║██╔████╔██║
+██╔═══╝ ██╔══██║██╔══██║██║╚██╗██║   ██║   ██║   ██║██║╚██╔╝██║
+██║     ██║  ██║██║  ██║██║ ╚████║   ██║   ╚██████╔╝██║ ╚═╝ ██║
+╚═╝     ╚═╝  ╚═╝╚═╝  ╚═╝╚═╝  ╚═══╝   ╚═╝    ╚═════╝ ╚═╝     ╚═╝
+
+WireGuardConfig Integration Tests
+
+Copyright (c) 2025 Rıza Emre ARAS <r.emrearas@proton.me>
+Licensed under AGPL-3.0 - see LICENSE file for details
+Third-party licenses - see THIRD_PARTY_LICENSES file for details
+WireGuard® is a registered trademark of Jason A. Donenfeld.
+"""
+
+import ipaddress
+import os
+from unittest.mock import Mock, patch
+
+import pytest
+
+from phantom.modules.core.lib import WireGuardConfig, WireGuardConfigFile
+from phantom.modules.core.lib.network_admin_helpers import MigrationOperations
+
+SERVER_CONFIG = """# Managed by Phantom-WG
+[Interface]
+PrivateKey = server
+Address = 10.8.0.1/24
+ListenPort = 51820
+PostUp = iptables -A FORWARD -i %i -j ACCEPT  # keep forwarding
+
+[Peer] # alice
+PublicKey = alice_pub
+PresharedKey = alice_psk
+AllowedIPs = 10.8.0.2/32
+
+# bob uses a laptop
+[Peer] # bob
+PublicKey = bob_pub
+PresharedKey = bob_psk
+AllowedIPs = 10.8.0.3/32, fd00::3/128
+PersistentKeepalive = 25
+"""
+
+
+class TestWireGuardConfig:
+
+    @pytest.mark.integration
+    def test_round_trip_is_byte_identical(self):
+        """Test that parsing and rendering an untouched file changes nothing."""
+        assert WireGuardConfig.parse(SERVER_CONFIG).render() == SERVER_CONFIG
+        assert WireGuardConfig.parse("[Interface]\nListenPort = 1").render() == "[Interface]\nListenPort = 1"
+
+    @pytest.mark.integration
+    def test_strip_for_syncconf(self):
+        """Test that strip() keeps wg(8) keys only and appends extra AllowedIPs."""
+        stripped = WireGuardConfig.parse(SERVER_CONFIG).strip({"alice_pub": ["10.7.0.2/32"]})
+
+        assert stripped == (
+            "[Interface]\nPrivateKey = server\nListenPort = 51820\n\n"
+            "[Peer]\nPublicKey = alice_pub\nPresharedKey = alice_psk\nAllowedIPs = 10.8.0.2/32, 10.7.0.2/32\n\n"
+            "[Peer]\nPublicKey = bob_pub\nPresharedKey = bob_psk\nAllowedIPs = 10.8.0.3/32, fd00::3/128\n"
+            "PersistentKeepalive = 25\n\n"
+        )
+
+    @pytest.mark.integration
+    def test_peer_index(self):
+        """Test ordered peers and lookups by public key and IP."""
+        config = WireGuardConfig.parse(SERVER_CONFIG)
+
+        assert [p.public_key for p in config.peers()] == ["alice_pub", "bob_pub"]
+        assert config.get_peer("bob_pub").comment == "bob"
+        assert config.find_peer_by_ip("10.8.0.3").public_key == "bob_pub"
+        assert config.find_peer_by_ip("fd00::3/128").public_key == "bob_pub"
+        assert config.find_peer_by_ip("10.8.0.9") is None
+        assert config.interface.get("PostUp") == "iptables -A FORWARD -i %i -j ACCEPT"
+
+    @pytest.mark.integration
+    def test_add_matches_legacy_format(self):
+        """Test that added peers look exactly like the previously appended text."""
+        config = WireGuardConfig.parse(SERVER_CONFIG)
+
+        config.add_client_peer("carol", "carol_pub", "carol_psk", "10.8.0.4")
+
+        assert config.render() == SERVER_CONFIG + (
+            "\n[Peer] # carol\nPublicKey = carol_pub\nPresharedKey = carol_psk\nAllowedIPs = 10.8.0.4/32\n\n"
+        )
+        assert config.find_peer_by_ip("10.8.0.4").comment == "carol"
+        with pytest.raises(ValueError):
+            config.add_client_peer("carol", "carol_pub", "x", "10.8.0.5")
+
+    @pytest.mark.integration
+    def test_remove_keeps_other_sections(self):
+        """Test that removal drops only the peer's own lines."""
+        config = WireGuardConfig.parse(SERVER_CONFIG)
+
+        assert config.remove_peer_by_ip("10.8.0.2") is True
+        assert config.remove_peer_by_ip("10.8.0.2") is False
+        assert config.remove_peer("unknown") is False
+
+        content = config.render()
+        assert "alice" not in content
+        assert "\n# bob uses a laptop\n[Peer] # bob\n" in content  # leading comment stays with bob
+        assert content.startswith(SERVER_CONFIG.split("[Peer] # alice")[0])
+        assert content.endswith("PersistentKeepalive = 25\n")
+        assert len(config) == 1
+
+    @pytest.mark.integration
+    def test_update_in_place(self):
+        """Test that updates rewrite one line and re-index the addresses."""
+        config = WireGuardConfig.parse(SERVER_CONFIG)
+
+        assert config.update_peer("bob_pub", allowed_ips=["10.9.0.3/32"]) is True
+
+        content = config.render()
+        assert "AllowedIPs = 10.9.0.3/32\nPersistentKeepalive = 25\n" in content
+        assert config.find_peer_by_ip("10.8.0.3") is None
+        assert config.find_peer_by_ip("10.9.0.3").public_key == "bob_pub"
+        assert config.update_peer("unknown", allowed_ips=[]) is False
+
+
+class TestWireGuardConfigFile:
+
+    @pytest.mark.integration
+    def test_parsed_once_until_changed(self, tmp_path):
+        """Test that the model is cached until the file changes on disk."""
+        path = tmp_path / "wg_main.conf"
+        path.write_text(SERVER_CONFIG)
+        config_file = WireGuardConfigFile(path)
+
+        with patch.object(WireGuardConfig, "parse", wraps=WireGuardConfig.parse) as parse:
+            first = config_file.load()
+            assert config_file.load() is first
+            parse.assert_called_once()
+
+            path.write_text(SERVER_CONFIG.replace("alice", "dave"))
+            reloaded = config_file.load()
+
+        assert reloaded is not first
+        assert reloaded.get_peer("dave_pub") is not None
+
+    @pytest.mark.integration
+    def test_atomic_save(self, tmp_path):
+        """Test that saving replaces the file with mode 600 and leaves no temp files."""
+        path = tmp_path / "wg_main.conf"
+        path.write_text(SERVER_CONFIG)
+        config_file = WireGuardConfigFile(path)
+
+        config = config_file.load()
+        config.remove_peer("alice_pub")
+        config_file.save(config)
+
+        assert "alice" not in path.read_text()
+        assert (path.stat().st_mode & 0o777) == 0o600
+        assert os.listdir(tmp_path) == ["wg_main.conf"]
+        assert config_file.load() is config
+
+    @pytest.mark.integration
+    def test_failed_save_keeps_file(self, tmp_path):
+        """Test that a failed write leaves the file and discards the cached change."""
+        path = tmp_path / "wg_main.conf"
+        path.write_text(SERVER_CONFIG)
+        config_file = WireGuardConfigFile(path)
+        config = config_file.load()
+        config.remove_peer("alice_pub")
+
+        with patch("os.replace", side_effect=OSError("read-only file system")):
+            with pytest.raises(OSError):
+                config_file.save(config)
+
+        assert path.read_text() == SERVER_CONFIG
+        assert os.listdir(tmp_path) == ["wg_main.conf"]
+        assert "alice_pub" in config_file.load()
+
+    @pytest.mark.integration
+    def test_missing_file(self, tmp_path):
+        """Test that a missing file loads empty and is created on save."""
+        config_file = WireGuardConfigFile(tmp_path / "wg_main.conf")
+
+        config = config_file.load()
+        assert len(config) == 0
+        config.add_client_peer("alice", "alice_pub", "alice_psk", "10.8.0.2")
+        config_file.save(config)
+
+        assert (tmp_path / "wg_main.conf").read_text().startswith("[Peer] # alice\n")
+
+
+class TestMigrationUsesModel:
+
+    @pytest.mark.integration
+    def test_subnet_change_rewrites_addresses_only(self, tmp_path):
+        """Test that subnet migration remaps addresses and keeps everything else."""
+        path = tmp_path / "wg_main.conf"
+        path.write_text(SERVER_CONFIG)
+        config_file = WireGuardConfigFile(path)
+        migration = MigrationOperations(
+            data_store=Mock(), common_tools=Mock(), service_monitor=Mock(),
+            config={"wireguard": {"network": "10.8.0.0/24"}}, save_config=Mock(), run_command=Mock(),
+            wg_interface="wg_main", wg_config_file=path, install_dir=tmp_path, data_dir=tmp_path,
+            backup_dir=tmp_path, subnet_ops=Mock(), ip_ops=Mock(), firewall_ops=Mock(), state_ops=Mock(),
+            wg_config=config_file
+        )
+
+        migration.update_server_network_configuration(
+            ipaddress.IPv4Network("10.9.0.0/24"),
+            {"10.8.0.1": "10.9.0.1", "10.8.0.2": "10.9.0.2", "10.8.0.3": "10.9.0.3"}
+        )
+
+        expected = (SERVER_CONFIG
+                    .replace("Address = 10.8.0.1/24", "Address = 10.9.0.1/24")
+                    .replace("AllowedIPs = 10.8.0.2/32", "AllowedIPs = 10.9.0.2/32")
+                    .replace("AllowedIPs = 10.8.0.3/32", "AllowedIPs = 10.9.0.3/32"))
+        assert path.read_text() == expected
+        assert config_file.load().find_peer_by_ip("10.9.0.2").public_key == "alice_pub"
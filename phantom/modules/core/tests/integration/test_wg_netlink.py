@@ -0,0 +1,132 @@
+"""
+██████╗ ██╗  ██╗ █████╗ ███╗   ██╗████████╗ ██████╗ ███╗   ███╗
+██╔══██╗██║  ██║██╔══██╗████╗  ██║╚══██╔══╝██╔═══██╗████╗ ████║
+██████╔╝███████║███████║██╔██╗ ██║   ██║   ██║   ██║██╔████╔██║
+██╔═══╝ ██╔══██║██╔══██║██║╚██╗██║   ██║   ██║   ██║██║╚██╔╝██║
+██║     ██║  ██║██║  ██║██║ ╚████║   ██║   ╚██████╔╝██║ ╚═╝ ██║
+╚═╝     ╚═╝  ╚═╝╚═╝  ╚═╝╚═╝  ╚═══╝   ╚═╝    ╚═════╝ ╚═╝     ╚═╝
+
+WireGuard Netlink Parser Integration Tests
+
+Copyright (c) 2025 Rıza Emre ARAS <r.emrearas@proton.me>
+Licensed under AGPL-3.0 - see LICENSE file for details
+Third-party licenses - see THIRD_PARTY_LICENSES file for details
+WireGuard® is a registered trademark of Jason A. Donenfeld.
+"""
+
+import errno
+import socket
+import struct
+import threading
+
+import pytest
+
+from phantom.modules.core.lib.wg_netlink import (
+    GENL_HEADER, NLA_HEADER, NLMSG_DONE, NLMSG_ERROR, NLMSG_HEADER, NLM_F_MULTI,
+    WGDEVICE_A_IFNAME, WGDEVICE_A_PEERS, WGPEER_A_LAST_HANDSHAKE_TIME,
+    pack_nla, parse_device_handshakes, parse_messages, parse_nla, parse_uapi_handshakes, read_uapi_handshakes
+)
+
+NESTED = 0x8000
+
+
+def message(msg_type, sequence, body=b"", flags=0):
+    return NLMSG_HEADER.pack(NLMSG_HEADER.size + len(body), msg_type, flags, sequence, 0) + body
+
+
+def device_payload(*handshakes):
+    peers = b"".join(
+        pack_nla(NESTED | index, pack_nla(WGPEER_A_LAST_HANDSHAKE_TIME, struct.pack("=qq", epoch, 0)))
+        for index, epoch in enumerate(handshakes)
+    )
+    return pack_nla(WGDEVICE_A_IFNAME, b"wg_main\0") + pack_nla(NESTED | WGDEVICE_A_PEERS, peers)
+
+
+class TestAttributes:
+
+    @pytest.mark.integration
+    def test_round_trip_with_padding(self):
+        """Test that values of any length are padded to 4 bytes and read back unpadded."""
+        data = pack_nla(1, b"abc") + pack_nla(NESTED | 2, b"") + pack_nla(3, b"wireguard\0")
+
+        assert len(data) % 4 == 0
+        assert list(parse_nla(data)) == [(1, b"abc"), (2, b""), (3, b"wireguard\0")]
+
+    @pytest.mark.integration
+    def test_malformed_attribute_stops_parsing(self):
+        """Test that a truncated or zero-length header ends the walk instead of looping."""
+        truncated = pack_nla(1, b"ok") + NLA_HEADER.pack(64, 2) + b"short"
+        zero_length = pack_nla(1, b"ok") + NLA_HEADER.pack(0, 2)
+
+        assert list(parse_nla(truncated)) == [(1, b"ok")]
+        assert list(parse_nla(zero_length)) == [(1, b"ok")]
+
+    @pytest.mark.integration
+    def test_device_handshakes(self):
+        """Test that nested peer attributes yield one epoch per peer."""
+        payloads = [device_payload(1_700_000_000, 0), device_payload(1_700_000_100)]
+
+        assert parse_device_handshakes(payloads) == [1_700_000_000, 0, 1_700_000_100]
+
+
+class TestMessages:
+
+    @pytest.mark.integration
+    def test_multipart_dump(self):
+        """Test that a dump is complete only after NLMSG_DONE and foreign messages are skipped."""
+        header = GENL_HEADER.pack(0, 1, 0)
+        first = message(0x20, 7, header + b"one\0", NLM_F_MULTI) + message(0x20, 99, header + b"oth\0", NLM_F_MULTI)
+        second = message(0x20, 7, header + b"two\0", NLM_F_MULTI) + message(NLMSG_DONE, 7, b"\0" * 4, NLM_F_MULTI)
+
+        assert parse_messages(first, 7) == ([b"one\0"], False)
+        assert parse_messages(second, 7) == ([b"two\0"], True)
+
+    @pytest.mark.integration
+    def test_single_reply_and_ack(self):
+        header = GENL_HEADER.pack(0, 1, 0)
+
+        assert parse_messages(message(0x10, 1, header + b"data"), 1) == ([b"data"], True)
+        assert parse_messages(message(NLMSG_ERROR, 1, struct.pack("=i", 0)), 1) == ([], True)
+
+    @pytest.mark.integration
+    def test_error_reply_raises(self):
+        """Test that a negative errno from the kernel becomes an OSError."""
+        with pytest.raises(OSError) as excinfo:
+            parse_messages(message(NLMSG_ERROR, 3, struct.pack("=i", -errno.ENODEV)), 3)
+        assert excinfo.value.errno == errno.ENODEV
+
+
+class TestUapi:
+
+    @pytest.mark.integration
+    def test_parse_answer(self):
+        answer = ("private_key=00\nlisten_port=51820\npublic_key=aa\nlast_handshake_time_sec=1700000000\n"
+                  "last_handshake_time_nsec=5\npublic_key=bb\nlast_handshake_time_sec=0\nerrno=0\n\n")
+
+        assert parse_uapi_handshakes(answer) == [1_700_000_000, 0]
+
+    @pytest.mark.integration
+    def test_missing_socket_raises(self, tmp_path):
+        with pytest.raises(OSError):
+            read_uapi_handshakes("wg_missing", uapi_dir=tmp_path)
+
+    @pytest.mark.integration
+    def test_read_from_socket(self, tmp_path):
+        """Test the get=1 exchange against a UAPI socket."""
+        server = socket.socket(socket.AF_UNIX, socket.SOCK_STREAM)
+        server.bind(str(tmp_path / "wg_go.sock"))
+        server.listen(1)
+
+        def answer():
+            conn, _ = server.accept()
+            with conn:
+                assert conn.recv(64) == b"get=1\n\n"
+                conn.sendall(b"public_key=aa\nlast_handshake_time_sec=42\nerrno=0\n\n")
+
+        thread = threading.Thread(target=answer)
+        thread.start()
+        try:
+            assert read_uapi_handshakes("wg_go", uapi_dir=tmp_path) == [42]
+        finally:
+            thread.join(timeout=5)
+            server.close()
@@ -23,6 +23,8 @@ from phantom.modules.core.models.client_models import (
     ClientListResult,
     ClientRemoveResult,
     ClientExportResult,
+    BulkClientEntry,
+    BulkClientExportResult,
     LatestClientsResult
 )
 
@@ -462,6 +464,33 @@ AllowedIPs = 0.0.0.0/0"""
         assert dict_result["client"]["enabled"] is True
 
 
+class TestBulkClientExportResult:
+
+    def test_to_dict(self):
+        result = BulkClientExportResult(
+            results=[
+                BulkClientEntry(name="alice", success=True, ip="10.0.0.2", public_key="pub_alice"),
+                BulkClientEntry(name="ghost", success=False, error="Client 'ghost' not found")
+            ],
+            archive="/opt/phantom-wg/data/exports/phantom-clients.tar.gz",
+            format="tar",
+            exported=1,
+            failed=1,
+            rendered=0,
+            cache_hits=1,
+            qr_included=False,
+            size_bytes=512,
+            message="Exported 1 client configurations"
+        )
+
+        dict_result = result.to_dict()
+        assert dict_result["archive"].endswith(".tar.gz")
+        assert dict_result["exported"] == 1
+        assert dict_result["cache_hits"] == 1
+        assert dict_result["results"][0]["ip"] == "10.0.0.2"
+        assert dict_result["results"][1]["error"] == "Client 'ghost' not found"
+
+
 class TestLatestClientsResult:
 
     def test_init_empty(self):
@@ -17,11 +17,13 @@ WireGuard® is a registered trademark of Jason A. Donenfeld.
 from phantom.modules.core.models.network_models import (
     TransferStats,
     PeerInfo,
+    InterfaceDump,
     NetworkInfo,
     SubnetChangeValidation,
     NetworkAnalysis,
     NetworkValidationResult,
     NetworkMigrationResult,
+    SubnetCleanupResult,
     MainInterfaceInfo
 )
 
@@ -163,6 +165,46 @@ class TestPeerInfo:
         assert restored.transfer.received == original.transfer.received
         assert restored.transfer.sent == original.transfer.sent
 
+    def test_raw_counters_round_trip(self):
+        transfer = TransferStats(received="1.50 KiB", sent="0 B", received_bytes=1536, sent_bytes=0)
+        peer = PeerInfo(
+            public_key="raw_key",
+            allowed_ips="10.0.0.9/32",
+            latest_handshake="Now",
+            transfer=transfer,
+            latest_handshake_epoch=1700000000,
+            persistent_keepalive=25
+        )
+        dict_form = peer.to_dict()
+
+        assert dict_form["latest_handshake_epoch"] == 1700000000
+        assert dict_form["transfer"] == {
+            "received": "1.50 KiB", "sent": "0 B", "received_bytes": 1536, "sent_bytes": 0
+        }
+        assert dict_form["persistent_keepalive"] == 25
+        assert PeerInfo.from_dict(dict_form) == peer
+
+
+class TestInterfaceDump:
+
+    def test_to_dict(self):
+        dump = InterfaceDump(
+            interface="wg_main",
+            public_key="server_key",
+            listen_port=51820,
+            fwmark=None,
+            peers=[PeerInfo(public_key="peer", allowed_ips="10.0.0.2/32", latest_handshake_epoch=0)],
+            read_at=1700000000.0
+        )
+        assert dump.to_dict() == {
+            "interface": "wg_main",
+            "public_key": "server_key",
+            "listen_port": 51820,
+            "fwmark": None,
+            "peers": [{"public_key": "peer", "allowed_ips": "10.0.0.2/32", "latest_handshake_epoch": 0}],
+            "read_at": 1700000000.0
+        }
+
 
 class TestNetworkInfo:
 
@@ -440,6 +482,40 @@ class TestNetworkMigrationResult:
         assert len(migration.ip_mapping) == 100
 
 
+    def test_live_to_dict(self):
+        migration = NetworkMigrationResult(
+            success=True,
+            old_subnet="10.8.0.0/24",
+            new_subnet="10.9.0.0/24",
+            clients_updated=1,
+            backup_id="subnet_change_1",
+            ip_mapping={"10.8.0.2": "10.9.0.2"},
+            mode="live",
+            strategy="preserve",
+            phase_timings={"peer_sync": 0.01},
+            cleanup_scheduled=True,
+            cleanup_at="2025-01-01T12:05:00"
+        )
+        result = migration.to_dict()
+        assert result["mode"] == "live"
+        assert result["strategy"] == "preserve"
+        assert result["phase_timings"] == {"peer_sync": 0.01}
+        assert result["cleanup_scheduled"] is True
+        assert result["cleanup_at"] == "2025-01-01T12:05:00"
+
+
+class TestSubnetCleanupResult:
+
+    def test_to_dict(self):
+        cleanup = SubnetCleanupResult(finalized=False, old_subnet=None, new_subnet=None)
+        assert cleanup.to_dict() == {
+            "finalized": False,
+            "old_subnet": None,
+            "new_subnet": None,
+            "phase_timings": {}
+        }
+
+
 class TestMainInterfaceInfo:
 
     def test_init(self):
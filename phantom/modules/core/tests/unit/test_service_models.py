@@ -23,7 +23,11 @@ from phantom.modules.core.models.service_models import (
     InterfaceStatistics,
     ServiceLogs,
     RestartResult,
-    ServiceHealth
+    ServiceHealth,
+    TrafficBucket,
+    ClientUsageResult,
+    TopTalker,
+    TopTalkersResult
 )
 
 
@@ -550,3 +554,48 @@ class TestServiceHealth:
         assert health_dict["clients"]["total_configured"] == 10
         assert health_dict["configuration"]["port"] == 51820
         assert health_dict["system"]["wireguard_module"] is True
+
+
+class TestClientUsageResult:
+
+    def test_to_dict_with_buckets(self):
+        usage = ClientUsageResult(
+            client_name="alice", public_key="pub_alice", period="month",
+            since="2025-01-01T00:00:00", until="2025-01-02T12:00:00",
+            received_bytes=3000, sent_bytes=1000, received="2.93 KiB", sent="1000 B",
+            bucket="day",
+            buckets=[TrafficBucket(start="2025-01-01T00:00:00", received_bytes=2000, sent_bytes=500),
+                     TrafficBucket(start="2025-01-02T00:00:00", received_bytes=1000, sent_bytes=500)]
+        )
+
+        data = usage.to_dict()
+
+        assert data["total_bytes"] == 4000
+        assert data["bucket"] == "day"
+        assert [b["total_bytes"] for b in data["buckets"]] == [2500, 1500]
+
+    def test_to_dict_totals_only(self):
+        usage = ClientUsageResult(
+            client_name="alice", public_key="pub_alice", period="24h", since="s", until="u",
+            received_bytes=0, sent_bytes=0, received="0 B", sent="0 B"
+        )
+
+        assert "buckets" not in usage.to_dict()
+
+
+class TestTopTalkersResult:
+
+    def test_to_dict(self):
+        result = TopTalkersResult(
+            period="30d", since="s", until="u", peers_tracked=5,
+            talkers=[TopTalker(rank=1, public_key="pub_alice", received_bytes=10, sent_bytes=5,
+                               total="15 B", client_name="alice"),
+                     TopTalker(rank=2, public_key="pub_removed", received_bytes=1, sent_bytes=1, total="2 B")]
+        )
+
+        data = result.to_dict()
+
+        assert data["count"] == 2
+        assert data["peers_tracked"] == 5
+        assert data["talkers"][0]["total_bytes"] == 15
+        assert data["talkers"][1]["client_name"] is None
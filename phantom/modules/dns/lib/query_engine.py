@@ -0,0 +1,331 @@
+"""
+██████╗ ██╗  ██╗ █████╗ ███╗   ██╗████████╗ ██████╗ ███╗   ███╗
+██╔══██╗██║  ██║██╔══██╗████╗  ██║╚══██╔══╝██╔═══██╗████╗ ████║
+██████╔╝███████║███████║██╔██╗ ██║   ██║   ██║   ██║██╔████╔██║
+██╔═══╝ ██╔══██║██╔══██║██║╚██╗██║   ██║   ██║   ██║██║╚██╔╝██║
+██║     ██║  ██║██║  ██║██║ ╚████║   ██║   ╚██████╔╝██║ ╚═╝ ██║
+╚═╝     ╚═╝  ╚═╝╚═╝  ╚═╝╚═╝  ╚═══╝   ╚═╝    ╚═════╝ ╚═╝     ╚═╝
+
+TR: DNS Modülü Sorgu Motoru
+    ========================
+
+    Ham UDP DNS sorgularını asyncio ile tüm sunuculara eşzamanlı gönderir.
+    Her sunucu için tek bir soket açılır, sorgu kimlikleri yanıtlarla
+    eşleştirilir ve gidiş-dönüş süresi yanıtın alındığı anda ölçülür.
+    Sonuçlardan kayıp oranı ve RTT yüzdelikleri (p50/p90/p99) hesaplanır.
+    Harici komut (dig/nslookup) gerektirmez.
+
+EN: DNS Module Query Engine
+    ========================
+
+    Sends raw UDP DNS queries to all servers concurrently with asyncio.
+    One socket is opened per server, query IDs are matched to responses and
+    the round-trip time is taken the moment a response arrives. Loss and
+    RTT percentiles (p50/p90/p99) are computed from the samples. No external
+    command (dig/nslookup) is required.
+
+Copyright (c) 2025 Rıza Emre ARAS <r.emrearas@proton.me>
+Licensed under AGPL-3.0 - see LICENSE file for details
+Third-party licenses - see THIRD_PARTY_LICENSES file for details
+WireGuard® is a registered trademark of Jason A. Donenfeld.
+"""
+
+import asyncio
+import ipaddress
+import random
+import socket
+import struct
+from dataclasses import dataclass, field
+from typing import Dict, List, Optional, Sequence, Tuple
+
+from ..models import DNSLatencyStats
+
+DNS_PORT = 53
+DNS_QUERY_TIMEOUT = 2.0  # seconds per query
+DNS_QUERY_COUNT = 5  # queries per server and domain
+DNS_QUERY_INTERVAL = 0.01  # seconds between queries sent to the same server
+
+QTYPE_A = 1
+QTYPE_CNAME = 5
+QTYPE_AAAA = 28
+QCLASS_IN = 1
+FLAG_RD = 0x0100
+FLAG_QR = 0x8000
+
+RCODE_NAMES = {
+    0: "NOERROR",
+    1: "FORMERR",
+    2: "SERVFAIL",
+    3: "NXDOMAIN",
+    4: "NOTIMP",
+    5: "REFUSED"
+}
+
+
+@dataclass
+class DNSResponse:
+    query_id: int
+    rcode: int
+    answers: List[str]
+
+    @property
+    def rcode_name(self) -> str:
+        return RCODE_NAMES.get(self.rcode, f"RCODE{self.rcode}")
+
+
+@dataclass
+class QueryOutcome:
+    domain: str
+    rtt_ms: Optional[float] = None
+    response: Optional[DNSResponse] = None
+    error: Optional[str] = None
+    timed_out: bool = False
+
+
+@dataclass
+class ServerBenchmark:
+    """All query outcomes of one server."""
+    server: str
+    outcomes: List[QueryOutcome] = field(default_factory=list)
+    timeout: float = DNS_QUERY_TIMEOUT
+
+    def for_domain(self, domain: str) -> List[QueryOutcome]:
+        return [outcome for outcome in self.outcomes if outcome.domain == domain]
+
+    def stats(self, domain: Optional[str] = None) -> DNSLatencyStats:
+        outcomes = self.outcomes if domain is None else self.for_domain(domain)
+        return summarize(len(outcomes), [o.rtt_ms for o in outcomes if o.rtt_ms is not None])
+
+    def status(self, domain: Optional[str] = None) -> Tuple[str, Optional[str]]:
+        """Classify as OK/FAILED/TIMEOUT/ERROR with an error message.
+
+        Any NOERROR answer makes the server OK. Otherwise a DNS error code
+        wins over socket errors, and socket errors over plain timeouts.
+        """
+        outcomes = self.outcomes if domain is None else self.for_domain(domain)
+        responses = [o.response for o in outcomes if o.response is not None]
+        if any(response.rcode == 0 for response in responses):
+            return "OK", None
+        if responses:
+            return "FAILED", responses[0].rcode_name
+        errors = [o.error for o in outcomes if o.error and not o.timed_out]
+        if errors:
+            return "ERROR", errors[0]
+        return "TIMEOUT", f"DNS query timed out after {self.timeout:g} seconds"
+
+    def answers(self, domain: str) -> List[str]:
+        for outcome in self.for_domain(domain):
+            if outcome.response is not None and outcome.response.rcode == 0 and outcome.response.answers:
+                return outcome.response.answers
+        return []
+
+
+def percentile(sorted_values: Sequence[float], pct: float) -> Optional[float]:
+    """Nearest-rank percentile of an already sorted sequence."""
+    if not sorted_values:
+        return None
+    rank = max(1, -(-len(sorted_values) * pct // 100))
+    return sorted_values[int(rank) - 1]
+
+
+def summarize(sent: int, rtts: List[float]) -> DNSLatencyStats:
+    samples = sorted(rtts)
+    received = len(samples)
+    stats = DNSLatencyStats(
+        sent=sent,
+        received=received,
+        loss_percent=round(100.0 * (sent - received) / sent, 1) if sent else 0.0
+    )
+    if samples:
+        stats.min_ms = round(samples[0], 2)
+        stats.avg_ms = round(sum(samples) / received, 2)
+        stats.p50_ms = round(percentile(samples, 50), 2)
+        stats.p90_ms = round(percentile(samples, 90), 2)
+        stats.p99_ms = round(percentile(samples, 99), 2)
+        stats.max_ms = round(samples[-1], 2)
+    return stats
+
+
+def build_query(domain: str, query_id: int, qtype: int = QTYPE_A) -> bytes:
+    """Build a recursive DNS query packet for a single question."""
+    qname = b""
+    for label in domain.rstrip(".").split("."):
+        encoded = label.encode("idna")
+        if not encoded or len(encoded) > 63:
+            raise ValueError(f"Invalid domain label in {domain!r}")
+        qname += bytes([len(encoded)]) + encoded
+    header = struct.pack("!HHHHHH", query_id, FLAG_RD, 1, 0, 0, 0)
+    return header + qname + b"\x00" + struct.pack("!HH", qtype, QCLASS_IN)
+
+
+def _read_name(data: bytes, offset: int) -> Tuple[str, int]:
+    """Decode a possibly compressed name; returns (name, offset after it)."""
+    labels = []
+    end = None
+    jumps = 0
+    while True:
+        if offset >= len(data):
+            raise ValueError("Truncated name")
+        length = data[offset]
+        if length & 0xC0 == 0xC0:
+            if offset + 1 >= len(data) or jumps > 16:
+                raise ValueError("Bad compression pointer")
+            if end is None:
+                end = offset + 2
+            offset = ((length & 0x3F) << 8) | data[offset + 1]
+            jumps += 1
+            continue
+        offset += 1
+        if length == 0:
+            break
+        labels.append(data[offset:offset + length].decode("ascii", "replace"))
+        offset += length
+    return ".".join(labels) + ".", end if end is not None else offset
+
+
+def parse_response(data: bytes) -> DNSResponse:
+    """Parse a response header and its A/AAAA/CNAME answers.
+
+    Raises:
+        ValueError: If the packet is not a well-formed DNS response
+    """
+    if len(data) < 12:
+        raise ValueError("Short DNS packet")
+    query_id, flags, qdcount, ancount, _, _ = struct.unpack("!HHHHHH", data[:12])
+    if not flags & FLAG_QR:
+        raise ValueError("Not a DNS response")
+
+    offset = 12
+    for _ in range(qdcount):
+        _, offset = _read_name(data, offset)
+        offset += 4
+
+    answers = []
+    for _ in range(ancount):
+        _, offset = _read_name(data, offset)
+        if offset + 10 > len(data):
+            raise ValueError("Truncated answer")
+        rtype, _, _, rdlength = struct.unpack("!HHIH", data[offset:offset + 10])
+        offset += 10
+        rdata = data[offset:offset + rdlength]
+        if rtype == QTYPE_A and rdlength == 4:
+            answers.append(str(ipaddress.IPv4Address(rdata)))
+        elif rtype == QTYPE_AAAA and rdlength == 16:
+            answers.append(str(ipaddress.IPv6Address(rdata)))
+        elif rtype == QTYPE_CNAME:
+            answers.append(_read_name(data, offset)[0])
+        offset += rdlength
+
+    return DNSResponse(query_id=query_id, rcode=flags & 0x000F, answers=answers)
+
+
+class _ResolverProtocol(asyncio.DatagramProtocol):
+    """Matches datagrams from one resolver to pending query futures."""
+
+    def __init__(self, loop: asyncio.AbstractEventLoop):
+        self.loop = loop
+        self.pending: Dict[int, asyncio.Future] = {}
+
+    def datagram_received(self, data, addr):
+        received_at = self.loop.time()
+        try:
+            response = parse_response(data)
+        except ValueError:
+            return
+        future = self.pending.pop(response.query_id, None)
+        if future is not None and not future.done():
+            future.set_result((received_at, response))
+
+    def error_received(self, exc):
+        # ICMP errors (e.g. port unreachable) fail every query in flight
+        self._fail_pending(exc)
+
+    def connection_lost(self, exc):
+        self._fail_pending(exc or ConnectionError("Socket closed"))
+
+    def _fail_pending(self, exc):
+        for future in self.pending.values():
+            if not future.done():
+                future.set_exception(exc)
+        self.pending.clear()
+
+
+class DNSQueryEngine:
+    """Concurrent raw UDP DNS benchmark.
+
+    Every server gets its own socket and all servers are measured at the
+    same time, so the total duration is roughly one query timeout no matter
+    how many servers are tested.
+
+    Args:
+        port: Destination port (53, or a stub resolver's port in tests)
+        timeout: Seconds to wait for each query
+        queries: Default number of queries per server and domain
+        interval: Seconds between consecutive queries to one server
+    """
+
+    def __init__(self, port: int = DNS_PORT, timeout: float = DNS_QUERY_TIMEOUT,
+                 queries: int = DNS_QUERY_COUNT, interval: float = DNS_QUERY_INTERVAL):
+        self.port = port
+        self.timeout = timeout
+        self.queries = queries
+        self.interval = interval
+
+    def benchmark(self, servers: List[str], domains: List[str],
+                  queries: Optional[int] = None) -> Dict[str, ServerBenchmark]:
+        """Query every domain on every server and return outcomes per server."""
+        return asyncio.run(self._benchmark_all(servers, domains, queries or self.queries))
+
+    async def _benchmark_all(self, servers: List[str], domains: List[str],
+                             queries: int) -> Dict[str, ServerBenchmark]:
+        results = await asyncio.gather(*(
+            self._benchmark_server(server, domains, queries) for server in servers
+        ))
+        return dict(zip(servers, results))
+
+    async def _benchmark_server(self, server: str, domains: List[str], queries: int) -> ServerBenchmark:
+        loop = asyncio.get_running_loop()
+        result = ServerBenchmark(server=server, timeout=self.timeout)
+        family = socket.AF_INET6 if ":" in server else socket.AF_INET
+
+        try:
+            transport, protocol = await loop.create_datagram_endpoint(
+                lambda: _ResolverProtocol(loop), remote_addr=(server, self.port), family=family
+            )
+        except OSError as e:
+            error = e.strerror or str(e)
+            result.outcomes = [QueryOutcome(domain=domain, error=error)
+                               for _ in range(queries) for domain in domains]
+            return result
+
+        try:
+            tasks = []
+            for _ in range(queries):
+                for domain in domains:
+                    tasks.append(loop.create_task(self._query(loop, transport, protocol, domain)))
+                    if self.interval:
+                        await asyncio.sleep(self.interval)
+            result.outcomes = list(await asyncio.gather(*tasks))
+        finally:
+            transport.close()
+        return result
+
+    async def _query(self, loop, transport, protocol: _ResolverProtocol, domain: str) -> QueryOutcome:
+        query_id = random.getrandbits(16)
+        while query_id in protocol.pending:
+            query_id = random.getrandbits(16)
+        future = loop.create_future()
+        protocol.pending[query_id] = future
+
+        sent_at = loop.time()
+        try:
+            transport.sendto(build_query(domain, query_id))
+            received_at, response = await asyncio.wait_for(future, self.timeout)
+        except asyncio.TimeoutError:
+            return QueryOutcome(domain=domain, timed_out=True, error="timeout")
+        except (OSError, ValueError) as e:
+            return QueryOutcome(domain=domain, error=getattr(e, "strerror", None) or str(e))
+        finally:
+            protocol.pending.pop(query_id, None)
+
+        return QueryOutcome(domain=domain, rtt_ms=(received_at - sent_at) * 1000, response=response)
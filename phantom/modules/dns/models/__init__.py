@@ -18,6 +18,7 @@ from .dns_models import (
     DNSServerConfig,
     ClientConfigUpdateResult,
     ChangeDNSResult,
+    DNSLatencyStats,
     DNSTestServerResult,
     TestDNSResult,
     DNSConfiguration,
@@ -25,13 +26,16 @@ from .dns_models import (
     DNSServerStatusTest,
     DNSHealth,
     DNSStatusResult,
-    GetDNSServersResult
+    GetDNSServersResult,
+    DNSRankEntry,
+    RankDNSResult
 )
 
 __all__ = [
     'DNSServerConfig',
     'ClientConfigUpdateResult',
     'ChangeDNSResult',
+    'DNSLatencyStats',
     'DNSTestServerResult',
     'TestDNSResult',
     'DNSConfiguration',
@@ -39,5 +43,7 @@ __all__ = [
     'DNSServerStatusTest',
     'DNSHealth',
     'DNSStatusResult',
-    'GetDNSServersResult'
+    'GetDNSServersResult',
+    'DNSRankEntry',
+    'RankDNSResult'
 ]
@@ -65,6 +65,32 @@ class ChangeDNSResult(BaseModel):
         }
 
 
+@dataclass
+class DNSLatencyStats(BaseModel):
+    sent: int
+    received: int
+    loss_percent: float
+    min_ms: Optional[float] = None
+    avg_ms: Optional[float] = None
+    p50_ms: Optional[float] = None
+    p90_ms: Optional[float] = None
+    p99_ms: Optional[float] = None
+    max_ms: Optional[float] = None
+
+    def to_dict(self) -> Dict[str, Any]:
+        return {
+            "sent": self.sent,
+            "received": self.received,
+            "loss_percent": self.loss_percent,
+            "min_ms": self.min_ms,
+            "avg_ms": self.avg_ms,
+            "p50_ms": self.p50_ms,
+            "p90_ms": self.p90_ms,
+            "p99_ms": self.p99_ms,
+            "max_ms": self.max_ms
+        }
+
+
 @dataclass
 class DNSTestServerResult(BaseModel):
     server: str
@@ -73,6 +99,7 @@ class DNSTestServerResult(BaseModel):
     response_time_ms: Optional[float] = None
     test_domain: Optional[str] = None
     error: Optional[str] = None
+    latency: Optional[DNSLatencyStats] = None
 
     def to_dict(self) -> Dict[str, Any]:
         result = {
@@ -86,6 +113,8 @@ class DNSTestServerResult(BaseModel):
             result["test_domain"] = self.test_domain
         if self.error is not None:
             result["error"] = self.error
+        if self.latency is not None:
+            result["latency"] = self.latency.to_dict()  # type: ignore
         return result
 
 
@@ -138,12 +167,16 @@ class DNSDomainTest(BaseModel):
 class DNSServerStatusTest(BaseModel):
     server: str
     tests: List[DNSDomainTest]
+    latency: Optional[DNSLatencyStats] = None
 
     def to_dict(self) -> Dict[str, Any]:
-        return {
+        result = {
             "server": self.server,
             "tests": [test.to_dict() for test in self.tests]
         }
+        if self.latency is not None:
+            result["latency"] = self.latency.to_dict()
+        return result
 
 
 @dataclass
@@ -180,3 +213,43 @@ class GetDNSServersResult(BaseModel):
             "primary": self.primary,
             "secondary": self.secondary
         }
+
+
+@dataclass
+class DNSRankEntry(BaseModel):
+    rank: int
+    server: str
+    status: str
+    latency: DNSLatencyStats
+    configured_as: Optional[str] = None
+    error: Optional[str] = None
+
+    def to_dict(self) -> Dict[str, Any]:
+        return {
+            "rank": self.rank,
+            "server": self.server,
+            "status": self.status,
+            "configured_as": self.configured_as,
+            "latency": self.latency.to_dict(),
+            "error": self.error
+        }
+
+
+@dataclass
+class RankDNSResult(BaseModel):
+    domains: List[str]
+    queries_per_domain: int
+    servers_ranked: int
+    ranking: List[DNSRankEntry]
+    recommended_primary: Optional[str] = None
+    recommended_secondary: Optional[str] = None
+
+    def to_dict(self) -> Dict[str, Any]:
+        return {
+            "domains": self.domains,
+            "queries_per_domain": self.queries_per_domain,
+            "servers_ranked": self.servers_ranked,
+            "ranking": [entry.to_dict() for entry in self.ranking],
+            "recommended_primary": self.recommended_primary,
+            "recommended_secondary": self.recommended_secondary
+        }
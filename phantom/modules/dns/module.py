@@ -13,29 +13,32 @@ TR: Phantom-WG DNS Yönetim Modülü
     istemcileri için merkezi DNS yönetimi sağlar. phantom.json dosyasında global DNS
     ayarlarını saklar ve tüm istemci yapılandırmaları bu ayarları kullanır.
     
-    API Endpoint'leri (4 adet):
+    API Endpoint'leri (5 adet):
         1. Yapılandırma: change_dns_servers, get_dns_servers
-        2. Test ve Durum: test_dns_servers, status
+        2. Test ve Durum: test_dns_servers, rank_dns_servers, status
     
     Modül Özellikleri:
         - Birincil ve ikincil DNS sunucu yönetimi
         - IP format doğrulaması (NetworkValidator)
-        - DNS sunucu erişilebilirlik testleri (nslookup/dig)
-        - Gerçek zamanlı performans ölçümü
+        - DNS sunucu erişilebilirlik testleri (ham UDP sorguları)
+        - Gerçek zamanlı performans ölçümü (RTT yüzdelikleri, kayıp oranı)
         - Sistem genelinde yapılandırma senkronizasyonu
         - Typed model desteği (BaseModel inheritance)
     
     Test Yetenekleri:
-        - nslookup ile DNS çözümleme testi
-        - dig ile hızlı sorgu performansı
+        - asyncio sorgu motoru ile tüm sunuculara eşzamanlı sorgu
+        - Sunucu başına N sorgu üzerinden p50/p90/p99 RTT ve kayıp oranı
         - Çoklu domain testi (google.com, cloudflare.com)
-        - Zaman aşımı koruması (5 saniye)
+        - Sorgu başına zaman aşımı koruması (2 saniye)
         - Sağlık durumu değerlendirmesi (healthy/degraded)
+        - Aday sunucuların gecikmeye göre sıralanması
     
     Model Mimarisi:
         Bu modül @dataclass modelleri kullanarak tip güvenliği sağlar:
         - DNSServerConfig: DNS sunucu yapılandırması
         - TestDNSResult: Test sonuçları
+        - DNSLatencyStats: RTT yüzdelikleri ve kayıp oranı
+        - RankDNSResult: Sunucu sıralaması
         - DNSStatusResult: Durum bilgisi
         - GetDNSServersResult: Sunucu bilgileri
         Tüm modeller BaseModel'den inherit eder ve to_dict() ile API uyumluluğu sağlar.
@@ -47,29 +50,32 @@ EN: Phantom-WG DNS Management Module
     DNS management for all WireGuard clients. Stores global DNS settings in phantom.json
     file and all client configurations use these settings.
     
-    API Endpoints (4 total):
+    API Endpoints (5 total):
         1. Configuration: change_dns_servers, get_dns_servers
-        2. Test and Status: test_dns_servers, status
+        2. Test and Status: test_dns_servers, rank_dns_servers, status
     
     Module Features:
         - Primary and secondary DNS server management
         - IP format validation (NetworkValidator)
-        - DNS server accessibility tests (nslookup/dig)
-        - Real-time performance measurement
+        - DNS server accessibility tests (raw UDP queries)
+        - Real-time performance measurement (RTT percentiles, loss)
         - System-wide configuration synchronization
         - Typed model support (BaseModel inheritance)
     
     Testing Capabilities:
-        - DNS resolution test with nslookup
-        - Fast query performance with dig
+        - Concurrent queries to all servers with the asyncio query engine
+        - p50/p90/p99 RTT and loss over N queries per server
         - Multiple domain testing (google.com, cloudflare.com)
-        - Timeout protection (5 seconds)
+        - Per-query timeout protection (2 seconds)
         - Health status evaluation (healthy/degraded)
+        - Latency ranking of candidate servers
     
     Model Architecture:
         This module uses @dataclass models for type safety:
         - DNSServerConfig: DNS server configuration
         - TestDNSResult: Test results
+        - DNSLatencyStats: RTT percentiles and loss
+        - RankDNSResult: Server ranking
         - DNSStatusResult: Status information
         - GetDNSServersResult: Server information
         All models inherit from BaseModel and provide API compatibility via to_dict().
@@ -80,7 +86,6 @@ Third-party licenses - see THIRD_PARTY_LICENSES file for details
 WireGuard® is a registered trademark of Jason A. Donenfeld.
 """
 
-import subprocess
 from pathlib import Path
 from typing import List, Dict, Any, Optional
 
@@ -95,14 +100,21 @@ from .models import (
     DNSServerConfig, ClientConfigUpdateResult, ChangeDNSResult,
     DNSTestServerResult, TestDNSResult, DNSConfiguration,
     DNSDomainTest, DNSServerStatusTest, DNSHealth, DNSStatusResult,
-    GetDNSServersResult
+    GetDNSServersResult, DNSRankEntry, RankDNSResult
 )
+from .lib.query_engine import DNSQueryEngine, ServerBenchmark
 
 # Module constants
 DEFAULT_DNS_PRIMARY = "8.8.8.8"
 DEFAULT_DNS_SECONDARY = "1.1.1.1"
 DNS_TEST_DOMAINS = ["google.com", "cloudflare.com"]
-DNS_TEST_TIMEOUT = 5
+DNS_MAX_QUERY_COUNT = 100
+DNS_CANDIDATE_SERVERS = [
+    "1.1.1.1", "1.0.0.1",  # Cloudflare
+    "8.8.8.8", "8.8.4.4",  # Google
+    "9.9.9.9", "149.112.112.112",  # Quad9
+    "208.67.222.222", "208.67.220.220"  # OpenDNS
+]
 
 
 class DnsModule(BaseModule):
@@ -120,8 +132,8 @@ class DnsModule(BaseModule):
 
     Features:
         - Secure DNS change with IP validation
-        - Multiple DNS server testing (dig and nslookup)
-        - Real-time performance measurement
+        - Concurrent DNS server testing with raw UDP queries
+        - Real-time performance measurement (RTT percentiles, loss)
         - Automatic configuration refresh
         - Typed model support (to_dict() for API compatibility)
 
@@ -144,6 +156,13 @@ class DnsModule(BaseModule):
         super().__init__(install_dir)
 
         # Load DNS configuration with sensible defaults
+        self._config_changed()
+
+        # Shared asyncio query engine used by every test action
+        self.query_engine = DNSQueryEngine()
+
+    def _config_changed(self) -> None:
+        """Re-derive the DNS settings after phantom.json changed."""
         self.dns_config = self.config.get("dns", {
             "primary": DEFAULT_DNS_PRIMARY,
             "secondary": DEFAULT_DNS_SECONDARY
@@ -160,9 +179,10 @@ class DnsModule(BaseModule):
     def get_actions(self) -> Dict[str, callable]:
         """Return all available actions this module can perform.
 
-        Provides 4 API endpoints for DNS management:
+        Provides 5 API endpoints for DNS management:
             - change_dns_servers: Changes DNS servers
             - test_dns_servers: Performs DNS server tests
+            - rank_dns_servers: Ranks candidate servers by latency
             - status: Shows current DNS status and health
             - get_dns_servers: Returns active DNS servers
 
@@ -173,6 +193,7 @@ class DnsModule(BaseModule):
             # Configuration Actions
             "change_dns_servers": self.change_dns_servers,
             "test_dns_servers": self.test_dns_servers,
+            "rank_dns_servers": self.rank_dns_servers,
 
             # Status Actions
             "status": self.status,
@@ -228,16 +249,10 @@ class DnsModule(BaseModule):
             self.config["dns"] = self.dns_config
             self._save_config()
 
-            # Client configurations use global DNS from phantom.json
+            # Client configurations use global DNS from phantom.json; the
+            # config service notifies the other modules of the new values
             client_update_result_data = {"success": True, "message": "DNS configuration updated globally"}
 
-            # Reload to prevent stale DNS values in cached config
-            self.config = self._load_config()
-            self.dns_config = self.config.get("dns", {
-                "primary": DEFAULT_DNS_PRIMARY,
-                "secondary": DEFAULT_DNS_SECONDARY
-            })
-
             # Create typed models
             dns_server_config = DNSServerConfig(
                 primary=primary,
@@ -266,15 +281,16 @@ class DnsModule(BaseModule):
             self.logger.error(f"Failed to change DNS servers: {e}")
             raise ConfigurationError(f"Failed to change DNS servers: {str(e)}")
 
-    def test_dns_servers(self, servers: List[str] = None, domain: str = None) -> Dict[str, Any]:
+    def test_dns_servers(self, servers: List[str] = None, domain: str = None,
+                         queries: int = None) -> Dict[str, Any]:
         """Test DNS server connectivity and performance.
 
         This action performs:
             1. Determines DNS servers to test (uses current if not provided)
             2. Validates IP format for each server
-            3. Performs DNS resolution test with nslookup command
-            4. Records response time and success status
-            5. Safe testing with 5 second timeout
+            3. Sends N raw UDP queries to every server concurrently
+            4. Records RTT percentiles, loss and success status
+            5. Safe testing with a per-query timeout
 
         Returns TestDNSResult model and converts to dict via to_dict().
         Creates DNSTestServerResult for each server.
@@ -282,6 +298,7 @@ class DnsModule(BaseModule):
         Args:
             servers: List of DNS servers to test (optional, uses current config if not provided)
             domain: Domain to test (optional, defaults to 'google.com')
+            queries: Number of queries per server (optional, defaults to 5)
 
         Returns:
             Dict containing:
@@ -291,6 +308,7 @@ class DnsModule(BaseModule):
 
         Raises:
             ValidationError: If no valid DNS servers to test
+            InvalidParameterError: If queries is out of range
         """
         if not servers:
             servers = [
@@ -301,35 +319,18 @@ class DnsModule(BaseModule):
         if not domain:
             domain = 'google.com'
 
-        # Validate servers
-        validated_servers = []
-        for server in servers:
-            try:
-                validated_servers.append(NetworkValidator.validate_ip_address(server))
-            except InvalidParameterError as e:
-                self.logger.warning(f"Skipping invalid DNS server {server}: {e}")
-                continue
-
+        validated_servers = self._validate_servers(servers)
         if not validated_servers:
             raise ValidationError("No valid DNS servers to test")
 
-        # Test each server
+        benchmarks = self.query_engine.benchmark(validated_servers, [domain], self._validate_queries(queries))
+
+        # Build a typed result per server
         test_results = []
         all_passed = True
 
         for server in validated_servers:
-            server_result_dict = self._test_single_dns_server(server, domain)
-
-            # Create typed result
-            server_result = DNSTestServerResult(
-                server=server_result_dict["server"],
-                success=server_result_dict["success"],
-                status=server_result_dict["status"],
-                response_time_ms=server_result_dict.get("response_time_ms"),
-                test_domain=server_result_dict.get("test_domain"),
-                error=server_result_dict.get("error")
-            )
-
+            server_result = self._build_server_result(benchmarks[server], domain)
             test_results.append(server_result)
             if not server_result.success:
                 all_passed = False
@@ -344,13 +345,100 @@ class DnsModule(BaseModule):
         # Convert to dict for API
         return result.to_dict()
 
+    def rank_dns_servers(self, servers: List[str] = None, domains: List[str] = None,
+                         queries: int = None) -> Dict[str, Any]:
+        """Benchmark candidate DNS servers and rank them by latency.
+
+        All candidates are queried concurrently. Servers are ordered by
+        reachability, then loss, then median and p90 RTT. The configuration
+        is not changed; the two best servers are returned as a recommendation
+        for change_dns_servers.
+
+        Args:
+            servers: Candidate servers (optional, defaults to the configured
+                servers plus well-known public resolvers)
+            domains: Domains to resolve (optional, defaults to DNS_TEST_DOMAINS)
+            queries: Number of queries per server and domain (optional, defaults to 5)
+
+        Returns:
+            Dict containing:
+            - domains: Domains used for the benchmark
+            - queries_per_domain: Queries sent per server and domain
+            - servers_ranked: Number of servers ranked
+            - ranking: Ranked servers with latency statistics
+            - recommended_primary / recommended_secondary: Best two reachable servers
+
+        Raises:
+            ValidationError: If no valid DNS servers to rank
+            InvalidParameterError: If a domain or queries is invalid
+        """
+        primary_dns = self.dns_config.get('primary', DEFAULT_DNS_PRIMARY)
+        secondary_dns = self.dns_config.get('secondary', DEFAULT_DNS_SECONDARY)
+
+        if not servers:
+            servers = [primary_dns, secondary_dns] + DNS_CANDIDATE_SERVERS
+
+        # Validate and de-duplicate while keeping the caller's order
+        validated_servers = list(dict.fromkeys(self._validate_servers(servers)))
+        if not validated_servers:
+            raise ValidationError("No valid DNS servers to rank")
+
+        domains = [NetworkValidator.validate_domain(d) for d in (domains or DNS_TEST_DOMAINS)]
+        queries = self._validate_queries(queries)
+
+        benchmarks = self.query_engine.benchmark(validated_servers, domains, queries)
+
+        entries = []
+        for server in validated_servers:
+            status, error = benchmarks[server].status()
+            configured_as = None
+            if server == primary_dns:
+                configured_as = "primary"
+            elif server == secondary_dns:
+                configured_as = "secondary"
+            entries.append(DNSRankEntry(
+                rank=0,
+                server=server,
+                status=status,
+                latency=benchmarks[server].stats(),
+                configured_as=configured_as,
+                error=error
+            ))
+
+        def rank_key(entry: DNSRankEntry):
+            latency = entry.latency
+            return (
+                entry.status != "OK",
+                latency.loss_percent,
+                latency.p50_ms if latency.p50_ms is not None else float("inf"),
+                latency.p90_ms if latency.p90_ms is not None else float("inf")
+            )
+
+        entries.sort(key=rank_key)
+        for position, entry in enumerate(entries, 1):
+            entry.rank = position
+
+        reachable = [entry.server for entry in entries if entry.status == "OK"]
+
+        result = RankDNSResult(
+            domains=domains,
+            queries_per_domain=queries,
+            servers_ranked=len(entries),
+            ranking=entries,
+            recommended_primary=reachable[0] if reachable else None,
+            recommended_secondary=reachable[1] if len(reachable) > 1 else None
+        )
+
+        # Convert to dict for API
+        return result.to_dict()
+
     def status(self) -> Dict[str, Any]:
         """Get comprehensive DNS status and health information.
 
         Provides real-time information about:
             - Current DNS configuration (primary/secondary)
-            - DNS server health status (with dig test)
-            - Multiple domain test results for each server
+            - DNS server health status (with raw UDP queries)
+            - Multiple domain test results and latency for each server
             - Overall system DNS health (healthy/degraded)
 
         Returns DNSStatusResult model and converts to dict via to_dict().
@@ -391,7 +479,8 @@ class DnsModule(BaseModule):
 
             server_status_test = DNSServerStatusTest(
                 server=server_result["server"],
-                tests=typed_domain_tests
+                tests=typed_domain_tests,
+                latency=server_result.get("latency")
             )
             typed_test_results.append(server_status_test)
 
@@ -432,103 +521,75 @@ class DnsModule(BaseModule):
 
     # Private helper methods - Internal DNS testing utilities
 
-    def _test_single_dns_server(self, server: str, domain: str = 'google.com') -> Dict[str, Any]:
-        """Test a single DNS server - resolution with nslookup.
-
-        Checks if DNS server is working using nslookup command.
-        Attempts to parse response time on successful resolution.
-        Applies 5 second timeout.
-
-        Test results:
-            - OK: Successful resolution
-            - FAILED: Resolution failed
-            - TIMEOUT: No response within 5 seconds
-            - ERROR: Unexpected error
-
-        Args:
-            server: DNS server IP address to test
-            domain: Domain name to resolve (default: 'google.com')
+    def _validate_servers(self, servers: List[str]) -> List[str]:
+        """Validate server IPs, skipping (and logging) invalid entries."""
+        validated_servers = []
+        for server in servers:
+            try:
+                validated_servers.append(NetworkValidator.validate_ip_address(server))
+            except InvalidParameterError as e:
+                self.logger.warning(f"Skipping invalid DNS server {server}: {e}")
+                continue
+        return validated_servers
 
-        Returns:
-            Dict containing:
-            - server: Tested server IP
-            - success: Boolean test result
-            - status: Test status (OK/FAILED/TIMEOUT/ERROR)
-            - response_time_ms: Response time if available
-            - test_domain: Domain used for testing
-            - error: Error message if failed
-        """
+    # noinspection PyMethodMayBeStatic
+    def _validate_queries(self, queries: Optional[int]) -> int:
+        """Validate the per-server query count, defaulting to the engine setting."""
+        if queries is None:
+            return self.query_engine.queries
         try:
-            # Test with nslookup
-            result = subprocess.run(
-                ['nslookup', domain, server],
-                capture_output=True,
-                text=True,
-                timeout=5
-            )
-
-            if result.returncode == 0:
-                # Parse response time if available
-                response_time = self._parse_nslookup_time(result.stdout)
-
-                return {
-                    "server": server,
-                    "success": True,
-                    "status": "OK",
-                    "response_time_ms": response_time,
-                    "test_domain": domain
-                }
-            else:
-                return {
-                    "server": server,
-                    "success": False,
-                    "status": "FAILED",
-                    "error": result.stderr.strip() if result.stderr else "DNS query failed"
-                }
-
-        except subprocess.TimeoutExpired:
-            return {
-                "server": server,
-                "success": False,
-                "status": "TIMEOUT",
-                "error": "DNS query timed out after 5 seconds"
-            }
-        except Exception as e:
-            return {
-                "server": server,
-                "success": False,
-                "status": "ERROR",
-                "error": str(e)
-            }
+            queries = int(queries)
+        except (TypeError, ValueError):
+            raise InvalidParameterError("queries must be an integer")
+        if not 1 <= queries <= DNS_MAX_QUERY_COUNT:
+            raise InvalidParameterError(f"queries must be between 1 and {DNS_MAX_QUERY_COUNT}")
+        return queries
 
     # noinspection PyMethodMayBeStatic
-    def _parse_nslookup_time(self, output: str) -> Optional[float]:
-        """Parse response time from nslookup output - simplified.
+    def _build_server_result(self, benchmark: ServerBenchmark, domain: str) -> DNSTestServerResult:
+        """Convert one server's benchmark into a DNSTestServerResult.
 
-        Attempts to extract DNS query response time from nslookup output.
-        This is a simplified implementation, output format may vary
-        across different systems.
-
-        Note: Currently returns None, real parsing can be added in future.
+        Test results:
+            - OK: At least one NOERROR response
+            - FAILED: Server answered with an error code (e.g. NXDOMAIN)
+            - TIMEOUT: No response within the query timeout
+            - ERROR: Socket error (e.g. ICMP port unreachable)
 
         Args:
-            output: nslookup command stdout output
+            benchmark: Query outcomes of the server
+            domain: Domain used for testing
 
         Returns:
-            Optional[float]: Response time in milliseconds or None if not parseable
+            DNSTestServerResult: Typed result; response_time_ms is the median RTT
         """
-        # Simplified parser - implementation may vary by system
-        _ = output
-        return None  # Cannot parse time yet
+        status, error = benchmark.status()
+        latency = benchmark.stats()
+
+        if status == "OK":
+            return DNSTestServerResult(
+                server=benchmark.server,
+                success=True,
+                status=status,
+                response_time_ms=latency.p50_ms,
+                test_domain=domain,
+                latency=latency
+            )
+        return DNSTestServerResult(
+            server=benchmark.server,
+            success=False,
+            status=status,
+            error=error,
+            latency=latency
+        )
 
     def _test_dns_servers_internal(self) -> Dict[str, Any]:
-        """Internal DNS server testing - comprehensive check with dig.
+        """Internal DNS server testing - comprehensive check with the query engine.
 
         For both DNS servers in current configuration:
-            1. Tests all domains in DNS_TEST_DOMAINS list
-            2. Performs fast DNS query with dig command (+short)
-            3. Applies 3 second query timeout, 5 second command timeout
-            4. Records success status and responses
+            1. Queries all domains in DNS_TEST_DOMAINS concurrently
+            2. A domain passes when a NOERROR response carries answers
+            3. Records the first answers (like dig +short) and errors
+            4. Adds latency statistics over all queries of the server
             5. Evaluates overall test success status
 
         Used by status() method for DNS health check.
@@ -541,43 +602,45 @@ class DnsModule(BaseModule):
         primary_dns = self.dns_config.get('primary', DEFAULT_DNS_PRIMARY)
         secondary_dns = self.dns_config.get('secondary', DEFAULT_DNS_SECONDARY)
         test_domains = DNS_TEST_DOMAINS
+        servers = [primary_dns, secondary_dns]
+
+        try:
+            benchmarks = self.query_engine.benchmark(list(dict.fromkeys(servers)), test_domains)
+        except Exception as e:
+            self.logger.error(f"DNS health check failed: {e}")
+            return {
+                "all_passed": False,
+                "results": [{
+                    "server": dns_server,
+                    "tests": [{'domain': domain, 'success': False, 'error': str(e)[:50]}
+                              for domain in test_domains]
+                } for dns_server in servers]
+            }
 
         results = []
         all_passed = True
 
-        for dns_server in [primary_dns, secondary_dns]:
+        for dns_server in servers:
+            benchmark = benchmarks[dns_server]
             server_result = {
                 "server": dns_server,
-                "tests": []
+                "tests": [],
+                "latency": benchmark.stats()
             }
 
             for domain in test_domains:
-                try:
-                    result = subprocess.run(
-                        ['dig', f'@{dns_server}', domain, '+short', '+timeout=3'],
-                        capture_output=True,
-                        text=True,
-                        timeout=5
-                    )
-
-                    success = result.returncode == 0 and result.stdout.strip()
-
-                    server_result['tests'].append({
-                        'domain': domain,
-                        'success': success,
-                        'response': result.stdout.strip()[:50] if success else None,
-                        'error': result.stderr.strip()[:50] if not success else None
-                    })
-
-                    if not success:
-                        all_passed = False
-
-                except Exception as e:
-                    server_result['tests'].append({
-                        'domain': domain,
-                        'success': False,
-                        'error': str(e)[:50]
-                    })
+                answers = "\n".join(benchmark.answers(domain))
+                success = bool(answers)
+                _, error = benchmark.status(domain)
+
+                server_result['tests'].append({
+                    'domain': domain,
+                    'success': success,
+                    'response': answers[:50] if success else None,
+                    'error': (error or "No answer")[:50] if not success else None
+                })
+
+                if not success:
                     all_passed = False
 
             results.append(server_result)
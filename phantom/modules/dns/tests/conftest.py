@@ -10,6 +10,10 @@
 # WireGuard® is a registered trademark of Jason A. Donenfeld.
 
 import json
+import socket
+import struct
+import threading
+
 import pytest
 import shutil
 
@@ -38,3 +42,84 @@ def test_environment(tmp_path):
     yield test_data
 
     shutil.rmtree(tmp_path)
+
+
+class StubResolver:
+    """Minimal UDP DNS server answering every A query from a local address.
+
+    Args:
+        address: Loopback address to bind (127.0.0.0/8 lets several stubs share a port)
+        port: Port to bind, 0 picks a free one
+        answer: IPv4 address returned for every query
+        rcode: Response code (0 NOERROR, 2 SERVFAIL, 3 NXDOMAIN ...)
+        delay: Seconds to wait before answering
+        drop_every: Silently drop every n-th query (0 answers all)
+    """
+
+    def __init__(self, address="127.0.0.1", port=0, answer="93.184.216.34", rcode=0, delay=0.0, drop_every=0):
+        self.answer = answer
+        self.rcode = rcode
+        self.delay = delay
+        self.drop_every = drop_every
+        self.received = 0
+        self.sock = socket.socket(socket.AF_INET, socket.SOCK_DGRAM)
+        self.sock.bind((address, port))
+        self.sock.settimeout(0.05)
+        self.address, self.port = self.sock.getsockname()
+        self._stopped = threading.Event()
+        self._thread = threading.Thread(target=self._serve, daemon=True)
+        self._thread.start()
+
+    def _serve(self):
+        while not self._stopped.is_set():
+            try:
+                data, client = self.sock.recvfrom(512)
+            except socket.timeout:
+                continue
+            except OSError:
+                return
+            self.received += 1
+            if self.drop_every and self.received % self.drop_every == 0:
+                continue
+            reply = self._reply(data)
+            if self.delay:
+                threading.Timer(self.delay, self._send, (reply, client)).start()
+            else:
+                self._send(reply, client)
+
+    def _send(self, reply, client):
+        try:
+            self.sock.sendto(reply, client)
+        except OSError:
+            pass
+
+    def _reply(self, query):
+        question = query[12:]
+        answers = 0
+        record = b""
+        if self.rcode == 0:
+            answers = 1
+            record = b"\xc0\x0c" + struct.pack("!HHIH", 1, 1, 60, 4) + socket.inet_aton(self.answer)
+        header = query[:2] + struct.pack("!HHHHH", 0x8180 | self.rcode, 1, answers, 0, 0)
+        return header + question + record
+
+    def close(self):
+        self._stopped.set()
+        self._thread.join()
+        self.sock.close()
+
+
+@pytest.fixture
+def stub_resolver():
+    """Factory starting stub resolvers that are closed after the test."""
+    started = []
+
+    def start(**kwargs):
+        resolver = StubResolver(**kwargs)
+        started.append(resolver)
+        return resolver
+
+    yield start
+
+    for resolver in started:
+        resolver.close()
@@ -17,6 +17,7 @@ WireGuard® is a registered trademark of Jason A. Donenfeld.
 import pytest
 
 from phantom.modules.dns.module import DnsModule
+from phantom.modules.dns.lib.query_engine import DNSQueryEngine
 
 
 # noinspection PyDeprecation
@@ -123,11 +124,6 @@ class TestModule:
 
     @pytest.mark.dependency(depends=["TestModule::test_change_dns_servers_invalid"])
     def test_test_dns_servers_default(self, dns_module):
-        import shutil
-
-        if not shutil.which('nslookup'):
-            pytest.skip("nslookup command not available on this system")
-
         result = dns_module.test_dns_servers()
 
         assert isinstance(result, dict)
@@ -202,11 +198,6 @@ class TestModule:
 
     @pytest.mark.dependency(depends=["TestModule::test_test_dns_servers_mixed"])
     def test_unreachable_dns_server_sets_all_passed_false(self, dns_module):
-        import shutil
-
-        if not shutil.which('nslookup'):
-            pytest.skip("nslookup command not available on this system")
-
         unreachable_servers = ["192.0.2.1", "192.0.2.2"]
 
         result = dns_module.test_dns_servers(servers=unreachable_servers)
@@ -226,11 +217,6 @@ class TestModule:
 
     @pytest.mark.dependency(depends=["TestModule::test_unreachable_dns_server_sets_all_passed_false"])
     def test_mixed_reachable_unreachable_dns_servers(self, dns_module):
-        import shutil
-
-        if not shutil.which('nslookup'):
-            pytest.skip("nslookup command not available on this system")
-
         mixed_servers = ["8.8.8.8", "192.0.2.1", "1.1.1.1", "192.0.2.2"]
 
         result = dns_module.test_dns_servers(servers=mixed_servers)
@@ -328,70 +314,96 @@ class TestModule:
         assert "Failed to change DNS servers" in str(exc_info.value)
 
     @pytest.mark.dependency(depends=["TestModule::test_change_dns_servers_config_error"])
-    def test_dns_server_test_timeout(self, dns_module, monkeypatch):
-        import subprocess
-
-        def mock_subprocess_run(*args, **_kwargs):
-            raise subprocess.TimeoutExpired(cmd=args[0], timeout=5)
-
-        monkeypatch.setattr(subprocess, "run", mock_subprocess_run)
+    def test_dns_server_test_timeout(self, dns_module, stub_resolver):
+        resolver = stub_resolver(drop_every=1)
+        dns_module.query_engine = DNSQueryEngine(port=resolver.port, timeout=0.2, queries=2)
 
-        result = dns_module._test_single_dns_server("8.8.8.8", "google.com")
+        result = dns_module.test_dns_servers(servers=["127.0.0.1"])
+        server_result = result["results"][0]
 
-        assert result["success"] is False
-        assert result["status"] == "TIMEOUT"
-        assert "timed out" in result["error"]
+        assert server_result["success"] is False
+        assert server_result["status"] == "TIMEOUT"
+        assert "timed out" in server_result["error"]
+        assert server_result["latency"]["loss_percent"] == 100.0
 
     @pytest.mark.dependency(depends=["TestModule::test_dns_server_test_timeout"])
-    def test_dns_server_test_failure(self, dns_module, monkeypatch):
-        import subprocess
-        from unittest.mock import MagicMock
-
-        def mock_subprocess_run(*_args, **_kwargs):
-            mock_result = MagicMock()
-            mock_result.returncode = 1
-            mock_result.stderr = "NXDOMAIN: domain not found"
-            mock_result.stdout = ""
-            return mock_result
-
-        monkeypatch.setattr(subprocess, "run", mock_subprocess_run)
+    def test_dns_server_test_failure(self, dns_module, stub_resolver):
+        resolver = stub_resolver(rcode=3)
+        dns_module.query_engine = DNSQueryEngine(port=resolver.port, timeout=0.5, queries=2)
 
-        result = dns_module._test_single_dns_server("8.8.8.8", "invalid.domain.test")
+        result = dns_module.test_dns_servers(servers=["127.0.0.1"], domain="invalid.domain.test")
+        server_result = result["results"][0]
 
-        assert result["success"] is False
-        assert result["status"] == "FAILED"
-        assert "NXDOMAIN" in result["error"]
+        assert server_result["success"] is False
+        assert server_result["status"] == "FAILED"
+        assert "NXDOMAIN" in server_result["error"]
 
     @pytest.mark.dependency(depends=["TestModule::test_dns_server_test_failure"])
-    def test_dns_server_test_exception(self, dns_module, monkeypatch):
-        import subprocess
+    def test_dns_server_test_exception(self, dns_module, stub_resolver):
+        resolver = stub_resolver()
+        dns_module.query_engine = DNSQueryEngine(port=resolver.port, timeout=0.5, queries=2)
 
-        def mock_subprocess_run(*_args, **_kwargs):
-            raise OSError("Network unreachable")
+        # Nothing listens on 127.0.0.3, the ICMP port unreachable fails the queries
+        result = dns_module.test_dns_servers(servers=["127.0.0.3"])
+        server_result = result["results"][0]
 
-        monkeypatch.setattr(subprocess, "run", mock_subprocess_run)
+        assert server_result["success"] is False
+        assert server_result["status"] == "ERROR"
+        assert "refused" in server_result["error"].lower()
 
-        result = dns_module._test_single_dns_server("8.8.8.8", "google.com")
+    @pytest.mark.dependency(depends=["TestModule::test_dns_server_test_exception"])
+    def test_test_dns_servers_latency(self, dns_module, stub_resolver):
+        fast = stub_resolver(address="127.0.0.1")
+        stub_resolver(address="127.0.0.2", port=fast.port, delay=0.05)
+        dns_module.query_engine = DNSQueryEngine(port=fast.port, timeout=1.0)
+
+        result = dns_module.test_dns_servers(servers=["127.0.0.1", "127.0.0.2"], queries=4)
+
+        assert result["all_passed"] is True
+        fast_result, slow_result = result["results"]
+        assert fast_result["latency"]["sent"] == 4
+        assert fast_result["latency"]["received"] == 4
+        assert fast_result["response_time_ms"] == fast_result["latency"]["p50_ms"]
+        assert slow_result["latency"]["min_ms"] >= 50
+        assert slow_result["response_time_ms"] > fast_result["response_time_ms"]
+
+    @pytest.mark.dependency(depends=["TestModule::test_test_dns_servers_latency"])
+    def test_rank_dns_servers(self, dns_module, stub_resolver):
+        from phantom.api.exceptions import InvalidParameterError
+
+        fast = stub_resolver(address="127.0.0.1")
+        stub_resolver(address="127.0.0.2", port=fast.port, delay=0.03)
+        stub_resolver(address="127.0.0.4", port=fast.port, drop_every=2)
+        dns_module.query_engine = DNSQueryEngine(port=fast.port, timeout=0.3)
+        dns_module.dns_config = {"primary": "127.0.0.2", "secondary": "127.0.0.3"}
+
+        result = dns_module.rank_dns_servers(
+            servers=["127.0.0.3", "127.0.0.4", "127.0.0.2", "127.0.0.1", "127.0.0.1"],
+            domains=["example.com"],
+            queries=4
+        )
 
-        assert result["success"] is False
-        assert result["status"] == "ERROR"
-        assert "Network unreachable" in result["error"]
+        assert result["servers_ranked"] == 4
+        assert [entry["server"] for entry in result["ranking"]] == [
+            "127.0.0.1", "127.0.0.2", "127.0.0.4", "127.0.0.3"
+        ]
+        assert [entry["rank"] for entry in result["ranking"]] == [1, 2, 3, 4]
+        assert result["ranking"][1]["configured_as"] == "primary"
+        assert result["ranking"][2]["latency"]["loss_percent"] == 50.0
+        assert result["ranking"][3]["status"] == "ERROR"
+        assert result["recommended_primary"] == "127.0.0.1"
+        assert result["recommended_secondary"] == "127.0.0.2"
 
-    @pytest.mark.dependency(depends=["TestModule::test_dns_server_test_exception"])
-    def test_internal_dns_test_exception(self, dns_module, monkeypatch):
-        import subprocess
-        from unittest.mock import MagicMock
+        with pytest.raises(InvalidParameterError):
+            dns_module.rank_dns_servers(servers=["127.0.0.1"], queries=0)
 
-        def mock_subprocess_failure(cmd, *_args, **_kwargs):
-            if 'dig' in cmd[0]:
-                mock_result = MagicMock()
-                mock_result.returncode = 1
-                mock_result.stdout = ""
-                mock_result.stderr = "Query failed: SERVFAIL"
-                return mock_result
-            return subprocess.CompletedProcess(cmd, 0, "OK", "")
+    @pytest.mark.dependency(depends=["TestModule::test_rank_dns_servers"])
+    def test_internal_dns_test_exception(self, dns_module, stub_resolver):
+        dns_module.dns_config = {"primary": "127.0.0.1", "secondary": "127.0.0.2"}
 
-        monkeypatch.setattr(subprocess, "run", mock_subprocess_failure)
+        servfail = stub_resolver(address="127.0.0.1", rcode=2)
+        stub_resolver(address="127.0.0.2", port=servfail.port, rcode=2)
+        dns_module.query_engine = DNSQueryEngine(port=servfail.port, timeout=0.3, queries=1)
 
         result = dns_module._test_dns_servers_internal()
         assert isinstance(result, dict)
@@ -404,14 +416,11 @@ class TestModule:
             assert "tests" in server_result
             for test in server_result["tests"]:
                 assert test["success"] is False
-                assert test.get("error") is not None
+                assert test.get("error") == "SERVFAIL"
 
-        def mock_subprocess_exception(cmd, *_args, **_kwargs):
-            if 'dig' in cmd[0]:
-                raise subprocess.TimeoutExpired(cmd=cmd, timeout=5)
-            return subprocess.CompletedProcess(cmd, 0, "OK", "")
-
-        monkeypatch.setattr(subprocess, "run", mock_subprocess_exception)
+        silent = stub_resolver(address="127.0.0.1", drop_every=1)
+        stub_resolver(address="127.0.0.2", port=silent.port, drop_every=1)
+        dns_module.query_engine = DNSQueryEngine(port=silent.port, timeout=0.2, queries=1)
 
         result2 = dns_module._test_dns_servers_internal()
         assert result2["all_passed"] is False
@@ -421,31 +430,11 @@ class TestModule:
             for test in server_result["tests"]:
                 assert test["success"] is False
                 error_msg = test.get("error", "")
-                assert error_msg and ("Command" in error_msg or "timeout" in error_msg.lower())
-
-        call_count = [0]
-
-        def mock_subprocess_mixed(cmd, *_args, **_kwargs):
-            nonlocal call_count
-            call_count[0] += 1
-
-            if 'dig' in cmd[0]:
-                mock_result = MagicMock()
-                # First call succeeds, rest fail
-                if call_count[0] == 1:
-                    mock_result.returncode = 0
-                    mock_result.stdout = "93.184.216.34"
-                    mock_result.stderr = ""
-                else:
-                    mock_result.returncode = 1
-                    mock_result.stdout = ""
-                    mock_result.stderr = "Connection refused"
-                return mock_result
-            return subprocess.CompletedProcess(cmd, 0, "OK", "")
-
-        call_count = [0]
+                assert error_msg and "timed out" in error_msg.lower()
 
-        monkeypatch.setattr(subprocess, "run", mock_subprocess_mixed)
+        # Primary answers, secondary is not listening
+        working = stub_resolver(address="127.0.0.1")
+        dns_module.query_engine = DNSQueryEngine(port=working.port, timeout=0.3, queries=1)
 
         result3 = dns_module._test_dns_servers_internal()
         assert result3["all_passed"] is False
@@ -456,6 +445,7 @@ class TestModule:
             for test in server_result["tests"]:
                 if test["success"]:
                     success_count += 1
+                    assert test["response"] == "93.184.216.34"
                 else:
                     failure_count += 1
 
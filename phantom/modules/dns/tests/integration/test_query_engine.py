@@ -0,0 +1,78 @@
+"""
+██████╗ ██╗  ██╗ █████╗ ███╗   ██╗████████╗ ██████╗ ███╗   ███╗
+██╔══██╗██║  ██║██╔══██╗████╗  ██║╚══██╔══╝██╔═══██╗████╗ ████║
+██████╔╝███████║███████║██╔██╗ ██║   ██║   ██║   ██║██╔████╔██║
+██╔═══╝ ██╔══██║██╔══██║██║╚██╗██║   ██║   ██║   ██║██║╚██╔╝██║
+██║     ██║  ██║██║  ██║██║ ╚████║   ██║   ╚██████╔╝██║ ╚═╝ ██║
+╚═╝     ╚═╝  ╚═╝╚═╝  ╚═╝╚═╝  ╚═══╝   ╚═╝    ╚═════╝ ╚═╝     ╚═╝
+
+DNS Query Engine Integration Tests
+
+Copyright (c) 2025 Rıza Emre ARAS <r.emrearas@proton.me>
+Licensed under AGPL-3.0 - see LICENSE file for details
+Third-party licenses - see THIRD_PARTY_LICENSES file for details
+WireGuard® is a registered trademark of Jason A. Donenfeld.
+"""
+
+import struct
+import time
+
+import pytest
+
+from phantom.modules.dns.lib.query_engine import (
+    DNSQueryEngine, build_query, parse_response, percentile, summarize
+)
+
+
+class TestQueryEngine:
+
+    def test_packet_round_trip(self):
+        """Test query encoding and parsing of compressed CNAME and A answers."""
+        query = build_query("www.example.com", 0x1234)
+        assert query[:2] == b"\x12\x34"
+        assert query[12:] == b"\x03www\x07example\x03com\x00\x00\x01\x00\x01"
+
+        cname = b"\xc0\x0c" + struct.pack("!HHIH", 5, 1, 60, 6) + b"\x03cdn\xc0\x10"
+        a_record = b"\xc0\x2d" + struct.pack("!HHIH", 1, 1, 60, 4) + bytes([93, 184, 216, 34])
+        header = b"\x12\x34" + struct.pack("!HHHHH", 0x8180, 1, 2, 0, 0)
+        response = parse_response(header + query[12:] + cname + a_record)
+
+        assert response.query_id == 0x1234
+        assert response.rcode_name == "NOERROR"
+        assert response.answers == ["cdn.example.com.", "93.184.216.34"]
+
+        with pytest.raises(ValueError):
+            parse_response(query)
+
+    def test_percentiles(self):
+        """Test nearest-rank percentiles and loss accounting."""
+        samples = [float(value) for value in range(1, 101)]
+
+        assert percentile(samples, 50) == 50.0
+        assert percentile(samples, 90) == 90.0
+        assert percentile(samples, 99) == 99.0
+        assert percentile([], 50) is None
+
+        stats = summarize(10, [4.0, 1.0, 3.0, 2.0])
+        assert stats.received == 4
+        assert stats.loss_percent == 60.0
+        assert (stats.min_ms, stats.p50_ms, stats.max_ms, stats.avg_ms) == (1.0, 2.0, 4.0, 2.5)
+
+    def test_servers_measured_concurrently(self, stub_resolver):
+        """Test that slow servers are queried in parallel, not one after another."""
+        first = stub_resolver(address="127.0.0.1", delay=0.2)
+        for address in ("127.0.0.2", "127.0.0.3", "127.0.0.4"):
+            stub_resolver(address=address, port=first.port, delay=0.2)
+        engine = DNSQueryEngine(port=first.port, timeout=1.0, queries=3, interval=0)
+
+        started = time.monotonic()
+        results = engine.benchmark(["127.0.0.1", "127.0.0.2", "127.0.0.3", "127.0.0.4"],
+                                   ["google.com", "cloudflare.com"])
+        elapsed = time.monotonic() - started
+
+        # 24 queries at 200 ms each would take 4.8 s serially
+        assert elapsed < 1.0
+        for benchmark in results.values():
+            assert benchmark.status() == ("OK", None)
+            assert benchmark.stats().received == 6
+            assert benchmark.answers("google.com") == ["93.184.216.34"]
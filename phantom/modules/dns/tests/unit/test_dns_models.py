@@ -25,7 +25,10 @@ from phantom.modules.dns.models.dns_models import (
     DNSServerStatusTest,
     DNSHealth,
     DNSStatusResult,
-    GetDNSServersResult
+    GetDNSServersResult,
+    DNSLatencyStats,
+    DNSRankEntry,
+    RankDNSResult
 )
 
 
@@ -459,3 +462,36 @@ class TestGetDNSServersResult:
         # OpenDNS
         opendns = GetDNSServersResult(primary="208.67.222.222", secondary="208.67.220.220")
         assert opendns.to_dict() == {"primary": "208.67.222.222", "secondary": "208.67.220.220"}
+
+
+class TestDNSLatencyStats:
+
+    def test_to_dict_without_samples(self):
+        stats = DNSLatencyStats(sent=5, received=0, loss_percent=100.0)
+        result = stats.to_dict()
+        assert result["loss_percent"] == 100.0
+        assert result["p50_ms"] is None
+
+    def test_nested_in_server_results(self):
+        stats = DNSLatencyStats(sent=2, received=2, loss_percent=0.0, min_ms=1.0, p50_ms=1.5, max_ms=2.0)
+        server_result = DNSTestServerResult(server="8.8.8.8", success=True, status="OK",
+                                            response_time_ms=1.5, latency=stats)
+        status = DNSServerStatusTest(server="8.8.8.8", tests=[], latency=stats)
+        assert server_result.to_dict()["latency"]["p50_ms"] == 1.5
+        assert status.to_dict()["latency"]["sent"] == 2
+
+
+class TestRankDNSResult:
+
+    def test_to_dict(self):
+        entry = DNSRankEntry(rank=1, server="1.1.1.1", status="OK",
+                             latency=DNSLatencyStats(sent=1, received=1, loss_percent=0.0, p50_ms=9.0),
+                             configured_as="primary")
+        result = RankDNSResult(domains=["google.com"], queries_per_domain=1, servers_ranked=1,
+                               ranking=[entry], recommended_primary="1.1.1.1")
+        data = result.to_dict()
+        assert data["ranking"][0]["rank"] == 1
+        assert data["ranking"][0]["configured_as"] == "primary"
+        assert data["ranking"][0]["latency"]["p50_ms"] == 9.0
+        assert data["recommended_primary"] == "1.1.1.1"
+        assert data["recommended_secondary"] is None
@@ -27,6 +27,15 @@ WireGuard® is a registered trademark of Jason A. Donenfeld.
 
 from typing import Callable, Dict, Any
 
+from phantom.modules.rule_batch import RuleBatch
+
+# INPUT rules in iptables-save canonical form
+GHOST_IPTABLES_RULES = [
+    "-p tcp -m tcp --dport 443 -j ACCEPT",
+    "-s 127.0.0.1/32 -p udp -m udp --dport 51820 -j ACCEPT",
+    "-p udp -m udp --dport 51820 -j DROP",
+]
+
 
 # noinspection PyUnusedLocal
 def configure_firewall(state: Dict[str, Any], run_command_func: Callable, logger) -> bool:
@@ -60,22 +69,13 @@ def configure_firewall(state: Dict[str, Any], run_command_func: Callable, logger
 
         state["changes"]["firewall_modified"] = True
 
-    # Add iptables rules for non-UFW systems
-    iptables_rules = [
-        ["iptables", "-A", "INPUT", "-p", "tcp", "--dport", "443", "-j", "ACCEPT"],
-    ]
-
-    # Localhost-only WireGuard access
-    iptables_restrict = [
-        ["iptables", "-A", "INPUT", "-p", "udp", "--dport", "51820", "-s", "127.0.0.1", "-j", "ACCEPT"],
-        ["iptables", "-A", "INPUT", "-p", "udp", "--dport", "51820", "-j", "DROP"]
-    ]
-
-    for rule in iptables_rules:
-        run_command_func(rule)
-
-    for rule in iptables_restrict:
-        run_command_func(rule)
+    # Add iptables rules for non-UFW systems: wstunnel HTTPS and
+    # localhost-only WireGuard access, kept in order in one transaction
+    batch = RuleBatch(run_command_func)
+    batch.ensure_rules("filter", "INPUT", GHOST_IPTABLES_RULES)
+    result = batch.apply()
+    if not result.success:
+        logger.warning(f"Failed to apply Ghost Mode iptables rules: {result.error}")
 
     return True
 
@@ -113,11 +113,7 @@ def remove_firewall_rules(state: Dict[str, Any], run_command_func: Callable, log
         run_command_func(["ufw", "reload"])
 
     # Clean up iptables rules
-    iptables_rules = [
-        ["iptables", "-D", "INPUT", "-p", "tcp", "--dport", "443", "-j", "ACCEPT"],
-        ["iptables", "-D", "INPUT", "-p", "udp", "--dport", "51820", "-s", "127.0.0.1", "-j", "ACCEPT"],
-        ["iptables", "-D", "INPUT", "-p", "udp", "--dport", "51820", "-j", "DROP"]
-    ]
-
-    for rule in iptables_rules:
-        run_command_func(rule)
+    batch = RuleBatch(run_command_func)
+    for rule in GHOST_IPTABLES_RULES:
+        batch.remove_rule("filter", "INPUT", rule)
+    batch.apply()
@@ -259,6 +259,9 @@ class GhostModule(BaseModule):
                 f"Please create an A record for {domain} pointing to {server_ip} and try again."
             )
 
+        # Record the current state before changing it
+        self._snapshot_state("ghost_enable", {"ghost_state": self.state_file})
+
         # Initialize state with domain
         self.state = state_manager.init_state(server_ip, domain)
         state_manager.save_state(self.state_file, self.state, self._write_json_file)
@@ -342,6 +345,8 @@ class GhostModule(BaseModule):
             # Return as dict for API compatibility
             return result.to_dict()
 
+        self._snapshot_state("ghost_disable", {"ghost_state": self.state_file})
+
         try:
             self.logger.info("Disabling Ghost Mode...")
 
@@ -34,6 +34,7 @@ AUTO_PERSISTENT_KEEP_ALIVE = 5  # Default PersistentKeepalive value in seconds
 
 # Interface Names
 VPN_INTERFACE_NAME = "wg_vpn"
+PROBE_INTERFACE_NAME = "wg_probe"
 DEFAULT_MAIN_INTERFACE = "wg_main"
 
 # Service Names
@@ -63,6 +64,19 @@ DEFAULT_LOG_LINES = 50
 INTERFACE_SETUP_DELAY = 2  # seconds
 SERVICE_START_DELAY = 1  # seconds
 
+# Session Log
+SESSION_LOG_FILE = "multihop-session-current.log"  # stored in the logs directory
+SESSION_LOG_MAX_BYTES = 1024 * 1024  # rotate the current file beyond this size
+SESSION_LOG_ARCHIVES = 5  # gzip archives kept per session
+SESSION_LOG_BLOCK_SIZE = 8192  # bytes read per step when seeking back from the end
+
+# Exit Pool
+EXIT_HEALTH_FILE = "multihop_exit_health.json"  # stored in the data directory
+EXIT_PROBE_TIMEOUT = 5  # seconds to wait for a probe handshake
+EXIT_PROBE_POLL_INTERVAL = 0.02  # seconds between handshake polls
+EXIT_MAX_HANDSHAKE_AGE = 180  # seconds, older handshakes make an exit unhealthy
+EXIT_MAX_FAILURES = 3  # consecutive failed probes before an exit is skipped
+
 # Required Config Sections and Keys
 REQUIRED_SECTIONS = ['[Interface]', '[Peer]']
 REQUIRED_INTERFACE_KEYS = ['PrivateKey']
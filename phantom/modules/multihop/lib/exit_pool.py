@@ -0,0 +1,354 @@
+"""
+██████╗ ██╗  ██╗ █████╗ ███╗   ██╗████████╗ ██████╗ ███╗   ███╗
+██╔══██╗██║  ██║██╔══██╗████╗  ██║╚══██╔══╝██╔═══██╗████╗ ████║
+██████╔╝███████║███████║██╔██╗ ██║   ██║   ██║   ██║██╔████╔██║
+██╔═══╝ ██╔══██║██╔══██║██║╚██╗██║   ██║   ██║   ██║██║╚██╔╝██║
+██║     ██║  ██║██║  ██║██║ ╚████║   ██║   ╚██████╔╝██║ ╚═╝ ██║
+╚═╝     ╚═╝  ╚═╝╚═╝  ╚═╝╚═╝  ╚═══╝   ╚═╝    ╚═════╝ ╚═╝     ╚═╝
+
+TR: Multihop Modülü Çıkış Havuzu
+    =============================
+
+    İçe aktarılmış çıkış yapılandırmalarını sağlık ve gecikmeye göre sıralar.
+    Boştaki çıkışlar geçici bir WireGuard arayüzü üzerinden handshake
+    gecikmesiyle ölçülür, aktif çıkış canlı handshake ve trafik sayaçlarıyla
+    değerlendirilir. Sonuçlar sağlık dosyasına yazılır; izleme servisi aktif
+    çıkış bozulduğunda en iyi sağlıklı çıkışa canlı arayüz üzerinde geçer.
+
+EN: Multihop Module Exit Pool
+    ==========================
+
+    Ranks imported exit configurations by health and latency. Idle exits are
+    measured by their handshake latency over a temporary WireGuard interface,
+    the active exit by its live handshake and transfer counters. Results are
+    written to the health file; the monitor service switches the live
+    interface to the best healthy exit when the active one degrades.
+
+Copyright (c) 2025 Rıza Emre ARAS <r.emrearas@proton.me>
+Licensed under AGPL-3.0 - see LICENSE file for details
+Third-party licenses - see THIRD_PARTY_LICENSES file for details
+WireGuard® is a registered trademark of Jason A. Donenfeld.
+"""
+
+import json
+import os
+import tempfile
+import time
+from datetime import datetime
+from pathlib import Path
+from typing import Dict, Any, List, Optional, Iterable
+
+from phantom.modules.core.lib.peer_state import PeerStateReader
+from phantom.modules.rule_batch import RuleBatch
+from .common_tools import (
+    VPN_INTERFACE_NAME, PROBE_INTERFACE_NAME, MULTIHOP_TABLE_NAME,
+    EXIT_PROBE_TIMEOUT, EXIT_PROBE_POLL_INTERVAL, EXIT_MAX_HANDSHAKE_AGE,
+    EXIT_MAX_FAILURES, build_wireguard_config_path
+)
+from .config_handler import ConfigHandler
+from ..models import ExitHealth
+
+
+class ExitPool:
+
+    def __init__(self, exit_configs_dir: Path, health_file: Path, logger, run_command_func,
+                 clock=time.monotonic, sleep=time.sleep):
+        self.exit_configs_dir = exit_configs_dir
+        self.health_file = health_file
+        self.logger = logger
+        self._run_command = run_command_func
+        self._clock = clock
+        self._sleep = sleep
+        self.config_handler = ConfigHandler(exit_configs_dir, {}, logger)
+
+    def exit_names(self) -> List[str]:
+        return sorted(config_file.stem for config_file in self.exit_configs_dir.glob("*.conf"))
+
+    # Health file
+
+    def load_health(self) -> Dict[str, ExitHealth]:
+        """Read the last probe results of exits that still exist."""
+        try:
+            with open(self.health_file, 'r') as f:
+                data = json.load(f)
+        except (OSError, ValueError):
+            return {}
+
+        existing = set(self.exit_names())
+        return {entry["name"]: ExitHealth.from_dict(entry)
+                for entry in data.get("exits", []) if entry.get("name") in existing}
+
+    def save_health(self, records: List[ExitHealth]):
+        self.health_file.parent.mkdir(parents=True, exist_ok=True)
+        payload = {
+            "updated_at": datetime.now().isoformat(),
+            "exits": [record.to_dict() for record in records]
+        }
+        fd, tmp_path = tempfile.mkstemp(dir=self.health_file.parent, prefix=f".{self.health_file.name}.")
+        try:
+            with os.fdopen(fd, 'w') as f:
+                json.dump(payload, f, indent=2)
+            os.replace(tmp_path, self.health_file)
+        except OSError:
+            os.unlink(tmp_path)
+            raise
+
+    @staticmethod
+    def ranked(records: Iterable[ExitHealth]) -> List[ExitHealth]:
+        """Healthy exits first, then fewer failures, then lower handshake latency."""
+        ordered = sorted(records, key=lambda r: (
+            not r.healthy,
+            r.consecutive_failures,
+            r.handshake_latency_ms if r.handshake_latency_ms is not None else float("inf"),
+            r.name
+        ))
+        for position, record in enumerate(ordered, 1):
+            record.rank = position
+        return ordered
+
+    def health_table(self, active_exit: Optional[str] = None) -> List[ExitHealth]:
+        records = self.ranked(self.load_health().values())
+        for record in records:
+            record.active = record.name == active_exit
+        return records
+
+    def select_best(self, exclude: Optional[str] = None,
+                    records: Optional[List[ExitHealth]] = None) -> Optional[str]:
+        """Name of the best ranked healthy exit other than exclude."""
+        return next(iter(self.candidates(exclude, records)), None)
+
+    def candidates(self, exclude: Optional[str] = None,
+                   records: Optional[List[ExitHealth]] = None) -> List[str]:
+        if records is None:
+            records = self.ranked(self.load_health().values())
+        return [record.name for record in records
+                if record.healthy and record.name != exclude
+                and record.consecutive_failures < EXIT_MAX_FAILURES
+                and (self.exit_configs_dir / f"{record.name}.conf").exists()]
+
+    # Probing
+
+    def probe_all(self, active_exit: Optional[str] = None,
+                  vpn_interface: str = VPN_INTERFACE_NAME) -> List[ExitHealth]:
+        """Probe every exit, persist and return the ranked health table."""
+        previous = self.load_health()
+        records = [self.probe_exit(name, active_exit, previous.get(name), vpn_interface)
+                   for name in self.exit_names()]
+        return self.record_probes(records)
+
+    def record_probes(self, records: List[ExitHealth]) -> List[ExitHealth]:
+        """Rank and persist the results of one probe round."""
+        records = self.ranked(records)
+        self.save_health(records)
+        return records
+
+    def probe_exit(self, exit_name: str, active_exit: Optional[str] = None,
+                   previous: Optional[ExitHealth] = None,
+                   vpn_interface: str = VPN_INTERFACE_NAME) -> ExitHealth:
+        if exit_name == active_exit:
+            record = self._probe_active(exit_name, previous, vpn_interface)
+        else:
+            record = self._probe_idle(exit_name, previous)
+        return self.stamp_probe(record, previous)
+
+    @staticmethod
+    def stamp_probe(record: ExitHealth, previous: Optional[ExitHealth]) -> ExitHealth:
+        """Set the probe time and carry the failure streak over from the previous result."""
+        record.probed_at = datetime.now().isoformat()
+        record.consecutive_failures = 0 if record.healthy else (
+            (previous.consecutive_failures if previous else 0) + 1)
+        return record
+
+    def _probe_active(self, exit_name: str, previous: Optional[ExitHealth], vpn_interface: str) -> ExitHealth:
+        """Judge the active exit from its live handshake and transfer counters."""
+        latency = previous.handshake_latency_ms if previous else None
+        result = self._run_command(["wg", "show", vpn_interface, "dump"])
+        if not result["success"]:
+            return ExitHealth(name=exit_name, healthy=False, active=True, handshake_latency_ms=latency,
+                              error="VPN interface not available")
+
+        handshake, transfer = 0, 0
+        for line in result["stdout"].strip().split('\n')[1:]:
+            fields = line.split('\t')
+            if len(fields) >= 7:
+                handshake = max(handshake, int(fields[4]))
+                transfer += int(fields[5]) + int(fields[6])
+
+        now = time.time()
+        age = int(now - handshake) if handshake else None
+        throughput = None
+        if previous and previous.active and previous.transfer_bytes is not None and previous.probed_at:
+            elapsed = now - datetime.fromisoformat(previous.probed_at).timestamp()
+            if elapsed > 0 and transfer >= previous.transfer_bytes:
+                throughput = round((transfer - previous.transfer_bytes) / elapsed, 1)
+
+        healthy = age is not None and age <= EXIT_MAX_HANDSHAKE_AGE
+        return ExitHealth(
+            name=exit_name, healthy=healthy, active=True, handshake_latency_ms=latency,
+            throughput_bps=throughput, handshake_age=age, transfer_bytes=transfer,
+            error=None if healthy else "Handshake stale"
+        )
+
+    def _probe_idle(self, exit_name: str, previous: Optional[ExitHealth]) -> ExitHealth:
+        """Measure handshake latency of an idle exit, blocking until it is known."""
+        probe = self.begin_idle_probe(exit_name, previous)
+        elapsed = None
+        try:
+            if probe.failure is None:
+                elapsed = self.wait_for_handshake(PROBE_INTERFACE_NAME, probe.started, probe.started_wall)
+        finally:
+            self.end_idle_probe(probe)
+        return probe.result(elapsed)
+
+    def begin_idle_probe(self, exit_name: str, previous: Optional[ExitHealth] = None) -> "IdleProbe":
+        """Bring a throwaway interface up for an idle exit without waiting.
+
+        The probe interface carries no addresses or routes, so client traffic
+        is never affected; the peer's keepalive starts the handshake as soon
+        as the link comes up. Callers poll handshake_elapsed() and must pair
+        every call with end_idle_probe().
+        """
+        probe = IdleProbe(exit_name)
+        config_file = self.exit_configs_dir / f"{exit_name}.conf"
+        try:
+            clean_config = self.config_handler.clean_vpn_config(config_file.read_text())
+        except OSError as e:
+            probe.failure = ExitHealth(name=exit_name, healthy=False, error=f"Config not readable: {e}")
+            return probe
+        if 'PersistentKeepalive' not in clean_config:
+            clean_config += "\nPersistentKeepalive = 1\n"
+
+        fd, probe.config_path = tempfile.mkstemp(prefix=f".{PROBE_INTERFACE_NAME}.", suffix=".probe")
+        with os.fdopen(fd, 'w') as f:
+            f.write(clean_config)
+
+        self._run_command(["ip", "link", "del", PROBE_INTERFACE_NAME])
+        for command in (["ip", "link", "add", PROBE_INTERFACE_NAME, "type", "wireguard"],
+                        ["wg", "setconf", PROBE_INTERFACE_NAME, probe.config_path]):
+            result = self._run_command(command)
+            if not result["success"]:
+                probe.failure = ExitHealth(name=exit_name, healthy=False,
+                                           handshake_latency_ms=previous.handshake_latency_ms if previous else None,
+                                           error=f"Probe setup failed: {' '.join(command)}")
+                return probe
+
+        probe.started_wall = int(time.time())
+        probe.started = self._clock()
+        self._run_command(["ip", "link", "set", "up", "dev", PROBE_INTERFACE_NAME])
+        return probe
+
+    def end_idle_probe(self, probe: "IdleProbe"):
+        """Remove the probe interface and its temporary config."""
+        if probe.config_path is None:
+            return
+        self._run_command(["ip", "link", "del", PROBE_INTERFACE_NAME])
+        os.unlink(probe.config_path)
+        probe.config_path = None
+
+    def handshake_elapsed(self, interface: str, started: float, started_wall: int) -> Optional[float]:
+        """Seconds from started if interface has a handshake newer than started_wall, else None.
+
+        A single read over netlink or the UAPI socket; nothing is forked
+        unless both are unavailable.
+        """
+        handshakes = PeerStateReader(self._run_command, interface).latest_handshakes()
+        if handshakes and max(handshakes) >= started_wall:
+            return self._clock() - started
+        return None
+
+    def wait_for_handshake(self, interface: str, started: float, started_wall: int,
+                           timeout: float = EXIT_PROBE_TIMEOUT) -> Optional[float]:
+        """Blocking form of handshake_elapsed() for synchronous callers such as the API."""
+        while True:
+            elapsed = self.handshake_elapsed(interface, started, started_wall)
+            if elapsed is not None:
+                return elapsed
+            if self._clock() - started >= timeout:
+                return None
+            self._sleep(EXIT_PROBE_POLL_INTERVAL)
+
+    # Failover
+
+    def switch_exit(self, exit_name: str, vpn_interface: str = VPN_INTERFACE_NAME,
+                    timeout: float = EXIT_PROBE_TIMEOUT) -> Dict[str, Any]:
+        """Move the live VPN interface to another exit and wait for its handshake."""
+        result = self.begin_switch(exit_name, vpn_interface)
+        if not result["success"]:
+            return result
+
+        handshake = self.wait_for_handshake(vpn_interface, result["started"], result["started_wall"], timeout)
+        return self.switch_result(result, handshake)
+
+    def begin_switch(self, exit_name: str, vpn_interface: str = VPN_INTERFACE_NAME) -> Dict[str, Any]:
+        """Move the live VPN interface to another exit without tearing it down.
+
+        Keys and peer are replaced with wg setconf; the address and the
+        multihop default route are swapped in one ip batch. Routing rules and
+        firewall rules reference the interface, not the exit, and stay as
+        they are. Does not wait for the handshake: on success the result
+        carries the start times for handshake_elapsed() and switch_result().
+        """
+        started_wall = int(time.time())
+        started = self._clock()
+
+        try:
+            config_content = (self.exit_configs_dir / f"{exit_name}.conf").read_text()
+        except OSError as e:
+            return {"success": False, "exit_name": exit_name, "error": f"Config not readable: {e}"}
+
+        interface_config = self.config_handler.parse_vpn_config(config_content)
+        if not interface_config:
+            return {"success": False, "exit_name": exit_name, "error": "Invalid Address in exit config"}
+
+        vpn_config_path = build_wireguard_config_path(vpn_interface)
+        with open(vpn_config_path, 'w') as f:
+            f.write(self.config_handler.clean_vpn_config(config_content))
+
+        result = self._run_command(["wg", "setconf", vpn_interface, vpn_config_path])
+        if not result["success"]:
+            return {"success": False, "exit_name": exit_name, "error": "wg setconf failed"}
+
+        batch = RuleBatch(self._run_command)
+        batch.ip_command(f"address flush dev {vpn_interface}")
+        batch.ip_command(f"address add {interface_config['address']} dev {vpn_interface}")
+        batch.ip_command(f"route replace default dev {vpn_interface} table {MULTIHOP_TABLE_NAME}")
+        batch_result = batch.apply()
+        if not batch_result.success:
+            return {"success": False, "exit_name": exit_name, "error": batch_result.error}
+
+        return {"success": True, "exit_name": exit_name, "started": started, "started_wall": started_wall}
+
+    def switch_result(self, switch: Dict[str, Any], handshake: Optional[float]) -> Dict[str, Any]:
+        """Final switch_exit() result once the handshake arrived (or did not)."""
+        return {
+            "success": handshake is not None,
+            "exit_name": switch["exit_name"],
+            "seconds": round(self._clock() - switch["started"], 3),
+            "error": None if handshake is not None else "No handshake after switching exit"
+        }
+
+
+class IdleProbe:
+    """A probe interface that is up and waiting for an idle exit's handshake.
+
+    Attributes:
+        exit_name: Exit being probed
+        config_path: Temporary WireGuard config, None once removed
+        started: Clock reading when the link came up
+        started_wall: Unix time when the link came up
+        failure: Result to report when the probe could not be set up
+    """
+
+    def __init__(self, exit_name: str):
+        self.exit_name = exit_name
+        self.config_path: Optional[str] = None
+        self.started = 0.0
+        self.started_wall = 0
+        self.failure: Optional[ExitHealth] = None
+
+    def result(self, elapsed: Optional[float]) -> ExitHealth:
+        if self.failure is not None:
+            return self.failure
+        if elapsed is None:
+            return ExitHealth(name=self.exit_name, healthy=False, error="No handshake within probe timeout")
+        return ExitHealth(name=self.exit_name, healthy=True, handshake_latency_ms=round(elapsed * 1000, 1))
@@ -34,6 +34,7 @@ from .common_tools import (
     build_wireguard_config_path, PEER_TRAFFIC_PRIORITY,
     MULTIHOP_TRAFFIC_PRIORITY, MULTIHOP_TABLE_NAME, DEFAULT_MAIN_INTERFACE
 )
+from .routing_manager import build_multihop_rule_batch
 
 
 class NetworkAdmin:
@@ -173,28 +174,14 @@ class NetworkAdmin:
             wg_network = wg_config.get("network", DEFAULT_WG_NETWORK)
             wg_interface_name = wg_config.get("interface", DEFAULT_MAIN_INTERFACE)
 
-            cleanup_commands = [
-                ["sh", "-c", f"ip link del {VPN_INTERFACE_NAME} 2>/dev/null || true"],
-
-                ["sh", "-c",
-                 f"ip rule del from {wg_network} to {wg_network} table main priority {PEER_TRAFFIC_PRIORITY} 2>/dev/null || true"],
-                ["sh", "-c",
-                 f"ip rule del from {wg_network} table {MULTIHOP_TABLE_NAME} priority {MULTIHOP_TRAFFIC_PRIORITY} 2>/dev/null || true"],
-
-                ["sh", "-c", f"ip route flush table {MULTIHOP_TABLE_NAME} 2>/dev/null || true"],
-
-                ["sh", "-c",
-                 f"iptables -t nat -D POSTROUTING -s {wg_network} -o {VPN_INTERFACE_NAME} -j MASQUERADE 2>/dev/null || true"],
-                ["sh", "-c",
-                 f"iptables -D FORWARD -i {wg_interface_name} -o {VPN_INTERFACE_NAME} -j ACCEPT 2>/dev/null || true"],
-                ["sh", "-c",
-                 f"iptables -D FORWARD -i {VPN_INTERFACE_NAME} -o {wg_interface_name} -m state --state RELATED,ESTABLISHED -j ACCEPT 2>/dev/null || true"],
-                ["sh", "-c",
-                 f"iptables -D FORWARD -i {wg_interface_name} -o {wg_interface_name} -s {wg_network} -d {wg_network} -j ACCEPT 2>/dev/null || true"]
-            ]
+            self._run_command(["sh", "-c", f"ip link del {VPN_INTERFACE_NAME} 2>/dev/null || true"])
 
-            for cmd in cleanup_commands:
-                self._run_command(cmd)
+            # Only rules that are actually present are deleted, in one transaction
+            batch = build_multihop_rule_batch(self._run_command, wg_network, VPN_INTERFACE_NAME,
+                                              wg_interface_name, present=False)
+            result = batch.apply()
+            if not result.success:
+                self.logger.warning(f"Multihop rule cleanup incomplete: {result.error}")
 
             if not self._verify_rules_cleaned(wg_network):
                 self.logger.warning("Some rules may still exist after cleanup")
@@ -24,17 +24,51 @@ Third-party licenses - see THIRD_PARTY_LICENSES file for details
 WireGuard® is a registered trademark of Jason A. Donenfeld.
 """
 
+import ipaddress
 import time
 from pathlib import Path
 from typing import Dict, Any
 from textwrap import dedent
 
+from phantom.modules.rule_batch import RuleBatch
 from .common_tools import (
     SYSTEMD_NETWORK_DIR, RT_TABLES_FILE, MULTIHOP_TABLE_ID,
     MULTIHOP_TABLE_NAME, PEER_TRAFFIC_PRIORITY, MULTIHOP_TRAFFIC_PRIORITY,
     NETWORKD_SERVICE_NAME, SERVICE_START_DELAY, DEFAULT_MAIN_INTERFACE, build_networkd_config_path,
 )
 
+IP_FORWARD_FILE = "/proc/sys/net/ipv4/ip_forward"
+
+
+def build_multihop_rule_batch(run_command, wg_network: str, vpn_interface: str, wg_interface: str,
+                              present: bool = True) -> RuleBatch:
+    """Describe the complete multihop rule set; present=False describes its removal."""
+    network = str(ipaddress.ip_network(wg_network, strict=False))
+    batch = RuleBatch(run_command)
+
+    nat_rule = f"-s {network} -o {vpn_interface} -j MASQUERADE"
+    forward_rules = [
+        f"-i {wg_interface} -o {vpn_interface} -j ACCEPT",
+        f"-i {vpn_interface} -o {wg_interface} -m state --state RELATED,ESTABLISHED -j ACCEPT",
+        f"-s {network} -d {network} -i {wg_interface} -o {wg_interface} -j ACCEPT",
+    ]
+
+    if present:
+        batch.ensure_rule("nat", "POSTROUTING", nat_rule)
+        batch.ensure_rules("filter", "FORWARD", forward_rules)
+        batch.ensure_ip_rule(PEER_TRAFFIC_PRIORITY, network, "main", destination=network)
+        batch.ensure_ip_rule(MULTIHOP_TRAFFIC_PRIORITY, network, MULTIHOP_TABLE_NAME)
+        batch.ip_command(f"route replace default dev {vpn_interface} table {MULTIHOP_TABLE_NAME}")
+    else:
+        batch.remove_rule("nat", "POSTROUTING", nat_rule)
+        for rule in forward_rules:
+            batch.remove_rule("filter", "FORWARD", rule)
+        batch.remove_ip_rule(PEER_TRAFFIC_PRIORITY, network, "main", destination=network)
+        batch.remove_ip_rule(MULTIHOP_TRAFFIC_PRIORITY, network, MULTIHOP_TABLE_NAME)
+        batch.ip_command(f"route flush table {MULTIHOP_TABLE_NAME}")
+
+    return batch
+
 
 class RoutingManager:
 
@@ -143,73 +177,37 @@ class RoutingManager:
             wg_config = self.config.get("wireguard", {})
             wg_interface_name = wg_config.get("interface", DEFAULT_MAIN_INTERFACE)
 
-            # Pre-setup: ensure multihop table exists
+            # Pre-setup: ensure multihop table exists and forwarding is on
             self._ensure_routing_table_exists()
+            self._enable_ip_forwarding()
+
+            # Desired state is diffed against the live ruleset and applied in
+            # one iptables-restore transaction plus one ip batch
+            batch = build_multihop_rule_batch(self._run_command, wg_network, vpn_interface, wg_interface_name)
+            result = batch.apply()
 
-            # Cleanup existing rules to avoid duplicates
-            cleanup_commands = [
-                ["sh", "-c",
-                 f"ip rule del from {wg_network} to {wg_network} table main priority {PEER_TRAFFIC_PRIORITY} 2>/dev/null || true"],
-                ["sh", "-c",
-                 f"ip rule del from {wg_network} table {MULTIHOP_TABLE_NAME} priority {MULTIHOP_TRAFFIC_PRIORITY} 2>/dev/null || true"],
-                ["sh", "-c", f"ip route del default table {MULTIHOP_TABLE_NAME} 2>/dev/null || true"],
-                ["sh", "-c",
-                 f"iptables -t nat -D POSTROUTING -s {wg_network} -o {vpn_interface} -j MASQUERADE 2>/dev/null || true"],
-                ["sh", "-c",
-                 f"iptables -D FORWARD -i {wg_interface_name} -o {vpn_interface} -j ACCEPT 2>/dev/null || true"],
-                ["sh", "-c",
-                 f"iptables -D FORWARD -i {vpn_interface} -o {wg_interface_name} -m state --state RELATED,ESTABLISHED -j ACCEPT 2>/dev/null || true"]
-            ]
-
-            # Run cleanup commands (ignore errors)
-            for cmd in cleanup_commands:
-                self._run_command(cmd)
-
-            # Setup commands
-            setup_commands = [
-                ["sh", "-c", "echo 1 > /proc/sys/net/ipv4/ip_forward"],
-                ["ip", "rule", "add", "from", wg_network, "to", wg_network, "table", "main", "priority",
-                 str(PEER_TRAFFIC_PRIORITY)],
-                ["ip", "rule", "add", "from", wg_network, "table", MULTIHOP_TABLE_NAME, "priority",
-                 str(MULTIHOP_TRAFFIC_PRIORITY)],
-                ["ip", "route", "add", "default", "dev", vpn_interface, "table", MULTIHOP_TABLE_NAME],
-                ["iptables", "-t", "nat", "-A", "POSTROUTING", "-s", wg_network, "-o", vpn_interface, "-j",
-                 "MASQUERADE"],
-                ["iptables", "-A", "FORWARD", "-i", wg_interface_name, "-o", vpn_interface, "-j", "ACCEPT"],
-                ["iptables", "-A", "FORWARD", "-i", vpn_interface, "-o", wg_interface_name, "-m", "state", "--state",
-                 "RELATED,ESTABLISHED", "-j", "ACCEPT"],
-                ["iptables", "-A", "FORWARD", "-i", wg_interface_name, "-o", wg_interface_name, "-s", wg_network, "-d",
-                 wg_network, "-j", "ACCEPT"]
-            ]
-
-            success_count = 0
-            failed_commands = []
-
-            for cmd in setup_commands:
-                result = self._run_command(cmd)
-                if result["success"]:
-                    success_count += 1
-                else:
-                    # Track failed commands for reporting
-                    cmd_str = " ".join(cmd) if isinstance(cmd, list) else cmd
-                    error = result.get("error", "Unknown error")
-                    self.logger.error(f"Failed command: {cmd_str} - Error: {error}")
-                    failed_commands.append(f"{cmd_str}: {error}")
-
-            # Allow up to 2 failures (some cleanup commands may fail normally)
-            if success_count < len(setup_commands) - 2:
+            if not result.success:
+                self.logger.error(f"Failed to apply multihop rule batch: {result.error}")
                 return {
                     "success": False,
-                    "error": f"Failed to execute firewall rules. {len(failed_commands)} commands failed",
-                    "failed_commands": failed_commands
+                    "error": f"Failed to execute firewall rules. {result.error}",
+                    "failed_commands": result.iptables_changes + result.ip_changes
                 }
 
+            self.logger.info(f"Multihop rules applied ({len(result.iptables_changes)} iptables, "
+                             f"{len(result.ip_changes)} ip changes, {result.commands_run} commands)")
             return {"success": True}
 
         except Exception as e:
             self.logger.error(f"Failed to setup routing rules manually: {e}")
             return {"success": False, "error": str(e)}
 
+    def _enable_ip_forwarding(self):
+        try:
+            Path(IP_FORWARD_FILE).write_text("1\n")
+        except OSError:
+            self._run_command(["sysctl", "-w", "net.ipv4.ip_forward=1"])
+
     def remove_networkd_routing_policy(self, vpn_interface: str) -> bool:
         try:
             network_file = Path(build_networkd_config_path(vpn_interface))
@@ -24,13 +24,253 @@ Third-party licenses - see THIRD_PARTY_LICENSES file for details
 WireGuard® is a registered trademark of Jason A. Donenfeld.
 """
 
+import os
 import re
+import gzip
+import time
 from pathlib import Path
-from typing import Dict, Any, List
+from typing import Dict, Any, List, Optional, Tuple
 from datetime import datetime
 from textwrap import dedent
 
-from .common_tools import DEFAULT_LOG_LINES, LOG_LEVELS
+from .common_tools import (
+    DEFAULT_LOG_LINES,
+    LOG_LEVELS,
+    SESSION_LOG_FILE,
+    SESSION_LOG_MAX_BYTES,
+    SESSION_LOG_ARCHIVES,
+    SESSION_LOG_BLOCK_SIZE
+)
+
+_HEADER_PREFIX = b"#phantom-session-log "
+_COUNT_BLOCK_SIZE = 65536
+
+
+class SessionLogFile:
+    """Append-only session log with size-capped rotation and byte-offset cursors.
+
+    Every file starts with a one-line header holding the logical offset of
+    its first byte and the number of lines before it. Offsets keep growing
+    across rotations, and each session starts at a time-based origin, so a
+    cursor handed out earlier is either still valid or detectably stale.
+
+    When the current file grows past max_bytes it is compressed to
+    ``<name>.<offset>.gz`` and replaced with an empty file (the archive is
+    written before the swap, so readers never see a gap). Only the newest
+    ``archives`` archives are kept.
+
+    There is a single line writer (the monitor service); readers never
+    take locks.
+    """
+
+    def __init__(self, path: Path, max_bytes: int = SESSION_LOG_MAX_BYTES,
+                 archives: int = SESSION_LOG_ARCHIVES, block_size: int = SESSION_LOG_BLOCK_SIZE):
+        self.path = Path(path)
+        self.max_bytes = max_bytes
+        self.archives = archives
+        self.block_size = block_size
+
+    # Writing
+
+    def start(self, text: str = "") -> None:
+        """Begin a new session: drop the previous file and archives, then write text."""
+        origin = self._session_origin()
+        try:
+            with open(self.path, "rb") as f:
+                base, _, header_len = self._read_header(f)
+                # Sessions started within microseconds must not share offsets
+                origin = max(origin, base + os.fstat(f.fileno()).st_size - header_len + 1)
+        except (OSError, ValueError):
+            pass
+        self.remove()
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        self._replace_current(origin, 0, text.encode())
+
+    def append(self, line: str) -> None:
+        """Append one line, rotating the file once it exceeds max_bytes."""
+        if not self.path.exists():
+            self.path.parent.mkdir(parents=True, exist_ok=True)
+            self._replace_current(self._session_origin(), 0)
+        with open(self.path, "ab") as f:
+            f.write(line.encode())
+            size = f.tell()
+        if size > self.max_bytes:
+            self._rotate()
+
+    def remove(self) -> None:
+        for _, archive in self._archive_list():
+            archive.unlink(missing_ok=True)
+        self.path.unlink(missing_ok=True)
+
+    @staticmethod
+    def _session_origin() -> int:
+        # Microseconds since the epoch: later sessions start beyond any earlier offset
+        return time.time_ns() // 1000
+
+    def _replace_current(self, offset: int, lines: int, content: bytes = b"") -> None:
+        tmp = self.path.with_name(f".{self.path.name}.tmp")
+        with open(tmp, "wb") as f:
+            f.write(self._header(offset, lines) + content)
+        os.replace(tmp, self.path)
+
+    def _rotate(self) -> None:
+        with open(self.path, "rb") as f:
+            offset, lines, _ = self._read_header(f)
+            data = f.read()
+
+        archive = self._archive_path(offset)
+        tmp = archive.with_name(f".{archive.name}.tmp")
+        with gzip.open(tmp, "wb") as gz:
+            gz.write(self._header(offset, lines) + data)
+        os.replace(tmp, archive)
+        self._replace_current(offset + len(data), lines + data.count(b"\n"))
+
+        for _, old in self._archive_list()[:-self.archives or None]:
+            old.unlink(missing_ok=True)
+
+    # Reading
+
+    def read(self, lines: int = DEFAULT_LOG_LINES, since_offset: Optional[int] = None) -> Dict[str, Any]:
+        """Return the last lines of the log, or the lines written after a cursor.
+
+        Without since_offset the file is read backwards in blocks from the
+        end until enough lines are found. With since_offset only the bytes
+        after the cursor are read (and at most the last ``lines`` of them
+        are returned). A cursor from another session or older than the
+        oldest archive is answered like a first call, with reset=True.
+
+        Args:
+            lines: Maximum number of lines to return
+            since_offset: Offset returned by a previous call
+
+        Returns:
+            Dict with lines, offset (cursor for the next call), reset,
+            truncated (more lines than returned) and total_lines
+
+        Raises:
+            FileNotFoundError: If there is no session log
+        """
+        lines = max(0, int(lines))
+        with open(self.path, "rb") as f:
+            base, lines_before, header_len = self._read_header(f)
+            end_pos = self._complete_end(f, header_len, os.fstat(f.fileno()).st_size)
+            end = base + end_pos - header_len
+
+            archives = self._archive_list()
+            oldest = archives[0][0] if archives else base
+            reset = since_offset is not None and not oldest <= int(since_offset) <= end
+
+            since = oldest if since_offset is None or reset else int(since_offset)
+            found, complete = self._tail(f, header_len + max(0, since - base), end_pos, lines)
+            if complete and since < base and len(found) < lines:
+                # Just after a rotation the current file alone is not enough
+                earlier, complete = self._archived_lines(archives, since, base, lines - len(found))
+                found = earlier + found
+
+            total_lines = lines_before + self._count_lines(f, header_len, end_pos)
+
+        return {
+            "lines": [line.decode("utf-8", "replace") for line in found],
+            "offset": end,
+            "reset": reset,
+            "truncated": not complete,
+            "total_lines": total_lines
+        }
+
+    def _complete_end(self, f, start: int, size: int) -> int:
+        """Position just after the last newline, so a line being written is not returned."""
+        pos = size
+        while pos > start:
+            step = min(self.block_size, pos - start)
+            f.seek(pos - step)
+            newline = f.read(step).rfind(b"\n")
+            if newline >= 0:
+                return pos - step + newline + 1
+            pos -= step
+        return start
+
+    def _tail(self, f, start: int, end: int, count: int) -> Tuple[List[bytes], bool]:
+        """Last count lines between start and end, reading backwards block by block.
+
+        Returns:
+            (lines, complete) where complete means no line before them was skipped
+        """
+        pos, chunks, newlines = end, [], 0
+        while pos > start and newlines <= count:
+            step = min(self.block_size, pos - start)
+            pos -= step
+            f.seek(pos)
+            chunk = f.read(step)
+            chunks.append(chunk)
+            newlines += chunk.count(b"\n")
+
+        found = b"".join(reversed(chunks)).split(b"\n")[:-1]
+        if pos > start:
+            # The first piece starts in the middle of a line
+            found = found[1:]
+        complete = pos <= start and len(found) <= count
+        return (found[-count:] if count else []), complete
+
+    @staticmethod
+    def _count_lines(f, start: int, end: int) -> int:
+        # Bounded by max_bytes; newlines are counted without decoding
+        f.seek(start)
+        total, remaining = 0, end - start
+        while remaining > 0:
+            chunk = f.read(min(_COUNT_BLOCK_SIZE, remaining))
+            if not chunk:
+                break
+            total += chunk.count(b"\n")
+            remaining -= len(chunk)
+        return total
+
+    def _archived_lines(self, archives: List[Tuple[int, Path]], since: int, base: int,
+                        count: int) -> Tuple[List[bytes], bool]:
+        """Last count lines archived after since, decompressing the newest archives first."""
+        found: List[bytes] = []
+        stop = base
+        for start, archive in reversed(archives):
+            if stop <= since:
+                break
+            try:
+                with gzip.open(archive, "rb") as gz:
+                    _, _, header_len = self._read_header(gz)
+                    gz.seek(header_len + max(0, since - start))
+                    found = gz.read().split(b"\n")[:-1] + found
+            except (OSError, EOFError):
+                break
+            stop = start
+            if len(found) > count:
+                return found[-count:] if count else [], False
+        return found, True
+
+    @staticmethod
+    def _header(offset: int, lines: int) -> bytes:
+        return _HEADER_PREFIX + f"offset={offset} lines={lines}\n".encode()
+
+    @staticmethod
+    def _read_header(f) -> Tuple[int, int, int]:
+        """(offset, lines before, header length); files without a header start at 0."""
+        f.seek(0)
+        first = f.readline(256)
+        if not first.startswith(_HEADER_PREFIX):
+            f.seek(0)
+            return 0, 0, 0
+        fields = dict(item.split(b"=", 1) for item in first[len(_HEADER_PREFIX):].split() if b"=" in item)
+        return int(fields.get(b"offset", 0)), int(fields.get(b"lines", 0)), len(first)
+
+    def _archive_path(self, offset: int) -> Path:
+        return self.path.with_name(f"{self.path.name}.{offset}.gz")
+
+    def _archive_list(self) -> List[Tuple[int, Path]]:
+        """Archives of the current session, oldest first."""
+        archives = []
+        prefix = f"{self.path.name}."
+        for archive in self.path.parent.glob(f"{self.path.name}.*.gz"):
+            offset = archive.name[len(prefix):-len(".gz")]
+            if offset.isdigit():
+                archives.append((int(offset), archive))
+        return sorted(archives)
 
 
 class SessionLogger:
@@ -39,83 +279,55 @@ class SessionLogger:
         self.logs_dir = logs_dir
         self.logger = logger
         self.session_log_path = None
+        self.log_file = SessionLogFile(self.logs_dir / SESSION_LOG_FILE)
 
     def init_session_log(self, exit_name: str):
         try:
-            self.logs_dir.mkdir(parents=True, exist_ok=True)
-            self.session_log_path = self.logs_dir / "multihop-session-current.log"
-
-            if self.session_log_path.exists():
-                self.session_log_path.unlink()
-
-            with open(self.session_log_path, 'w') as f:
-                f.write(dedent("""
-                    ██████╗ ██╗  ██╗ █████╗ ███╗   ██╗████████╗ ██████╗ ███╗   ███╗
-                    ██╔══██╗██║  ██║██╔══██╗████╗  ██║╚══██╔══╝██╔═══██╗████╗ ████║
-                    ██████╔╝███████║███████║██╔██╗ ██║   ██║   ██║   ██║██╔████╔██║
-                    ██╔═══╝ ██╔══██║██╔══██║██║╚██╗██║   ██║   ██║   ██║██║╚██╔╝██║
-                    ██║     ██║  ██║██║  ██║██║ ╚████║   ██║   ╚██████╔╝██║ ╚═╝ ██║
-                    ╚═╝     ╚═╝  ╚═╝╚═╝  ╚═╝╚═╝  ╚═══╝   ╚═╝    ╚═════╝ ╚═╝     ╚═╝
-
-                    MULTIHOP HANDSHAKE MONITOR - LIVE SESSION
-                    ==========================================
-                    """).strip() + "\n")
-                f.write(f"Session Started: {datetime.now().strftime('%Y-%m-%d %H:%M:%S')}\n")
-                f.write(f"Exit Server: {exit_name}\n")
-                f.write(f"Monitor: Managed by phantom-multihop-monitor.service\n\n")
-                f.write(f"[{datetime.now().strftime('%H:%M:%S')}] SESSION STARTED - Handshake monitoring active\n")
+            self.session_log_path = self.log_file.path
+            self.log_file.start(dedent("""
+                ██████╗ ██╗  ██╗ █████╗ ███╗   ██╗████████╗ ██████╗ ███╗   ███╗
+                ██╔══██╗██║  ██║██╔══██╗████╗  ██║╚══██╔══╝██╔═══██╗████╗ ████║
+                ██████╔╝███████║███████║██╔██╗ ██║   ██║   ██║   ██║██╔████╔██║
+                ██╔═══╝ ██╔══██║██╔══██║██║╚██╗██║   ██║   ██║   ██║██║╚██╔╝██║
+                ██║     ██║  ██║██║  ██║██║ ╚████║   ██║   ╚██████╔╝██║ ╚═╝ ██║
+                ╚═╝     ╚═╝  ╚═╝╚═╝  ╚═╝╚═╝  ╚═══╝   ╚═╝    ╚═════╝ ╚═╝     ╚═╝
+
+                MULTIHOP HANDSHAKE MONITOR - LIVE SESSION
+                ==========================================
+                """).strip() + "\n" +
+                f"Session Started: {datetime.now().strftime('%Y-%m-%d %H:%M:%S')}\n"
+                f"Exit Server: {exit_name}\n"
+                f"Monitor: Managed by phantom-multihop-monitor.service\n\n"
+                f"[{datetime.now().strftime('%H:%M:%S')}] SESSION STARTED - Handshake monitoring active\n")
 
         except Exception as e:
             self.logger.error(f"Failed to initialize session log: {e}")
 
     def cleanup_session_log(self):
         try:
-            if self.session_log_path and self.session_log_path.exists():
-                self.session_log_path.unlink()
-                self.session_log_path = None
+            self.log_file.remove()
+            self.session_log_path = None
         except Exception as e:
             self.logger.error(f"Failed to cleanup session log: {e}")
 
     def get_session_log(self, lines: int = DEFAULT_LOG_LINES, multihop_enabled: bool = False,
-                        active_exit: str = None, get_monitor_status_func=None) -> Dict[str, Any]:
+                        active_exit: str = None, get_monitor_status_func=None,
+                        since_offset: Optional[int] = None) -> Dict[str, Any]:
         if not multihop_enabled:
             return {
                 "active_session": False,
                 "message": "No active multihop session"
             }
 
-        session_log_path = self.logs_dir / "multihop-session-current.log"
-
-        if not session_log_path.exists():
+        try:
+            # Tail of the log, or only what was written after the caller's cursor
+            result = self.log_file.read(lines, since_offset)
+        except FileNotFoundError:
             return {
                 "active_session": True,
                 "log_exists": False,
                 "message": "Session log not found"
             }
-
-        try:
-            with open(session_log_path, 'r') as f:
-                all_lines = f.readlines()
-
-            # Get last N lines
-            display_lines = all_lines[-lines:] if len(all_lines) > lines else all_lines
-
-            # Parse lines for structured data
-            parsed_lines = self._parse_log_lines(display_lines)
-
-            # Get monitor status if function provided
-            monitor_status = get_monitor_status_func() if get_monitor_status_func else None
-
-            return {
-                "active_session": True,
-                "log_exists": True,
-                "active_exit": active_exit,
-                "monitor_status": monitor_status,
-                "log_lines": parsed_lines,
-                "total_lines": len(all_lines),
-                "displayed_lines": len(parsed_lines)
-            }
-
         except Exception as e:
             self.logger.error(f"Failed to read session log: {e}")
             return {
@@ -124,6 +336,25 @@ class SessionLogger:
                 "error": str(e)
             }
 
+        # Parse lines for structured data
+        parsed_lines = self._parse_log_lines(result["lines"])
+
+        # Get monitor status if function provided
+        monitor_status = get_monitor_status_func() if get_monitor_status_func else None
+
+        return {
+            "active_session": True,
+            "log_exists": True,
+            "active_exit": active_exit,
+            "monitor_status": monitor_status,
+            "log_lines": parsed_lines,
+            "total_lines": result["total_lines"],
+            "displayed_lines": len(parsed_lines),
+            "offset": result["offset"],
+            "reset": result["reset"],
+            "truncated": result["truncated"]
+        }
+
     def _parse_log_lines(self, lines: List[str]) -> List[Dict[str, Any]]:
         parsed_lines = []
 
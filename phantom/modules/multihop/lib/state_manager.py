@@ -41,11 +41,13 @@ class StateManager:
         # State variables
         self.multihop_enabled = False
         self.active_exit = None
+        self.pool_mode = False
 
     def load_multihop_state(self):
         multihop_config = self.config.get("multihop", {})
         self.multihop_enabled = multihop_config.get("enabled", False)
         self.active_exit = multihop_config.get("active_exit")
+        self.pool_mode = multihop_config.get("pool_mode", False)
 
         if self.multihop_enabled and self.active_exit:
             self.logger.info(f"Multihop enabled: {self.active_exit}")
@@ -54,12 +56,14 @@ class StateManager:
         self.config["multihop"] = {
             "enabled": self.multihop_enabled,
             "active_exit": self.active_exit,
+            "pool_mode": self.pool_mode,
             "vpn_interface_name": VPN_INTERFACE_NAME,
             "updated_at": datetime.now().isoformat()
         }
         self._save_config()
 
-    def update_state(self, enabled: bool, active_exit: Optional[str] = None):
+    def update_state(self, enabled: bool, active_exit: Optional[str] = None, pool_mode: bool = False):
         self.multihop_enabled = enabled
         self.active_exit = active_exit if enabled else None
+        self.pool_mode = pool_mode if enabled else False
         self.save_multihop_state()
@@ -25,6 +25,7 @@ from .multihop_models import (
     VPNTestResult,
     ResetStateResult,
     SessionLog,
+    ExitHealth,
     ListExitsResult,
     MultihopStatusResult
 )
@@ -40,6 +41,7 @@ __all__ = [
     'VPNTestResult',
     'ResetStateResult',
     'SessionLog',
+    'ExitHealth',
     'ListExitsResult',
     'MultihopStatusResult'
 ]
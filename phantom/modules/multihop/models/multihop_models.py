@@ -13,7 +13,7 @@ Licensed under AGPL-3.0 - see LICENSE file for details
 Third-party licenses - see THIRD_PARTY_LICENSES file for details
 WireGuard® is a registered trademark of Jason A. Donenfeld.
 """
-from dataclasses import dataclass
+from dataclasses import dataclass, field
 from typing import Optional, List, Dict, Any
 
 from phantom.models.base import BaseModel
@@ -83,6 +83,7 @@ class EnableMultihopResult(BaseModel):
     traffic_flow: str
     peer_access: str
     message: str
+    pool_mode: bool = False
 
     def to_dict(self) -> Dict[str, Any]:
         return {
@@ -93,7 +94,8 @@ class EnableMultihopResult(BaseModel):
             "monitor_started": self.monitor_started,
             "traffic_flow": self.traffic_flow,
             "peer_access": self.peer_access,
-            "message": self.message
+            "message": self.message,
+            "pool_mode": self.pool_mode
         }
 
 
@@ -197,19 +199,73 @@ class SessionLog(BaseModel):
         return result
 
 
+@dataclass
+class ExitHealth(BaseModel):
+    name: str
+    healthy: bool
+    handshake_latency_ms: Optional[float] = None
+    throughput_bps: Optional[float] = None
+    handshake_age: Optional[int] = None
+    transfer_bytes: Optional[int] = None
+    consecutive_failures: int = 0
+    active: bool = False
+    rank: Optional[int] = None
+    probed_at: Optional[str] = None
+    error: Optional[str] = None
+
+    def to_dict(self) -> Dict[str, Any]:
+        result = {
+            "rank": self.rank,
+            "name": self.name,
+            "healthy": self.healthy,
+            "active": self.active,
+            "handshake_latency_ms": self.handshake_latency_ms,
+            "throughput_bps": self.throughput_bps,
+            "consecutive_failures": self.consecutive_failures,
+            "probed_at": self.probed_at
+        }
+        if self.handshake_age is not None:
+            result["handshake_age"] = self.handshake_age
+        if self.transfer_bytes is not None:
+            result["transfer_bytes"] = self.transfer_bytes
+        if self.error:
+            result["error"] = self.error
+        return result
+
+    @classmethod
+    def from_dict(cls, data: Dict[str, Any]) -> 'ExitHealth':
+        return cls(
+            name=data["name"],
+            healthy=data.get("healthy", False),
+            handshake_latency_ms=data.get("handshake_latency_ms"),
+            throughput_bps=data.get("throughput_bps"),
+            handshake_age=data.get("handshake_age"),
+            transfer_bytes=data.get("transfer_bytes"),
+            consecutive_failures=data.get("consecutive_failures", 0),
+            active=data.get("active", False),
+            rank=data.get("rank"),
+            probed_at=data.get("probed_at"),
+            error=data.get("error")
+        )
+
+
 @dataclass
 class ListExitsResult(BaseModel):
     exits: List[VPNExitInfo]
     multihop_enabled: bool
     active_exit: Optional[str]
     total: int
+    pool_mode: bool = False
+    health: List[ExitHealth] = field(default_factory=list)
 
     def to_dict(self) -> Dict[str, Any]:
         return {
             "exits": [_exit.to_dict() for _exit in self.exits],
             "multihop_enabled": self.multihop_enabled,
             "active_exit": self.active_exit,
-            "total": self.total
+            "total": self.total,
+            "pool_mode": self.pool_mode,
+            "health": [entry.to_dict() for entry in self.health]
         }
 
 
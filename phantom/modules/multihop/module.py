@@ -32,7 +32,7 @@ TR: Phantom-WG Multihop Yönlendirme Modülü
         - Gerçek zamanlı oturum günlüğü
         - Otomatik rollback mekanizması
     
-    Manager'lar (7 adet):
+    Manager'lar (8 adet):
         - ConfigHandler: VPN yapılandırma doğrulama ve optimizasyon
         - NetworkAdmin: VPN arayüz yönetimi ve subnet algılama
         - RoutingManager: systemd-networkd ve iptables kuralları
@@ -40,12 +40,14 @@ TR: Phantom-WG Multihop Yönlendirme Modülü
         - ConnectionTester: VPN bağlantı testleri
         - StateManager: Durum kalıcılığı
         - SessionLogger: Oturum günlüğü yönetimi
+        - ExitPool: Çıkış havuzu sağlık ölçümü ve otomatik yedeğe geçiş
     
     Model Mimarisi:
         Bu modül @dataclass modelleri kullanarak tip güvenliği sağlar:
         - VPNExitInfo: VPN çıkış noktası bilgileri
         - EnableMultihopResult: Aktivasyon sonuçları
         - ListExitsResult: Çıkış noktaları listesi
+        - ExitHealth: Çıkış havuzu sağlık kaydı
         - MultihopStatusResult: Durum bilgisi
         - DeactivationResult: Devre dışı bırakma sonuçları
         - RemoveConfigResult: Yapılandırma kaldırma sonuçları
@@ -79,7 +81,7 @@ EN: Phantom-WG Multihop Routing Module
         - Real-time session logging
         - Automatic rollback mechanism
     
-    Managers (7 total):
+    Managers (8 total):
         - ConfigHandler: VPN configuration validation and optimization
         - NetworkAdmin: VPN interface management and subnet detection
         - RoutingManager: systemd-networkd and iptables rules
@@ -87,12 +89,14 @@ EN: Phantom-WG Multihop Routing Module
         - ConnectionTester: VPN connection tests
         - StateManager: State persistence
         - SessionLogger: Session log management
+        - ExitPool: Exit pool health probing and automatic failover
     
     Model Architecture:
         This module uses @dataclass models for type safety:
         - VPNExitInfo: VPN exit node information
         - EnableMultihopResult: Activation results
         - ListExitsResult: Exit nodes list
+        - ExitHealth: Exit pool health record
         - MultihopStatusResult: Status information
         - DeactivationResult: Deactivation results
         - RemoveConfigResult: Configuration removal results
@@ -122,7 +126,7 @@ from .models import (
 )
 
 from .lib.common_tools import (
-    VPN_INTERFACE_NAME
+    VPN_INTERFACE_NAME, EXIT_HEALTH_FILE
 )
 
 class MultihopModule(BaseModule):
@@ -150,7 +154,7 @@ class MultihopModule(BaseModule):
         - Typed model support (to_dict() for API compatibility)
 
     Manager Architecture:
-        Functional separation with 7 specialized managers:
+        Functional separation with 8 specialized managers:
         - ConfigHandler: VPN configuration operations
         - NetworkAdmin: Network interface management
         - RoutingManager: Routing rules
@@ -158,6 +162,7 @@ class MultihopModule(BaseModule):
         - ConnectionTester: Connection tests
         - StateManager: State persistence
         - SessionLogger: Session logging
+        - ExitPool: Exit pool probing and failover
     """
 
     def __init__(self, install_dir: Optional[Path] = None):
@@ -165,7 +170,7 @@ class MultihopModule(BaseModule):
 
         Inherits from BaseModule and loads multihop-specific configuration.
         Creates exit_configs directory to store VPN exit configurations.
-        Provides functional separation with 7 managers.
+        Provides functional separation with 8 managers.
 
         Args:
             install_dir: Installation directory path (default: /opt/phantom-wg)
@@ -182,6 +187,7 @@ class MultihopModule(BaseModule):
         from .lib.connection_tester import ConnectionTester
         from .lib.state_manager import StateManager
         from .lib.session_logger import SessionLogger
+        from .lib.exit_pool import ExitPool
         self.config_handler = ConfigHandler(self.exit_configs_dir, self.config, self.logger)
         self.network_admin = NetworkAdmin(self.config, self.logger, self._run_command)
         self.routing_manager = RoutingManager(self.config, self.logger, self._run_command)
@@ -189,15 +195,26 @@ class MultihopModule(BaseModule):
         self.connection_tester = ConnectionTester(self.config, self.logger, self._run_command)
         self.state_manager = StateManager(self.config, self.logger, self._save_config)
         self.session_logger = SessionLogger(self.logs_dir, self.logger)
+        self.exit_pool = ExitPool(self.exit_configs_dir, self.data_dir / EXIT_HEALTH_FILE,
+                                  self.logger, self._run_command)
 
         # Session logging handled by SessionLogger
         # Monitor settings removed - now handled by systemd service only
 
         # Load multihop state using StateManager
+        self._config_changed()
+
+    def _config_changed(self) -> None:
+        """Reload the multihop state after phantom.json changed.
+
+        The monitor service writes multihop.active_exit on failover; without
+        this the module would report, protect and save back the old exit.
+        """
         self.state_manager.load_multihop_state()
         # Maintain backward compatibility with existing code
         self.multihop_enabled = self.state_manager.multihop_enabled
         self.active_exit = self.state_manager.active_exit
+        self.pool_mode = self.state_manager.pool_mode
 
     def get_module_name(self) -> str:
         """Return module name."""
@@ -321,14 +338,20 @@ class MultihopModule(BaseModule):
                 raise
             raise VPNConfigError(f"Failed to import config: {str(e)}")
 
-    def list_exits(self) -> Dict[str, Any]:
+    def list_exits(self, probe: bool = False) -> Dict[str, Any]:
         """Lists available VPN exit configurations.
 
         Lists all imported VPN configurations with metadata information.
-        Shows endpoint, provider and active status for each configuration.
+        Shows endpoint, provider and active status for each configuration,
+        plus the exit pool health table ranked by health and handshake
+        latency. The table comes from the monitor's last probe unless
+        probe=true measures every exit now.
+
+        Args:
+            probe: Probe all exits before listing (default: False)
 
         Returns:
-            Dict with list of exit configurations
+            Dict with list of exit configurations and ranked health table
         """
         config_files = list(self.exit_configs_dir.glob("*.conf"))
 
@@ -361,18 +384,26 @@ class MultihopModule(BaseModule):
 
             exits.append(exit_info)
 
+        # Ranked health table of the exit pool
+        if probe:
+            health = self.exit_pool.probe_all(self.active_exit if self.multihop_enabled else None)
+        else:
+            health = self.exit_pool.health_table(self.active_exit)
+
         # Create typed result internally
         result = ListExitsResult(
             exits=exits,
             multihop_enabled=self.multihop_enabled,
             active_exit=self.active_exit,
-            total=len(exits)
+            total=len(exits),
+            pool_mode=self.pool_mode,
+            health=health
         )
 
         # Return as dict for API compatibility
         return result.to_dict()
 
-    def enable_multihop(self, exit_name: str) -> Dict[str, Any]:
+    def enable_multihop(self, exit_name: Optional[str] = None, pool: bool = False) -> Dict[str, Any]:
         """Enables multihop routing through VPN exit.
 
         Starts multihop routing using specified VPN exit node. Configures
@@ -380,24 +411,41 @@ class MultihopModule(BaseModule):
         NAT rules. Connection is automatically tested and handshake
         monitoring is started.
 
+        In pool mode every imported exit is probed first and, without an
+        explicit exit_name, the lowest latency healthy exit is used. The
+        monitor service then fails over to the next best exit whenever the
+        active one degrades.
+
         Args:
             exit_name: Name of VPN exit configuration to use
+            pool: Enable exit pool mode with automatic failover
 
         Returns:
             Dict with activation result and connection status
 
         Raises:
-            MissingParameterError: If exit_name is not provided
-            ExitNodeError: If VPN configuration not found
+            MissingParameterError: If exit_name is not provided outside pool mode
+            ExitNodeError: If VPN configuration not found or no exit is healthy
             MultihopError: If activation or connection test fails
         """
-        if not exit_name:
+        if not exit_name and not pool:
             raise MissingParameterError("exit_name is required")
 
+        if pool:
+            health = self.exit_pool.probe_all()
+            if not exit_name:
+                exit_name = self.exit_pool.select_best(records=health)
+                if not exit_name:
+                    raise ExitNodeError("No healthy exit available in the pool",
+                                        data={"health": [entry.to_dict() for entry in health]})
+
         exit_config_file = self.exit_configs_dir / f"{exit_name}.conf"
         if not exit_config_file.exists():
             raise ExitNodeError(f"VPN config '{exit_name}' not found")
 
+        # Record the current state before changing it
+        self._snapshot_state("multihop_enable")
+
         try:
             self.logger.info("Ensuring clean state before enabling multihop")
             cleanup_result = self.network_admin.cleanup_vpn_interface_basic()
@@ -447,7 +495,8 @@ class MultihopModule(BaseModule):
             # Test passed, save state permanently
             self.multihop_enabled = temp_multihop_enabled
             self.active_exit = temp_active_exit
-            self.state_manager.update_state(self.multihop_enabled, self.active_exit)
+            self.pool_mode = pool
+            self.state_manager.update_state(self.multihop_enabled, self.active_exit, self.pool_mode)
 
             # Start handshake monitor service
             self.service_manager.start_monitor_service()
@@ -466,7 +515,8 @@ class MultihopModule(BaseModule):
                 monitor_started=True,
                 traffic_flow=f"Clients → Phantom → VPN Exit ({endpoint})",
                 peer_access="Peers can still connect directly",
-                message=f"Multihop enabled successfully through {exit_name}"
+                message=f"Multihop enabled successfully through {exit_name}",
+                pool_mode=pool
             )
 
             # Return as dict for API compatibility
@@ -493,6 +543,8 @@ class MultihopModule(BaseModule):
                 "message": "Multihop is not currently enabled"
             }
 
+        self._snapshot_state("multihop_disable")
+
         try:
             previous_exit = self.active_exit
 
@@ -511,6 +563,7 @@ class MultihopModule(BaseModule):
             # Update state
             self.multihop_enabled = False
             self.active_exit = None
+            self.pool_mode = False
             self.state_manager.update_state(self.multihop_enabled, self.active_exit)
 
             # Cleanup sonrası doğrulama ekle
@@ -605,6 +658,11 @@ class MultihopModule(BaseModule):
         if not config_file.exists():
             raise ExitNodeError(f"VPN configuration '{exit_name}' not found")
 
+        self._snapshot_state("multihop_remove_exit", {
+            f"exit_configs/{exit_name}.conf": config_file,
+            f"exit_configs/{exit_name}.json": metadata_file
+        })
+
         try:
             if config_file.exists():
                 config_file.unlink()
@@ -718,6 +776,8 @@ class MultihopModule(BaseModule):
         Raises:
             MultihopError: If reset fails
         """
+        self._snapshot_state("multihop_reset")
+
         try:
             # Remove systemd-networkd routing policy (use RoutingManager)
             self.routing_manager.remove_networkd_routing_policy(VPN_INTERFACE_NAME)
@@ -728,6 +788,7 @@ class MultihopModule(BaseModule):
             # Reset multihop state completely
             self.multihop_enabled = False
             self.active_exit = None
+            self.pool_mode = False
             self.state_manager.update_state(self.multihop_enabled, self.active_exit)
 
             # Create typed result internally
@@ -751,15 +812,20 @@ class MultihopModule(BaseModule):
         except Exception as e:
             raise MultihopError(f"Failed to reset multihop state: {str(e)}")
 
-    def get_session_log(self, lines: int = 50) -> Dict[str, Any]:
+    def get_session_log(self, lines: int = 50, since_offset: Optional[int] = None) -> Dict[str, Any]:
         """Returns current multihop session log.
 
         Returns handshake monitoring log of active multihop session.
         Log lines are presented structured with timestamp, message
-        and severity level.
+        and severity level. The log is read backwards from its end, so
+        the cost does not grow with the session length. Every response
+        carries an offset; passing it back as since_offset returns only
+        the lines written since (reset=True if the cursor is no longer
+        valid and the tail was returned instead).
 
         Args:
             lines: Number of lines to return (default: 50)
+            since_offset: Offset from a previous response, for new lines only
 
         Returns:
             Dict with session log data
@@ -772,7 +838,8 @@ class MultihopModule(BaseModule):
                 lines=lines,
                 multihop_enabled=self.multihop_enabled,
                 active_exit=self.active_exit,
-                get_monitor_status_func=self.service_manager.get_monitor_status
+                get_monitor_status_func=self.service_manager.get_monitor_status,
+                since_offset=since_offset
             )
         except Exception as e:
             raise MultihopError(f"Failed to read session log: {str(e)}")
@@ -917,6 +984,7 @@ class MultihopModule(BaseModule):
 
             self.multihop_enabled = False
             self.active_exit = None
+            self.pool_mode = False
             self.state_manager.update_state(self.multihop_enabled, self.active_exit)
 
             return True
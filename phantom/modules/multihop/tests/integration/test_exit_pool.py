@@ -0,0 +1,230 @@
+"""
+██████╗ ██╗  ██╗ █████╗ ███╗   ██╗████████╗ ██████╗ ███╗   ███╗
+██╔══██╗██║  ██║██╔══██╗████╗  ██║╚══██╔══╝██╔═══██╗████╗ ████║
+██████╔╝███████║███████║██╔██╗ ██║   ██║   ██║   ██║██╔████╔██║
+██╔═══╝ ██╔══██║██╔══██║██║╚██╗██║   ██║   ██║   ██║██║╚██╔╝██║
+██║     ██║  ██║██║  ██║██║ ╚████║   ██║   ╚██████╔╝██║ ╚═╝ ██║
+╚═╝     ╚═╝  ╚═╝╚═╝  ╚═╝╚═╝  ╚═══╝   ╚═╝    ╚═════╝ ╚═╝     ╚═╝
+
+ExitPool Integration Tests
+
+Copyright (c) 2025 Rıza Emre ARAS <r.emrearas@proton.me>
+Licensed under AGPL-3.0 - see LICENSE file for details
+Third-party licenses - see THIRD_PARTY_LICENSES file for details
+WireGuard® is a registered trademark of Jason A. Donenfeld.
+"""
+
+import json
+import time
+from datetime import datetime, timedelta
+from unittest.mock import Mock, patch
+
+import pytest
+
+from phantom.models.base import CommandResult
+from phantom.modules.multihop.lib.exit_pool import ExitPool
+from phantom.modules.multihop.models import ExitHealth, ListExitsResult
+
+EXIT_CONFIG = """[Interface]
+PrivateKey = {key}
+Address = 10.{octet}.0.2/32
+DNS = 10.{octet}.0.1
+
+[Peer]
+PublicKey = server_{octet}
+AllowedIPs = 0.0.0.0/0
+Endpoint = {octet}.example.net:51820
+PersistentKeepalive = 5
+"""
+
+
+class FakeClock:
+
+    def __init__(self):
+        self.now = 100.0
+
+    def __call__(self):
+        return self.now
+
+    def sleep(self, seconds):
+        self.now += seconds
+
+
+class FakeWireGuard:
+    """Answers wg/ip commands; latency maps exit octet to handshake delay in seconds."""
+
+    def __init__(self, clock, latency, live_dump=None):
+        self.clock = clock
+        self.latency = latency
+        self.live_dump = live_dump
+        self.calls = []
+        self.handshake_reads = 0
+        self._probe_octet = None
+        self._up_at = None
+
+    def __call__(self, command, **kwargs):
+        self.calls.append(command)
+        if command[:2] == ["wg", "setconf"]:
+            with open(command[3]) as f:
+                content = f.read()
+            assert "Address" not in content
+            self._probe_octet = content.split("server_")[1].split()[0]
+        elif command[:4] == ["ip", "link", "set", "up"]:
+            self._up_at = self.clock()
+        elif command[:2] == ["ip", "-force"]:
+            self._up_at = self.clock()
+        elif command[-1] == "dump":
+            if self.live_dump is None:
+                return CommandResult(success=False, returncode=1)
+            return CommandResult(success=True, stdout=self.live_dump)
+        return CommandResult(success=True)
+
+    def latest_handshakes(self, interface):
+        """Stands in for the netlink reader, so handshake polls never run a command."""
+        self.handshake_reads += 1
+        delay = self.latency.get(self._probe_octet)
+        if delay is not None and self._up_at is not None and self.clock() - self._up_at >= delay:
+            return [int(time.time())]
+        return [0]
+
+
+@pytest.fixture
+def pool_dir(tmp_path):
+    exits = tmp_path / "exit_configs"
+    exits.mkdir()
+    for name, octet in (("fast", "1"), ("slow", "2"), ("dead", "3")):
+        (exits / f"{name}.conf").write_text(EXIT_CONFIG.format(key=f"key{octet}", octet=octet))
+    return tmp_path
+
+
+@pytest.fixture
+def make_pool(pool_dir):
+    """Build an ExitPool on a fake clock whose handshake reads go to the fake netlink reader."""
+    with patch("phantom.modules.core.lib.peer_state._netlink") as netlink:
+        def factory(latency, live_dump=None):
+            clock = FakeClock()
+            fake = FakeWireGuard(clock, latency, live_dump)
+            netlink.latest_handshakes = fake.latest_handshakes
+            pool = ExitPool(pool_dir / "exit_configs", pool_dir / "data" / "health.json", Mock(), fake,
+                            clock=clock, sleep=clock.sleep)
+            return pool, fake
+        yield factory
+
+
+class TestExitPool:
+
+    @pytest.mark.integration
+    def test_probe_all_ranks_by_latency(self, make_pool):
+        """Test that idle exits are ranked healthy-first by handshake latency."""
+        pool, fake = make_pool({"1": 0.04, "2": 0.3})
+
+        records = pool.probe_all()
+
+        assert [(r.rank, r.name, r.healthy) for r in records] == [
+            (1, "fast", True), (2, "slow", True), (3, "dead", False)
+        ]
+        assert records[0].handshake_latency_ms < records[1].handshake_latency_ms
+        assert records[2].error == "No handshake within probe timeout"
+        assert records[2].consecutive_failures == 1
+        assert pool.select_best() == "fast"
+        assert pool.select_best(exclude="fast") == "slow"
+        # Every probe interface is removed again
+        assert fake.calls.count(["ip", "link", "del", "wg_probe"]) == 6
+        # Handshake polls go through the netlink reader, never through wg
+        assert fake.handshake_reads > 0
+        assert not any(call[-1] == "latest-handshakes" for call in fake.calls)
+
+    @pytest.mark.integration
+    def test_idle_probe_steps_do_not_block(self, make_pool):
+        """Test that an idle probe can be driven one handshake read at a time."""
+        pool, fake = make_pool({"1": 0.04})
+
+        probe = pool.begin_idle_probe("fast")
+        assert probe.failure is None
+        assert pool.handshake_elapsed("wg_probe", probe.started, probe.started_wall) is None
+
+        fake.clock.now += 0.05
+        elapsed = pool.handshake_elapsed("wg_probe", probe.started, probe.started_wall)
+        pool.end_idle_probe(probe)
+        pool.end_idle_probe(probe)
+
+        assert pool.stamp_probe(probe.result(elapsed), None).handshake_latency_ms == 50.0
+        assert fake.handshake_reads == 2
+        assert fake.calls.count(["ip", "link", "del", "wg_probe"]) == 2
+        assert probe.config_path is None
+
+    @pytest.mark.integration
+    def test_health_file_persists_failures(self, pool_dir, make_pool):
+        """Test that the health file is reused and failures accumulate."""
+        pool, _ = make_pool({"1": 0.04, "2": 0.3})
+        pool.probe_all()
+        pool.probe_all()
+
+        saved = json.loads((pool_dir / "data" / "health.json").read_text())
+        assert [entry["name"] for entry in saved["exits"]] == ["fast", "slow", "dead"]
+
+        health = pool.load_health()
+        assert health["dead"].consecutive_failures == 2
+
+        (pool_dir / "exit_configs" / "slow.conf").unlink()
+        assert [r.name for r in pool.health_table("fast")] == ["fast", "dead"]
+        assert pool.health_table("fast")[0].active is True
+
+    @pytest.mark.integration
+    def test_active_exit_uses_live_counters(self, make_pool):
+        """Test that the active exit is judged by its handshake and throughput."""
+        now = int(time.time())
+        dump = f"priv\tpub\t0\toff\nserver_1\t(none)\t1.2.3.4:51820\t0.0.0.0/0\t{now - 20}\t4000\t6000\t5\n"
+        pool, fake = make_pool({}, live_dump=dump)
+        previous = ExitHealth(name="fast", healthy=True, active=True, handshake_latency_ms=42.0,
+                              transfer_bytes=5000,
+                              probed_at=(datetime.now() - timedelta(seconds=10)).isoformat())
+
+        record = pool.probe_exit("fast", active_exit="fast", previous=previous)
+
+        assert record.healthy is True
+        assert record.handshake_latency_ms == 42.0
+        assert record.transfer_bytes == 10000
+        assert 450 <= record.throughput_bps <= 550
+        assert 19 <= record.handshake_age <= 21
+        assert not any(call[:3] == ["ip", "link", "add"] for call in fake.calls)
+
+    @pytest.mark.integration
+    def test_switch_exit_single_batch(self, pool_dir, make_pool):
+        """Test that a failover swaps keys, address and route with measured time."""
+        pool, fake = make_pool({"2": 0.1})
+
+        with patch("phantom.modules.multihop.lib.exit_pool.build_wireguard_config_path",
+                   return_value=str(pool_dir / "wg_vpn.conf")):
+            result = pool.switch_exit("slow")
+
+        assert result["success"] is True
+        assert 0.1 <= result["seconds"] < 0.2
+        assert ["ip", "-force", "-batch", "-"] in fake.calls
+        assert "Address" not in (pool_dir / "wg_vpn.conf").read_text()
+
+    @pytest.mark.integration
+    def test_begin_switch_returns_before_handshake(self, pool_dir, make_pool):
+        """Test that begin_switch applies the exit and leaves the handshake wait to the caller."""
+        pool, fake = make_pool({"2": 0.1})
+
+        with patch("phantom.modules.multihop.lib.exit_pool.build_wireguard_config_path",
+                   return_value=str(pool_dir / "wg_vpn.conf")):
+            switch = pool.begin_switch("slow")
+
+        assert switch["success"] is True
+        assert fake.handshake_reads == 0
+        assert pool.switch_result(switch, None)["error"] == "No handshake after switching exit"
+
+    @pytest.mark.integration
+    def test_list_exits_result_includes_health(self):
+        """Test that the ranked table is part of the list_exits payload."""
+        result = ListExitsResult(exits=[], multihop_enabled=True, active_exit="fast", total=0, pool_mode=True,
+                                 health=[ExitHealth(name="fast", healthy=True, rank=1, handshake_latency_ms=12.5)])
+
+        data = result.to_dict()
+
+        assert data["pool_mode"] is True
+        assert data["health"][0]["rank"] == 1
+        assert data["health"][0]["handshake_latency_ms"] == 12.5
+        assert ExitHealth.from_dict(data["health"][0]).name == "fast"
@@ -0,0 +1,46 @@
+"""
+██████╗ ██╗  ██╗ █████╗ ███╗   ██╗████████╗ ██████╗ ███╗   ███╗
+██╔══██╗██║  ██║██╔══██╗████╗  ██║╚══██╔══╝██╔═══██╗████╗ ████║
+██████╔╝███████║███████║██╔██╗ ██║   ██║   ██║   ██║██╔████╔██║
+██╔═══╝ ██╔══██║██╔══██║██║╚██╗██║   ██║   ██║   ██║██║╚██╔╝██║
+██║     ██║  ██║██║  ██║██║ ╚████║   ██║   ╚██████╔╝██║ ╚═╝ ██║
+╚═╝     ╚═╝  ╚═╝╚═╝  ╚═╝╚═╝  ╚═══╝   ╚═╝    ╚═════╝ ╚═╝     ╚═╝
+
+MultihopModule Configuration Integration Tests
+
+Copyright (c) 2025 Rıza Emre ARAS <r.emrearas@proton.me>
+Licensed under AGPL-3.0 - see LICENSE file for details
+Third-party licenses - see THIRD_PARTY_LICENSES file for details
+WireGuard® is a registered trademark of Jason A. Donenfeld.
+"""
+
+import json
+
+import pytest
+
+from phantom.modules.multihop.module import MultihopModule
+
+
+class TestMultihopModuleConfig:
+
+    @pytest.mark.integration
+    def test_failover_written_elsewhere_is_followed(self, tmp_path):
+        """Test that an exit switched by the monitor service is seen and not saved back over."""
+        config_file = tmp_path / "config" / "phantom.json"
+        config_file.parent.mkdir()
+        (tmp_path / "data").mkdir()
+        (tmp_path / "logs").mkdir()
+        config = {"multihop": {"enabled": True, "active_exit": "exit-a", "pool_mode": True}}
+        config_file.write_text(json.dumps(config))
+        module = MultihopModule(install_dir=tmp_path)
+        assert module.active_exit == "exit-a"
+
+        # Failover by the monitor service, a separate process
+        config["multihop"]["active_exit"] = "exit-b"
+        config_file.write_text(json.dumps(config))
+        assert module.config_service.poll() is True
+
+        assert (module.multihop_enabled, module.active_exit, module.pool_mode) == (True, "exit-b", True)
+
+        module.state_manager.save_multihop_state()
+        assert json.loads(config_file.read_text())["multihop"]["active_exit"] == "exit-b"
@@ -0,0 +1,237 @@
+"""
+██████╗ ██╗  ██╗ █████╗ ███╗   ██╗████████╗ ██████╗ ███╗   ███╗
+██╔══██╗██║  ██║██╔══██╗████╗  ██║╚══██╔══╝██╔═══██╗████╗ ████║
+██████╔╝███████║███████║██╔██╗ ██║   ██║   ██║   ██║██╔████╔██║
+██╔═══╝ ██╔══██║██╔══██║██║╚██╗██║   ██║   ██║   ██║██║╚██╔╝██║
+██║     ██║  ██║██║  ██║██║ ╚████║   ██║   ╚██████╔╝██║ ╚═╝ ██║
+╚═╝     ╚═╝  ╚═╝╚═╝  ╚═╝╚═╝  ╚═══╝   ╚═╝    ╚═════╝ ╚═╝     ╚═╝
+
+RuleBatch Integration Tests
+
+Copyright (c) 2025 Rıza Emre ARAS <r.emrearas@proton.me>
+Licensed under AGPL-3.0 - see LICENSE file for details
+Third-party licenses - see THIRD_PARTY_LICENSES file for details
+WireGuard® is a registered trademark of Jason A. Donenfeld.
+"""
+
+import ipaddress
+from unittest.mock import Mock, patch
+
+import pytest
+
+from phantom.models.base import CommandResult
+from phantom.modules.rule_batch import RuleBatch
+from phantom.modules.multihop.lib.routing_manager import RoutingManager, build_multihop_rule_batch
+from phantom.modules.core.lib.network_admin_helpers import FirewallOperations
+
+EMPTY_SAVE = """# Generated by iptables-save
+*nat
+:PREROUTING ACCEPT [0:0]
+:POSTROUTING ACCEPT [0:0]
+COMMIT
+*filter
+:INPUT ACCEPT [0:0]
+:FORWARD DROP [0:0]
+:OUTPUT ACCEPT [0:0]
+-A FORWARD -i wg_main -j ACCEPT
+COMMIT
+"""
+
+MULTIHOP_SAVE = """*nat
+:POSTROUTING ACCEPT [0:0]
+-A POSTROUTING -s 10.8.0.0/24 -o wg_vpn -j MASQUERADE
+COMMIT
+*filter
+:FORWARD DROP [0:0]
+-A FORWARD -i wg_main -j ACCEPT
+-A FORWARD -i wg_main -o wg_vpn -j ACCEPT
+-A FORWARD -i wg_vpn -o wg_main -m state --state RELATED,ESTABLISHED -j ACCEPT
+-A FORWARD -s 10.8.0.0/24 -d 10.8.0.0/24 -i wg_main -o wg_main -j ACCEPT
+COMMIT
+"""
+
+MULTIHOP_IP_RULES = """0:\tfrom all lookup local
+99:\tfrom 10.8.0.0/24 to 10.8.0.0/24 lookup main
+100:\tfrom 10.8.0.0/24 lookup multihop
+32766:\tfrom all lookup main
+"""
+
+
+class FakeNetfilter:
+    """Answers iptables-save / ip rule show and records everything else."""
+
+    def __init__(self, save_output=EMPTY_SAVE, ip_rules="0:\tfrom all lookup local\n", save_fails=False):
+        self.save_output = save_output
+        self.ip_rules = ip_rules
+        self.save_fails = save_fails
+        self.calls = []
+
+    def __call__(self, command, **kwargs):
+        self.calls.append((command, kwargs.get("input")))
+        if command == ["iptables-save"]:
+            if self.save_fails:
+                return CommandResult(success=False, returncode=127, error="not found")
+            return CommandResult(success=True, stdout=self.save_output)
+        if command == ["ip", "rule", "show"]:
+            return CommandResult(success=True, stdout=self.ip_rules)
+        if command[:1] == ["iptables"] and "-C" in command:
+            return CommandResult(success=False, returncode=1)
+        return CommandResult(success=True)
+
+    def commands(self):
+        return [command for command, _ in self.calls]
+
+    def input_for(self, program):
+        return next(data for command, data in self.calls if command[0] == program and data is not None)
+
+
+class TestRuleBatch:
+
+    @pytest.mark.integration
+    def test_parse_iptables_save(self):
+        """Test that rules and declared chains are read per table."""
+        live = RuleBatch.parse_iptables_save(MULTIHOP_SAVE)
+
+        assert live[("nat", "POSTROUTING")] == ["-s 10.8.0.0/24 -o wg_vpn -j MASQUERADE"]
+        assert len(live[("filter", "FORWARD")]) == 4
+
+    @pytest.mark.integration
+    def test_single_transaction(self):
+        """Test that all missing rules go into one iptables-restore and one ip batch."""
+        fake = FakeNetfilter()
+
+        result = build_multihop_rule_batch(fake, "10.8.0.5/24", "wg_vpn", "wg_main").apply()
+
+        assert result.success is True
+        assert result.commands_run == 4
+        assert fake.commands() == [
+            ["iptables-save"], ["ip", "rule", "show"],
+            ["iptables-restore", "--noflush"], ["ip", "-force", "-batch", "-"]
+        ]
+        assert fake.input_for("iptables-restore") == (
+            "*nat\n"
+            "-A POSTROUTING -s 10.8.0.0/24 -o wg_vpn -j MASQUERADE\n"
+            "COMMIT\n"
+            "*filter\n"
+            "-A FORWARD -i wg_main -o wg_vpn -j ACCEPT\n"
+            "-A FORWARD -i wg_vpn -o wg_main -m state --state RELATED,ESTABLISHED -j ACCEPT\n"
+            "-A FORWARD -s 10.8.0.0/24 -d 10.8.0.0/24 -i wg_main -o wg_main -j ACCEPT\n"
+            "COMMIT\n"
+        )
+        assert fake.input_for("ip") == (
+            "rule add from 10.8.0.0/24 to 10.8.0.0/24 table main priority 99\n"
+            "rule add from 10.8.0.0/24 table multihop priority 100\n"
+            "route replace default dev wg_vpn table multihop\n"
+        )
+
+    @pytest.mark.integration
+    def test_idempotent(self):
+        """Test that an already applied rule set starts no iptables-restore."""
+        fake = FakeNetfilter(MULTIHOP_SAVE, MULTIHOP_IP_RULES)
+
+        result = build_multihop_rule_batch(fake, "10.8.0.0/24", "wg_vpn", "wg_main").apply()
+
+        assert result.success is True
+        assert result.iptables_changes == []
+        assert fake.input_for("ip") == "route replace default dev wg_vpn table multihop\n"
+        assert ["iptables-restore", "--noflush"] not in fake.commands()
+
+    @pytest.mark.integration
+    def test_duplicates_and_order_repaired(self):
+        """Test that duplicated or reordered groups are rewritten once, in order."""
+        save = "*filter\n:INPUT ACCEPT [0:0]\n-A INPUT -j B\n-A INPUT -j A\n-A INPUT -j B\nCOMMIT\n"
+        fake = FakeNetfilter(save)
+
+        batch = RuleBatch(fake).ensure_rules("filter", "INPUT", ["-j A", "-j B"])
+        result = batch.apply()
+
+        assert result.iptables_changes == [
+            "filter: -D INPUT -j A", "filter: -D INPUT -j B", "filter: -D INPUT -j B",
+            "filter: -A INPUT -j A", "filter: -A INPUT -j B"
+        ]
+        assert RuleBatch(FakeNetfilter(
+            "*filter\n:INPUT ACCEPT [0:0]\n-A INPUT -j X\n-A INPUT -j A\n-A INPUT -j B\nCOMMIT\n"
+        )).ensure_rules("filter", "INPUT", ["-j A", "-j B"]).apply().changed is False
+
+    @pytest.mark.integration
+    def test_custom_chain_declared(self):
+        """Test that a missing user chain is declared without flushing existing ones."""
+        fake = FakeNetfilter()
+
+        RuleBatch(fake).ensure_rule("filter", "PHANTOM", "-j RETURN").apply()
+
+        assert fake.input_for("iptables-restore") == "*filter\n:PHANTOM - [0:0]\n-A PHANTOM -j RETURN\nCOMMIT\n"
+
+    @pytest.mark.integration
+    def test_removal_only_touches_present_rules(self):
+        """Test that removal deletes what exists and nothing else."""
+        fake = FakeNetfilter(MULTIHOP_SAVE, MULTIHOP_IP_RULES)
+
+        result = build_multihop_rule_batch(fake, "10.8.0.0/24", "wg_vpn", "wg_main", present=False).apply()
+
+        assert len(result.iptables_changes) == 4
+        assert "-A " not in fake.input_for("iptables-restore")
+        assert fake.input_for("ip").startswith("rule del from 10.8.0.0/24 to 10.8.0.0/24 table main")
+
+    @pytest.mark.integration
+    def test_probe_fallback(self):
+        """Test the per-rule iptables -C fallback when iptables-save is unavailable."""
+        fake = FakeNetfilter(save_fails=True)
+
+        result = RuleBatch(fake).ensure_rule("nat", "POSTROUTING", "-s 10.8.0.0/24 -o eth0 -j MASQUERADE").apply()
+
+        assert result.success is True
+        assert ["iptables", "-t", "nat", "-C", "POSTROUTING", "-s", "10.8.0.0/24", "-o", "eth0",
+                "-j", "MASQUERADE"] in fake.commands()
+
+    @pytest.mark.integration
+    def test_restore_failure(self):
+        """Test that a rejected transaction is reported and ip changes are skipped."""
+        fake = FakeNetfilter()
+        fake_call = fake.__call__
+
+        def run_command(command, **kwargs):
+            if command[0] == "iptables-restore":
+                return CommandResult(success=False, returncode=1, stderr="line 2 failed")
+            return fake_call(command, **kwargs)
+
+        batch = build_multihop_rule_batch(run_command, "10.8.0.0/24", "wg_vpn", "wg_main")
+        result = batch.apply()
+
+        assert result.success is False
+        assert "line 2 failed" in result.error
+        assert result.ip_changes == []
+
+
+class TestRuleBatchCallers:
+
+    @pytest.mark.integration
+    def test_multihop_setup(self):
+        """Test that multihop setup applies its rules with a couple of commands."""
+        fake = FakeNetfilter()
+        manager = RoutingManager({"wireguard": {"interface": "wg_main"}}, Mock(), fake)
+
+        with patch.object(manager, "_ensure_routing_table_exists"), \
+                patch.object(manager, "_enable_ip_forwarding"):
+            result = manager.setup_routing_rules_manual("10.8.0.0/24", "wg_vpn")
+
+        assert result == {"success": True}
+        assert len(fake.calls) == 4
+
+    @pytest.mark.integration
+    def test_nat_subnet_change(self):
+        """Test that the NAT swap is one transaction and persisted only when changed."""
+        fake = FakeNetfilter("*nat\n:POSTROUTING ACCEPT [0:0]\n"
+                             "-A POSTROUTING -s 10.8.0.0/24 -o eth0 -j MASQUERADE\nCOMMIT\n")
+        firewall = FirewallOperations(fake, "wg_main", analyze_interface=lambda: {"interface": "eth0"})
+
+        firewall.update_iptables_nat_for_subnet(ipaddress.IPv4Network("10.8.0.0/24"),
+                                                ipaddress.IPv4Network("10.9.0.0/24"))
+
+        assert fake.input_for("iptables-restore") == (
+            "*nat\n"
+            "-D POSTROUTING -s 10.8.0.0/24 -o eth0 -j MASQUERADE\n"
+            "-A POSTROUTING -s 10.9.0.0/24 -o eth0 -j MASQUERADE\n"
+            "COMMIT\n"
+        )
+        assert fake.commands()[-1] == ["netfilter-persistent", "save"]
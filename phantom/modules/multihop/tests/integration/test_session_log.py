@@ -0,0 +1,146 @@
+"""
+██████╗ ██╗  ██╗ █████╗ ███╗   ██╗████████╗ ██████╗ ███╗   ███╗
+██╔══██╗██║  ██║██╔══██╗████╗  ██║╚══██╔══╝██╔═══██╗████╗ ████║
+██████╔╝███████║███████║██╔██╗ ██║   ██║   ██║   ██║██╔████╔██║
+██╔═══╝ ██╔══██║██╔══██║██║╚██╗██║   ██║   ██║   ██║██║╚██╔╝██║
+██║     ██║  ██║██║  ██║██║ ╚████║   ██║   ╚██████╔╝██║ ╚═╝ ██║
+╚═╝     ╚═╝  ╚═╝╚═╝  ╚═╝╚═╝  ╚═══╝   ╚═╝    ╚═════╝ ╚═╝     ╚═╝
+
+
+SessionLogFile Integration Tests
+
+Copyright (c) 2025 Rıza Emre ARAS <r.emrearas@proton.me>
+Licensed under AGPL-3.0 - see LICENSE file for details
+Third-party licenses - see THIRD_PARTY_LICENSES file for details
+WireGuard® is a registered trademark of Jason A. Donenfeld.
+"""
+
+import gzip
+from unittest.mock import Mock, patch
+
+import pytest
+
+from phantom.modules.multihop.lib.session_logger import SessionLogFile, SessionLogger
+
+
+def line(index: int) -> str:
+    return f"[12:00:{index % 60:02d}] [INFO] Handshake: {index}s [Good]\n"
+
+
+class TestSessionLogFile:
+
+    @pytest.mark.integration
+    def test_tail_seeks_back_from_the_end(self, tmp_path):
+        """Test that the tail only decodes the blocks holding the requested lines."""
+        log = SessionLogFile(tmp_path / "session.log", max_bytes=1 << 30, block_size=256)
+        log.start("SESSION STARTED\n")
+        for index in range(5000):
+            log.append(line(index))
+
+        with patch.object(SessionLogFile, "_tail", wraps=log._tail) as tail:
+            result = log.read(3)
+
+        assert result["lines"] == [line(i).rstrip("\n") for i in range(4997, 5000)]
+        assert result["truncated"] is True
+        assert result["total_lines"] == 5001
+        # Started at the end of the file, not at the first line
+        assert tail.call_args.args[2] == log.path.stat().st_size
+
+    @pytest.mark.integration
+    def test_cursor_returns_new_lines_only(self, tmp_path):
+        """Test that since_offset returns what was appended since, ignoring a half-written line."""
+        log = SessionLogFile(tmp_path / "session.log")
+        log.start("SESSION STARTED\n")
+        first = log.read(50)
+
+        log.append(line(1))
+        log.append(line(2))
+        with open(log.path, "a") as f:
+            f.write("[12:00:03] [INFO] half")
+        second = log.read(50, first["offset"])
+
+        assert second["lines"] == [line(1).rstrip("\n"), line(2).rstrip("\n")]
+        assert second["reset"] is False
+        assert second["offset"] - first["offset"] == len(line(1)) + len(line(2))
+        assert log.read(50, second["offset"])["lines"] == []
+
+    @pytest.mark.integration
+    def test_rotation_keeps_cursors_valid(self, tmp_path):
+        """Test that rotated content is archived with gzip and still reachable from a cursor."""
+        log = SessionLogFile(tmp_path / "session.log", max_bytes=400, archives=3)
+        log.start()
+        cursor = log.read(10)["offset"]
+
+        for index in range(20):
+            log.append(line(index))
+
+        archives = sorted(tmp_path.glob("session.log.*.gz"))
+        assert archives and len(archives) <= 3
+        assert log.path.stat().st_size < 400 + len(line(0)) + 64
+        with gzip.open(archives[-1], "rb") as gz:
+            assert gz.readline().startswith(b"#phantom-session-log offset=")
+
+        # The cursor lies in the oldest remaining archive or before it
+        result = log.read(100, cursor)
+        if result["reset"]:
+            assert result["lines"][-1] == line(19).rstrip("\n")
+        else:
+            assert result["lines"] == [line(i).rstrip("\n") for i in range(20)]
+        assert log.read(100)["total_lines"] == 20
+
+        recent = log.read(100, log.read(1)["offset"] - len(line(18)) - len(line(19)))
+        assert recent["lines"] == [line(18).rstrip("\n"), line(19).rstrip("\n")]
+
+    @pytest.mark.integration
+    def test_new_session_invalidates_old_cursor(self, tmp_path):
+        """Test that a cursor from a previous session is answered with reset and the new tail."""
+        log = SessionLogFile(tmp_path / "session.log")
+        log.start("first session\n")
+        for index in range(10):
+            log.append(line(index))
+        stale = log.read(1)["offset"]
+
+        log.start("second session\n")
+        result = log.read(5, stale)
+
+        assert result["reset"] is True
+        assert result["lines"] == ["second session"]
+
+    @pytest.mark.integration
+    def test_sessions_started_in_the_same_microsecond_do_not_overlap(self, tmp_path):
+        """Test that the next session starts past the old one even when the clock has not moved."""
+        log = SessionLogFile(tmp_path / "session.log")
+        with patch("phantom.modules.multihop.lib.session_logger.time.time_ns", return_value=10 ** 18):
+            log.start("first session\n")
+            log.append(line(1))
+            stale = log.read(1)["offset"]
+            log.start(f"second session {'-' * 100}\n")
+
+        result = log.read(5, stale)
+
+        assert result["reset"] is True
+        assert result["lines"] == [f"second session {'-' * 100}"]
+
+
+class TestSessionLogger:
+
+    @pytest.mark.integration
+    def test_get_session_log_with_cursor(self, tmp_path):
+        logger = SessionLogger(tmp_path, Mock())
+        logger.init_session_log("exit-a")
+        logger.log_file.append(line(1))
+
+        first = logger.get_session_log(lines=2, multihop_enabled=True, active_exit="exit-a")
+        logger.log_file.append("[12:00:02] [ERROR] Handshake: No connection\n")
+        update = logger.get_session_log(lines=3, multihop_enabled=True, since_offset=first["offset"])
+
+        assert [entry["message"] for entry in first["log_lines"]] == [
+            "SESSION STARTED - Handshake monitoring active", "[INFO] Handshake: 1s [Good]"
+        ]
+        assert update["log_lines"] == [{"timestamp": "12:00:02", "message": "[ERROR] Handshake: No connection",
+                                        "level": "ERROR"}]
+        assert update["total_lines"] == first["total_lines"] + 1
+
+        logger.cleanup_session_log()
+        assert list(tmp_path.iterdir()) == []
+        assert logger.get_session_log(multihop_enabled=True)["log_exists"] is False
@@ -0,0 +1,338 @@
+"""
+██████╗ ██╗  ██╗ █████╗ ███╗   ██╗████████╗ ██████╗ ███╗   ███╗
+██╔══██╗██║  ██║██╔══██╗████╗  ██║╚══██╔══╝██╔═══██╗████╗ ████║
+██████╔╝███████║███████║██╔██╗ ██║   ██║   ██║   ██║██╔████╔██║
+██╔═══╝ ██╔══██║██╔══██║██║╚██╗██║   ██║   ██║   ██║██║╚██╔╝██║
+██║     ██║  ██║██║  ██║██║ ╚████║   ██║   ╚██████╔╝██║ ╚═╝ ██║
+╚═╝     ╚═╝  ╚═╝╚═╝  ╚═╝╚═╝  ╚═══╝   ╚═╝    ╚═════╝ ╚═╝     ╚═╝
+
+TR: RuleBatch - Atomik iptables-restore / ip -batch kural motoru
+    ============================================================
+
+    Bir özelliğin (multihop, NAT, ghost) istenen kural setini tek seferde
+    tanımlar, canlı kural setiyle karşılaştırır ve yalnızca farkı uygular:
+
+        - iptables kuralları: 'iptables-save' ile okunur, fark tek bir
+          'iptables-restore --noflush' işleminde (COMMIT) atomik uygulanır
+        - ip kuralları: 'ip rule show' ile okunur, rotalarla birlikte tek bir
+          'ip -force -batch -' çağrısında uygulanır
+
+    Uygulama idempotenttir: kurallar zaten varsa hiçbir süreç başlatılmaz,
+    eksikler eklenir, yinelenen kopyalar silinir. Kural başına bir süreç
+    yerine toplamda birkaç süreç yeterlidir.
+
+    Kurallar iptables-save'in kanonik yazımıyla verilmelidir (ör.
+    "-s 10.8.0.0/24 -o eth0 -j MASQUERADE", "-p tcp -m tcp --dport 443 -j ACCEPT").
+
+EN: RuleBatch - Atomic iptables-restore / ip -batch rule engine
+    ==========================================================
+
+    Describes the complete desired rule set of a feature (multihop, NAT,
+    ghost) at once, diffs it against the live ruleset and applies only the
+    difference:
+
+        - iptables rules: read with 'iptables-save', the diff is applied
+          atomically in a single 'iptables-restore --noflush' transaction
+        - ip rules: read with 'ip rule show', applied together with routes in
+          a single 'ip -force -batch -' call
+
+    Applying is idempotent: when everything is in place no process is
+    started, missing rules are added and duplicates removed. A handful of
+    processes replace one process per rule.
+
+    Rules must be written in iptables-save canonical form (e.g.
+    "-s 10.8.0.0/24 -o eth0 -j MASQUERADE", "-p tcp -m tcp --dport 443 -j ACCEPT").
+
+Copyright (c) 2025 Rıza Emre ARAS <r.emrearas@proton.me>
+Licensed under AGPL-3.0 - see LICENSE file for details
+Third-party licenses - see THIRD_PARTY_LICENSES file for details
+WireGuard® is a registered trademark of Jason A. Donenfeld.
+"""
+
+import shlex
+from dataclasses import dataclass, field
+from typing import Any, Callable, Dict, List, Optional, Tuple
+
+from phantom.models.base import BaseModel
+
+BUILTIN_CHAINS = {
+    "filter": ("INPUT", "FORWARD", "OUTPUT"),
+    "nat": ("PREROUTING", "INPUT", "OUTPUT", "POSTROUTING"),
+    "mangle": ("PREROUTING", "INPUT", "FORWARD", "OUTPUT", "POSTROUTING"),
+    "raw": ("PREROUTING", "OUTPUT"),
+}
+
+# (priority, from, to, table)
+IpRule = Tuple[int, str, Optional[str], str]
+
+
+@dataclass
+class RuleBatchResult(BaseModel):
+    success: bool
+    iptables_changes: List[str] = field(default_factory=list)
+    ip_changes: List[str] = field(default_factory=list)
+    commands_run: int = 0
+    error: Optional[str] = None
+
+    @property
+    def changed(self) -> bool:
+        return bool(self.iptables_changes or self.ip_changes)
+
+    def to_dict(self) -> Dict[str, Any]:
+        result = {
+            "success": self.success,
+            "changed": self.changed,
+            "iptables_changes": self.iptables_changes,
+            "ip_changes": self.ip_changes,
+            "commands_run": self.commands_run
+        }
+        if self.error:
+            result["error"] = self.error
+        return result
+
+
+def _normalize(spec: str) -> str:
+    return " ".join(spec.split())
+
+
+class RuleBatch:
+    """Desired iptables / ip rule state for one feature, applied as a diff.
+
+    Example:
+        batch = RuleBatch(run_command)
+        batch.ensure_rule("nat", "POSTROUTING", "-s 10.8.0.0/24 -o eth0 -j MASQUERADE")
+        batch.remove_rule("nat", "POSTROUTING", "-s 10.9.0.0/24 -o eth0 -j MASQUERADE")
+        result = batch.apply()
+    """
+
+    def __init__(self, run_command: Callable):
+        self._run_command = run_command
+        # (table, chain, [specs]) groups that must exist in this order
+        self._ensure: List[Tuple[str, str, List[str]]] = []
+        self._absent: List[Tuple[str, str, str]] = []
+        self._ensure_ip_rules: List[IpRule] = []
+        self._absent_ip_rules: List[IpRule] = []
+        self._ip_commands: List[str] = []
+        self._commands_run = 0
+
+    # Declaring the desired state
+
+    def ensure_rule(self, table: str, chain: str, spec: str) -> "RuleBatch":
+        """Require a rule to be present exactly once."""
+        return self.ensure_rules(table, chain, [spec])
+
+    def ensure_rules(self, table: str, chain: str, specs: List[str]) -> "RuleBatch":
+        """Require rules to be present exactly once and in the given order.
+
+        If they are missing, duplicated or out of order, every copy is
+        deleted and the group is appended again in order.
+        """
+        self._ensure.append((table, chain, [_normalize(s) for s in specs]))
+        return self
+
+    def remove_rule(self, table: str, chain: str, spec: str) -> "RuleBatch":
+        """Require a rule to be absent (every copy is deleted)."""
+        self._absent.append((table, chain, _normalize(spec)))
+        return self
+
+    def ensure_ip_rule(self, priority: int, source: str, table: str,
+                       destination: Optional[str] = None) -> "RuleBatch":
+        self._ensure_ip_rules.append((int(priority), source, destination, table))
+        return self
+
+    def remove_ip_rule(self, priority: int, source: str, table: str,
+                       destination: Optional[str] = None) -> "RuleBatch":
+        self._absent_ip_rules.append((int(priority), source, destination, table))
+        return self
+
+    def ip_command(self, line: str) -> "RuleBatch":
+        """Add an idempotent ip batch line, e.g. "route replace default dev wg0 table 100"."""
+        self._ip_commands.append(_normalize(line))
+        return self
+
+    # Reading the live state
+
+    def _run(self, command: List[str], **kwargs):
+        self._commands_run += 1
+        return self._run_command(command, **kwargs)
+
+    def _read_iptables(self) -> Optional[Dict[Tuple[str, str], List[str]]]:
+        tables = {table for table, _, _ in self._ensure} | {table for table, _, _ in self._absent}
+        if not tables:
+            return {}
+
+        result = self._run(["iptables-save"])
+        if not result["success"]:
+            return None
+        return self.parse_iptables_save(result["stdout"])
+
+    @staticmethod
+    def parse_iptables_save(output: str) -> Dict[Tuple[str, str], List[str]]:
+        """Parse iptables-save output into {(table, chain): [rule specs]}; chains map to []."""
+        live: Dict[Tuple[str, str], List[str]] = {}
+        table = None
+        for line in output.splitlines():
+            line = line.strip()
+            if line.startswith("*"):
+                table = line[1:]
+            elif line.startswith(":") and table:
+                live.setdefault((table, line[1:].split()[0]), [])
+            elif line.startswith("-A ") and table:
+                _, chain, *rest = line.split(None, 2)
+                live.setdefault((table, chain), []).append(_normalize(rest[0]) if rest else "")
+        return live
+
+    def _probe_iptables(self) -> Dict[Tuple[str, str], List[str]]:
+        """Fallback when iptables-save is unavailable: check each rule with -C."""
+        live: Dict[Tuple[str, str], List[str]] = {}
+        wanted = [(t, c, s) for t, c, specs in self._ensure for s in specs] + self._absent
+        for table, chain, spec in wanted:
+            rules = live.setdefault((table, chain), [])
+            if spec in rules:
+                continue
+            check = self._run(["iptables", "-t", table, "-C", chain] + shlex.split(spec))
+            if check["success"]:
+                rules.append(spec)
+        return live
+
+    def _read_ip_rules(self) -> Optional[List[IpRule]]:
+        if not self._ensure_ip_rules and not self._absent_ip_rules:
+            return []
+        result = self._run(["ip", "rule", "show"])
+        if not result["success"]:
+            return None
+        return self.parse_ip_rules(result["stdout"])
+
+    @staticmethod
+    def parse_ip_rules(output: str) -> List[IpRule]:
+        """Parse 'ip rule show' lines like "31000: from 10.8.0.0/24 to 10.8.0.0/24 lookup main"."""
+        rules = []
+        for line in output.splitlines():
+            priority, _, rest = line.partition(":")
+            if not priority.strip().isdigit():
+                continue
+            tokens = rest.split()
+            values = dict(zip(tokens[::2], tokens[1::2]))
+            source = values.get("from")
+            table = values.get("lookup") or values.get("table")
+            if source and table:
+                rules.append((int(priority), source, values.get("to"), table))
+        return rules
+
+    # Planning and applying
+
+    def plan(self) -> Tuple[List[str], List[str]]:
+        """Compute the iptables-restore lines and ip batch lines needed.
+
+        Returns:
+            Tuple of (iptables changes as "table: -A/-D chain spec", ip batch lines)
+        """
+        live = self._read_iptables()
+        if live is None:
+            live = self._probe_iptables()
+
+        changes: List[str] = []
+
+        for table, chain, spec in self._absent:
+            rules = live.setdefault((table, chain), [])
+            while spec in rules:
+                rules.remove(spec)
+                changes.append(f"{table}: -D {chain} {spec}")
+
+        for table, chain, specs in self._ensure:
+            exists = (table, chain) in live
+            rules = live.setdefault((table, chain), [])
+            positions = [i for i, rule in enumerate(rules) if rule in specs]
+            if [rules[i] for i in positions] == specs:
+                continue
+            if not exists and chain not in BUILTIN_CHAINS.get(table, ()):
+                changes.append(f"{table}: :{chain}")
+            for spec in specs:
+                while spec in rules:
+                    rules.remove(spec)
+                    changes.append(f"{table}: -D {chain} {spec}")
+            for spec in specs:
+                rules.append(spec)
+                changes.append(f"{table}: -A {chain} {spec}")
+
+        ip_lines: List[str] = []
+        live_ip_rules = self._read_ip_rules()
+        if live_ip_rules is None:
+            live_ip_rules = []
+
+        for rule in self._absent_ip_rules:
+            while rule in live_ip_rules:
+                live_ip_rules.remove(rule)
+                ip_lines.append("rule del " + self._format_ip_rule(rule))
+        for rule in self._ensure_ip_rules:
+            count = live_ip_rules.count(rule)
+            if count == 1:
+                continue
+            for _ in range(count - 1):
+                ip_lines.append("rule del " + self._format_ip_rule(rule))
+            if count == 0:
+                ip_lines.append("rule add " + self._format_ip_rule(rule))
+            live_ip_rules.append(rule)
+
+        ip_lines.extend(self._ip_commands)
+        return changes, ip_lines
+
+    @staticmethod
+    def _format_ip_rule(rule: IpRule) -> str:
+        priority, source, destination, table = rule
+        target = f" to {destination}" if destination else ""
+        return f"from {source}{target} table {table} priority {priority}"
+
+    @staticmethod
+    def render_restore(changes: List[str]) -> str:
+        """Render planned iptables changes as iptables-restore input."""
+        by_table: Dict[str, List[str]] = {}
+        for change in changes:
+            table, _, line = change.partition(": ")
+            by_table.setdefault(table, []).append(line)
+        blocks = []
+        for table, lines in by_table.items():
+            # Chain declarations first, then deletions and additions in plan order
+            declarations = [line for line in lines if line.startswith(":")]
+            declarations = [f"{line} - [0:0]" for line in declarations]
+            rules = [line for line in lines if not line.startswith(":")]
+            blocks.append("\n".join([f"*{table}"] + declarations + rules + ["COMMIT"]))
+        return "\n".join(blocks) + "\n"
+
+    def apply(self, dry_run: bool = False) -> RuleBatchResult:
+        """Diff against the live ruleset and apply the changes.
+
+        Args:
+            dry_run: Only compute the changes
+
+        Returns:
+            RuleBatchResult with the applied changes and the number of commands run
+        """
+        self._commands_run = 0
+        changes, ip_lines = self.plan()
+
+        if dry_run:
+            return RuleBatchResult(success=True, iptables_changes=changes, ip_changes=ip_lines,
+                                   commands_run=self._commands_run)
+
+        if changes:
+            result = self._run(["iptables-restore", "--noflush"], input=self.render_restore(changes))
+            if not result["success"]:
+                # Nothing was committed, the live ruleset is unchanged
+                return RuleBatchResult(
+                    success=False, iptables_changes=changes, ip_changes=[],
+                    commands_run=self._commands_run,
+                    error=f"iptables-restore failed: {result.get('stderr') or result.get('error')}"
+                )
+
+        if ip_lines:
+            result = self._run(["ip", "-force", "-batch", "-"], input="\n".join(ip_lines) + "\n")
+            if not result["success"]:
+                return RuleBatchResult(
+                    success=False, iptables_changes=changes, ip_changes=ip_lines,
+                    commands_run=self._commands_run,
+                    error=f"ip -batch failed: {result.get('stderr') or result.get('error')}"
+                )
+
+        return RuleBatchResult(success=True, iptables_changes=changes, ip_changes=ip_lines,
+                               commands_run=self._commands_run)
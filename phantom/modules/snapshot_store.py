@@ -0,0 +1,602 @@
+"""
+██████╗ ██╗  ██╗ █████╗ ███╗   ██╗████████╗ ██████╗ ███╗   ███╗
+██╔══██╗██║  ██║██╔══██╗████╗  ██║╚══██╔══╝██╔═══██╗████╗ ████║
+██████╔╝███████║███████║██╔██╗ ██║   ██║   ██║   ██║██╔████╔██║
+██╔═══╝ ██╔══██║██╔══██║██║╚██╗██║   ██║   ██║   ██║██║╚██╔╝██║
+██║     ██║  ██║██║  ██║██║ ╚████║   ██║   ╚██████╔╝██║ ╚═╝ ██║
+╚═╝     ╚═╝  ╚═╝╚═╝  ╚═╝╚═╝  ╚═══╝   ╚═╝    ╚═════╝ ╚═╝     ╚═╝
+
+
+TR: SnapshotStore - İçerik adresli, tekilleştirilmiş yedek deposu
+    ==============================================================
+
+    Durum değiştiren işlemlerden (subnet değişikliği, Ghost Mode, multihop)
+    önce alınan yedekler dosyaların tam kopyaları yerine parçalar halinde
+    saklanır:
+
+        - Dosyalar 64 KiB'lik parçalara bölünür, her parça SHA-256 özetiyle
+          objects/ altında bir kez saklanır. SQLite sayfaları sabit
+          konumlarda değiştiği için clients.db'de yalnızca değişen parçalar
+          yeni yer kaplar
+        - Son anlık görüntüden beri (inode, boyut, mtime, ctime) imzası
+          değişmeyen dosyalar hiç okunmaz; parça listesi yeniden kullanılır
+        - Nesneler hard link ile yayımlanır (aynı parçayı yazan eşzamanlı
+          bir yazıcı diğerinin üzerine yazmaz); dosya sistemi destekliyorsa
+          (btrfs, XFS) parçalar kaynağa ve geri yüklenen dosyaya reflink
+          (FICLONERANGE) ile klonlanır, desteklenmiyorsa kopyalanır; özeti
+          tutmayan bir klon (kaynak okunduktan sonra değişmişse) okunan
+          baytlarla değiştirilir
+        - Her anlık görüntü snapshots/<id>.json içinde bir manifesttir
+        - Saklama politikası: etiket başına son N anlık görüntü ve en fazla
+          M gün tutulur (etiketin en yeni yedeği her zaman kalır); hiçbir
+          manifestin başvurmadığı nesneler silinir
+
+EN: SnapshotStore - Content-addressed, deduplicated backup store
+    ===========================================================
+
+    Backups taken before state changing operations (subnet change, Ghost
+    Mode, multihop) are stored as chunks instead of full file copies:
+
+        - Files are split into 64 KiB chunks, each chunk is stored once
+          under objects/ by its SHA-256 digest. SQLite pages change in place,
+          so only the changed chunks of clients.db take new space
+        - Files whose (inode, size, mtime, ctime) signature is unchanged
+          since the last snapshot are not read at all; their chunk list is
+          reused
+        - Objects are published with a hard link, so a concurrent writer of
+          the same chunk never overwrites another; where the filesystem
+          supports it (btrfs, XFS) chunks are cloned from the source and into
+          restored files with reflinks (FICLONERANGE), otherwise copied; a
+          clone that no longer matches its digest (the source changed after
+          it was read) is replaced by the bytes that were read
+        - Every snapshot is a manifest in snapshots/<id>.json
+        - Retention: the last N snapshots per label and at most M days are
+          kept (the newest snapshot of a label always stays); objects no
+          manifest refers to are deleted
+
+Copyright (c) 2025 Rıza Emre ARAS <r.emrearas@proton.me>
+Licensed under AGPL-3.0 - see LICENSE file for details
+Third-party licenses - see THIRD_PARTY_LICENSES file for details
+WireGuard® is a registered trademark of Jason A. Donenfeld.
+"""
+
+import errno
+import fcntl
+import hashlib
+import json
+import os
+import re
+import struct
+import tempfile
+import threading
+import time
+from contextlib import contextmanager
+from dataclasses import dataclass, field
+from datetime import datetime, timedelta
+from pathlib import Path
+from typing import Any, Dict, Iterator, List, Optional, Tuple
+
+from phantom.api.exceptions import ValidationError
+from phantom.models.base import BaseModel
+
+# Store directory under the installation directory
+STORE_DIR = "backups"
+
+# Chunk size; a multiple of the SQLite page and filesystem block size
+CHUNK_SIZE = 64 * 1024
+
+# Backups hold private keys
+STORE_PERMISSIONS = 0o600
+
+# Retention defaults (overridable with the "backups" section of phantom.json)
+DEFAULT_KEEP_LAST = 10
+DEFAULT_MAX_AGE_DAYS = 30
+
+# Signatures with an mtime this close to the previous snapshot are re-read
+RACY_WINDOW_NS = 2_000_000_000
+
+# struct file_clone_range from linux/fs.h
+FICLONERANGE = 0x4020940D
+CLONE_RANGE = struct.Struct("qQQQ")
+
+_LABEL_PATTERN = re.compile(r'^[A-Za-z0-9_-]+$')
+
+
+@dataclass
+class SnapshotFile(BaseModel):
+    name: str
+    path: Optional[str]
+    size: int
+    mode: int
+    chunks: List[str]
+    signature: Optional[List[int]] = None
+
+    def to_dict(self) -> Dict[str, Any]:
+        return {
+            "name": self.name,
+            "path": self.path,
+            "size": self.size,
+            "chunks": len(self.chunks)
+        }
+
+    def to_manifest(self) -> Dict[str, Any]:
+        return {
+            "name": self.name,
+            "path": self.path,
+            "size": self.size,
+            "mode": self.mode,
+            "chunks": self.chunks,
+            "signature": self.signature
+        }
+
+
+@dataclass
+class Snapshot(BaseModel):
+    id: str
+    label: str
+    created: str
+    recorded_ns: int
+    source: Optional[str] = None
+    files: List[SnapshotFile] = field(default_factory=list)
+    metadata: Dict[str, Any] = field(default_factory=dict)
+    new_bytes: int = 0
+
+    @property
+    def size(self) -> int:
+        return sum(f.size for f in self.files)
+
+    def file(self, name: str) -> Optional[SnapshotFile]:
+        return next((f for f in self.files if f.name == name), None)
+
+    def to_dict(self) -> Dict[str, Any]:
+        return {
+            "id": self.id,
+            "label": self.label,
+            "created": self.created,
+            "source": self.source,
+            "files": [f.to_dict() for f in self.files],
+            "size": self.size,
+            "new_bytes": self.new_bytes,
+            "metadata": self.metadata
+        }
+
+    def to_manifest(self) -> Dict[str, Any]:
+        return {
+            "id": self.id,
+            "label": self.label,
+            "created": self.created,
+            "recorded_ns": self.recorded_ns,
+            "source": self.source,
+            "files": [f.to_manifest() for f in self.files],
+            "metadata": self.metadata,
+            "new_bytes": self.new_bytes
+        }
+
+    @classmethod
+    def from_manifest(cls, data: Dict[str, Any]) -> "Snapshot":
+        return cls(
+            id=data["id"], label=data["label"], created=data["created"],
+            recorded_ns=data.get("recorded_ns", 0), source=data.get("source"),
+            files=[SnapshotFile(**f) for f in data.get("files", [])],
+            metadata=data.get("metadata", {}), new_bytes=data.get("new_bytes", 0)
+        )
+
+
+@dataclass
+class PruneResult(BaseModel):
+    removed: List[str] = field(default_factory=list)
+    objects_removed: int = 0
+    bytes_freed: int = 0
+
+    def to_dict(self) -> Dict[str, Any]:
+        return {
+            "removed": self.removed,
+            "objects_removed": self.objects_removed,
+            "bytes_freed": self.bytes_freed
+        }
+
+
+class SnapshotStore:
+    """Deduplicated snapshots of small sets of files.
+
+    Example:
+        store = get_snapshot_store(install_dir / "backups")
+        snapshot = store.create("subnet_change", {"clients_db": data_dir / "clients.db"}, source="core")
+        store.extract(snapshot.id, "clients_db", data_dir / "clients.db")
+
+    Args:
+        root: Store directory (objects/ and snapshots/ are created below it)
+        keep_last: Snapshots kept per label (None: no count limit)
+        max_age_days: Maximum snapshot age (None: no age limit)
+    """
+
+    def __init__(self, root: Path, keep_last: Optional[int] = DEFAULT_KEEP_LAST,
+                 max_age_days: Optional[int] = DEFAULT_MAX_AGE_DAYS):
+        self.root = Path(root)
+        self.objects_dir = self.root / "objects"
+        self.snapshots_dir = self.root / "snapshots"
+        self.keep_last = keep_last
+        self.max_age_days = max_age_days
+        self._lock = threading.RLock()
+        # None until a clone is attempted, False once the filesystem refused reflinks
+        self._reflink: Optional[bool] = None
+
+    # Locking
+
+    @contextmanager
+    def _locked(self) -> Iterator[None]:
+        """Serialise writers within the process and across processes."""
+        with self._lock:
+            self.objects_dir.mkdir(parents=True, exist_ok=True)
+            self.snapshots_dir.mkdir(parents=True, exist_ok=True)
+            fd = os.open(self.root / ".lock", os.O_RDWR | os.O_CREAT, STORE_PERMISSIONS)
+            try:
+                fcntl.flock(fd, fcntl.LOCK_EX)
+                yield
+            finally:
+                os.close(fd)
+
+    # Objects
+
+    def _object_path(self, digest: str) -> Path:
+        return self.objects_dir / digest[:2] / digest[2:]
+
+    def _clone(self, src_fd: int, src_offset: int, length: int, dst_fd: int, dst_offset: int) -> bool:
+        """Reflink a byte range; False if it cannot be cloned (the caller copies).
+
+        EINVAL only rejects this range (e.g. an unaligned tail), so the next
+        chunk still tries; the other errors mean the filesystem has no
+        reflinks and cloning stops for the process.
+        """
+        if self._reflink is False:
+            return False
+        try:
+            fcntl.ioctl(dst_fd, FICLONERANGE, CLONE_RANGE.pack(src_fd, src_offset, length, dst_offset))
+        except OSError as e:
+            if e.errno == errno.EINVAL:
+                return False
+            if e.errno in (errno.EOPNOTSUPP, errno.EXDEV, errno.ENOTTY, errno.EPERM):
+                self._reflink = False
+                return False
+            raise
+        self._reflink = True
+        return True
+
+    def _store_chunk(self, data: bytes, src_fd: int = -1, offset: int = 0) -> Tuple[str, int]:
+        """Store one chunk unless present; returns (digest, number of new bytes).
+
+        With a source descriptor the chunk is reflinked from the source range
+        when possible instead of written. The source is live and may change
+        after it was read, so a clone is kept only if it still holds the
+        bytes the digest was taken from.
+        """
+        digest = hashlib.sha256(data).hexdigest()
+        target = self._object_path(digest)
+        if target.exists():
+            return digest, 0
+
+        target.parent.mkdir(exist_ok=True)
+        fd, tmp_name = tempfile.mkstemp(prefix=".chunk.", dir=str(target.parent))
+        try:
+            os.fchmod(fd, STORE_PERMISSIONS)
+            cloned = src_fd >= 0 and self._clone(src_fd, offset, len(data), fd, 0)
+            if cloned and os.pread(fd, len(data) + 1, 0) != data:
+                os.ftruncate(fd, 0)
+                cloned = False
+            if not cloned:
+                os.write(fd, data)
+            os.fsync(fd)
+            os.close(fd)
+            fd = -1
+            try:
+                # link() never replaces an object another writer just published
+                os.link(tmp_name, target)
+            except FileExistsError:
+                return digest, 0
+            except OSError:
+                # Filesystems without hard links
+                os.replace(tmp_name, target)
+            return digest, len(data)
+        finally:
+            if fd >= 0:
+                os.close(fd)
+            if os.path.exists(tmp_name):
+                os.unlink(tmp_name)
+
+    def _store_file(self, name: str, path: Path, previous: Optional[SnapshotFile],
+                    previous_ns: int) -> Tuple[SnapshotFile, int]:
+        st = os.stat(path)
+        signature = [st.st_ino, st.st_size, st.st_mtime_ns, st.st_ctime_ns]
+
+        # Unchanged since the last snapshot: reuse the chunk list without reading
+        if (previous is not None and previous.signature == signature
+                and st.st_mtime_ns < previous_ns - RACY_WINDOW_NS
+                and all(self._object_path(d).exists() for d in previous.chunks)):
+            return SnapshotFile(name=name, path=str(path), size=previous.size, mode=previous.mode,
+                                chunks=list(previous.chunks), signature=signature), 0
+
+        chunks: List[str] = []
+        new_bytes = 0
+        size = 0
+        with open(path, 'rb') as f:
+            while True:
+                offset = size
+                data = f.read(CHUNK_SIZE)
+                if not data:
+                    break
+                size += len(data)
+                digest, written = self._store_chunk(data, f.fileno(), offset)
+                chunks.append(digest)
+                new_bytes += written
+        return SnapshotFile(name=name, path=str(path), size=size, mode=st.st_mode & 0o7777,
+                            chunks=chunks, signature=signature), new_bytes
+
+    def _store_data(self, name: str, data: bytes) -> Tuple[SnapshotFile, int]:
+        chunks: List[str] = []
+        new_bytes = 0
+        for offset in range(0, len(data), CHUNK_SIZE):
+            digest, written = self._store_chunk(data[offset:offset + CHUNK_SIZE])
+            chunks.append(digest)
+            new_bytes += written
+        return SnapshotFile(name=name, path=None, size=len(data), mode=STORE_PERMISSIONS,
+                            chunks=chunks), new_bytes
+
+    # Manifests
+
+    def _manifest_path(self, snapshot_id: str) -> Path:
+        return self.snapshots_dir / f"{snapshot_id}.json"
+
+    def _write_manifest(self, snapshot: Snapshot) -> None:
+        fd, tmp_name = tempfile.mkstemp(prefix=".manifest.", dir=str(self.snapshots_dir))
+        try:
+            os.fchmod(fd, STORE_PERMISSIONS)
+            with os.fdopen(fd, 'w') as f:
+                json.dump(snapshot.to_manifest(), f, indent=2)
+                f.flush()
+                os.fsync(f.fileno())
+            os.replace(tmp_name, self._manifest_path(snapshot.id))
+        except BaseException:
+            if os.path.exists(tmp_name):
+                os.unlink(tmp_name)
+            raise
+
+    def _new_id(self, label: str) -> str:
+        now_ns = time.time_ns()
+        snapshot_id = f"{label}_{now_ns // 1_000_000_000}"
+        if self._manifest_path(snapshot_id).exists():
+            # Several snapshots in one second; the sub-second part keeps ids unique and ordered
+            snapshot_id = f"{snapshot_id}_{now_ns % 1_000_000_000:09d}"
+        return snapshot_id
+
+    # Public API
+
+    def create(self, label: str, files: Dict[str, Path], data: Optional[Dict[str, bytes]] = None,
+               source: Optional[str] = None, metadata: Optional[Dict[str, Any]] = None,
+               prune: bool = True) -> Snapshot:
+        """Record the current content of files (missing paths are skipped).
+
+        Args:
+            label: Snapshot kind, part of the id and the retention group (e.g. "subnet_change")
+            files: Name -> path of the files to record
+            data: Name -> content of generated entries without a path (e.g. captured firewall rules)
+            source: Module that took the snapshot
+            metadata: Free-form JSON-serialisable details
+            prune: Apply the retention policy afterwards
+
+        Returns:
+            Snapshot: The stored snapshot, new_bytes tells how much was actually written
+
+        Raises:
+            ValidationError: If the label is not a plain name
+            OSError: If a file cannot be read or the store cannot be written
+        """
+        if not _LABEL_PATTERN.match(label):
+            raise ValidationError(f"Invalid backup label '{label}'")
+
+        with self._locked():
+            latest = self._latest_files()
+            snapshot = Snapshot(id=self._new_id(label), label=label, created=datetime.now().isoformat(),
+                                recorded_ns=time.time_ns(), source=source, metadata=metadata or {})
+            for name, path in files.items():
+                if path is None or not Path(path).is_file():
+                    continue
+                previous, previous_ns = latest.get(str(path), (None, 0))
+                entry, new_bytes = self._store_file(name, Path(path), previous, previous_ns)
+                snapshot.files.append(entry)
+                snapshot.new_bytes += new_bytes
+            for name, content in (data or {}).items():
+                entry, new_bytes = self._store_data(name, content)
+                snapshot.files.append(entry)
+                snapshot.new_bytes += new_bytes
+
+            self._write_manifest(snapshot)
+            if prune:
+                self._prune_locked(self.keep_last, self.max_age_days, protect=snapshot.id)
+        return snapshot
+
+    def _latest_files(self) -> Dict[str, Any]:
+        """Path -> (entry, recorded_ns) from the newest snapshot containing it."""
+        latest: Dict[str, Any] = {}
+        for snapshot in self.list():
+            for entry in snapshot.files:
+                if entry.path and entry.path not in latest:
+                    latest[entry.path] = (entry, snapshot.recorded_ns)
+        return latest
+
+    def list(self, label: Optional[str] = None) -> List[Snapshot]:
+        """Snapshots, newest first."""
+        snapshots = []
+        try:
+            manifests = list(self.snapshots_dir.glob("*.json"))
+        except OSError:
+            return []
+        for manifest in manifests:
+            try:
+                snapshot = Snapshot.from_manifest(json.loads(manifest.read_text()))
+            except (OSError, ValueError, KeyError, TypeError):
+                continue
+            if label is None or snapshot.label == label:
+                snapshots.append(snapshot)
+        snapshots.sort(key=lambda s: (s.recorded_ns, s.id), reverse=True)
+        return snapshots
+
+    def get(self, snapshot_id: str) -> Snapshot:
+        """Load a snapshot manifest.
+
+        Raises:
+            ValidationError: If no such snapshot exists
+        """
+        path = self._manifest_path(snapshot_id)
+        if "/" in snapshot_id or not path.is_file():
+            raise ValidationError(f"Backup '{snapshot_id}' not found")
+        return Snapshot.from_manifest(json.loads(path.read_text()))
+
+    def read(self, snapshot_id: str, name: str) -> bytes:
+        """Content of one file of a snapshot."""
+        entry = self._entry(snapshot_id, name)
+        return b"".join(self._object_path(d).read_bytes() for d in entry.chunks)
+
+    def _entry(self, snapshot_id: str, name: str) -> SnapshotFile:
+        entry = self.get(snapshot_id).file(name)
+        if entry is None:
+            raise ValidationError(f"Backup '{snapshot_id}' has no file '{name}'")
+        return entry
+
+    def extract(self, snapshot_id: str, name: str, destination: Optional[Path] = None) -> Path:
+        """Write one file of a snapshot atomically (temp file, fsync, rename).
+
+        Args:
+            snapshot_id: Snapshot id
+            name: File name within the snapshot
+            destination: Target path (default: the path the file was recorded from)
+
+        Returns:
+            Path: The written file
+        """
+        entry = self._entry(snapshot_id, name)
+        if destination is None:
+            if not entry.path:
+                raise ValidationError(f"File '{name}' of backup '{snapshot_id}' has no original path")
+            destination = Path(entry.path)
+        destination = Path(destination)
+        destination.parent.mkdir(parents=True, exist_ok=True)
+
+        fd, tmp_name = tempfile.mkstemp(prefix=f".{destination.name}.", dir=str(destination.parent))
+        try:
+            os.fchmod(fd, entry.mode)
+            offset = 0
+            for digest in entry.chunks:
+                with open(self._object_path(digest), 'rb') as chunk:
+                    length = os.fstat(chunk.fileno()).st_size
+                    if not self._clone(chunk.fileno(), 0, 0, fd, offset):
+                        os.pwrite(fd, chunk.read(), offset)
+                offset += length
+            os.ftruncate(fd, offset)
+            os.fsync(fd)
+            os.close(fd)
+            fd = -1
+            os.replace(tmp_name, destination)
+        finally:
+            if fd >= 0:
+                os.close(fd)
+            if os.path.exists(tmp_name):
+                os.unlink(tmp_name)
+        return destination
+
+    def delete(self, snapshot_id: str) -> PruneResult:
+        """Remove one snapshot and the objects only it referred to."""
+        self.get(snapshot_id)
+        with self._locked():
+            self._manifest_path(snapshot_id).unlink()
+            result = self._collect_garbage()
+        result.removed.insert(0, snapshot_id)
+        return result
+
+    def prune(self, keep_last: Optional[int] = None, max_age_days: Optional[int] = None) -> PruneResult:
+        """Apply a retention policy (defaults to the store's) and delete unreferenced objects."""
+        with self._locked():
+            return self._prune_locked(self.keep_last if keep_last is None else keep_last,
+                                      self.max_age_days if max_age_days is None else max_age_days)
+
+    def _prune_locked(self, keep_last: Optional[int], max_age_days: Optional[int],
+                      protect: Optional[str] = None) -> PruneResult:
+        cutoff = datetime.now() - timedelta(days=max_age_days) if max_age_days is not None else None
+        removed: List[str] = []
+
+        by_label: Dict[str, List[Snapshot]] = {}
+        for snapshot in self.list():
+            by_label.setdefault(snapshot.label, []).append(snapshot)
+
+        for snapshots in by_label.values():
+            # Newest first; the newest of a label always stays
+            for index, snapshot in enumerate(snapshots[1:], start=1):
+                if snapshot.id == protect:
+                    continue
+                too_many = keep_last is not None and index >= keep_last
+                too_old = cutoff is not None and datetime.fromisoformat(snapshot.created) < cutoff
+                if too_many or too_old:
+                    self._manifest_path(snapshot.id).unlink()
+                    removed.append(snapshot.id)
+
+        result = self._collect_garbage() if removed else PruneResult()
+        result.removed = removed
+        return result
+
+    def _collect_garbage(self) -> PruneResult:
+        """Delete objects no manifest refers to (mark and sweep)."""
+        referenced = {d for snapshot in self.list() for f in snapshot.files for d in f.chunks}
+        result = PruneResult()
+        for bucket in self.objects_dir.iterdir():
+            if not bucket.is_dir():
+                continue
+            for obj in bucket.iterdir():
+                if bucket.name + obj.name in referenced:
+                    continue
+                # Leftover temp files of interrupted writers are swept too
+                try:
+                    size = obj.stat().st_size
+                    obj.unlink()
+                except FileNotFoundError:
+                    continue
+                if not obj.name.startswith("."):
+                    result.objects_removed += 1
+                    result.bytes_freed += size
+        return result
+
+    def usage(self) -> Dict[str, int]:
+        """Snapshot count, bytes on disk and bytes the snapshots represent."""
+        snapshots = self.list()
+        stored = 0
+        objects = 0
+        if self.objects_dir.exists():
+            for obj in self.objects_dir.glob("*/*"):
+                objects += 1
+                stored += obj.stat().st_size
+        return {
+            "snapshots": len(snapshots),
+            "objects": objects,
+            "stored_bytes": stored,
+            "logical_bytes": sum(s.size for s in snapshots)
+        }
+
+
+_stores: Dict[Path, SnapshotStore] = {}
+_stores_lock = threading.Lock()
+
+
+def get_snapshot_store(root: Path, retention: Optional[Dict[str, Any]] = None) -> SnapshotStore:
+    """Process-wide SnapshotStore for a directory.
+
+    Args:
+        root: Store directory
+        retention: Optional {"keep_last": n, "max_age_days": d} overriding the defaults
+    """
+    key = Path(os.path.abspath(root))
+    with _stores_lock:
+        store = _stores.get(key)
+        if store is None:
+            store = _stores[key] = SnapshotStore(key)
+        if retention:
+            store.keep_last = retention.get("keep_last", store.keep_last)
+            store.max_age_days = retention.get("max_age_days", store.max_age_days)
+        return store
@@ -51,6 +51,7 @@ modules = OrderedDict([
     ("multihop", ("modules/multihop", "phantom.modules.multihop")),
     ("ghost", ("modules/ghost", "phantom.modules.ghost")),
     ("models", ("models", "phantom.models")),
+    ("casper", ("casper", "phantom.casper")),
     ("api", ("api", "phantom.api")),
 ])
 
@@ -23,10 +23,17 @@ TR: Multihop VPN bağlantılarını izler ve kesintisiz bağlantıyı sağlar
         3. Handshake timeout durumunda otomatik yeniden bağlanma
         4. Session log dosyasına durum raporlama
         5. Multihop devre dışı bırakıldığında servisi durdurma
+        6. Havuz modunda çıkışları ölçme ve en iyi sağlıklı çıkışa geçiş
         
     İzleme Döngüsü:
-        - Her 30 saniyede bir bağlantı kontrolü
-        - Handshake > 180 saniye ise yeniden bağlanma
+        - epoll tabanlı olay döngüsü; boşta CPU tüketmez
+        - phantom.json paylaşılan ConfigService ile inotify üzerinden izlenir ve
+          önbellekte tutulur; çıkış değişimi kilitli atomik güncelleme ile yazılır
+        - Handshake zamanı süreç içinde okunur (netlink / UAPI), 'wg' çalıştırılmaz
+        - Çıkış yoklamaları ve geçiş handshake'leri zamanlayıcılarla beklenir, döngü uyutulmaz
+        - Kontrol, handshake'in eskiyeceği ana zamanlanır; her 30 saniyede durum raporu
+        - Handshake > 180 saniye ise havuz modunda en iyi çıkışa geçiş (süre loglanır),
+          aksi halde artan bekleme süreli yeniden bağlanma
         - Maksimum 3 yeniden bağlanma denemesi
         - Tüm durumlar session log'a kaydedilir
 
@@ -43,10 +50,17 @@ EN: Monitors Multihop VPN connections and ensures continuous connectivity
         3. Auto-reconnect on handshake timeout
         4. Report status to session log file
         5. Stop service when multihop is disabled
+        6. In pool mode, probe exits and fail over to the best healthy one
         
     Monitoring Loop:
-        - Connection check every 30 seconds
-        - Reconnect if handshake > 180 seconds
+        - epoll based event loop; no CPU use while idle
+        - phantom.json watched with inotify and cached by the shared ConfigService;
+          exit switches are written with a locked atomic update
+        - Handshake time read in-process (netlink / UAPI), without running 'wg'
+        - Exit probes and failover handshakes are awaited with timers, the loop never sleeps
+        - Checks scheduled for the moment the handshake turns stale; status report every 30 seconds
+        - If handshake > 180 seconds, fail over to the best exit in pool mode (time logged),
+          otherwise reconnect with exponential backoff
         - Maximum 3 reconnection attempts
         - All states logged to session file
 
@@ -56,16 +70,228 @@ Third-party licenses - see THIRD_PARTY_LICENSES file for details
 WireGuard® is a registered trademark of Jason A. Donenfeld.
 """
 
+import heapq
+import itertools
 import os
+import selectors
+import socket
 import sys
 import time
-import json
 import subprocess
 import signal
 import logging
-import threading
 from pathlib import Path
 from datetime import datetime
+from functools import partial
+from typing import Callable, Optional
+
+# Config access, handshake reads, exit pool probing and switching are shared with the modules
+sys.path.insert(0, str(Path(__file__).resolve().parents[2]))
+from phantom.modules.config_service import get_config_service
+from phantom.modules.core.lib.peer_state import PeerStateReader
+
+try:
+    from phantom.modules.multihop.lib.exit_pool import ExitPool
+    from phantom.modules.multihop.lib.common_tools import (
+        EXIT_HEALTH_FILE, PROBE_INTERFACE_NAME, EXIT_PROBE_TIMEOUT, EXIT_PROBE_POLL_INTERVAL
+    )
+    from phantom.modules.multihop.lib.session_logger import SessionLogFile
+except ImportError:
+    ExitPool = None
+    EXIT_HEALTH_FILE = None
+    SessionLogFile = None
+
+
+class EventLoop:
+    """Minimal epoll (selectors) loop with a timer heap.
+
+    The loop blocks in the selector until a watched descriptor becomes
+    readable or the nearest timer is due, so an idle monitor costs no CPU.
+    Signals wake the loop immediately through signal.set_wakeup_fd.
+    """
+
+    def __init__(self):
+        self._selector = selectors.DefaultSelector()
+        self._timers = []
+        self._sequence = itertools.count()
+        self._running = False
+
+        self._wakeup_read, self._wakeup_write = socket.socketpair()
+        self._wakeup_read.setblocking(False)
+        self._wakeup_write.setblocking(False)
+        signal.set_wakeup_fd(self._wakeup_write.fileno())
+        self.add_reader(self._wakeup_read.fileno(), self._drain_wakeup)
+
+    def add_reader(self, fd: int, callback: Callable[[], None]):
+        self._selector.register(fd, selectors.EVENT_READ, callback)
+
+    def call_later(self, delay: float, callback: Callable[[], None]) -> list:
+        """Schedule a callback; returns a handle accepted by cancel()."""
+        timer = [time.monotonic() + max(0.0, delay), next(self._sequence), callback]
+        heapq.heappush(self._timers, timer)
+        return timer
+
+    @staticmethod
+    def cancel(timer: Optional[list]):
+        if timer is not None:
+            timer[2] = None
+
+    def stop(self):
+        self._running = False
+
+    def run(self):
+        self._running = True
+        while self._running:
+            while self._timers and self._timers[0][2] is None:
+                heapq.heappop(self._timers)
+
+            timeout = None
+            if self._timers:
+                timeout = max(0.0, self._timers[0][0] - time.monotonic())
+
+            for key, _ in self._selector.select(timeout):
+                key.data()
+
+            now = time.monotonic()
+            while self._running and self._timers and self._timers[0][0] <= now:
+                _, _, callback = heapq.heappop(self._timers)
+                if callback is not None:
+                    callback()
+
+    def close(self):
+        signal.set_wakeup_fd(-1)
+        self._selector.close()
+        self._wakeup_read.close()
+        self._wakeup_write.close()
+
+    def _drain_wakeup(self):
+        try:
+            while self._wakeup_read.recv(64):
+                pass
+        except (BlockingIOError, InterruptedError):
+            pass
+
+
+class HandshakeWait:
+    """Polls an interface for a fresh handshake on EventLoop timers.
+
+    Each poll is one in-process read through ExitPool.handshake_elapsed();
+    on_done receives the seconds since started, or None at the probe timeout.
+    """
+
+    def __init__(self, loop: EventLoop, pool, interface: str, started: float, started_wall: int,
+                 on_done: Callable[[Optional[float]], None]):
+        self.loop = loop
+        self.pool = pool
+        self.interface = interface
+        self.started = started
+        self.started_wall = started_wall
+        self.on_done = on_done
+        self._deadline = started + EXIT_PROBE_TIMEOUT
+        self._timer = loop.call_later(EXIT_PROBE_POLL_INTERVAL, self._poll)
+
+    def _poll(self):
+        self._timer = None
+        elapsed = self.pool.handshake_elapsed(self.interface, self.started, self.started_wall)
+        if elapsed is None and time.monotonic() < self._deadline:
+            self._timer = self.loop.call_later(EXIT_PROBE_POLL_INTERVAL, self._poll)
+            return
+        self.on_done(elapsed)
+
+    def cancel(self):
+        self.loop.cancel(self._timer)
+        self._timer = None
+
+
+class PoolProbeRound:
+    """Probes every exit of the pool one after another without blocking the loop.
+
+    Idle exits share the probe interface, so they are measured in turn; the
+    active exit is judged from its live counters in a single read. Callbacks
+    passed to join() receive the ranked records, or None and the error.
+    """
+
+    def __init__(self, loop: EventLoop, pool, active_exit: Optional[str], vpn_interface: str):
+        self.loop = loop
+        self.pool = pool
+        self.active_exit = active_exit
+        self.vpn_interface = vpn_interface
+        self.done = False
+        self._waiters = []
+        self._names = []
+        self._previous = {}
+        self._records = []
+        self._probe = None
+        self._wait = None
+
+    def join(self, on_done: Callable[[Optional[list], Optional[Exception]], None]):
+        self._waiters.append(on_done)
+
+    def start(self):
+        try:
+            self._previous = self.pool.load_health()
+            self._names = self.pool.exit_names()
+        except Exception as e:
+            self._finish(None, e)
+            return
+        self._next()
+
+    def _next(self):
+        try:
+            while self._names:
+                name = self._names.pop(0)
+                if name == self.active_exit:
+                    self._records.append(self.pool.probe_exit(name, self.active_exit,
+                                                              self._previous.get(name), self.vpn_interface))
+                    continue
+
+                self._probe = self.pool.begin_idle_probe(name, self._previous.get(name))
+                if self._probe.failure is None:
+                    self._wait = HandshakeWait(self.loop, self.pool, PROBE_INTERFACE_NAME,
+                                               self._probe.started, self._probe.started_wall, self._probed)
+                    return
+                self._record_probe(None)
+
+            records = self.pool.record_probes(self._records)
+        except Exception as e:
+            self._finish(None, e)
+            return
+        self._finish(records, None)
+
+    def _probed(self, elapsed: Optional[float]):
+        self._wait = None
+        try:
+            self._record_probe(elapsed)
+        except Exception as e:
+            self._finish(None, e)
+            return
+        self._next()
+
+    def _record_probe(self, elapsed: Optional[float]):
+        probe, self._probe = self._probe, None
+        self.pool.end_idle_probe(probe)
+        self._records.append(self.pool.stamp_probe(probe.result(elapsed), self._previous.get(probe.exit_name)))
+
+    def cancel(self):
+        """Stop a running round and remove its probe interface."""
+        if self._wait is not None:
+            self._wait.cancel()
+            self._wait = None
+        if self._probe is not None:
+            probe, self._probe = self._probe, None
+            self.pool.end_idle_probe(probe)
+        self.done = True
+
+    def _finish(self, records: Optional[list], error: Optional[Exception]):
+        if self._probe is not None:
+            probe, self._probe = self._probe, None
+            try:
+                self.pool.end_idle_probe(probe)
+            except OSError:
+                pass
+        self.done = True
+        for on_done in self._waiters:
+            on_done(records, error)
 
 
 class MultihopMonitorService:
@@ -74,22 +300,40 @@ class MultihopMonitorService:
         self.install_dir = Path("/opt/phantom-wg")
         self.config_file = self.install_dir / "config" / "phantom.json"
         self.session_log_path = self.install_dir / "logs" / "multihop-session-current.log"
+        # Size-capped with gzip archives; falls back to plain appends without the module package
+        self.session_log = SessionLogFile(self.session_log_path) if SessionLogFile else None
 
         # Settings
-        self.CHECK_INTERVAL = 30  # seconds
+        self.CHECK_INTERVAL = 30  # seconds, status report cadence
         self.MAX_HANDSHAKE_AGE = 180  # 3 minutes
-        self.RECONNECT_INTERVAL = 10  # seconds
+        self.RECONNECT_INTERVAL = 10  # seconds, doubled after every failed attempt
         self.MAX_RECONNECT_ATTEMPTS = 3
-
-        # Stop event
-        self._stop_event = threading.Event()
+        self.HANDSHAKE_SETTLE_DELAY = 2  # seconds to wait for a handshake after a trigger
+        self.POOL_PROBE_INTERVAL = 300  # seconds between exit pool probes
+        self.MAX_FAILOVER_CANDIDATES = 2
 
         # Setup logging
         self._setup_logging()
 
+        self.loop = EventLoop()
+        self.config_service = get_config_service(self.config_file)
+        self.config_service.subscribe(self._on_config_changed)
+
+        # Scheduling state
+        self._check_timer = None
+        self._next_status_report = 0.0
+        self._reconnect_attempt = 0
+        self._failover_started = None
+        self._probe_round = None
+        self._handshake_wait = None
+        self._exit_addresses = {}
+        self._exit_pool = None
+        self._config_fd = None
+
         # Signal handlers
         signal.signal(signal.SIGTERM, self._signal_handler)
         signal.signal(signal.SIGINT, self._signal_handler)
+        signal.signal(signal.SIGHUP, self._reload_handler)
 
     def _setup_logging(self):
         self.log_level_str = os.environ.get('MULTIHOP_LOG_LEVEL', 'INFO')
@@ -120,12 +364,19 @@ class MultihopMonitorService:
     def _signal_handler(self, signum, frame):
         self.logger.info(f"Received signal {signum}, shutting down...")
         self.running = False
-        self._stop_event.set()
+        self.loop.stop()
+
+    # noinspection PyUnusedLocal
+    def _reload_handler(self, signum, frame):
+        self.logger.info("Received SIGHUP, reloading configuration")
+        self.config_service.invalidate()
+        self._schedule_check(0)
 
     def _load_config(self):
         try:
-            with open(self.config_file, 'r') as f:
-                return json.load(f)
+            if self._config_fd is None:
+                self.config_service.poll()
+            return self.config_service.snapshot()
         except Exception as e:
             self.logger.error(f"Failed to load config: {e}")
             return None
@@ -141,7 +392,35 @@ class MultihopMonitorService:
 
         return enabled, active_exit
 
-    def _run_command(self, cmd: list, timeout: int = None) -> dict:
+    def _pool_mode(self) -> bool:
+        config = self._load_config()
+        return bool(config and config.get("multihop", {}).get("pool_mode", False))
+
+    def _set_active_exit(self, exit_name: str):
+        """Record a failover in phantom.json (locked, atomic update)."""
+        def record(config):
+            multihop_config = config.setdefault("multihop", {})
+            multihop_config["active_exit"] = exit_name
+            multihop_config["updated_at"] = datetime.now().isoformat()
+
+        self.config_service.update(record, source=self)
+        self._exit_addresses.clear()
+
+    def _get_exit_pool(self):
+        if ExitPool is None:
+            return None
+        if self._exit_pool is None:
+            self._exit_pool = ExitPool(self.install_dir / "exit_configs", self.install_dir / "data" / EXIT_HEALTH_FILE,
+                                       self.logger, self._run_command)
+        return self._exit_pool
+
+    def _vpn_interface(self) -> str:
+        config = self._load_config()
+        if config:
+            return config.get("multihop", {}).get("vpn_interface_name", "wg_vpn")
+        return "wg_vpn"
+
+    def _run_command(self, cmd: list, timeout: int = None, input: str = None) -> dict:
         """Run command and log output at DEBUG level (inspired by multihop-interface-restore.py:93)."""
         cmd_str = ' '.join(cmd)
 
@@ -153,7 +432,8 @@ class MultihopMonitorService:
                 cmd,
                 capture_output=True,
                 text=True,
-                timeout=timeout
+                timeout=timeout,
+                input=input
             )
 
             # Log result details to session log at DEBUG level
@@ -197,116 +477,92 @@ class MultihopMonitorService:
             if message_level_value < self.current_log_level:
                 return  # Skip writing lower priority messages
 
+            timestamp = datetime.now().strftime('%H:%M:%S')
+            line = f"[{timestamp}] [{level}] {message}\n"
+            if self.session_log:
+                self.session_log.append(line)
+                return
+
             # Create log directory
             self.session_log_path.parent.mkdir(parents=True, exist_ok=True)
-
-            timestamp = datetime.now().strftime('%H:%M:%S')
             with open(self.session_log_path, 'a') as f:
-                f.write(f"[{timestamp}] [{level}] {message}\n")
+                f.write(line)
                 f.flush()
         except Exception as e:
             self.logger.error(f"Failed to write to session log: {e}")
 
     def _get_handshake_age(self, interface: str = None) -> int:
         if interface is None:
-            # Get interface
-            config = self._load_config()
-            if config:
-                interface = config.get("multihop", {}).get("vpn_interface_name", "wg_vpn")
-            else:
-                interface = "wg_vpn"
+            interface = self._vpn_interface()
         try:
-            cmd_result = self._run_command(['wg', 'show', interface, 'latest-handshakes'], timeout=5)
-
-            if not cmd_result["success"]:
+            handshakes = PeerStateReader(partial(self._run_command, timeout=5), interface).latest_handshakes()
+            if not handshakes:
                 return -1
-
-            lines = cmd_result["stdout"].strip().split('\n')
-            # noinspection DuplicatedCode
-            if lines and lines[0]:
-                parts = lines[0].split()
-                if len(parts) >= 2:
-                    timestamp = int(parts[1])
-                    current_time = int(time.time())
-                    age = current_time - timestamp
-                    return age
-
-            return -1
+            return int(time.time()) - max(handshakes)
 
         except Exception as e:
             self.logger.error(f"Failed to get handshake age: {e}")
             return -1
 
-    def _refresh_vpn_connection(self, active_exit: str) -> bool:
-        try:
-            # Get interface
-            config = self._load_config()
-            if config:
-                vpn_interface = config.get("multihop", {}).get("vpn_interface_name", "wg_vpn")
-            else:
-                vpn_interface = "wg_vpn"
-
-            # Force re-resolution by resetting listen port
-            self._run_command(['wg', 'set', vpn_interface, 'listen-port', '0'])
-
-            time.sleep(2)
-
-            # Check handshake
-            new_age = self._get_handshake_age()
-            if 0 <= new_age < 10:
-                return True
-
-            # Extract endpoint and attempt ping-based reconnection
+    def _exit_vpn_ip(self, active_exit: str) -> Optional[str]:
+        """VPN address of the exit config, read once per exit."""
+        if active_exit not in self._exit_addresses:
+            vpn_ip = None
             exit_config_file = self.install_dir / "exit_configs" / f"{active_exit}.conf"
             if exit_config_file.exists():
-                with open(exit_config_file, 'r') as f:
-                    config_content = f.read()
-
-                # Extract VPN IP address
-                for line in config_content.split('\n'):
+                for line in exit_config_file.read_text().split('\n'):
                     if line.strip().startswith('Address'):
-                        address = line.split('=', 1)[1].strip()
-                        vpn_ip = address.split('/')[0]
-
-                        # Send ping to trigger handshake
-                        self._run_command(['ping', '-c', '1', '-W', '2', vpn_ip])
-                        time.sleep(2)
-
-                        # Check handshake again
-                        new_age = self._get_handshake_age()
-                        if 0 <= new_age < 10:
-                            return True
+                        vpn_ip = line.split('=', 1)[1].strip().split('/')[0]
                         break
+            self._exit_addresses[active_exit] = vpn_ip
+        return self._exit_addresses[active_exit]
 
-            return False
+    # Event handlers
 
-        except Exception as e:
-            self.logger.error(f"Failed to refresh VPN connection: {e}")
-            return False
+    def _on_config_event(self):
+        self.config_service.handle_events()
 
-    def monitor_loop(self):
-        self.logger.info("Multihop monitor service started")
-        self._log_to_session("Monitor service started", "INFO")
+    # noinspection PyUnusedLocal
+    def _on_config_changed(self, snapshot, source):
+        if source is self:
+            return
+        self._log_to_session("Configuration changed", "DEBUG")
+        self._exit_addresses.clear()
+        if not self._recovering():
+            self._schedule_check(0)
+        elif not snapshot.get("multihop", {}).get("enabled", False):
+            self._check_once()
+
+    def _schedule_check(self, delay: float):
+        self.loop.cancel(self._check_timer)
+        self._check_timer = self.loop.call_later(delay, self._check_once)
+
+    def _check_once(self):
+        self._check_timer = None
+        try:
+            enabled, active_exit = self._check_multihop_state()
 
-        while self.running:
-            try:
-                # Check state
-                enabled, active_exit = self._check_multihop_state()
+            if not enabled:
+                self.logger.info("Multihop is disabled, shutting down service")
+                self._log_to_session("Monitor stopped - Multihop disabled", "INFO")
+                self.loop.stop()
+                return
 
-                if not enabled:
-                    self.logger.info("Multihop is disabled, shutting down service")
-                    self._log_to_session("Monitor stopped - Multihop disabled", "INFO")
-                    break
+            if not active_exit:
+                self.logger.warning("No active exit configured")
+                self._schedule_check(self.CHECK_INTERVAL)
+                return
 
-                if not active_exit:
-                    self.logger.warning("No active exit configured")
-                    time.sleep(self.CHECK_INTERVAL)
-                    continue
+            if self._recovering():
+                # The failover or reconnect sequence owns scheduling until it finishes
+                return
 
-                # Get age
-                handshake_age = self._get_handshake_age()
+            handshake_age = self._get_handshake_age()
+            now = time.monotonic()
 
-                # Status logging
+            # Status logging at the regular cadence, and always once stale
+            if now >= self._next_status_report or handshake_age > self.MAX_HANDSHAKE_AGE:
+                self._next_status_report = now + self.CHECK_INTERVAL
                 if handshake_age < 0:
                     self._log_to_session("Handshake: No connection", "ERROR")
                 elif handshake_age <= 120:
@@ -316,40 +572,234 @@ class MultihopMonitorService:
                 else:
                     self._log_to_session(f"Handshake: {handshake_age}s [Critical]", "ERROR")
 
-                # Check reconnection
-                if handshake_age > self.MAX_HANDSHAKE_AGE:
-                    self._log_to_session(f"Handshake too old ({handshake_age}s), reconnecting...", "WARNING")
-
-                    # Reconnect
-                    success = False
-                    for attempt in range(1, self.MAX_RECONNECT_ATTEMPTS + 1):
-                        self._log_to_session(f"Reconnection attempt {attempt}/{self.MAX_RECONNECT_ATTEMPTS}")
-
-                        if self._refresh_vpn_connection(active_exit):
-                            new_age = self._get_handshake_age()
-                            self._log_to_session(f"Reconnected - New handshake: {new_age}s", "SUCCESS")
-                            success = True
-                            break
-                        else:
-                            self._log_to_session(f"Attempt {attempt} failed", "ERROR")
-                            if attempt < self.MAX_RECONNECT_ATTEMPTS:
-                                time.sleep(self.RECONNECT_INTERVAL)
-
-                    if not success:
-                        self._log_to_session("All reconnection attempts failed", "ERROR")
-                        self.logger.error("All reconnection attempts failed")
-
-            except Exception as e:
-                self._log_to_session(f"Monitor error: {e}", "ERROR")
-                self.logger.error(f"Monitor loop error: {e}")
-
-            # Wait
-            remaining = self.CHECK_INTERVAL
-            while remaining > 0 and self.running:
-                wait_time = min(1, remaining)
-                if self._stop_event.wait(timeout=wait_time):
-                    break
-                remaining -= wait_time
+            if handshake_age > self.MAX_HANDSHAKE_AGE:
+                if self._pool_mode() and self._failover(active_exit, handshake_age):
+                    return
+                self._log_to_session(f"Handshake too old ({handshake_age}s), reconnecting...", "WARNING")
+                self._start_reconnect(active_exit)
+                return
+
+            # Wake up right when the handshake would turn stale, at the
+            # latest at the next status report
+            delay = self.CHECK_INTERVAL
+            if handshake_age >= 0:
+                delay = min(delay, self.MAX_HANDSHAKE_AGE - handshake_age + 1)
+            self._schedule_check(max(1, min(delay, self._next_status_report - now)))
+
+        except Exception as e:
+            self._log_to_session(f"Monitor error: {e}", "ERROR")
+            self.logger.error(f"Monitor loop error: {e}")
+            self._schedule_check(self.CHECK_INTERVAL)
+
+    # Exit pool
+
+    def _probe_pool(self):
+        self.loop.call_later(self.POOL_PROBE_INTERVAL, self._probe_pool)
+        if self._recovering() or not self._pool_mode():
+            return
+
+        enabled, active_exit = self._check_multihop_state()
+        if self._get_exit_pool() is None or not enabled:
+            return
+        self._run_probe_round(active_exit, self._log_probe_summary)
+
+    def _run_probe_round(self, active_exit: Optional[str],
+                         on_done: Callable[[Optional[list], Optional[Exception]], None]):
+        """Probe the pool on loop timers; a round already running is joined."""
+        if self._probe_round is None or self._probe_round.done:
+            self._probe_round = PoolProbeRound(self.loop, self._get_exit_pool(), active_exit,
+                                               self._vpn_interface())
+            self._probe_round.join(on_done)
+            self._probe_round.start()
+        else:
+            self._probe_round.join(on_done)
+
+    def _log_probe_summary(self, records: Optional[list], error: Optional[Exception]):
+        if error is not None:
+            self._log_to_session(f"Pool probe failed: {error}", "ERROR")
+            return
+
+        healthy = [record for record in records if record.healthy]
+        summary = f"Pool probe: {len(healthy)}/{len(records)} exits healthy"
+        if healthy:
+            best = healthy[0]
+            latency = f" ({best.handshake_latency_ms} ms)" if best.handshake_latency_ms is not None else ""
+            summary += f", best {best.name}{latency}"
+        self._log_to_session(summary, "INFO")
+
+    def _recovering(self) -> bool:
+        """True while a failover or reconnect sequence owns scheduling."""
+        return bool(self._reconnect_attempt) or self._failover_started is not None
+
+    def _failover(self, active_exit: str, handshake_age: int) -> bool:
+        """Start switching the live interface to the best healthy exit.
+
+        Returns False without a pool. Otherwise the switch continues on loop
+        timers and reconnects the original exit if no candidate takes over.
+        """
+        pool = self._get_exit_pool()
+        if pool is None:
+            return False
+
+        self._failover_started = time.monotonic()
+        try:
+            candidates = pool.candidates(exclude=active_exit)
+        except Exception as e:
+            self._failover_error(active_exit, handshake_age, e)
+            return True
+
+        if candidates:
+            self._failover_switch(active_exit, handshake_age, candidates)
+        else:
+            self._run_probe_round(active_exit, lambda records, error: self._failover_probed(
+                active_exit, handshake_age, records, error))
+        return True
+
+    def _failover_probed(self, active_exit: str, handshake_age: int,
+                         records: Optional[list], error: Optional[Exception]):
+        if error is not None:
+            self._failover_error(active_exit, handshake_age, error)
+            return
+        try:
+            candidates = self._get_exit_pool().candidates(exclude=active_exit, records=records)
+        except Exception as e:
+            self._failover_error(active_exit, handshake_age, e)
+            return
+        self._failover_switch(active_exit, handshake_age, candidates)
+
+    def _failover_switch(self, active_exit: str, handshake_age: int, candidates: list):
+        if not candidates:
+            self._log_to_session("Failover: no healthy exit in the pool", "WARNING")
+            self._failover_failed(active_exit, handshake_age)
+            return
+
+        self._log_to_session(f"Failover: handshake on {active_exit} too old ({handshake_age}s), "
+                             f"switching exit", "WARNING")
+        self._failover_next(active_exit, handshake_age, candidates[:self.MAX_FAILOVER_CANDIDATES])
+
+    def _failover_next(self, active_exit: str, handshake_age: int, candidates: list):
+        pool = self._get_exit_pool()
+        vpn_interface = self._vpn_interface()
+        try:
+            while candidates:
+                candidate = candidates.pop(0)
+                switch = pool.begin_switch(candidate, vpn_interface)
+                if switch["success"]:
+                    self._handshake_wait = HandshakeWait(
+                        self.loop, pool, vpn_interface, switch["started"], switch["started_wall"],
+                        lambda elapsed: self._failover_switched(active_exit, handshake_age, candidates,
+                                                                switch, elapsed))
+                    return
+                self._log_to_session(f"Failover to {candidate} failed: {switch['error']}", "ERROR")
+
+            # Nobody took over: put the original exit back and reconnect it
+            pool.begin_switch(active_exit, vpn_interface)
+            self._log_to_session(f"Failover failed after {time.monotonic() - self._failover_started:.2f}s, "
+                                 f"restored {active_exit}", "ERROR")
+        except Exception as e:
+            self._failover_error(active_exit, handshake_age, e)
+            return
+        self._failover_failed(active_exit, handshake_age)
+
+    def _failover_switched(self, active_exit: str, handshake_age: int, candidates: list,
+                           switch: dict, elapsed: Optional[float]):
+        self._handshake_wait = None
+        try:
+            result = self._get_exit_pool().switch_result(switch, elapsed)
+            if not result["success"]:
+                self._log_to_session(f"Failover to {result['exit_name']} failed: {result['error']}", "ERROR")
+                self._failover_next(active_exit, handshake_age, candidates)
+                return
+
+            self._set_active_exit(result["exit_name"])
+        except Exception as e:
+            self._failover_error(active_exit, handshake_age, e)
+            return
+
+        self._log_to_session(f"Failover: {active_exit} -> {result['exit_name']} completed in "
+                             f"{time.monotonic() - self._failover_started:.2f}s", "SUCCESS")
+        self._failover_started = None
+        self._finish_reconnect()
+
+    def _failover_error(self, active_exit: str, handshake_age: int, error: Exception):
+        self._log_to_session(f"Failover error: {error}", "ERROR")
+        self.logger.error(f"Failover error: {error}")
+        self._failover_failed(active_exit, handshake_age)
+
+    def _failover_failed(self, active_exit: str, handshake_age: int):
+        self._failover_started = None
+        self._log_to_session(f"Handshake too old ({handshake_age}s), reconnecting...", "WARNING")
+        self._start_reconnect(active_exit)
+
+    # Reconnection (timer driven, no sleeping in the loop)
+
+    def _start_reconnect(self, active_exit: str):
+        self._reconnect_attempt = 0
+        self._reconnect_attempt_start(active_exit)
+
+    def _reconnect_attempt_start(self, active_exit: str):
+        self._reconnect_attempt += 1
+        self._log_to_session(f"Reconnection attempt {self._reconnect_attempt}/{self.MAX_RECONNECT_ATTEMPTS}")
+
+        # Force re-resolution by resetting listen port
+        self._run_command(['wg', 'set', self._vpn_interface(), 'listen-port', '0'])
+        self.loop.call_later(self.HANDSHAKE_SETTLE_DELAY,
+                             lambda: self._reconnect_verify(active_exit, pinged=False))
+
+    def _reconnect_verify(self, active_exit: str, pinged: bool):
+        if not self.running:
+            return
+
+        new_age = self._get_handshake_age()
+        if 0 <= new_age < 10:
+            self._log_to_session(f"Reconnected - New handshake: {new_age}s", "SUCCESS")
+            self._finish_reconnect()
+            return
+
+        # Send a ping through the tunnel to trigger a handshake
+        vpn_ip = None if pinged else self._exit_vpn_ip(active_exit)
+        if vpn_ip:
+            self._run_command(['ping', '-c', '1', '-W', '2', vpn_ip])
+            self.loop.call_later(self.HANDSHAKE_SETTLE_DELAY,
+                                 lambda: self._reconnect_verify(active_exit, pinged=True))
+            return
+
+        attempt = self._reconnect_attempt
+        self._log_to_session(f"Attempt {attempt} failed", "ERROR")
+        if attempt < self.MAX_RECONNECT_ATTEMPTS:
+            backoff = self.RECONNECT_INTERVAL * 2 ** (attempt - 1)
+            self.loop.call_later(backoff, lambda: self._reconnect_attempt_start(active_exit))
+            return
+
+        self._log_to_session("All reconnection attempts failed", "ERROR")
+        self.logger.error("All reconnection attempts failed")
+        self._finish_reconnect()
+
+    def _finish_reconnect(self):
+        self._reconnect_attempt = 0
+        self._next_status_report = 0.0
+        self._schedule_check(self.CHECK_INTERVAL)
+
+    def monitor_loop(self):
+        self.logger.info("Multihop monitor service started")
+        self._log_to_session("Monitor service started", "INFO")
+
+        self._config_fd = self.config_service.watch()
+        if self._config_fd is not None:
+            self.loop.add_reader(self._config_fd, self._on_config_event)
+        else:
+            self.logger.warning("inotify unavailable, falling back to stat checks")
+        self._schedule_check(0)
+        self.loop.call_later(self.POOL_PROBE_INTERVAL, self._probe_pool)
+
+        try:
+            if self.running:
+                self.loop.run()
+        finally:
+            if self._probe_round is not None:
+                self._probe_round.cancel()
+            self.config_service.close()
+            self.loop.close()
 
         self.logger.info("Multihop monitor service stopped")
 